@@ -38,6 +38,9 @@ from app.features.platform.router_sub2api import router as platform_sub2api_rout
 from app.features.platform.router_flow2api import router as platform_flow2api_router
 from app.features.platform.router_jimeng_lab import router as platform_jimeng_lab_router
 from app.features.platform.router_doubao_lab import router as platform_doubao_lab_router
+from app.features.platform.router_request_profiles import router as platform_request_profiles_router
+from app.features.platform.router_task_metrics import router as platform_task_metrics_router
+from app.features.platform.router_ttb_quota import router as platform_ttb_quota_router
 
 # --- Tenants ---
 from app.features.tenants.users.router import router as tenant_users_router
@@ -116,6 +119,9 @@ def create_app() -> FastAPI:
     app.include_router(platform_flow2api_router)
     app.include_router(platform_jimeng_lab_router)
     app.include_router(platform_doubao_lab_router)
+    app.include_router(platform_request_profiles_router)
+    app.include_router(platform_task_metrics_router)
+    app.include_router(platform_ttb_quota_router)
 
     # Tenant routes
     app.include_router(tenant_users_router)
@@ -13,6 +13,8 @@ from celery.schedules import crontab
 from kombu import Queue, Exchange
 
 from app.core.config import settings
+from app.core.task_metrics import install_task_metrics
+from app.services.ttb_quota_planner import install_quota_subsystems
 
 
 def _use_ssl(url: str | None) -> bool:
@@ -534,6 +536,10 @@ _CORE_TASK_MODULES = (
 )
 _TIKTOK_SHOP_TASK_MODULE = "app.tasks.tiktok_shop_tasks"
 _VIDEO_ANALYSIS_TASK_MODULE = "app.tasks.tiktok_shop_video_analysis_tasks"
+_TTB_SYNC_TASK_MODULE = "app.tasks.ttb_sync_tasks"
+_GMVMAX_TASK_MODULE = "app.tasks.ttb_gmvmax_tasks"
+_GMVMAX_SYNC_TASK_MODULE = "app.gmvmax.tasks_sync"
+_WEBSITE_ADS_TASK_MODULE = "app.tasks.website_ads_tasks"
 _HERMES_TASK_MODULES = (
     "app.tasks.hermes_agent.tasks",
     "app.tasks.hermes_agent.content_runtime_tasks",
@@ -557,37 +563,75 @@ _VIDEO_TRANSCRIPT_TASK_MODULE = "app.tasks.tiktok_shop_video_transcript_tasks"
 _WHISPER_TASK_MODULES = (_WHISPER_TASK_MODULE, _VIDEO_TRANSCRIPT_TASK_MODULE)
 
 
+def queue_task_registry() -> dict[str, tuple[str, ...]]:
+    """Map each specialized queue to the task modules its worker must import.
+
+    A queue's entry has to cover every task routed to it, including tasks
+    whose name prefix belongs to another feature (``gmvmax.*`` media-cache
+    tasks live in the Website Ads module).  The default queue is the
+    catch-all for unrouted tasks, so it never gets an entry and its workers
+    keep the complete registry.
+    """
+
+    registry: dict[str, list[str]] = {}
+
+    def add(queue: str | None, *modules: str) -> None:
+        name = str(queue or "").strip()
+        if not name or name == str(default_queue_name):
+            return
+        entry = registry.setdefault(name, [])
+        entry.extend(module for module in modules if module not in entry)
+
+    add(HERMES_AGENT_TASK_QUEUE, *_HERMES_TASK_MODULES)
+    add(HERMES_MAINTENANCE_TASK_QUEUE, *_HERMES_MAINTENANCE_TASK_MODULES)
+    for queue in (AI_VIDEO_API_TASK_QUEUE, AI_VIDEO_BROWSER_TASK_QUEUE, AI_VIDEO_BROWSER_POLL_TASK_QUEUE):
+        add(queue, *_AI_VIDEO_PRODUCTION_TASK_MODULES)
+    add(AI_VIDEO_DOWNLOAD_TASK_QUEUE, *_AI_VIDEO_DOWNLOAD_TASK_MODULES)
+    add(AI_VIDEO_MAINTENANCE_TASK_QUEUE, *_AI_VIDEO_MAINTENANCE_TASK_MODULES)
+    # openai_whisper.website_ads_asset_analysis is defined with the Website Ads tasks.
+    add(WHISPER_TASK_QUEUE, *_WHISPER_TASK_MODULES, _WEBSITE_ADS_TASK_MODULE)
+    add(TIKTOK_SHOP_TASK_QUEUE, _TIKTOK_SHOP_TASK_MODULE)
+    add(VIDEO_ANALYSIS_TASK_QUEUE, _VIDEO_ANALYSIS_TASK_MODULE)
+    add(TTB_SYNC_QUEUE, _TTB_SYNC_TASK_MODULE)
+    # Pause intents only need the GMV Max task module, so the control worker
+    # starts without the Website Ads, Hermes and Whisper task graphs.
+    add("gmvmax_control", _GMVMAX_TASK_MODULE)
+    add("gmvmax", _GMVMAX_TASK_MODULE, _WEBSITE_ADS_TASK_MODULE)
+    add("gmvmax_sync", _GMVMAX_SYNC_TASK_MODULE)
+    add(WEBSITE_ADS_TASK_QUEUE, _WEBSITE_ADS_TASK_MODULE)
+    add(WEBSITE_ADS_MEDIA_TASK_QUEUE, _WEBSITE_ADS_TASK_MODULE)
+    return {queue: tuple(modules) for queue, modules in registry.items()}
+
+
+def _worker_queues(worker_queue: str | None) -> list[str]:
+    return _dedupe_names(str(worker_queue or "").split(","))
+
+
 def task_modules_for_worker_queue(worker_queue: str | None) -> tuple[str, ...]:
     """Return the smallest task registry needed by one queue-owned worker.
 
-    An empty queue means API, Beat, tests, or an unspecialized worker and keeps
-    the complete registry for backwards compatibility. Queue names themselves
-    remain deployment configuration, not campaign behavior.
+    ``worker_queue`` takes the same comma-separated list as ``celery -Q``.
+    An empty value means API, Beat, tests, or an unspecialized worker and keeps
+    the complete registry for backwards compatibility, as does any queue
+    without a registry entry. Queue names themselves remain deployment
+    configuration, not campaign behavior.
     """
 
-    queue = str(worker_queue or "").strip()
+    complete = _CORE_TASK_MODULES + _WHISPER_TASK_MODULES
+    queues = _worker_queues(worker_queue)
+    if not queues:
+        return complete
+    registry = queue_task_registry()
     hermes_queue = str(HERMES_AGENT_TASK_QUEUE)
-    if queue == hermes_queue or queue.startswith(f"{hermes_queue}.slot"):
-        return _HERMES_TASK_MODULES
-    if queue == str(HERMES_MAINTENANCE_TASK_QUEUE):
-        return _HERMES_MAINTENANCE_TASK_MODULES
-    if queue in {
-        str(AI_VIDEO_API_TASK_QUEUE),
-        str(AI_VIDEO_BROWSER_TASK_QUEUE),
-        str(AI_VIDEO_BROWSER_POLL_TASK_QUEUE),
-    }:
-        return _AI_VIDEO_PRODUCTION_TASK_MODULES
-    if queue == str(AI_VIDEO_DOWNLOAD_TASK_QUEUE):
-        return _AI_VIDEO_DOWNLOAD_TASK_MODULES
-    if queue == str(AI_VIDEO_MAINTENANCE_TASK_QUEUE):
-        return _AI_VIDEO_MAINTENANCE_TASK_MODULES
-    if queue == str(WHISPER_TASK_QUEUE):
-        return _WHISPER_TASK_MODULES
-    if queue == TIKTOK_SHOP_TASK_QUEUE:
-        return (_TIKTOK_SHOP_TASK_MODULE,)
-    if queue == str(VIDEO_ANALYSIS_TASK_QUEUE):
-        return (_VIDEO_ANALYSIS_TASK_MODULE,)
-    return _CORE_TASK_MODULES + _WHISPER_TASK_MODULES
+    modules: list[str] = []
+    for queue in queues:
+        if queue.startswith(f"{hermes_queue}.slot"):
+            queue = hermes_queue
+        entry = registry.get(queue)
+        if entry is None:
+            return complete
+        modules.extend(module for module in entry if module not in modules)
+    return tuple(modules)
 
 
 def task_modules_for_runtime(
@@ -622,6 +666,11 @@ def _register_task_modules(
             raise
 
 
+# Enqueue stamps for producers, wait/run/RSS samples for workers.
+install_task_metrics()
+# TikTok quota calls made by a task count against its subsystem's priority.
+install_quota_subsystems()
+
 _register_task_modules(
     os.getenv("GMV_CELERY_WORKER_QUEUE"),
     os.getenv("GMV_CELERY_RUNTIME_ROLE"),
@@ -108,6 +108,18 @@ class Settings(BaseSettings):
     WEBSHELL_CWD: str = ""
     WEBSHELL_TERM: str = "xterm-256color"
 
+    # =========================
+    # Request profiling（默认关闭）
+    # =========================
+    # Per-request SQL / Redis / upstream timings, Server-Timing headers and
+    # sampled slow-request traces at /api/v1/admin/platform/request-profiles.
+    REQUEST_PROFILING_ENABLED: bool = False
+    REQUEST_PROFILING_SLOW_MS: int = 1000
+    REQUEST_PROFILING_SAMPLE_RATE: float = 1.0
+    REQUEST_PROFILING_SERVER_TIMING: bool = True
+    REQUEST_PROFILING_TRACE_LIMIT: int = 200
+    REQUEST_PROFILING_TRACES_IN_REDIS: bool = True
+
     # =========================
     # Admin Docs
     # =========================
@@ -300,9 +312,22 @@ class Settings(BaseSettings):
     # so every API/worker process stops retrying the same quota simultaneously.
     TTB_API_UPSTREAM_COOLDOWN_SECONDS: float = 30.0
     TTB_API_UPSTREAM_COOLDOWN_MAX_SECONDS: float = 300.0
+    # Quota planner: share of each minute/day window that guard, sync and
+    # backfill subsystems may fill (the control plane may use all of it), and
+    # how many recent minutes forecast each subsystem's report-call demand.
+    TTB_QUOTA_PLANNER_ENABLED: bool = True
+    TTB_QUOTA_GUARD_SHARE: float = 0.9
+    TTB_QUOTA_SYNC_SHARE: float = 0.75
+    TTB_QUOTA_BACKFILL_SHARE: float = 0.5
+    TTB_QUOTA_FORECAST_MINUTES: int = 15
 
     # Website Ads runtime cadence and bounded automatic creative expansion.
     WEBSITE_ADS_MONITOR_INTERVAL_SECONDS: int = 60
+    WEBSITE_ADS_MONITOR_REPORT_CONCURRENCY: int = 4
+    # Hourly ad reports are shared between the monitor and the daily report
+    # for this long.  Keep it below the monitor interval so every monitor
+    # cycle still reads a fresh report.
+    WEBSITE_ADS_REPORT_CACHE_TTL_SECONDS: int = 45
     WEBSITE_ADS_ASSET_SYNC_INTERVAL_SECONDS: int = 10 * 60
     WEBSITE_ADS_ASSET_ANALYSIS_INTERVAL_SECONDS: int = 2 * 60
     WEBSITE_ADS_MEDIA_CACHE_INTERVAL_SECONDS: int = 2 * 60
@@ -327,6 +352,17 @@ class Settings(BaseSettings):
     GMVMAX_MEDIA_STORAGE_DIR: str = "/data/gmv_ops/gmvmax_media"
     GMVMAX_MEDIA_CACHE_INTERVAL_SECONDS: int = 2 * 60
     GMVMAX_MEDIA_CACHE_BATCH_SIZE: int = 12
+    # ffprobe results (duration, streams, keyframes) are indexed per file by
+    # path+size+mtime (or content hash) so pipeline stages stop re-probing.
+    MEDIA_PROBE_INDEX_PATH: str = "/data/gmv_ops/media_probe_index.sqlite3"
+    MEDIA_PROBE_TIMEOUT_SECONDS: int = 30
+    MEDIA_PROBE_MAX_WORKERS: int = 4
+    # Sampled video frames are cached per content hash and sample set; contact
+    # sheets of any layout are composed from them instead of re-decoding.
+    MEDIA_FRAME_CACHE_DIR: str = "/data/gmv_ops/media_frame_cache"
+    MEDIA_FRAME_CACHE_RETENTION_DAYS: int = 14
+    MEDIA_FRAME_MAX_SIDE: int = 1920
+    MEDIA_FRAME_DECODE_TIMEOUT_SECONDS: int = 180
     WEBSITE_ADS_VIDEO_UPLOAD_TIMEOUT_SECONDS: float = 600.0
     WEBSITE_ADS_UPLOAD_STALE_MINUTES: int = 60
     WEBSITE_ADS_ASSET_EXPANSION_ENABLED: bool = True
@@ -450,6 +486,10 @@ class Settings(BaseSettings):
     CELERY_TASK_SEND_SENT_EVENT: bool = False
     CELERY_TASK_CREATE_MISSING_QUEUES: bool = False
 
+    # Per-task queue wait / run time / RSS metrics in hourly Redis buckets.
+    CELERY_TASK_METRICS_ENABLED: bool = True
+    CELERY_TASK_METRICS_TTL_HOURS: int = 48
+
     CELERY_BEAT_DB_REFRESH_SECS: int = 15
     SCHEDULE_MIN_INTERVAL_SECONDS: int = 60
 
@@ -458,14 +498,37 @@ class Settings(BaseSettings):
     # =========================
     GMV_MAX_OPTIONS_POLL_TIMEOUT_SECONDS: float = 3.0
     GMV_MAX_OPTIONS_POLL_INTERVAL_SECONDS: float = 0.3
+    # Serialized options payload cached per binding and meta ETag in Redis
+    # (0 disables); concurrent cold loads wait this long for one builder.
+    GMV_MAX_OPTIONS_CACHE_TTL_SECONDS: int = 3600
+    GMV_MAX_OPTIONS_CACHE_BUILD_WAIT_SECONDS: float = 2.0
     GMVMAX_OVERVIEW_SNAPSHOT_TTL_DAYS: int = 90
     GMVMAX_CAMPAIGN_METRICS_HOURLY_TTL_DAYS: int = 90
     GMVMAX_CAMPAIGN_METRICS_DAILY_TTL_DAYS: int = 730
     GMVMAX_CAMPAIGN_SNAPSHOT_TTL_DAYS: int = 90
     GMVMAX_CREATIVE_10MIN_TTL_DAYS: int = 90
+    # Only Smart Guard HOLD/SKIPPED heartbeats expire from the guard-event log.
+    GMVMAX_GUARD_HEARTBEAT_TTL_DAYS: int = 30
+    # Chunked retention deletes: rows per batch, pause between batches, and a
+    # per-run time budget (0 = unbounded) for tables that are not partitioned.
+    GMVMAX_RETENTION_BATCH_SIZE: int = 5000
+    GMVMAX_RETENTION_PAUSE_SECONDS: float = 0.05
+    GMVMAX_RETENTION_MAX_SECONDS: float = 0.0
+    # Empty future partitions kept ahead of today on partitioned tables.
+    GMVMAX_RETENTION_FUTURE_PARTITIONS: int = 7
     # Realtime creative collection spans the advertiser's current report day
     # plus exactly the prior day for timezone/day-boundary handoff.
     GMVMAX_CREATIVE_10MIN_LOOKBACK_DAYS: int = 1
+    # "campaign" dispatches one creative sync per campaign (capped by
+    # GMVMAX_CREATIVE_10MIN_MAX_CAMPAIGNS_PER_SWEEP); "store" pulls all due
+    # campaigns of an advertiser store in shared multi-campaign report calls.
+    GMVMAX_CREATIVE_10MIN_SWEEP_MODE: str = "campaign"
+    GMVMAX_CREATIVE_10MIN_STORE_SWEEP_MAX_CAMPAIGNS: int = 500
+    GMVMAX_CREATIVE_10MIN_STORE_BATCH_CAMPAIGNS: int = 100
+    # Smart Guard reads its rolling windows from Redis mirrors of committed
+    # rows and falls back to MySQL whenever coverage cannot be proven.
+    GMVMAX_REALTIME_COUNTERS_ENABLED: bool = True
+    GMVMAX_REALTIME_COUNTERS_RETENTION_MINUTES: int = 360
 
     # =========================
     # Sync wait helpers
@@ -537,6 +600,10 @@ class Settings(BaseSettings):
     HERMES_CONTENT_CRITIC_AGENT_BASE_URL: str = "http://127.0.0.1:8646/v1"
     HERMES_CONTENT_CRITIC_AGENT_MODEL: str = "gmv-ops-hermes-content-critic"
     HERMES_CONTENT_CRITIC_AGENT_TIMEOUT_SECONDS: float = 600.0
+    # Content factory segment reviews render contact sheets and call the vision
+    # inspector in a thread pool; in-flight calls are capped per logical model.
+    CONTENT_FACTORY_VISION_REVIEW_CONCURRENCY: int = 8
+    CONTENT_FACTORY_VISION_REVIEW_ROUTE_CONCURRENCY: int = 4
     # Stateless multimodal analyst for TikTok Shop / GMV Max video content.
     # It has its own gateway and queue so visual inference never shares content
     # factory state or blocks the one-minute advertising control loops.
@@ -567,6 +634,12 @@ class Settings(BaseSettings):
     GMVMAX_HERMES_DAILY_REPORT_LOCAL_MINUTE: int = 30
     GMVMAX_HERMES_DAILY_REPORT_FINAL_CUTOFF_HOUR: int = 1
     GMVMAX_HERMES_DAILY_REPORT_DETAIL_TOLERANCE: float = 0.05
+    # Scopes run in parallel lanes, each with its own DB session.  TikTok
+    # overview refreshes and Hermes calls are capped separately.
+    GMVMAX_HERMES_DAILY_REPORT_SCOPE_CONCURRENCY: int = 8
+    GMVMAX_HERMES_DAILY_REPORT_TIKTOK_CONCURRENCY: int = 4
+    GMVMAX_HERMES_DAILY_REPORT_LLM_CONCURRENCY: int = 2
+    GMVMAX_HERMES_DAILY_REPORT_CHECKPOINT_REUSE_SECONDS: int = 30 * 60
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -12,6 +12,7 @@ from starlette.middleware.trustedhost import TrustedHostMiddleware
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware  # 改为从 uvicorn 引入
 
 from app.core.config import settings
+from app.core.request_profiling import install_request_profiling
 
 
 def _parse_list_like(value: object) -> List[str]:
@@ -49,6 +50,7 @@ def install_middleware(app: FastAPI) -> None:
     - TrustedHostMiddleware：Host 白名单（防 Host 头伪造）
     - CORSMiddleware：跨域白名单（支持 Cookie）
     - GZipMiddleware：压缩响应
+    - RequestProfilingMiddleware：按请求统计 SQL / Redis / 上游耗时（REQUEST_PROFILING_ENABLED 开启）
     """
     # 1) 代理头（置前）
     # 若你的前置代理（Nginx / frps）已正确设置 X-Forwarded-For / -Proto，则这里按真实协议拼接 URL。
@@ -95,3 +97,5 @@ def install_middleware(app: FastAPI) -> None:
     # 4) 压缩
     app.add_middleware(GZipMiddleware, minimum_size=1024)
 
+    # 5) 请求剖析（可选，置于最外层以覆盖完整请求耗时）
+    install_request_profiling(app)
@@ -0,0 +1,409 @@
+"""Opt-in per-request profiling for SQL, Redis and upstream HTTP calls.
+
+When ``REQUEST_PROFILING_ENABLED`` is on, :func:`install_request_profiling`
+hooks SQLAlchemy cursor events on ``app.data.db.engine`` and wraps the redis
+and httpx client entry points.  Each HTTP request gets a
+:class:`RequestProfile` held in a context variable (Starlette copies it into
+the threadpool for sync endpoints), and the response carries a
+``Server-Timing`` header such as ``db;dur=41.2;desc="12 queries"``.
+
+Requests slower than ``REQUEST_PROFILING_SLOW_MS`` are sampled into a bounded
+trace list — Redis when available so every API worker shares it, otherwise
+this process only — together with their most repeated statements, which is
+where N+1 loops show up.  Platform admins read the traces through
+``/api/v1/admin/platform/request-profiles``.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from app.core.config import settings
+
+logger = logging.getLogger("gmv.request_profiling")
+
+TRACE_REDIS_KEY = "gmv:request_profiles:slow"
+_STATEMENT_PREVIEW = 240
+_TOP_ITEMS = 5
+
+_current: ContextVar["RequestProfile | None"] = ContextVar("gmv_request_profile", default=None)
+
+
+@dataclass
+class _CallStats:
+    count: int = 0
+    seconds: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+
+
+@dataclass
+class RequestProfile:
+    method: str
+    path: str
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    sql: _CallStats = field(default_factory=_CallStats)
+    redis: _CallStats = field(default_factory=_CallStats)
+    http: _CallStats = field(default_factory=_CallStats)
+    statements: Counter = field(default_factory=Counter)
+    statement_seconds: dict[str, float] = field(default_factory=dict)
+    upstream_calls: list[dict[str, Any]] = field(default_factory=list)
+    status_code: int | None = None
+    total_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_sql(self, statement: str, seconds: float) -> None:
+        preview = " ".join(str(statement).split())[:_STATEMENT_PREVIEW]
+        with self._lock:
+            self.sql.add(seconds)
+            self.statements[preview] += 1
+            self.statement_seconds[preview] = self.statement_seconds.get(preview, 0.0) + seconds
+
+    def record_redis(self, seconds: float) -> None:
+        with self._lock:
+            self.redis.add(seconds)
+
+    def record_http(self, method: str, url: Any, status: int | None, seconds: float) -> None:
+        with self._lock:
+            self.http.add(seconds)
+            self.upstream_calls.append(
+                {
+                    "method": method,
+                    # Host and path only: query strings carry access tokens.
+                    "url": f"{getattr(url, 'host', '')}{getattr(url, 'path', '')}",
+                    "status": status,
+                    "ms": round(seconds * 1000, 1),
+                }
+            )
+
+    def server_timing(self) -> str:
+        parts = [
+            f'db;dur={self.sql.seconds * 1000:.1f};desc="{self.sql.count} queries"',
+            f'redis;dur={self.redis.seconds * 1000:.1f};desc="{self.redis.count} calls"',
+            f'upstream;dur={self.http.seconds * 1000:.1f};desc="{self.http.count} calls"',
+            f"total;dur={self.total_seconds * 1000:.1f}",
+        ]
+        return ", ".join(parts)
+
+    def as_dict(self) -> dict[str, Any]:
+        repeated = [
+            {
+                "statement": statement,
+                "count": count,
+                "ms": round(self.statement_seconds.get(statement, 0.0) * 1000, 1),
+            }
+            for statement, count in self.statements.most_common(_TOP_ITEMS)
+        ]
+        slowest_calls = sorted(self.upstream_calls, key=lambda call: call["ms"], reverse=True)
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status": self.status_code,
+            "started_at": self.started_at.isoformat(),
+            "total_ms": round(self.total_seconds * 1000, 1),
+            "sql": {"count": self.sql.count, "ms": round(self.sql.seconds * 1000, 1)},
+            "redis": {"count": self.redis.count, "ms": round(self.redis.seconds * 1000, 1)},
+            "upstream": {"count": self.http.count, "ms": round(self.http.seconds * 1000, 1)},
+            "repeated_statements": repeated,
+            "slowest_upstream_calls": slowest_calls[:_TOP_ITEMS],
+        }
+
+
+def current_profile() -> RequestProfile | None:
+    return _current.get()
+
+
+# =========================
+# Slow request traces
+# =========================
+class SlowRequestStore:
+    """Bounded list of slow request traces, shared through Redis when possible."""
+
+    def __init__(self, limit: int, *, use_redis: bool = True) -> None:
+        self._limit = max(1, int(limit))
+        self._use_redis = use_redis
+        self._local: deque[dict[str, Any]] = deque(maxlen=self._limit)
+
+    async def add(self, trace: dict[str, Any]) -> None:
+        self._local.appendleft(trace)
+        if not self._use_redis:
+            return
+        try:
+            from app.services.redis_client import get_redis
+
+            client = await get_redis()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.lpush(TRACE_REDIS_KEY, json.dumps(trace, default=str))
+                pipe.ltrim(TRACE_REDIS_KEY, 0, self._limit - 1)
+                await pipe.execute()
+        except Exception:  # noqa: BLE001 - profiling must never fail a request
+            logger.debug("failed to publish slow request trace", exc_info=True)
+
+    async def recent(self, limit: int) -> list[dict[str, Any]]:
+        limit = max(1, min(int(limit), self._limit))
+        if self._use_redis:
+            try:
+                from app.services.redis_client import get_redis
+
+                client = await get_redis()
+                raw = await client.lrange(TRACE_REDIS_KEY, 0, limit - 1)
+                return [json.loads(item) for item in raw]
+            except Exception:  # noqa: BLE001
+                logger.debug(
+                    "failed to read slow request traces; using local buffer", exc_info=True
+                )
+        return list(self._local)[:limit]
+
+    async def clear(self) -> None:
+        self._local.clear()
+        if not self._use_redis:
+            return
+        try:
+            from app.services.redis_client import get_redis
+
+            client = await get_redis()
+            await client.delete(TRACE_REDIS_KEY)
+        except Exception:  # noqa: BLE001
+            logger.debug("failed to clear slow request traces", exc_info=True)
+
+
+slow_request_store = SlowRequestStore(
+    int(getattr(settings, "REQUEST_PROFILING_TRACE_LIMIT", 200)),
+    use_redis=bool(getattr(settings, "REQUEST_PROFILING_TRACES_IN_REDIS", True)),
+)
+
+
+# =========================
+# ASGI middleware
+# =========================
+class RequestProfilingMiddleware:
+    """Attach a :class:`RequestProfile` to each HTTP request and report it."""
+
+    def __init__(
+        self,
+        app,
+        *,
+        slow_ms: float = 1000.0,
+        sample_rate: float = 1.0,
+        server_timing: bool = True,
+        store: SlowRequestStore | None = None,
+    ) -> None:
+        self.app = app
+        self.slow_seconds = max(0.0, float(slow_ms)) / 1000
+        self.sample_rate = min(1.0, max(0.0, float(sample_rate)))
+        self.server_timing = server_timing
+        self.store = store or slow_request_store
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(method=scope.get("method", ""), path=scope.get("path", ""))
+        token = _current.set(profile)
+        started = time.perf_counter()
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message.get("status")
+                profile.total_seconds = time.perf_counter() - started
+                if self.server_timing:
+                    headers = list(message.get("headers") or [])
+                    headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            profile.total_seconds = time.perf_counter() - started
+            if profile.total_seconds >= self.slow_seconds and (
+                self.sample_rate >= 1.0 or random.random() < self.sample_rate
+            ):
+                trace = profile.as_dict()
+                logger.warning("slow request", extra={"request_profile": trace})
+                await self.store.add(trace)
+
+
+# =========================
+# Instrumentation hooks
+# =========================
+_installed = False
+_install_lock = threading.Lock()
+
+
+def _on_before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("gmv_profile_started", []).append(time.perf_counter())
+
+
+def _on_after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    profile = _current.get()
+    stack = conn.info.get("gmv_profile_started")
+    if profile is None or not stack:
+        return
+    profile.record_sql(statement, time.perf_counter() - stack.pop())
+
+
+def _on_handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    stack = conn.info.get("gmv_profile_started") if conn is not None else None
+    if stack:
+        stack.pop()
+
+
+def _wrap_sync(func, record):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _current.get() is None:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(time.perf_counter() - started)
+
+    wrapper.__gmv_profiled__ = True
+    return wrapper
+
+
+def _wrap_async(func, record):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if _current.get() is None:
+            return await func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            record(time.perf_counter() - started)
+
+    wrapper.__gmv_profiled__ = True
+    return wrapper
+
+
+def _record_redis(seconds: float) -> None:
+    profile = _current.get()
+    if profile is not None:
+        profile.record_redis(seconds)
+
+
+def _patch(owner, name: str, wrap, record) -> None:
+    original = getattr(owner, name)
+    if getattr(original, "__gmv_profiled__", False):
+        return
+    setattr(owner, name, wrap(original, record))
+
+
+def _instrument_redis() -> None:
+    import redis
+    import redis.asyncio as aioredis
+
+    _patch(redis.Redis, "execute_command", _wrap_sync, _record_redis)
+    _patch(redis.client.Pipeline, "execute", _wrap_sync, _record_redis)
+    _patch(aioredis.Redis, "execute_command", _wrap_async, _record_redis)
+    _patch(aioredis.client.Pipeline, "execute", _wrap_async, _record_redis)
+
+
+def _instrument_httpx() -> None:
+    import httpx
+
+    def _send_sync(func):
+        @functools.wraps(func)
+        def send(self, request, *args, **kwargs):
+            profile = _current.get()
+            if profile is None:
+                return func(self, request, *args, **kwargs)
+            started = time.perf_counter()
+            status = None
+            try:
+                response = func(self, request, *args, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                elapsed = time.perf_counter() - started
+                profile.record_http(request.method, request.url, status, elapsed)
+
+        send.__gmv_profiled__ = True
+        return send
+
+    def _send_async(func):
+        @functools.wraps(func)
+        async def send(self, request, *args, **kwargs):
+            profile = _current.get()
+            if profile is None:
+                return await func(self, request, *args, **kwargs)
+            started = time.perf_counter()
+            status = None
+            try:
+                response = await func(self, request, *args, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                elapsed = time.perf_counter() - started
+                profile.record_http(request.method, request.url, status, elapsed)
+
+        send.__gmv_profiled__ = True
+        return send
+
+    for owner, wrap in ((httpx.Client, _send_sync), (httpx.AsyncClient, _send_async)):
+        if not getattr(owner.send, "__gmv_profiled__", False):
+            owner.send = wrap(owner.send)
+
+
+def instrument(engine=None) -> None:
+    """Install the SQL, Redis and httpx hooks once per process."""
+
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        from sqlalchemy import event
+
+        if engine is None:
+            from app.data.db import engine
+
+        event.listen(engine, "before_cursor_execute", _on_before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _on_after_cursor_execute)
+        event.listen(engine, "handle_error", _on_handle_error)
+        _instrument_redis()
+        _instrument_httpx()
+        _installed = True
+
+
+def install_request_profiling(app) -> None:
+    """Instrument clients and add the profiling middleware when enabled."""
+
+    if not bool(getattr(settings, "REQUEST_PROFILING_ENABLED", False)):
+        return
+    instrument()
+    app.add_middleware(
+        RequestProfilingMiddleware,
+        slow_ms=float(getattr(settings, "REQUEST_PROFILING_SLOW_MS", 1000)),
+        sample_rate=float(getattr(settings, "REQUEST_PROFILING_SAMPLE_RATE", 1.0)),
+        server_timing=bool(getattr(settings, "REQUEST_PROFILING_SERVER_TIMING", True)),
+    )
+
+
+__all__ = [
+    "RequestProfile",
+    "RequestProfilingMiddleware",
+    "SlowRequestStore",
+    "current_profile",
+    "install_request_profiling",
+    "instrument",
+    "slow_request_store",
+]
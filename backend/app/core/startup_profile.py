@@ -0,0 +1,148 @@
+"""Per-module import timing for API and worker startup.
+
+Run ``python -m app.core.startup_profile`` from ``backend/`` to import the
+API (and optionally the Celery app) in a fresh interpreter under
+``-X importtime`` and print the slowest modules by cumulative time, plus any
+ML stack module that leaked into startup.  The same report backs the import
+budget test, so a regression shows up with the module that caused it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+
+# Modules that must only be imported by the code paths that run models.
+HEAVY_MODULES = ("torch", "whisper", "transformers")
+
+
+@dataclass(frozen=True)
+class ModuleImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupImportReport:
+    target: str
+    wall_seconds: float
+    modules: list[ModuleImportTime] = field(default_factory=list)
+    heavy_modules: list[str] = field(default_factory=list)
+
+    def slowest(self, limit: int = 25) -> list[ModuleImportTime]:
+        return sorted(self.modules, key=lambda item: item.cumulative_us, reverse=True)[:limit]
+
+    def as_dict(self, limit: int = 25) -> dict:
+        return {
+            "target": self.target,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "heavy_modules": list(self.heavy_modules),
+            "slowest": [asdict(item) for item in self.slowest(limit)],
+        }
+
+
+def parse_importtime(stderr: str) -> list[ModuleImportTime]:
+    """Parse ``-X importtime`` lines (``import time: self | cumulative | name``)."""
+
+    modules: list[ModuleImportTime] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|", 2)
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        try:
+            self_value = int(self_us.strip())
+            cumulative_value = int(cumulative_us.strip())
+        except ValueError:  # the header line
+            continue
+        stripped = name.lstrip(" ")
+        modules.append(
+            ModuleImportTime(
+                module=stripped.strip(),
+                self_us=self_value,
+                cumulative_us=cumulative_value,
+                depth=(len(name) - len(stripped)) // 2,
+            )
+        )
+    return modules
+
+
+def measure_startup(target: str = "app.app", *, timeout: float = 120.0) -> StartupImportReport:
+    """Import ``target`` in a fresh interpreter and collect its import timings."""
+
+    probe = (
+        "import json, sys; "
+        f"import {target}; "
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=BACKEND_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        check=False,
+    )
+    wall_seconds = time.perf_counter() - started
+    if completed.returncode != 0:
+        tail = "\n".join(
+            line for line in completed.stderr.splitlines() if not line.startswith("import time:")
+        )
+        raise RuntimeError(f"importing {target} failed:\n{tail[-2000:]}")
+    stdout_lines = completed.stdout.strip().splitlines()
+    heavy = json.loads(stdout_lines[-1]) if stdout_lines else []
+    return StartupImportReport(
+        target=target,
+        wall_seconds=wall_seconds,
+        modules=parse_importtime(completed.stderr),
+        heavy_modules=heavy,
+    )
+
+
+def _print_report(report: StartupImportReport, limit: int) -> None:
+    print(f"{report.target}: {report.wall_seconds:.2f}s wall")
+    if report.heavy_modules:
+        print(f"  heavy modules imported at startup: {', '.join(report.heavy_modules)}")
+    print(f"  {'cumulative ms':>13}  {'self ms':>8}  module")
+    for item in report.slowest(limit):
+        print(
+            f"  {item.cumulative_us / 1000:>13.1f}  {item.self_us / 1000:>8.1f}  "
+            f"{'  ' * item.depth}{item.module}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Report per-module startup import time.")
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        default=["app.app", "app.celery_app"],
+        help="Modules to import (default: the API and the Celery app).",
+    )
+    parser.add_argument("--top", type=int, default=25, help="Number of modules to list per target.")
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of a table.")
+    args = parser.parse_args(argv)
+
+    reports = [measure_startup(target) for target in args.targets]
+    if args.json:
+        print(json.dumps([report.as_dict(args.top) for report in reports], indent=2))
+    else:
+        for report in reports:
+            _print_report(report, args.top)
+    return 1 if any(report.heavy_modules for report in reports) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
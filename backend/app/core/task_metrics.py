@@ -0,0 +1,358 @@
+"""Celery task runtime and queue-latency metrics.
+
+:func:`install_task_metrics` connects Celery signals:
+
+* ``before_task_publish`` stamps every outgoing message with the wall-clock
+  enqueue time (``gmv_enqueued_at``);
+* ``task_prerun`` / ``task_postrun`` measure enqueue-to-start wait (from the
+  header, or the ETA for delayed tasks) and execution time, and count runs
+  that ended in ``RETRY`` or ``FAILURE``.
+
+Each finished task is folded into hourly Redis buckets per ``queue|task``
+(counts, sums and fixed histogram buckets in a hash, plus the maximum wait
+and RSS growth in sorted sets updated with ``ZADD GT``), so every worker host
+contributes to the same view.  :func:`collect_task_metrics` rolls the recent
+hours up per task and per queue for the platform endpoint and
+``scripts/report_celery_task_metrics.py``; a queue whose p95 wait keeps
+growing is the one starving for workers.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from app.core.config import settings
+
+try:  # pragma: no cover - resource is POSIX only
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger("gmv.task_metrics")
+
+ENQUEUED_AT_HEADER = "gmv_enqueued_at"
+KEY_PREFIX = "gmv:task_metrics"
+# Upper bounds (seconds) of the wait/run histogram buckets; the last bucket is open.
+BUCKETS_SECONDS: tuple[float, ...] = (0.1, 0.5, 1, 5, 15, 60, 300, 900, 1800)
+
+_started: dict[str, tuple[float, float | None, int]] = {}
+_started_lock = threading.Lock()
+_installed = False
+
+
+def _bucket_index(seconds: float) -> int:
+    for index, upper in enumerate(BUCKETS_SECONDS):
+        if seconds <= upper:
+            return index
+    return len(BUCKETS_SECONDS)
+
+
+def _hour_key(moment: datetime) -> str:
+    return f"{KEY_PREFIX}:{moment:%Y%m%d%H}"
+
+
+def _peak_rss_kb() -> int:
+    if resource is None:
+        return 0
+    # ru_maxrss is KiB on Linux: the process high-water mark, which for a
+    # prefork child is the peak of every task it has run so far.  Tasks are
+    # charged with how far they raise it, not with the mark itself.
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _redis():
+    from app.services.redis_client import get_redis_sync
+
+    return get_redis_sync()
+
+
+# =========================
+# Recording
+# =========================
+@dataclass(frozen=True)
+class TaskSample:
+    queue: str
+    task: str
+    state: str
+    run_seconds: float
+    wait_seconds: float | None
+    rss_growth_kb: int
+    retried: bool = False
+
+
+def record_sample(client, sample: TaskSample, *, now: datetime | None = None) -> None:
+    """Fold one finished task into the current hour's buckets."""
+
+    moment = now or datetime.now(timezone.utc)
+    key = _hour_key(moment)
+    member = f"{sample.queue}|{sample.task}"
+    ttl = int(getattr(settings, "CELERY_TASK_METRICS_TTL_HOURS", 48)) * 3600
+    pipe = client.pipeline(transaction=False)
+    pipe.hincrby(f"{key}:stats", f"{member}|count", 1)
+    pipe.hincrbyfloat(f"{key}:stats", f"{member}|run_ms", round(sample.run_seconds * 1000, 3))
+    pipe.hincrby(f"{key}:stats", f"{member}|run_b{_bucket_index(sample.run_seconds)}", 1)
+    if sample.state == "FAILURE":
+        pipe.hincrby(f"{key}:stats", f"{member}|failures", 1)
+    if sample.retried:
+        pipe.hincrby(f"{key}:stats", f"{member}|retries", 1)
+    if sample.wait_seconds is not None:
+        wait = max(0.0, sample.wait_seconds)
+        pipe.hincrby(f"{key}:stats", f"{member}|waited", 1)
+        pipe.hincrbyfloat(f"{key}:stats", f"{member}|wait_ms", round(wait * 1000, 3))
+        pipe.hincrby(f"{key}:stats", f"{member}|wait_b{_bucket_index(wait)}", 1)
+        pipe.zadd(f"{key}:max_wait", {member: round(wait * 1000, 3)}, gt=True)
+    if sample.rss_growth_kb > 0:
+        pipe.zadd(f"{key}:rss_growth", {member: sample.rss_growth_kb}, gt=True)
+    for suffix in ("stats", "max_wait", "rss_growth"):
+        pipe.expire(f"{key}:{suffix}", ttl)
+    pipe.execute()
+
+
+def _publish(sample: TaskSample) -> None:
+    try:
+        record_sample(_redis(), sample)
+    except Exception:  # noqa: BLE001 - metrics must never fail a task
+        logger.debug("failed to publish task metrics", exc_info=True)
+
+
+def _header(request, name: str) -> Any:
+    value = getattr(request, name, None)
+    if value is None:
+        value = (getattr(request, "headers", None) or {}).get(name)
+    return value
+
+
+def _wait_seconds(request, started_wall: float) -> float | None:
+    enqueued = _header(request, ENQUEUED_AT_HEADER)
+    try:
+        enqueued_at = float(enqueued) if enqueued is not None else None
+    except (TypeError, ValueError):
+        enqueued_at = None
+    eta = getattr(request, "eta", None)
+    if eta:
+        try:
+            eta_at = datetime.fromisoformat(str(eta)).timestamp()
+        except ValueError:
+            eta_at = None
+        # A delayed task only starts waiting for a worker once its ETA passes.
+        if eta_at is not None:
+            enqueued_at = max(enqueued_at or eta_at, eta_at)
+    if enqueued_at is None:
+        return None
+    return started_wall - enqueued_at
+
+
+def _queue_name(request) -> str:
+    delivery = getattr(request, "delivery_info", None) or {}
+    return str(delivery.get("routing_key") or delivery.get("queue") or "unknown")
+
+
+def _on_before_task_publish(sender=None, headers=None, **_kwargs) -> None:
+    if isinstance(headers, dict):
+        headers.setdefault(ENQUEUED_AT_HEADER, time.time())
+
+
+def _on_task_prerun(sender=None, task_id=None, task=None, **_kwargs) -> None:
+    if not task_id or task is None:
+        return
+    wait = _wait_seconds(task.request, time.time())
+    with _started_lock:
+        _started[task_id] = (time.perf_counter(), wait, _peak_rss_kb())
+
+
+def _on_task_postrun(sender=None, task_id=None, task=None, state=None, **_kwargs) -> None:
+    if not task_id or task is None:
+        return
+    with _started_lock:
+        entry = _started.pop(task_id, None)
+    if entry is None:
+        return
+    started, wait, rss_before_kb = entry
+    _publish(
+        TaskSample(
+            queue=_queue_name(task.request),
+            task=str(task.name),
+            state=str(state or ""),
+            run_seconds=time.perf_counter() - started,
+            wait_seconds=wait,
+            rss_growth_kb=max(0, _peak_rss_kb() - rss_before_kb),
+            retried=str(state or "") == "RETRY",
+        )
+    )
+
+
+def install_task_metrics() -> None:
+    """Connect the metrics signal handlers once per process."""
+
+    global _installed
+    if _installed or not bool(getattr(settings, "CELERY_TASK_METRICS_ENABLED", True)):
+        return
+    from celery.signals import before_task_publish, task_postrun, task_prerun
+
+    before_task_publish.connect(_on_before_task_publish, weak=False)
+    task_prerun.connect(_on_task_prerun, weak=False)
+    task_postrun.connect(_on_task_postrun, weak=False)
+    _installed = True
+
+
+# =========================
+# Reporting
+# =========================
+@dataclass
+class TaskMetrics:
+    queue: str
+    task: str
+    count: int = 0
+    failures: int = 0
+    retries: int = 0
+    run_ms: float = 0.0
+    waited: int = 0
+    wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    rss_growth_kb: int = 0
+    run_buckets: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS_SECONDS) + 1))
+    wait_buckets: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS_SECONDS) + 1))
+
+    def merge(self, other: "TaskMetrics") -> None:
+        self.count += other.count
+        self.failures += other.failures
+        self.retries += other.retries
+        self.run_ms += other.run_ms
+        self.waited += other.waited
+        self.wait_ms += other.wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, other.max_wait_ms)
+        self.rss_growth_kb = max(self.rss_growth_kb, other.rss_growth_kb)
+        for index, value in enumerate(other.run_buckets):
+            self.run_buckets[index] += value
+        for index, value in enumerate(other.wait_buckets):
+            self.wait_buckets[index] += value
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "queue": self.queue,
+            "task": self.task,
+            "count": self.count,
+            "failures": self.failures,
+            "retries": self.retries,
+            "run_avg_ms": round(self.run_ms / self.count, 1) if self.count else None,
+            "run_p95_s": _bound(percentile(self.run_buckets, 0.95)),
+            "wait_avg_ms": round(self.wait_ms / self.waited, 1) if self.waited else None,
+            "wait_p50_s": _bound(percentile(self.wait_buckets, 0.50)),
+            "wait_p95_s": _bound(percentile(self.wait_buckets, 0.95)),
+            "wait_max_ms": round(self.max_wait_ms, 1) if self.waited else None,
+            "rss_growth_mb": round(self.rss_growth_kb / 1024, 1) if self.rss_growth_kb else None,
+        }
+
+
+def percentile(buckets: list[int], quantile: float) -> float | None:
+    """Upper bound of the histogram bucket holding ``quantile`` (``inf`` if open)."""
+
+    total = sum(buckets)
+    if not total:
+        return None
+    rank = math.ceil(total * quantile)
+    seen = 0
+    for index, count in enumerate(buckets):
+        seen += count
+        if seen >= rank:
+            return BUCKETS_SECONDS[index] if index < len(BUCKETS_SECONDS) else math.inf
+    return math.inf
+
+
+def _bound(value: float | None) -> float | str | None:
+    # JSON has no infinity; label the open bucket the way Prometheus does.
+    return "+Inf" if value == math.inf else value
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _hours(now: datetime, hours: int) -> Iterable[datetime]:
+    for offset in range(max(1, hours)):
+        yield now - timedelta(hours=offset)
+
+
+def collect_task_metrics(
+    client=None,
+    *,
+    hours: int = 24,
+    queue: str | None = None,
+    now: datetime | None = None,
+) -> dict[str, Any]:
+    """Roll up the last ``hours`` hourly buckets per task and per queue."""
+
+    client = client or _redis()
+    moment = now or datetime.now(timezone.utc)
+    tasks: dict[tuple[str, str], TaskMetrics] = {}
+
+    def member_metrics(
+        into: dict[tuple[str, str], TaskMetrics], member: str
+    ) -> TaskMetrics:
+        queue_name, _, task = member.partition("|")
+        return into.setdefault(
+            (queue_name, task), TaskMetrics(queue=queue_name, task=task)
+        )
+
+    for hour in _hours(moment, hours):
+        key = _hour_key(hour)
+        window: dict[tuple[str, str], TaskMetrics] = {}
+        for raw_field, raw_value in (client.hgetall(f"{key}:stats") or {}).items():
+            member, _, metric = _decode(raw_field).rpartition("|")
+            item = member_metrics(window, member)
+            value = float(_decode(raw_value))
+            if metric.startswith("run_b"):
+                item.run_buckets[int(metric[5:])] += int(value)
+            elif metric.startswith("wait_b"):
+                item.wait_buckets[int(metric[6:])] += int(value)
+            elif metric in {"count", "failures", "retries", "waited"}:
+                setattr(item, metric, getattr(item, metric) + int(value))
+            elif metric in {"run_ms", "wait_ms"}:
+                setattr(item, metric, getattr(item, metric) + value)
+        for member, score in client.zrange(f"{key}:max_wait", 0, -1, withscores=True) or []:
+            item = member_metrics(window, _decode(member))
+            item.max_wait_ms = max(item.max_wait_ms, float(score))
+        for member, score in client.zrange(f"{key}:rss_growth", 0, -1, withscores=True) or []:
+            item = member_metrics(window, _decode(member))
+            item.rss_growth_kb = max(item.rss_growth_kb, int(score))
+        for (queue_name, task), item in window.items():
+            if queue is None or queue_name == queue:
+                member_metrics(tasks, f"{queue_name}|{task}").merge(item)
+
+    queues: dict[str, TaskMetrics] = {}
+    for (queue_name, _task), item in tasks.items():
+        queues.setdefault(queue_name, TaskMetrics(queue=queue_name, task="*")).merge(item)
+
+    def wait_rank(item: TaskMetrics) -> tuple[float, float]:
+        p95 = percentile(item.wait_buckets, 0.95)
+        return (p95 if p95 is not None else -1.0, item.max_wait_ms)
+
+    return {
+        "hours": max(1, hours),
+        "generated_at": moment.isoformat(),
+        "buckets_seconds": list(BUCKETS_SECONDS),
+        "queues": [
+            {name: value for name, value in item.as_dict().items() if name != "task"}
+            for item in sorted(queues.values(), key=wait_rank, reverse=True)
+        ],
+        "tasks": [
+            item.as_dict() for item in sorted(tasks.values(), key=wait_rank, reverse=True)
+        ],
+    }
+
+
+__all__ = [
+    "BUCKETS_SECONDS",
+    "ENQUEUED_AT_HEADER",
+    "TaskSample",
+    "collect_task_metrics",
+    "install_task_metrics",
+    "percentile",
+    "record_sample",
+]
@@ -44,7 +44,13 @@ from .tiktok_shop import (
     TikTokShopVideoOverviewDailyMetric,
     TikTokShopWithdrawal,
 )
-from .commerce import CommerceProductCostVersion, CommerceProductMapping
+from .commerce import (
+    CommerceOrderFactState,
+    CommerceOrderProductHourlyFact,
+    CommerceProductCostVersion,
+    CommerceProductMapping,
+    CommerceShopOrderHourlyFact,
+)
 from .scheduling import TaskCatalog, Schedule, ScheduleRun
 from .providers import (
     PlatformProvider,
@@ -121,7 +127,12 @@ from .gmvmax_campaign_metrics import (
 )
 from .gmvmax_creative_metrics import GmvmaxProductCreativeMetricsDaily
 from .gmvmax_creative_assets import GmvmaxCreativeAssetProduct
+from .gmvmax_creative_leaderboard import (
+    GmvmaxCreativeLeaderboardEntry,
+    GmvmaxCreativeLeaderboardState,
+)
 from .gmvmax_sync_state import (
+    GmvCampaignMetricsDayState,
     GmvCreative10MinBatchManifest,
     GmvCreative10MinSyncState,
     GmvSyncSelectionCursor,
@@ -218,8 +229,11 @@ __all__ = [
     "TikTokShopSkuDailyMetric",
     "TikTokShopLiveDailyMetric",
     "TikTokShopUnsettledTransaction",
+    "CommerceOrderFactState",
+    "CommerceOrderProductHourlyFact",
     "CommerceProductCostVersion",
     "CommerceProductMapping",
+    "CommerceShopOrderHourlyFact",
     "TaskCatalog",
     "Schedule",
     "ScheduleRun",
@@ -287,6 +301,9 @@ __all__ = [
     "GmvmaxLiveCampaignMetricsHourly",
     "GmvmaxProductCreativeMetricsDaily",
     "GmvmaxCreativeAssetProduct",
+    "GmvmaxCreativeLeaderboardEntry",
+    "GmvmaxCreativeLeaderboardState",
+    "GmvCampaignMetricsDayState",
     "GmvCreative10MinBatchManifest",
     "GmvCreative10MinSyncState",
     "GmvSyncSelectionCursor",
@@ -24,6 +24,9 @@ from app.data.db import Base
 UBigInt = _BigInteger().with_variant(MySQL_BIGINT(unsigned=True), "mysql")
 Money = Numeric(20, 6)
 Rate = Numeric(12, 8)
+# Allocated order revenue is a ratio of two money values; keep enough scale
+# that summing millions of hourly facts cannot drift by a cent.
+FactMoney = Numeric(30, 10)
 
 
 def _utcnow() -> datetime:
@@ -202,7 +205,133 @@ class CommerceProductCostVersion(Base):
     )
 
 
+class CommerceOrderProductHourlyFact(Base):
+    """Paid order lines pre-aggregated per UTC hour, product and SKU.
+
+    Reporting days follow the advertiser timezone chosen at read time, so
+    facts are kept at UTC-hour grain and assembled into local days on read.
+    Costs are not stored: they come from the effective cost version when the
+    overview is built, using ``first_paid_at``/``last_paid_at`` to detect a
+    version change inside the bucket.
+    """
+
+    __tablename__ = "commerce_order_product_hourly_facts"
+    __table_args__ = (
+        UniqueConstraint(
+            "workspace_id",
+            "shop_row_id",
+            "paid_hour",
+            "product_id",
+            "sku_id",
+            name="uq_commerce_order_product_hour",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(UBigInt, primary_key=True, autoincrement=True)
+    workspace_id: Mapped[int] = mapped_column(
+        UBigInt,
+        ForeignKey("workspaces.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    shop_row_id: Mapped[int] = mapped_column(
+        UBigInt,
+        ForeignKey("oauth_tiktok_shop_shops.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    paid_hour: Mapped[datetime] = mapped_column(MySQL_DATETIME(fsp=6), nullable=False)
+    product_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    sku_id: Mapped[str] = mapped_column(
+        String(128),
+        nullable=False,
+        server_default=text("''"),
+    )
+    product_name: Mapped[str | None] = mapped_column(String(1024), default=None)
+    # Each order is counted on one SKU row of its product, so summing this
+    # column over a product yields distinct orders.
+    product_orders: Mapped[int] = mapped_column(UBigInt, nullable=False, server_default=text("0"))
+    quantity: Mapped[int] = mapped_column(UBigInt, nullable=False, server_default=text("0"))
+    merchandise_revenue: Mapped[Decimal] = mapped_column(
+        FactMoney, nullable=False, server_default=text("0")
+    )
+    allocated_revenue: Mapped[Decimal] = mapped_column(
+        FactMoney, nullable=False, server_default=text("0")
+    )
+    first_paid_at: Mapped[datetime] = mapped_column(MySQL_DATETIME(fsp=6), nullable=False)
+    last_paid_at: Mapped[datetime] = mapped_column(MySQL_DATETIME(fsp=6), nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        MySQL_DATETIME(fsp=6),
+        nullable=False,
+        default=_utcnow,
+        server_default=text("CURRENT_TIMESTAMP(6)"),
+    )
+
+
+class CommerceShopOrderHourlyFact(Base):
+    """Paid, non-sample order counts and totals per shop and UTC hour."""
+
+    __tablename__ = "commerce_shop_order_hourly_facts"
+    __table_args__ = (
+        UniqueConstraint(
+            "workspace_id",
+            "shop_row_id",
+            "paid_hour",
+            name="uq_commerce_shop_order_hour",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(UBigInt, primary_key=True, autoincrement=True)
+    workspace_id: Mapped[int] = mapped_column(
+        UBigInt,
+        ForeignKey("workspaces.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    shop_row_id: Mapped[int] = mapped_column(
+        UBigInt,
+        ForeignKey("oauth_tiktok_shop_shops.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    paid_hour: Mapped[datetime] = mapped_column(MySQL_DATETIME(fsp=6), nullable=False)
+    orders: Mapped[int] = mapped_column(UBigInt, nullable=False, server_default=text("0"))
+    revenue: Mapped[Decimal] = mapped_column(Money, nullable=False, server_default=text("0"))
+    refreshed_at: Mapped[datetime] = mapped_column(
+        MySQL_DATETIME(fsp=6),
+        nullable=False,
+        default=_utcnow,
+        server_default=text("CURRENT_TIMESTAMP(6)"),
+    )
+
+
+class CommerceOrderFactState(Base):
+    """Marks a shop whose hourly order facts were fully rebuilt."""
+
+    __tablename__ = "commerce_order_fact_states"
+    __table_args__ = (
+        UniqueConstraint(
+            "workspace_id",
+            "shop_row_id",
+            name="uq_commerce_order_fact_state",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(UBigInt, primary_key=True, autoincrement=True)
+    workspace_id: Mapped[int] = mapped_column(
+        UBigInt,
+        ForeignKey("workspaces.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    shop_row_id: Mapped[int] = mapped_column(
+        UBigInt,
+        ForeignKey("oauth_tiktok_shop_shops.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    rebuilt_at: Mapped[datetime] = mapped_column(MySQL_DATETIME(fsp=6), nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(MySQL_DATETIME(fsp=6), nullable=False)
+
+
 __all__ = [
+    "CommerceOrderFactState",
+    "CommerceOrderProductHourlyFact",
     "CommerceProductMapping",
     "CommerceProductCostVersion",
+    "CommerceShopOrderHourlyFact",
 ]
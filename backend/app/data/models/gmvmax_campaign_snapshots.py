@@ -6,7 +6,16 @@ from datetime import date, datetime
 
 from decimal import Decimal
 
-from sqlalchemy import BigInteger, ForeignKey, Index, Numeric, String, UniqueConstraint, text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    ForeignKey,
+    Index,
+    Numeric,
+    String,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.dialects.mysql import BIGINT as MySQL_BIGINT
 from sqlalchemy.dialects.mysql import DATETIME as MySQL_DATETIME
 from sqlalchemy.orm import Mapped, mapped_column
@@ -64,6 +73,10 @@ class GmvmaxProductCampaignSnapshotBatch(Base):
     end_date: Mapped[date] = mapped_column(nullable=False)
     snapshot_type: Mapped[str] = mapped_column(String(32), nullable=False)
     snapshot_at: Mapped[datetime] = mapped_column(MySQL_DATETIME(fsp=6), nullable=False)
+    # Fingerprint of the stored rows and whether the whole range was settled
+    # when they were fetched; a settled, fingerprinted batch is not refetched.
+    rows_fingerprint: Mapped[str | None] = mapped_column(String(64))
+    is_final: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("0"))
 
     created_at: Mapped[datetime] = mapped_column(
         MySQL_DATETIME(fsp=6), nullable=False, server_default=text("CURRENT_TIMESTAMP(6)")
@@ -126,6 +139,10 @@ class GmvmaxLiveCampaignSnapshotBatch(Base):
     end_date: Mapped[date] = mapped_column(nullable=False)
     snapshot_type: Mapped[str] = mapped_column(String(32), nullable=False)
     snapshot_at: Mapped[datetime] = mapped_column(MySQL_DATETIME(fsp=6), nullable=False)
+    # Fingerprint of the stored rows and whether the whole range was settled
+    # when they were fetched; a settled, fingerprinted batch is not refetched.
+    rows_fingerprint: Mapped[str | None] = mapped_column(String(64))
+    is_final: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("0"))
 
     created_at: Mapped[datetime] = mapped_column(
         MySQL_DATETIME(fsp=6), nullable=False, server_default=text("CURRENT_TIMESTAMP(6)")
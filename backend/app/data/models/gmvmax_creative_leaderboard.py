@@ -0,0 +1,149 @@
+"""Precomputed Hermes creative leaderboard for GMV Max candidate lists."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Date,
+    Index,
+    Integer,
+    JSON,
+    Numeric,
+    String,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.mysql import BIGINT as MySQL_BIGINT
+from sqlalchemy.dialects.mysql import DATETIME as MySQL_DATETIME
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.data.db import Base
+
+
+UBigInt = BigInteger().with_variant(MySQL_BIGINT(unsigned=True), "mysql")
+
+
+class GmvmaxCreativeLeaderboardEntry(Base):
+    """One ranked creative of a store or product leaderboard.
+
+    A board is keyed by scope, ``item_group_key`` (empty for the store-wide
+    board) and metric lookback.  ``position`` is the Hermes order, so pages
+    are read with ``position > :cursor``.
+    """
+
+    __tablename__ = "gmvmax_creative_leaderboard"
+    __table_args__ = (
+        UniqueConstraint(
+            "workspace_id",
+            "auth_id",
+            "advertiser_id",
+            "store_id",
+            "item_group_key",
+            "lookback_days",
+            "item_id",
+            name="uq_gmvmax_creative_leaderboard_item",
+        ),
+        Index(
+            "idx_gmvmax_creative_leaderboard_position",
+            "workspace_id",
+            "auth_id",
+            "advertiser_id",
+            "store_id",
+            "item_group_key",
+            "lookback_days",
+            "position",
+        ),
+        {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_0900_ai_ci"},
+    )
+
+    id: Mapped[int] = mapped_column(UBigInt, primary_key=True, autoincrement=True)
+    workspace_id: Mapped[int] = mapped_column(UBigInt, nullable=False)
+    auth_id: Mapped[int] = mapped_column(UBigInt, nullable=False)
+    advertiser_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    store_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    item_group_key: Mapped[str] = mapped_column(
+        String(64), nullable=False, server_default=text("''")
+    )
+    lookback_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    item_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    item_group_id: Mapped[str | None] = mapped_column(String(64))
+    hermes_tier: Mapped[str] = mapped_column(String(16), nullable=False)
+    hermes_score: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2), nullable=False, server_default=text("0")
+    )
+    hermes_rank: Mapped[int | None] = mapped_column(Integer)
+    hermes_recommended: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default=text("0")
+    )
+    selectable: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default=text("0")
+    )
+    historically_excluded: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default=text("0")
+    )
+    cost_cents: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=text("0")
+    )
+    gross_revenue_cents: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=text("0")
+    )
+    orders: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=text("0")
+    )
+    ranking_json: Mapped[dict | None] = mapped_column(JSON)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        MySQL_DATETIME(fsp=6),
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP(6)"),
+    )
+
+
+class GmvmaxCreativeLeaderboardState(Base):
+    """Freshness and Hermes summary of one leaderboard."""
+
+    __tablename__ = "gmvmax_creative_leaderboard_states"
+    __table_args__ = (
+        UniqueConstraint(
+            "workspace_id",
+            "auth_id",
+            "advertiser_id",
+            "store_id",
+            "item_group_key",
+            "lookback_days",
+            name="uq_gmvmax_creative_leaderboard_state",
+        ),
+        {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_0900_ai_ci"},
+    )
+
+    id: Mapped[int] = mapped_column(UBigInt, primary_key=True, autoincrement=True)
+    workspace_id: Mapped[int] = mapped_column(UBigInt, nullable=False)
+    auth_id: Mapped[int] = mapped_column(UBigInt, nullable=False)
+    advertiser_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    store_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    item_group_key: Mapped[str] = mapped_column(
+        String(64), nullable=False, server_default=text("''")
+    )
+    lookback_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    metric_start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    total: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    selectable_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
+    historically_excluded_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
+    product_price_source: Mapped[str | None] = mapped_column(String(128))
+    summary_json: Mapped[dict | None] = mapped_column(JSON)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        MySQL_DATETIME(fsp=6),
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP(6)"),
+    )
+
+
+__all__ = ["GmvmaxCreativeLeaderboardEntry", "GmvmaxCreativeLeaderboardState"]
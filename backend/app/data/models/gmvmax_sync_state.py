@@ -175,6 +175,79 @@ class GmvCreative10MinBatchManifest(Base):
     )
 
 
+class GmvCampaignMetricsDayState(Base):
+    """Fingerprint and settlement of the last campaign report fetch for one day.
+
+    ``campaign_id`` is empty for the store-wide row written by unscoped
+    syncs, which proves that no further campaign appeared on that day.
+    """
+
+    __tablename__ = "gmv_campaign_metrics_day_state"
+    __table_args__ = (
+        UniqueConstraint(
+            "workspace_id",
+            "auth_id",
+            "advertiser_id",
+            "store_id",
+            "promotion_type",
+            "granularity",
+            "campaign_id",
+            "stat_time_day",
+            name="uk_gmv_campaign_metrics_day_state",
+        ),
+        Index(
+            "idx_gmv_campaign_metrics_day_state_day",
+            "workspace_id",
+            "auth_id",
+            "advertiser_id",
+            "store_id",
+            "promotion_type",
+            "granularity",
+            "stat_time_day",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(UBigInt, primary_key=True, autoincrement=True)
+    workspace_id: Mapped[int] = mapped_column(UBigInt, nullable=False)
+    auth_id: Mapped[int] = mapped_column(UBigInt, nullable=False)
+    advertiser_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    store_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    promotion_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    granularity: Mapped[str] = mapped_column(String(16), nullable=False)
+    campaign_id: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        server_default=text("''"),
+    )
+    stat_time_day: Mapped[date] = mapped_column(Date, nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    row_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+    )
+    is_final: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        server_default=text("0"),
+    )
+    fetched_at: Mapped[datetime] = mapped_column(
+        MySQL_DATETIME(fsp=6),
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        MySQL_DATETIME(fsp=6),
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP(6)"),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        MySQL_DATETIME(fsp=6),
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP(6)"),
+        server_onupdate=text("CURRENT_TIMESTAMP(6)"),
+    )
+
+
 class GmvSyncSelectionCursor(Base):
     """Frozen-round cursor for one explicitly capped monitoring strategy."""
 
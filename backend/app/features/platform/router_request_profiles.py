@@ -0,0 +1,43 @@
+"""Admin APIs for sampled slow-request profiles (platform domain)."""
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.core.config import settings
+from app.core.deps import SessionUser, require_platform_admin
+from app.core.request_profiling import slow_request_store
+
+router = APIRouter(
+    prefix="/api/v1/admin/platform/request-profiles",
+    tags=["Admin / Platform Request Profiles"],
+)
+
+
+@router.get("")
+async def list_request_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    min_ms: float = Query(0, ge=0),
+    path: str | None = Query(None, max_length=256),
+    _: SessionUser = Depends(require_platform_admin),
+) -> dict[str, Any]:
+    """Newest slow-request traces first, optionally filtered by path and duration."""
+
+    traces = await slow_request_store.recent(limit)
+    if min_ms:
+        traces = [trace for trace in traces if float(trace.get("total_ms") or 0) >= min_ms]
+    if path:
+        traces = [trace for trace in traces if path in str(trace.get("path") or "")]
+    return {
+        "enabled": bool(getattr(settings, "REQUEST_PROFILING_ENABLED", False)),
+        "slow_ms": int(getattr(settings, "REQUEST_PROFILING_SLOW_MS", 1000)),
+        "items": traces,
+    }
+
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_request_profiles(
+    _: SessionUser = Depends(require_platform_admin),
+) -> None:
+    await slow_request_store.clear()
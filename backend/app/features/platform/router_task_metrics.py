@@ -0,0 +1,32 @@
+"""Admin APIs for Celery queue wait and task runtime metrics (platform domain)."""
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.deps import SessionUser, require_platform_admin
+from app.core.errors import APIError
+from app.core.task_metrics import collect_task_metrics
+
+router = APIRouter(
+    prefix="/api/v1/admin/platform/task-metrics",
+    tags=["Admin / Platform Task Metrics"],
+)
+
+
+@router.get("")
+def get_task_metrics(
+    hours: int = Query(24, ge=1, le=168),
+    queue: str | None = Query(None, max_length=128),
+    _: SessionUser = Depends(require_platform_admin),
+) -> dict[str, Any]:
+    """Per-queue and per-task wait/run percentiles, retries and peak RSS."""
+
+    try:
+        report = collect_task_metrics(hours=hours, queue=queue)
+    except Exception as exc:  # noqa: BLE001 - Redis down or unreachable
+        raise APIError(
+            "TASK_METRICS_UNAVAILABLE", "Task metrics store is unavailable.", 503
+        ) from exc
+    return report
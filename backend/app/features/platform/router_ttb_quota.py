@@ -0,0 +1,29 @@
+"""Admin APIs for the shared TikTok Business API quota (platform domain)."""
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.core.deps import SessionUser, require_platform_admin
+from app.core.errors import APIError
+from app.services.ttb_quota_planner import quota_overview
+
+router = APIRouter(
+    prefix="/api/v1/admin/platform/ttb-quota",
+    tags=["Admin / Platform TikTok Quota"],
+)
+
+
+@router.get("")
+def get_ttb_quota(
+    _: SessionUser = Depends(require_platform_admin),
+) -> dict[str, Any]:
+    """Remaining minute/day report budget per app and demand per subsystem."""
+
+    try:
+        return quota_overview()
+    except Exception as exc:  # noqa: BLE001 - Redis down or unreachable
+        raise APIError(
+            "TTB_QUOTA_UNAVAILABLE", "TikTok quota counters are unavailable.", 503
+        ) from exc
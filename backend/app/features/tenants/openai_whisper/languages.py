@@ -1,26 +1,46 @@
-"""Language helpers built from openai-whisper tables."""
+"""Language helpers built from openai-whisper tables.
+
+Importing ``whisper.tokenizer`` loads the whole whisper package and torch, so
+the tables are read on first use instead of when the module is imported.
+"""
 
 from __future__ import annotations
 
-from typing import List, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class _LanguageTables:
+    languages: Dict[str, str]
+    to_language_code: Dict[str, str]
+    options: List[dict]
+    code_set: frozenset[str]
+    name_to_code: Dict[str, str]
 
-from whisper.tokenizer import LANGUAGES, TO_LANGUAGE_CODE
 
-_LANGUAGE_OPTIONS = [
-    {"code": code, "name": name.title()}
-    for code, name in LANGUAGES.items()
-]
-_LANGUAGE_OPTIONS.sort(key=lambda item: item["name"])
+@lru_cache(maxsize=1)
+def _tables() -> _LanguageTables:
+    from whisper.tokenizer import LANGUAGES, TO_LANGUAGE_CODE
 
-_LANGUAGE_CODE_SET = {code.lower() for code in LANGUAGES.keys()}
-_LANGUAGE_NAME_TO_CODE = {
-    name.lower(): code for code, name in LANGUAGES.items()
-}
+    options = [
+        {"code": code, "name": name.title()}
+        for code, name in LANGUAGES.items()
+    ]
+    options.sort(key=lambda item: item["name"])
+    return _LanguageTables(
+        languages=dict(LANGUAGES),
+        to_language_code=dict(TO_LANGUAGE_CODE),
+        options=options,
+        code_set=frozenset(code.lower() for code in LANGUAGES.keys()),
+        name_to_code={name.lower(): code for code, name in LANGUAGES.items()},
+    )
 
 
 def list_language_options() -> List[dict]:
     """Return a stable copy of the language options."""
-    return [dict(item) for item in _LANGUAGE_OPTIONS]
+    return [dict(item) for item in _tables().options]
 
 
 def normalize_language_code(raw: Optional[str]) -> Optional[str]:
@@ -30,12 +50,13 @@ def normalize_language_code(raw: Optional[str]) -> Optional[str]:
     value = raw.strip().lower()
     if not value:
         return None
-    if value in _LANGUAGE_CODE_SET:
+    tables = _tables()
+    if value in tables.code_set:
         return value
-    if value in TO_LANGUAGE_CODE:
-        return TO_LANGUAGE_CODE[value]
-    if value in _LANGUAGE_NAME_TO_CODE:
-        return _LANGUAGE_NAME_TO_CODE[value]
+    if value in tables.to_language_code:
+        return tables.to_language_code[value]
+    if value in tables.name_to_code:
+        return tables.name_to_code[value]
     return None
 
 
@@ -43,7 +64,7 @@ def get_language_label(code: Optional[str]) -> Optional[str]:
     if not code:
         return None
     normalized = code.lower()
-    name = LANGUAGES.get(normalized)
+    name = _tables().languages.get(normalized)
     if name:
         return name.title()
     return None
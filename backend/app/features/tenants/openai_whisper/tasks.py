@@ -8,7 +8,6 @@ import math
 import mimetypes
 import re
 import shutil
-import subprocess
 import tempfile
 import time
 from datetime import datetime, timedelta, timezone
@@ -20,6 +19,13 @@ from app.celery_app import celery_app
 from app.core.config import settings
 from app.data.db import SessionLocal
 from app.services import video_site_cookies
+from app.services.media_frames import (
+    SheetLayout,
+    best_grid,
+    prune_frame_cache,
+    render_contact_sheet,
+)
+from app.services.media_probe_index import probe_media
 from sqlalchemy import func, select
 from sqlalchemy.orm.attributes import flag_modified
 
@@ -271,22 +277,7 @@ def _sha256_file(path: Path) -> str:
 
 
 def _has_audio_stream(path: Path) -> bool:
-    command = [
-        "/opt/apps/bin/ffprobe",
-        "-v", "error",
-        "-select_streams", "a:0",
-        "-show_entries", "stream=index",
-        "-of", "csv=p=0",
-        str(path),
-    ]
-    completed = subprocess.run(
-        command,
-        check=True,
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
-    return bool(str(completed.stdout or "").strip())
+    return probe_media(path).has_audio
 
 
 def _pick_entry(info: dict) -> dict:
@@ -714,57 +705,32 @@ def _ensure_local_video(db, workspace_id: int, job_id: str, metadata: dict) -> t
     return metadata, video_path, None
 
 
-def _best_grid(n: int) -> tuple[int, int]:
-    best_rows, best_cols = 1, n
-    best_diff = abs(best_rows - best_cols)
-    best_area = best_rows * best_cols
-    for rows in range(1, n + 1):
-        cols = math.ceil(n / rows)
-        area = rows * cols
-        diff = abs(rows - cols)
-        if diff < best_diff or (diff == best_diff and area < best_area):
-            best_rows, best_cols = rows, cols
-            best_diff = diff
-            best_area = area
-    return best_rows, best_cols
-
-
-def _extract_frames(video_path: Path, frames_dir: Path, interval: float) -> list[Path]:
-    frames_dir.mkdir(parents=True, exist_ok=True)
-    pattern = frames_dir / "frame_%03d.png"
-    cmd = ["ffmpeg", "-y", "-i", str(video_path), "-vf", f"fps=1/{interval},scale=1080:1920:force_original_aspect_ratio=increase,crop=1080:1920", str(pattern)]
-    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    frames = sorted(frames_dir.glob("frame_*.png"))
-    if frames:
-        return frames
-    fallback = frames_dir / "frame_001.png"
-    fallback_cmd = ["ffmpeg", "-y", "-i", str(video_path), "-frames:v", "1", "-vf", "scale=1080:1920:force_original_aspect_ratio=increase,crop=1080:1920", str(fallback)]
-    subprocess.run(fallback_cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    return [fallback]
-
-
 def _render_contact_sheet(video_path: Path, workspace_id: int, job_id: str, interval: float) -> Path:
     directory = storage.job_dir(workspace_id, job_id)
-    frames_dir = directory / "frames"
-    if frames_dir.exists():
-        shutil.rmtree(frames_dir, ignore_errors=True)
-    frames_dir.mkdir(parents=True, exist_ok=True)
-    frames = _extract_frames(video_path, frames_dir, interval)
-    frame_count = max(1, len(frames))
     try:
-        probe_cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", str(video_path)]
-        duration_raw = subprocess.check_output(probe_cmd, stderr=subprocess.STDOUT).decode().strip()
-        duration_seconds = max(0.0, float(duration_raw)) if duration_raw else 0.0
+        duration_seconds = probe_media(video_path).duration_seconds
     except Exception:
         duration_seconds = 0.0
-    expected_frames = frame_count
+    frame_count = 1
     if duration_seconds > 0 and interval > 0:
-        expected_frames = max(expected_frames, math.ceil(duration_seconds / interval))
-    rows, cols = _best_grid(expected_frames)
+        frame_count = max(1, math.ceil(duration_seconds / interval))
+    columns, rows = best_grid(frame_count)
     output_path = storage.contact_sheet_path(directory)
-    tile_cmd = ["ffmpeg", "-y", "-i", str(frames_dir / "frame_%03d.png"), "-frames:v", "1", "-vf", f"tile={cols}x{rows}:padding=4:margin=10", str(output_path)]
-    subprocess.run(tile_cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    shutil.rmtree(frames_dir, ignore_errors=True)
+    render_contact_sheet(
+        video_path,
+        [interval * index for index in range(frame_count)],
+        SheetLayout(
+            tile_width=1080,
+            tile_height=1920,
+            fit="cover",
+            columns=columns,
+            rows=rows,
+            padding=4,
+            margin=10,
+            image_format="PNG",
+        ),
+        output_path,
+    )
     return output_path
 
 
@@ -1473,6 +1439,7 @@ def cleanup_jobs(self) -> dict:
         "large_artifacts_purged": 0,
         "expired_jobs_deleted": 0,
         "uploads_deleted": 0,
+        "frame_cache_pruned": 0,
         "elapsed_ms": 0,
     }
     with SessionLocal() as db:
@@ -1508,6 +1475,7 @@ def cleanup_jobs(self) -> dict:
         db.commit()
 
     stats["uploads_deleted"] = storage.delete_uploads_older_than(None, upload_cutoff_ts, limit=batch_size)
+    stats["frame_cache_pruned"] = prune_frame_cache()
     stats["elapsed_ms"] = int((time.monotonic() - started) * 1000)
     logger.info("openai whisper cleanup completed", extra=stats)
     return stats
@@ -5,26 +5,23 @@ import logging
 import shutil
 import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-import whisper
-from transformers import (
-    AutoModelForSeq2SeqLM,
-    AutoTokenizer,
-    MarianMTModel,
-    MarianTokenizer,
-    pipeline,
-)
-from transformers.pipelines import TranslationPipeline
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from app.core.config import settings
 
 from .languages import get_language_label
 
+if TYPE_CHECKING:
+    from transformers.pipelines import TranslationPipeline
+
+# whisper and transformers pull in torch, which costs seconds at import time.
+# They are imported inside the loaders below so the API and the Celery workers
+# that merely register transcription tasks start without the ML stack.
+
 logger = logging.getLogger("gmv.whisper")
 _MODEL_LOCK = threading.Lock()
 _MODEL = None
-_TRANSLATORS: Dict[tuple[str, str], TranslationPipeline] = {}
+_TRANSLATORS: Dict[tuple[str, str], "TranslationPipeline"] = {}
 _TRANSLATOR_LOCK = threading.Lock()
 _NLLB_LOCK = threading.Lock()
 _NLLB_TOKENIZER = None
@@ -100,6 +97,8 @@ _NLLB_LANGUAGE_CODES = {
 def _load_model():
     model_name = getattr(settings, "WHISPER_MODEL_NAME", "small")
     logger.info("loading whisper model", extra={"model": model_name})
+    import whisper
+
     return whisper.load_model(model_name)
 
 
@@ -148,6 +147,8 @@ def _load_translation_pipeline(source_language: str, target_language: str) -> Tr
         "loading MarianMT translation model",
         extra={"model": model_name, "source": source_language, "target": target_language, "cache_dir": str(cache_dir)},
     )
+    from transformers import MarianMTModel, MarianTokenizer, pipeline
+
     tokenizer = MarianTokenizer.from_pretrained(model_name, cache_dir=cache_dir)
     model = MarianMTModel.from_pretrained(model_name, cache_dir=cache_dir)
     return pipeline("translation", model=model, tokenizer=tokenizer)
@@ -178,6 +179,8 @@ def _get_nllb():
             cache_dir = Path(settings.OPENAI_WHISPER_STORAGE_DIR).expanduser() / "models"
             cache_dir.mkdir(parents=True, exist_ok=True)
             logger.info("loading NLLB translation model", extra={"model": model_name, "cache_dir": str(cache_dir)})
+            from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
             _NLLB_TOKENIZER = AutoTokenizer.from_pretrained(model_name, cache_dir=cache_dir)
             _NLLB_MODEL = AutoModelForSeq2SeqLM.from_pretrained(model_name, cache_dir=cache_dir)
     return _NLLB_TOKENIZER, _NLLB_MODEL
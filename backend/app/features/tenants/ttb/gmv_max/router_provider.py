@@ -130,6 +130,17 @@ from app.services.gmvmax_creative_assets import (
     resolve_store_authorized_bc_id as resolve_creative_asset_store_authorized_bc_id,
     sync_creative_assets_for_scope,
 )
+from app.services.gmvmax_creative_candidates import (
+    creative_asset_candidate_from_row as _creative_asset_candidate_from_row,
+    creative_candidate_statement as _creative_candidate_statement,
+    load_historical_removed_creatives as _load_historical_removed_creatives,
+    product_price_for_hermes as _product_price_for_hermes,
+)
+from app.services.gmvmax_creative_leaderboard import (
+    STORE_WIDE_KEY as CREATIVE_LEADERBOARD_STORE_WIDE_KEY,
+    read_creative_leaderboard_page,
+    request_creative_leaderboard_build,
+)
 from app.services.gmvmax_creative_media_cache import creative_media_urls, resolve_creative_media
 from app.services.gmvmax_hermes_decision import (
     apply_approved_plan_defaults_to_create_payload,
@@ -673,422 +684,6 @@ def _float_or_none(value: Any) -> float | None:
         return None
 
 
-def _configured_product_price_for_hermes(
-    db: Session,
-    *,
-    workspace_id: int,
-    auth_id: int,
-    item_group_id: str | None,
-) -> tuple[float | None, str | None]:
-    if not item_group_id:
-        return None, None
-    # Product prices may live on an older campaign strategy. Keep the newest
-    # precedence, but inspect the complete account scope instead of an
-    # arbitrary recent prefix.
-    rows = (
-        db.query(GmvStrategyConfig.config_json)
-        .filter(GmvStrategyConfig.workspace_id == int(workspace_id))
-        .filter(GmvStrategyConfig.auth_id == int(auth_id))
-        .order_by(GmvStrategyConfig.updated_at.desc())
-        .all()
-    )
-    for (config_json,) in rows:
-        config = config_json if isinstance(config_json, Mapping) else {}
-        for section_name in ("smart_guard", "creative_guard"):
-            section = config.get(section_name)
-            if not isinstance(section, Mapping):
-                continue
-            prices = section.get("product_effective_prices")
-            if not isinstance(prices, Mapping):
-                continue
-            for key, value in prices.items():
-                if str(key) != str(item_group_id):
-                    continue
-                price = _float_or_none(value)
-                if price and price > 0:
-                    return price, f"strategy.{section_name}.product_effective_prices"
-    return None, None
-
-
-def _product_price_for_hermes(
-    db: Session,
-    *,
-    workspace_id: int,
-    auth_id: int,
-    store_id: str,
-    item_group_id: str | None,
-) -> tuple[float | None, str | None]:
-    configured_price, configured_source = _configured_product_price_for_hermes(
-        db,
-        workspace_id=workspace_id,
-        auth_id=auth_id,
-        item_group_id=item_group_id,
-    )
-    if configured_price is not None:
-        return configured_price, configured_source
-    if not item_group_id:
-        return None, None
-    try:
-        row = db.execute(
-            text(
-                """
-                select effective_price, min_price, price
-                from ttb_products
-                where workspace_id=:workspace_id
-                  and auth_id=:auth_id
-                  and store_id=:store_id
-                  and product_id=:product_id
-                limit 1
-                """
-            ),
-            {
-                "workspace_id": workspace_id,
-                "auth_id": auth_id,
-                "store_id": str(store_id),
-                "product_id": str(item_group_id),
-            },
-        ).mappings().first()
-    except SQLAlchemyError:
-        logger.exception(
-            "Failed to load product price for Hermes creative ranking",
-            extra={"item_group_id": str(item_group_id), "store_id": str(store_id)},
-        )
-        db.rollback()
-        return None, None
-    if not row:
-        return None, None
-    for key in ("effective_price", "min_price", "price"):
-        price = _float_or_none(row.get(key))
-        if price and price > 0:
-            return price, f"ttb_products.{key}"
-    return None, None
-
-
-def _load_historical_removed_creatives(
-    db: Session,
-    *,
-    workspace_id: int,
-    auth_id: int,
-    advertiser_id: str,
-    store_id: str,
-    item_group_ids: Sequence[str] | None,
-    guard_config: Mapping[str, Any] | None = None,
-) -> list[tuple[str, str | None]]:
-    normalized_items = list(
-        dict.fromkeys(
-            str(item).strip()
-            for item in item_group_ids or []
-            if str(item or "").strip()
-        )
-    )
-    if not normalized_items:
-        return []
-    config = dict(guard_config or {})
-    if not bool(config.get("historical_blacklist_enabled", True)):
-        return []
-
-    def _cfg_int(key: str, default: int) -> int:
-        try:
-            return int(config.get(key, default))
-        except Exception:  # noqa: BLE001
-            return default
-
-    def _cfg_decimal(key: str, default: str) -> Decimal:
-        try:
-            return Decimal(str(config.get(key, default)))
-        except Exception:  # noqa: BLE001
-            return Decimal(default)
-
-    def _value_int(value: Any, default: int = 0) -> int:
-        try:
-            return int(value)
-        except Exception:  # noqa: BLE001
-            return default
-
-    product_price_cache: dict[str | None, int | None] = {}
-
-    def _product_price_cents(item_group_id: str | None) -> int | None:
-        if item_group_id in product_price_cache:
-            return product_price_cache[item_group_id]
-        price_map = config.get("product_effective_prices") or {}
-        if isinstance(price_map, Mapping):
-            value = price_map.get(str(item_group_id)) if item_group_id else None
-            if value is None:
-                value = price_map.get("default")
-            try:
-                price = Decimal(str(value)) if value not in (None, "") else None
-            except Exception:  # noqa: BLE001
-                price = None
-            if price and price > 0:
-                product_price_cache[item_group_id] = int(
-                    (price * Decimal("100")).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
-                )
-                return product_price_cache[item_group_id]
-        if item_group_id:
-            row = db.execute(
-                text(
-                    """
-                    select effective_price, min_price, price
-                    from ttb_products
-                    where workspace_id=:workspace_id
-                      and auth_id=:auth_id
-                      and store_id=:store_id
-                      and product_id=:product_id
-                    limit 1
-                    """
-                ),
-                {
-                    "workspace_id": workspace_id,
-                    "auth_id": auth_id,
-                    "store_id": str(store_id),
-                    "product_id": str(item_group_id),
-                },
-            ).mappings().first()
-            if row:
-                for key in ("effective_price", "min_price", "price"):
-                    value = row.get(key)
-                    try:
-                        price = Decimal(str(value)) if value not in (None, "") else None
-                    except Exception:  # noqa: BLE001
-                        price = None
-                    if price and price > 0:
-                        product_price_cache[item_group_id] = int(
-                            (price * Decimal("100")).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
-                        )
-                        return product_price_cache[item_group_id]
-        product_price_cache[item_group_id] = None
-        return None
-
-    def _threshold_cents(item_group_id: str | None, multiplier_key: str) -> int:
-        min_spend = max(0, _cfg_int("historical_blacklist_min_spend_cents", 300))
-        price_cents = _product_price_cents(item_group_id)
-        if not price_cents:
-            return min_spend
-        multiplier = _cfg_decimal(multiplier_key, "1.0")
-        price_threshold = int(
-            (Decimal(price_cents) * multiplier).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
-        )
-        return max(min_spend, price_threshold)
-
-    rows = db.execute(
-        text(
-            """
-            select
-                m.creative_id,
-                m.item_group_id,
-                m.campaign_id as metric_campaign_id,
-                m.stat_time_day,
-                coalesce(m.cost_cents, 0) as metric_cost_cents,
-                coalesce(m.gross_revenue_cents, 0) as metric_gmv_cents,
-                coalesce(m.orders, 0) as metric_orders,
-                e.id as remove_event_id,
-                e.campaign_id as remove_campaign_id,
-                e.reason as remove_reason,
-                coalesce(e.cost_cents, 0) as remove_cost_cents,
-                e.created_at as remove_created_at,
-                m.updated_at as metric_updated_at
-            from gmvmax_product_creative_metrics_daily m
-            join gmv_campaign_guard_events e
-              on e.workspace_id=m.workspace_id
-             and e.auth_id=m.auth_id
-             and e.advertiser_id=m.advertiser_id
-             and e.store_id=m.store_id
-             and e.campaign_id=m.campaign_id
-            where m.workspace_id=:workspace_id
-              and m.auth_id=:auth_id
-              and m.advertiser_id=:advertiser_id
-              and m.store_id=:store_id
-              and m.item_group_id in :item_group_ids
-              and m.creative_id is not null
-              and m.creative_id not in ('', '-1', '0')
-              and e.event_type='CREATIVE_GUARD'
-              and e.action='REMOVE'
-              and e.result='SUCCESS'
-              and e.reason <> 'creative_guard:inherit_historical_exclusions'
-              and (
-                    json_search(e.request_json, 'one', m.creative_id, null, '$') is not null
-                 or json_search(e.response_json, 'one', m.creative_id, null, '$') is not null
-              )
-              and not exists (
-                    select 1
-                    from gmvmax_product_creative_metrics_daily good
-                    where good.workspace_id=m.workspace_id
-                      and good.auth_id=m.auth_id
-                      and good.advertiser_id=m.advertiser_id
-                      and good.store_id=m.store_id
-                      and good.item_group_id=m.item_group_id
-                      and good.creative_id=m.creative_id
-                      and coalesce(good.orders, 0) >= :historical_reinclude_min_orders
-                      and coalesce(good.roi, 0) >= :historical_reinclude_min_roi
-              )
-            order by m.updated_at desc
-            """
-        ).bindparams(bindparam("item_group_ids", expanding=True)),
-        {
-            "workspace_id": workspace_id,
-            "auth_id": auth_id,
-            "advertiser_id": str(advertiser_id),
-            "store_id": str(store_id),
-            "item_group_ids": normalized_items,
-            "historical_reinclude_min_orders": max(1, _cfg_int("historical_reinclude_min_orders", 1)),
-            "historical_reinclude_min_roi": str(_cfg_decimal("historical_reinclude_min_roi", "1.2")),
-        },
-    ).mappings().all()
-
-    grouped: dict[tuple[str, str | None], dict[str, Any]] = {}
-    timezone_row = db.execute(
-        text(
-            """
-            select display_timezone, timezone
-            from ttb_advertisers
-            where workspace_id=:workspace_id and auth_id=:auth_id
-              and advertiser_id=:advertiser_id
-            limit 1
-            """
-        ),
-        {
-            "workspace_id": workspace_id,
-            "auth_id": auth_id,
-            "advertiser_id": str(advertiser_id),
-        },
-    ).mappings().first()
-    timezone_name = (
-        timezone_row.get("display_timezone") or timezone_row.get("timezone")
-        if timezone_row
-        else None
-    )
-    time_bucket_hours = max(1, min(24, _cfg_int("historical_blacklist_time_bucket_hours", 4)))
-
-    def _event_bucket(value: Any) -> str | None:
-        if not value:
-            return None
-        created_at = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
-        if created_at.tzinfo is None:
-            created_at = created_at.replace(tzinfo=timezone.utc)
-        if timezone_name:
-            try:
-                created_at = created_at.astimezone(ZoneInfo(str(timezone_name)))
-            except (ZoneInfoNotFoundError, ValueError):
-                pass
-        return f"{created_at.date().isoformat()}:{(created_at.hour // time_bucket_hours) * time_bucket_hours:02d}"
-
-    for row in rows:
-        creative_id = str(row.get("creative_id") or "").strip()
-        if not creative_id:
-            continue
-        item_group_id = str(row.get("item_group_id") or "").strip() or None
-        key = (creative_id, item_group_id)
-        group = grouped.setdefault(
-            key,
-            {
-                "metric_keys": set(),
-                "event_ids": set(),
-                "event_campaigns": set(),
-                "event_time_buckets": set(),
-                "cost_cents": 0,
-                "gmv_cents": 0,
-                "orders": 0,
-                "max_event_cost_cents": 0,
-                "last_metric_at": row.get("metric_updated_at"),
-            },
-        )
-        metric_key = (
-            str(row.get("metric_campaign_id") or ""),
-            str(row.get("stat_time_day") or ""),
-            creative_id,
-            str(item_group_id or ""),
-        )
-        if metric_key not in group["metric_keys"]:
-            group["metric_keys"].add(metric_key)
-            group["cost_cents"] += _value_int(row.get("metric_cost_cents"), 0)
-            group["gmv_cents"] += _value_int(row.get("metric_gmv_cents"), 0)
-            group["orders"] += _value_int(row.get("metric_orders"), 0)
-        event_id = row.get("remove_event_id")
-        if event_id is not None and event_id not in group["event_ids"]:
-            group["event_ids"].add(event_id)
-            group["event_campaigns"].add(str(row.get("remove_campaign_id") or ""))
-            bucket = _event_bucket(row.get("remove_created_at"))
-            if bucket:
-                group["event_time_buckets"].add(bucket)
-            group["max_event_cost_cents"] = max(
-                int(group["max_event_cost_cents"]),
-                int(row.get("remove_cost_cents") or 0),
-            )
-        if row.get("metric_updated_at") and (
-            not group["last_metric_at"] or row.get("metric_updated_at") > group["last_metric_at"]
-        ):
-            group["last_metric_at"] = row.get("metric_updated_at")
-
-    min_remove_events = max(1, _cfg_int("historical_blacklist_min_remove_events", 3))
-    min_distinct_campaigns = max(1, _cfg_int("historical_blacklist_min_distinct_campaigns", 2))
-    min_distinct_time_buckets = max(1, _cfg_int("historical_blacklist_min_distinct_time_buckets", 3))
-    poor_roi_min_orders = max(1, _cfg_int("historical_blacklist_poor_roi_min_orders", 2))
-    poor_roi_floor = _cfg_decimal("historical_blacklist_poor_roi_floor", "0.8")
-
-    qualified: list[tuple[tuple[str, str | None], dict[str, Any]]] = []
-    for key, group in grouped.items():
-        creative_id, item_group_id = key
-        if bool(config.get("historical_blacklist_honor_add_events", True)):
-            latest_action = db.execute(
-                text(
-                    """
-                    select action
-                    from gmv_campaign_guard_events
-                    where workspace_id=:workspace_id and auth_id=:auth_id
-                      and advertiser_id=:advertiser_id and store_id=:store_id
-                      and event_type='CREATIVE_GUARD' and action in ('REMOVE','ADD')
-                      and result='SUCCESS'
-                      and (request_json like :needle or response_json like :needle)
-                    order by created_at desc, id desc limit 1
-                    """
-                ),
-                {
-                    "workspace_id": workspace_id,
-                    "auth_id": auth_id,
-                    "advertiser_id": str(advertiser_id),
-                    "store_id": str(store_id),
-                    "needle": f'%"{creative_id}"%',
-                },
-            ).scalar_one_or_none()
-            if latest_action and str(latest_action).upper() != "REMOVE":
-                continue
-        cost_cents = int(group["cost_cents"])
-        gmv_cents = int(group["gmv_cents"])
-        orders = int(group["orders"])
-        if cost_cents <= 0:
-            continue
-        remove_events = len(group["event_ids"])
-        distinct_campaigns = len({item for item in group["event_campaigns"] if item})
-        distinct_time_buckets = len(group["event_time_buckets"])
-        aggregate_roi = Decimal(gmv_cents) / Decimal(cost_cents) if cost_cents > 0 else Decimal("0")
-        zero_order_spend = _threshold_cents(item_group_id, "historical_blacklist_zero_order_price_multiplier")
-        poor_roi_spend = _threshold_cents(item_group_id, "historical_blacklist_poor_roi_price_multiplier")
-        single_event_spend = _threshold_cents(item_group_id, "historical_blacklist_single_event_price_multiplier")
-        enough_repeated_evidence = (
-            remove_events >= min_remove_events
-            and distinct_campaigns >= min_distinct_campaigns
-            and distinct_time_buckets >= min_distinct_time_buckets
-        )
-        zero_order_bad = enough_repeated_evidence and orders <= 0 and cost_cents >= zero_order_spend
-        poor_roi_bad = (
-            enough_repeated_evidence
-            and orders >= poor_roi_min_orders
-            and cost_cents >= poor_roi_spend
-            and aggregate_roi <= poor_roi_floor
-        )
-        high_spend_bad_converter = (
-            enough_repeated_evidence
-            and orders > 0
-            and cost_cents >= single_event_spend
-            and aggregate_roi <= poor_roi_floor
-        )
-        if zero_order_bad or poor_roi_bad or high_spend_bad_converter:
-            qualified.append((key, group))
-
-    qualified.sort(key=lambda item: item[1].get("last_metric_at") or datetime.min, reverse=True)
-    return [key for key, _ in qualified]
-
-
 async def _inherit_historical_creative_exclusions(
     context: GMVMaxRouteContext,
     *,
@@ -2524,99 +2119,6 @@ def _creative_asset_payload_from_cache(row: Mapping[str, Any]) -> dict[str, Any]
     }
 
 
-def _money_from_cents(value: Any) -> float:
-    try:
-        return round(float(value or 0) / 100.0, 4)
-    except (TypeError, ValueError):
-        return 0.0
-
-
-def _asset_score(row: Mapping[str, Any]) -> float:
-    cost = float(row.get("cost_cents") or 0)
-    gross = float(row.get("gross_revenue_cents") or 0)
-    orders = float(row.get("orders") or 0)
-    clicks = float(row.get("clicks") or row.get("product_clicks") or 0)
-    impressions = float(row.get("impressions") or row.get("product_impressions") or 0)
-    roi = gross / cost if cost > 0 else 0.0
-    ctr = clicks / impressions if impressions > 0 else 0.0
-    # Conservative ranking: paid proof first, then order proof, then engagement.
-    return round((roi * 55.0) + (orders * 18.0) + min(cost / 1000.0, 12.0) + min(ctr * 100.0, 10.0), 4)
-
-
-def _creative_asset_candidate_from_row(row: Mapping[str, Any]) -> dict[str, Any]:
-    cost_cents = int(row.get("cost_cents") or 0)
-    gross_cents = int(row.get("gross_revenue_cents") or 0)
-    orders = int(row.get("orders") or 0)
-    clicks = int(row.get("clicks") or row.get("product_clicks") or 0)
-    impressions = int(row.get("impressions") or row.get("product_impressions") or 0)
-    roi = round(gross_cents / cost_cents, 4) if cost_cents > 0 else 0.0
-    cache_active = str(row.get("cache_active", "true")).strip().lower() not in {
-        "0",
-        "false",
-        "no",
-    }
-    partition_active = str(
-        row.get("partition_active", "true")
-    ).strip().lower() not in {"0", "false", "no"}
-    selectable = bool(
-        cache_active
-        and partition_active
-        and row.get("item_id")
-        and str(row.get("item_id")) not in {"-1", "0"}
-        and row.get("video_id")
-        and row.get("identity_id")
-        and row.get("identity_type")
-    )
-    if not cache_active:
-        not_selectable_reason = "TikTok 当前完整素材列表已不再返回该视频。"
-    elif not partition_active:
-        not_selectable_reason = "TikTok 当前已不再返回该视频与所选商品的关联。"
-    elif not selectable:
-        not_selectable_reason = "缺少 TikTok 视频 ID 或授权身份，暂不能用于手动投放。"
-    else:
-        not_selectable_reason = None
-    media = creative_media_urls(row)
-    return {
-        "source": "TIKTOK_VIDEO_GET",
-        "selectable": selectable,
-        "not_selectable_reason": not_selectable_reason,
-        "item_id": row.get("item_id"),
-        "creative_id": row.get("item_id"),
-        "video_id": row.get("video_id"),
-        "item_group_id": row.get("item_group_id"),
-        "title": row.get("title") or row.get("item_id"),
-        "preview_url": media["preview_url"],
-        "video_cover_url": media["video_cover_url"],
-        "thumbnail_url": media["video_cover_url"],
-        "media_cache_status": row.get("media_cache_status"),
-        "duration": float(row["duration"]) if row.get("duration") is not None else None,
-        "identity_info": {
-            "identity_id": row.get("identity_id"),
-            "identity_type": row.get("identity_type"),
-            "identity_authorized_bc_id": row.get("identity_authorized_bc_id"),
-            "identity_authorized_shop_id": row.get("identity_authorized_shop_id"),
-            "store_id": row.get("store_id"),
-        },
-        "identity_name": row.get("identity_name"),
-        "can_change_anchor": str(row.get("can_change_anchor") or "").lower() == "true",
-        "metrics": {
-            "spend": _money_from_cents(cost_cents),
-            "gmv": _money_from_cents(gross_cents),
-            "orders": orders,
-            "roi": roi,
-            "clicks": clicks,
-            "impressions": impressions,
-            "ctr": round(clicks / impressions, 4) if impressions > 0 else 0.0,
-            "ad_video_view_rate_2s": float(row.get("ad_video_view_rate_2s") or 0),
-            "ad_video_view_rate_6s": float(row.get("ad_video_view_rate_6s") or 0),
-            "ad_video_view_rate_p100": float(row.get("ad_video_view_rate_p100") or 0),
-        },
-        "score": _asset_score(row),
-        "fetched_at": row.get("fetched_at"),
-        "updated_at": row.get("updated_at"),
-    }
-
-
 def _json_mapping(value: Any) -> dict[str, Any]:
     if isinstance(value, Mapping):
         return dict(value)
@@ -2649,6 +2151,42 @@ def _first_video_material(response: Any) -> dict[str, Any]:
     return {}
 
 
+def _creative_leaderboard_page(
+    db: Session,
+    *,
+    board: Mapping[str, Any],
+    metric_start_date: date,
+    **page_options: Any,
+) -> dict[str, Any] | None:
+    """Read a leaderboard page; a missing or stale board is queued for a build.
+
+    Returns ``None`` when the board cannot be served so the caller falls back
+    to live ranking.  The GET itself never writes the board.
+    """
+
+    try:
+        page = read_creative_leaderboard_page(
+            db, **board, metric_start_date=metric_start_date, **page_options
+        )
+    except Exception:  # noqa: BLE001 - live ranking remains available
+        logger.exception(
+            "Creative leaderboard unavailable; ranking candidates live",
+            extra={"item_group_key": board.get("item_group_key")},
+        )
+        db.rollback()
+        return None
+    if page is None:
+        try:
+            request_creative_leaderboard_build(**board, metric_start_date=metric_start_date)
+        except Exception:  # noqa: BLE001 - the next request queues it again
+            logger.warning(
+                "Creative leaderboard build enqueue failed",
+                exc_info=True,
+                extra={"item_group_key": board.get("item_group_key")},
+            )
+    return page
+
+
 def _manual_upload_candidate_from_row(
     row: Mapping[str, Any],
     *,
@@ -4719,9 +4257,17 @@ async def list_gmvmax_creative_assets_route(
     page: int = Query(1, ge=1),
     page_size: int = Query(24, ge=1, le=1000),
     offset: Optional[int] = Query(None, ge=0),
+    cursor: Optional[str] = Query(None, max_length=32),
+    hermes_tier: Optional[List[str]] = Query(None),
+    selectable_only: bool = Query(False),
     context: GMVMaxRouteContext = Depends(get_route_context),
 ) -> dict[str, Any]:
-    """Return GMV Max video candidates for manual validation campaigns."""
+    """Return GMV Max video candidates for manual validation campaigns.
+
+    Store-wide and single-product requests page through the precomputed
+    Hermes leaderboard; ``cursor`` is the ``page_info.next_cursor`` of the
+    previous page.  Campaign and multi-product scopes are ranked live.
+    """
 
     db = context.db
     effective_advertiser_id, effective_store_id = _validate_bound_scope(
@@ -4799,48 +4345,6 @@ async def list_gmvmax_creative_assets_route(
         advertiser_id=str(effective_advertiser_id),
     ) - timedelta(days=int(lookback_days))
     has_item_group_filter = bool(normalized_item_group_ids)
-    metric_item_filter = (
-        "and item_group_id in :item_group_ids" if has_item_group_filter else ""
-    )
-    metric_campaign_filter = (
-        "and campaign_id=:campaign_id" if normalized_campaign_id else ""
-    )
-    partition_active_expression = (
-        """
-        case when exists (
-          select 1
-          from gmvmax_creative_asset_products active_ap
-          where active_ap.workspace_id=a.workspace_id
-            and active_ap.auth_id=a.auth_id
-            and active_ap.advertiser_id=a.advertiser_id
-            and active_ap.store_id=a.store_id
-            and active_ap.item_id=a.item_id
-            and active_ap.item_group_id in :item_group_ids
-        ) then 1 else 0 end
-        """
-        if has_item_group_filter
-        else "1"
-    )
-    asset_item_filter = (
-        """
-        and (
-          m.item_group_id in :item_group_ids
-          or exists (
-            select 1
-            from gmvmax_creative_asset_products ap
-            where ap.workspace_id=a.workspace_id
-              and ap.auth_id=a.auth_id
-              and ap.advertiser_id=a.advertiser_id
-              and ap.store_id=a.store_id
-              and ap.item_id=a.item_id
-              and ap.item_group_id in :item_group_ids
-          )
-        )
-        """
-        if has_item_group_filter
-        else ""
-    )
-
     # GET is database-only. Explicit refreshes are handled by the POST endpoint.
     upload_sync_result: dict[str, Any] | None = None
     sync_result: dict[str, Any] | None = (
@@ -4849,158 +4353,153 @@ async def list_gmvmax_creative_assets_route(
         else None
     )
 
-    creative_assets_stmt = text(
-        f"""
-            with metrics as (
-                select creative_id,
-                       max(item_group_id) as item_group_id,
-                       sum(coalesce(nullif(net_cost_cents, 0), cost_cents, 0)) as cost_cents,
-                       sum(coalesce(gross_revenue_cents, 0)) as gross_revenue_cents,
-                       sum(coalesce(orders, 0)) as orders,
-                       sum(coalesce(clicks, 0)) as clicks,
-                       sum(coalesce(impressions, product_impressions, 0)) as impressions,
-                       sum(coalesce(product_clicks, 0)) as product_clicks,
-                       sum(coalesce(product_impressions, 0)) as product_impressions,
-                       max(ad_video_view_rate_2s) as ad_video_view_rate_2s,
-                       max(ad_video_view_rate_6s) as ad_video_view_rate_6s,
-                       max(ad_video_view_rate_p100) as ad_video_view_rate_p100
-                from gmvmax_product_creative_metrics_daily
-                where workspace_id=:workspace_id
-                  and auth_id=:auth_id
-                  and advertiser_id=:advertiser_id
-                  and store_id=:store_id
-                  and stat_time_day >= :metric_start_date
-                  {metric_campaign_filter}
-                  {metric_item_filter}
-                group by creative_id
-            )
-            select a.id, a.workspace_id, a.auth_id, a.advertiser_id,
-                   a.item_id,
-                   coalesce(m.item_group_id, a.item_group_id) as item_group_id,
-                   a.video_id, a.title, a.preview_url, a.video_cover_url,
-                   a.local_preview_path, a.local_cover_path,
-                   a.preview_content_type, a.cover_content_type, a.media_cache_status,
-                   a.duration,
-                    a.identity_id, a.identity_type,
-                    coalesce(
-                      json_unquote(json_extract(a.raw_json, '$.identity_info.identity_authorized_bc_id')),
-                      json_unquote(json_extract(a.raw_json, '$.identity_authorized_bc_id'))
-                    ) as identity_authorized_bc_id,
-                    coalesce(
-                      json_unquote(json_extract(a.raw_json, '$.identity_info.identity_authorized_shop_id')),
-                      json_unquote(json_extract(a.raw_json, '$.identity_authorized_shop_id'))
-                    ) as identity_authorized_shop_id,
-                    json_unquote(json_extract(a.raw_json, '$.can_change_anchor')) as can_change_anchor,
-                    coalesce(
-                      json_unquote(json_extract(a.raw_json, '$._gmv_ops_sync.active')),
-                      'true'
-                    ) as cache_active,
-                    {partition_active_expression} as partition_active,
-                    a.identity_name, a.store_id, a.fetched_at, a.updated_at,
-                   coalesce(m.cost_cents, 0) as cost_cents,
-                   coalesce(m.gross_revenue_cents, 0) as gross_revenue_cents,
-                   coalesce(m.orders, 0) as orders,
-                   coalesce(m.clicks, 0) as clicks,
-                   coalesce(m.impressions, 0) as impressions,
-                   coalesce(m.product_clicks, 0) as product_clicks,
-                   coalesce(m.product_impressions, 0) as product_impressions,
-                   coalesce(m.ad_video_view_rate_2s, 0) as ad_video_view_rate_2s,
-                   coalesce(m.ad_video_view_rate_6s, 0) as ad_video_view_rate_6s,
-                   coalesce(m.ad_video_view_rate_p100, 0) as ad_video_view_rate_p100
-            from gmvmax_creative_asset_cache a
-            left join metrics m
-              on m.creative_id collate utf8mb4_0900_ai_ci
-               = a.item_id collate utf8mb4_0900_ai_ci
-            where a.workspace_id=:workspace_id
-              and a.auth_id=:auth_id
-              and a.advertiser_id=:advertiser_id
-              and a.store_id=:store_id
-              {asset_item_filter}
-            order by
-              case when coalesce(m.cost_cents, 0) > 0 then 0 else 1 end,
-              coalesce(m.gross_revenue_cents, 0) / greatest(coalesce(m.cost_cents, 0), 1) desc,
-              coalesce(m.orders, 0) desc,
-              coalesce(m.cost_cents, 0) desc,
-              a.updated_at desc,
-              a.item_id asc
-            """
-    )
-    if has_item_group_filter:
-        creative_assets_stmt = creative_assets_stmt.bindparams(
-            bindparam("item_group_ids", expanding=True)
-        )
-    rows = db.execute(
-        creative_assets_stmt,
-        {
-            "workspace_id": workspace_id,
-            "auth_id": auth_id,
-            "advertiser_id": str(effective_advertiser_id),
-            "store_id": str(effective_store_id),
-            "metric_start_date": metric_start_date,
-            "campaign_id": normalized_campaign_id,
-            "item_group_ids": normalized_item_group_ids,
-        },
-    ).mappings().all()
-    candidates = [_creative_asset_candidate_from_row(row) for row in rows]
-    try:
-        historical_removed = {
-            creative_id
-            for creative_id, _ in _load_historical_removed_creatives(
-                db,
-                workspace_id=workspace_id,
-                auth_id=auth_id,
-                advertiser_id=str(effective_advertiser_id),
-                store_id=str(effective_store_id),
-                item_group_ids=normalized_item_group_ids or None,
-            )
-        }
-    except Exception:  # noqa: BLE001 - optional enrichment must not break candidate loading
-        logger.exception(
-            "Failed to load historical removed creatives for candidate ranking",
-            extra={"item_group_ids": normalized_item_group_ids},
-        )
-        db.rollback()
-        historical_removed = set()
-    for candidate in candidates:
-        candidate["historically_excluded"] = str(candidate.get("item_id") or "") in historical_removed
-
-    product_price, product_price_source = _product_price_for_hermes(
-        db,
-        workspace_id=workspace_id,
-        auth_id=auth_id,
-        store_id=str(effective_store_id),
-        item_group_id=str(item_group_id) if item_group_id else None,
-    )
-    try:
-        candidates, hermes_summary = rank_creative_candidates(
-            candidates,
-            product_price=product_price,
-            minimum_roi=0.8,
-            recommendation_limit=4,
-        )
-    except Exception:  # noqa: BLE001 - ranking is advisory; candidates should still load
-        logger.exception(
-            "Hermes creative ranking failed",
-            extra={"item_group_id": str(item_group_id) if item_group_id else None},
-        )
-        hermes_summary = {
-            "model": "HERMES_PERFORMANCE_RANKER_V1",
-            "status": "ranking_failed",
-            "evaluated": len(candidates),
-            "recommended": 0,
-            "product_price": product_price,
-            "minimum_roi": 0.8,
-            "has_proven_winners": False,
-        }
-    total_number = len(candidates)
     effective_offset = (
         int(offset)
         if offset is not None
         else (int(page) - 1) * int(page_size)
     )
-    paged_candidates = candidates[
-        effective_offset : effective_offset + int(page_size)
-    ]
+    after_position = (
+        int(cursor)
+        if isinstance(cursor, str) and cursor.strip().isdigit()
+        else None
+    )
+    requested_tiers = {
+        str(item).strip().upper()
+        for item in (hermes_tier if isinstance(hermes_tier, (list, tuple, set)) else [])
+        if str(item or "").strip()
+    }
+    selectable_only = selectable_only is True
+    single_item_group_id = (
+        item_group_id.strip()
+        if isinstance(item_group_id, str) and item_group_id.strip()
+        else None
+    )
+    leaderboard_key: str | None = None
+    if not normalized_campaign_id:
+        if not normalized_item_group_ids:
+            leaderboard_key = CREATIVE_LEADERBOARD_STORE_WIDE_KEY
+        elif normalized_item_group_ids == [single_item_group_id]:
+            leaderboard_key = single_item_group_id
+    board_page = (
+        _creative_leaderboard_page(
+            db,
+            board={
+                "workspace_id": int(workspace_id),
+                "auth_id": int(auth_id),
+                "advertiser_id": str(effective_advertiser_id),
+                "store_id": str(effective_store_id),
+                "item_group_key": leaderboard_key,
+                "lookback_days": int(lookback_days),
+            },
+            metric_start_date=metric_start_date,
+            limit=int(page_size),
+            offset=effective_offset,
+            after_position=after_position,
+            tiers=sorted(requested_tiers),
+            selectable_only=selectable_only,
+        )
+        if leaderboard_key is not None
+        else None
+    )
+    if board_page is not None:
+        paged_candidates = board_page["items"]
+        has_more = bool(board_page["has_more"])
+        next_cursor = board_page["next_cursor"]
+        total_number = int(board_page["total"])
+        hermes_summary = dict(board_page["summary"])
+        historically_excluded_count = int(board_page["historically_excluded_count"])
+        product_price_source = board_page["product_price_source"]
+        manual_selection_ready = int(board_page["selectable_count"]) > 0
+        ranking_source = "leaderboard"
+        refreshed_at = board_page["refreshed_at"]
+    else:
+        creative_assets_stmt = _creative_candidate_statement(
+            has_item_group_filter=has_item_group_filter,
+            has_campaign_filter=bool(normalized_campaign_id),
+        )
+        rows = db.execute(
+            creative_assets_stmt,
+            {
+                "workspace_id": workspace_id,
+                "auth_id": auth_id,
+                "advertiser_id": str(effective_advertiser_id),
+                "store_id": str(effective_store_id),
+                "metric_start_date": metric_start_date,
+                "campaign_id": normalized_campaign_id,
+                "item_group_ids": normalized_item_group_ids,
+            },
+        ).mappings().all()
+        candidates = [_creative_asset_candidate_from_row(row) for row in rows]
+        try:
+            historical_removed = {
+                creative_id
+                for creative_id, _ in _load_historical_removed_creatives(
+                    db,
+                    workspace_id=workspace_id,
+                    auth_id=auth_id,
+                    advertiser_id=str(effective_advertiser_id),
+                    store_id=str(effective_store_id),
+                    item_group_ids=normalized_item_group_ids or None,
+                )
+            }
+        except Exception:  # noqa: BLE001 - optional enrichment must not break candidate loading
+            logger.exception(
+                "Failed to load historical removed creatives for candidate ranking",
+                extra={"item_group_ids": normalized_item_group_ids},
+            )
+            db.rollback()
+            historical_removed = set()
+        for candidate in candidates:
+            candidate["historically_excluded"] = str(candidate.get("item_id") or "") in historical_removed
+
+        product_price, product_price_source = _product_price_for_hermes(
+            db,
+            workspace_id=workspace_id,
+            auth_id=auth_id,
+            store_id=str(effective_store_id),
+            item_group_id=str(item_group_id) if item_group_id else None,
+        )
+        try:
+            candidates, hermes_summary = rank_creative_candidates(
+                candidates,
+                product_price=product_price,
+                minimum_roi=0.8,
+                recommendation_limit=4,
+            )
+        except Exception:  # noqa: BLE001 - ranking is advisory; candidates should still load
+            logger.exception(
+                "Hermes creative ranking failed",
+                extra={"item_group_id": str(item_group_id) if item_group_id else None},
+            )
+            hermes_summary = {
+                "model": "HERMES_PERFORMANCE_RANKER_V1",
+                "status": "ranking_failed",
+                "evaluated": len(candidates),
+                "recommended": 0,
+                "product_price": product_price,
+                "minimum_roi": 0.8,
+                "has_proven_winners": False,
+            }
+        positioned = [
+            (position, candidate)
+            for position, candidate in enumerate(candidates, start=1)
+            if (not requested_tiers or str(candidate.get("hermes_tier") or "").upper() in requested_tiers)
+            and (not selectable_only or candidate.get("selectable"))
+        ]
+        total_number = len(positioned)
+        if after_position is not None:
+            positioned = [item for item in positioned if item[0] > after_position]
+            window = positioned[: int(page_size)]
+            has_more = len(positioned) > len(window)
+        else:
+            window = positioned[effective_offset : effective_offset + int(page_size)]
+            has_more = effective_offset + len(window) < len(positioned)
+        paged_candidates = [candidate for _, candidate in window]
+        next_cursor = str(window[-1][0]) if has_more and window else None
+        historically_excluded_count = len(historical_removed)
+        manual_selection_ready = any(item.get("selectable") for item in candidates)
+        ranking_source = "live"
+        refreshed_at = None
 
     upload_rows = db.execute(
         text(
@@ -5055,7 +4554,8 @@ async def list_gmvmax_creative_assets_route(
             "offset": effective_offset,
             "total_number": total_number,
             "total_page": total_page,
-            "has_more": effective_offset + len(paged_candidates) < total_number,
+            "has_more": has_more,
+            "next_cursor": next_cursor,
         },
         "upload_sync": upload_sync_result,
         "sync": sync_result,
@@ -5063,13 +4563,15 @@ async def list_gmvmax_creative_assets_route(
             "campaign_id": normalized_campaign_id,
             "item_group_ids": normalized_item_group_ids,
         },
-        "manual_selection_ready": any(item.get("selectable") for item in candidates),
+        "manual_selection_ready": manual_selection_ready,
         "hermes": {
             **hermes_summary,
             "status": hermes_summary.get("status") or "ok",
             "lookback_days": int(lookback_days),
-            "historically_excluded": len(historical_removed),
+            "historically_excluded": historically_excluded_count,
             "product_price_source": product_price_source,
+            "ranking_source": ranking_source,
+            "refreshed_at": refreshed_at.isoformat() if refreshed_at else None,
         },
     }
 
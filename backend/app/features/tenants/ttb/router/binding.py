@@ -6,6 +6,7 @@ to refresh and update the configuration for an account.
 
 from __future__ import annotations
 
+import asyncio
 from typing import Optional, Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
@@ -21,6 +22,7 @@ from app.services.ttb_meta import (
     enqueue_meta_sync,
     get_meta_cursor_state,
 )
+from app.services.ttb_meta_cache import gmvmax_options_body, store_gmvmax_options
 from app.services.ttb_binding_config import (
     BindingConfigStorageNotReady,
     get_binding_config,
@@ -113,17 +115,33 @@ async def get_gmv_max_options(
                 "refresh_changed": changed,
             },
         )
+    if not refresh_status:
+        body = await gmvmax_options_body(
+            db,
+            workspace_id=workspace_id,
+            auth_id=auth_id,
+            etag=etag,
+            fallback_synced_at=cursor_state.updated_at,
+        )
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"ETag": f'"{etag}"'},
+        )
     db.expire_all()
-    payload: Dict[str, Any] = build_gmvmax_options(
+    payload: Dict[str, Any] = await asyncio.to_thread(
+        build_gmvmax_options,
         db,
         workspace_id=workspace_id,
         auth_id=auth_id,
         fallback_synced_at=cursor_state.updated_at,
     )
-    if refresh_status:
-        payload["refresh"] = refresh_status
-        if refresh_status == "timeout" and idempotency_key:
-            payload["idempotency_key"] = idempotency_key
+    await store_gmvmax_options(
+        workspace_id=workspace_id, auth_id=auth_id, etag=etag, payload=payload
+    )
+    payload["refresh"] = refresh_status
+    if refresh_status == "timeout" and idempotency_key:
+        payload["idempotency_key"] = idempotency_key
     response = JSONResponse(payload)
     response.headers["ETag"] = f'"{etag}"'
     return response
@@ -1,8 +1,10 @@
 """Utilities for cleaning up GMV Max campaign metric and snapshot tables.
 
-The cleanup runs in batches to avoid wide locking and is intended to be invoked
-from a scheduled Celery task. Retention windows are configurable so the task can
-be tuned per-environment.
+Expiry goes through ``app.gmvmax.services.retention.RetentionEngine``, which
+drops whole partitions where a table is range partitioned by date and
+otherwise deletes in small throttled batches to avoid wide locking.  It is
+intended to be invoked from a scheduled Celery task. Retention windows are
+configurable so the task can be tuned per-environment.
 """
 
 from __future__ import annotations
@@ -10,9 +12,8 @@ from __future__ import annotations
 import logging
 import time
 from datetime import date, datetime, timedelta
-from typing import Callable
 
-from sqlalchemy import select
+from sqlalchemy import and_, column, table
 from sqlalchemy.orm import Session
 
 from app.data.models.gmv_restructured import GmvCreativeMetrics10Min
@@ -26,39 +27,34 @@ from app.data.models.gmvmax_campaign_snapshots import (
     GmvmaxLiveCampaignSnapshotBatch,
     GmvmaxProductCampaignSnapshotBatch,
 )
-from app.data.models.gmvmax_sync_state import GmvCreative10MinBatchManifest
+from app.data.models.gmvmax_sync_state import (
+    GmvCampaignMetricsDayState,
+    GmvCreative10MinBatchManifest,
+)
+from app.gmvmax.services.retention import RetentionEngine, RetentionTarget, summarize
 
 logger = logging.getLogger("gmv.gmvmax.cleanup")
 
 
-def _delete_in_batches(
-    session: Session,
-    model,
-    *,
-    cutoff_value,
-    cutoff_column: Callable[[object], object],
-    batch_size: int = 10_000,
-) -> int:
-    deleted_total = 0
-    while True:
-        ids = (
-            session.execute(
-                select(model.id)
-                .where(cutoff_column(model) < cutoff_value)
-                .order_by(cutoff_column(model), model.id)
-                .limit(batch_size)
-            )
-            .scalars()
-            .all()
-        )
-        if not ids:
-            break
-        deleted = (
-            session.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
-        )
-        session.commit()
-        deleted_total += int(deleted)
-    return deleted_total
+# Smart Guard re-evaluates a held campaign every minute and writes a
+# HOLD/SKIPPED heartbeat at most every ten minutes; only those rows expire.
+# Mutations and creative-guard events are history read by later decisions.
+_guard_events = table(
+    "gmv_campaign_guard_events",
+    column("id"),
+    column("created_at"),
+    column("event_type"),
+    column("action"),
+    column("result"),
+)
+
+
+def _guard_heartbeats(events) -> object:
+    return and_(
+        events.c.event_type == "SMART_GUARD",
+        events.c.action == "HOLD",
+        events.c.result == "SKIPPED",
+    )
 
 
 def cleanup_campaign_tables(
@@ -69,8 +65,16 @@ def cleanup_campaign_tables(
     daily_retention_days: int = 730,
     snapshot_retention_days: int = 90,
     creative_10min_retention_days: int = 90,
+    guard_heartbeat_retention_days: int | None = None,
+    engine: RetentionEngine | None = None,
 ) -> dict:
-    """Delete expired campaign facts, snapshots, and creative batch watermarks."""
+    """Delete expired campaign facts, snapshots, and creative batch watermarks.
+
+    Tables range partitioned on their date column lose whole partitions;
+    the rest are swept in throttled keyset batches (see
+    :mod:`app.gmvmax.services.retention`).  Guard heartbeats are only expired
+    when ``guard_heartbeat_retention_days`` is given.
+    """
 
     started = time.monotonic()
     clock = now or datetime.utcnow()
@@ -83,70 +87,85 @@ def cleanup_campaign_tables(
         days=creative_10min_retention_days
     )
 
-    deleted_hourly_prod = _delete_in_batches(
-        session,
-        GmvmaxProductCampaignMetricsHourly,
-        cutoff_value=hourly_cutoff,
-        cutoff_column=lambda model: model.stat_time_hour,
-    )
-    deleted_hourly_live = _delete_in_batches(
-        session,
-        GmvmaxLiveCampaignMetricsHourly,
-        cutoff_value=hourly_cutoff,
-        cutoff_column=lambda model: model.stat_time_hour,
-    )
-    deleted_daily_prod = _delete_in_batches(
-        session,
-        GmvmaxProductCampaignMetricsDaily,
-        cutoff_value=daily_cutoff,
-        cutoff_column=lambda model: model.stat_time_day,
-    )
-    deleted_daily_live = _delete_in_batches(
-        session,
-        GmvmaxLiveCampaignMetricsDaily,
-        cutoff_value=daily_cutoff,
-        cutoff_column=lambda model: model.stat_time_day,
-    )
-    deleted_snapshots_prod = _delete_in_batches(
-        session,
-        GmvmaxProductCampaignSnapshotBatch,
-        cutoff_value=snapshot_cutoff,
-        cutoff_column=lambda model: model.snapshot_at,
-    )
-    deleted_snapshots_live = _delete_in_batches(
-        session,
-        GmvmaxLiveCampaignSnapshotBatch,
-        cutoff_value=snapshot_cutoff,
-        cutoff_column=lambda model: model.snapshot_at,
-    )
-    # Remove manifests first so a crash between the two bounded sweeps leaves
-    # orphaned detail rows fail-closed rather than readable without a watermark.
-    # Both tables use the exact same snapshot cutoff.
-    deleted_creative_10min_manifests = _delete_in_batches(
-        session,
-        GmvCreative10MinBatchManifest,
-        cutoff_value=creative_10min_cutoff,
-        cutoff_column=lambda model: model.snapshot_at,
-    )
-    deleted_creative_10min_metrics = _delete_in_batches(
-        session,
-        GmvCreativeMetrics10Min,
-        cutoff_value=creative_10min_cutoff,
-        cutoff_column=lambda model: model.snapshot_at,
-    )
+    targets = [
+        RetentionTarget(
+            "hourly_prod",
+            GmvmaxProductCampaignMetricsHourly.__table__,
+            "stat_time_hour",
+            hourly_cutoff,
+        ),
+        RetentionTarget(
+            "hourly_live",
+            GmvmaxLiveCampaignMetricsHourly.__table__,
+            "stat_time_hour",
+            hourly_cutoff,
+        ),
+        RetentionTarget(
+            "daily_prod",
+            GmvmaxProductCampaignMetricsDaily.__table__,
+            "stat_time_day",
+            daily_cutoff,
+        ),
+        RetentionTarget(
+            "daily_live",
+            GmvmaxLiveCampaignMetricsDaily.__table__,
+            "stat_time_day",
+            daily_cutoff,
+        ),
+        RetentionTarget(
+            "campaign_day_states",
+            GmvCampaignMetricsDayState.__table__,
+            "stat_time_day",
+            daily_cutoff,
+        ),
+        RetentionTarget(
+            "snapshots_prod",
+            GmvmaxProductCampaignSnapshotBatch.__table__,
+            "snapshot_at",
+            snapshot_cutoff,
+        ),
+        RetentionTarget(
+            "snapshots_live",
+            GmvmaxLiveCampaignSnapshotBatch.__table__,
+            "snapshot_at",
+            snapshot_cutoff,
+        ),
+        # Remove manifests first so a crash between the two bounded sweeps leaves
+        # orphaned detail rows fail-closed rather than readable without a watermark.
+        # Both tables use the exact same snapshot cutoff.
+        RetentionTarget(
+            "creative_10min_manifests",
+            GmvCreative10MinBatchManifest.__table__,
+            "snapshot_at",
+            creative_10min_cutoff,
+        ),
+        RetentionTarget(
+            "creative_10min_metrics",
+            GmvCreativeMetrics10Min.__table__,
+            "snapshot_at",
+            creative_10min_cutoff,
+        ),
+    ]
+    guard_heartbeat_cutoff = None
+    if guard_heartbeat_retention_days is not None:
+        guard_heartbeat_cutoff = clock - timedelta(days=guard_heartbeat_retention_days)
+        targets.append(
+            RetentionTarget(
+                "guard_heartbeats",
+                _guard_events,
+                "created_at",
+                guard_heartbeat_cutoff,
+                where=_guard_heartbeats,
+            )
+        )
+
+    results = (engine or RetentionEngine(session)).run(targets)
 
     elapsed = time.monotonic() - started
-    summary = {
-        "hourly_prod": deleted_hourly_prod,
-        "hourly_live": deleted_hourly_live,
-        "daily_prod": deleted_daily_prod,
-        "daily_live": deleted_daily_live,
-        "snapshots_prod": deleted_snapshots_prod,
-        "snapshots_live": deleted_snapshots_live,
-        "creative_10min_manifests": deleted_creative_10min_manifests,
-        "creative_10min_metrics": deleted_creative_10min_metrics,
-        "elapsed_seconds": elapsed,
-    }
+    summary: dict = {result.name: result.rows for result in results}
+    summary["elapsed_seconds"] = elapsed
+    summary["bytes_reclaimed"] = sum(result.bytes or 0 for result in results)
+    summary["retention"] = summarize(results)
     logger.info(
         "gmvmax campaign cleanup finished",
         extra={
@@ -155,6 +174,9 @@ def cleanup_campaign_tables(
             "daily_cutoff": daily_cutoff.isoformat(),
             "snapshot_cutoff": snapshot_cutoff.isoformat(),
             "creative_10min_cutoff": creative_10min_cutoff.isoformat(),
+            "guard_heartbeat_cutoff": (
+                guard_heartbeat_cutoff.isoformat() if guard_heartbeat_cutoff else None
+            ),
         },
     )
     return summary
@@ -0,0 +1,378 @@
+"""Campaign to item-group relations for GMV Max PRODUCT campaigns.
+
+``gmvmax_product_campaign_item_groups`` is maintained by the catalog sync
+from campaign/info payloads.  Readers resolve item groups for a batch of
+campaigns with :func:`load_campaign_item_groups`, one query on the scoped
+unique key, instead of walking catalog ``raw_json`` on every sync.
+
+Catalog rows written before the relation table existed (or by list-only
+payloads) are converted once: :func:`backfill_campaign_item_groups` parses
+the stored detail/list payloads of the campaigns that still lack relations
+and persists what it finds, and :func:`backfill_catalog_item_group_range`
+does the same for an id range of the whole catalog so the conversion can run
+as parallel chunks.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Iterable, Mapping, Sequence
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.data.models.gmvmax_campaign_catalog import (
+    GmvmaxProductCampaignCatalog,
+    GmvmaxProductCampaignItemGroup,
+)
+from app.data.models.gmvmax_creative_metrics import GmvmaxProductCreativeMetricsDaily
+
+logger = logging.getLogger("gmv.gmvmax.campaign_item_groups")
+
+# Stays well below MySQL's placeholder limits while keeping one round trip
+# for every realistic store.
+LOOKUP_CHUNK_SIZE = 1000
+
+_ID_KEYS = {"item_group_id", "item_group_ids", "item_id", "item_ids"}
+_GROUP_KEYS = {"item_group", "item_groups", "item_group_list", "item_list"}
+
+
+def _dedupe(values: Iterable[Any]) -> list[str]:
+    return list(dict.fromkeys(text for text in (str(v).strip() for v in values if v) if text))
+
+
+def extract_item_group_ids(raw: Any) -> list[str]:
+    """Collect item-group IDs from a stored campaign payload of any shape."""
+
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return []
+    ids: list[str] = []
+
+    def _walk(value: Any, key_hint: str | None = None) -> None:
+        if value is None:
+            return
+        if isinstance(value, (str, int)):
+            if key_hint in _ID_KEYS:
+                ids.append(str(value))
+            return
+        if isinstance(value, list):
+            for item in value:
+                _walk(item, key_hint=key_hint)
+            return
+        if not isinstance(value, Mapping):
+            return
+
+        for key, child in value.items():
+            key_text = str(key)
+            if key_text in _ID_KEYS:
+                _walk(child, key_hint=key_text)
+                continue
+            if key_text in _GROUP_KEYS:
+                _walk(child, key_hint="item_group_id")
+                continue
+            _walk(child, key_hint=None)
+
+    _walk(raw)
+    return _dedupe(ids)
+
+
+def _chunks(values: Sequence[str], size: int = LOOKUP_CHUNK_SIZE) -> Iterable[list[str]]:
+    for start in range(0, len(values), size):
+        yield list(values[start : start + size])
+
+
+def load_campaign_item_groups(
+    session: Session,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    campaign_ids: Sequence[str],
+    include_observed: bool = False,
+) -> dict[str, list[str]]:
+    """Return ``{campaign_id: [item_group_id, ...]}`` for mapped campaigns.
+
+    ``include_observed`` adds item groups seen in daily creative facts, which
+    can trail a campaign edit that the catalog has not picked up yet.
+    Campaigns without any relation are absent from the result.
+    """
+
+    requested = _dedupe(campaign_ids)
+    resolved: dict[str, list[str]] = defaultdict(list)
+    if not requested:
+        return {}
+    relation = GmvmaxProductCampaignItemGroup
+    sources = [(relation, relation.id)]
+    if include_observed:
+        creative = GmvmaxProductCreativeMetricsDaily
+        sources.append((creative, None))
+    for model, order_column in sources:
+        for chunk in _chunks(requested):
+            statement = select(model.campaign_id, model.item_group_id).where(
+                model.workspace_id == int(workspace_id),
+                model.auth_id == int(auth_id),
+                model.advertiser_id == str(advertiser_id),
+                model.store_id == str(store_id),
+                model.campaign_id.in_(chunk),
+                model.item_group_id.is_not(None),
+            )
+            statement = (
+                statement.order_by(order_column)
+                if order_column is not None
+                else statement.distinct()
+            )
+            for campaign_id, item_group_id in session.execute(statement):
+                resolved[str(campaign_id)].append(str(item_group_id))
+    return {
+        campaign_id: _dedupe(resolved[campaign_id])
+        for campaign_id in requested
+        if resolved.get(campaign_id)
+    }
+
+
+def _insert_relations(
+    session: Session,
+    relations: Mapping[tuple[int, int, str, str, str], Sequence[str]],
+) -> int:
+    """Add relation rows for ``(scope..., campaign_id) -> item groups``.
+
+    Campaigns that already have relations are left alone: the catalog sync
+    owns those and prunes them against complete campaign/info snapshots.
+    """
+
+    if not relations:
+        return 0
+    relation = GmvmaxProductCampaignItemGroup
+    scope_columns = (
+        relation.workspace_id,
+        relation.auth_id,
+        relation.advertiser_id,
+        relation.store_id,
+        relation.campaign_id,
+    )
+    keys = list(relations)
+    mapped: set[tuple[Any, ...]] = set()
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        rows = session.execute(
+            select(*scope_columns)
+            .where(tuple_(*scope_columns).in_(keys[start : start + LOOKUP_CHUNK_SIZE]))
+            .distinct()
+        )
+        mapped.update(
+            (int(w), int(a), str(adv), str(store), str(cid)) for w, a, adv, store, cid in rows
+        )
+    inserted = 0
+    for key, item_group_ids in relations.items():
+        if key in mapped:
+            continue
+        for item_group_id in item_group_ids:
+            workspace_id, auth_id, advertiser_id, store_id, campaign_id = key
+            session.add(
+                relation(
+                    workspace_id=workspace_id,
+                    auth_id=auth_id,
+                    advertiser_id=advertiser_id,
+                    store_id=store_id,
+                    campaign_id=campaign_id,
+                    item_group_id=item_group_id,
+                )
+            )
+            inserted += 1
+    if inserted:
+        session.flush()
+    return inserted
+
+
+def backfill_campaign_item_groups(
+    session: Session,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    campaign_ids: Sequence[str],
+    extra_payloads: Mapping[str, Sequence[Any]] | None = None,
+) -> dict[str, list[str]]:
+    """Persist relations parsed from stored payloads of unmapped campaigns.
+
+    Reads the catalog ``detail_raw_json``/``list_raw_json`` of
+    ``campaign_ids`` (plus any ``extra_payloads`` per campaign, such as the
+    legacy campaign row) and returns the item groups found per campaign.
+    """
+
+    requested = _dedupe(campaign_ids)
+    if not requested:
+        return {}
+    catalog = GmvmaxProductCampaignCatalog
+    payloads: dict[str, list[Any]] = defaultdict(list)
+    for campaign_id, values in (extra_payloads or {}).items():
+        payloads[str(campaign_id)].extend(values)
+    for chunk in _chunks(requested):
+        rows = session.execute(
+            select(catalog.campaign_id, catalog.detail_raw_json, catalog.list_raw_json).where(
+                catalog.workspace_id == int(workspace_id),
+                catalog.auth_id == int(auth_id),
+                catalog.advertiser_id == str(advertiser_id),
+                catalog.store_id == str(store_id),
+                catalog.campaign_id.in_(chunk),
+            )
+        )
+        for campaign_id, detail_raw_json, list_raw_json in rows:
+            payloads[str(campaign_id)].extend((detail_raw_json, list_raw_json))
+
+    found: dict[str, list[str]] = {}
+    for campaign_id in requested:
+        item_group_ids = _dedupe(
+            item
+            for payload in payloads.get(campaign_id, ())
+            for item in extract_item_group_ids(payload)
+        )
+        if item_group_ids:
+            found[campaign_id] = item_group_ids
+    inserted = _insert_relations(
+        session,
+        {
+            (int(workspace_id), int(auth_id), str(advertiser_id), str(store_id), campaign_id): ids
+            for campaign_id, ids in found.items()
+        },
+    )
+    if inserted:
+        logger.info(
+            "gmvmax campaign item groups backfilled from catalog detail",
+            extra={
+                "workspace_id": workspace_id,
+                "auth_id": auth_id,
+                "advertiser_id": advertiser_id,
+                "store_id": store_id,
+                "campaigns": len(found),
+                "inserted": inserted,
+            },
+        )
+    return found
+
+
+def resolve_campaign_item_groups(
+    session: Session,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    campaign_ids: Sequence[str],
+    include_observed: bool = False,
+    extra_payloads: Mapping[str, Sequence[Any]] | None = None,
+) -> dict[str, list[str]]:
+    """Load mapped item groups, converting stored payloads only for the rest."""
+
+    scope = {
+        "workspace_id": workspace_id,
+        "auth_id": auth_id,
+        "advertiser_id": advertiser_id,
+        "store_id": store_id,
+    }
+    resolved = load_campaign_item_groups(
+        session,
+        **scope,
+        campaign_ids=campaign_ids,
+        include_observed=include_observed,
+    )
+    missing = [campaign_id for campaign_id in _dedupe(campaign_ids) if campaign_id not in resolved]
+    if missing:
+        resolved.update(
+            backfill_campaign_item_groups(
+                session,
+                **scope,
+                campaign_ids=missing,
+                extra_payloads=extra_payloads,
+            )
+        )
+    return resolved
+
+
+def catalog_id_bounds(session: Session) -> tuple[int, int] | None:
+    """Return the ``(min, max)`` catalog primary key, or ``None`` when empty."""
+
+    catalog = GmvmaxProductCampaignCatalog
+    low = session.execute(select(catalog.id).order_by(catalog.id.asc()).limit(1)).scalar()
+    high = session.execute(select(catalog.id).order_by(catalog.id.desc()).limit(1)).scalar()
+    if low is None or high is None:
+        return None
+    return int(low), int(high)
+
+
+def backfill_catalog_item_group_range(
+    session: Session,
+    *,
+    start_id: int,
+    end_id: int,
+    batch_size: int = 500,
+) -> dict[str, int]:
+    """Convert catalog payloads with ``start_id <= id < end_id`` into relations.
+
+    Ranges are disjoint by catalog row, and a catalog row owns one campaign
+    scope, so concurrent ranges never insert the same relation.  Each batch
+    is flushed; the caller commits.
+    """
+
+    catalog = GmvmaxProductCampaignCatalog
+    scanned = 0
+    converted = 0
+    inserted = 0
+    last_id = int(start_id) - 1
+    while True:
+        rows = session.execute(
+            select(
+                catalog.id,
+                catalog.workspace_id,
+                catalog.auth_id,
+                catalog.advertiser_id,
+                catalog.store_id,
+                catalog.campaign_id,
+                catalog.detail_raw_json,
+                catalog.list_raw_json,
+            )
+            .where(catalog.id > last_id, catalog.id < int(end_id))
+            .order_by(catalog.id)
+            .limit(max(1, int(batch_size)))
+        ).all()
+        if not rows:
+            break
+        last_id = int(rows[-1].id)
+        scanned += len(rows)
+        relations: dict[tuple[int, int, str, str, str], list[str]] = {}
+        for row in rows:
+            if not row.store_id or not row.campaign_id:
+                continue
+            item_group_ids = _dedupe(
+                item
+                for payload in (row.detail_raw_json, row.list_raw_json)
+                for item in extract_item_group_ids(payload)
+            )
+            if item_group_ids:
+                key = (
+                    int(row.workspace_id),
+                    int(row.auth_id),
+                    str(row.advertiser_id),
+                    str(row.store_id),
+                    str(row.campaign_id),
+                )
+                relations[key] = item_group_ids
+        converted += len(relations)
+        inserted += _insert_relations(session, relations)
+    return {"scanned": scanned, "campaigns": converted, "inserted": inserted}
+
+
+__all__ = [
+    "backfill_campaign_item_groups",
+    "backfill_catalog_item_group_range",
+    "catalog_id_bounds",
+    "extract_item_group_ids",
+    "load_campaign_item_groups",
+    "resolve_campaign_item_groups",
+]
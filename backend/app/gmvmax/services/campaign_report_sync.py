@@ -2,13 +2,22 @@
 
 The functions here implement idempotent MySQL upserts for the new GMV Max
 campaign fact tables and snapshot caches using TikTok report/get responses.
+
+Each fetched campaign day is fingerprinted in ``gmv_campaign_metrics_day_state``
+together with its settlement flag.  Days that were fetched after settling (and
+whose stored facts still match the recorded row count) are left out of later
+report requests, and a day whose fingerprint is unchanged is not upserted
+again.  :class:`CampaignSyncStats` reports what a cycle fetched and wrote.
 """
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
 import logging
-from dataclasses import dataclass
+from collections import defaultdict
+from dataclasses import asdict, dataclass
 from datetime import date, datetime, timedelta
 from typing import Any, Iterable, Mapping, Sequence
 
@@ -34,6 +43,7 @@ from app.data.models.gmvmax_campaign_snapshots import (
     GmvmaxProductCampaignSnapshotBatch,
     GmvmaxProductCampaignSnapshotRow,
 )
+from app.data.models.gmvmax_sync_state import GmvCampaignMetricsDayState
 from app.gmvmax.services.gmvmax_value_parser import (
     money_to_cents,
     parse_stat_time_day,
@@ -150,6 +160,10 @@ _NULL_PRESERVING_FIELDS = {
 }
 
 
+_STORE_WIDE_CAMPAIGN = ""
+_DAY_STATE_UPDATE_FIELDS = ["fingerprint", "row_count", "is_final", "fetched_at", "updated_at"]
+
+
 @dataclass
 class SyncIdentifiers:
     workspace_id: int
@@ -159,6 +173,22 @@ class SyncIdentifiers:
     advertiser_timezone: str | None = None
 
 
+@dataclass
+class CampaignSyncStats:
+    """Counters for one campaign report sync cycle; pass one in to accumulate."""
+
+    requested_days: int = 0
+    settled_days_skipped: int = 0
+    report_pages: int = 0
+    bytes_fetched: int = 0
+    rows_fetched: int = 0
+    rows_written: int = 0
+    rows_unchanged: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
 def _unique_columns(model) -> list[str]:
     unique_sets = []
     for constraint in model.__table__.constraints:
@@ -286,7 +316,21 @@ def _normalize_entry(entry: Any) -> tuple[dict[str, Any], dict[str, Any]]:
     return metrics, dimensions
 
 
-async def _fetch_report_pages(client: TikTokBusinessGMVMaxClient, request: GMVMaxReportGetRequest) -> Iterable[Any]:
+def _entry_bytes(metrics: Mapping[str, Any], dimensions: Mapping[str, Any]) -> int:
+    return len(
+        json.dumps(
+            {"metrics": metrics, "dimensions": dimensions},
+            separators=(",", ":"),
+            default=str,
+        ).encode("utf-8")
+    )
+
+
+async def _fetch_report_pages(
+    client: TikTokBusinessGMVMaxClient,
+    request: GMVMaxReportGetRequest,
+    stats: CampaignSyncStats | None = None,
+) -> Iterable[Any]:
     page = 1
     max_pages = 200
     pagination_state = ReportPaginationState(require_dimensions=True)
@@ -306,6 +350,9 @@ async def _fetch_report_pages(client: TikTokBusinessGMVMaxClient, request: GMVMa
                 await asyncio.sleep(2 ** (attempt - 1))
         data = resp.data or GMVMaxReportData()
         rows = data.list or []
+        if stats is not None:
+            stats.report_pages += 1
+            stats.bytes_fetched += sum(_entry_bytes(*_normalize_entry(row)) for row in rows)
         for row in rows:
             yield row
         has_more = report_page_has_more(
@@ -471,6 +518,224 @@ def _official_report_windows(
     return windows
 
 
+def _fingerprint(parts: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _row_signature(prepared: Mapping[str, Any], fields: Sequence[str]) -> str:
+    return json.dumps(
+        [prepared.get(field) for field in fields],
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+def _report_days(start_date: date, end_date: date) -> list[date]:
+    return [
+        start_date + timedelta(days=offset)
+        for offset in range((end_date - start_date).days + 1)
+    ]
+
+
+def _day_runs(days: Sequence[date]) -> list[tuple[date, date]]:
+    """Collapse sorted days into contiguous ``(first, last)`` runs."""
+
+    runs: list[tuple[date, date]] = []
+    for day in days:
+        if runs and runs[-1][1] + timedelta(days=1) == day:
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+def _load_day_states(
+    session: Session,
+    identifiers: SyncIdentifiers,
+    *,
+    promotion_type: str,
+    granularity: str,
+    start_date: date,
+    end_date: date,
+) -> dict[tuple[str, date], GmvCampaignMetricsDayState]:
+    state = GmvCampaignMetricsDayState
+    rows = session.execute(
+        select(state).where(
+            state.workspace_id == identifiers.workspace_id,
+            state.auth_id == identifiers.auth_id,
+            state.advertiser_id == str(identifiers.advertiser_id),
+            state.store_id == str(identifiers.store_id),
+            state.promotion_type == promotion_type,
+            state.granularity == granularity,
+            state.stat_time_day >= start_date,
+            state.stat_time_day <= end_date,
+        )
+    ).scalars()
+    return {(row.campaign_id, row.stat_time_day): row for row in rows}
+
+
+def _stored_fact_counts(
+    session: Session,
+    model,
+    identifiers: SyncIdentifiers,
+    *,
+    granularity: str,
+    start_date: date,
+    end_date: date,
+) -> dict[tuple[str, date], int]:
+    """Count stored facts per ``(campaign_id, report day)`` in the range."""
+
+    scope = [
+        model.workspace_id == identifiers.workspace_id,
+        model.auth_id == identifiers.auth_id,
+        model.advertiser_id == str(identifiers.advertiser_id),
+        model.store_id == str(identifiers.store_id),
+    ]
+    counts: dict[tuple[str, date], int] = defaultdict(int)
+    if granularity == "DAILY":
+        rows = session.execute(
+            select(model.campaign_id, model.stat_time_day, func.count())
+            .where(
+                *scope,
+                model.stat_time_day >= start_date,
+                model.stat_time_day <= end_date,
+            )
+            .group_by(model.campaign_id, model.stat_time_day)
+        )
+        for campaign_id, stat_day, count in rows:
+            counts[(str(campaign_id), stat_day)] += int(count)
+        return counts
+    rows = session.execute(
+        select(model.campaign_id, model.stat_time_hour).where(
+            *scope,
+            model.stat_time_hour >= datetime.combine(start_date, datetime.min.time()),
+            model.stat_time_hour
+            < datetime.combine(end_date + timedelta(days=1), datetime.min.time()),
+        )
+    )
+    for campaign_id, stat_hour in rows:
+        counts[(str(campaign_id), stat_hour.date())] += 1
+    return counts
+
+
+def _settled_days(
+    days: Sequence[date],
+    *,
+    states: Mapping[tuple[str, date], GmvCampaignMetricsDayState],
+    counts: Mapping[tuple[str, date], int],
+    campaign_ids: Sequence[str],
+) -> set[date]:
+    """Days fetched after settlement whose stored facts are still intact.
+
+    A store-wide state covers every campaign of the day; otherwise each
+    requested campaign needs its own settled state.  The stored row count
+    must match so facts removed since the fetch are requested again.
+    """
+
+    day_totals: dict[date, int] = defaultdict(int)
+    for (_campaign_id, stat_day), count in counts.items():
+        day_totals[stat_day] += count
+
+    def _intact(campaign_id: str, stat_day: date, stored: int) -> bool:
+        state = states.get((campaign_id, stat_day))
+        return state is not None and bool(state.is_final) and state.row_count == stored
+
+    settled: set[date] = set()
+    for day in days:
+        if _intact(_STORE_WIDE_CAMPAIGN, day, day_totals.get(day, 0)):
+            settled.add(day)
+        elif campaign_ids and all(
+            _intact(campaign_id, day, counts.get((campaign_id, day), 0))
+            for campaign_id in campaign_ids
+        ):
+            settled.add(day)
+    return settled
+
+
+def _plan_window_writes(
+    rows: Sequence[Mapping[str, Any]],
+    *,
+    identifiers: SyncIdentifiers,
+    promotion_type: str,
+    granularity: str,
+    days: Sequence[date],
+    campaign_ids: Sequence[str],
+    signature_fields: Sequence[str],
+    day_final: Mapping[date, bool],
+    states: Mapping[tuple[str, date], GmvCampaignMetricsDayState],
+    counts: Mapping[tuple[str, date], int],
+    observed_at: datetime,
+) -> tuple[list[Mapping[str, Any]], list[dict[str, Any]]]:
+    """Split one complete window into rows to upsert and day states to store.
+
+    A campaign day is skipped when its fingerprint and settlement match the
+    stored state and the stored facts still hold the recorded row count.
+    """
+
+    groups: dict[tuple[str, date], list[Mapping[str, Any]]] = {
+        (campaign_id, day): [] for campaign_id in campaign_ids for day in days
+    }
+    for prepared in rows:
+        groups.setdefault((prepared["campaign_id"], prepared["_report_day"]), []).append(prepared)
+
+    to_write: list[Mapping[str, Any]] = []
+    day_parts: dict[date, list[str]] = {day: [] for day in days}
+    day_rows: dict[date, int] = defaultdict(int)
+    pending: list[tuple[str, date, str, int]] = []
+    for (campaign_id, day), group in groups.items():
+        fingerprint = _fingerprint(
+            sorted(_row_signature(prepared, signature_fields) for prepared in group)
+        )
+        state = states.get((campaign_id, day))
+        unchanged = (
+            state is not None
+            and state.fingerprint == fingerprint
+            and bool(state.is_final) == day_final[day]
+            and state.row_count == counts.get((campaign_id, day), 0) == len(group)
+        )
+        if not unchanged:
+            to_write.extend(group)
+            pending.append((campaign_id, day, fingerprint, len(group)))
+        if group:
+            day_parts[day].append(f"{campaign_id}:{fingerprint}")
+            day_rows[day] += len(group)
+    if not campaign_ids:
+        for day in days:
+            fingerprint = _fingerprint(sorted(day_parts[day]))
+            state = states.get((_STORE_WIDE_CAMPAIGN, day))
+            if (
+                state is None
+                or state.fingerprint != fingerprint
+                or bool(state.is_final) != day_final[day]
+                or state.row_count != day_rows[day]
+            ):
+                pending.append((_STORE_WIDE_CAMPAIGN, day, fingerprint, day_rows[day]))
+
+    state_values = [
+        {
+            "workspace_id": identifiers.workspace_id,
+            "auth_id": identifiers.auth_id,
+            "advertiser_id": str(identifiers.advertiser_id),
+            "store_id": str(identifiers.store_id),
+            "promotion_type": promotion_type,
+            "granularity": granularity,
+            "campaign_id": campaign_id,
+            "stat_time_day": day,
+            "fingerprint": fingerprint,
+            "row_count": row_count,
+            "is_final": day_final[day],
+            "fetched_at": observed_at,
+            "updated_at": observed_at,
+        }
+        for campaign_id, day, fingerprint, row_count in pending
+    ]
+    return to_write, state_values
+
+
 async def sync_campaign_metrics(
     session: Session,
     client: TikTokBusinessGMVMaxClient,
@@ -481,7 +746,16 @@ async def sync_campaign_metrics(
     start_date: date,
     end_date: date,
     campaign_ids: Sequence[str] | None = None,
+    force_refresh: bool = False,
+    stats: CampaignSyncStats | None = None,
 ) -> int:
+    """Fetch and upsert campaign facts for the unsettled days of a range.
+
+    ``force_refresh`` requests every day again, settled or not.  Counters are
+    added to ``stats`` when given.
+    """
+
+    stats = stats if stats is not None else CampaignSyncStats()
     clean_campaign_ids = list(
         dict.fromkeys(
             str(item).strip()
@@ -519,16 +793,57 @@ async def sync_campaign_metrics(
         ("LIVE", "HOURLY"): GmvmaxLiveCampaignMetricsHourly,
     }[(promotion_type, granularity)]
     time_column = "stat_time_day" if granularity == "DAILY" else "stat_time_hour"
+    signature_fields = [
+        time_column,
+        *(
+            field
+            for field in METRIC_UPDATE_FIELDS[model]
+            if field not in _FACT_METADATA_UPDATE_FIELDS
+        ),
+    ]
+
+    if start_date > end_date:
+        raise ValueError("start_date must not be after end_date")
+    days = _report_days(start_date, end_date)
+    states = _load_day_states(
+        session,
+        identifiers,
+        promotion_type=promotion_type,
+        granularity=granularity,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    counts = _stored_fact_counts(
+        session,
+        model,
+        identifiers,
+        granularity=granularity,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    settled = (
+        set()
+        if force_refresh
+        else _settled_days(
+            days,
+            states=states,
+            counts=counts,
+            campaign_ids=clean_campaign_ids,
+        )
+    )
+    stats.requested_days += len(days) - len(settled)
+    stats.settled_days_skipped += len(settled)
+    windows = [
+        window
+        for run_start, run_end in _day_runs([day for day in days if day not in settled])
+        for window in _official_report_windows(run_start, run_end, granularity=granularity)
+    ]
 
     rows_synced = 0
-    prepared_rows: list[Mapping[str, Any]] = []
-    reconciliation_stages: list[StagedFactKeySet] = []
+    window_batches: list[tuple[date, date, StagedFactKeySet, list[dict[str, Any]]]] = []
     seen_campaigns: set[str] = set()
-    for window_start, window_end in _official_report_windows(
-        start_date,
-        end_date,
-        granularity=granularity,
-    ):
+    for window_start, window_end in windows:
+        window_rows: list[dict[str, Any]] = []
         stage = StagedFactKeySet(
             model=model,
             time_column=time_column,
@@ -572,7 +887,7 @@ async def sync_campaign_metrics(
                 page=1,
                 page_size=PAGE_SIZE,
             )
-            async for row in _fetch_report_pages(client, request):
+            async for row in _fetch_report_pages(client, request, stats):
                 metrics_block, dims = _normalize_entry(row)
                 prepared = (
                     _prepare_product_metric_row(
@@ -630,46 +945,87 @@ async def sync_campaign_metrics(
                     promotion_type,
                     seen_campaigns,
                 )
-                prepared_rows.append(prepared)
+                window_rows.append(prepared)
                 rows_synced += 1
         # Reaching this line proves the async page generator exhausted without
         # an upstream/pagination exception.
         stage.mark_pagination_complete()
-        reconciliation_stages.append(stage)
+        window_batches.append((window_start, window_end, stage, window_rows))
 
     source_observed_at = utc_now_naive()
     ingested_at = utc_now_naive()
-    for prepared in prepared_rows:
+    prepared_rows: list[Mapping[str, Any]] = []
+    state_rows: list[dict[str, Any]] = []
+    for window_start, window_end, stage, window_rows in window_batches:
         # Hourly windows are issued one advertiser-local day at a time.  This
         # avoids guessing the timezone of a naive ``stat_time_hour``.
-        report_day = prepared.pop("_report_day")
-        is_final, settled_at = settlement_metadata(
-            report_day,
-            source_observed_at=source_observed_at,
-            advertiser_timezone=identifiers.advertiser_timezone,
-        )
-        prepared.update(
-            {
-                "source_observed_at": source_observed_at,
-                "ingested_at": ingested_at,
-                "is_final": is_final,
-                "settled_at": settled_at,
-                "updated_at": ingested_at,
-            }
-        )
+        window_days = _report_days(window_start, window_end)
+        settlement = {
+            day: settlement_metadata(
+                day,
+                source_observed_at=source_observed_at,
+                advertiser_timezone=identifiers.advertiser_timezone,
+            )
+            for day in window_days
+        }
+        for prepared in window_rows:
+            is_final, settled_at = settlement[prepared["_report_day"]]
+            prepared.update(
+                {
+                    "source_observed_at": source_observed_at,
+                    "ingested_at": ingested_at,
+                    "is_final": is_final,
+                    "settled_at": settled_at,
+                    "updated_at": ingested_at,
+                }
+            )
+        if not stage.can_reconcile:
+            # Rows were dropped from this window, so its fingerprints would
+            # not describe what the report returned.
+            to_write, window_states = window_rows, []
+        else:
+            to_write, window_states = _plan_window_writes(
+                window_rows,
+                identifiers=identifiers,
+                promotion_type=promotion_type,
+                granularity=granularity,
+                days=window_days,
+                campaign_ids=clean_campaign_ids,
+                signature_fields=signature_fields,
+                day_final={day: final for day, (final, _settled_at) in settlement.items()},
+                states=states,
+                counts=counts,
+                observed_at=source_observed_at,
+            )
+        for prepared in window_rows:
+            prepared.pop("_report_day")
+        prepared_rows.extend(to_write)
+        state_rows.extend(window_states)
+    stats.rows_fetched += rows_synced
+    stats.rows_written += len(prepared_rows)
+    stats.rows_unchanged += rows_synced - len(prepared_rows)
 
     # Reconcile before upserting so an official status-only/zero row cannot
     # inherit stale metrics through null-preserving update semantics.
-    for stage in reconciliation_stages:
+    for _window_start, _window_end, stage, _rows in window_batches:
         stage.reconcile(session)
 
     if session.bind.dialect.name == "mysql":
         for i in range(0, len(prepared_rows), UPSERT_CHUNK_SIZE):
             chunk = prepared_rows[i : i + UPSERT_CHUNK_SIZE]
             _bulk_upsert_mysql(session, model, chunk, METRIC_UPDATE_FIELDS[model])
+        for i in range(0, len(state_rows), UPSERT_CHUNK_SIZE):
+            _bulk_upsert_mysql(
+                session,
+                GmvCampaignMetricsDayState,
+                state_rows[i : i + UPSERT_CHUNK_SIZE],
+                _DAY_STATE_UPDATE_FIELDS,
+            )
     else:
         for prepared in prepared_rows:
             _upsert(session, model, prepared, METRIC_UPDATE_FIELDS[model])
+        for values in state_rows:
+            _upsert(session, GmvCampaignMetricsDayState, values, _DAY_STATE_UPDATE_FIELDS)
 
     session.flush()
     # Core/MySQL upserts bypass ORM state tracking.  Expire cached facts so a
@@ -687,7 +1043,16 @@ async def sync_campaign_snapshot(
     start_date: date,
     end_date: date,
     snapshot_type: str = "MANUAL",
+    force_refresh: bool = False,
+    stats: CampaignSyncStats | None = None,
 ) -> int:
+    """Replace the snapshot batch of a range unless its rows are unchanged.
+
+    A batch fetched after its whole range settled is reused without a report
+    request; otherwise rows are only rewritten when their fingerprint moved.
+    """
+
+    stats = stats if stats is not None else CampaignSyncStats()
     metrics_list_product = ["cost", "net_cost", "orders", "gross_revenue", "roi", "cost_per_order"]
     metrics_list_live = metrics_list_product + [
         "all_shops_orders",
@@ -722,9 +1087,42 @@ async def sync_campaign_snapshot(
     row_model = (
         GmvmaxProductCampaignSnapshotRow if promotion_type == "PRODUCT" else GmvmaxLiveCampaignSnapshotRow
     )
+    batch_scope = [
+        batch_model.workspace_id == identifiers.workspace_id,
+        batch_model.auth_id == identifiers.auth_id,
+        batch_model.advertiser_id == str(identifiers.advertiser_id),
+        batch_model.store_id == str(identifiers.store_id),
+        batch_model.start_date == start_date,
+        batch_model.end_date == end_date,
+        batch_model.snapshot_type == snapshot_type,
+    ]
+    range_days = (end_date - start_date).days + 1
+
+    if not force_refresh:
+        with session.begin():
+            cached = session.execute(
+                select(batch_model.id, batch_model.rows_fingerprint).where(
+                    *batch_scope,
+                    batch_model.is_final.is_(True),
+                )
+            ).one_or_none()
+            cached_rows = (
+                session.execute(
+                    select(func.count()).select_from(row_model).where(
+                        row_model.batch_id == cached.id
+                    )
+                ).scalar_one()
+                if cached is not None and cached.rows_fingerprint
+                else None
+            )
+        if cached_rows is not None:
+            stats.settled_days_skipped += range_days
+            stats.rows_unchanged += int(cached_rows)
+            return int(cached_rows)
+    stats.requested_days += range_days
 
     rows: list[Mapping[str, Any]] = []
-    async for row in _fetch_report_pages(client, request):
+    async for row in _fetch_report_pages(client, request, stats):
         metrics_block, dims = _normalize_entry(row)
         campaign_id = dims.get("campaign_id")
         if not campaign_id:
@@ -754,9 +1152,23 @@ async def sync_campaign_snapshot(
             )
         rows.append(prepared)
 
+    signature_fields = sorted({field for row in rows for field in row})
+    fingerprint = _fingerprint(sorted(_row_signature(row, signature_fields) for row in rows))
+    is_final, _settled_at = settlement_metadata(
+        end_date,
+        source_observed_at=utc_now_naive(),
+        advertiser_timezone=identifiers.advertiser_timezone,
+    )
+    stats.rows_fetched += len(rows)
+
     for attempt in range(3):
         try:
             with session.begin():
+                previous = session.execute(
+                    select(batch_model.id, batch_model.rows_fingerprint)
+                    .where(*batch_scope)
+                    .with_for_update()
+                ).one_or_none()
                 batch_values = {
                     "workspace_id": identifiers.workspace_id,
                     "auth_id": identifiers.auth_id,
@@ -766,22 +1178,34 @@ async def sync_campaign_snapshot(
                     "end_date": end_date,
                     "snapshot_type": snapshot_type,
                     "snapshot_at": datetime.utcnow(),
+                    "rows_fingerprint": fingerprint,
+                    "is_final": is_final,
                 }
-                _upsert(session, batch_model, batch_values, ["snapshot_at"])
+                _upsert(
+                    session,
+                    batch_model,
+                    batch_values,
+                    ["snapshot_at", "rows_fingerprint", "is_final"],
+                )
 
                 batch = session.execute(
-                    select(batch_model)
-                    .where(batch_model.workspace_id == identifiers.workspace_id)
-                    .where(batch_model.auth_id == identifiers.auth_id)
-                    .where(batch_model.advertiser_id == str(identifiers.advertiser_id))
-                    .where(batch_model.store_id == str(identifiers.store_id))
-                    .where(batch_model.start_date == start_date)
-                    .where(batch_model.end_date == end_date)
-                    .where(batch_model.snapshot_type == snapshot_type)
-                    .with_for_update()
+                    select(batch_model).where(*batch_scope).with_for_update()
                 ).scalar_one()
 
+                if (
+                    previous is not None
+                    and previous.rows_fingerprint == fingerprint
+                    and session.execute(
+                        select(func.count()).select_from(row_model).where(
+                            row_model.batch_id == batch.id
+                        )
+                    ).scalar_one()
+                    == len(rows)
+                ):
+                    stats.rows_unchanged += len(rows)
+                    break
                 session.query(row_model).filter(row_model.batch_id == batch.id).delete()
+                stats.rows_written += len(rows)
                 if rows:
                     rows_to_insert = [{"batch_id": batch.id, **row} for row in rows]
                     if session.bind.dialect.name != "mysql":
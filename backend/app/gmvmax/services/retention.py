@@ -0,0 +1,322 @@
+"""Retention engine for GMV Max fact, snapshot and guard-event tables.
+
+Each :class:`RetentionTarget` names a table, its date/time column and a
+cutoff.  On MySQL, a table that is RANGE partitioned on that column (either
+``RANGE COLUMNS(col)`` or ``RANGE(TO_DAYS(col))``) is managed by partition:
+partitions whose upper bound is at or before the cutoff are dropped whole,
+and empty future partitions are split off the ``MAXVALUE`` partition so new
+rows never land in it.  Every other table, and the rows of a partition
+straddling the cutoff, are removed with small keyset-ordered batches that
+commit and pause between chunks, so the sweep never holds long locks or a
+large undo log while syncs write the same tables.
+
+Runs report the rows removed and the bytes reclaimed per table.  Partition
+drops report the partition's data and index length; chunked deletes report
+an estimate from the table's average row length, or ``None`` where the
+database does not expose it.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Callable
+
+from sqlalchemy import and_, delete, or_, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ColumnElement, TableClause
+
+logger = logging.getLogger("gmv.gmvmax.retention")
+
+_MYSQL_DAYS_OFFSET = 365  # TO_DAYS('0001-01-01') - date(1, 1, 1).toordinal()
+
+
+@dataclass(frozen=True)
+class RetentionTarget:
+    """One table to expire rows from.
+
+    ``where`` narrows the sweep to a subset of rows (for example only guard
+    heartbeats); such targets are never expired by partition because a
+    partition holds rows outside the subset.
+    """
+
+    name: str
+    table: TableClause
+    column: str
+    cutoff: date | datetime
+    where: Callable[[TableClause], ColumnElement[bool]] | None = None
+    key: str = "id"
+
+
+@dataclass
+class RetentionResult:
+    name: str
+    table: str
+    strategy: str = "delete"
+    rows: int = 0
+    bytes: int | None = None
+    partitions_dropped: list[str] = field(default_factory=list)
+    partitions_created: list[str] = field(default_factory=list)
+    batches: int = 0
+    complete: bool = True
+    elapsed_seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class _Partition:
+    name: str
+    upper: datetime | None  # None for MAXVALUE
+    rows: int
+    bytes: int
+
+
+@dataclass(frozen=True)
+class _PartitionLayout:
+    to_days: bool
+    partitions: list[_Partition]
+
+
+class RetentionEngine:
+    """Expire rows by partition where possible, else in throttled chunks."""
+
+    def __init__(
+        self,
+        session: Session,
+        *,
+        batch_size: int = 5_000,
+        pause_seconds: float = 0.05,
+        max_seconds: float | None = None,
+        future_partitions: int = 7,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._session = session
+        self._batch_size = max(1, int(batch_size))
+        self._pause_seconds = max(0.0, float(pause_seconds))
+        self._max_seconds = max_seconds
+        self._future_partitions = max(0, int(future_partitions))
+        self._sleep = sleep
+        self._clock = clock
+        self._deadline: float | None = None
+
+    @property
+    def _is_mysql(self) -> bool:
+        return self._session.get_bind().dialect.name == "mysql"
+
+    def run(self, targets: list[RetentionTarget]) -> list[RetentionResult]:
+        """Apply every target in order; a run past ``max_seconds`` stops early."""
+
+        started = self._clock()
+        self._deadline = started + self._max_seconds if self._max_seconds else None
+        results = [self.apply(target) for target in targets]
+        logger.info(
+            "gmvmax retention run finished",
+            extra={
+                "rows": sum(result.rows for result in results),
+                "bytes": sum(result.bytes or 0 for result in results),
+                "elapsed_seconds": round(self._clock() - started, 3),
+                "tables": [asdict(result) for result in results],
+            },
+        )
+        return results
+
+    def apply(self, target: RetentionTarget) -> RetentionResult:
+        started = self._clock()
+        result = RetentionResult(name=target.name, table=target.table.name)
+        layout = self._partition_layout(target) if target.where is None else None
+        if layout is not None:
+            result.strategy = "partition"
+            self._drop_expired_partitions(target, layout.partitions, result)
+            self._create_future_partitions(target, layout, result)
+        self._delete_in_chunks(target, result)
+        result.elapsed_seconds = round(self._clock() - started, 3)
+        return result
+
+    # ------------------------------------------------------------ partitions
+    def _partition_layout(self, target: RetentionTarget) -> _PartitionLayout | None:
+        if not self._is_mysql:
+            return None
+        rows = self._session.execute(
+            text(
+                """
+                select partition_name, partition_method, partition_expression,
+                       partition_description, table_rows, data_length, index_length
+                from information_schema.partitions
+                where table_schema = database() and table_name = :table
+                  and partition_name is not null
+                order by partition_ordinal_position
+                """
+            ),
+            {"table": target.table.name},
+        ).all()
+        if not rows:
+            return None
+        method = str(rows[0][1] or "").upper()
+        expression = str(rows[0][2] or "").replace("`", "").strip().lower()
+        column = target.column.lower()
+        if method == "RANGE COLUMNS" and expression == column:
+            to_days = False
+        elif method == "RANGE" and re.fullmatch(
+            rf"to_days\(\s*{re.escape(column)}\s*\)", expression
+        ):
+            to_days = True
+        else:
+            return None
+        partitions: list[_Partition] = []
+        for name, _method, _expression, description, table_rows, data_length, index_length in rows:
+            partitions.append(
+                _Partition(
+                    name=str(name),
+                    upper=_partition_upper_bound(description, to_days=to_days),
+                    rows=int(table_rows or 0),
+                    bytes=int(data_length or 0) + int(index_length or 0),
+                )
+            )
+        return _PartitionLayout(to_days=to_days, partitions=partitions)
+
+    def _drop_expired_partitions(
+        self,
+        target: RetentionTarget,
+        partitions: list[_Partition],
+        result: RetentionResult,
+    ) -> None:
+        cutoff = _as_datetime(target.cutoff)
+        expired = [p for p in partitions if p.upper is not None and p.upper <= cutoff]
+        # MySQL refuses to drop the last partition of a table.
+        if len(expired) == len(partitions):
+            expired = expired[:-1]
+        if not expired:
+            return
+        names = ", ".join(f"`{p.name}`" for p in expired)
+        self._session.execute(text(f"alter table `{target.table.name}` drop partition {names}"))
+        self._session.commit()
+        result.partitions_dropped.extend(p.name for p in expired)
+        result.rows += sum(p.rows for p in expired)
+        result.bytes = (result.bytes or 0) + sum(p.bytes for p in expired)
+
+    def _create_future_partitions(
+        self,
+        target: RetentionTarget,
+        layout: _PartitionLayout,
+        result: RetentionResult,
+    ) -> None:
+        if not self._future_partitions:
+            return
+        partitions = layout.partitions
+        bounded = [p.upper.date() for p in partitions if p.upper is not None]
+        tail = partitions[-1]
+        if tail.upper is not None or not bounded:
+            return  # without a MAXVALUE partition there is nothing to split
+        step = bounded[-1] - bounded[-2] if len(bounded) > 1 else timedelta(days=1)
+        if step <= timedelta(0):
+            step = timedelta(days=1)
+        horizon = datetime.utcnow().date() + step * self._future_partitions
+        upper = bounded[-1]
+        definitions: list[str] = []
+        while upper < horizon:
+            upper = upper + step
+            name = f"p{upper:%Y%m%d}"
+            literal = f"'{upper.isoformat()}'"
+            bound = f"to_days({literal})" if layout.to_days else literal
+            definitions.append(f"partition `{name}` values less than ({bound})")
+            result.partitions_created.append(name)
+        if not definitions:
+            return
+        definitions.append(f"partition `{tail.name}` values less than (maxvalue)")
+        self._session.execute(
+            text(
+                f"alter table `{target.table.name}` reorganize partition `{tail.name}` "
+                f"into ({', '.join(definitions)})"
+            )
+        )
+        self._session.commit()
+
+    # ------------------------------------------------------- chunked deletes
+    def _delete_in_chunks(self, target: RetentionTarget, result: RetentionResult) -> None:
+        table = target.table
+        column = table.c[target.column]
+        key = table.c[target.key]
+        condition = column < target.cutoff
+        if target.where is not None:
+            condition = and_(condition, target.where(table))
+        deleted = 0
+        last: tuple[Any, Any] | None = None
+        while True:
+            if self._deadline is not None and self._clock() >= self._deadline:
+                result.complete = False
+                break
+            stmt = select(key, column).where(condition)
+            if last is not None:
+                stmt = stmt.where(or_(column > last[1], and_(column == last[1], key > last[0])))
+            rows = self._session.execute(
+                stmt.order_by(column, key).limit(self._batch_size)
+            ).all()
+            if not rows:
+                break
+            ids = [row[0] for row in rows]
+            count = self._session.execute(delete(table).where(key.in_(ids))).rowcount
+            self._session.commit()
+            deleted += int(count if count is not None and count >= 0 else len(ids))
+            result.batches += 1
+            last = (rows[-1][0], rows[-1][1])
+            if len(rows) < self._batch_size:
+                break
+            if self._pause_seconds:
+                self._sleep(self._pause_seconds)
+        if deleted:
+            result.rows += deleted
+            average = self._average_row_length(table.name)
+            if average is not None:
+                result.bytes = (result.bytes or 0) + deleted * average
+
+    def _average_row_length(self, table_name: str) -> int | None:
+        if not self._is_mysql:
+            return None
+        value = self._session.execute(
+            text(
+                """
+                select avg_row_length from information_schema.tables
+                where table_schema = database() and table_name = :table
+                """
+            ),
+            {"table": table_name},
+        ).scalar()
+        return int(value) if value else None
+
+
+def _as_datetime(value: date | datetime) -> datetime:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    return datetime.combine(value, datetime.min.time())
+
+
+def _partition_upper_bound(description: Any, *, to_days: bool) -> datetime | None:
+    raw = str(description or "").strip().strip("'\"")
+    if not raw or raw.upper() == "MAXVALUE":
+        return None
+    if to_days:
+        return _as_datetime(date.fromordinal(int(raw) - _MYSQL_DAYS_OFFSET))
+    return datetime.fromisoformat(raw)
+
+
+def summarize(results: list[RetentionResult]) -> dict[str, dict[str, Any]]:
+    return {
+        result.name: {
+            "table": result.table,
+            "strategy": result.strategy,
+            "rows": result.rows,
+            "bytes": result.bytes,
+            "partitions_dropped": list(result.partitions_dropped),
+            "partitions_created": list(result.partitions_created),
+            "batches": result.batches,
+            "complete": result.complete,
+            "elapsed_seconds": result.elapsed_seconds,
+        }
+        for result in results
+    }
+
+
+__all__ = ["RetentionEngine", "RetentionResult", "RetentionTarget", "summarize"]
@@ -20,7 +20,6 @@ from app.data.models.gmv_restructured import (
 )
 from app.data.models.gmvmax_campaign_catalog import (
     GmvmaxLiveCampaignCatalog,
-    GmvmaxProductCampaignItemGroup,
     GmvmaxProductCampaignCatalog,
 )
 from app.data.models.gmvmax_creative_metrics import GmvmaxProductCreativeMetricsDaily
@@ -29,10 +28,13 @@ from app.data.models.ttb_entities import TTBAdvertiser, TTBAdvertiserStoreLink
 from app.data.models.ttb_gmvmax import TTBGmvMaxCampaign
 from app.gmvmax.domain.monitoring_strategy import MonitoringStrategy
 from app.gmvmax.services.campaign_report_sync import (
+    CampaignSyncStats,
     SyncIdentifiers,
     sync_campaign_metrics as sync_catalog_campaign_metrics,
 )
+from app.gmvmax.services.campaign_item_groups import resolve_campaign_item_groups
 from app.gmvmax.services.creative_report_sync import sync_product_creative_metrics
+from app.services.gmvmax_creative_leaderboard import refresh_scope_leaderboards
 from app.services.ttb_client_factory import build_ttb_gmvmax_client
 from app.services.ttb_api import TTBHttpError, TTBRateLimitBudgetError
 from app.services.ttb_gmvmax import (
@@ -254,117 +256,6 @@ def _dedupe_strings(values: list[str]) -> list[str]:
     return result
 
 
-def _extract_item_group_ids(raw: Any) -> list[str]:
-    ids: list[str] = []
-
-    def _walk(value: Any, key_hint: str | None = None) -> None:
-        if value is None:
-            return
-        if isinstance(value, (str, int)):
-            if key_hint in {"item_group_id", "item_group_ids", "item_id", "item_ids"}:
-                ids.append(str(value))
-            return
-        if isinstance(value, list):
-            for item in value:
-                _walk(item, key_hint=key_hint)
-            return
-        if not isinstance(value, Mapping):
-            return
-
-        for key, child in value.items():
-            key_text = str(key)
-            if key_text in {"item_group_id", "item_group_ids", "item_id", "item_ids"}:
-                _walk(child, key_hint=key_text)
-                continue
-            if key_text in {"item_group", "item_groups", "item_group_list", "item_list"}:
-                _walk(child, key_hint="item_group_id")
-                continue
-            _walk(child, key_hint=None)
-
-    _walk(raw)
-    return _dedupe_strings(ids)
-
-
-def _backfill_campaign_item_groups_from_catalog(
-    session: Session,
-    *,
-    workspace_id: int,
-    auth_id: int,
-    advertiser_id: str,
-    store_id: str,
-    campaign_ids: list[str],
-) -> list[str]:
-    if not campaign_ids:
-        return []
-
-    rows = (
-        session.execute(
-            select(
-                GmvmaxProductCampaignCatalog.campaign_id,
-                GmvmaxProductCampaignCatalog.detail_raw_json,
-            )
-            .where(GmvmaxProductCampaignCatalog.workspace_id == int(workspace_id))
-            .where(GmvmaxProductCampaignCatalog.auth_id == int(auth_id))
-            .where(GmvmaxProductCampaignCatalog.advertiser_id == str(advertiser_id))
-            .where(GmvmaxProductCampaignCatalog.store_id == str(store_id))
-            .where(GmvmaxProductCampaignCatalog.campaign_id.in_(campaign_ids))
-        )
-        .all()
-    )
-    if not rows:
-        return []
-
-    existing = set(
-        session.execute(
-            select(
-                GmvmaxProductCampaignItemGroup.campaign_id,
-                GmvmaxProductCampaignItemGroup.item_group_id,
-            )
-            .where(GmvmaxProductCampaignItemGroup.workspace_id == int(workspace_id))
-            .where(GmvmaxProductCampaignItemGroup.auth_id == int(auth_id))
-            .where(GmvmaxProductCampaignItemGroup.advertiser_id == str(advertiser_id))
-            .where(GmvmaxProductCampaignItemGroup.store_id == str(store_id))
-            .where(GmvmaxProductCampaignItemGroup.campaign_id.in_(campaign_ids))
-        ).all()
-    )
-
-    resolved: list[str] = []
-    inserted = 0
-    for campaign_id, raw_json in rows:
-        for item_group_id in _extract_item_group_ids(raw_json):
-            key = (str(campaign_id), str(item_group_id))
-            resolved.append(str(item_group_id))
-            if key in existing:
-                continue
-            session.add(
-                GmvmaxProductCampaignItemGroup(
-                    workspace_id=int(workspace_id),
-                    auth_id=int(auth_id),
-                    advertiser_id=str(advertiser_id),
-                    store_id=str(store_id),
-                    campaign_id=str(campaign_id),
-                    item_group_id=str(item_group_id),
-                )
-            )
-            existing.add(key)
-            inserted += 1
-
-    if inserted:
-        session.flush()
-        logger.info(
-            "gmvmax campaign item groups backfilled from catalog detail",
-            extra={
-                "workspace_id": workspace_id,
-                "auth_id": auth_id,
-                "advertiser_id": advertiser_id,
-                "store_id": store_id,
-                "campaign_count": len(campaign_ids),
-                "inserted": inserted,
-            },
-        )
-    return _dedupe_strings(resolved)
-
-
 def _report_date_windows(start_date: date, end_date: date, granularity: str) -> list[tuple[date, date]]:
     if start_date > end_date:
         raise ValueError("start_date must not be after end_date")
@@ -1062,6 +953,8 @@ class GmvMaxSyncService:
                 )
                 return {"synced_rows": 0}
 
+            cycle_stats = CampaignSyncStats()
+
             async def _run() -> dict[str, int]:
                 totals: Dict[str, int] = {"campaign_rows": 0, "failed_requests": 0}
                 grouped: Dict[int, list[dict[str, str | int]]] = {}
@@ -1104,6 +997,7 @@ class GmvMaxSyncService:
                                             start_date=window_start,
                                             end_date=window_end,
                                             campaign_ids=campaign_ids,
+                                            stats=cycle_stats,
                                         )
                                         totals["campaign_rows"] += int(rows_synced or 0)
                                     except (TTBRateLimitBudgetError, TTBHttpError):
@@ -1147,12 +1041,18 @@ class GmvMaxSyncService:
                     "accounts": len(accounts),
                     "campaign_ids": campaign_ids,
                     "result": result,
+                    "report": cycle_stats.as_dict(),
                     "start_date": start_date,
                     "end_date": end_date,
                 },
             )
 
-            return {"synced_rows": int(result.get("campaign_rows", 0) or 0)}
+            return {
+                "synced_rows": int(result.get("campaign_rows", 0) or 0),
+                "bytes_fetched": cycle_stats.bytes_fetched,
+                "rows_written": cycle_stats.rows_written,
+                "settled_days_skipped": cycle_stats.settled_days_skipped,
+            }
 
     def _sync_product_metrics(
         self,
@@ -1779,19 +1679,7 @@ class GmvMaxSyncService:
                     return requested
                 if not account_campaign_ids:
                     return []
-                rows = session.execute(
-                    select(GmvmaxProductCampaignItemGroup.item_group_id)
-                    .where(GmvmaxProductCampaignItemGroup.workspace_id == int(strategy.workspace_id))
-                    .where(GmvmaxProductCampaignItemGroup.auth_id == int(account["auth_id"]))
-                    .where(GmvmaxProductCampaignItemGroup.advertiser_id == str(account["advertiser_id"]))
-                    .where(GmvmaxProductCampaignItemGroup.store_id == str(account["store_id"]))
-                    .where(GmvmaxProductCampaignItemGroup.campaign_id.in_(account_campaign_ids))
-                ).scalars()
-                resolved = _dedupe_strings([str(item) for item in rows if item])
-                if resolved:
-                    return resolved
-
-                catalog_resolved = _backfill_campaign_item_groups_from_catalog(
+                by_campaign = resolve_campaign_item_groups(
                     session,
                     workspace_id=int(strategy.workspace_id),
                     auth_id=int(account["auth_id"]),
@@ -1799,8 +1687,15 @@ class GmvMaxSyncService:
                     store_id=str(account["store_id"]),
                     campaign_ids=account_campaign_ids,
                 )
-                if catalog_resolved:
-                    return catalog_resolved
+                resolved = _dedupe_strings(
+                    [
+                        item
+                        for campaign_id in account_campaign_ids
+                        for item in by_campaign.get(campaign_id, [])
+                    ]
+                )
+                if resolved:
+                    return resolved
 
                 metric_rows = session.execute(
                     select(GmvmaxProductCreativeMetricsDaily.item_group_id)
@@ -1813,6 +1708,22 @@ class GmvMaxSyncService:
                 ).scalars()
                 return _dedupe_strings([str(item) for item in metric_rows if item])
 
+            def _synced_creative_ids(account: dict[str, str | int], account_campaign_ids: list[str]) -> set[str]:
+                """Creatives with metric rows in the synced days, for leaderboard re-ranking."""
+
+                rows = session.execute(
+                    select(GmvmaxProductCreativeMetricsDaily.creative_id)
+                    .where(GmvmaxProductCreativeMetricsDaily.workspace_id == int(strategy.workspace_id))
+                    .where(GmvmaxProductCreativeMetricsDaily.auth_id == int(account["auth_id"]))
+                    .where(GmvmaxProductCreativeMetricsDaily.advertiser_id == str(account["advertiser_id"]))
+                    .where(GmvmaxProductCreativeMetricsDaily.store_id == str(account["store_id"]))
+                    .where(GmvmaxProductCreativeMetricsDaily.campaign_id.in_(account_campaign_ids))
+                    .where(GmvmaxProductCreativeMetricsDaily.stat_time_day >= start)
+                    .where(GmvmaxProductCreativeMetricsDaily.stat_time_day <= end)
+                    .distinct()
+                ).scalars()
+                return {str(item) for item in rows if item}
+
             async def _run() -> int:
                 written = 0
                 failed_windows = 0
@@ -1851,6 +1762,9 @@ class GmvMaxSyncService:
                                     advertiser_id=str(account["advertiser_id"]),
                                 ),
                             )
+                            # Rows can appear or vanish in the rewritten days, so
+                            # creatives from before and after the sync are re-ranked.
+                            synced_creative_ids = _synced_creative_ids(account, account_campaign_ids)
                             current = start
                             while current <= end:
                                 attempted_windows += 1
@@ -1889,6 +1803,32 @@ class GmvMaxSyncService:
                                         },
                                     )
                                 current = current + timedelta(days=1)
+                            try:
+                                with session.begin_nested():
+                                    refresh_scope_leaderboards(
+                                        session,
+                                        workspace_id=identifiers.workspace_id,
+                                        auth_id=identifiers.auth_id,
+                                        advertiser_id=identifiers.advertiser_id,
+                                        store_id=identifiers.store_id,
+                                        item_group_ids=account_item_group_ids,
+                                        advertiser_today=_as_advertiser_local_datetime(
+                                            now, identifiers.advertiser_timezone
+                                        ).date(),
+                                        creative_ids=synced_creative_ids
+                                        | _synced_creative_ids(account, account_campaign_ids),
+                                    )
+                            except Exception:  # noqa: BLE001 - boards rebuild on next request
+                                logger.warning(
+                                    "gmvmax creative leaderboard refresh failed",
+                                    exc_info=True,
+                                    extra={
+                                        "workspace_id": strategy.workspace_id,
+                                        "auth_id": auth_id,
+                                        "advertiser_id": account["advertiser_id"],
+                                        "store_id": account["store_id"],
+                                    },
+                                )
                     finally:
                         try:
                             await client.aclose()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from functools import lru_cache
 import re
+from typing import Iterable
 
 
 _STRUCTURED_PREFIXES = (
@@ -100,18 +102,35 @@ _DANGLING_ACTION_TAIL_RE = re.compile(
     flags=re.IGNORECASE,
 )
 _CJK_CHARACTER_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_MUST_TIMED_GROUP_RE = re.compile(
+    r"^(?P<label>\d+(?:\.\d+)?-\d+(?:\.\d+)?s)\s+(?P<body>.+)$",
+    flags=re.IGNORECASE,
+)
+_PHONE_STATE_VERB_RE = re.compile(
+    r"phone(?:\s+remains?|\s+remaining|\s+stays?|\s+is|\s+must\s+be)?\s+"
+    r"(?:visibly\s+)?",
+    flags=re.IGNORECASE,
+)
+_SEGMENT_SCOPE_RE = re.compile(r"(\d+\s*/\s*\d+)")
+_IMAGE_HANDLE_RE = re.compile(r"@image\d+")
+_ENGLISH_WORD_RE = re.compile(r"[A-Za-z0-9]+(?:[-'][A-Za-z0-9]+)*")
+_DOUBAO_SHORT_OUTPUT_RE = re.compile(
+    r"9:16; no captions/UI/watermark; segment \d+/\d+\.",
+    flags=re.IGNORECASE,
+)
 
 
 def _normalized_semantic(value: str) -> str:
-    return re.sub(
-        r"[^a-z0-9]+",
+    return _NON_ALNUM_RE.sub(
         " ",
         str(value or "").casefold().replace("a.m.", "am").replace("p.m.", "pm"),
     ).strip()
 
 
 def _short_object_name(value: str) -> str:
-    lowered = re.sub(r"\s+", " ", str(value or "").strip().lower())
+    lowered = _WHITESPACE_RE.sub(" ", str(value or "").strip().lower())
     if "clock" in lowered:
         return "clock"
     if "tally" in lowered:
@@ -130,7 +149,12 @@ def structured_video_prompt_semantic_invariants(value: str) -> list[str]:
     invent creative actions or product claims.
     """
 
-    lines = [line.strip() for line in str(value or "").splitlines() if line.strip()]
+    return list(_semantic_invariants(str(value or "")))
+
+
+@lru_cache(maxsize=1024)
+def _semantic_invariants(value: str) -> tuple[str, ...]:
+    lines = [line.strip() for line in value.splitlines() if line.strip()]
     explicit = next((line for line in lines if line.startswith("Must:")), "")
     if explicit:
         expanded: list[str] = []
@@ -138,12 +162,7 @@ def structured_video_prompt_semantic_invariants(value: str) -> list[str]:
             group = group.strip(" .")
             if not group:
                 continue
-            timed = re.match(
-                r"^(?P<label>\d+(?:\.\d+)?-\d+(?:\.\d+)?s)\s+"
-                r"(?P<body>.+)$",
-                group,
-                flags=re.IGNORECASE,
-            )
+            timed = _MUST_TIMED_GROUP_RE.match(group)
             label = timed.group("label") if timed else ""
             body = timed.group("body") if timed else group
             parts = [part.strip(" .") for part in body.split(",")]
@@ -152,7 +171,7 @@ def structured_video_prompt_semantic_invariants(value: str) -> list[str]:
                 for part in parts
                 if part
             )
-        return list(dict.fromkeys(expanded))
+        return tuple(dict.fromkeys(expanded))
 
     timeline = next((
         line
@@ -160,7 +179,7 @@ def structured_video_prompt_semantic_invariants(value: str) -> list[str]:
         if line.startswith(("Timeline (this segment only):", "Beats:"))
     ), "")
     if not timeline:
-        return []
+        return ()
     body = timeline.partition(":")[2].strip()
     invariants: list[str] = []
     for raw_row in [row.strip() for row in body.split(" | ") if row.strip()]:
@@ -187,14 +206,8 @@ def structured_video_prompt_semantic_invariants(value: str) -> list[str]:
                 prefix + marking.group("value").strip() + " marking visible"
             )
         for state in _PHONE_STATE_RE.finditer(row):
-            canonical = re.sub(r"\s+", " ", state.group(0).strip())
-            canonical = re.sub(
-                r"phone(?:\s+remains?|\s+remaining|\s+stays?|\s+is|\s+must\s+be)?\s+"
-                r"(?:visibly\s+)?",
-                "phone ",
-                canonical,
-                flags=re.IGNORECASE,
-            )
+            canonical = _WHITESPACE_RE.sub(" ", state.group(0).strip())
+            canonical = _PHONE_STATE_VERB_RE.sub("phone ", canonical)
             invariants.append(prefix + canonical)
         for state in _OBJECT_STATE_RE.finditer(row):
             invariants.append(
@@ -215,7 +228,7 @@ def structured_video_prompt_semantic_invariants(value: str) -> list[str]:
             # reference.  A generic transport invariant keeps the visible
             # product beat without rewriting a balm jar into a gummy bottle.
             invariants.append(prefix + "product package visible")
-    return list(dict.fromkeys(invariants))
+    return tuple(dict.fromkeys(invariants))
 
 
 def validate_structured_video_prompt_fidelity(
@@ -242,7 +255,7 @@ def validate_structured_video_prompt_fidelity(
         )
     ]
     aliases = list(dict.fromkeys(
-        [*required_reference_aliases, *re.findall(r"@image\d+", source)]
+        [*required_reference_aliases, *_IMAGE_HANDLE_RE.findall(source)]
     ))
     missing_aliases = [alias for alias in aliases if alias not in actual]
     source_timeline = next((
@@ -393,7 +406,7 @@ def _compact_text(value: str, limit: int) -> str:
     phrase when the provider-facing instruction has no ASCII word breaks.
     """
 
-    text = re.sub(r"\s+", " ", str(value or "")).strip()
+    text = _WHITESPACE_RE.sub(" ", str(value or "")).strip()
     if len(text) <= limit:
         return text
     kept: list[str] = []
@@ -658,7 +671,7 @@ def _compact_repair_line(line: str, limit: int) -> str:
     }
     semantic_clauses = []
     for clause in clauses:
-        words = re.findall(r"[A-Za-z0-9]+(?:[-'][A-Za-z0-9]+)*", clause)
+        words = _ENGLISH_WORD_RE.findall(clause)
         kept = [word for word in words if word.lower() not in filler_words]
         semantic_clauses.append(" ".join(kept) or clause)
     semantic_result = prefix + "; ".join(semantic_clauses)
@@ -907,7 +920,7 @@ def _tiny_reference_bindings(line: str) -> str:
 
     value = _lean_reference_bindings(line)
     short = re.sub(r"^Reference bindings:\s*", "Refs: ", value)
-    if not re.search(r"@image\d+", short):
+    if not _IMAGE_HANDLE_RE.search(short):
         return _compact_prefixed_line(value, 85)
 
     role_aliases = {
@@ -920,7 +933,7 @@ def _tiny_reference_bindings(line: str) -> str:
     canonical_parts: list[str] = []
     body = re.sub(r"^(?:Reference bindings:|Refs:)\s*", "", value).strip(" .")
     for raw_part in body.split(";"):
-        handles = list(dict.fromkeys(re.findall(r"@image\d+", raw_part)))
+        handles = list(dict.fromkeys(_IMAGE_HANDLE_RE.findall(raw_part)))
         if not handles:
             continue
         role_text = raw_part.partition("=")[2]
@@ -962,6 +975,363 @@ def _compact_semantic_invariants(invariants: list[str]) -> str:
     )
 
 
+# Transport compression, not a creative rewrite.  Convert verbose,
+# model-authored staging prose into the same observable state tokens before
+# the provider's small prompt budget is distributed.  Still-image references
+# own appearance; these tokens tell Seedance what must change over time
+# (object count, phone state and gestures).
+_CANONICAL_STATE_REWRITES = tuple(
+    (re.compile(pattern, flags=re.IGNORECASE), replacement)
+    for pattern, replacement in (
+        (
+            r"\b(?:the\s+)?(?P<brand>[A-Za-z][A-Za-z0-9-]{2,30})\s+"
+            r"(?P<color>(?:blue|purple|white|dark|light)\s+)?bottle\s+with\b"
+            r"[^.;|]{0,120}\benters\b",
+            r"\g<brand> \g<color>bottle enters",
+        ),
+        (
+            r"\bkeeps?\s+scrolling\s+despite\s+(?:a\s+)?nearly\s+"
+            r"empty\s+red\s+battery(?:\s+shape)?\b",
+            "scrolls on low battery",
+        ),
+        (
+            r"\bfreezes?\s+mid-scroll,?\s*lowers?\s+(?:the\s+)?phone"
+            r"(?:\s+slightly)?,?\s*(?:and\s+)?darts?\s+(?:her\s+)?"
+            r"eyes?\s+toward\s+(?:the\s+)?(?:late-night\s+)?clock"
+            r"(?:\s+glow)?\b",
+            "freezes; lowers phone; eyes clock",
+        ),
+        (
+            r"\bfreezes?\s+mid-scroll,?\s*lowers?\s+(?:the\s+)?phone"
+            r"(?:\s+slightly)?,?\s*(?:and\s+)?looks?\s+toward\s+"
+            r"(?:the\s+)?clock\b",
+            "freezes; lowers phone; eyes clock",
+        ),
+        (
+            r"\blooks?\s+back\s+at\s+(?:the\s+)?phone,?\s*repeats?"
+            r"\s+rapid\s+upward\s+swipes?.*?\b(?:thumb\s+)?"
+            r"stop(?:s|ping)?(?:\s+above\s+(?:the\s+)?screen)?\b",
+            "rapidly swipes; thumb stops",
+        ),
+        (
+            r"\brepeats?\s+rapid\s+upward\s+swipes?\s+and\s+"
+            r"(?:suddenly\s+)?stops?\b",
+            "rapidly swipes; stops",
+        ),
+        (
+            r"\brepeats?\s+rapid\s+upward\s+swipes?\b",
+            "rapidly swipes",
+        ),
+        (
+            r"\b(?:her\s+)?thumb\s+(?:stop(?:s|ping)?|is\s+stopped)"
+            r"(?:\s+above|\s+over)?\s+(?:the\s+)?screen\b",
+            "thumb stops",
+        ),
+        (
+            r"\b(?:her\s+)?stopped\s+hand\s+hovers?\s+over\s+"
+            r"(?:the\s+)?phone\s+as\s+(?:the\s+)?repeated[- ]swipe"
+            r"\s+light\s+trail\s+collapses?\s+into\s+darkness\b",
+            "hand hovers; swipe trail fades",
+        ),
+        (
+            r"\b(?:her\s+)?stopped\s+hand\s+hovers?\s+as\s+"
+            r"(?:the\s+)?light\s+trail\s+collapses?\b",
+            "hand hovers; trail fades",
+        ),
+        (
+            r"\bunplugs?\s+(?:the\s+)?cable\s+and\s+(?:reveals?|shows?)"
+            r"\s+(?:the\s+)?(?:product\s+)?bottle\b",
+            "product-package-visible",
+        ),
+        (
+            r"\bunplugs?\s+(?:the\s+)?cable\s+and\s+follows?\s+its"
+            r"\s+movement\s+to\s+(?:the\s+)?nightstand\b",
+            "unplugs cable; follows to nightstand",
+        ),
+        (
+            r"\b(?:she\s+)?(?:decisively\s+)?turns?\s+(?:the\s+)?"
+            r"phone\s+face-down\s+in\s+(?:her\s+)?palm\s+and\s+"
+            r"sits?\s+up\b",
+            "phone-face-down; sits up",
+        ),
+        (
+            r"\bher\s+thumb\s+keeps\s+scrolling\s+while\s+an\s+"
+            r"oversized\s+phone\s+portal\s+pulls\s+luminous\s+shards\s+"
+            r"into\s+the\s+room\b",
+            "scrolling phone portal pulls luminous shards",
+        ),
+        (
+            r"\bshow\s+(?:the\s+)?woman\s+awake\s+in\s+bed\s+"
+            r"holding\s+(?:a\s+)?phone\b",
+            "woman awake in bed with phone",
+        ),
+        (
+            r"\b(?:she|the\s+woman|the\s+protagonist)\s+holds\s+"
+            r"(?:the\s+)?uploaded\s+bottle\s+in\s+(?:a\s+)?warm\s+"
+            r"setting\s+and\s+presents\s+exactly\s+two\s+gummies\b",
+            "holds uploaded bottle; presents exactly two gummies",
+        ),
+        (
+            r"\b(?:in\s+)?(?:the\s+)?cool-blue\s+bedroom,?\s+"
+            r"(?:the\s+)?woman\b",
+            "woman in cool-blue bedroom",
+        ),
+        (
+            r"\b(?:she|the\s+woman|the\s+protagonist)\s+makes\s+"
+            r"one\s+deliberate\s+choice[:,]?\s+place(?:s)?\s+(?:the\s+)?"
+            r"phone\s+face-down\s+on\s+(?:the\s+)?bedside\b",
+            "phone face-down on bedside",
+        ),
+        (
+            r"\b(?:the\s+)?phone\s+(?:already\s+)?face[- ]down\s+on\s+"
+            r"(?:the\s+)?bedside\s+surface\s+with\s+(?:the\s+)?"
+            r"woman's\s+hand\s+fully\s+withdrawn\b",
+            "phone face-down; hand out of frame",
+        ),
+        (
+            r"\bhold\s+(?:the\s+)?bottle\s+in\s+(?:the\s+)?warm\s+"
+            r"setting\b",
+            "hold bottle in warm setting",
+        ),
+        (
+            r"^use\s+hard\s+cuts\s+between\s+three\s+completed\s+"
+            r"states:\s*",
+            "",
+        ),
+        (
+            r"\b(?:the\s+)?room\s+changes\s+from\s+cool-blue\s+"
+            r"phone\s+light\s+to\s+warm\s+light\b",
+            "light blue-to-warm",
+        ),
+        (
+            r"\bhard\s+cut\s+(?:back\s+)?from\s+(.+?)\s+to\s+"
+            r"(.+?)(?=(?:[.;]|$))",
+            r"\1 -> \2",
+        ),
+        (
+            r"\b(?:the\s+)?(?:narrator|protagonist)\s+(?:is\s+)?"
+            r"(?:seated|sits)\s+(?:beside|on)\s+(?:the\s+)?"
+            r"(?:bed|bedside)\b",
+            "",
+        ),
+        (
+            r"\b(?:she|narrator|protagonist)\s+turns\s+(?:the\s+)?"
+            r"phone\s+face-down\b",
+            "phone face-down",
+        ),
+        (
+            r"\b(?:the\s+)?phone\s+is\s+(?:already\s+)?face-down\b",
+            "phone face-down",
+        ),
+        (
+            r"\b(?:both\s+)?hands\s+are\s+empty\b",
+            "hands empty",
+        ),
+        (
+            r"\b(?:exactly\s+)?two\s+unbranded\s+gummies\s+"
+            r"(?:resting\s+)?(?:visibly\s+)?in\s+(?:her\s+)?"
+            r"(?:open\s+)?(?:other\s+)?palm\b",
+            "two unbranded gummies in palm",
+        ),
+        (
+            r"\b(?:her\s+)?(?:other\s+)?open\s+palm\s+presents\s+"
+            r"exactly\s+two\s+gummies\s+(?:separately\s+)?beside\s+"
+            r"(?:the\s+)?package\b",
+            "two gummies in open palm beside package",
+        ),
+        (
+            r"\b(?:the\s+)?(?:narrator|protagonist)\s+makes\s+"
+            r"one\s+single\s+fingertip\s+tap\b",
+            "one fingertip tap",
+        ),
+        (r"\bhard\s+cut\s+(?:back\s+)?to\b", ""),
+    )
+)
+_DANGLING_CONJUNCTION_RE = re.compile(r"\b(?:and|with)\s*(?=[;,.]|$)", flags=re.IGNORECASE)
+# Keep object orientation as one semantic token during fair-share
+# allocation.  Otherwise a tiny lane can retain only ``phone`` and discard
+# the state-changing ``face-down`` suffix.
+_ORIENTATION_TOKEN_REWRITES = tuple(
+    (re.compile(pattern, flags=re.IGNORECASE), replacement)
+    for pattern, replacement in (
+        (r"\bphone\s+face-down\b", "phone-face-down"),
+        (r"\b(?:decisively\s+)?turns?\s+(?:the\s+)?phone-face-down\b", "phone-face-down"),
+        (r"\bphone-face-down\s+and\s+sits?\s+up\b", "phone-face-down; sits up"),
+        (
+            r"\b(?:the\s+)?(?:MYUPONA\s+|product\s+)?bottle\s+"
+            r"(?:becomes?|is)\s+(?:clearly\s+)?visible\b",
+            "product-bottle-visible",
+        ),
+    )
+)
+# Put immutable state changes before descriptive motion.  The word-boundary
+# compactor keeps the start of a tiny beat; without this ordering, a required
+# bottle reveal at the end of a natural sentence can disappear even though
+# less important travel motion survives.
+_PRIORITY_STATE_TOKENS = tuple(
+    (token, re.compile(re.escape(token), flags=re.IGNORECASE))
+    for token in (
+        "product-bottle-visible",
+        "phone-face-down",
+        "phone-screen-up",
+        "exactly-two-gummies",
+    )
+)
+_STATE_TOKEN_REWRITES = tuple(
+    (re.compile(pattern, flags=re.IGNORECASE), replacement)
+    for pattern, replacement in (
+        (r"\bphone\s+screen-up\b", "phone-screen-up"),
+        (r"\bexactly\s+two\s+gummies\b", "exactly-two-gummies"),
+        (r"\bamber\s+pulse\b", "amber-pulse"),
+    )
+)
+# Reference images already identify the cast.  Remove only a leading subject
+# label so a tiny per-beat budget starts on the observable verb instead of
+# returning an empty action because a long subject such as
+# ``female-presenting protagonist`` consumed the whole lane.
+_LEADING_SUBJECT_REWRITES = tuple(
+    (re.compile(pattern, flags=re.IGNORECASE), replacement)
+    for pattern, replacement in (
+        (r"^(?:the\s+)?silent\s+visible\s+protagonist\b", "She"),
+        (r"^the\s+protagonist\b", "She"),
+        (
+            r"^(?:the\s+)?(?:(?:female|male)[- ]presenting\s+)?"
+            r"(?:adult\s+)?(?:protagonist|woman|man|character)\s+",
+            "",
+        ),
+        (r"^(?:she|he|they|her|his|their)\s+", ""),
+        (r"^tight\s+on\s+the\s+protagonist's\b", "Her"),
+    )
+)
+_LEADING_PRONOUN_RE = re.compile(r"^(?:she|he|they|her|his|their)\s+", flags=re.IGNORECASE)
+_CLAUSE_SPLIT_RE = re.compile(
+    r"\s*;\s*|\s*->\s*|\.\s+|:\s*|\s+while\s+|,\s*then\s+|"
+    r"\s+and\s+then\s+|,\s*|\s*；\s*|\s*。\s*|"
+    r"\s*：\s*|\s*，\s*",
+    flags=re.IGNORECASE,
+)
+_CLAUSE_FILLER_WORDS = frozenset({
+    "a", "an", "the", "same", "silent", "visible", "protagonist",
+    "authoritative", "oversized",
+    "continues", "begins", "starts", "completely", "naturally",
+    "softly", "implied", "generic", "containing",
+    # The ordered package reference already carries label color and layout.
+    # Spend the scarce text lane on semantic product facts (brand,
+    # Melatonin-free, serving action) instead.
+    "purple", "label", "front", "marking", "enters",
+    "now", "still", "aggressive", "tight", "stable",
+    "narrator", "seated", "hard", "quiet", "fully",
+    "separately", "already", "both", "bare", "transition",
+})
+_TRAILING_FUNCTION_WORD_RE = re.compile(
+    r"\s+(?:a|an|the|at|and|or|as|despite|toward|towards|to|with|"
+    r"while|into|from|for|of|near|over|under)$",
+    flags=re.IGNORECASE,
+)
+_BEAT_TIME_LABEL_RE = re.compile(r"^([^:]{1,24}:)\s*(.*)$")
+
+
+@lru_cache(maxsize=4096)
+def _semantic_clause_phrases(value: str) -> tuple[str, ...]:
+    """Normalize one beat into ordered clause phrases, independent of budget.
+
+    ``_maximize_timeline_in_packet`` re-renders the same beats at every
+    candidate budget, so this parse is shared by all of them.
+    """
+
+    text = _WHITESPACE_RE.sub(
+        " ",
+        str(value or "").replace("’", "'").replace("‘", "'"),
+    ).strip()
+    for pattern, replacement in _CANONICAL_STATE_REWRITES:
+        text = pattern.sub(replacement, text)
+    # Exact readable values live in the lossless Must lane. Remove their
+    # verbose source clauses from Beats so the scarce motion lane can keep
+    # the human action around them instead of repeating the same digits.
+    text = _READABLE_VALUE_RE.sub("", text)
+    text = _DANGLING_CONJUNCTION_RE.sub("", text)
+    for pattern, replacement in _ORIENTATION_TOKEN_REWRITES:
+        text = pattern.sub(replacement, text)
+    prioritized: list[str] = []
+    for token, pattern in _PRIORITY_STATE_TOKENS:
+        if token.casefold() not in text.casefold():
+            continue
+        text = pattern.sub("", text, count=1).strip(" ,.;")
+        prioritized.append(token)
+    if prioritized:
+        text = "; ".join([*prioritized, text] if text else prioritized)
+    for pattern, replacement in _STATE_TOKEN_REWRITES:
+        text = pattern.sub(replacement, text)
+    text = _WHITESPACE_RE.sub(" ", text).strip(" ,.;")
+    if " -> " in text:
+        # In a transition the post-cut state is the actual acceptance target.
+        # Put it first before round-robin token allocation so a small provider
+        # lane cannot preserve only the pre-cut setup and silently lose the
+        # required final object state.
+        before, after = text.split(" -> ", 1)
+        text = f"{after}; {before}"
+    for pattern, replacement in _LEADING_SUBJECT_REWRITES:
+        text = pattern.sub(replacement, text)
+    clauses = [
+        part.strip(" ,")
+        for part in _CLAUSE_SPLIT_RE.split(text)
+        if part.strip(" ,")
+    ]
+    clause_phrases: list[str] = []
+    for clause in clauses:
+        clause = _LEADING_PRONOUN_RE.sub("", clause)
+        if _CJK_CHARACTER_RE.search(clause):
+            # The AI has already authored this provider-facing Chinese action
+            # under a combined character budget.  Preserve its wording and
+            # order; the English stop-word tokenizer below is not a semantic
+            # tokenizer for CJK text.
+            clause_phrases.append(clause.strip(" ，。；、,:;."))
+            continue
+        words = [
+            word
+            for word in _ENGLISH_WORD_RE.findall(clause)
+            if word.lower() not in _CLAUSE_FILLER_WORDS
+        ]
+        if words:
+            clause_phrases.append(" ".join(words))
+    return tuple(clause_phrases)
+
+
+def _semantic_clauses(value: str, budget: int) -> str:
+    clause_phrases = _semantic_clause_phrases(value)
+    if not clause_phrases:
+        return ""
+    # Keep word order and grammatical action phrases.  The old
+    # round-robin/equal-clause allocator could turn a beat into fragments
+    # such as ``cool-blue; physical; 43``.  Exact states are separately
+    # protected by Must, so this lane should remain a readable motion
+    # sentence rather than scattering isolated tokens from every clause.
+    # Add complete clauses only. Partially appending the next clause made
+    # valid AI plans reach providers as fragments such as ``; In`` or
+    # ``woman s``. If even the first clause is too long, trim only that
+    # clause at a word boundary.
+    kept_phrases: list[str] = []
+    for phrase in clause_phrases:
+        candidate = "; ".join([*kept_phrases, phrase])
+        if len(candidate) > budget:
+            break
+        kept_phrases.append(phrase)
+    phrases = (
+        "; ".join(kept_phrases)
+        if kept_phrases
+        else _compact_text_no_ellipsis(clause_phrases[0], budget)
+    )
+    phrases = _TRAILING_FUNCTION_WORD_RE.sub("", phrases)
+    return (
+        phrases
+        .replace("exactly-two-gummies", "exactly two gummies")
+        .replace("amber-pulse", "amber pulse")
+        .replace("product-package-visible", "product package visible")
+        .replace("phone-face-down", "phone face-down")
+    )
+
+
+@lru_cache(maxsize=8192)
 def _compact_local_visual_timeline(line: str, limit: int) -> str:
     """Preserve action, effect and camera from every AI-authored beat."""
 
@@ -978,388 +1348,6 @@ def _compact_local_visual_timeline(line: str, limit: int) -> str:
         if len(complete_cjk_timeline) <= limit:
             return complete_cjk_timeline
 
-    def semantic_clauses(value: str, budget: int) -> str:
-        text = re.sub(
-            r"\s+",
-            " ",
-            str(value or "").replace("’", "'").replace("‘", "'"),
-        ).strip()
-        # This is transport compression, not a creative rewrite.  Convert
-        # verbose, model-authored staging prose into the same observable state
-        # tokens before the provider's small prompt budget is distributed.
-        # Still-image references own appearance; these tokens tell Seedance
-        # what must change over time (object count, phone state and gestures).
-        canonical_states = (
-            (
-                r"\b(?:the\s+)?(?P<brand>[A-Za-z][A-Za-z0-9-]{2,30})\s+"
-                r"(?P<color>(?:blue|purple|white|dark|light)\s+)?bottle\s+with\b"
-                r"[^.;|]{0,120}\benters\b",
-                r"\g<brand> \g<color>bottle enters",
-            ),
-            (
-                r"\bkeeps?\s+scrolling\s+despite\s+(?:a\s+)?nearly\s+"
-                r"empty\s+red\s+battery(?:\s+shape)?\b",
-                "scrolls on low battery",
-            ),
-            (
-                r"\bfreezes?\s+mid-scroll,?\s*lowers?\s+(?:the\s+)?phone"
-                r"(?:\s+slightly)?,?\s*(?:and\s+)?darts?\s+(?:her\s+)?"
-                r"eyes?\s+toward\s+(?:the\s+)?(?:late-night\s+)?clock"
-                r"(?:\s+glow)?\b",
-                "freezes; lowers phone; eyes clock",
-            ),
-            (
-                r"\bfreezes?\s+mid-scroll,?\s*lowers?\s+(?:the\s+)?phone"
-                r"(?:\s+slightly)?,?\s*(?:and\s+)?looks?\s+toward\s+"
-                r"(?:the\s+)?clock\b",
-                "freezes; lowers phone; eyes clock",
-            ),
-            (
-                r"\blooks?\s+back\s+at\s+(?:the\s+)?phone,?\s*repeats?"
-                r"\s+rapid\s+upward\s+swipes?.*?\b(?:thumb\s+)?"
-                r"stop(?:s|ping)?(?:\s+above\s+(?:the\s+)?screen)?\b",
-                "rapidly swipes; thumb stops",
-            ),
-            (
-                r"\brepeats?\s+rapid\s+upward\s+swipes?\s+and\s+"
-                r"(?:suddenly\s+)?stops?\b",
-                "rapidly swipes; stops",
-            ),
-            (
-                r"\brepeats?\s+rapid\s+upward\s+swipes?\b",
-                "rapidly swipes",
-            ),
-            (
-                r"\b(?:her\s+)?thumb\s+(?:stop(?:s|ping)?|is\s+stopped)"
-                r"(?:\s+above|\s+over)?\s+(?:the\s+)?screen\b",
-                "thumb stops",
-            ),
-            (
-                r"\b(?:her\s+)?stopped\s+hand\s+hovers?\s+over\s+"
-                r"(?:the\s+)?phone\s+as\s+(?:the\s+)?repeated[- ]swipe"
-                r"\s+light\s+trail\s+collapses?\s+into\s+darkness\b",
-                "hand hovers; swipe trail fades",
-            ),
-            (
-                r"\b(?:her\s+)?stopped\s+hand\s+hovers?\s+as\s+"
-                r"(?:the\s+)?light\s+trail\s+collapses?\b",
-                "hand hovers; trail fades",
-            ),
-            (
-                r"\bunplugs?\s+(?:the\s+)?cable\s+and\s+(?:reveals?|shows?)"
-                r"\s+(?:the\s+)?(?:product\s+)?bottle\b",
-                "product-package-visible",
-            ),
-            (
-                r"\bunplugs?\s+(?:the\s+)?cable\s+and\s+follows?\s+its"
-                r"\s+movement\s+to\s+(?:the\s+)?nightstand\b",
-                "unplugs cable; follows to nightstand",
-            ),
-            (
-                r"\b(?:she\s+)?(?:decisively\s+)?turns?\s+(?:the\s+)?"
-                r"phone\s+face-down\s+in\s+(?:her\s+)?palm\s+and\s+"
-                r"sits?\s+up\b",
-                "phone-face-down; sits up",
-            ),
-            (
-                r"\bher\s+thumb\s+keeps\s+scrolling\s+while\s+an\s+"
-                r"oversized\s+phone\s+portal\s+pulls\s+luminous\s+shards\s+"
-                r"into\s+the\s+room\b",
-                "scrolling phone portal pulls luminous shards",
-            ),
-            (
-                r"\bshow\s+(?:the\s+)?woman\s+awake\s+in\s+bed\s+"
-                r"holding\s+(?:a\s+)?phone\b",
-                "woman awake in bed with phone",
-            ),
-            (
-                r"\b(?:she|the\s+woman|the\s+protagonist)\s+holds\s+"
-                r"(?:the\s+)?uploaded\s+bottle\s+in\s+(?:a\s+)?warm\s+"
-                r"setting\s+and\s+presents\s+exactly\s+two\s+gummies\b",
-                "holds uploaded bottle; presents exactly two gummies",
-            ),
-            (
-                r"\b(?:in\s+)?(?:the\s+)?cool-blue\s+bedroom,?\s+"
-                r"(?:the\s+)?woman\b",
-                "woman in cool-blue bedroom",
-            ),
-            (
-                r"\b(?:she|the\s+woman|the\s+protagonist)\s+makes\s+"
-                r"one\s+deliberate\s+choice[:,]?\s+place(?:s)?\s+(?:the\s+)?"
-                r"phone\s+face-down\s+on\s+(?:the\s+)?bedside\b",
-                "phone face-down on bedside",
-            ),
-            (
-                r"\b(?:the\s+)?phone\s+(?:already\s+)?face[- ]down\s+on\s+"
-                r"(?:the\s+)?bedside\s+surface\s+with\s+(?:the\s+)?"
-                r"woman's\s+hand\s+fully\s+withdrawn\b",
-                "phone face-down; hand out of frame",
-            ),
-            (
-                r"\bhold\s+(?:the\s+)?bottle\s+in\s+(?:the\s+)?warm\s+"
-                r"setting\b",
-                "hold bottle in warm setting",
-            ),
-            (
-                r"^use\s+hard\s+cuts\s+between\s+three\s+completed\s+"
-                r"states:\s*",
-                "",
-            ),
-            (
-                r"\b(?:the\s+)?room\s+changes\s+from\s+cool-blue\s+"
-                r"phone\s+light\s+to\s+warm\s+light\b",
-                "light blue-to-warm",
-            ),
-            (
-                r"\bhard\s+cut\s+(?:back\s+)?from\s+(.+?)\s+to\s+"
-                r"(.+?)(?=(?:[.;]|$))",
-                r"\1 -> \2",
-            ),
-            (
-                r"\b(?:the\s+)?(?:narrator|protagonist)\s+(?:is\s+)?"
-                r"(?:seated|sits)\s+(?:beside|on)\s+(?:the\s+)?"
-                r"(?:bed|bedside)\b",
-                "",
-            ),
-            (
-                r"\b(?:she|narrator|protagonist)\s+turns\s+(?:the\s+)?"
-                r"phone\s+face-down\b",
-                "phone face-down",
-            ),
-            (
-                r"\b(?:the\s+)?phone\s+is\s+(?:already\s+)?face-down\b",
-                "phone face-down",
-            ),
-            (
-                r"\b(?:both\s+)?hands\s+are\s+empty\b",
-                "hands empty",
-            ),
-            (
-                r"\b(?:exactly\s+)?two\s+unbranded\s+gummies\s+"
-                r"(?:resting\s+)?(?:visibly\s+)?in\s+(?:her\s+)?"
-                r"(?:open\s+)?(?:other\s+)?palm\b",
-                "two unbranded gummies in palm",
-            ),
-            (
-                r"\b(?:her\s+)?(?:other\s+)?open\s+palm\s+presents\s+"
-                r"exactly\s+two\s+gummies\s+(?:separately\s+)?beside\s+"
-                r"(?:the\s+)?package\b",
-                "two gummies in open palm beside package",
-            ),
-            (
-                r"\b(?:the\s+)?(?:narrator|protagonist)\s+makes\s+"
-                r"one\s+single\s+fingertip\s+tap\b",
-                "one fingertip tap",
-            ),
-            (r"\bhard\s+cut\s+(?:back\s+)?to\b", ""),
-        )
-        for pattern, replacement in canonical_states:
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-        # Exact readable values live in the lossless Must lane. Remove their
-        # verbose source clauses from Beats so the scarce motion lane can keep
-        # the human action around them instead of repeating the same digits.
-        text = _READABLE_VALUE_RE.sub("", text)
-        text = re.sub(r"\b(?:and|with)\s*(?=[;,.]|$)", "", text, flags=re.IGNORECASE)
-        # Keep object orientation as one semantic token during fair-share
-        # allocation.  Otherwise a tiny lane can retain only ``phone`` and
-        # discard the state-changing ``face-down`` suffix.
-        text = re.sub(
-            r"\bphone\s+face-down\b",
-            "phone-face-down",
-            text,
-            flags=re.IGNORECASE,
-        )
-        text = re.sub(
-            r"\b(?:decisively\s+)?turns?\s+(?:the\s+)?phone-face-down\b",
-            "phone-face-down",
-            text,
-            flags=re.IGNORECASE,
-        )
-        text = re.sub(
-            r"\bphone-face-down\s+and\s+sits?\s+up\b",
-            "phone-face-down; sits up",
-            text,
-            flags=re.IGNORECASE,
-        )
-        text = re.sub(
-            r"\b(?:the\s+)?(?:MYUPONA\s+|product\s+)?bottle\s+"
-            r"(?:becomes?|is)\s+(?:clearly\s+)?visible\b",
-            "product-bottle-visible",
-            text,
-            flags=re.IGNORECASE,
-        )
-        # Put immutable state changes before descriptive motion.  The
-        # word-boundary compactor keeps the start of a tiny beat; without this
-        # ordering, a required bottle reveal at the end of a natural sentence
-        # can disappear even though less important travel motion survives.
-        priority_tokens = (
-            "product-bottle-visible",
-            "phone-face-down",
-            "phone-screen-up",
-            "exactly-two-gummies",
-        )
-        prioritized: list[str] = []
-        for token in priority_tokens:
-            if token.casefold() not in text.casefold():
-                continue
-            text = re.sub(
-                re.escape(token),
-                "",
-                text,
-                count=1,
-                flags=re.IGNORECASE,
-            ).strip(" ,.;")
-            prioritized.append(token)
-        if prioritized:
-            text = "; ".join([*prioritized, text] if text else prioritized)
-        text = re.sub(
-            r"\bphone\s+screen-up\b",
-            "phone-screen-up",
-            text,
-            flags=re.IGNORECASE,
-        )
-        text = re.sub(
-            r"\bexactly\s+two\s+gummies\b",
-            "exactly-two-gummies",
-            text,
-            flags=re.IGNORECASE,
-        )
-        text = re.sub(
-            r"\bamber\s+pulse\b",
-            "amber-pulse",
-            text,
-            flags=re.IGNORECASE,
-        )
-        text = re.sub(r"\s+", " ", text).strip(" ,.;")
-        if " -> " in text:
-            # In a transition the post-cut state is the actual acceptance
-            # target.  Put it first before round-robin token allocation so a
-            # small provider lane cannot preserve only the pre-cut setup and
-            # silently lose the required final object state.
-            before, after = text.split(" -> ", 1)
-            text = f"{after}; {before}"
-        text = re.sub(
-            r"^(?:the\s+)?silent\s+visible\s+protagonist\b",
-            "She",
-            text,
-            flags=re.IGNORECASE,
-        )
-        text = re.sub(
-            r"^the\s+protagonist\b",
-            "She",
-            text,
-            flags=re.IGNORECASE,
-        )
-        # Reference images already identify the cast.  Remove only a leading
-        # subject label so a tiny per-beat budget starts on the observable
-        # verb instead of returning an empty action because a long subject
-        # such as ``female-presenting protagonist`` consumed the whole lane.
-        text = re.sub(
-            r"^(?:the\s+)?(?:(?:female|male)[- ]presenting\s+)?"
-            r"(?:adult\s+)?(?:protagonist|woman|man|character)\s+",
-            "",
-            text,
-            flags=re.IGNORECASE,
-        )
-        text = re.sub(
-            r"^(?:she|he|they|her|his|their)\s+",
-            "",
-            text,
-            flags=re.IGNORECASE,
-        )
-        text = re.sub(
-            r"^tight\s+on\s+the\s+protagonist's\b",
-            "Her",
-            text,
-            flags=re.IGNORECASE,
-        )
-        clauses = [
-            part.strip(" ,")
-            for part in re.split(
-                r"\s*;\s*|\s*->\s*|\.\s+|:\s*|\s+while\s+|,\s*then\s+|"
-                r"\s+and\s+then\s+|,\s*|\s*；\s*|\s*。\s*|"
-                r"\s*：\s*|\s*，\s*",
-                text,
-                flags=re.IGNORECASE,
-            )
-            if part.strip(" ,")
-        ]
-        filler_words = {
-            "a", "an", "the", "same", "silent", "visible", "protagonist",
-            "authoritative", "oversized",
-            "continues", "begins", "starts", "completely", "naturally",
-            "softly", "implied", "generic", "containing",
-            # The ordered package reference already carries label color and
-            # layout.  Spend the scarce text lane on semantic product facts
-            # (brand, Melatonin-free, serving action) instead.
-            "purple", "label", "front", "marking", "enters",
-            "now", "still", "aggressive", "tight", "stable",
-            "narrator", "seated", "hard", "quiet", "fully",
-            "separately", "already", "both", "bare", "transition",
-        }
-
-        clause_phrases = []
-        for clause in clauses:
-            clause = re.sub(
-                r"^(?:she|he|they|her|his|their)\s+",
-                "",
-                clause,
-                flags=re.IGNORECASE,
-            )
-            if _CJK_CHARACTER_RE.search(clause):
-                # The AI has already authored this provider-facing Chinese
-                # action under a combined character budget.  Preserve its
-                # wording and order; the English stop-word tokenizer below is
-                # not a semantic tokenizer for CJK text.
-                clause_phrases.append(clause.strip(" ，。；、,:;."))
-                continue
-            words = [
-                word
-                for word in re.findall(
-                    r"[A-Za-z0-9]+(?:[-'][A-Za-z0-9]+)*",
-                    clause,
-                )
-                if word.lower() not in filler_words
-            ]
-            if words:
-                clause_phrases.append(" ".join(words))
-        if not clause_phrases:
-            return ""
-        # Keep word order and grammatical action phrases.  The old
-        # round-robin/equal-clause allocator could turn a beat into fragments
-        # such as ``cool-blue; physical; 43``.  Exact states are separately
-        # protected by Must, so this lane should remain a readable motion
-        # sentence rather than scattering isolated tokens from every clause.
-        # Add complete clauses only. Partially appending the next clause made
-        # valid AI plans reach providers as fragments such as ``; In`` or
-        # ``woman s``. If even the first clause is too long, trim only that
-        # clause at a word boundary.
-        kept_phrases: list[str] = []
-        for phrase in clause_phrases:
-            candidate = "; ".join([*kept_phrases, phrase])
-            if len(candidate) > budget:
-                break
-            kept_phrases.append(phrase)
-        phrases = (
-            "; ".join(kept_phrases)
-            if kept_phrases
-            else _compact_text_no_ellipsis(clause_phrases[0], budget)
-        )
-        phrases = re.sub(
-            r"\s+(?:a|an|the|at|and|or|as|despite|toward|towards|to|with|"
-            r"while|into|from|for|of|near|over|under)$",
-            "",
-            phrases,
-            flags=re.IGNORECASE,
-        )
-        return (
-            phrases
-            .replace("exactly-two-gummies", "exactly two gummies")
-            .replace("amber-pulse", "amber pulse")
-            .replace("product-package-visible", "product package visible")
-            .replace("phone-face-down", "phone face-down")
-        )
-
     prefix, separator, body = str(line or "").partition(":")
     if not separator:
         return _compact_text(line, limit)
@@ -1373,7 +1361,7 @@ def _compact_local_visual_timeline(line: str, limit: int) -> str:
     for row in rows:
         action_part, fx_separator, effects_part = row.partition("; FX:")
         effects_part, camera_separator, camera_part = effects_part.partition("; Cam:")
-        time_match = re.match(r"^([^:]{1,24}:)\s*(.*)$", action_part)
+        time_match = _BEAT_TIME_LABEL_RE.match(action_part)
         time_label = time_match.group(1) if time_match else ""
         action_text = time_match.group(2) if time_match else action_part
         label_budget = len(time_label) + (1 if time_label else 0)
@@ -1394,7 +1382,7 @@ def _compact_local_visual_timeline(line: str, limit: int) -> str:
             elif _NEGATIVE_PRODUCT_RE.search(action_text):
                 payload = "no product visible"
             else:
-                payload = semantic_clauses(action_text, payload_budget)
+                payload = _semantic_clauses(action_text, payload_budget)
         elif fx_separator and camera_separator:
             # Final animation framing is already visible in the ordered image
             # anchors.  Inside Doubao's 495-character limit, spend the text
@@ -1402,20 +1390,20 @@ def _compact_local_visual_timeline(line: str, limit: int) -> str:
             action_budget = max(12, int(payload_budget * 0.60))
             effects_budget = max(10, payload_budget - action_budget - 5)
             payload = (
-                semantic_clauses(action_text, action_budget)
+                _semantic_clauses(action_text, action_budget)
                 + "; FX: "
-                + semantic_clauses(effects_part, effects_budget)
+                + _semantic_clauses(effects_part, effects_budget)
             )
         elif fx_separator:
             action_budget = max(12, int(payload_budget * 0.58))
             effects_budget = max(10, payload_budget - action_budget - 5)
             payload = (
-                semantic_clauses(action_text, action_budget)
+                _semantic_clauses(action_text, action_budget)
                 + "; FX: "
-                + semantic_clauses(effects_part, effects_budget)
+                + _semantic_clauses(effects_part, effects_budget)
             )
         else:
-            payload = semantic_clauses(action_text, payload_budget)
+            payload = _semantic_clauses(action_text, payload_budget)
         compacted.append((time_label + " " + payload).strip())
     return kept_prefix + " | ".join(compacted)
 
@@ -1457,7 +1445,7 @@ def _tiny_product_authority(reference_line: str) -> str:
     package = ""
     for part in str(reference_line or "").split(";"):
         if re.search(r"\b(?:package|product)\b", part, flags=re.IGNORECASE):
-            handles = re.findall(r"@image\d+", part)
+            handles = _IMAGE_HANDLE_RE.findall(part)
             if handles:
                 package = handles[0]
                 break
@@ -1579,7 +1567,7 @@ def _lean_provider_prompt(lines: list[str], *, limit: int) -> str:
     )
     if not dialogue and not local_voiceover:
         raise ValueError("structured provider prompt has no approved dialogue line")
-    scope_match = re.search(r"(\d+\s*/\s*\d+)", by_prefix["Segment scope:"])
+    scope_match = _SEGMENT_SCOPE_RE.search(by_prefix["Segment scope:"])
     scope = scope_match.group(1).replace(" ", "") if scope_match else "this segment"
     if local_voiceover:
         # The provider owns only the visual/motion lane.  Spend its scarce
@@ -2143,12 +2131,57 @@ def compact_structured_video_prompt(value: str, *, max_characters: int) -> str:
     Full production contracts remain in task metadata.  This function only
     compacts the provider-facing, segment-local execution view.  Dialogue is
     intentionally never truncated because it is owned by the Director.
+    Results are memoized on the stripped packet and budget, so a retry or a
+    second provider lane with the same budget reuses the first compaction.
     """
 
-    prompt = str(value or "").strip()
     limit = int(max_characters)
     if limit < 256:
         raise ValueError("provider prompt limit must be at least 256 characters")
+    return _compact_structured_video_prompt(str(value or "").strip(), limit)
+
+
+def compact_structured_video_prompt_tiers(
+    value: str,
+    *,
+    budgets: Iterable[int],
+) -> dict[int, str]:
+    """Compact one packet for several provider budgets at once.
+
+    Every tier shares the packet's clause parse, semantic invariants and
+    per-budget timeline renders, so the extra tiers cost little more than
+    the first.  Budgets whose approved dialogue and mandatory controls do
+    not fit are left out of the result.
+    """
+
+    limits = sorted({int(budget) for budget in budgets})
+    if limits and limits[0] < 256:
+        raise ValueError("provider prompt limit must be at least 256 characters")
+    prompt = str(value or "").strip()
+    tiers: dict[int, str] = {}
+    for limit in limits:
+        try:
+            tiers[limit] = _compact_structured_video_prompt(prompt, limit)
+        except ValueError:
+            continue
+    return tiers
+
+
+def clear_prompt_budget_caches() -> None:
+    """Drop memoized compactions, e.g. between benchmark rounds."""
+
+    for cached in (
+        _compact_structured_video_prompt,
+        _compact_local_visual_timeline,
+        _semantic_clause_phrases,
+        _semantic_invariants,
+        _localize_structured_video_prompt_for_doubao,
+    ):
+        cached.cache_clear()
+
+
+@lru_cache(maxsize=512)
+def _compact_structured_video_prompt(prompt: str, limit: int) -> str:
     if len(prompt) <= limit:
         # A short packet still must respect the reference/prompt authority
         # boundary.  Reference descriptions are internal visual-review notes,
@@ -2216,7 +2249,7 @@ def compact_structured_video_prompt(value: str, *, max_characters: int) -> str:
                 "picture-in-picture, or watermark; preserve the exact dialogue."
             )
         elif line.startswith("Segment scope:"):
-            match = re.search(r"(\d+\s*/\s*\d+)", line)
+            match = _SEGMENT_SCOPE_RE.search(line)
             scope = match.group(1).replace(" ", "") if match else "this segment"
             compacted.append(
                 f"Segment scope: {scope} only; do not preplay or replay other segments."
@@ -2313,8 +2346,13 @@ def localize_structured_video_prompt_for_doubao(value: str) -> str:
     rewrite or risking translation drift in spoken English copy.
     """
 
+    return _localize_structured_video_prompt_for_doubao(str(value or ""))
+
+
+@lru_cache(maxsize=512)
+def _localize_structured_video_prompt_for_doubao(value: str) -> str:
     localized: list[str] = []
-    for raw_line in str(value or "").splitlines():
+    for raw_line in value.splitlines():
         line = raw_line.strip()
         if not line:
             continue
@@ -2324,11 +2362,7 @@ def localize_structured_video_prompt_for_doubao(value: str) -> str:
                 break
         if line == "No captions, overlays, sales UI, QR, collage, inset, playback UI or watermark.":
             line = "不要字幕、叠加文字、销售界面、二维码、拼贴、画中画、播放界面或水印。"
-        elif re.fullmatch(
-            r"9:16; no captions/UI/watermark; segment \d+/\d+\.",
-            line,
-            flags=re.IGNORECASE,
-        ):
+        elif _DOUBAO_SHORT_OUTPUT_RE.fullmatch(line):
             scope = line.rsplit(" ", 1)[-1].rstrip(".")
             line = f"9:16；不要字幕、界面或水印；只生成片段{scope}。"
         elif line.startswith("Output: 9:16 720p, English (US), one full-frame scene; segment "):
@@ -2352,4 +2386,9 @@ def localize_structured_video_prompt_for_doubao(value: str) -> str:
     return "\n".join(localized)
 
 
-__all__ = ["compact_structured_video_prompt", "is_structured_video_prompt"]
+__all__ = [
+    "clear_prompt_budget_caches",
+    "compact_structured_video_prompt",
+    "compact_structured_video_prompt_tiers",
+    "is_structured_video_prompt",
+]
@@ -27,12 +27,18 @@ from app.data.models.gmv_restructured import (
 from app.data.models.oauth_tiktok_shop import OAuthTikTokShopShop
 from app.data.models.tiktok_shop import (
     TikTokShopOrder,
-    TikTokShopOrderLine,
     TikTokShopProduct,
     TikTokShopSku,
     TikTokShopSyncRun,
 )
 from app.data.models.ttb_entities import TTBAdvertiser, TTBAdvertiserStoreLink
+from app.services.commerce_order_facts import (
+    allocate_order_lines,
+    order_facts_cover,
+    paid_order_line_rows,
+    product_hour_facts,
+    shop_hour_facts,
+)
 from app.services.commerce_orders import (
     CommerceOrderError,
     order_summary,
@@ -607,6 +613,40 @@ def _effective_cost(
     return None
 
 
+def _cost_rates(cost: CommerceProductCostVersion) -> tuple[Decimal, Decimal]:
+    per_unit = (
+        _decimal(cost.unit_cost)
+        + _decimal(cost.packaging_cost)
+        + _decimal(cost.fulfillment_cost)
+        + _decimal(cost.seller_shipping_cost)
+        + _decimal(cost.other_variable_cost)
+    )
+    rate_total = (
+        _decimal(cost.platform_fee_rate)
+        + _decimal(cost.payment_fee_rate)
+        + _decimal(cost.affiliate_commission_rate)
+        + _decimal(cost.expected_refund_rate)
+    )
+    return per_unit, rate_total
+
+
+def _apply_line_cost(
+    target: dict[str, Any],
+    cost: CommerceProductCostVersion | None,
+    *,
+    sku_id: str,
+    quantity: int,
+    allocated_revenue: Decimal,
+) -> None:
+    if cost is None:
+        target["cost_complete"] = False
+        target["missing_cost_skus"].add(sku_id or "product-default")
+        return
+    per_unit, rate_total = _cost_rates(cost)
+    target["fixed_cost"] += per_unit * quantity
+    target["rate_cost"] += allocated_revenue * rate_total
+
+
 def _order_product_metrics(
     db: Session,
     *,
@@ -615,56 +655,11 @@ def _order_product_metrics(
     end_utc: datetime,
     costs: dict[tuple[str, str], list[CommerceProductCostVersion]],
 ) -> dict[str, dict[str, Any]]:
-    base_filters = (
-        TikTokShopOrder.workspace_id == scope.workspace_id,
-        TikTokShopOrder.shop_row_id == int(scope.shop.id),
-        TikTokShopOrder.paid_at.is_not(None),
-        TikTokShopOrder.paid_at >= start_utc,
-        TikTokShopOrder.paid_at < end_utc,
-        TikTokShopOrder.is_sample_order.is_(False),
-        func.upper(func.coalesce(TikTokShopOrder.status, "")).not_in(
-            {"CANCELLED", "CANCELED"}
-        ),
-    )
-    line_revenue = (
-        func.coalesce(TikTokShopOrderLine.sale_price, 0)
-        * func.coalesce(TikTokShopOrderLine.quantity, 0)
-    )
-    rows = db.execute(
-        select(
-            TikTokShopOrder.order_id,
-            TikTokShopOrder.paid_at,
-            TikTokShopOrder.total_amount,
-            TikTokShopOrderLine.product_id,
-            TikTokShopOrderLine.sku_id,
-            func.max(TikTokShopOrderLine.product_name).label("product_name"),
-            func.coalesce(func.sum(TikTokShopOrderLine.quantity), 0).label(
-                "quantity"
-            ),
-            func.coalesce(func.sum(line_revenue), 0).label(
-                "merchandise_revenue"
-            ),
-        )
-        .join(
-            TikTokShopOrder,
-            (
-                (TikTokShopOrder.shop_row_id == TikTokShopOrderLine.shop_row_id)
-                & (TikTokShopOrder.order_id == TikTokShopOrderLine.order_id)
-            ),
-        )
-        .where(*base_filters)
-        .group_by(
-            TikTokShopOrder.order_id,
-            TikTokShopOrder.paid_at,
-            TikTokShopOrder.total_amount,
-            TikTokShopOrderLine.product_id,
-            TikTokShopOrderLine.sku_id,
-        )
-    ).mappings().all()
     products: dict[str, dict[str, Any]] = defaultdict(
         lambda: {
             "product_name": "",
             "order_ids": set(),
+            "orders": 0,
             "quantity": 0,
             "revenue": ZERO,
             "merchandise_revenue": ZERO,
@@ -674,91 +669,104 @@ def _order_product_metrics(
             "missing_cost_skus": set(),
         }
     )
-    order_rows: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for row in rows:
-        order_rows[str(row.get("order_id") or "")].append(dict(row))
-
-    for order_id, entries in order_rows.items():
-        order_total = _decimal(entries[0].get("total_amount"))
-        merchandise_total = sum(
-            (_decimal(item.get("merchandise_revenue")) for item in entries),
-            ZERO,
-        )
-        quantity_total = sum(int(item.get("quantity") or 0) for item in entries)
-        remaining = order_total
-        for index, row in enumerate(entries):
-            product_id = str(row.get("product_id") or "unknown")
-            sku_id = str(row.get("sku_id") or "")
-            quantity = int(row.get("quantity") or 0)
-            item_revenue = _decimal(row.get("merchandise_revenue"))
-            if index == len(entries) - 1:
-                allocated_revenue = remaining
-            elif merchandise_total > 0:
-                allocated_revenue = order_total * item_revenue / merchandise_total
-                remaining -= allocated_revenue
-            elif quantity_total > 0:
-                allocated_revenue = order_total * Decimal(quantity) / Decimal(
-                    quantity_total
-                )
-                remaining -= allocated_revenue
-            else:
-                allocated_revenue = ZERO
-            paid_at = row.get("paid_at")
-            at = paid_at if isinstance(paid_at, datetime) else start_utc
+    raw_ranges = [(start_utc, end_utc)]
+    if order_facts_cover(
+        db,
+        workspace_id=scope.workspace_id,
+        shop_row_id=int(scope.shop.id),
+        start_utc=start_utc,
+        end_utc=end_utc,
+    ):
+        priced_facts = []
+        split_hours: set[datetime] = set()
+        for fact in product_hour_facts(
+            db,
+            workspace_id=scope.workspace_id,
+            shop_row_id=int(scope.shop.id),
+            start_utc=start_utc,
+            end_utc=end_utc,
+        ):
+            product_id = str(fact.product_id)
+            sku_id = str(fact.sku_id or "")
             cost = _effective_cost(
-                costs,
-                product_id=product_id,
-                sku_id=sku_id,
-                at=at,
+                costs, product_id=product_id, sku_id=sku_id, at=fact.first_paid_at
             )
-            target = products[product_id]
+            if cost is not _effective_cost(
+                costs, product_id=product_id, sku_id=sku_id, at=fact.last_paid_at
+            ):
+                # A cost version took effect inside this hour; price the
+                # hour's orders one by one instead.
+                split_hours.add(fact.paid_hour)
+            priced_facts.append((fact, cost))
+        for fact, cost in priced_facts:
+            if fact.paid_hour in split_hours:
+                continue
+            target = products[str(fact.product_id)]
             target["product_name"] = str(
-                row.get("product_name") or target["product_name"] or ""
+                fact.product_name or target["product_name"] or ""
             )
-            target["order_ids"].add(order_id)
-            target["quantity"] += quantity
-            target["revenue"] += allocated_revenue
-            target["merchandise_revenue"] += item_revenue
-            if cost is None:
-                target["cost_complete"] = False
-                target["missing_cost_skus"].add(
-                    sku_id or "product-default"
-                )
-                continue
-            per_unit = (
-                _decimal(cost.unit_cost)
-                + _decimal(cost.packaging_cost)
-                + _decimal(cost.fulfillment_cost)
-                + _decimal(cost.seller_shipping_cost)
-                + _decimal(cost.other_variable_cost)
+            target["orders"] += int(fact.product_orders or 0)
+            target["quantity"] += int(fact.quantity or 0)
+            target["revenue"] += _decimal(fact.allocated_revenue)
+            target["merchandise_revenue"] += _decimal(fact.merchandise_revenue)
+            _apply_line_cost(
+                target,
+                cost,
+                sku_id=str(fact.sku_id or ""),
+                quantity=int(fact.quantity or 0),
+                allocated_revenue=_decimal(fact.allocated_revenue),
             )
-            rate_total = (
-                _decimal(cost.platform_fee_rate)
-                + _decimal(cost.payment_fee_rate)
-                + _decimal(cost.affiliate_commission_rate)
-                + _decimal(cost.expected_refund_rate)
+        raw_ranges = [
+            (hour, hour + timedelta(hours=1)) for hour in sorted(split_hours)
+        ]
+
+    for range_start, range_end in raw_ranges:
+        rows = paid_order_line_rows(
+            db,
+            workspace_id=scope.workspace_id,
+            shop_row_id=int(scope.shop.id),
+            start_utc=range_start,
+            end_utc=range_end,
+        )
+        for line in allocate_order_lines(rows):
+            product_id = line["product_id"]
+            sku_id = line["sku_id"]
+            paid_at = line["paid_at"]
+            at = paid_at if isinstance(paid_at, datetime) else range_start
+            target = products[product_id]
+            target["product_name"] = str(
+                line["product_name"] or target["product_name"] or ""
+            )
+            target["order_ids"].add(line["order_id"])
+            target["quantity"] += line["quantity"]
+            target["revenue"] += line["allocated_revenue"]
+            target["merchandise_revenue"] += line["merchandise_revenue"]
+            _apply_line_cost(
+                target,
+                _effective_cost(costs, product_id=product_id, sku_id=sku_id, at=at),
+                sku_id=sku_id,
+                quantity=line["quantity"],
+                allocated_revenue=line["allocated_revenue"],
             )
-            target["fixed_cost"] += per_unit * quantity
-            target["rate_cost"] += allocated_revenue * rate_total
     for target in products.values():
-        target["orders"] = len(target.pop("order_ids"))
+        target["orders"] += len(target.pop("order_ids"))
     return products
 
 
-def _shop_daily_trends(
+def _shop_hourly_order_rows(
     db: Session,
     *,
     scope: CommerceScope,
     start_utc: datetime,
     end_utc: datetime,
-) -> dict[date, dict[str, Decimal | int]]:
+) -> list[Any]:
     dialect = str(db.get_bind().dialect.name)
     hour_expression = (
         func.strftime("%Y-%m-%d %H:00:00", TikTokShopOrder.paid_at)
         if dialect == "sqlite"
         else func.date_format(TikTokShopOrder.paid_at, "%Y-%m-%d %H:00:00")
     )
-    rows = db.execute(
+    return db.execute(
         select(
             hour_expression.label("paid_hour"),
             func.count(TikTokShopOrder.id).label("orders"),
@@ -779,6 +787,36 @@ def _shop_daily_trends(
         )
         .group_by(hour_expression)
     ).mappings().all()
+
+
+def _shop_daily_trends(
+    db: Session,
+    *,
+    scope: CommerceScope,
+    start_utc: datetime,
+    end_utc: datetime,
+) -> dict[date, dict[str, Decimal | int]]:
+    if order_facts_cover(
+        db,
+        workspace_id=scope.workspace_id,
+        shop_row_id=int(scope.shop.id),
+        start_utc=start_utc,
+        end_utc=end_utc,
+    ):
+        rows = [
+            {"paid_hour": paid_hour, "orders": orders, "revenue": revenue}
+            for paid_hour, orders, revenue in shop_hour_facts(
+                db,
+                workspace_id=scope.workspace_id,
+                shop_row_id=int(scope.shop.id),
+                start_utc=start_utc,
+                end_utc=end_utc,
+            )
+        ]
+    else:
+        rows = _shop_hourly_order_rows(
+            db, scope=scope, start_utc=start_utc, end_utc=end_utc
+        )
     zone = ZoneInfo(scope.reporting_timezone)
     result: dict[date, dict[str, Decimal | int]] = defaultdict(
         lambda: {"orders": 0, "revenue": ZERO}
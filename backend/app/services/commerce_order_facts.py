@@ -0,0 +1,453 @@
+"""Hourly order facts behind the commerce overview.
+
+The overview used to join every paid order and line in the requested range
+on each page load.  Order syncs now maintain two small fact tables at UTC-hour
+grain: per product/SKU line totals with the paid total already allocated
+across each order's lines, and per shop order counts.  A reporting day in
+any whole-hour timezone is a contiguous run of UTC hours, so the overview
+reads pre-aggregated rows no matter how large the order history grows.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.data.models.commerce import (
+    CommerceOrderFactState,
+    CommerceOrderProductHourlyFact,
+    CommerceShopOrderHourlyFact,
+)
+from app.data.models.tiktok_shop import TikTokShopOrder, TikTokShopOrderLine
+
+
+ZERO = Decimal("0")
+_HOUR = timedelta(hours=1)
+_REBUILD_WINDOW = timedelta(days=7)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _decimal(value: Any) -> Decimal:
+    if value is None:
+        return ZERO
+    try:
+        return Decimal(str(value))
+    except Exception:
+        return ZERO
+
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _paid_order_filters(*, workspace_id: int, shop_row_id: int, start_utc: datetime, end_utc: datetime) -> tuple:
+    return (
+        TikTokShopOrder.workspace_id == int(workspace_id),
+        TikTokShopOrder.shop_row_id == int(shop_row_id),
+        TikTokShopOrder.paid_at.is_not(None),
+        TikTokShopOrder.paid_at >= start_utc,
+        TikTokShopOrder.paid_at < end_utc,
+        TikTokShopOrder.is_sample_order.is_(False),
+        func.upper(func.coalesce(TikTokShopOrder.status, "")).not_in({"CANCELLED", "CANCELED"}),
+    )
+
+
+def paid_order_line_rows(
+    db: Session,
+    *,
+    workspace_id: int,
+    shop_row_id: int,
+    start_utc: datetime,
+    end_utc: datetime,
+) -> Sequence[Mapping[str, Any]]:
+    """Paid order lines grouped per order, product and SKU."""
+
+    line_revenue = func.coalesce(TikTokShopOrderLine.sale_price, 0) * func.coalesce(
+        TikTokShopOrderLine.quantity, 0
+    )
+    return db.execute(
+        select(
+            TikTokShopOrder.order_id,
+            TikTokShopOrder.paid_at,
+            TikTokShopOrder.total_amount,
+            TikTokShopOrderLine.product_id,
+            TikTokShopOrderLine.sku_id,
+            func.max(TikTokShopOrderLine.product_name).label("product_name"),
+            func.coalesce(func.sum(TikTokShopOrderLine.quantity), 0).label("quantity"),
+            func.coalesce(func.sum(line_revenue), 0).label("merchandise_revenue"),
+        )
+        .join(
+            TikTokShopOrder,
+            (
+                (TikTokShopOrder.shop_row_id == TikTokShopOrderLine.shop_row_id)
+                & (TikTokShopOrder.order_id == TikTokShopOrderLine.order_id)
+            ),
+        )
+        .where(
+            *_paid_order_filters(
+                workspace_id=workspace_id,
+                shop_row_id=shop_row_id,
+                start_utc=start_utc,
+                end_utc=end_utc,
+            )
+        )
+        .group_by(
+            TikTokShopOrder.order_id,
+            TikTokShopOrder.paid_at,
+            TikTokShopOrder.total_amount,
+            TikTokShopOrderLine.product_id,
+            TikTokShopOrderLine.sku_id,
+        )
+    ).mappings().all()
+
+
+def allocate_order_lines(rows: Iterable[Mapping[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Split each order's paid total across its product/SKU lines.
+
+    Revenue is allocated by merchandise value, then by quantity, and the last
+    line absorbs the remainder so every order reconciles to its paid total.
+    """
+
+    order_rows: dict[str, list[Mapping[str, Any]]] = defaultdict(list)
+    for row in rows:
+        order_rows[str(row.get("order_id") or "")].append(row)
+    for order_id, entries in order_rows.items():
+        order_total = _decimal(entries[0].get("total_amount"))
+        merchandise_total = sum((_decimal(item.get("merchandise_revenue")) for item in entries), ZERO)
+        quantity_total = sum(int(item.get("quantity") or 0) for item in entries)
+        remaining = order_total
+        for index, row in enumerate(entries):
+            quantity = int(row.get("quantity") or 0)
+            item_revenue = _decimal(row.get("merchandise_revenue"))
+            if index == len(entries) - 1:
+                allocated_revenue = remaining
+            elif merchandise_total > 0:
+                allocated_revenue = order_total * item_revenue / merchandise_total
+                remaining -= allocated_revenue
+            elif quantity_total > 0:
+                allocated_revenue = order_total * Decimal(quantity) / Decimal(quantity_total)
+                remaining -= allocated_revenue
+            else:
+                allocated_revenue = ZERO
+            yield {
+                "order_id": order_id,
+                "paid_at": row.get("paid_at"),
+                "product_id": str(row.get("product_id") or "unknown"),
+                "sku_id": str(row.get("sku_id") or ""),
+                "product_name": row.get("product_name"),
+                "quantity": quantity,
+                "merchandise_revenue": item_revenue,
+                "allocated_revenue": allocated_revenue,
+            }
+
+
+def _product_fact_rows(
+    lines: Iterable[Mapping[str, Any]],
+    *,
+    workspace_id: int,
+    shop_row_id: int,
+    refreshed_at: datetime,
+) -> list[dict[str, Any]]:
+    facts: dict[tuple[datetime, str, str], dict[str, Any]] = {}
+    counted_orders: dict[tuple[datetime, str], dict[str, str]] = defaultdict(dict)
+    for line in lines:
+        paid_at = line.get("paid_at")
+        if not isinstance(paid_at, datetime):
+            continue
+        hour = floor_hour(paid_at)
+        key = (hour, line["product_id"], line["sku_id"])
+        fact = facts.get(key)
+        if fact is None:
+            fact = facts[key] = {
+                "workspace_id": int(workspace_id),
+                "shop_row_id": int(shop_row_id),
+                "paid_hour": hour,
+                "product_id": line["product_id"],
+                "sku_id": line["sku_id"],
+                "product_name": None,
+                "product_orders": 0,
+                "quantity": 0,
+                "merchandise_revenue": ZERO,
+                "allocated_revenue": ZERO,
+                "first_paid_at": paid_at,
+                "last_paid_at": paid_at,
+                "refreshed_at": refreshed_at,
+            }
+        if line.get("product_name"):
+            fact["product_name"] = str(line["product_name"])[:1024]
+        fact["quantity"] += int(line["quantity"])
+        fact["merchandise_revenue"] += line["merchandise_revenue"]
+        fact["allocated_revenue"] += line["allocated_revenue"]
+        fact["first_paid_at"] = min(fact["first_paid_at"], paid_at)
+        fact["last_paid_at"] = max(fact["last_paid_at"], paid_at)
+        # Count an order once per product: on its lowest SKU in this hour.
+        owners = counted_orders[(hour, line["product_id"])]
+        owner = owners.get(line["order_id"])
+        if owner is None or line["sku_id"] < owner:
+            owners[line["order_id"]] = line["sku_id"]
+    for (hour, product_id), owners in counted_orders.items():
+        for sku_id in owners.values():
+            facts[(hour, product_id, sku_id)]["product_orders"] += 1
+    return list(facts.values())
+
+
+def _shop_fact_rows(
+    db: Session,
+    *,
+    workspace_id: int,
+    shop_row_id: int,
+    start_utc: datetime,
+    end_utc: datetime,
+    refreshed_at: datetime,
+) -> list[dict[str, Any]]:
+    totals: dict[datetime, dict[str, Any]] = {}
+    for paid_at, total_amount in db.execute(
+        select(TikTokShopOrder.paid_at, TikTokShopOrder.total_amount).where(
+            *_paid_order_filters(
+                workspace_id=workspace_id,
+                shop_row_id=shop_row_id,
+                start_utc=start_utc,
+                end_utc=end_utc,
+            )
+        )
+    ).all():
+        if not isinstance(paid_at, datetime):
+            continue
+        hour = floor_hour(paid_at)
+        fact = totals.setdefault(
+            hour,
+            {
+                "workspace_id": int(workspace_id),
+                "shop_row_id": int(shop_row_id),
+                "paid_hour": hour,
+                "orders": 0,
+                "revenue": ZERO,
+                "refreshed_at": refreshed_at,
+            },
+        )
+        fact["orders"] += 1
+        fact["revenue"] += _decimal(total_amount)
+    return list(totals.values())
+
+
+def _hour_runs(hours: Iterable[datetime]) -> list[tuple[datetime, datetime]]:
+    """Collapse hour buckets into ``[start, end)`` runs of consecutive hours."""
+
+    runs: list[tuple[datetime, datetime]] = []
+    for hour in sorted({floor_hour(item) for item in hours}):
+        if runs and runs[-1][1] == hour:
+            runs[-1] = (runs[-1][0], hour + _HOUR)
+        else:
+            runs.append((hour, hour + _HOUR))
+    return runs
+
+
+def _rewrite_range(
+    db: Session,
+    *,
+    workspace_id: int,
+    shop_row_id: int,
+    start_utc: datetime,
+    end_utc: datetime,
+    refreshed_at: datetime,
+) -> None:
+    for model in (CommerceOrderProductHourlyFact, CommerceShopOrderHourlyFact):
+        db.execute(
+            delete(model).where(
+                model.workspace_id == int(workspace_id),
+                model.shop_row_id == int(shop_row_id),
+                model.paid_hour >= start_utc,
+                model.paid_hour < end_utc,
+            )
+        )
+    product_rows = _product_fact_rows(
+        allocate_order_lines(
+            paid_order_line_rows(
+                db,
+                workspace_id=workspace_id,
+                shop_row_id=shop_row_id,
+                start_utc=start_utc,
+                end_utc=end_utc,
+            )
+        ),
+        workspace_id=workspace_id,
+        shop_row_id=shop_row_id,
+        refreshed_at=refreshed_at,
+    )
+    if product_rows:
+        db.execute(insert(CommerceOrderProductHourlyFact), product_rows)
+    shop_rows = _shop_fact_rows(
+        db,
+        workspace_id=workspace_id,
+        shop_row_id=shop_row_id,
+        start_utc=start_utc,
+        end_utc=end_utc,
+        refreshed_at=refreshed_at,
+    )
+    if shop_rows:
+        db.execute(insert(CommerceShopOrderHourlyFact), shop_rows)
+
+
+def _fact_state(db: Session, *, workspace_id: int, shop_row_id: int) -> CommerceOrderFactState | None:
+    return db.scalar(
+        select(CommerceOrderFactState).where(
+            CommerceOrderFactState.workspace_id == int(workspace_id),
+            CommerceOrderFactState.shop_row_id == int(shop_row_id),
+        )
+    )
+
+
+def rebuild_order_facts(db: Session, *, workspace_id: int, shop_row_id: int) -> CommerceOrderFactState:
+    """Rebuild every hourly fact of a shop in bounded windows."""
+
+    now = _utcnow()
+    bounds = db.execute(
+        select(func.min(TikTokShopOrder.paid_at), func.max(TikTokShopOrder.paid_at)).where(
+            TikTokShopOrder.workspace_id == int(workspace_id),
+            TikTokShopOrder.shop_row_id == int(shop_row_id),
+            TikTokShopOrder.paid_at.is_not(None),
+        )
+    ).one()
+    for model in (CommerceOrderProductHourlyFact, CommerceShopOrderHourlyFact):
+        db.execute(
+            delete(model).where(
+                model.workspace_id == int(workspace_id),
+                model.shop_row_id == int(shop_row_id),
+            )
+        )
+    first_paid, last_paid = bounds
+    if isinstance(first_paid, datetime) and isinstance(last_paid, datetime):
+        cursor = floor_hour(first_paid)
+        end = floor_hour(last_paid) + _HOUR
+        while cursor < end:
+            window_end = min(end, cursor + _REBUILD_WINDOW)
+            _rewrite_range(
+                db,
+                workspace_id=workspace_id,
+                shop_row_id=shop_row_id,
+                start_utc=cursor,
+                end_utc=window_end,
+                refreshed_at=now,
+            )
+            cursor = window_end
+    state = _fact_state(db, workspace_id=workspace_id, shop_row_id=shop_row_id)
+    if state is None:
+        state = CommerceOrderFactState(workspace_id=int(workspace_id), shop_row_id=int(shop_row_id))
+    state.rebuilt_at = now
+    state.refreshed_at = now
+    db.add(state)
+    db.flush()
+    return state
+
+
+def refresh_order_facts(
+    db: Session,
+    *,
+    workspace_id: int,
+    shop_row_id: int,
+    hours: Iterable[datetime],
+) -> None:
+    """Recompute the facts of the UTC hours an order sync touched.
+
+    The first refresh of a shop rebuilds its whole history so readers can
+    trust the facts from then on.
+    """
+
+    db.flush()
+    state = _fact_state(db, workspace_id=workspace_id, shop_row_id=shop_row_id)
+    if state is None:
+        rebuild_order_facts(db, workspace_id=workspace_id, shop_row_id=shop_row_id)
+        return
+    now = _utcnow()
+    for start_utc, end_utc in _hour_runs(hours):
+        _rewrite_range(
+            db,
+            workspace_id=workspace_id,
+            shop_row_id=shop_row_id,
+            start_utc=start_utc,
+            end_utc=end_utc,
+            refreshed_at=now,
+        )
+    state.refreshed_at = now
+    db.add(state)
+    db.flush()
+
+
+def order_facts_cover(
+    db: Session,
+    *,
+    workspace_id: int,
+    shop_row_id: int,
+    start_utc: datetime,
+    end_utc: datetime,
+) -> bool:
+    """Whether ``[start_utc, end_utc)`` can be answered from hourly facts."""
+
+    if start_utc != floor_hour(start_utc) or end_utc != floor_hour(end_utc):
+        return False
+    return _fact_state(db, workspace_id=workspace_id, shop_row_id=shop_row_id) is not None
+
+
+def product_hour_facts(
+    db: Session,
+    *,
+    workspace_id: int,
+    shop_row_id: int,
+    start_utc: datetime,
+    end_utc: datetime,
+) -> Sequence[CommerceOrderProductHourlyFact]:
+    return list(
+        db.scalars(
+            select(CommerceOrderProductHourlyFact).where(
+                CommerceOrderProductHourlyFact.workspace_id == int(workspace_id),
+                CommerceOrderProductHourlyFact.shop_row_id == int(shop_row_id),
+                CommerceOrderProductHourlyFact.paid_hour >= start_utc,
+                CommerceOrderProductHourlyFact.paid_hour < end_utc,
+            )
+        )
+    )
+
+
+def shop_hour_facts(
+    db: Session,
+    *,
+    workspace_id: int,
+    shop_row_id: int,
+    start_utc: datetime,
+    end_utc: datetime,
+) -> list[tuple[datetime, int, Decimal]]:
+    return [
+        (paid_hour, int(orders or 0), _decimal(revenue))
+        for paid_hour, orders, revenue in db.execute(
+            select(
+                CommerceShopOrderHourlyFact.paid_hour,
+                CommerceShopOrderHourlyFact.orders,
+                CommerceShopOrderHourlyFact.revenue,
+            ).where(
+                CommerceShopOrderHourlyFact.workspace_id == int(workspace_id),
+                CommerceShopOrderHourlyFact.shop_row_id == int(shop_row_id),
+                CommerceShopOrderHourlyFact.paid_hour >= start_utc,
+                CommerceShopOrderHourlyFact.paid_hour < end_utc,
+            )
+        ).all()
+    ]
+
+
+__all__ = [
+    "allocate_order_lines",
+    "floor_hour",
+    "order_facts_cover",
+    "paid_order_line_rows",
+    "product_hour_facts",
+    "rebuild_order_facts",
+    "refresh_order_facts",
+    "shop_hour_facts",
+]
@@ -886,6 +886,43 @@ def _reconcile_asset_product_partitions(
     return removed
 
 
+def _refresh_asset_leaderboards(
+    session: Session,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    item_ids: set[str],
+) -> None:
+    """Re-rank leaderboard creatives whose asset rows this sync changed."""
+
+    # Imported here: the leaderboard reaches this module through the media cache.
+    from app.services.gmvmax_creative_leaderboard import refresh_asset_leaderboards
+
+    try:
+        with session.begin_nested():
+            refresh_asset_leaderboards(
+                session,
+                workspace_id=workspace_id,
+                auth_id=auth_id,
+                advertiser_id=advertiser_id,
+                store_id=store_id,
+                item_ids=item_ids,
+            )
+    except Exception:  # noqa: BLE001 - boards are rebuilt when their window moves
+        logger.warning(
+            "gmvmax creative leaderboard asset refresh failed",
+            exc_info=True,
+            extra={
+                "workspace_id": workspace_id,
+                "auth_id": auth_id,
+                "advertiser_id": advertiser_id,
+                "store_id": store_id,
+            },
+        )
+
+
 async def _sync_creative_assets_for_scope_unlocked(
     session: Session,
     client: TikTokBusinessGMVMaxClient,
@@ -1064,6 +1101,14 @@ async def _sync_creative_assets_for_scope_unlocked(
                 store_id=store_id,
                 seen_item_ids=seen_ids,
             )
+    _refresh_asset_leaderboards(
+        session,
+        workspace_id=workspace_id,
+        auth_id=auth_id,
+        advertiser_id=advertiser_id,
+        store_id=store_id,
+        item_ids=set(payloads_by_item_id),
+    )
 
     return {
         "requested": len(requested_ids),
@@ -1211,6 +1256,15 @@ async def _backfill_missing_creative_assets_for_scope_unlocked(
             store_id=store_id,
             payload=payload,
         )
+    if matched_payloads:
+        _refresh_asset_leaderboards(
+            session,
+            workspace_id=workspace_id,
+            auth_id=auth_id,
+            advertiser_id=advertiser_id,
+            store_id=store_id,
+            item_ids=set(matched_payloads),
+        )
 
     matched_ids = cached_ids | set(matched_payloads)
     return {
@@ -0,0 +1,822 @@
+"""Precomputed Hermes creative leaderboards for GMV Max candidate pages.
+
+Ranking every cached asset of a store on each candidate request means joining
+the whole asset cache to a lookback metrics aggregate and scoring it in
+Python.  A board stores that ranking once per scope, product and lookback;
+readers page through it by position and only load the asset rows on the
+requested page.  Boards are built by a background task on first request,
+and creative metric and asset syncs re-rank only the creatives they changed.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable, Mapping, Sequence
+
+from sqlalchemy import bindparam, delete, func, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.data.models.gmvmax_creative_leaderboard import (
+    GmvmaxCreativeLeaderboardEntry,
+    GmvmaxCreativeLeaderboardState,
+)
+from app.services.gmvmax_creative_candidates import (
+    creative_asset_candidate_from_row,
+    creative_metrics_statement,
+    load_historical_removed_creatives,
+    money_from_cents,
+    product_price_for_hermes,
+)
+from app.services.gmvmax_hermes_creative_ranker import (
+    TIER_PRIORITY,
+    VALIDATION_REASON_SUFFIX,
+    order_scored_candidates,
+    score_creative_candidate,
+)
+from app.services.redis_client import get_redis_sync
+
+logger = logging.getLogger("gmv.services.gmvmax.creative_leaderboard")
+
+STORE_WIDE_KEY = ""
+MINIMUM_ROI = 0.8
+RECOMMENDATION_LIMIT = 4
+# Tiers Hermes recommends before the recommendation limit is applied.
+RECOMMENDED_TIERS = frozenset({"WINNER", "PROMISING"})
+BUILD_CLAIM_SECONDS = 120
+
+_METRIC_FIELDS = (
+    "cost_cents",
+    "gross_revenue_cents",
+    "orders",
+    "clicks",
+    "impressions",
+    "product_clicks",
+    "product_impressions",
+    "ad_video_view_rate_2s",
+    "ad_video_view_rate_6s",
+    "ad_video_view_rate_p100",
+)
+_HERMES_FIELDS = (
+    "score",
+    "hermes_tier",
+    "hermes_confidence",
+    "hermes_reason",
+    "hermes_recommended",
+    "hermes_rank",
+    "hermes_adjusted_roi",
+    "ranking_source",
+)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _board_filters(model: Any, scope: Mapping[str, Any]) -> tuple:
+    return (
+        model.workspace_id == int(scope["workspace_id"]),
+        model.auth_id == int(scope["auth_id"]),
+        model.advertiser_id == str(scope["advertiser_id"]),
+        model.store_id == str(scope["store_id"]),
+        model.item_group_key == str(scope["item_group_key"]),
+        model.lookback_days == int(scope["lookback_days"]),
+    )
+
+
+def _board_scope(
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    item_group_key: str,
+    lookback_days: int,
+) -> dict[str, Any]:
+    return {
+        "workspace_id": int(workspace_id),
+        "auth_id": int(auth_id),
+        "advertiser_id": str(advertiser_id),
+        "store_id": str(store_id),
+        "item_group_key": str(item_group_key or STORE_WIDE_KEY),
+        "lookback_days": int(lookback_days),
+    }
+
+
+def _linked_item_ids(
+    db: Session,
+    scope: Mapping[str, Any],
+    item_ids: Sequence[str] | None = None,
+) -> set[str]:
+    """Creatives TikTok currently associates with the board's product."""
+
+    sql = """
+        select item_id
+        from gmvmax_creative_asset_products
+        where workspace_id=:workspace_id
+          and auth_id=:auth_id
+          and advertiser_id=:advertiser_id
+          and store_id=:store_id
+          and item_group_id=:item_group_id
+    """
+    params: dict[str, Any] = {
+        "workspace_id": scope["workspace_id"],
+        "auth_id": scope["auth_id"],
+        "advertiser_id": scope["advertiser_id"],
+        "store_id": scope["store_id"],
+        "item_group_id": scope["item_group_key"],
+    }
+    statement = text(sql)
+    if item_ids is not None:
+        statement = text(sql + " and item_id in :item_ids").bindparams(
+            bindparam("item_ids", expanding=True)
+        )
+        params["item_ids"] = list(item_ids)
+    return {str(item) for item in db.execute(statement, params).scalars() if item}
+
+
+def _raw_json(value: Any) -> Mapping[str, Any]:
+    if isinstance(value, Mapping):
+        return value
+    if isinstance(value, (str, bytes)) and value:
+        try:
+            parsed = json.loads(value)
+        except (TypeError, ValueError):
+            return {}
+        return parsed if isinstance(parsed, Mapping) else {}
+    return {}
+
+
+def _asset_rows(
+    db: Session,
+    scope: Mapping[str, Any],
+    item_ids: Sequence[str] | None,
+    *,
+    linked: set[str] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Asset cache rows looked up through the asset unique key.
+
+    ``item_ids=None`` reads every asset of the store.  ``linked`` are the
+    product's linked creatives when the caller already loaded them.
+    """
+
+    sql = """
+            select a.id, a.workspace_id, a.auth_id, a.advertiser_id, a.store_id,
+                   a.item_id, a.item_group_id, a.video_id, a.title,
+                   a.preview_url, a.video_cover_url,
+                   a.local_preview_path, a.local_cover_path,
+                   a.preview_content_type, a.cover_content_type, a.media_cache_status,
+                   a.duration, a.identity_id, a.identity_type, a.identity_name,
+                   a.raw_json, a.fetched_at, a.updated_at
+            from gmvmax_creative_asset_cache a
+            where a.workspace_id=:workspace_id
+              and a.auth_id=:auth_id
+              and a.advertiser_id=:advertiser_id
+              and a.store_id=:store_id
+    """
+    params: dict[str, Any] = {
+        "workspace_id": scope["workspace_id"],
+        "auth_id": scope["auth_id"],
+        "advertiser_id": scope["advertiser_id"],
+        "store_id": scope["store_id"],
+    }
+    statement = text(sql)
+    if item_ids is not None:
+        statement = text(sql + " and a.item_id in :item_ids").bindparams(
+            bindparam("item_ids", expanding=True)
+        )
+        params["item_ids"] = list(item_ids)
+    rows = db.execute(statement, params).mappings().all()
+    if linked is None and scope["item_group_key"]:
+        linked = _linked_item_ids(db, scope, item_ids)
+    result: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        item = dict(row)
+        raw = _raw_json(item.pop("raw_json", None))
+        identity_info = raw.get("identity_info") if isinstance(raw.get("identity_info"), Mapping) else {}
+        sync_state = raw.get("_gmv_ops_sync") if isinstance(raw.get("_gmv_ops_sync"), Mapping) else {}
+        item.update(
+            {
+                "identity_authorized_bc_id": identity_info.get("identity_authorized_bc_id")
+                or raw.get("identity_authorized_bc_id"),
+                "identity_authorized_shop_id": identity_info.get("identity_authorized_shop_id")
+                or raw.get("identity_authorized_shop_id"),
+                "can_change_anchor": raw.get("can_change_anchor"),
+                "cache_active": str(sync_state.get("active", "true")).lower(),
+                "partition_active": 1 if linked is None or str(item.get("item_id")) in linked else 0,
+            }
+        )
+        result[str(item.get("item_id") or "")] = item
+    return result
+
+
+def _metric_rows(
+    db: Session,
+    scope: Mapping[str, Any],
+    *,
+    metric_start_date: date,
+    item_ids: Sequence[str] | None = None,
+) -> dict[str, Mapping[str, Any]]:
+    item_group_ids = [scope["item_group_key"]] if scope["item_group_key"] else []
+    rows = db.execute(
+        creative_metrics_statement(
+            has_item_group_filter=bool(item_group_ids),
+            has_creative_filter=item_ids is not None,
+        ),
+        {
+            "workspace_id": scope["workspace_id"],
+            "auth_id": scope["auth_id"],
+            "advertiser_id": scope["advertiser_id"],
+            "store_id": scope["store_id"],
+            "metric_start_date": metric_start_date,
+            "item_group_ids": item_group_ids,
+            "creative_ids": list(item_ids or []),
+        },
+    ).mappings()
+    return {str(row["creative_id"]): row for row in rows if row.get("creative_id")}
+
+
+def _candidate_rows(
+    db: Session,
+    scope: Mapping[str, Any],
+    *,
+    metric_start_date: date,
+    item_ids: Sequence[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Asset rows of a board with their lookback metrics, optionally for some items.
+
+    Metrics and assets are read separately and matched on ``item_id`` here:
+    the metrics table does not share the asset cache collation, and a
+    collate-cast join cannot use either side's index.  A product board holds
+    the creatives linked to the product plus those with product metrics.
+    """
+
+    if item_ids is not None and not item_ids:
+        return []
+    metrics = _metric_rows(db, scope, metric_start_date=metric_start_date, item_ids=item_ids)
+    if scope["item_group_key"]:
+        linked = _linked_item_ids(db, scope, item_ids)
+        asset_ids = sorted(linked | set(metrics))
+        assets = _asset_rows(db, scope, asset_ids, linked=linked) if asset_ids else {}
+    else:
+        assets = _asset_rows(db, scope, item_ids)
+    rows = []
+    for item_id, asset in assets.items():
+        metric = metrics.get(item_id) or {}
+        row = {**asset, **{field: metric.get(field) or 0 for field in _METRIC_FIELDS}}
+        row["item_group_id"] = metric.get("item_group_id") or asset.get("item_group_id")
+        rows.append(row)
+    return rows
+
+
+def _board_state(db: Session, scope: Mapping[str, Any]) -> GmvmaxCreativeLeaderboardState | None:
+    return db.scalar(
+        select(GmvmaxCreativeLeaderboardState).where(
+            *_board_filters(GmvmaxCreativeLeaderboardState, scope)
+        )
+    )
+
+
+def _store_scored(
+    db: Session,
+    scope: Mapping[str, Any],
+    scored: Mapping[str, tuple[Mapping[str, Any], Mapping[str, Any]]],
+    *,
+    item_ids: Sequence[str] | None,
+    now: datetime,
+) -> None:
+    """Write re-scored rows; rows of ``item_ids`` that left the board are removed.
+
+    Positions are left to :func:`_reorder_board`, so new rows start at 0.
+    """
+
+    filters = list(_board_filters(GmvmaxCreativeLeaderboardEntry, scope))
+    if item_ids is not None:
+        filters.append(GmvmaxCreativeLeaderboardEntry.item_id.in_(list(item_ids)))
+    existing = {
+        str(item_id): entry_id
+        for item_id, entry_id in db.execute(
+            select(GmvmaxCreativeLeaderboardEntry.item_id, GmvmaxCreativeLeaderboardEntry.id).where(
+                *filters
+            )
+        ).all()
+    }
+    updates: list[dict[str, Any]] = []
+    inserts: list[dict[str, Any]] = []
+    for item_id, (item, row) in scored.items():
+        values = {
+            "item_group_id": item.get("item_group_id"),
+            "hermes_tier": str(item.get("hermes_tier") or "UNRATED"),
+            "hermes_score": round(_float(item.get("score")), 2),
+            "selectable": bool(item.get("selectable")),
+            "historically_excluded": bool(item.get("historically_excluded")),
+            "cost_cents": _int(row.get("cost_cents")),
+            "gross_revenue_cents": _int(row.get("gross_revenue_cents")),
+            "orders": _int(row.get("orders")),
+            "ranking_json": {
+                "metrics": {field: row.get(field) for field in _METRIC_FIELDS},
+                "hermes": {field: item.get(field) for field in _HERMES_FIELDS},
+            },
+            "refreshed_at": now,
+        }
+        if item_id in existing:
+            updates.append({"id": existing[item_id], **values})
+        else:
+            inserts.append(
+                {
+                    **scope,
+                    **values,
+                    "item_id": item_id,
+                    "position": 0,
+                    "hermes_rank": None,
+                    "hermes_recommended": False,
+                }
+            )
+    removed = [entry_id for item_id, entry_id in existing.items() if item_id not in scored]
+    if removed:
+        db.execute(
+            delete(GmvmaxCreativeLeaderboardEntry).where(GmvmaxCreativeLeaderboardEntry.id.in_(removed))
+        )
+    if updates:
+        db.execute(update(GmvmaxCreativeLeaderboardEntry), updates)
+    if inserts:
+        db.execute(insert(GmvmaxCreativeLeaderboardEntry), inserts)
+
+
+def _reorder_board(
+    db: Session,
+    scope: Mapping[str, Any],
+    *,
+    product_price: float | None,
+) -> tuple[dict[str, Any], int, int]:
+    """Re-sort a board from its stored sort keys and move only displaced rows.
+
+    Returns the Hermes summary, the board size and its selectable count.
+    """
+
+    entry = GmvmaxCreativeLeaderboardEntry
+    stored = db.execute(
+        select(
+            entry.id,
+            entry.item_id,
+            entry.position,
+            entry.hermes_tier,
+            entry.hermes_score,
+            entry.hermes_rank,
+            entry.hermes_recommended,
+            entry.selectable,
+            entry.historically_excluded,
+            entry.orders,
+            entry.cost_cents,
+        ).where(*_board_filters(entry, scope))
+    ).all()
+    items = [
+        {
+            "id": row.id,
+            "item_id": row.item_id,
+            "hermes_tier": row.hermes_tier,
+            "score": _float(row.hermes_score),
+            "metrics": {"orders": _int(row.orders), "spend": money_from_cents(row.cost_cents)},
+            "hermes_recommended": row.hermes_tier in RECOMMENDED_TIERS,
+            "selectable": bool(row.selectable),
+            "historically_excluded": bool(row.historically_excluded),
+            "stored": (row.position, row.hermes_rank, bool(row.hermes_recommended)),
+        }
+        for row in stored
+    ]
+    summary = order_scored_candidates(
+        items,
+        product_price=product_price,
+        minimum_roi=MINIMUM_ROI,
+        recommendation_limit=RECOMMENDATION_LIMIT,
+    )
+    moved = [
+        {
+            "id": item["id"],
+            "position": position,
+            "hermes_rank": item["hermes_rank"],
+            "hermes_recommended": bool(item["hermes_recommended"]),
+        }
+        for position, item in enumerate(items, start=1)
+        if item["stored"] != (position, item["hermes_rank"], bool(item["hermes_recommended"]))
+    ]
+    if moved:
+        db.execute(update(entry), moved)
+    return summary, len(items), sum(1 for item in items if item["selectable"])
+
+
+def refresh_creative_leaderboard(
+    db: Session,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    item_group_key: str,
+    lookback_days: int,
+    metric_start_date: date,
+    item_ids: Iterable[str] | None = None,
+) -> GmvmaxCreativeLeaderboardState:
+    """Rank a board from the asset cache and store its positions.
+
+    With ``item_ids`` only those creatives are scored again and the board is
+    re-sorted from the stored sort keys of the others.  The whole board is
+    scored when it does not exist yet, its metric window moved or the
+    product price changed, since every score depends on those.
+    """
+
+    scope = _board_scope(
+        workspace_id=workspace_id,
+        auth_id=auth_id,
+        advertiser_id=advertiser_id,
+        store_id=store_id,
+        item_group_key=item_group_key,
+        lookback_days=lookback_days,
+    )
+    state = _board_state(db, scope)
+    product_price, product_price_source = product_price_for_hermes(
+        db,
+        workspace_id=scope["workspace_id"],
+        auth_id=scope["auth_id"],
+        store_id=scope["store_id"],
+        item_group_id=scope["item_group_key"] or None,
+    )
+    changed: list[str] | None = None
+    if (
+        item_ids is not None
+        and state is not None
+        and state.metric_start_date == metric_start_date
+        and _float((state.summary_json or {}).get("product_price"))
+        == round(max(_float(product_price), 0.01), 2)
+    ):
+        changed = sorted({str(item) for item in item_ids if item})
+        if not changed:
+            return state
+
+    rows = _candidate_rows(db, scope, metric_start_date=metric_start_date, item_ids=changed)
+    historical_removed = {
+        creative_id
+        for creative_id, _ in load_historical_removed_creatives(
+            db,
+            workspace_id=scope["workspace_id"],
+            auth_id=scope["auth_id"],
+            advertiser_id=scope["advertiser_id"],
+            store_id=scope["store_id"],
+            item_group_ids=[scope["item_group_key"]] if scope["item_group_key"] else None,
+        )
+    }
+    scored: dict[str, tuple[dict[str, Any], Mapping[str, Any]]] = {}
+    for row in rows:
+        candidate = creative_asset_candidate_from_row(row)
+        item_id = str(candidate.get("item_id") or "")
+        if not item_id:
+            continue
+        candidate["historically_excluded"] = item_id in historical_removed
+        scored[item_id] = (
+            score_creative_candidate(candidate, product_price=product_price, minimum_roi=MINIMUM_ROI),
+            row,
+        )
+
+    now = _utcnow()
+    _store_scored(db, scope, scored, item_ids=changed, now=now)
+    summary, total, selectable_count = _reorder_board(db, scope, product_price=product_price)
+
+    if state is None:
+        state = GmvmaxCreativeLeaderboardState(**scope)
+    state.metric_start_date = metric_start_date
+    state.total = total
+    state.selectable_count = selectable_count
+    state.historically_excluded_count = len(historical_removed)
+    state.product_price_source = product_price_source
+    # Round-trip through JSON so Decimal/float values persist the same way
+    # on every backend.
+    state.summary_json = json.loads(json.dumps(summary, default=str))
+    state.refreshed_at = now
+    db.add(state)
+    db.flush()
+    return state
+
+
+def _scope_states(
+    db: Session,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    item_group_keys: Iterable[str] | None = None,
+) -> list[tuple[str, int, date]]:
+    statement = select(
+        GmvmaxCreativeLeaderboardState.item_group_key,
+        GmvmaxCreativeLeaderboardState.lookback_days,
+        GmvmaxCreativeLeaderboardState.metric_start_date,
+    ).where(
+        GmvmaxCreativeLeaderboardState.workspace_id == int(workspace_id),
+        GmvmaxCreativeLeaderboardState.auth_id == int(auth_id),
+        GmvmaxCreativeLeaderboardState.advertiser_id == str(advertiser_id),
+        GmvmaxCreativeLeaderboardState.store_id == str(store_id),
+    )
+    if item_group_keys is not None:
+        statement = statement.where(
+            GmvmaxCreativeLeaderboardState.item_group_key.in_(sorted(set(item_group_keys)))
+        )
+    return [
+        (str(key or STORE_WIDE_KEY), int(lookback_days), start)
+        for key, lookback_days, start in db.execute(statement).all()
+    ]
+
+
+def refresh_scope_leaderboards(
+    db: Session,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    item_group_ids: Iterable[str],
+    advertiser_today: date,
+    creative_ids: Iterable[str] | None = None,
+) -> int:
+    """Refresh the existing boards a creative metric sync may have changed.
+
+    Boards are built on request for their product and lookback; afterwards
+    every sync covering that product keeps them fresh.  ``creative_ids`` are
+    the creatives whose metric rows the sync rewrote; within an unchanged
+    metric window only those are ranked again.
+    """
+
+    keys = {STORE_WIDE_KEY, *(str(item) for item in item_group_ids if item)}
+    changed = None if creative_ids is None else sorted({str(item) for item in creative_ids if item})
+    states = _scope_states(
+        db,
+        workspace_id=workspace_id,
+        auth_id=auth_id,
+        advertiser_id=advertiser_id,
+        store_id=store_id,
+        item_group_keys=keys,
+    )
+    for item_group_key, lookback_days, _start in states:
+        refresh_creative_leaderboard(
+            db,
+            workspace_id=workspace_id,
+            auth_id=auth_id,
+            advertiser_id=advertiser_id,
+            store_id=store_id,
+            item_group_key=item_group_key,
+            lookback_days=lookback_days,
+            metric_start_date=advertiser_today - timedelta(days=lookback_days),
+            item_ids=changed,
+        )
+    return len(states)
+
+
+def refresh_asset_leaderboards(
+    db: Session,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    item_ids: Iterable[str] = (),
+) -> int:
+    """Re-rank the creatives an asset sync changed on every board of a store.
+
+    Asset syncs can add creatives (``item_ids``), tombstone them or drop their
+    product relations, all of which change ``selectable`` and with it the
+    Hermes tier.  Stored flags are compared with the current asset rows and
+    only the creatives that differ are ranked again, in each board's current
+    metric window.
+    """
+
+    upserted = {str(item) for item in item_ids if item}
+    states = _scope_states(
+        db,
+        workspace_id=workspace_id,
+        auth_id=auth_id,
+        advertiser_id=advertiser_id,
+        store_id=store_id,
+    )
+    for item_group_key, lookback_days, metric_start_date in states:
+        scope = _board_scope(
+            workspace_id=workspace_id,
+            auth_id=auth_id,
+            advertiser_id=advertiser_id,
+            store_id=store_id,
+            item_group_key=item_group_key,
+            lookback_days=lookback_days,
+        )
+        stored = {
+            str(item_id): bool(selectable)
+            for item_id, selectable in db.execute(
+                select(
+                    GmvmaxCreativeLeaderboardEntry.item_id,
+                    GmvmaxCreativeLeaderboardEntry.selectable,
+                ).where(*_board_filters(GmvmaxCreativeLeaderboardEntry, scope))
+            ).all()
+        }
+        assets = (
+            _asset_rows(db, scope, sorted(stored)) if item_group_key else _asset_rows(db, scope, None)
+        ) if stored else {}
+        flipped = {
+            item_id
+            for item_id, selectable in stored.items()
+            if item_id not in assets
+            or bool(creative_asset_candidate_from_row(assets[item_id]).get("selectable")) != selectable
+        }
+        refresh_creative_leaderboard(
+            db,
+            **scope,
+            metric_start_date=metric_start_date,
+            item_ids=flipped | upserted,
+        )
+    return len(states)
+
+
+def request_creative_leaderboard_build(
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    item_group_key: str,
+    lookback_days: int,
+    metric_start_date: date,
+) -> bool:
+    """Queue a board build for a request that found it missing or stale.
+
+    A short Redis claim keeps concurrent page requests from queueing the same
+    build; without Redis every request may queue one, and the task skips
+    boards that are already current.
+    """
+
+    from app.celery_app import celery_app  # noqa: WPS433
+
+    scope = _board_scope(
+        workspace_id=workspace_id,
+        auth_id=auth_id,
+        advertiser_id=advertiser_id,
+        store_id=store_id,
+        item_group_key=item_group_key,
+        lookback_days=lookback_days,
+    )
+    claim_key = "gmvmax:creative_leaderboard:build:" + ":".join(str(value) for value in scope.values())
+    try:
+        if not get_redis_sync().set(claim_key, b"1", nx=True, ex=BUILD_CLAIM_SECONDS):
+            return False
+    except Exception:  # noqa: BLE001 - the task itself skips current boards
+        pass
+    celery_app.send_task(
+        "gmvmax.refresh_creative_leaderboard",
+        kwargs={**scope, "metric_start_date": metric_start_date.isoformat()},
+        queue="gmvmax",
+    )
+    return True
+
+
+def build_creative_leaderboard(
+    db: Session,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    item_group_key: str,
+    lookback_days: int,
+    metric_start_date: date,
+) -> bool:
+    """Build a requested board unless it is already current; ``True`` if built."""
+
+    scope = _board_scope(
+        workspace_id=workspace_id,
+        auth_id=auth_id,
+        advertiser_id=advertiser_id,
+        store_id=store_id,
+        item_group_key=item_group_key,
+        lookback_days=lookback_days,
+    )
+    state = _board_state(db, scope)
+    if state is not None and state.metric_start_date == metric_start_date:
+        return False
+    refresh_creative_leaderboard(db, **scope, metric_start_date=metric_start_date)
+    return True
+
+
+def read_creative_leaderboard_page(
+    db: Session,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    item_group_key: str,
+    lookback_days: int,
+    metric_start_date: date,
+    limit: int,
+    offset: int = 0,
+    after_position: int | None = None,
+    tiers: Sequence[str] | None = None,
+    selectable_only: bool = False,
+) -> dict[str, Any] | None:
+    """Return one page of a current board, or ``None`` when it must be rebuilt.
+
+    ``after_position`` is the keyset cursor from the previous page and takes
+    precedence over ``offset``.
+    """
+
+    scope = _board_scope(
+        workspace_id=workspace_id,
+        auth_id=auth_id,
+        advertiser_id=advertiser_id,
+        store_id=store_id,
+        item_group_key=item_group_key,
+        lookback_days=lookback_days,
+    )
+    state = _board_state(db, scope)
+    if state is None or state.metric_start_date != metric_start_date:
+        return None
+
+    filters = list(_board_filters(GmvmaxCreativeLeaderboardEntry, scope))
+    normalized_tiers = sorted({str(tier).upper() for tier in tiers or [] if str(tier).upper() in TIER_PRIORITY})
+    if normalized_tiers:
+        filters.append(GmvmaxCreativeLeaderboardEntry.hermes_tier.in_(normalized_tiers))
+    if selectable_only:
+        filters.append(GmvmaxCreativeLeaderboardEntry.selectable.is_(True))
+    total = int(
+        db.scalar(select(func.count()).select_from(GmvmaxCreativeLeaderboardEntry).where(*filters)) or 0
+    )
+
+    statement = select(GmvmaxCreativeLeaderboardEntry).where(*filters)
+    if after_position is not None:
+        statement = statement.where(GmvmaxCreativeLeaderboardEntry.position > int(after_position))
+    elif offset:
+        statement = statement.offset(int(offset))
+    entries = list(
+        db.scalars(statement.order_by(GmvmaxCreativeLeaderboardEntry.position).limit(int(limit) + 1))
+    )
+    has_more = len(entries) > int(limit)
+    entries = entries[: int(limit)]
+
+    assets = _asset_rows(db, scope, [entry.item_id for entry in entries]) if entries else {}
+    items: list[dict[str, Any]] = []
+    for entry in entries:
+        asset = assets.get(str(entry.item_id))
+        if asset is None:
+            continue
+        ranking = entry.ranking_json if isinstance(entry.ranking_json, Mapping) else {}
+        metrics = ranking.get("metrics") if isinstance(ranking.get("metrics"), Mapping) else {}
+        candidate = creative_asset_candidate_from_row(
+            {
+                **asset,
+                **{field: metrics.get(field) for field in _METRIC_FIELDS},
+                "item_group_id": entry.item_group_id or asset.get("item_group_id"),
+            }
+        )
+        hermes = ranking.get("hermes") if isinstance(ranking.get("hermes"), Mapping) else {}
+        candidate.update({field: hermes.get(field) for field in _HERMES_FIELDS})
+        # Ranks move when other rows change, so they live in columns; the
+        # stored reason is the unranked one.
+        candidate["hermes_rank"] = entry.hermes_rank
+        candidate["hermes_recommended"] = bool(entry.hermes_recommended)
+        if entry.hermes_recommended and entry.hermes_tier not in RECOMMENDED_TIERS:
+            candidate["hermes_reason"] = str(candidate.get("hermes_reason") or "") + VALIDATION_REASON_SUFFIX
+        candidate["historically_excluded"] = bool(entry.historically_excluded)
+        candidate["leaderboard_position"] = int(entry.position)
+        items.append(candidate)
+
+    return {
+        "items": items,
+        "total": total,
+        "has_more": has_more,
+        "next_cursor": str(entries[-1].position) if has_more and entries else None,
+        "selectable_count": int(state.selectable_count or 0),
+        "historically_excluded_count": int(state.historically_excluded_count or 0),
+        "product_price_source": state.product_price_source,
+        "summary": dict(state.summary_json or {}),
+        "refreshed_at": state.refreshed_at,
+    }
+
+
+__all__ = [
+    "STORE_WIDE_KEY",
+    "build_creative_leaderboard",
+    "read_creative_leaderboard_page",
+    "refresh_asset_leaderboards",
+    "refresh_creative_leaderboard",
+    "refresh_scope_leaderboards",
+    "request_creative_leaderboard_build",
+]
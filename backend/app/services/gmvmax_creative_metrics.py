@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 from app.data.models.gmv_restructured import GmvCreativeMetrics10Min
 from app.data.models.gmvmax_sync_state import GmvCreative10MinBatchManifest
 from app.providers.tiktok_business.gmvmax_client import TikTokBusinessGMVMaxClient
+from app.gmvmax.services.campaign_item_groups import resolve_campaign_item_groups
 from app.gmvmax.services.fact_freshness import settlement_metadata, utc_now_naive
 from app.services.gmvmax_spec import GMVMaxReportLevel
 from app.services.ttb_gmvmax import (
@@ -24,6 +25,7 @@ from app.services.gmvmax_creative_assets import (
     resolve_store_authorized_bc_id,
     sync_creative_assets_for_scope,
 )
+from app.services.gmvmax_realtime_counters import record_creative_snapshot
 
 logger = logging.getLogger("gmv.services.gmvmax.creative_metrics")
 
@@ -144,96 +146,60 @@ def _normalize_identifier(value: Any) -> str | None:
     return text or None
 
 
-def _extract_item_group_ids_from_raw(raw: Any) -> list[str]:
-    payload = _load_json(raw)
-    candidates = payload.get("item_group_ids")
-    if not candidates and isinstance(payload.get("_campaign_info"), Mapping):
-        candidates = payload["_campaign_info"].get("item_group_ids")
-    if isinstance(candidates, (str, int)):
-        candidates = [candidates]
-    if not isinstance(candidates, Sequence):
-        return []
-    return list(dict.fromkeys(filter(None, (_normalize_identifier(item) for item in candidates))))
+def _campaign_scope(campaign: Any) -> tuple[int, int, str, str]:
+    return (
+        int(_campaign_attr(campaign, "workspace_id", 0) or 0),
+        int(_campaign_attr(campaign, "auth_id", 0) or 0),
+        str(_campaign_attr(campaign, "advertiser_id", "") or ""),
+        str(_campaign_attr(campaign, "store_id", "") or ""),
+    )
 
 
-def _item_group_ids_for_campaign(session: Session, campaign: Any) -> list[str]:
-    campaign_id = str(_campaign_attr(campaign, "campaign_id", "") or "")
-    workspace_id = int(_campaign_attr(campaign, "workspace_id", 0) or 0)
-    auth_id = int(_campaign_attr(campaign, "auth_id", 0) or 0)
-    advertiser_id = str(_campaign_attr(campaign, "advertiser_id", "") or "")
-    store_id = str(_campaign_attr(campaign, "store_id", "") or "")
+def _item_group_ids_for_campaigns(
+    session: Session, campaigns: Sequence[Any]
+) -> dict[str, list[str]]:
+    """Resolve item groups for ``campaigns`` with one lookup per store scope.
 
-    resolved: list[str] = []
-    for raw_attribute in ("raw_json", "detail_raw_json", "list_raw_json"):
-        resolved.extend(
-            _extract_item_group_ids_from_raw(
-                _campaign_attr(campaign, raw_attribute)
-            )
-        )
+    Relations and observed creative facts are read in bulk; stored campaign
+    payloads are only parsed (and persisted as relations) for campaigns that
+    have neither.
+    """
 
-    catalog_row = session.execute(
-        text(
-            """
-            select detail_raw_json, list_raw_json
-            from gmvmax_product_campaign_catalog
-            where campaign_id=:campaign_id
-              and workspace_id=:workspace_id
-              and auth_id=:auth_id
-              and advertiser_id=:advertiser_id
-              and store_id=:store_id
-            limit 1
-            """
-        ),
-        {
-            "campaign_id": campaign_id,
-            "workspace_id": workspace_id,
-            "auth_id": auth_id,
-            "advertiser_id": advertiser_id,
-            "store_id": store_id,
-        },
-    ).mappings().first()
-    for raw_attribute in ("detail_raw_json", "list_raw_json"):
-        resolved.extend(
-            _extract_item_group_ids_from_raw(
-                (catalog_row or {}).get(raw_attribute)
+    by_scope: dict[tuple[int, int, str, str], list[Any]] = {}
+    for campaign in campaigns:
+        by_scope.setdefault(_campaign_scope(campaign), []).append(campaign)
+
+    resolved: dict[str, list[str]] = {}
+    for (workspace_id, auth_id, advertiser_id, store_id), scoped in by_scope.items():
+        campaign_ids: list[str] = []
+        payloads: dict[str, list[Any]] = {}
+        for campaign in scoped:
+            campaign_id = _normalize_identifier(_campaign_attr(campaign, "campaign_id"))
+            if not campaign_id:
+                continue
+            campaign_ids.append(campaign_id)
+            payloads.setdefault(campaign_id, []).extend(
+                _campaign_attr(campaign, attribute)
+                for attribute in ("raw_json", "detail_raw_json", "list_raw_json")
+            )
+        resolved.update(
+            resolve_campaign_item_groups(
+                session,
+                workspace_id=workspace_id,
+                auth_id=auth_id,
+                advertiser_id=advertiser_id,
+                store_id=store_id,
+                campaign_ids=campaign_ids,
+                include_observed=True,
+                extra_payloads=payloads,
             )
         )
+    return resolved
 
-    rows = session.execute(
-        text(
-            """
-            select item_group_id
-            from gmvmax_product_campaign_item_groups
-            where campaign_id=:campaign_id
-              and workspace_id=:workspace_id
-              and auth_id=:auth_id
-              and advertiser_id=:advertiser_id
-              and store_id=:store_id
-            union
-            select item_group_id
-            from gmvmax_product_creative_metrics_daily
-            where campaign_id=:campaign_id
-              and workspace_id=:workspace_id
-              and auth_id=:auth_id
-              and advertiser_id=:advertiser_id
-              and store_id=:store_id
-              and item_group_id is not null
-            """
-        ),
-        {
-            "campaign_id": campaign_id,
-            "workspace_id": workspace_id,
-            "auth_id": auth_id,
-            "advertiser_id": advertiser_id,
-            "store_id": store_id,
-        },
-    ).scalars().all()
-    resolved.extend(
-        item
-        for item in (_normalize_identifier(row) for row in rows)
-        if item
-    )
-    return list(dict.fromkeys(resolved))
+
+def _item_group_ids_for_campaign(session: Session, campaign: Any) -> list[str]:
+    campaign_id = _normalize_identifier(_campaign_attr(campaign, "campaign_id"))
+    return _item_group_ids_for_campaigns(session, [campaign]).get(campaign_id or "", [])
 
 
 def _advertiser_timezone_for_scope(
@@ -566,6 +532,87 @@ def _creative_asset_refresh_needed(
     return False, "asset_cache_fresh"
 
 
+def _split_entries_by_campaign(
+    entries: Sequence[Any],
+    campaign_ids: Sequence[str],
+) -> dict[str, list[Any]]:
+    split: dict[str, list[Any]] = {str(item): [] for item in campaign_ids}
+    for index, entry in enumerate(entries):
+        _metrics, dimensions = _entry_parts(entry)
+        campaign_id = _normalize_identifier(dimensions.get("campaign_id"))
+        if campaign_id not in split:
+            # Without its campaign the row cannot be attributed, so no
+            # campaign of this request can prove a complete batch.
+            raise ValueError(
+                "GMV Max creative row without a requested campaign_id "
+                f"at index {index}"
+            )
+        split[campaign_id].append(entry)
+    return split
+
+
+async def fetch_creative_rows_for_campaigns(
+    session: Session,
+    client: TikTokBusinessGMVMaxClient,
+    *,
+    advertiser_id: str,
+    store_id: str,
+    campaigns: Sequence[Any],
+    start_date: date,
+    end_date: date,
+) -> dict[str, tuple[list[Any], list[Any]]]:
+    """Pull creative rows for many campaigns of one store in shared requests.
+
+    The creative report and the current status inventory are each requested
+    once for all campaigns (chunked at the official 100-ID filter limit)
+    instead of once per campaign, then split per campaign locally.  Campaigns
+    without resolvable item groups are left out of the request and the
+    result.
+    """
+
+    resolved = _item_group_ids_for_campaigns(session, campaigns)
+    item_group_ids: list[str] = []
+    campaign_ids: list[str] = []
+    for campaign in campaigns:
+        campaign_item_groups = resolved.get(
+            _normalize_identifier(_campaign_attr(campaign, "campaign_id")) or ""
+        )
+        if not campaign_item_groups:
+            continue
+        campaign_ids.append(str(_campaign_attr(campaign, "campaign_id", "") or ""))
+        item_group_ids.extend(campaign_item_groups)
+    campaign_ids = list(dict.fromkeys(item for item in campaign_ids if item))
+    item_group_ids = list(dict.fromkeys(item_group_ids))
+    if not campaign_ids:
+        return {}
+
+    entries = await fetch_gmvmax_report_by_level(
+        client,
+        advertiser_id=str(advertiser_id),
+        store_id=str(store_id),
+        campaign_id=campaign_ids[0],
+        campaign_ids=campaign_ids,
+        level=GMVMaxReportLevel.CREATIVE.value,
+        start_date=start_date,
+        end_date=end_date,
+        item_group_ids=item_group_ids,
+    )
+    status_entries = await fetch_gmvmax_current_creative_statuses(
+        client,
+        advertiser_id=str(advertiser_id),
+        store_id=str(store_id),
+        campaign_ids=campaign_ids,
+        item_group_ids=item_group_ids,
+        report_date=end_date,
+    )
+    rows_by_campaign = _split_entries_by_campaign(entries, campaign_ids)
+    statuses_by_campaign = _split_entries_by_campaign(status_entries, campaign_ids)
+    return {
+        campaign_id: (rows_by_campaign[campaign_id], statuses_by_campaign[campaign_id])
+        for campaign_id in campaign_ids
+    }
+
+
 async def sync_creative_metrics_10min_for_campaign(
     session: Session,
     client: TikTokBusinessGMVMaxClient,
@@ -577,7 +624,15 @@ async def sync_creative_metrics_10min_for_campaign(
     campaign: Any,
     start_date: date,
     end_date: date,
+    prefetched: tuple[Sequence[Any], Sequence[Any]] | None = None,
 ) -> dict[str, Any]:
+    """Write one complete creative snapshot batch for ``campaign``.
+
+    ``prefetched`` carries the ``(report rows, status rows)`` of this campaign
+    when a store sweep already pulled them with
+    :func:`fetch_creative_rows_for_campaigns`; the completeness checks below
+    run on them exactly as on rows fetched here.
+    """
     item_group_ids = _item_group_ids_for_campaign(session, campaign)
     campaign_id = str(_campaign_attr(campaign, "campaign_id", "") or "")
     store_id = str(_campaign_attr(campaign, "store_id", "") or "")
@@ -595,17 +650,28 @@ async def sync_creative_metrics_10min_for_campaign(
         )
         return {"rows": 0}
 
-    entries = await fetch_gmvmax_report_by_level(
-        client,
-        advertiser_id=advertiser_id,
-        store_id=store_id,
-        campaign_id=campaign_id,
-        campaign_ids=[campaign_id],
-        level=GMVMaxReportLevel.CREATIVE.value,
-        start_date=start_date,
-        end_date=end_date,
-        item_group_ids=item_group_ids,
-    )
+    if prefetched is not None:
+        entries, status_entries = list(prefetched[0]), list(prefetched[1])
+    else:
+        entries = await fetch_gmvmax_report_by_level(
+            client,
+            advertiser_id=advertiser_id,
+            store_id=store_id,
+            campaign_id=campaign_id,
+            campaign_ids=[campaign_id],
+            level=GMVMaxReportLevel.CREATIVE.value,
+            start_date=start_date,
+            end_date=end_date,
+            item_group_ids=item_group_ids,
+        )
+        status_entries = await fetch_gmvmax_current_creative_statuses(
+            client,
+            advertiser_id=str(advertiser_id),
+            store_id=store_id,
+            campaign_ids=[campaign_id],
+            item_group_ids=item_group_ids,
+            report_date=end_date,
+        )
     _assert_complete_creative_rows(
         entries,
         campaign_id=campaign_id,
@@ -613,15 +679,6 @@ async def sync_creative_metrics_10min_for_campaign(
         start_date=start_date,
         end_date=end_date,
     )
-
-    status_entries = await fetch_gmvmax_current_creative_statuses(
-        client,
-        advertiser_id=str(advertiser_id),
-        store_id=store_id,
-        campaign_ids=[campaign_id],
-        item_group_ids=item_group_ids,
-        report_date=end_date,
-    )
     _assert_complete_creative_rows(
         status_entries,
         campaign_id=campaign_id,
@@ -669,6 +726,9 @@ async def sync_creative_metrics_10min_for_campaign(
     )
     rows_written = 0
     creative_refs: list[dict[str, str]] = []
+    counter_rows: dict[date, dict[tuple[str, str], dict[str, int]]] = {
+        stat_time_day: {} for stat_time_day in snapshot_days
+    }
     for entry in entries:
         metrics, dimensions = _entry_parts(entry)
         creative_id = str(dimensions.get("shop_content_id") or dimensions.get("creative_id") or "").strip()
@@ -750,6 +810,18 @@ async def sync_creative_metrics_10min_for_campaign(
         )
         rows_written += 1
         row_counts[stat_time_day] += 1
+        counter_rows[stat_time_day][(item_group_id, creative_id)] = {
+            "cost_cents": _to_cents(metrics.get("cost")),
+            "gross_revenue_cents": _to_cents(metrics.get("gross_revenue")),
+            "orders": _to_int(metrics.get("orders")),
+            "impressions": _to_int(
+                _first_not_none(
+                    metrics.get("product_impressions"),
+                    metrics.get("impressions"),
+                )
+            ),
+            "clicks": _to_int(metrics.get("clicks")),
+        }
 
     session.flush()
     _register_complete_batch_manifests(
@@ -766,6 +838,18 @@ async def sync_creative_metrics_10min_for_campaign(
     # A manifest is the commit watermark.  Flush it only after all metric
     # writes succeeded; the outer task commits both atomically.
     session.flush()
+    # Smart Guard reads recent momentum from a Redis mirror of complete
+    # batches; it is published only once the outer task commits.
+    record_creative_snapshot(
+        session,
+        workspace_id=int(workspace_id),
+        auth_id=int(auth_id),
+        advertiser_id=str(advertiser_id),
+        store_id=str(store_id),
+        campaign_id=str(campaign_id),
+        snapshot_at=snapshot_at,
+        rows_by_day=counter_rows,
+    )
 
     asset_result: dict[str, Any] | None = None
     if creative_refs and store_id:
@@ -11,6 +11,9 @@ TIER_PRIORITY = {
     "WEAK": 1,
     "REJECTED": 0,
 }
+VALIDATION_REASON_SUFFIX = (
+    "\uff1bHermes \u5efa\u8bae\u4f5c\u4e3a\u5c0f\u9884\u7b97\u624b\u52a8\u9a8c\u8bc1\u5019\u9009"
+)
 
 
 def _number(value: Any) -> float:
@@ -106,22 +109,36 @@ def _rank_one(
     return item
 
 
-def rank_creative_candidates(
-    candidates: Sequence[Mapping[str, Any]],
+def score_creative_candidate(
+    candidate: Mapping[str, Any],
+    *,
+    product_price: float | None = None,
+    minimum_roi: float = 0.8,
+) -> dict[str, Any]:
+    """Hermes tier and score of one candidate, before it is ordered."""
+
+    return _rank_one(
+        candidate,
+        product_price=max(_number(product_price), 0.01),
+        minimum_roi=max(_number(minimum_roi), 0.01),
+    )
+
+
+def order_scored_candidates(
+    ranked: list[dict[str, Any]],
     *,
     product_price: float | None = None,
     minimum_roi: float = 0.8,
     recommendation_limit: int = 4,
-) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+) -> dict[str, Any]:
+    """Sort scored candidates in place, assign recommendation ranks and summarize.
+
+    Only the tier, score, ``metrics.orders``/``metrics.spend``, item id and the
+    unranked ``hermes_recommended`` flag of each candidate are consulted, so
+    stored leaderboard rows can be reordered without scoring them again.
+    """
+
     effective_price = max(_number(product_price), 0.01)
-    ranked = [
-        _rank_one(
-            candidate,
-            product_price=effective_price,
-            minimum_roi=max(_number(minimum_roi), 0.01),
-        )
-        for candidate in candidates
-    ]
     # Python's sort is stable, so establish the unique resource key first and
     # preserve it whenever all Hermes performance signals are tied.
     ranked.sort(
@@ -164,10 +181,7 @@ def rank_creative_candidates(
             rank += 1
             item["hermes_recommended"] = True
             item["hermes_rank"] = rank
-            item["hermes_reason"] = (
-                str(item.get("hermes_reason") or "")
-                + "\uff1bHermes \u5efa\u8bae\u4f5c\u4e3a\u5c0f\u9884\u7b97\u624b\u52a8\u9a8c\u8bc1\u5019\u9009"
-            )
+            item["hermes_reason"] = str(item.get("hermes_reason") or "") + VALIDATION_REASON_SUFFIX
 
     summary = {
         "model": "HERMES_PERFORMANCE_RANKER_V1",
@@ -179,7 +193,37 @@ def rank_creative_candidates(
         "minimum_roi": round(max(_number(minimum_roi), 0.01), 2),
         "has_proven_winners": any(item.get("hermes_tier") == "WINNER" for item in ranked),
     }
+    return summary
+
+
+def rank_creative_candidates(
+    candidates: Sequence[Mapping[str, Any]],
+    *,
+    product_price: float | None = None,
+    minimum_roi: float = 0.8,
+    recommendation_limit: int = 4,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    ranked = [
+        score_creative_candidate(
+            candidate,
+            product_price=product_price,
+            minimum_roi=minimum_roi,
+        )
+        for candidate in candidates
+    ]
+    summary = order_scored_candidates(
+        ranked,
+        product_price=product_price,
+        minimum_roi=minimum_roi,
+        recommendation_limit=recommendation_limit,
+    )
     return ranked, summary
 
 
-__all__ = ["rank_creative_candidates"]
+__all__ = [
+    "TIER_PRIORITY",
+    "VALIDATION_REASON_SUFFIX",
+    "order_scored_candidates",
+    "rank_creative_candidates",
+    "score_creative_candidate",
+]
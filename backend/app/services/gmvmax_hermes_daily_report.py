@@ -5,13 +5,15 @@ import hashlib
 import json
 import logging
 import re
+from collections import Counter
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Mapping
+from typing import Any, Callable, Mapping
 from zoneinfo import ZoneInfo
 
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 from app.core.errors import APIError
@@ -31,6 +33,26 @@ logger = logging.getLogger("gmv.services.gmvmax.hermes_daily_report")
 _DECISION_TERMINAL_STATUSES = {"APPROVED", "NO_RECOMMENDATIONS", "REJECTED"}
 _DECISION_MAX_ATTEMPTS = 4
 _DECISION_RETRY_BASE_MINUTES = 15
+_CHECKPOINT_OVERVIEW_REFRESHED = "OVERVIEW_REFRESHED"
+_CHECKPOINT_COMPLETED = "COMPLETED"
+_CYCLE_SUMMARY_KEYS = (
+    "generated",
+    "skipped",
+    "deferred",
+    "errors",
+    "decision_approved",
+    "decision_errors",
+    "decision_retried",
+    "decision_pending",
+    "memory_evaluated",
+    "memory_refreshed",
+    "memory_errors",
+    "overview_refreshed",
+    "overview_refresh_errors",
+    "initial_reports",
+    "finalized_reports",
+    "resumed",
+)
 
 
 def _utcnow() -> datetime:
@@ -201,6 +223,128 @@ def ensure_hermes_daily_report_table(db: Session) -> None:
                     f"add column {column_name} {definition}"
                 )
             )
+    db.execute(
+        text(
+            """
+            create table if not exists gmv_hermes_daily_report_checkpoints (
+                id bigint unsigned not null auto_increment primary key,
+                workspace_id bigint not null,
+                auth_id bigint not null,
+                advertiser_id varchar(64) not null,
+                store_id varchar(64) not null,
+                report_date date not null,
+                stage varchar(32) not null,
+                final_cutoff tinyint(1) not null default 0,
+                overview_json json null,
+                updated_at datetime(6) not null default current_timestamp(6),
+                unique key uq_gmv_hermes_daily_checkpoint_scope (
+                    workspace_id, auth_id, advertiser_id, store_id, report_date
+                )
+            ) engine=InnoDB default charset=utf8mb4 collate=utf8mb4_unicode_ci
+            """
+        )
+    )
+
+
+def _checkpoint_params(scope: Mapping[str, Any], report_date: date) -> dict[str, Any]:
+    return {
+        "workspace_id": int(scope["workspace_id"]),
+        "auth_id": int(scope["auth_id"]),
+        "advertiser_id": str(scope["advertiser_id"]),
+        "store_id": str(scope["store_id"]),
+        "report_date": report_date,
+    }
+
+
+def _load_report_checkpoint(
+    db: Session,
+    scope: Mapping[str, Any],
+    report_date: date,
+) -> dict[str, Any] | None:
+    row = db.execute(
+        text(
+            """
+            select stage, final_cutoff, overview_json, updated_at
+            from gmv_hermes_daily_report_checkpoints
+            where workspace_id=:workspace_id
+              and auth_id=:auth_id
+              and advertiser_id=:advertiser_id
+              and store_id=:store_id
+              and report_date=:report_date
+            limit 1
+            """
+        ),
+        _checkpoint_params(scope, report_date),
+    ).mappings().first()
+    return dict(row) if row else None
+
+
+def _save_report_checkpoint(
+    db: Session,
+    scope: Mapping[str, Any],
+    report_date: date,
+    *,
+    stage: str,
+    final_cutoff: bool,
+    overview_refresh: Mapping[str, Any],
+) -> None:
+    db.execute(
+        text(
+            """
+            insert into gmv_hermes_daily_report_checkpoints (
+                workspace_id, auth_id, advertiser_id, store_id, report_date,
+                stage, final_cutoff, overview_json, updated_at
+            ) values (
+                :workspace_id, :auth_id, :advertiser_id, :store_id, :report_date,
+                :stage, :final_cutoff, cast(:overview_json as json), current_timestamp(6)
+            )
+            on duplicate key update
+                stage=values(stage),
+                final_cutoff=values(final_cutoff),
+                overview_json=values(overview_json),
+                updated_at=current_timestamp(6)
+            """
+        ),
+        {
+            **_checkpoint_params(scope, report_date),
+            "stage": stage,
+            "final_cutoff": 1 if final_cutoff else 0,
+            "overview_json": _json_dumps(overview_refresh),
+        },
+    )
+
+
+def _checkpoint_reusable(
+    checkpoint: Mapping[str, Any] | None,
+    *,
+    final_cutoff: bool,
+    stage: str | None = None,
+    now: datetime | None = None,
+) -> bool:
+    """Whether a rerun may resume from ``checkpoint`` instead of redoing work.
+
+    Only checkpoints from the same report stage (before/after the final
+    cutoff) and younger than the reuse window count.  Overview refreshes are
+    reused only when they succeeded.
+    """
+
+    if not checkpoint:
+        return False
+    if stage is not None and str(checkpoint.get("stage") or "") != stage:
+        return False
+    if bool(checkpoint.get("final_cutoff")) != bool(final_cutoff):
+        return False
+    if stage is None and _dict(checkpoint.get("overview_json")).get("status") != "success":
+        return False
+    updated_at = checkpoint.get("updated_at")
+    if not isinstance(updated_at, datetime):
+        return False
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    reuse_seconds = int(
+        getattr(settings, "GMVMAX_HERMES_DAILY_REPORT_CHECKPOINT_REUSE_SECONDS", 30 * 60)
+    )
+    return (now or _utcnow()) - updated_at <= timedelta(seconds=reuse_seconds)
 
 
 def _decision_retry_due(
@@ -1184,258 +1328,357 @@ def _save_report(
     return int(row["id"]) if row else None
 
 
-async def run_hermes_daily_report_cycle(
+@dataclass(frozen=True)
+class _CycleLimits:
+    tiktok: asyncio.Semaphore
+    llm: asyncio.Semaphore
+
+
+def _positive_setting(name: str, default: int) -> int:
+    try:
+        return max(1, int(getattr(settings, name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+async def _process_report_scope(
     db: Session,
+    scope: Mapping[str, Any],
     *,
-    report_date: date | None = None,
-    force: bool = False,
-) -> dict[str, Any]:
-    ensure_hermes_daily_report_table(db)
-    scopes = _load_report_scopes(db)
-    summary = {
-        "scopes": len(scopes),
-        "generated": 0,
-        "skipped": 0,
-        "deferred": 0,
-        "errors": 0,
-        "decision_approved": 0,
-        "decision_errors": 0,
-        "decision_retried": 0,
-        "decision_pending": 0,
-        "memory_evaluated": 0,
-        "memory_refreshed": 0,
-        "memory_errors": 0,
-        "overview_refreshed": 0,
-        "overview_refresh_errors": 0,
-        "initial_reports": 0,
-        "finalized_reports": 0,
-    }
-    for scope in scopes:
-        try:
-            advertiser_timezone = _required_advertiser_timezone(
-                scope.get("advertiser_timezone")
-            )
-        except Exception as exc:  # noqa: BLE001 - isolate invalid account metadata.
-            summary["errors"] += 1
-            logger.error(
-                "Hermes daily report skipped: advertiser timezone unavailable",
-                extra={"scope": dict(scope), "error": str(exc)},
-            )
-            continue
-        scope = {**scope, "advertiser_timezone": advertiser_timezone}
-        scope_report_date = _scope_report_date(advertiser_timezone, report_date)
-        ready, ready_reason, local_now = _report_generation_ready(
-            advertiser_timezone,
-            scope_report_date,
+    report_date: date | None,
+    force: bool,
+    limits: _CycleLimits,
+    summary: Counter[str],
+) -> None:
+    try:
+        advertiser_timezone = _required_advertiser_timezone(
+            scope.get("advertiser_timezone")
         )
-        if not force and not ready:
-            summary["deferred"] += 1
-            logger.info(
-                "Hermes daily report deferred",
-                extra={
-                    "scope": dict(scope),
-                    "report_date": scope_report_date.isoformat(),
-                    "reason": ready_reason,
-                    "advertiser_local_time": local_now.isoformat(),
-                },
-            )
-            continue
-        existing = db.execute(
-            text(
-                """
-                select id, input_json, decision_status, decision_attempts,
-                       decision_last_attempt_at
-                from gmv_hermes_ad_daily_reports
-                where workspace_id=:workspace_id
-                  and auth_id=:auth_id
-                  and advertiser_id=:advertiser_id
-                  and store_id=:store_id
-                  and report_date=:report_date
-                  and report_type='DAILY'
-                  and status='GENERATED'
-                limit 1
-                """
-            ),
-            {**scope, "report_date": scope_report_date},
-        ).mappings().first()
-        if not force and existing and _existing_report_finalized(existing):
+    except Exception as exc:  # noqa: BLE001 - isolate invalid account metadata.
+        summary["errors"] += 1
+        logger.error(
+            "Hermes daily report skipped: advertiser timezone unavailable",
+            extra={"scope": dict(scope), "error": str(exc)},
+        )
+        return
+    scope = {**scope, "advertiser_timezone": advertiser_timezone}
+    scope_report_date = _scope_report_date(advertiser_timezone, report_date)
+    ready, ready_reason, local_now = _report_generation_ready(
+        advertiser_timezone,
+        scope_report_date,
+    )
+    if not force and not ready:
+        summary["deferred"] += 1
+        logger.info(
+            "Hermes daily report deferred",
+            extra={
+                "scope": dict(scope),
+                "report_date": scope_report_date.isoformat(),
+                "reason": ready_reason,
+                "advertiser_local_time": local_now.isoformat(),
+            },
+        )
+        return
+    existing = db.execute(
+        text(
+            """
+            select id, input_json, decision_status, decision_attempts,
+                   decision_last_attempt_at
+            from gmv_hermes_ad_daily_reports
+            where workspace_id=:workspace_id
+              and auth_id=:auth_id
+              and advertiser_id=:advertiser_id
+              and store_id=:store_id
+              and report_date=:report_date
+              and report_type='DAILY'
+              and status='GENERATED'
+            limit 1
+            """
+        ),
+        {**scope, "report_date": scope_report_date},
+    ).mappings().first()
+    if not force and existing and _existing_report_finalized(existing):
+        async with limits.llm:
             decision_result = await _run_tracked_report_decision(
                 db,
                 report_id=int(existing["id"]),
             )
-            if decision_result.get("attempted"):
-                summary["decision_retried"] += 1
-            if decision_result.get("error"):
-                summary["decision_errors"] += 1
-            elif decision_result.get("attempted"):
-                summary["decision_approved"] += int(decision_result.get("approved") or 0)
-            elif str(decision_result.get("status") or "") == "not_due":
-                summary["decision_pending"] += 1
-            summary["skipped"] += 1
-            continue
-
-        try:
-            overview_refresh = await _refresh_official_overview(db, scope, scope_report_date)
-            db.commit()
-            summary["overview_refreshed"] += 1
-        except Exception as exc:  # noqa: BLE001
-            db.rollback()
-            ensure_hermes_daily_report_table(db)
-            overview_refresh = {"status": "failed", "error": str(exc)[:500]}
-            summary["overview_refresh_errors"] += 1
-            logger.exception(
-                "Hermes daily report official overview refresh failed",
-                extra={"scope": dict(scope), "report_date": scope_report_date.isoformat()},
+        if decision_result.get("attempted"):
+            summary["decision_retried"] += 1
+        if decision_result.get("error"):
+            summary["decision_errors"] += 1
+        elif decision_result.get("attempted"):
+            summary["decision_approved"] += int(decision_result.get("approved") or 0)
+        elif str(decision_result.get("status") or "") == "not_due":
+            summary["decision_pending"] += 1
+        summary["skipped"] += 1
+        return
+
+    final_cutoff = _report_final_cutoff_reached(local_now, force=force)
+    checkpoint = None if force else _load_report_checkpoint(db, scope, scope_report_date)
+    if _checkpoint_reusable(checkpoint, final_cutoff=final_cutoff, stage=_CHECKPOINT_COMPLETED):
+        summary["skipped"] += 1
+        summary["resumed"] += 1
+        return
+    try:
+        if _checkpoint_reusable(checkpoint, final_cutoff=final_cutoff):
+            overview_refresh = _dict(checkpoint.get("overview_json"))
+            summary["resumed"] += 1
+        else:
+            async with limits.tiktok:
+                overview_refresh = await _refresh_official_overview(db, scope, scope_report_date)
+            _save_report_checkpoint(
+                db,
+                scope,
+                scope_report_date,
+                stage=_CHECKPOINT_OVERVIEW_REFRESHED,
+                final_cutoff=final_cutoff,
+                overview_refresh=overview_refresh,
             )
-            if existing and not force:
-                summary["deferred"] += 1
-                continue
+            db.commit()
+        summary["overview_refreshed"] += 1
+    except Exception as exc:  # noqa: BLE001
+        db.rollback()
+        ensure_hermes_daily_report_table(db)
+        overview_refresh = {"status": "failed", "error": str(exc)[:500]}
+        summary["overview_refresh_errors"] += 1
+        logger.exception(
+            "Hermes daily report official overview refresh failed",
+            extra={"scope": dict(scope), "report_date": scope_report_date.isoformat()},
+        )
+        if existing and not force:
+            summary["deferred"] += 1
+            return
 
-        report_finalized = (
-            _report_final_cutoff_reached(local_now, force=force)
-            and overview_refresh.get("status") == "success"
+    report_finalized = final_cutoff and overview_refresh.get("status") == "success"
+    # Summary queries are synchronous; run them off the event loop so other
+    # lanes keep their TikTok and Hermes calls moving.
+    input_payload = await asyncio.to_thread(
+        _build_report_input,
+        db,
+        scope,
+        scope_report_date,
+        overview_refresh=overview_refresh,
+        report_finalized=report_finalized,
+        generated_local_at=local_now,
+    )
+    if input_payload.get("summary", {}).get("summary_source") != "overview_daily":
+        report_finalized = False
+        input_payload["data_quality"]["report_finalized"] = False
+        input_payload["data_quality"]["report_stage"] = "initial"
+
+    if existing and not force:
+        if not report_finalized:
+            _save_report_checkpoint(
+                db,
+                scope,
+                scope_report_date,
+                stage=_CHECKPOINT_COMPLETED,
+                final_cutoff=final_cutoff,
+                overview_refresh=overview_refresh,
+            )
+            db.commit()
+            summary["skipped"] += 1
+            return
+    try:
+        memory_evaluation = record_policy_evaluations(
+            db,
+            scope=scope,
+            report_date=scope_report_date,
+            report_input=input_payload,
         )
-        input_payload = _build_report_input(
+        memory_refresh = refresh_strategy_memory(db, scope=scope)
+        input_payload["strategy_memory"] = load_strategy_memory(
+            db,
+            scope=scope,
+            item_group_ids=input_payload.get("product_ids") or [],
+        )
+        db.commit()
+        summary["memory_evaluated"] += int(memory_evaluation.get("evaluated") or 0)
+        summary["memory_refreshed"] += int(memory_refresh.get("refreshed") or 0)
+    except Exception:  # noqa: BLE001
+        db.rollback()
+        summary["memory_errors"] += 1
+        logger.exception("Hermes MySQL strategy memory refresh failed", extra={"scope": dict(scope)})
+    if (
+        float(input_payload.get("summary", {}).get("cost") or 0) <= 0
+        and not input_payload.get("guard_events")
+        and not input_payload.get("learning_stats")
+        and int(input_payload.get("shop_orders", {}).get("order_count") or 0) <= 0
+    ):
+        _save_report(
+            db,
+            scope=scope,
+            report_date=scope_report_date,
+            input_payload=input_payload,
+            response_payload={},
+            output_text="无投放数据，未调用 Hermes。",
+            parsed={"markdown_report": "无投放数据，未调用 Hermes。", "recommendations": []},
+            status="SKIPPED_EMPTY",
+        )
+        _save_report_checkpoint(
             db,
             scope,
             scope_report_date,
+            stage=_CHECKPOINT_COMPLETED,
+            final_cutoff=final_cutoff,
             overview_refresh=overview_refresh,
-            report_finalized=report_finalized,
-            generated_local_at=local_now,
         )
-        if input_payload.get("summary", {}).get("summary_source") != "overview_daily":
-            report_finalized = False
-            input_payload["data_quality"]["report_finalized"] = False
-            input_payload["data_quality"]["report_stage"] = "initial"
-
-        if existing and not force:
-            if not report_finalized:
-                summary["skipped"] += 1
-                continue
-        try:
-            memory_evaluation = record_policy_evaluations(
-                db,
-                scope=scope,
-                report_date=scope_report_date,
-                report_input=input_payload,
-            )
-            memory_refresh = refresh_strategy_memory(db, scope=scope)
-            input_payload["strategy_memory"] = load_strategy_memory(
-                db,
-                scope=scope,
-                item_group_ids=input_payload.get("product_ids") or [],
-            )
-            db.commit()
-            summary["memory_evaluated"] += int(memory_evaluation.get("evaluated") or 0)
-            summary["memory_refreshed"] += int(memory_refresh.get("refreshed") or 0)
-        except Exception:  # noqa: BLE001
-            db.rollback()
-            summary["memory_errors"] += 1
-            logger.exception("Hermes MySQL strategy memory refresh failed", extra={"scope": dict(scope)})
-        if (
-            float(input_payload.get("summary", {}).get("cost") or 0) <= 0
-            and not input_payload.get("guard_events")
-            and not input_payload.get("learning_stats")
-            and int(input_payload.get("shop_orders", {}).get("order_count") or 0) <= 0
-        ):
-            _save_report(
-                db,
-                scope=scope,
-                report_date=scope_report_date,
-                input_payload=input_payload,
-                response_payload={},
-                output_text="无投放数据，未调用 Hermes。",
-                parsed={"markdown_report": "无投放数据，未调用 Hermes。", "recommendations": []},
-                status="SKIPPED_EMPTY",
-            )
-            db.commit()
-            summary["skipped"] += 1
-            continue
-        try:
-            if report_finalized:
+        db.commit()
+        summary["skipped"] += 1
+        return
+    try:
+        if report_finalized:
+            async with limits.llm:
                 response_payload, output_text, parsed = await _call_hermes(input_payload)
-            else:
-                response_payload = {}
-                parsed = _initial_report_output(input_payload)
-                output_text = str(parsed.get("markdown_report") or "")
-            report_id = _save_report(
-                db,
-                scope=scope,
-                report_date=scope_report_date,
-                input_payload=input_payload,
-                response_payload=response_payload,
-                output_text=output_text,
-                parsed=parsed,
-                status="GENERATED",
-            )
-            db.commit()
-            summary["generated"] += 1
+        else:
+            response_payload = {}
+            parsed = _initial_report_output(input_payload)
+            output_text = str(parsed.get("markdown_report") or "")
+        report_id = _save_report(
+            db,
+            scope=scope,
+            report_date=scope_report_date,
+            input_payload=input_payload,
+            response_payload=response_payload,
+            output_text=output_text,
+            parsed=parsed,
+            status="GENERATED",
+        )
+        _save_report_checkpoint(
+            db,
+            scope,
+            scope_report_date,
+            stage=_CHECKPOINT_COMPLETED,
+            final_cutoff=final_cutoff,
+            overview_refresh=overview_refresh,
+        )
+        db.commit()
+        summary["generated"] += 1
+        if report_finalized:
+            summary["finalized_reports"] += 1
+        else:
+            summary["initial_reports"] += 1
+        if report_id:
+            try:
+                link_policy_evaluations_to_report(
+                    db,
+                    scope=scope,
+                    report_date=scope_report_date,
+                    report_id=int(report_id),
+                )
+                db.commit()
+            except Exception:  # noqa: BLE001
+                db.rollback()
+                summary["memory_errors"] += 1
+                logger.exception(
+                    "Hermes policy evaluation report link failed",
+                    extra={"scope": dict(scope), "report_id": report_id},
+                )
             if report_finalized:
-                summary["finalized_reports"] += 1
-            else:
-                summary["initial_reports"] += 1
-            if report_id:
-                try:
-                    link_policy_evaluations_to_report(
-                        db,
-                        scope=scope,
-                        report_date=scope_report_date,
-                        report_id=int(report_id),
-                    )
-                    db.commit()
-                except Exception:  # noqa: BLE001
-                    db.rollback()
-                    summary["memory_errors"] += 1
-                    logger.exception(
-                        "Hermes policy evaluation report link failed",
-                        extra={"scope": dict(scope), "report_id": report_id},
-                    )
-                if report_finalized:
+                async with limits.llm:
                     decision_result = await _run_tracked_report_decision(
                         db,
                         report_id=int(report_id),
                         force=True,
                     )
-                    summary["decision_approved"] += int(
-                        decision_result.get("approved") or 0
-                    )
-                    if decision_result.get("error"):
-                        summary["decision_errors"] += 1
-        except APIError as exc:
-            db.rollback()
-            ensure_hermes_daily_report_table(db)
-            _save_report(
-                db,
-                scope=scope,
-                report_date=scope_report_date,
-                input_payload=input_payload,
-                response_payload={},
-                output_text="",
-                parsed={},
-                status="FAILED",
-                error_message=str(exc),
-            )
-            db.commit()
-            summary["errors"] += 1
-            logger.exception("Hermes daily report failed", extra={"scope": dict(scope)})
-        except Exception as exc:  # noqa: BLE001
-            db.rollback()
-            ensure_hermes_daily_report_table(db)
-            _save_report(
-                db,
-                scope=scope,
-                report_date=scope_report_date,
-                input_payload=input_payload,
-                response_payload={},
-                output_text="",
-                parsed={},
-                status="FAILED",
-                error_message=str(exc),
-            )
-            db.commit()
-            summary["errors"] += 1
-            logger.exception("GMV Max daily report failed", extra={"scope": dict(scope)})
-    return summary
+                summary["decision_approved"] += int(
+                    decision_result.get("approved") or 0
+                )
+                if decision_result.get("error"):
+                    summary["decision_errors"] += 1
+    except APIError as exc:
+        db.rollback()
+        ensure_hermes_daily_report_table(db)
+        _save_report(
+            db,
+            scope=scope,
+            report_date=scope_report_date,
+            input_payload=input_payload,
+            response_payload={},
+            output_text="",
+            parsed={},
+            status="FAILED",
+            error_message=str(exc),
+        )
+        db.commit()
+        summary["errors"] += 1
+        logger.exception("Hermes daily report failed", extra={"scope": dict(scope)})
+    except Exception as exc:  # noqa: BLE001
+        db.rollback()
+        ensure_hermes_daily_report_table(db)
+        _save_report(
+            db,
+            scope=scope,
+            report_date=scope_report_date,
+            input_payload=input_payload,
+            response_payload={},
+            output_text="",
+            parsed={},
+            status="FAILED",
+            error_message=str(exc),
+        )
+        db.commit()
+        summary["errors"] += 1
+        logger.exception("GMV Max daily report failed", extra={"scope": dict(scope)})
+
+
+async def run_hermes_daily_report_cycle(
+    db: Session,
+    *,
+    report_date: date | None = None,
+    force: bool = False,
+    session_factory: Callable[[], Session] | None = None,
+) -> dict[str, Any]:
+    """Generate daily reports for every scope in bounded parallel lanes.
+
+    Each lane works on its own session from ``session_factory`` (a session
+    maker on ``db``'s engine by default).  Per-scope checkpoints let a rerun
+    after a crash skip finished scopes and reuse recent overview refreshes.
+    """
+
+    ensure_hermes_daily_report_table(db)
+    scopes = _load_report_scopes(db)
+    db.commit()
+    summary: Counter[str] = Counter({key: 0 for key in _CYCLE_SUMMARY_KEYS})
+    limits = _CycleLimits(
+        tiktok=asyncio.Semaphore(
+            _positive_setting("GMVMAX_HERMES_DAILY_REPORT_TIKTOK_CONCURRENCY", 4)
+        ),
+        llm=asyncio.Semaphore(
+            _positive_setting("GMVMAX_HERMES_DAILY_REPORT_LLM_CONCURRENCY", 2)
+        ),
+    )
+    lanes = asyncio.Semaphore(
+        _positive_setting("GMVMAX_HERMES_DAILY_REPORT_SCOPE_CONCURRENCY", 8)
+    )
+    make_session = session_factory or sessionmaker(
+        bind=db.get_bind(), autoflush=False, expire_on_commit=False
+    )
+
+    async def _lane(scope: Mapping[str, Any]) -> None:
+        async with lanes:
+            scope_summary: Counter[str] = Counter()
+            scope_db = make_session()
+            try:
+                await _process_report_scope(
+                    scope_db,
+                    scope,
+                    report_date=report_date,
+                    force=force,
+                    limits=limits,
+                    summary=scope_summary,
+                )
+            except Exception:  # noqa: BLE001 - one scope must not stop the cycle.
+                scope_db.rollback()
+                scope_summary["errors"] += 1
+                logger.exception("Hermes daily report scope failed", extra={"scope": dict(scope)})
+            finally:
+                scope_db.close()
+            summary.update(scope_summary)
+
+    await asyncio.gather(*(_lane(scope) for scope in scopes))
+    return {"scopes": len(scopes), **summary}
 
 
 def run_hermes_daily_report_cycle_sync(
@@ -0,0 +1,341 @@
+"""Redis rolling windows for GMV Max realtime guard reads.
+
+Smart Guard re-reads the same minutes of history every cycle: the creative
+10-minute snapshots behind product momentum and the last unchanged HOLD
+heartbeat of each campaign.  Complete creative batches are immutable once
+committed, so this module mirrors them into Redis sorted sets scored by
+snapshot time and trimmed to a short retention window.  Guards read the window
+from Redis and fall back to MySQL whenever the store cannot prove it covers
+the requested range.
+
+Writes are published only after the SQL transaction that produced the rows
+commits.  A failed publish drops the coverage marker so readers return to SQL
+until a fresh, gap-free series has accumulated again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections.abc import Callable, Iterable, Mapping
+from datetime import date, datetime, timezone
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.redis_client import get_redis_sync
+
+logger = logging.getLogger("gmv.services.gmvmax.realtime_counters")
+
+_KEY_PREFIX = "gmvmax:rt"
+_CREATIVE_COUNTERS = ("cost_cents", "gross_revenue_cents", "orders", "impressions", "clicks")
+_PENDING_KEY = "gmvmax_realtime_counters_pending"
+_LISTENING_KEY = "gmvmax_realtime_counters_listening"
+_HEARTBEAT_SECONDS = 10 * 60
+
+
+def counters_enabled() -> bool:
+    return bool(getattr(settings, "GMVMAX_REALTIME_COUNTERS_ENABLED", True))
+
+
+def retention_minutes() -> int:
+    return max(60, int(getattr(settings, "GMVMAX_REALTIME_COUNTERS_RETENTION_MINUTES", 6 * 60)))
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _from_epoch(value: float) -> datetime:
+    return datetime.fromtimestamp(float(value), tz=timezone.utc).replace(tzinfo=None)
+
+
+def _scope_key(kind: str, *parts: Any) -> str:
+    return ":".join([_KEY_PREFIX, kind, *(str(part) for part in parts)])
+
+
+def creative_series_key(
+    *, workspace_id: int, auth_id: int, advertiser_id: str, store_id: str, campaign_id: str,
+) -> str:
+    return _scope_key("creative", workspace_id, auth_id, advertiser_id, store_id, campaign_id)
+
+
+def _coverage_key(series_key: str) -> str:
+    return f"{series_key}:since"
+
+
+# ---------------------------------------------------------------------------
+# Transaction-bound publishing
+# ---------------------------------------------------------------------------
+
+
+def _flush_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None) or []
+    for callback in pending:
+        try:
+            callback()
+        except Exception:  # noqa: BLE001 - Redis mirrors never fail a committed sync
+            logger.warning("gmvmax realtime counter publish failed", exc_info=True)
+
+
+def _discard_pending(session: Session, _previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def publish_after_commit(db: Any, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once ``db`` commits; drop it if the session rolls back."""
+
+    if not counters_enabled() or not isinstance(db, Session):
+        return
+    if not db.info.get(_LISTENING_KEY):
+        event.listen(db, "after_commit", _flush_pending)
+        event.listen(db, "after_soft_rollback", _discard_pending)
+        db.info[_LISTENING_KEY] = True
+    db.info.setdefault(_PENDING_KEY, []).append(callback)
+
+
+def _write_series(key: str, *, score: float, members: Iterable[str], now: datetime) -> None:
+    """Replace one observation bucket and extend the series' coverage."""
+
+    client = get_redis_sync()
+    ttl_seconds = retention_minutes() * 60
+    cutoff = _epoch(now) - ttl_seconds
+    try:
+        pipe = client.pipeline(transaction=True)
+        pipe.zremrangebyscore(key, score, score)
+        mapping = {member: score for member in members}
+        if mapping:
+            pipe.zadd(key, mapping)
+        pipe.zremrangebyscore(key, "-inf", f"({cutoff}")
+        pipe.expire(key, ttl_seconds)
+        pipe.set(_coverage_key(key), str(score), nx=True, ex=ttl_seconds)
+        pipe.expire(_coverage_key(key), ttl_seconds)
+        pipe.execute()
+    except Exception:
+        try:
+            client.delete(_coverage_key(key))
+        except Exception:  # noqa: BLE001 - the marker TTL bounds a stale claim
+            pass
+        raise
+
+
+def _read_series(key: str, *, since: datetime, until: datetime) -> list[tuple[float, dict[str, Any]]] | None:
+    """Return ``(score, member)`` pairs, or ``None`` when coverage is unproven."""
+
+    if not counters_enabled():
+        return None
+    if _epoch(since) < datetime.now(timezone.utc).timestamp() - retention_minutes() * 60:
+        # Older members have been trimmed even though coverage began earlier.
+        return None
+    try:
+        client = get_redis_sync()
+        pipe = client.pipeline(transaction=False)
+        pipe.get(_coverage_key(key))
+        pipe.zrangebyscore(key, _epoch(since), _epoch(until), withscores=True)
+        covered_since, rows = pipe.execute()
+    except Exception as exc:  # noqa: BLE001 - SQL remains authoritative
+        logger.debug("gmvmax realtime counters unavailable: %s", exc)
+        return None
+    if covered_since is None:
+        return None
+    try:
+        if float(covered_since) > _epoch(since):
+            return None
+    except (TypeError, ValueError):
+        return None
+    decoded: list[tuple[float, dict[str, Any]]] = []
+    for raw, score in rows or []:
+        try:
+            decoded.append((float(score), json.loads(raw)))
+        except (TypeError, ValueError):
+            return None
+    return decoded
+
+
+# ---------------------------------------------------------------------------
+# Creative 10-minute snapshots
+# ---------------------------------------------------------------------------
+
+
+def record_creative_snapshot(
+    db: Any,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    campaign_id: str,
+    snapshot_at: datetime,
+    rows_by_day: Mapping[date, Mapping[tuple[str, str], Mapping[str, Any]]],
+) -> None:
+    """Mirror one complete creative batch once its manifest commits.
+
+    ``rows_by_day`` maps every manifest day, including empty ones, to the
+    cumulative counters keyed by ``(item_group_id, creative_id)``.
+    """
+
+    key = creative_series_key(
+        workspace_id=workspace_id,
+        auth_id=auth_id,
+        advertiser_id=advertiser_id,
+        store_id=store_id,
+        campaign_id=campaign_id,
+    )
+    members = [
+        json.dumps(
+            {
+                "at": snapshot_at.isoformat(),
+                "day": stat_day.isoformat(),
+                "rows": {
+                    f"{item_group_id}|{creative_id}": [
+                        int(values.get(counter) or 0) for counter in _CREATIVE_COUNTERS
+                    ]
+                    for (item_group_id, creative_id), values in sorted(rows.items())
+                },
+            },
+            separators=(",", ":"),
+            sort_keys=True,
+        )
+        for stat_day, rows in sorted(rows_by_day.items())
+    ]
+    score = _epoch(snapshot_at)
+
+    def publish() -> None:
+        _write_series(key, score=score, members=members, now=datetime.now(timezone.utc))
+
+    publish_after_commit(db, publish)
+
+
+def creative_snapshot_rows(
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    campaign_ids: Iterable[str],
+    item_group_ids: Iterable[str] | None,
+    since: datetime,
+    now: datetime,
+    covered_only: bool = False,
+) -> dict[str, dict[str, Any]] | None:
+    """Rebuild the 10-minute rows Smart Guard momentum reads from MySQL.
+
+    Each campaign maps to ``rows`` carrying the same fields as the SQL query,
+    ordered by item group, creative and time, plus the ``latest`` snapshot and
+    the number of distinct ``snapshots`` in the window so callers can check
+    the mirror against the manifest watermark.  ``item_group_ids=None`` keeps
+    every product.  Returns ``None`` unless every campaign is covered; with
+    ``covered_only`` uncovered campaigns are left out instead.
+    """
+
+    allowed = None if item_group_ids is None else {str(item) for item in item_group_ids}
+    rows_by_campaign: dict[str, dict[str, Any]] = {}
+    for campaign_id in campaign_ids:
+        series = _read_series(
+            creative_series_key(
+                workspace_id=workspace_id,
+                auth_id=auth_id,
+                advertiser_id=advertiser_id,
+                store_id=store_id,
+                campaign_id=campaign_id,
+            ),
+            since=since,
+            until=now,
+        )
+        if series is None:
+            if covered_only:
+                continue
+            return None
+        # Every row of a day in the window is at or before that day's latest
+        # complete batch, so the window itself holds each day's watermark.
+        latest_by_day: dict[str, float] = {}
+        for score, member in series:
+            day = str(member.get("day") or "")
+            latest_by_day[day] = max(score, latest_by_day.get(day, score))
+        rows: list[dict[str, Any]] = []
+        for score, member in series:
+            day = str(member.get("day") or "")
+            for series_id, values in dict(member.get("rows") or {}).items():
+                item_group_id, _, creative_id = str(series_id).partition("|")
+                if allowed is not None and item_group_id not in allowed:
+                    continue
+                row: dict[str, Any] = {
+                    "campaign_id": str(campaign_id),
+                    "item_group_id": item_group_id,
+                    "creative_id": creative_id,
+                    "snapshot_at": _from_epoch(score),
+                    "latest_complete_snapshot_at": _from_epoch(latest_by_day[day]),
+                }
+                row.update(zip(_CREATIVE_COUNTERS, (int(value) for value in values)))
+                rows.append(row)
+        rows.sort(key=lambda row: (row["item_group_id"], row["creative_id"], row["snapshot_at"]))
+        scores = {score for score, _member in series}
+        rows_by_campaign[str(campaign_id)] = {
+            "rows": rows,
+            "latest": _from_epoch(max(scores)) if scores else None,
+            "snapshots": len(scores),
+        }
+    return rows_by_campaign
+
+
+# ---------------------------------------------------------------------------
+# Unchanged-observation heartbeats
+# ---------------------------------------------------------------------------
+
+
+def _heartbeat_key(parts: Iterable[Any]) -> str:
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:32]
+    return _scope_key("heartbeat", digest)
+
+
+def heartbeat_matches(parts: Iterable[Any], signature: str) -> bool | None:
+    """Return ``True`` when ``signature`` was published in the last ten minutes.
+
+    ``None`` means the store cannot answer and the caller must check SQL.
+    """
+
+    if not counters_enabled():
+        return None
+    try:
+        stored = get_redis_sync().get(_heartbeat_key(parts))
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("gmvmax heartbeat store unavailable: %s", exc)
+        return None
+    if stored is None:
+        return None
+    if isinstance(stored, bytes):
+        stored = stored.decode("utf-8", "replace")
+    return stored == signature
+
+
+def remember_heartbeat(db: Any, parts: Iterable[Any], signature: str, *, created_at: datetime) -> None:
+    """Publish the signature of a committed heartbeat event.
+
+    The key expires ten minutes after ``created_at`` so it never outlives the
+    SQL heartbeat window it stands in for.
+    """
+
+    key = _heartbeat_key(list(parts))
+    expires_at = _epoch(created_at) + _HEARTBEAT_SECONDS
+
+    def publish() -> None:
+        remaining = int(expires_at - datetime.now(timezone.utc).timestamp())
+        if remaining > 0:
+            get_redis_sync().set(key, signature, ex=remaining)
+
+    publish_after_commit(db, publish)
+
+
+__all__ = [
+    "counters_enabled",
+    "creative_snapshot_rows",
+    "heartbeat_matches",
+    "publish_after_commit",
+    "record_creative_snapshot",
+    "remember_heartbeat",
+]
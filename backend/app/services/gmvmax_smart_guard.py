@@ -47,6 +47,17 @@ from app.gmvmax.services.mutation_execution_lock import (
     gmvmax_mutation_lease,
 )
 from app.services.commerce_orders import current_order_timing_signal
+from app.services.gmvmax_realtime_counters import (
+    heartbeat_matches,
+    remember_heartbeat,
+)
+from app.services.gmvmax_smart_guard_windows import (
+    begin_cycle,
+    cycle_windows,
+    end_cycle,
+    mirrored_momentum_rows,
+    momentum_totals,
+)
 from app.services.ttb_api import TTBBusinessError
 from app.services.gmvmax_product_price import load_authoritative_product_price
 from app.gmvmax.services.campaign_catalog_freshness import (
@@ -943,40 +954,22 @@ def _safe_roi(gross_revenue_cents: int, cost_cents: int) -> Decimal | None:
     return (Decimal(max(0, gross_revenue_cents)) / Decimal(cost_cents)).quantize(_ROI_QUANT)
 
 
-def _product_day_stats(
+def _campaign_scope(campaign: CatalogCampaign) -> tuple[int, int, str, str]:
+    return (
+        int(campaign.workspace_id),
+        int(campaign.auth_id),
+        str(campaign.advertiser_id),
+        str(campaign.store_id),
+    )
+
+
+def _product_day_sql_row(
     db: Session,
     *,
     campaign: CatalogCampaign,
-    guard: Mapping[str, Any],
-    metrics: RealtimeMetrics,
-) -> dict[str, Any]:
-    item_group_ids = _campaign_item_group_ids(db, campaign)
-    stat_day = _advertiser_today(
-        db,
-        workspace_id=campaign.workspace_id,
-        auth_id=campaign.auth_id,
-        advertiser_id=campaign.advertiser_id,
-    )
-    empty = {
-        "item_group_ids": item_group_ids,
-        "stat_time_day": stat_day.isoformat(),
-        "cost_cents": int(metrics.cost_cents or 0),
-        "gross_revenue_cents": int(metrics.gross_revenue_cents or 0),
-        "orders": int(metrics.orders or 0),
-        "roi": metrics.roi,
-        "campaign_count": 1 if metrics.cost_cents or metrics.orders else 0,
-        "source": "current_campaign_metrics",
-        "source_updated_at": (metrics.fetched_at or _utcnow()).isoformat(),
-        "source_age_seconds": 0,
-        "current_campaign": {
-            "cost_cents": int(metrics.cost_cents or 0),
-            "gross_revenue_cents": int(metrics.gross_revenue_cents or 0),
-            "orders": int(metrics.orders or 0),
-        },
-    }
-    if not item_group_ids:
-        return empty
-
+    stat_day: date,
+    item_group_ids: list[str],
+) -> Mapping[str, Any]:
     stmt = text(
         """
         select
@@ -1000,7 +993,7 @@ def _product_day_stats(
           and item_group_id in :item_group_ids
         """
     ).bindparams(bindparam("item_group_ids", expanding=True))
-    row = db.execute(
+    return db.execute(
         stmt,
         {
             "workspace_id": campaign.workspace_id,
@@ -1012,6 +1005,58 @@ def _product_day_stats(
             "item_group_ids": [str(item) for item in item_group_ids],
         },
     ).mappings().first() or {}
+
+
+def _product_day_stats(
+    db: Session,
+    *,
+    campaign: CatalogCampaign,
+    guard: Mapping[str, Any],
+    metrics: RealtimeMetrics,
+) -> dict[str, Any]:
+    item_group_ids = _campaign_item_group_ids(db, campaign)
+    stat_day = _advertiser_today(
+        db,
+        workspace_id=campaign.workspace_id,
+        auth_id=campaign.auth_id,
+        advertiser_id=campaign.advertiser_id,
+    )
+    empty = {
+        "item_group_ids": item_group_ids,
+        "stat_time_day": stat_day.isoformat(),
+        "cost_cents": int(metrics.cost_cents or 0),
+        "gross_revenue_cents": int(metrics.gross_revenue_cents or 0),
+        "orders": int(metrics.orders or 0),
+        "roi": metrics.roi,
+        "campaign_count": 1 if metrics.cost_cents or metrics.orders else 0,
+        "source": "current_campaign_metrics",
+        "source_updated_at": (metrics.fetched_at or _utcnow()).isoformat(),
+        "source_age_seconds": 0,
+        "current_campaign": {
+            "cost_cents": int(metrics.cost_cents or 0),
+            "gross_revenue_cents": int(metrics.gross_revenue_cents or 0),
+            "orders": int(metrics.orders or 0),
+        },
+    }
+    if not item_group_ids:
+        return empty
+
+    windows = cycle_windows(db)
+    if windows is not None:
+        row = windows.product_day_row(
+            db,
+            scope=_campaign_scope(campaign),
+            stat_day=stat_day,
+            item_group_ids=item_group_ids,
+            campaign_id=str(campaign.campaign_id),
+        )
+    else:
+        row = _product_day_sql_row(
+            db,
+            campaign=campaign,
+            stat_day=stat_day,
+            item_group_ids=item_group_ids,
+        )
     total_cost = _to_int(row.get("total_cost_cents"), 0)
     total_gmv = _to_int(row.get("total_gmv_cents"), 0)
     total_orders = _to_int(row.get("total_orders"), 0)
@@ -1073,18 +1118,13 @@ def _product_day_stats(
     }
 
 
-def _recent_product_failure_stats(
+def _recent_product_failure_sql_row(
     db: Session,
     *,
     campaign: CatalogCampaign,
-    guard: Mapping[str, Any],
+    cutoff: datetime,
     item_group_ids: list[str],
-    now: datetime,
-) -> dict[str, Any]:
-    if not item_group_ids:
-        return {"failure_count": 0, "campaign_count": 0, "hard_stop_count": 0, "reset_count": 0}
-    lookback_hours = max(1, _to_int(guard.get("product_failure_lookback_hours"), 24))
-    cutoff = (now - timedelta(hours=lookback_hours)).replace(tzinfo=None)
+) -> Mapping[str, Any]:
     stmt = text(
         """
         select
@@ -1127,7 +1167,7 @@ def _recent_product_failure_stats(
           )
         """
     ).bindparams(bindparam("item_group_ids", expanding=True))
-    row = db.execute(
+    return db.execute(
         stmt,
         {
             "workspace_id": campaign.workspace_id,
@@ -1138,6 +1178,35 @@ def _recent_product_failure_stats(
             "item_group_ids": [str(item) for item in item_group_ids],
         },
     ).mappings().first() or {}
+
+
+def _recent_product_failure_stats(
+    db: Session,
+    *,
+    campaign: CatalogCampaign,
+    guard: Mapping[str, Any],
+    item_group_ids: list[str],
+    now: datetime,
+) -> dict[str, Any]:
+    if not item_group_ids:
+        return {"failure_count": 0, "campaign_count": 0, "hard_stop_count": 0, "reset_count": 0}
+    lookback_hours = max(1, _to_int(guard.get("product_failure_lookback_hours"), 24))
+    cutoff = (now - timedelta(hours=lookback_hours)).replace(tzinfo=None)
+    windows = cycle_windows(db)
+    if windows is not None:
+        row = windows.failure_row(
+            db,
+            scope=_campaign_scope(campaign),
+            cutoff=cutoff,
+            item_group_ids=item_group_ids,
+        )
+    else:
+        row = _recent_product_failure_sql_row(
+            db,
+            campaign=campaign,
+            cutoff=cutoff,
+            item_group_ids=item_group_ids,
+        )
     return {
         "failure_count": _to_int(row.get("failure_count"), 0),
         "campaign_count": _to_int(row.get("campaign_count"), 0),
@@ -1152,22 +1221,12 @@ def _recent_product_failure_stats(
     }
 
 
-def _product_recent_momentum_stats(
+def _recent_momentum_campaign_ids(
     db: Session,
     *,
     campaign: CatalogCampaign,
-    guard: Mapping[str, Any],
     item_group_ids: list[str],
-    now: datetime,
-) -> dict[str, Any]:
-    if not bool(guard.get("recent_momentum_enabled", True)) or not item_group_ids:
-        return {"enabled": bool(guard.get("recent_momentum_enabled", True)), "orders": 0}
-
-    window_minutes = max(10, _to_int(guard.get("recent_momentum_window_minutes"), 60))
-    now_utc = now.astimezone(timezone.utc) if now.tzinfo is not None else now.replace(tzinfo=timezone.utc)
-    now_naive = now_utc.replace(tzinfo=None)
-    cutoff = now_naive - timedelta(minutes=window_minutes)
-    since = cutoff - timedelta(minutes=180)
+) -> list[str]:
     campaign_rows = db.execute(
         text(
             """
@@ -1196,11 +1255,19 @@ def _product_recent_momentum_stats(
             "item_group_ids": [str(item) for item in item_group_ids],
         },
     ).scalars().all()
-    campaign_ids = [str(row) for row in campaign_rows if row]
-    if not campaign_ids:
-        return {"enabled": True, "orders": 0, "window_minutes": window_minutes}
+    return [str(row) for row in campaign_rows if row]
 
-    rows = db.execute(
+
+def _recent_momentum_sql_rows(
+    db: Session,
+    *,
+    campaign: CatalogCampaign,
+    campaign_ids: list[str],
+    item_group_ids: list[str],
+    since: datetime,
+    now: datetime,
+) -> list[Mapping[str, Any]]:
+    return db.execute(
         text(
             """
             select m.campaign_id, m.item_group_id, m.creative_id, m.snapshot_at,
@@ -1263,62 +1330,76 @@ def _product_recent_momentum_stats(
             "campaign_ids": campaign_ids,
             "item_group_ids": [str(item) for item in item_group_ids],
             "since": since,
-            "now": now_naive,
+            "now": now,
         },
     ).mappings().all()
-    allowed_item_group_ids = {str(item) for item in item_group_ids}
-    grouped: dict[tuple[str, str, str], list[Mapping[str, Any]]] = {}
-    for row in rows:
-        item_group_id = str(row.get("item_group_id") or "")
-        # SQL is authoritative; this defensive check also prevents an
+
+
+def _product_recent_momentum_stats(
+    db: Session,
+    *,
+    campaign: CatalogCampaign,
+    guard: Mapping[str, Any],
+    item_group_ids: list[str],
+    now: datetime,
+) -> dict[str, Any]:
+    if not bool(guard.get("recent_momentum_enabled", True)) or not item_group_ids:
+        return {"enabled": bool(guard.get("recent_momentum_enabled", True)), "orders": 0}
+
+    window_minutes = max(10, _to_int(guard.get("recent_momentum_window_minutes"), 60))
+    now_utc = now.astimezone(timezone.utc) if now.tzinfo is not None else now.replace(tzinfo=timezone.utc)
+    now_naive = now_utc.replace(tzinfo=None)
+    cutoff = now_naive - timedelta(minutes=window_minutes)
+    since = cutoff - timedelta(minutes=180)
+    windows = cycle_windows(db)
+    if windows is not None:
+        momentum = windows.momentum(
+            db,
+            scope=_campaign_scope(campaign),
+            item_group_ids=item_group_ids,
+            since=since,
+            cutoff=cutoff,
+            now=now_naive,
+            active_campaign_id=str(campaign.campaign_id),
+        )
+        campaign_ids = list(momentum["campaign_ids"])
+        if not campaign_ids:
+            return {"enabled": True, "orders": 0, "window_minutes": window_minutes}
+    else:
+        campaign_ids = _recent_momentum_campaign_ids(db, campaign=campaign, item_group_ids=item_group_ids)
+        if not campaign_ids:
+            return {"enabled": True, "orders": 0, "window_minutes": window_minutes}
+        rows = mirrored_momentum_rows(
+            db,
+            scope=_campaign_scope(campaign),
+            campaign_ids=campaign_ids,
+            item_group_ids=item_group_ids,
+            since=since,
+            now=now_naive,
+        )
+        if rows is None:
+            rows = _recent_momentum_sql_rows(
+                db,
+                campaign=campaign,
+                campaign_ids=campaign_ids,
+                item_group_ids=item_group_ids,
+                since=since,
+                now=now_naive,
+            )
+        # SQL is authoritative; the item-group mask also prevents an
         # unexpectedly broad/mock result from contaminating product momentum.
-        if item_group_id not in allowed_item_group_ids:
-            continue
-        key = (
-            str(row.get("campaign_id")),
-            item_group_id,
-            str(row.get("creative_id")),
+        momentum = momentum_totals(
+            rows,
+            item_group_ids=item_group_ids,
+            cutoff=cutoff,
+            active_campaign_id=str(campaign.campaign_id),
         )
-        grouped.setdefault(key, []).append(row)
-
-    totals = {"cost_cents": 0, "gross_revenue_cents": 0, "orders": 0, "impressions": 0, "clicks": 0}
-    active_campaign_totals = {"cost_cents": 0, "gross_revenue_cents": 0, "orders": 0}
-    latest_snapshot_at: datetime | None = None
-    reliable_group_count = 0
-    for (campaign_id, _item_group_id, _creative_id), snapshots in grouped.items():
-        if not snapshots:
-            continue
-        latest = snapshots[-1]
-        latest_at = latest.get("snapshot_at")
-        if latest_at != latest.get("latest_complete_snapshot_at"):
-            # The creative disappeared from the latest complete campaign/day
-            # inventory; never treat its older cumulative row as current.
-            continue
-        if isinstance(latest_at, datetime) and (
-            latest_snapshot_at is None or latest_at > latest_snapshot_at
-        ):
-            latest_snapshot_at = latest_at
-        baseline: Mapping[str, Any] | None = None
-        for snapshot in snapshots:
-            if snapshot.get("snapshot_at") <= cutoff:
-                baseline = snapshot
-            else:
-                break
-        if baseline is None:
-            # A cumulative snapshot without an earlier baseline is not an
-            # increment. Use the first observation so a newly discovered
-            # campaign cannot masquerade as fresh 60-minute spend/orders.
-            baseline = snapshots[0]
-        if latest is not baseline:
-            reliable_group_count += 1
-        for key in totals:
-            delta = _to_int(latest.get(key), 0) - _to_int(baseline.get(key), 0)
-            if delta < 0:
-                delta = _to_int(latest.get(key), 0)
-            totals[key] += delta
-            if campaign_id == str(campaign.campaign_id) and key in active_campaign_totals:
-                active_campaign_totals[key] += delta
 
+    totals = momentum["totals"]
+    active_campaign_totals = momentum["active_campaign_totals"]
+    latest_snapshot_at = momentum["latest_snapshot_at"]
+    if not isinstance(latest_snapshot_at, datetime):
+        latest_snapshot_at = None
     roi = _safe_roi(totals["gross_revenue_cents"], totals["cost_cents"])
     active_roi = _safe_roi(active_campaign_totals["gross_revenue_cents"], active_campaign_totals["cost_cents"])
     return {
@@ -1341,7 +1422,7 @@ def _product_recent_momentum_stats(
         "source": "creative_10min_delta",
         "source_updated_at": latest_snapshot_at.isoformat() if latest_snapshot_at else None,
         "source_age_seconds": _source_age_seconds(db, latest_snapshot_at),
-        "reliable_group_count": reliable_group_count,
+        "reliable_group_count": momentum["reliable_group_count"],
     }
 
 
@@ -2662,7 +2743,29 @@ def _insert_event(
     # A HOLD/SKIPPED conflict is re-evaluated every minute, but an unchanged
     # observation only needs a ten-minute heartbeat in the append-only event
     # stream. Mutation successes/failures are never throttled.
+    heartbeat_parts: tuple[Any, ...] | None = None
     if str(action).upper() == "HOLD" and str(result).upper() == "SKIPPED":
+        current_signature = _guard_event_signature(
+            cost_cents=metrics.cost_cents,
+            gross_revenue_cents=metrics.gross_revenue_cents,
+            orders=metrics.orders,
+            roi=metrics.roi,
+            request_json=request_payload,
+            response_json=response_payload,
+            error_message=error_message,
+        )
+        heartbeat_parts = (
+            campaign.workspace_id,
+            campaign.auth_id,
+            campaign.advertiser_id,
+            campaign.store_id,
+            campaign.campaign_id,
+            action,
+            reason,
+            result,
+        )
+        if heartbeat_matches(heartbeat_parts, current_signature):
+            return False
         previous = db.execute(
             text(
                 """
@@ -2696,15 +2799,6 @@ def _insert_event(
             },
         ).mappings().first()
         if previous is not None:
-            current_signature = _guard_event_signature(
-                cost_cents=metrics.cost_cents,
-                gross_revenue_cents=metrics.gross_revenue_cents,
-                orders=metrics.orders,
-                roi=metrics.roi,
-                request_json=request_payload,
-                response_json=response_payload,
-                error_message=error_message,
-            )
             previous_signature = _guard_event_signature(
                 cost_cents=previous.get("cost_cents"),
                 gross_revenue_cents=previous.get("gross_revenue_cents"),
@@ -2753,6 +2847,12 @@ def _insert_event(
             "created_at": created_at,
         },
     )
+    if heartbeat_parts is not None:
+        remember_heartbeat(db, heartbeat_parts, current_signature, created_at=created_at)
+    windows = cycle_windows(db)
+    if windows is not None and str(result).upper() == "SUCCESS":
+        # Later strategies on the same product must see this mutation.
+        windows.invalidate_failures(_campaign_scope(campaign))
     if not write_learning_sample:
         return True
     try:
@@ -4521,305 +4621,363 @@ async def _apply_campaign_adjustment(
 async def run_smart_guard_cycle(db: Session, *, now: datetime | None = None) -> dict[str, Any]:
     cycle_time = now or _utcnow()
     strategies = _load_enabled_strategies(db)
-    summary: dict[str, Any] = {
-        "strategies": len(strategies),
-        "checked": 0,
-        "paused": 0,
-        "resumed": 0,
-        "adjusted": 0,
-        "rebuilt": 0,
-        "held": 0,
-        "stopped": 0,
-        "hermes_reviewed": 0,
-        "data_conflicts": 0,
-        "forced_syncs": 0,
-        "manual_override_holds": 0,
-        "skipped_not_due": 0,
-        "errors": 0,
-    }
-
-    for strategy in strategies:
-        campaign = _load_catalog_campaign(db, strategy)
-        _load_runtime_state(db, strategy, campaign=campaign)
-        if not _strategy_due(strategy, cycle_time):
-            summary["skipped_not_due"] += 1
-            continue
-        if campaign is None:
-            _update_strategy_state(
-                strategy,
-                now=cycle_time,
-                decision={"action": "SKIP", "reason": "campaign_missing_in_catalog"},
-                paused_until=None,
-            )
-            db.add(strategy)
-            db.commit()
-            summary["errors"] += 1
-            continue
+    # Product history windows are loaded once per store scope and shared by
+    # every strategy evaluated in this cycle; a new cycle replaces them.
+    begin_cycle(db)
+    try:
+        summary: dict[str, Any] = {
+            "strategies": len(strategies),
+            "checked": 0,
+            "paused": 0,
+            "resumed": 0,
+            "adjusted": 0,
+            "rebuilt": 0,
+            "held": 0,
+            "stopped": 0,
+            "hermes_reviewed": 0,
+            "data_conflicts": 0,
+            "forced_syncs": 0,
+            "manual_override_holds": 0,
+            "skipped_not_due": 0,
+            "errors": 0,
+        }
 
-        try:
-            if is_manual_pause_override_active(
-                db,
-                workspace_id=campaign.workspace_id,
-                auth_id=campaign.auth_id,
-                advertiser_id=campaign.advertiser_id,
-                store_id=campaign.store_id,
-                campaign_id=campaign.campaign_id,
-                now=cycle_time,
-            ):
-                decision = {
-                    "action": "HOLD",
-                    "reason": "manual_pause_override",
-                    "decision_phase": "MANUAL_OVERRIDE",
-                    "monitor_interval_minutes": 1,
-                }
+        for strategy in strategies:
+            campaign = _load_catalog_campaign(db, strategy)
+            _load_runtime_state(db, strategy, campaign=campaign)
+            if not _strategy_due(strategy, cycle_time):
+                summary["skipped_not_due"] += 1
+                continue
+            if campaign is None:
                 _update_strategy_state(
                     strategy,
                     now=cycle_time,
-                    decision=decision,
+                    decision={"action": "SKIP", "reason": "campaign_missing_in_catalog"},
                     paused_until=None,
-                    monitor_interval_minutes=1,
                 )
-                _persist_runtime_state(db, strategy, campaign=campaign, now=cycle_time)
-                _clear_legacy_runtime_config(strategy)
                 db.add(strategy)
                 db.commit()
-                summary["manual_override_holds"] += 1
-                summary["held"] += 1
-                summary["checked"] += 1
+                summary["errors"] += 1
                 continue
-            metrics = await _fetch_today_metrics(db, campaign)
-            data_quality = _assess_realtime_metrics_quality(
-                db,
-                strategy=strategy,
-                campaign=campaign,
-                metrics=metrics,
-            )
-            if metrics.raw is None:
-                metrics.raw = {}
-            metrics.raw["data_quality"] = data_quality
-            if not bool(data_quality.get("valid")):
-                reason = f"data_quality:{data_quality.get('reason') or 'invalid_report'}"
-                decision = {
-                    "action": "HOLD",
-                    "reason": reason,
-                    "data_quality": data_quality,
-                    "monitor_interval_minutes": 1,
-                }
-                _insert_event(
+
+            try:
+                if is_manual_pause_override_active(
+                    db,
+                    workspace_id=campaign.workspace_id,
+                    auth_id=campaign.auth_id,
+                    advertiser_id=campaign.advertiser_id,
+                    store_id=campaign.store_id,
+                    campaign_id=campaign.campaign_id,
+                    now=cycle_time,
+                ):
+                    decision = {
+                        "action": "HOLD",
+                        "reason": "manual_pause_override",
+                        "decision_phase": "MANUAL_OVERRIDE",
+                        "monitor_interval_minutes": 1,
+                    }
+                    _update_strategy_state(
+                        strategy,
+                        now=cycle_time,
+                        decision=decision,
+                        paused_until=None,
+                        monitor_interval_minutes=1,
+                    )
+                    _persist_runtime_state(db, strategy, campaign=campaign, now=cycle_time)
+                    _clear_legacy_runtime_config(strategy)
+                    db.add(strategy)
+                    db.commit()
+                    summary["manual_override_holds"] += 1
+                    summary["held"] += 1
+                    summary["checked"] += 1
+                    continue
+                metrics = await _fetch_today_metrics(db, campaign)
+                data_quality = _assess_realtime_metrics_quality(
                     db,
                     strategy=strategy,
                     campaign=campaign,
                     metrics=metrics,
-                    action="HOLD",
-                    reason=reason,
-                    result="SKIPPED",
-                    response_json={"data_quality": data_quality},
-                    write_learning_sample=False,
-                )
-                smart_state = _smart_guard_state(strategy)
-                _update_strategy_state(
-                    strategy,
-                    now=cycle_time,
-                    decision=decision,
-                    paused_until=smart_state.get("paused_until"),
-                    monitor_interval_minutes=1,
                 )
-                _persist_runtime_state(db, strategy, campaign=campaign, now=cycle_time)
-                _clear_legacy_runtime_config(strategy)
-                db.execute(
-                    text(
-                        """
-                        update gmv_campaign_realtime_state
-                        set guard_status='data_hold', last_action='HOLD',
-                            last_reason=:reason, last_checked_at=:checked_at,
-                            updated_at=:checked_at
-                        where workspace_id=:workspace_id
-                          and auth_id=:auth_id
-                          and advertiser_id=:advertiser_id
-                          and store_id=:store_id
-                          and campaign_id=:campaign_id
-                        """
-                    ),
-                    {
+                if metrics.raw is None:
+                    metrics.raw = {}
+                metrics.raw["data_quality"] = data_quality
+                if not bool(data_quality.get("valid")):
+                    reason = f"data_quality:{data_quality.get('reason') or 'invalid_report'}"
+                    decision = {
+                        "action": "HOLD",
                         "reason": reason,
-                        "checked_at": cycle_time.replace(tzinfo=None),
-                        "workspace_id": campaign.workspace_id,
-                        "auth_id": campaign.auth_id,
-                        "advertiser_id": campaign.advertiser_id,
-                        "store_id": campaign.store_id,
-                        "campaign_id": campaign.campaign_id,
-                    },
-                )
-                db.add(strategy)
-                db.commit()
-                summary["held"] += 1
-                summary["checked"] += 1
-                continue
-            decision = _decide(db, strategy=strategy, campaign=campaign, metrics=metrics, now=cycle_time)
-            decision["data_quality"] = data_quality
-            guard = _guard_config(strategy)
-            decision = _prepare_two_stage_decision(
-                strategy=strategy,
-                campaign=campaign,
-                decision=decision,
-                now=cycle_time,
-            )
-            consistency = dict((decision.get("threshold_context") or {}).get("data_consistency") or {})
-            if consistency.get("state") == "conflict":
-                summary["data_conflicts"] += 1
-            _enqueue_conflict_sync(
-                db=db,
-                strategy=strategy,
-                campaign=campaign,
-                decision=decision,
-                now=cycle_time,
-            )
-            if decision.get("forced_sync_status") == "enqueued":
-                summary["forced_syncs"] += 1
-
-            pre_applied_pause = False
-            pre_applied_response: dict[str, Any] | None = None
-            proposed_action = str(decision.get("action") or "HOLD").upper()
-            if (
-                proposed_action == "PAUSE"
-                and bool(decision.get("requires_hermes_review"))
-                and _status_is_active(campaign.operation_status)
-            ):
-                try:
-                    pre_applied_response = await _apply_status_action(
-                        db,
-                        campaign=campaign,
-                        action="PAUSE",
-                    )
-                    pre_applied_pause = True
-                except Exception as exc:  # noqa: BLE001
+                        "data_quality": data_quality,
+                        "monitor_interval_minutes": 1,
+                    }
                     _insert_event(
                         db,
                         strategy=strategy,
                         campaign=campaign,
                         metrics=metrics,
-                        action="PAUSE",
-                        reason=str(decision.get("reason") or "protective pause"),
-                        result="FAILED",
-                        request_json={"decision_phase": "PROTECTION"},
-                        error_message=str(exc),
+                        action="HOLD",
+                        reason=reason,
+                        result="SKIPPED",
+                        response_json={"data_quality": data_quality},
+                        write_learning_sample=False,
                     )
-                    raise
-
-            decision = await _review_two_stage_decision(
-                strategy=strategy,
-                campaign=campaign,
-                metrics=metrics,
-                decision=decision,
-                now=cycle_time,
-            )
-            if decision.get("hermes_review"):
-                summary["hermes_reviewed"] += 1
-            monitor_interval = _dynamic_monitor_interval_minutes(
-                db,
-                campaign=campaign,
-                metrics=metrics,
-                guard=guard,
-                order_timing=(decision.get("threshold_context") or {}).get("order_timing"),
-            )
-            decision_phase = str(decision.get("decision_phase") or "").upper()
-            current_test_state = dict(_smart_guard_state(strategy).get("controlled_test") or {})
-            if decision_phase.startswith("CONTROLLED_TEST") or bool(current_test_state.get("active")):
-                monitor_interval = max(
-                    1,
-                    _to_int(guard.get("controlled_test_monitor_interval_minutes"), 1),
+                    smart_state = _smart_guard_state(strategy)
+                    _update_strategy_state(
+                        strategy,
+                        now=cycle_time,
+                        decision=decision,
+                        paused_until=smart_state.get("paused_until"),
+                        monitor_interval_minutes=1,
+                    )
+                    _persist_runtime_state(db, strategy, campaign=campaign, now=cycle_time)
+                    _clear_legacy_runtime_config(strategy)
+                    db.execute(
+                        text(
+                            """
+                            update gmv_campaign_realtime_state
+                            set guard_status='data_hold', last_action='HOLD',
+                                last_reason=:reason, last_checked_at=:checked_at,
+                                updated_at=:checked_at
+                            where workspace_id=:workspace_id
+                              and auth_id=:auth_id
+                              and advertiser_id=:advertiser_id
+                              and store_id=:store_id
+                              and campaign_id=:campaign_id
+                            """
+                        ),
+                        {
+                            "reason": reason,
+                            "checked_at": cycle_time.replace(tzinfo=None),
+                            "workspace_id": campaign.workspace_id,
+                            "auth_id": campaign.auth_id,
+                            "advertiser_id": campaign.advertiser_id,
+                            "store_id": campaign.store_id,
+                            "campaign_id": campaign.campaign_id,
+                        },
+                    )
+                    db.add(strategy)
+                    db.commit()
+                    summary["held"] += 1
+                    summary["checked"] += 1
+                    continue
+                decision = _decide(db, strategy=strategy, campaign=campaign, metrics=metrics, now=cycle_time)
+                decision["data_quality"] = data_quality
+                guard = _guard_config(strategy)
+                decision = _prepare_two_stage_decision(
+                    strategy=strategy,
+                    campaign=campaign,
+                    decision=decision,
+                    now=cycle_time,
                 )
-            action = str(decision.get("action") or "HOLD").upper()
-            reason = str(decision.get("reason") or "")
-            response_payload: dict[str, Any] | None = None
-            request_payload: dict[str, Any] | None = None
-
-            if action in {"PAUSE", "START"}:
-                request_payload = {
-                    "campaign_id": campaign.campaign_id,
-                    "action": action,
-                    "operation_status": "DISABLE" if action == "PAUSE" else "ENABLE",
-                    "threshold_context": decision.get("threshold_context"),
-                    "disable_strategy": bool(decision.get("disable_strategy")),
-                    "decision_phase": decision.get("decision_phase"),
-                    "hermes_review": decision.get("hermes_review"),
-                }
-                try:
-                    if action == "START" and decision.get("controlled_test_budget_cents") is not None:
-                        test_budget = max(100, _to_int(decision.get("controlled_test_budget_cents"), 0))
-                        current_budget = _budget_to_cents(campaign.budget_value)
-                        controlled_budget = max(
-                            _to_int(guard.get("controlled_test_budget_floor_cents"), 2000),
-                            metrics.cost_cents + test_budget,
+                consistency = dict((decision.get("threshold_context") or {}).get("data_consistency") or {})
+                if consistency.get("state") == "conflict":
+                    summary["data_conflicts"] += 1
+                _enqueue_conflict_sync(
+                    db=db,
+                    strategy=strategy,
+                    campaign=campaign,
+                    decision=decision,
+                    now=cycle_time,
+                )
+                if decision.get("forced_sync_status") == "enqueued":
+                    summary["forced_syncs"] += 1
+
+                pre_applied_pause = False
+                pre_applied_response: dict[str, Any] | None = None
+                proposed_action = str(decision.get("action") or "HOLD").upper()
+                if (
+                    proposed_action == "PAUSE"
+                    and bool(decision.get("requires_hermes_review"))
+                    and _status_is_active(campaign.operation_status)
+                ):
+                    try:
+                        pre_applied_response = await _apply_status_action(
+                            db,
+                            campaign=campaign,
+                            action="PAUSE",
+                        )
+                        pre_applied_pause = True
+                    except Exception as exc:  # noqa: BLE001
+                        _insert_event(
+                            db,
+                            strategy=strategy,
+                            campaign=campaign,
+                            metrics=metrics,
+                            action="PAUSE",
+                            reason=str(decision.get("reason") or "protective pause"),
+                            result="FAILED",
+                            request_json={"decision_phase": "PROTECTION"},
+                            error_message=str(exc),
                         )
-                        controlled_adjustment = {
-                            "budget_cents": controlled_budget,
-                            "budget": float(Decimal(controlled_budget) / Decimal("100")),
-                        }
-                        if controlled_budget != current_budget:
+                        raise
+
+                decision = await _review_two_stage_decision(
+                    strategy=strategy,
+                    campaign=campaign,
+                    metrics=metrics,
+                    decision=decision,
+                    now=cycle_time,
+                )
+                if decision.get("hermes_review"):
+                    summary["hermes_reviewed"] += 1
+                monitor_interval = _dynamic_monitor_interval_minutes(
+                    db,
+                    campaign=campaign,
+                    metrics=metrics,
+                    guard=guard,
+                    order_timing=(decision.get("threshold_context") or {}).get("order_timing"),
+                )
+                decision_phase = str(decision.get("decision_phase") or "").upper()
+                current_test_state = dict(_smart_guard_state(strategy).get("controlled_test") or {})
+                if decision_phase.startswith("CONTROLLED_TEST") or bool(current_test_state.get("active")):
+                    monitor_interval = max(
+                        1,
+                        _to_int(guard.get("controlled_test_monitor_interval_minutes"), 1),
+                    )
+                action = str(decision.get("action") or "HOLD").upper()
+                reason = str(decision.get("reason") or "")
+                response_payload: dict[str, Any] | None = None
+                request_payload: dict[str, Any] | None = None
+
+                if action in {"PAUSE", "START"}:
+                    request_payload = {
+                        "campaign_id": campaign.campaign_id,
+                        "action": action,
+                        "operation_status": "DISABLE" if action == "PAUSE" else "ENABLE",
+                        "threshold_context": decision.get("threshold_context"),
+                        "disable_strategy": bool(decision.get("disable_strategy")),
+                        "decision_phase": decision.get("decision_phase"),
+                        "hermes_review": decision.get("hermes_review"),
+                    }
+                    try:
+                        if action == "START" and decision.get("controlled_test_budget_cents") is not None:
+                            test_budget = max(100, _to_int(decision.get("controlled_test_budget_cents"), 0))
+                            current_budget = _budget_to_cents(campaign.budget_value)
+                            controlled_budget = max(
+                                _to_int(guard.get("controlled_test_budget_floor_cents"), 2000),
+                                metrics.cost_cents + test_budget,
+                            )
+                            controlled_adjustment = {
+                                "budget_cents": controlled_budget,
+                                "budget": float(Decimal(controlled_budget) / Decimal("100")),
+                            }
+                            if controlled_budget != current_budget:
+                                budget_response = await _apply_campaign_adjustment(
+                                    db,
+                                    campaign=campaign,
+                                    adjustment=controlled_adjustment,
+                                    current_spend_cents=metrics.cost_cents,
+                                )
+                            else:
+                                budget_response = {
+                                    "skipped": True,
+                                    "reason": "existing_budget_matches_controlled_test_cap",
+                                }
+                            test_update = dict(decision.get("controlled_test_update") or {})
+                            decision["controlled_test_update"] = {
+                                **test_update,
+                                "platform_budget_cents": controlled_budget,
+                            }
+                            request_payload["controlled_test_budget_cents"] = test_budget
+                            request_payload["controlled_test_adjustment"] = controlled_adjustment
+                            request_payload["controlled_test_response"] = budget_response
+                        elif action == "START" and decision.get("pre_start_budget_multiplier") is not None:
+                            current_budget = _budget_to_cents(campaign.budget_value)
+                            multiplier = Decimal(str(decision.get("pre_start_budget_multiplier")))
+                            controlled_budget = max(
+                                _to_int(guard.get("controlled_test_budget_floor_cents"), 2000),
+                                int(Decimal(current_budget) * multiplier),
+                            )
+                            controlled_adjustment = {
+                                "budget_cents": controlled_budget,
+                                "budget": float(Decimal(controlled_budget) / Decimal("100")),
+                            }
                             budget_response = await _apply_campaign_adjustment(
                                 db,
                                 campaign=campaign,
                                 adjustment=controlled_adjustment,
                                 current_spend_cents=metrics.cost_cents,
                             )
+                            request_payload["controlled_test_adjustment"] = controlled_adjustment
+                            request_payload["controlled_test_response"] = budget_response
+                        response_payload = (
+                            pre_applied_response
+                            if action == "PAUSE" and pre_applied_pause
+                            else await _apply_status_action(db, campaign=campaign, action=action)
+                        )
+                        if action == "PAUSE" and bool(decision.get("disable_strategy")):
+                            strategy.enabled = False
+                            summary["stopped"] += 1
+                        _insert_event(
+                            db,
+                            strategy=strategy,
+                            campaign=campaign,
+                            metrics=metrics,
+                            action=action,
+                            reason=reason,
+                            result="SUCCESS",
+                            request_json=request_payload,
+                            response_json=response_payload,
+                        )
+                        if action == "PAUSE":
+                            summary["paused"] += 1
                         else:
-                            budget_response = {
-                                "skipped": True,
-                                "reason": "existing_budget_matches_controlled_test_cap",
+                            summary["resumed"] += 1
+                    except TTBBusinessError as exc:
+                        if action != "START" or not _is_active_campaign_conflict(exc):
+                            _insert_event(
+                                db,
+                                strategy=strategy,
+                                campaign=campaign,
+                                metrics=metrics,
+                                action=action,
+                                reason=reason,
+                                result="FAILED",
+                                request_json=request_payload,
+                                error_message=str(exc),
+                            )
+                            raise
+
+                        conflict_count, retry_minutes = _active_campaign_conflict_backoff(
+                            strategy,
+                            guard=guard,
+                        )
+                        paused_until = (cycle_time + timedelta(minutes=retry_minutes)).isoformat()
+                        reason = (
+                            "smart_guard: resume deferred because the product is occupied "
+                            "by another active GMV Max campaign"
+                        )
+                        action = "HOLD"
+                        monitor_interval = retry_minutes
+                        decision.update(
+                            {
+                                "action": action,
+                                "reason": reason,
+                                "paused_until": paused_until,
+                                "decision_phase": "START_CONFLICT_HOLD",
+                                "start_conflict_count": conflict_count,
+                                "start_conflict_retry_minutes": retry_minutes,
                             }
-                        test_update = dict(decision.get("controlled_test_update") or {})
-                        decision["controlled_test_update"] = {
-                            **test_update,
-                            "platform_budget_cents": controlled_budget,
-                        }
-                        request_payload["controlled_test_budget_cents"] = test_budget
-                        request_payload["controlled_test_adjustment"] = controlled_adjustment
-                        request_payload["controlled_test_response"] = budget_response
-                    elif action == "START" and decision.get("pre_start_budget_multiplier") is not None:
-                        current_budget = _budget_to_cents(campaign.budget_value)
-                        multiplier = Decimal(str(decision.get("pre_start_budget_multiplier")))
-                        controlled_budget = max(
-                            _to_int(guard.get("controlled_test_budget_floor_cents"), 2000),
-                            int(Decimal(current_budget) * multiplier),
                         )
-                        controlled_adjustment = {
-                            "budget_cents": controlled_budget,
-                            "budget": float(Decimal(controlled_budget) / Decimal("100")),
-                        }
-                        budget_response = await _apply_campaign_adjustment(
+                        if request_payload is not None:
+                            request_payload["platform_error_code"] = getattr(exc, "code", None)
+                        _insert_event(
                             db,
+                            strategy=strategy,
                             campaign=campaign,
-                            adjustment=controlled_adjustment,
-                            current_spend_cents=metrics.cost_cents,
+                            metrics=metrics,
+                            action=action,
+                            reason=reason,
+                            result="SKIPPED",
+                            request_json=request_payload,
+                            response_json={
+                                "platform_error_code": getattr(exc, "code", None),
+                                "retry_minutes": retry_minutes,
+                                "conflict_count": conflict_count,
+                            },
+                            write_learning_sample=False,
                         )
-                        request_payload["controlled_test_adjustment"] = controlled_adjustment
-                        request_payload["controlled_test_response"] = budget_response
-                    response_payload = (
-                        pre_applied_response
-                        if action == "PAUSE" and pre_applied_pause
-                        else await _apply_status_action(db, campaign=campaign, action=action)
-                    )
-                    if action == "PAUSE" and bool(decision.get("disable_strategy")):
-                        strategy.enabled = False
-                        summary["stopped"] += 1
-                    _insert_event(
-                        db,
-                        strategy=strategy,
-                        campaign=campaign,
-                        metrics=metrics,
-                        action=action,
-                        reason=reason,
-                        result="SUCCESS",
-                        request_json=request_payload,
-                        response_json=response_payload,
-                    )
-                    if action == "PAUSE":
-                        summary["paused"] += 1
-                    else:
-                        summary["resumed"] += 1
-                except TTBBusinessError as exc:
-                    if action != "START" or not _is_active_campaign_conflict(exc):
+                        summary["held"] += 1
+                    except Exception as exc:  # noqa: BLE001
                         _insert_event(
                             db,
                             strategy=strategy,
@@ -4832,299 +4990,247 @@ async def run_smart_guard_cycle(db: Session, *, now: datetime | None = None) ->
                             error_message=str(exc),
                         )
                         raise
-
-                    conflict_count, retry_minutes = _active_campaign_conflict_backoff(
-                        strategy,
-                        guard=guard,
-                    )
-                    paused_until = (cycle_time + timedelta(minutes=retry_minutes)).isoformat()
-                    reason = (
-                        "smart_guard: resume deferred because the product is occupied "
-                        "by another active GMV Max campaign"
-                    )
-                    action = "HOLD"
-                    monitor_interval = retry_minutes
-                    decision.update(
-                        {
-                            "action": action,
-                            "reason": reason,
-                            "paused_until": paused_until,
-                            "decision_phase": "START_CONFLICT_HOLD",
-                            "start_conflict_count": conflict_count,
-                            "start_conflict_retry_minutes": retry_minutes,
-                        }
-                    )
-                    if request_payload is not None:
-                        request_payload["platform_error_code"] = getattr(exc, "code", None)
-                    _insert_event(
-                        db,
-                        strategy=strategy,
-                        campaign=campaign,
-                        metrics=metrics,
-                        action=action,
-                        reason=reason,
-                        result="SKIPPED",
-                        request_json=request_payload,
-                        response_json={
-                            "platform_error_code": getattr(exc, "code", None),
-                            "retry_minutes": retry_minutes,
-                            "conflict_count": conflict_count,
-                        },
-                        write_learning_sample=False,
+                elif action == "REBUILD":
+                    from app.services.gmvmax_creative_guard import (
+                        rebuild_campaign_for_delivery_failure,
                     )
-                    summary["held"] += 1
-                except Exception as exc:  # noqa: BLE001
-                    _insert_event(
-                        db,
-                        strategy=strategy,
-                        campaign=campaign,
-                        metrics=metrics,
-                        action=action,
-                        reason=reason,
-                        result="FAILED",
-                        request_json=request_payload,
-                        error_message=str(exc),
-                    )
-                    raise
-            elif action == "REBUILD":
-                from app.services.gmvmax_creative_guard import (
-                    rebuild_campaign_for_delivery_failure,
-                )
 
-                current_roas = campaign.roas_bid or _to_decimal(strategy.min_roi, "0.8") or Decimal("0.8")
-                minimum_roas = _to_decimal(strategy.min_roi, "0.6") or Decimal("0.6")
-                rebuild_roas = max(
-                    _normalize_roas_bid(minimum_roas, rounding=ROUND_DOWN) or Decimal("0.1"),
-                    _normalize_roas_bid(current_roas * Decimal("0.90"), rounding=ROUND_DOWN)
-                    or Decimal("0.1"),
-                )
-                request_payload = {
-                    "campaign_id": campaign.campaign_id,
-                    "action": "RESET_CAMPAIGN",
-                    "failure_class": decision.get("failure_class"),
-                    "rebuild_roas_bid": str(rebuild_roas),
-                }
-                try:
-                    rebuild_request, response_payload = await rebuild_campaign_for_delivery_failure(
-                        db,
-                        strategy_id=int(strategy.id),
-                        reason="creative_guard:no_spend_timeout",
-                        context={
-                            "source": "smart_guard",
-                            "failure_class": decision.get("failure_class"),
-                            "rebuild_roas_bid": str(rebuild_roas),
-                            "rebuild_limit_24h": _to_int(
-                                guard.get("controlled_test_rebuild_limit_24h"), 2
-                            ),
-                        },
+                    current_roas = campaign.roas_bid or _to_decimal(strategy.min_roi, "0.8") or Decimal("0.8")
+                    minimum_roas = _to_decimal(strategy.min_roi, "0.6") or Decimal("0.6")
+                    rebuild_roas = max(
+                        _normalize_roas_bid(minimum_roas, rounding=ROUND_DOWN) or Decimal("0.1"),
+                        _normalize_roas_bid(current_roas * Decimal("0.90"), rounding=ROUND_DOWN)
+                        or Decimal("0.1"),
                     )
-                    request_payload.update(rebuild_request)
-                    deferred = bool((response_payload or {}).get("rebuild_deferred"))
-                    _insert_event(
-                        db,
-                        strategy=strategy,
-                        campaign=campaign,
-                        metrics=metrics,
-                        action="RESET_CAMPAIGN",
-                        reason=reason,
-                        result="SKIPPED" if deferred else "SUCCESS",
-                        request_json=request_payload,
-                        response_json=response_payload,
-                    )
-                    if deferred:
-                        action = "HOLD"
-                        decision["action"] = "HOLD"
-                        decision["reason"] = "smart_guard: rebuild circuit open; recovery deferred"
-                        decision["paused_until"] = (
-                            cycle_time
-                            + timedelta(
-                                minutes=max(
-                                    60,
-                                    _to_int(guard.get("max_pause_cooldown_minutes"), 360),
+                    request_payload = {
+                        "campaign_id": campaign.campaign_id,
+                        "action": "RESET_CAMPAIGN",
+                        "failure_class": decision.get("failure_class"),
+                        "rebuild_roas_bid": str(rebuild_roas),
+                    }
+                    try:
+                        rebuild_request, response_payload = await rebuild_campaign_for_delivery_failure(
+                            db,
+                            strategy_id=int(strategy.id),
+                            reason="creative_guard:no_spend_timeout",
+                            context={
+                                "source": "smart_guard",
+                                "failure_class": decision.get("failure_class"),
+                                "rebuild_roas_bid": str(rebuild_roas),
+                                "rebuild_limit_24h": _to_int(
+                                    guard.get("controlled_test_rebuild_limit_24h"), 2
+                                ),
+                            },
+                        )
+                        request_payload.update(rebuild_request)
+                        deferred = bool((response_payload or {}).get("rebuild_deferred"))
+                        _insert_event(
+                            db,
+                            strategy=strategy,
+                            campaign=campaign,
+                            metrics=metrics,
+                            action="RESET_CAMPAIGN",
+                            reason=reason,
+                            result="SKIPPED" if deferred else "SUCCESS",
+                            request_json=request_payload,
+                            response_json=response_payload,
+                        )
+                        if deferred:
+                            action = "HOLD"
+                            decision["action"] = "HOLD"
+                            decision["reason"] = "smart_guard: rebuild circuit open; recovery deferred"
+                            decision["paused_until"] = (
+                                cycle_time
+                                + timedelta(
+                                    minutes=max(
+                                        60,
+                                        _to_int(guard.get("max_pause_cooldown_minutes"), 360),
+                                    )
                                 )
-                            )
-                        ).isoformat()
-                        decision["controlled_test_update"] = {
-                            **dict(decision.get("controlled_test_update") or {}),
-                            "active": False,
-                            "status": "REBUILD_CIRCUIT_OPEN",
-                            "rebuild_pending": True,
-                        }
-                        summary["held"] += 1
-                    else:
-                        decision["controlled_test_update"] = {
-                            **dict(decision.get("controlled_test_update") or {}),
-                            "active": False,
-                            "status": "REBUILT",
-                            "rebuild_pending": False,
-                            "completed_at": cycle_time.isoformat(),
-                        }
-                        summary["rebuilt"] += 1
-                except Exception as exc:  # noqa: BLE001
-                    _insert_event(
-                        db,
-                        strategy=strategy,
-                        campaign=campaign,
-                        metrics=metrics,
-                        action="RESET_CAMPAIGN",
-                        reason=reason,
-                        result="FAILED",
-                        request_json=request_payload,
-                        error_message=str(exc),
-                    )
-                    non_retryable = type(exc).__name__ == "TTBBusinessError"
-                    retry_minutes = 30 if non_retryable else 5
-                    action = "HOLD"
-                    reason = f"smart_guard: campaign rebuild failed ({type(exc).__name__}); retry deferred"
-                    decision.update(
-                        {
-                            "action": "HOLD",
-                            "reason": reason,
-                            "paused_until": (cycle_time + timedelta(minutes=retry_minutes)).isoformat(),
-                            "decision_phase": "REBUILD_FAILED",
-                            "controlled_test_update": {
+                            ).isoformat()
+                            decision["controlled_test_update"] = {
                                 **dict(decision.get("controlled_test_update") or {}),
                                 "active": False,
-                                "status": "REBUILD_FAILED",
+                                "status": "REBUILD_CIRCUIT_OPEN",
                                 "rebuild_pending": True,
-                                "last_error": str(exc)[:500],
-                                "last_error_at": cycle_time.isoformat(),
-                                "retry_after_minutes": retry_minutes,
-                            },
-                        }
-                    )
-                    monitor_interval = retry_minutes
-                    summary["errors"] += 1
+                            }
+                            summary["held"] += 1
+                        else:
+                            decision["controlled_test_update"] = {
+                                **dict(decision.get("controlled_test_update") or {}),
+                                "active": False,
+                                "status": "REBUILT",
+                                "rebuild_pending": False,
+                                "completed_at": cycle_time.isoformat(),
+                            }
+                            summary["rebuilt"] += 1
+                    except Exception as exc:  # noqa: BLE001
+                        _insert_event(
+                            db,
+                            strategy=strategy,
+                            campaign=campaign,
+                            metrics=metrics,
+                            action="RESET_CAMPAIGN",
+                            reason=reason,
+                            result="FAILED",
+                            request_json=request_payload,
+                            error_message=str(exc),
+                        )
+                        non_retryable = type(exc).__name__ == "TTBBusinessError"
+                        retry_minutes = 30 if non_retryable else 5
+                        action = "HOLD"
+                        reason = f"smart_guard: campaign rebuild failed ({type(exc).__name__}); retry deferred"
+                        decision.update(
+                            {
+                                "action": "HOLD",
+                                "reason": reason,
+                                "paused_until": (cycle_time + timedelta(minutes=retry_minutes)).isoformat(),
+                                "decision_phase": "REBUILD_FAILED",
+                                "controlled_test_update": {
+                                    **dict(decision.get("controlled_test_update") or {}),
+                                    "active": False,
+                                    "status": "REBUILD_FAILED",
+                                    "rebuild_pending": True,
+                                    "last_error": str(exc)[:500],
+                                    "last_error_at": cycle_time.isoformat(),
+                                    "retry_after_minutes": retry_minutes,
+                                },
+                            }
+                        )
+                        monitor_interval = retry_minutes
+                        summary["errors"] += 1
+                        summary["held"] += 1
+                elif action == "ADJUST":
+                    adjustment = dict(decision.get("adjustment") or {})
+                    request_payload = {
+                        "campaign_id": campaign.campaign_id,
+                        "action": action,
+                        "adjustment": adjustment,
+                        "threshold_context": decision.get("threshold_context"),
+                    }
+                    try:
+                        response_payload = await _apply_campaign_adjustment(
+                            db,
+                            campaign=campaign,
+                            adjustment=adjustment,
+                            current_spend_cents=metrics.cost_cents,
+                        )
+                        _insert_event(
+                            db,
+                            strategy=strategy,
+                            campaign=campaign,
+                            metrics=metrics,
+                            action=action,
+                            reason=reason,
+                            result="SUCCESS",
+                            request_json=request_payload,
+                            response_json=response_payload,
+                        )
+                        summary["adjusted"] += 1
+                    except Exception as exc:  # noqa: BLE001
+                        _insert_event(
+                            db,
+                            strategy=strategy,
+                            campaign=campaign,
+                            metrics=metrics,
+                            action=action,
+                            reason=reason,
+                            result="FAILED",
+                            request_json=request_payload,
+                            error_message=str(exc),
+                        )
+                        raise
+                else:
                     summary["held"] += 1
-            elif action == "ADJUST":
-                adjustment = dict(decision.get("adjustment") or {})
-                request_payload = {
-                    "campaign_id": campaign.campaign_id,
-                    "action": action,
-                    "adjustment": adjustment,
-                    "threshold_context": decision.get("threshold_context"),
-                }
-                try:
-                    response_payload = await _apply_campaign_adjustment(
-                        db,
-                        campaign=campaign,
-                        adjustment=adjustment,
-                        current_spend_cents=metrics.cost_cents,
-                    )
-                    _insert_event(
-                        db,
-                        strategy=strategy,
-                        campaign=campaign,
-                        metrics=metrics,
-                        action=action,
-                        reason=reason,
-                        result="SUCCESS",
-                        request_json=request_payload,
-                        response_json=response_payload,
-                    )
-                    summary["adjusted"] += 1
-                except Exception as exc:  # noqa: BLE001
-                    _insert_event(
-                        db,
-                        strategy=strategy,
-                        campaign=campaign,
-                        metrics=metrics,
-                        action=action,
-                        reason=reason,
-                        result="FAILED",
-                        request_json=request_payload,
-                        error_message=str(exc),
-                    )
-                    raise
-            else:
-                summary["held"] += 1
-                if decision.get("hermes_review") or decision.get("force_sync"):
-                    _insert_event(
-                        db,
-                        strategy=strategy,
-                        campaign=campaign,
-                        metrics=metrics,
-                        action="HOLD",
-                        reason=reason,
-                        result="SKIPPED",
-                        request_json={
-                            "decision_phase": decision.get("decision_phase"),
-                            "proposed_action": decision.get("proposed_action"),
-                            "threshold_context": decision.get("threshold_context"),
-                        },
-                        response_json={
-                            "hermes_review": decision.get("hermes_review"),
-                            "forced_sync_task_id": decision.get("forced_sync_task_id"),
-                        },
-                    )
+                    if decision.get("hermes_review") or decision.get("force_sync"):
+                        _insert_event(
+                            db,
+                            strategy=strategy,
+                            campaign=campaign,
+                            metrics=metrics,
+                            action="HOLD",
+                            reason=reason,
+                            result="SKIPPED",
+                            request_json={
+                                "decision_phase": decision.get("decision_phase"),
+                                "proposed_action": decision.get("proposed_action"),
+                                "threshold_context": decision.get("threshold_context"),
+                            },
+                            response_json={
+                                "hermes_review": decision.get("hermes_review"),
+                                "forced_sync_task_id": decision.get("forced_sync_task_id"),
+                            },
+                        )
 
-            paused_until = decision.get("paused_until")
-            _insert_smart_decision_sample(
-                db,
-                campaign=campaign,
-                metrics=metrics,
-                decision=decision,
-                monitor_interval=monitor_interval,
-            )
-            _update_strategy_state(
-                strategy,
-                now=cycle_time,
-                decision={
-                    **decision,
-                    "monitor_interval_minutes": monitor_interval,
-                    "metrics": {
-                        "cost": metrics.cost_cents / 100,
-                        "gmv": metrics.gross_revenue_cents / 100,
-                        "orders": metrics.orders,
-                        "roi": float(metrics.roi) if metrics.roi is not None else None,
+                paused_until = decision.get("paused_until")
+                _insert_smart_decision_sample(
+                    db,
+                    campaign=campaign,
+                    metrics=metrics,
+                    decision=decision,
+                    monitor_interval=monitor_interval,
+                )
+                _update_strategy_state(
+                    strategy,
+                    now=cycle_time,
+                    decision={
+                        **decision,
+                        "monitor_interval_minutes": monitor_interval,
+                        "metrics": {
+                            "cost": metrics.cost_cents / 100,
+                            "gmv": metrics.gross_revenue_cents / 100,
+                            "orders": metrics.orders,
+                            "roi": float(metrics.roi) if metrics.roi is not None else None,
+                        },
                     },
-                },
-                paused_until=paused_until,
-                monitor_interval_minutes=monitor_interval,
-            )
-            _upsert_realtime_state(
-                db,
-                strategy=strategy,
-                campaign=campaign,
-                metrics=metrics,
-                now=cycle_time,
-                guard_status="active",
-                last_action=action,
-                reason=reason,
-                paused_until=paused_until,
-            )
-            _clear_legacy_runtime_config(strategy)
-            db.add(strategy)
-            db.commit()
-            summary["checked"] += 1
-        except (GmvMaxMutationBusy, GmvMaxMutationFenceLost) as exc:
-            db.rollback()
-            logger.warning(
-                "gmvmax smart guard mutation held for the next cycle",
-                extra={
-                    "strategy_id": strategy.id,
-                    "workspace_id": strategy.workspace_id,
-                    "auth_id": strategy.auth_id,
-                    "campaign_id": strategy.campaign_id,
-                    "reason": str(exc),
-                },
-            )
-            summary["held"] += 1
-            summary["checked"] += 1
-        except Exception:  # noqa: BLE001
-            db.rollback()
-            logger.exception(
-                "gmvmax realtime smart guard failed",
-                extra={
-                    "strategy_id": strategy.id,
-                    "workspace_id": strategy.workspace_id,
-                    "auth_id": strategy.auth_id,
-                    "campaign_id": strategy.campaign_id,
-                },
-            )
-            summary["errors"] += 1
+                    paused_until=paused_until,
+                    monitor_interval_minutes=monitor_interval,
+                )
+                _upsert_realtime_state(
+                    db,
+                    strategy=strategy,
+                    campaign=campaign,
+                    metrics=metrics,
+                    now=cycle_time,
+                    guard_status="active",
+                    last_action=action,
+                    reason=reason,
+                    paused_until=paused_until,
+                )
+                _clear_legacy_runtime_config(strategy)
+                db.add(strategy)
+                db.commit()
+                summary["checked"] += 1
+            except (GmvMaxMutationBusy, GmvMaxMutationFenceLost) as exc:
+                db.rollback()
+                logger.warning(
+                    "gmvmax smart guard mutation held for the next cycle",
+                    extra={
+                        "strategy_id": strategy.id,
+                        "workspace_id": strategy.workspace_id,
+                        "auth_id": strategy.auth_id,
+                        "campaign_id": strategy.campaign_id,
+                        "reason": str(exc),
+                    },
+                )
+                summary["held"] += 1
+                summary["checked"] += 1
+            except Exception:  # noqa: BLE001
+                db.rollback()
+                logger.exception(
+                    "gmvmax realtime smart guard failed",
+                    extra={
+                        "strategy_id": strategy.id,
+                        "workspace_id": strategy.workspace_id,
+                        "auth_id": strategy.auth_id,
+                        "campaign_id": strategy.campaign_id,
+                    },
+                )
+                summary["errors"] += 1
 
-    return summary
+        return summary
+    finally:
+        end_cycle(db)
 
 
 def run_smart_guard_cycle_sync(db: Session, *, now: datetime | None = None) -> dict[str, Any]:
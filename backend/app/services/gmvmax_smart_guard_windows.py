@@ -0,0 +1,772 @@
+"""Per-cycle columnar history windows for Smart Guard decisions.
+
+Every strategy in a Smart Guard cycle asks the same questions about its
+products: today's product totals, recent guard failures on the product and
+the last hour of creative momentum.  Campaigns that share a product used to
+re-run identical scans.  A cycle now loads each store scope's history once
+into NumPy columns and answers every product set with vectorized masks; the
+aggregates are memoized for the rest of the cycle.  Momentum prefers the
+Redis mirror of committed creative batches and reads the 10-minute join from
+MySQL only when the mirror disagrees with the batch manifests.
+
+The aggregates reproduce the per-campaign SQL exactly (integer cents, the
+same filters and the same baseline rules), so callers keep building their
+decision payloads from the same row shapes.  NumPy is imported by the
+frames themselves, so importing this module for the cycle hooks stays cheap.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from app.services.gmvmax_realtime_counters import creative_snapshot_rows
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_CYCLE_INFO_KEY = "gmv_smart_guard_cycle_windows"
+
+Scope = tuple[int, int, str, str]
+
+_FAILURE_REASON_MARKERS = (
+    "hard stop",
+    "no_order",
+    "0 orders",
+    "window roi",
+    "roi_below_target",
+    "daily spend cap",
+    "pacing cap",
+    "product risk cap",
+)
+_FAILURE_ACTIONS = ("PAUSE", "RESET_CAMPAIGN")
+_MOMENTUM_COUNTERS = ("cost_cents", "gross_revenue_cents", "orders", "impressions", "clicks")
+_NO_TIME = -(2**63)  # np.iinfo(np.int64).min
+
+
+def _scope_params(scope: Scope) -> dict[str, Any]:
+    workspace_id, auth_id, advertiser_id, store_id = scope
+    return {
+        "workspace_id": workspace_id,
+        "auth_id": auth_id,
+        "advertiser_id": advertiser_id,
+        "store_id": store_id,
+    }
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _time_key(value: Any) -> int:
+    """Order timestamps as integers; missing values sort before everything."""
+
+    if not isinstance(value, datetime):
+        return int(_NO_TIME)
+    value = value.replace(tzinfo=None)
+    return (value.toordinal() * 86_400 + value.hour * 3600 + value.minute * 60 + value.second) * 1_000_000 + (
+        value.microsecond
+    )
+
+
+def _naive_datetime(value: Any) -> datetime | None:
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+    if isinstance(value, str) and value:
+        try:
+            return _naive_datetime(datetime.fromisoformat(value))
+        except ValueError:
+            return None
+    return None
+
+
+def _codes(values: Sequence[str | None]) -> tuple[np.ndarray, list[str]]:
+    """Encode identifiers as dense integer codes; ``None`` becomes ``-1``."""
+
+    import numpy as np
+
+    labels: dict[str, int] = {}
+    codes = np.empty(len(values), dtype=np.int64)
+    for index, value in enumerate(values):
+        if value is None:
+            codes[index] = -1
+            continue
+        codes[index] = labels.setdefault(str(value), len(labels))
+    return codes, list(labels)
+
+
+def _lookup(labels: Sequence[str], wanted: Iterable[str]) -> np.ndarray:
+    import numpy as np
+
+    index = {label: code for code, label in enumerate(labels)}
+    return np.array(sorted({index[item] for item in wanted if item in index}), dtype=np.int64)
+
+
+def _max_time(keys: np.ndarray, values: Sequence[Any], mask: np.ndarray) -> Any:
+    import numpy as np
+
+    if not mask.any():
+        return None
+    masked = np.where(mask, keys, _NO_TIME)
+    position = int(np.argmax(masked))
+    if masked[position] == _NO_TIME:
+        return None
+    return values[position]
+
+
+# ---------------------------------------------------------------------------
+# Product day totals
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _ProductDayFrame:
+    campaign: np.ndarray
+    campaign_labels: list[str]
+    item_group: np.ndarray
+    item_group_labels: list[str]
+    counters: np.ndarray
+    updated_key: np.ndarray
+    updated_at: list[Any]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Mapping[str, Any]]) -> "_ProductDayFrame":
+        import numpy as np
+
+        campaign, campaign_labels = _codes([row.get("campaign_id") for row in rows])
+        item_group, item_group_labels = _codes([row.get("item_group_id") for row in rows])
+        counters = np.array(
+            [[_int(row.get("cost_cents")), _int(row.get("gross_revenue_cents")), _int(row.get("orders"))] for row in rows],
+            dtype=np.int64,
+        ).reshape(len(rows), 3)
+        updated_at = [row.get("updated_at") for row in rows]
+        return cls(
+            campaign=campaign,
+            campaign_labels=campaign_labels,
+            item_group=item_group,
+            item_group_labels=item_group_labels,
+            counters=counters,
+            updated_key=np.array([_time_key(value) for value in updated_at], dtype=np.int64),
+            updated_at=updated_at,
+        )
+
+    def aggregate(self, item_group_ids: Iterable[str]) -> dict[str, Any]:
+        import numpy as np
+
+        mask = np.isin(self.item_group, _lookup(self.item_group_labels, item_group_ids))
+        totals = self.counters[mask].sum(axis=0) if mask.any() else np.zeros(3, dtype=np.int64)
+        matched_campaigns = self.campaign[mask]
+        per_campaign = np.zeros((len(self.campaign_labels), 3), dtype=np.int64)
+        named = matched_campaigns >= 0
+        if named.any():
+            np.add.at(per_campaign, matched_campaigns[named], self.counters[mask][named])
+        return {
+            "totals": totals,
+            "per_campaign": per_campaign,
+            "campaign_count": int(np.unique(matched_campaigns[named]).size),
+            "source_updated_at": _max_time(self.updated_key, self.updated_at, mask),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Recent product failures
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _FailureFrame:
+    campaign: np.ndarray
+    campaign_labels: list[str]
+    is_reset: np.ndarray
+    is_hard_stop: np.ndarray
+    is_no_order: np.ndarray
+    counters: np.ndarray
+    created_key: np.ndarray
+    created_at: list[Any]
+    item_groups_by_campaign: dict[str, set[str]]
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Mapping[str, Any]],
+        mappings: Sequence[Mapping[str, Any]],
+    ) -> "_FailureFrame":
+        # MySQL's default collation makes the SQL ``like`` markers
+        # case-insensitive; mirror that here.
+        import numpy as np
+
+        rows = [
+            row
+            for row in rows
+            if str(row.get("action") or "") in _FAILURE_ACTIONS
+            and any(marker in str(row.get("reason") or "").lower() for marker in _FAILURE_REASON_MARKERS)
+        ]
+        reasons = [str(row.get("reason") or "").lower() for row in rows]
+        campaign, campaign_labels = _codes([row.get("campaign_id") for row in rows])
+        item_groups_by_campaign: dict[str, set[str]] = {}
+        for mapping in mappings:
+            if mapping.get("campaign_id") is None or mapping.get("item_group_id") is None:
+                continue
+            item_groups_by_campaign.setdefault(str(mapping["campaign_id"]), set()).add(str(mapping["item_group_id"]))
+        created_at = [row.get("created_at") for row in rows]
+        return cls(
+            campaign=campaign,
+            campaign_labels=campaign_labels,
+            is_reset=np.array([row.get("action") == "RESET_CAMPAIGN" for row in rows], dtype=bool),
+            is_hard_stop=np.array(["hard stop" in reason for reason in reasons], dtype=bool),
+            is_no_order=np.array(["0 orders" in reason or "no_order" in reason for reason in reasons], dtype=bool),
+            counters=np.array(
+                [
+                    [_int(row.get("cost_cents")), _int(row.get("gross_revenue_cents")), _int(row.get("orders"))]
+                    for row in rows
+                ],
+                dtype=np.int64,
+            ).reshape(len(rows), 3),
+            created_key=np.array([_time_key(value) for value in created_at], dtype=np.int64),
+            created_at=created_at,
+            item_groups_by_campaign=item_groups_by_campaign,
+        )
+
+    def aggregate(self, item_group_ids: Iterable[str]) -> dict[str, Any]:
+        import numpy as np
+
+        wanted = {str(item) for item in item_group_ids}
+        campaigns = [
+            campaign_id
+            for campaign_id, item_groups in self.item_groups_by_campaign.items()
+            if item_groups & wanted
+        ]
+        mask = np.isin(self.campaign, _lookup(self.campaign_labels, campaigns))
+        totals = self.counters[mask].sum(axis=0) if mask.any() else np.zeros(3, dtype=np.int64)
+        return {
+            "failure_count": int(mask.sum()),
+            "campaign_count": int(np.unique(self.campaign[mask]).size),
+            "reset_count": int((mask & self.is_reset).sum()),
+            "hard_stop_count": int((mask & self.is_hard_stop).sum()),
+            "no_order_count": int((mask & self.is_no_order).sum()),
+            "observed_cost_cents": int(totals[0]),
+            "observed_gmv_cents": int(totals[1]),
+            "observed_orders": int(totals[2]),
+            "last_failure_at": _max_time(self.created_key, self.created_at, mask),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Creative momentum
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _MomentumFrame:
+    campaign: np.ndarray
+    campaign_labels: list[str]
+    item_group: np.ndarray
+    item_group_labels: list[str]
+    series: np.ndarray
+    snapshot_key: np.ndarray
+    latest_complete_key: np.ndarray
+    snapshot_at: list[Any]
+    counters: np.ndarray
+    campaigns_by_item_group: dict[str, set[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Mapping[str, Any]],
+        campaign_pairs: Sequence[Mapping[str, Any]] = (),
+    ) -> "_MomentumFrame":
+        import numpy as np
+
+        ordered = sorted(
+            rows,
+            key=lambda row: (
+                str(row.get("campaign_id")),
+                str(row.get("item_group_id") or ""),
+                str(row.get("creative_id")),
+                _time_key(row.get("snapshot_at")),
+            ),
+        )
+        campaign, campaign_labels = _codes([str(row.get("campaign_id")) for row in ordered])
+        item_group, item_group_labels = _codes([str(row.get("item_group_id") or "") for row in ordered])
+        series_ids, _ = _codes(
+            [
+                "\x1f".join((str(row.get("campaign_id")), str(row.get("item_group_id") or ""), str(row.get("creative_id"))))
+                for row in ordered
+            ]
+        )
+        campaigns_by_item_group: dict[str, set[str]] = {}
+        for pair in campaign_pairs:
+            if pair.get("campaign_id") and pair.get("item_group_id") is not None:
+                campaigns_by_item_group.setdefault(str(pair["item_group_id"]), set()).add(str(pair["campaign_id"]))
+        return cls(
+            campaign=campaign,
+            campaign_labels=campaign_labels,
+            item_group=item_group,
+            item_group_labels=item_group_labels,
+            series=series_ids,
+            snapshot_key=np.array([_time_key(row.get("snapshot_at")) for row in ordered], dtype=np.int64),
+            latest_complete_key=np.array(
+                [_time_key(row.get("latest_complete_snapshot_at")) for row in ordered],
+                dtype=np.int64,
+            ),
+            snapshot_at=[row.get("snapshot_at") for row in ordered],
+            counters=np.array(
+                [[_int(row.get(key)) for key in _MOMENTUM_COUNTERS] for row in ordered],
+                dtype=np.int64,
+            ).reshape(len(ordered), len(_MOMENTUM_COUNTERS)),
+            campaigns_by_item_group=campaigns_by_item_group,
+        )
+
+    def campaign_ids(self, item_group_ids: Iterable[str]) -> list[str]:
+        campaigns: set[str] = set()
+        for item_group_id in item_group_ids:
+            campaigns |= self.campaigns_by_item_group.get(str(item_group_id), set())
+        return sorted(campaigns)
+
+    def aggregate(
+        self,
+        *,
+        campaign_ids: Iterable[str],
+        item_group_ids: Iterable[str],
+        cutoff: datetime,
+    ) -> dict[str, Any]:
+        import numpy as np
+
+        mask = np.isin(self.campaign, _lookup(self.campaign_labels, campaign_ids)) & np.isin(
+            self.item_group,
+            _lookup(self.item_group_labels, item_group_ids),
+        )
+        indices = np.flatnonzero(mask)
+        per_campaign = np.zeros((len(self.campaign_labels), len(_MOMENTUM_COUNTERS)), dtype=np.int64)
+        empty = {
+            "totals": np.zeros(len(_MOMENTUM_COUNTERS), dtype=np.int64),
+            "per_campaign": per_campaign,
+            "latest_snapshot_at": None,
+            "reliable_group_count": 0,
+        }
+        if indices.size == 0:
+            return empty
+        series = self.series[indices]
+        # Rows are sorted by series then time, so each series is one run.
+        starts = np.flatnonzero(np.r_[True, series[1:] != series[:-1]])
+        ends = np.r_[starts[1:], series.size] - 1
+        snapshot_key = self.snapshot_key[indices]
+        # Snapshots at or before the cutoff form a prefix of each run; the
+        # baseline is its last row, or the first observation without one.
+        at_or_before = (snapshot_key <= _time_key(cutoff)).astype(np.int64)
+        prefix = np.add.reduceat(at_or_before, starts)
+        baseline = np.where(prefix > 0, starts + prefix - 1, starts)
+        current = snapshot_key[ends] == self.latest_complete_key[indices][ends]
+        if not current.any():
+            return empty
+        latest_rows = indices[ends][current]
+        baseline_rows = indices[baseline][current]
+        latest_values = self.counters[latest_rows]
+        delta = latest_values - self.counters[baseline_rows]
+        delta = np.where(delta < 0, latest_values, delta)
+        np.add.at(per_campaign, self.campaign[latest_rows], delta)
+        newest = int(np.argmax(self.snapshot_key[latest_rows]))
+        return {
+            "totals": delta.sum(axis=0),
+            "per_campaign": per_campaign,
+            "latest_snapshot_at": self.snapshot_at[int(latest_rows[newest])],
+            "reliable_group_count": int((ends[current] != baseline[current]).sum()),
+        }
+
+
+def mirrored_momentum_rows(
+    db: Session,
+    *,
+    scope: Scope,
+    campaign_ids: Sequence[str],
+    item_group_ids: Iterable[str] | None,
+    since: datetime,
+    now: datetime,
+) -> list[Mapping[str, Any]] | None:
+    """Read 10-minute momentum rows from the Redis mirror.
+
+    The manifest watermark (latest snapshot and snapshot count per campaign)
+    is a narrow index read.  Campaigns without complete batches in the window
+    need no mirrored series; any other disagreement means a batch was written
+    or removed outside the mirror and ``None`` sends the caller to the SQL
+    join.
+    """
+
+    workspace_id, auth_id, advertiser_id, store_id = scope
+    mirrored = creative_snapshot_rows(
+        workspace_id=int(workspace_id),
+        auth_id=int(auth_id),
+        advertiser_id=str(advertiser_id),
+        store_id=str(store_id),
+        campaign_ids=campaign_ids,
+        item_group_ids=item_group_ids,
+        since=since,
+        now=now,
+        covered_only=True,
+    )
+    if not mirrored:
+        return None
+    watermark_rows = db.execute(
+        text(
+            """
+            select campaign_id,
+                   max(snapshot_at) as latest_snapshot_at,
+                   count(distinct snapshot_at) as snapshot_count
+            from gmv_creative_10min_batch_manifests
+            where workspace_id=:workspace_id
+              and auth_id=:auth_id
+              and advertiser_id=:advertiser_id
+              and store_id=:store_id
+              and campaign_id in :campaign_ids
+              and complete=1
+              and snapshot_at >= :since
+              and snapshot_at <= :now
+            group by campaign_id
+            """
+        ).bindparams(bindparam("campaign_ids", expanding=True)),
+        {**_scope_params(scope), "campaign_ids": list(campaign_ids), "since": since, "now": now},
+    ).mappings().all()
+    watermarks = {
+        str(row.get("campaign_id")): (_naive_datetime(row.get("latest_snapshot_at")), _int(row.get("snapshot_count")))
+        for row in watermark_rows
+    }
+    rows: list[Mapping[str, Any]] = []
+    for campaign_id in sorted(set(watermarks) | set(mirrored)):
+        entry = mirrored.get(campaign_id)
+        if entry is None:
+            return None
+        if (entry.get("latest"), entry.get("snapshots", 0)) != watermarks.get(campaign_id, (None, 0)):
+            return None
+        rows.extend(entry.get("rows") or [])
+    return rows
+
+
+def momentum_totals(
+    rows: Sequence[Mapping[str, Any]],
+    *,
+    item_group_ids: Iterable[str],
+    cutoff: datetime,
+    active_campaign_id: str,
+) -> dict[str, Any]:
+    """Vectorized momentum deltas for rows shaped like the 10-minute SQL."""
+
+    item_group_ids = [str(item) for item in item_group_ids]
+    frame = _MomentumFrame.from_rows(rows)
+    aggregate = frame.aggregate(
+        campaign_ids=frame.campaign_labels,
+        item_group_ids=item_group_ids,
+        cutoff=cutoff,
+    )
+    return _momentum_result(frame, aggregate, active_campaign_id)
+
+
+def _momentum_result(frame: _MomentumFrame, aggregate: Mapping[str, Any], active_campaign_id: str) -> dict[str, Any]:
+    totals = dict(zip(_MOMENTUM_COUNTERS, (int(value) for value in aggregate["totals"])))
+    active = {key: 0 for key in ("cost_cents", "gross_revenue_cents", "orders")}
+    if str(active_campaign_id) in frame.campaign_labels:
+        row = aggregate["per_campaign"][frame.campaign_labels.index(str(active_campaign_id))]
+        active = {key: int(row[_MOMENTUM_COUNTERS.index(key)]) for key in active}
+    return {
+        "totals": totals,
+        "active_campaign_totals": active,
+        "latest_snapshot_at": aggregate["latest_snapshot_at"],
+        "reliable_group_count": aggregate["reliable_group_count"],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Cycle store
+# ---------------------------------------------------------------------------
+
+
+class SmartGuardCycleWindows:
+    """Load-once, answer-many window statistics for one Smart Guard cycle."""
+
+    def __init__(self) -> None:
+        self._product_day: dict[tuple[Scope, date], _ProductDayFrame] = {}
+        self._failures: dict[tuple[Scope, datetime], _FailureFrame] = {}
+        self._momentum: dict[tuple[Scope, datetime, datetime], _MomentumFrame] = {}
+        self._results: dict[tuple[Any, ...], dict[str, Any]] = {}
+
+    # -- product day -------------------------------------------------------
+
+    def product_day_row(
+        self,
+        db: Session,
+        *,
+        scope: Scope,
+        stat_day: date,
+        item_group_ids: Sequence[str],
+        campaign_id: str,
+    ) -> dict[str, Any]:
+        """Return the row ``_product_day_stats`` would read from SQL."""
+
+        import numpy as np
+
+        frame_key = (scope, stat_day)
+        frame = self._product_day.get(frame_key)
+        if frame is None:
+            rows = db.execute(
+                text(
+                    """
+                    select campaign_id, item_group_id,
+                           coalesce(sum(coalesce(cost_cents, 0)), 0) as cost_cents,
+                           coalesce(sum(coalesce(gross_revenue_cents, 0)), 0) as gross_revenue_cents,
+                           coalesce(sum(coalesce(orders, 0)), 0) as orders,
+                           max(updated_at) as updated_at
+                    from gmvmax_product_creative_metrics_daily
+                    where workspace_id=:workspace_id
+                      and auth_id=:auth_id
+                      and advertiser_id=:advertiser_id
+                      and store_id=:store_id
+                      and stat_time_day=:stat_time_day
+                      and item_group_id is not null
+                    group by campaign_id, item_group_id
+                    """
+                ),
+                {**_scope_params(scope), "stat_time_day": stat_day},
+            ).mappings().all()
+            frame = self._product_day[frame_key] = _ProductDayFrame.from_rows(rows)
+        result_key = ("product_day", frame_key, frozenset(str(item) for item in item_group_ids))
+        aggregate = self._results.get(result_key)
+        if aggregate is None:
+            aggregate = self._results[result_key] = frame.aggregate(result_key[2])
+        current = np.zeros(3, dtype=np.int64)
+        if str(campaign_id) in frame.campaign_labels:
+            current = aggregate["per_campaign"][frame.campaign_labels.index(str(campaign_id))]
+        totals = aggregate["totals"]
+        return {
+            "total_cost_cents": int(totals[0]),
+            "total_gmv_cents": int(totals[1]),
+            "total_orders": int(totals[2]),
+            "campaign_count": aggregate["campaign_count"],
+            "current_cost_cents": int(current[0]),
+            "current_gmv_cents": int(current[1]),
+            "current_orders": int(current[2]),
+            "source_updated_at": aggregate["source_updated_at"],
+        }
+
+    # -- failures ----------------------------------------------------------
+
+    def failure_row(
+        self,
+        db: Session,
+        *,
+        scope: Scope,
+        cutoff: datetime,
+        item_group_ids: Sequence[str],
+    ) -> dict[str, Any]:
+        """Return the row ``_recent_product_failure_stats`` would read from SQL."""
+
+        frame_key = (scope, cutoff)
+        frame = self._failures.get(frame_key)
+        if frame is None:
+            params = _scope_params(scope)
+            events = db.execute(
+                text(
+                    """
+                    select campaign_id, action, reason, cost_cents, gross_revenue_cents,
+                           orders, created_at
+                    from gmv_campaign_guard_events
+                    where workspace_id=:workspace_id
+                      and auth_id=:auth_id
+                      and advertiser_id=:advertiser_id
+                      and store_id=:store_id
+                      and result='SUCCESS'
+                      and action in ('PAUSE', 'RESET_CAMPAIGN')
+                      and created_at >= :cutoff
+                    """
+                ),
+                {**params, "cutoff": cutoff},
+            ).mappings().all()
+            mappings: Sequence[Mapping[str, Any]] = []
+            if events:
+                # Product membership is matched across stores, as in the
+                # per-campaign query.
+                mappings = db.execute(
+                    text(
+                        """
+                        select distinct campaign_id, item_group_id
+                        from gmvmax_product_campaign_item_groups
+                        where workspace_id=:workspace_id
+                          and auth_id=:auth_id
+                          and advertiser_id=:advertiser_id
+                        """
+                    ),
+                    params,
+                ).mappings().all()
+            frame = self._failures[frame_key] = _FailureFrame.from_rows(events, mappings)
+        result_key = ("failures", frame_key, frozenset(str(item) for item in item_group_ids))
+        aggregate = self._results.get(result_key)
+        if aggregate is None:
+            aggregate = self._results[result_key] = frame.aggregate(result_key[2])
+        return dict(aggregate)
+
+    def invalidate_failures(self, scope: Scope) -> None:
+        """Forget failure windows after this cycle records a new mutation."""
+
+        for key in [key for key in self._failures if key[0] == scope]:
+            del self._failures[key]
+        for key in [key for key in self._results if key[0] == "failures" and key[1][0] == scope]:
+            del self._results[key]
+
+    # -- momentum ----------------------------------------------------------
+
+    @staticmethod
+    def _momentum_sql_rows(
+        db: Session,
+        *,
+        params: Mapping[str, Any],
+        since: datetime,
+        now: datetime,
+    ) -> Sequence[Mapping[str, Any]]:
+        return db.execute(
+            text(
+                """
+                select m.campaign_id, m.item_group_id, m.creative_id, m.snapshot_at,
+                       latest.snapshot_at as latest_complete_snapshot_at,
+                       coalesce(m.cost_cents, 0) as cost_cents,
+                       coalesce(m.gross_revenue_cents, 0) as gross_revenue_cents,
+                       coalesce(m.orders, 0) as orders,
+                       coalesce(m.impressions, 0) as impressions,
+                       coalesce(m.clicks, 0) as clicks
+                from gmv_creative_metrics_10min m
+                join gmv_creative_10min_batch_manifests b
+                  on b.workspace_id=m.workspace_id
+                 and b.auth_id=m.auth_id
+                 and b.advertiser_id=m.advertiser_id
+                 and b.store_id=m.store_id
+                 and b.campaign_id=m.campaign_id
+                 and b.stat_time_day=m.stat_time_day
+                 and b.snapshot_at=m.snapshot_at
+                 and b.complete=1
+                join (
+                    select workspace_id, auth_id, advertiser_id, store_id,
+                           campaign_id, stat_time_day,
+                           max(snapshot_at) as snapshot_at
+                    from gmv_creative_10min_batch_manifests
+                    where workspace_id=:workspace_id
+                      and auth_id=:auth_id
+                      and advertiser_id=:advertiser_id
+                      and store_id=:store_id
+                      and complete=1
+                      and snapshot_at <= :now
+                    group by workspace_id, auth_id, advertiser_id, store_id,
+                             campaign_id, stat_time_day
+                ) latest
+                  on latest.workspace_id=m.workspace_id
+                 and latest.auth_id=m.auth_id
+                 and latest.advertiser_id=m.advertiser_id
+                 and latest.store_id=m.store_id
+                 and latest.campaign_id=m.campaign_id
+                 and latest.stat_time_day=m.stat_time_day
+                where m.workspace_id=:workspace_id
+                  and m.auth_id=:auth_id
+                  and m.advertiser_id=:advertiser_id
+                  and m.store_id=:store_id
+                  and m.snapshot_at >= :since
+                  and m.snapshot_at <= :now
+                """
+            ),
+            {**params, "since": since, "now": now},
+        ).mappings().all()
+
+    def momentum(
+        self,
+        db: Session,
+        *,
+        scope: Scope,
+        item_group_ids: Sequence[str],
+        since: datetime,
+        cutoff: datetime,
+        now: datetime,
+        active_campaign_id: str,
+    ) -> dict[str, Any]:
+        """Return product momentum deltas plus the matching campaign IDs."""
+
+        frame_key = (scope, since, now)
+        frame = self._momentum.get(frame_key)
+        if frame is None:
+            params = _scope_params(scope)
+            pairs = db.execute(
+                text(
+                    """
+                    select distinct campaign_id, item_group_id
+                    from gmvmax_product_campaign_item_groups
+                    where workspace_id=:workspace_id
+                      and auth_id=:auth_id
+                      and advertiser_id=:advertiser_id
+                      and store_id=:store_id
+                    union
+                    select distinct campaign_id, item_group_id
+                    from gmvmax_product_creative_metrics_daily
+                    where workspace_id=:workspace_id
+                      and auth_id=:auth_id
+                      and advertiser_id=:advertiser_id
+                      and store_id=:store_id
+                    """
+                ),
+                params,
+            ).mappings().all()
+            rows = mirrored_momentum_rows(
+                db,
+                scope=scope,
+                campaign_ids=sorted({str(pair["campaign_id"]) for pair in pairs if pair.get("campaign_id")}),
+                item_group_ids=None,
+                since=since,
+                now=now,
+            )
+            if rows is None:
+                rows = self._momentum_sql_rows(db, params=params, since=since, now=now)
+            frame = self._momentum[frame_key] = _MomentumFrame.from_rows(rows, pairs)
+        item_group_ids = [str(item) for item in item_group_ids]
+        campaign_ids = frame.campaign_ids(item_group_ids)
+        result_key = ("momentum", frame_key, cutoff, frozenset(item_group_ids))
+        aggregate = self._results.get(result_key)
+        if aggregate is None:
+            aggregate = self._results[result_key] = frame.aggregate(
+                campaign_ids=campaign_ids,
+                item_group_ids=item_group_ids,
+                cutoff=cutoff,
+            )
+        return {"campaign_ids": campaign_ids, **_momentum_result(frame, aggregate, active_campaign_id)}
+
+
+def begin_cycle(db: Any) -> SmartGuardCycleWindows | None:
+    info = getattr(db, "info", None)
+    if not isinstance(info, dict):
+        return None
+    windows = info[_CYCLE_INFO_KEY] = SmartGuardCycleWindows()
+    return windows
+
+
+def end_cycle(db: Any) -> None:
+    info = getattr(db, "info", None)
+    if isinstance(info, dict):
+        info.pop(_CYCLE_INFO_KEY, None)
+
+
+def cycle_windows(db: Any) -> SmartGuardCycleWindows | None:
+    info = getattr(db, "info", None)
+    if not isinstance(info, dict):
+        return None
+    windows = info.get(_CYCLE_INFO_KEY)
+    return windows if isinstance(windows, SmartGuardCycleWindows) else None
+
+
+__all__ = [
+    "SmartGuardCycleWindows",
+    "begin_cycle",
+    "cycle_windows",
+    "end_cycle",
+    "mirrored_momentum_rows",
+    "momentum_totals",
+]
@@ -17,6 +17,7 @@ from PIL import Image, ImageOps, UnidentifiedImageError
 from app.services.ai_routing.router import AiGatewayError, call_chat_with_failover
 from app.services.hermes_agent.client import extract_output_text
 from app.services.hermes_agent.storyboard_split import expected_row_columns
+from app.services.hermes_agent.vision_review_batch import route_slot
 from sqlalchemy.orm import Session
 
 from app.services.ai_video.accounts import (
@@ -836,23 +837,24 @@ def _routed_multimodal_completion(
         and value is not None
     }
     try:
-        result = asyncio.run(
-            call_chat_with_failover(
-                db,
-                logical_model_id=resolved_model,
-                messages=messages,
-                capability=resolved_capability,
-                workload=resolved_workload,
-                request_id=str(request_id)[:96],
-                payload_overrides=overrides,
-                metadata={
-                    "source": str(source or "content_multimodal")[:64],
-                    "workload": resolved_workload,
-                },
-                timeout_seconds=150,
-                max_routes=4,
+        with route_slot(resolved_model):
+            result = asyncio.run(
+                call_chat_with_failover(
+                    db,
+                    logical_model_id=resolved_model,
+                    messages=messages,
+                    capability=resolved_capability,
+                    workload=resolved_workload,
+                    request_id=str(request_id)[:96],
+                    payload_overrides=overrides,
+                    metadata={
+                        "source": str(source or "content_multimodal")[:64],
+                        "workload": resolved_workload,
+                    },
+                    timeout_seconds=150,
+                    max_routes=4,
+                )
             )
-        )
     except AiGatewayError as exc:
         # Route health retains bounded metadata. Do not copy provider bodies,
         # balances or request identifiers into project/stage error text.
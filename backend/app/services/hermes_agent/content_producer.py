@@ -38,6 +38,7 @@ from app.services.hermes_agent.client import (
     extract_output_text,
 )
 from app.services.ai_video.accounts import video_model_routing_catalog
+from app.services.media_probe_index import MediaProbeError, probe_media
 from app.features.tenants.openai_whisper.url_security import (
     UnsafeShareURLError,
     validate_share_url,
@@ -1105,22 +1106,10 @@ def _extract_document_text(source: Path, extension: str) -> dict[str, Any]:
 
 
 def _probe_reference_video(source: Path) -> dict[str, Any]:
-    command = [
-        "/opt/apps/bin/ffprobe",
-        "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=width,height:format=duration",
-        "-of", "json",
-        str(source),
-    ]
     try:
-        completed = subprocess.run(command, check=True, capture_output=True, text=True, timeout=30)
-        payload = json.loads(completed.stdout or "{}")
-        stream = list(payload.get("streams") or [{}])[0]
-        duration = float(dict(payload.get("format") or {}).get("duration") or 0)
-        width = int(stream.get("width") or 0)
-        height = int(stream.get("height") or 0)
-    except (subprocess.SubprocessError, ValueError, TypeError, json.JSONDecodeError) as exc:
+        probe = probe_media(source)
+        duration, width, height = probe.duration_seconds, probe.width, probe.height
+    except MediaProbeError as exc:
         raise APIError(
             "CONTENT_PRODUCER_REFERENCE_VIDEO_INVALID",
             "Reference video must be a readable MP4, MOV, or WebM file.",
@@ -2,22 +2,38 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
 from pathlib import Path
 import math
 import subprocess
-from typing import Any
+import threading
+from typing import TYPE_CHECKING, Any
 
+from app.services.media_frames import SHOWINFO_PTS_RE, select_expression
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy is imported inside the frame helpers, like the storyboard splitter:
+# the content factory imports this module for every render task while only
+# the source-diff gates need the array stack.
 
 FFMPEG_BIN = "/opt/apps/bin/ffmpeg"
 
+_FRAME_SIDE = 64
+_FRAME_BYTES = _FRAME_SIDE * _FRAME_SIDE
+_AUDIO_CHUNK_BYTES = 1 << 20
+
 
-def _decoded_audio_sha256(path: Path) -> str:
-    result = subprocess.run(
+def _decoded_audio_sha256(path: Path, *, timeout: float = 300.0) -> str:
+    """Hash the decoded mono 16 kHz PCM track while ffmpeg streams it."""
+    process = subprocess.Popen(
         [
             FFMPEG_BIN,
             "-v",
             "error",
+            "-nostdin",
             "-i",
             str(path),
             "-map",
@@ -30,45 +46,141 @@ def _decoded_audio_sha256(path: Path) -> str:
             "s16le",
             "-",
         ],
-        check=False,
-        capture_output=True,
-        timeout=300,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
     )
-    if result.returncode != 0 or not result.stdout:
+    watchdog = threading.Timer(timeout, process.kill)
+    watchdog.start()
+    digest = hashlib.sha256()
+    decoded = 0
+    try:
+        assert process.stdout is not None
+        while chunk := process.stdout.read(_AUDIO_CHUNK_BYTES):
+            digest.update(chunk)
+            decoded += len(chunk)
+        returncode = process.wait()
+    finally:
+        watchdog.cancel()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+    if returncode != 0 or not decoded:
         return ""
-    return hashlib.sha256(result.stdout).hexdigest()
+    return digest.hexdigest()
 
 
-def _gray_frame(path: Path, seconds: float) -> bytes:
-    result = subprocess.run(
-        [
-            FFMPEG_BIN,
-            "-v",
-            "error",
-            "-ss",
-            f"{max(0.0, seconds):.3f}",
-            "-i",
-            str(path),
-            "-frames:v",
-            "1",
-            "-vf",
-            "scale=64:64:force_original_aspect_ratio=decrease,"
-            "pad=64:64:(ow-iw)/2:(oh-ih)/2,format=gray",
-            "-f",
-            "rawvideo",
-            "-",
-        ],
-        check=False,
-        capture_output=True,
-        timeout=60,
-    )
-    return result.stdout if result.returncode == 0 else b""
+def _sample_gray_frames(
+    path: Path,
+    times: list[float],
+    *,
+    timeout: float = 300.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Decode ``path`` once and return 64x64 luminance frames for ``times``.
 
+    The frames come back as a ``(len(times), 4096)`` uint8 array plus a mask
+    of the samples that resolved to a decoded frame; samples past the end of
+    the stream or of a failed decode stay masked out.
+    """
+    import numpy as np
+
+    frames = np.zeros((len(times), _FRAME_BYTES), dtype=np.uint8)
+    found = np.zeros(len(times), dtype=bool)
+    if not times:
+        return frames, found
+    try:
+        completed = subprocess.run(
+            [
+                FFMPEG_BIN,
+                "-hide_banner",
+                "-nostats",
+                "-nostdin",
+                "-v",
+                "info",
+                "-i",
+                str(path),
+                "-map",
+                "0:v:0",
+                "-vf",
+                f"select='{select_expression(times)}',showinfo,"
+                f"scale={_FRAME_SIDE}:{_FRAME_SIDE}:force_original_aspect_ratio=decrease,"
+                f"pad={_FRAME_SIDE}:{_FRAME_SIDE}:(ow-iw)/2:(oh-ih)/2,format=gray",
+                "-fps_mode",
+                "passthrough",
+                "-f",
+                "rawvideo",
+                "-",
+            ],
+            check=False,
+            capture_output=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return frames, found
+    if completed.returncode != 0:
+        return frames, found
+    decoded = np.frombuffer(completed.stdout, dtype=np.uint8)
+    count = decoded.size // _FRAME_BYTES
+    pts = [
+        float(match.group(1))
+        for match in SHOWINFO_PTS_RE.finditer(
+            completed.stderr.decode("utf-8", "replace")
+        )
+    ][:count]
+    if not pts:
+        return frames, found
+    decoded = decoded[: len(pts) * _FRAME_BYTES].reshape(len(pts), _FRAME_BYTES)
+    # Selected frames are in presentation order, so each sample maps to the
+    # first selected frame at or after it.
+    index = np.searchsorted(np.asarray(pts), np.asarray(times) - 1e-3, side="left")
+    found = index < len(pts)
+    frames[found] = decoded[index[found]]
+    return frames, found
 
-def _frame_mae(left: bytes, right: bytes) -> float:
-    if not left or len(left) != len(right):
-        return 255.0
-    return sum(abs(a - b) for a, b in zip(left, right)) / len(left)
+
+def _frame_maes(
+    left: tuple[np.ndarray, np.ndarray],
+    right: tuple[np.ndarray, np.ndarray],
+) -> list[float]:
+    """Per-sample luminance MAE; unmatched samples score the maximum 255."""
+    import numpy as np
+
+    left_frames, left_found = left
+    right_frames, right_found = right
+    mae = np.abs(
+        left_frames.astype(np.int16) - right_frames.astype(np.int16)
+    ).mean(axis=1)
+    return np.where(left_found & right_found, mae, 255.0).tolist()
+
+
+def _sample_source_and_result(
+    source: Path,
+    result: Path,
+    *,
+    source_times: list[float],
+    result_times: list[float],
+) -> tuple[str, str, list[float]]:
+    """Hash both audio tracks and sample both videos in parallel.
+
+    Each file gets one audio and one video decode pass; the four ffmpeg
+    processes run side by side instead of one seek-and-decode per sample.
+    """
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        source_audio = pool.submit(_decoded_audio_sha256, source)
+        result_audio = pool.submit(_decoded_audio_sha256, result)
+        source_frames = pool.submit(_sample_gray_frames, source, source_times)
+        result_frames = pool.submit(_sample_gray_frames, result, result_times)
+        return (
+            source_audio.result(),
+            result_audio.result(),
+            _frame_maes(source_frames.result(), result_frames.result()),
+        )
+
+
+def _fraction_seconds(duration_seconds: float, fraction: float) -> float:
+    return round(
+        max(0.0, min(duration_seconds - 0.05, duration_seconds * fraction)),
+        3,
+    )
 
 
 def _inside_window(value: float, windows: list[tuple[float, float]]) -> bool:
@@ -107,11 +219,6 @@ def audit_bounded_source_edit(
         failures.append(
             f"protected duration changed by {duration_delta:.3f} seconds"
         )
-    source_audio = _decoded_audio_sha256(source)
-    result_audio = _decoded_audio_sha256(result)
-    if not source_audio or not result_audio or source_audio != result_audio:
-        failures.append("protected decoded audio differs from the source")
-
     usable_duration = min(source_duration_seconds, result_duration_seconds)
     sample_times: list[float] = []
     cursor = 0.5
@@ -120,13 +227,18 @@ def audit_bounded_source_edit(
         if not _inside_window(cursor, windows):
             sample_times.append(round(cursor, 3))
         cursor += step
-    samples: list[dict[str, float]] = []
-    for sample_time in sample_times:
-        mae = _frame_mae(
-            _gray_frame(source, sample_time),
-            _gray_frame(result, sample_time),
-        )
-        samples.append({"seconds": sample_time, "mae": round(mae, 3)})
+    source_audio, result_audio, maes = _sample_source_and_result(
+        source,
+        result,
+        source_times=sample_times,
+        result_times=sample_times,
+    )
+    if not source_audio or not result_audio or source_audio != result_audio:
+        failures.append("protected decoded audio differs from the source")
+    samples = [
+        {"seconds": sample_time, "mae": round(mae, 3)}
+        for sample_time, mae in zip(sample_times, maes)
+    ]
     # 64x64 luminance MAE stays below 0.3 for an ordinary H.264 re-encode in
     # our regression corpus.  1.0 still leaves ample codec headroom while
     # catching a changed inset, caption block, actor, or shot outside the
@@ -175,9 +287,23 @@ def audit_regenerated_source_originality(
             "source_media_reuse": reuse,
         }
 
+    fractions = [0.05 + index * 0.10 for index in range(10)]
+    source_times = [
+        _fraction_seconds(source_duration_seconds, fraction)
+        for fraction in fractions
+    ]
+    result_times = [
+        _fraction_seconds(result_duration_seconds, fraction)
+        for fraction in fractions
+    ]
+    source_audio, result_audio, maes = _sample_source_and_result(
+        source,
+        result,
+        source_times=source_times,
+        result_times=result_times,
+    )
+
     failures: list[str] = []
-    source_audio = _decoded_audio_sha256(source)
-    result_audio = _decoded_audio_sha256(result)
     decoded_audio_identical = bool(
         source_audio and source_audio == result_audio
     )
@@ -186,29 +312,17 @@ def audit_regenerated_source_originality(
             "source audio was reused although source_media_reuse is forbidden"
         )
 
-    fractions = [0.05 + index * 0.10 for index in range(10)]
-    samples: list[dict[str, float]] = []
-    for fraction in fractions:
-        source_time = max(
-            0.0,
-            min(source_duration_seconds - 0.05, source_duration_seconds * fraction),
-        )
-        result_time = max(
-            0.0,
-            min(result_duration_seconds - 0.05, result_duration_seconds * fraction),
-        )
-        mae = _frame_mae(
-            _gray_frame(source, source_time),
-            _gray_frame(result, result_time),
-        )
-        samples.append(
-            {
-                "fraction": round(fraction, 3),
-                "source_seconds": round(source_time, 3),
-                "result_seconds": round(result_time, 3),
-                "mae": round(mae, 3),
-            }
+    samples = [
+        {
+            "fraction": round(fraction, 3),
+            "source_seconds": source_time,
+            "result_seconds": result_time,
+            "mae": round(mae, 3),
+        }
+        for fraction, source_time, result_time, mae in zip(
+            fractions, source_times, result_times, maes
         )
+    ]
     near_duplicates = [item for item in samples if item["mae"] <= 1.0]
     allowed_near_duplicates = max(1, math.floor(len(samples) * 0.10))
     if len(near_duplicates) > allowed_near_duplicates:
@@ -8,6 +8,7 @@ import math
 import os
 import random
 import re
+import secrets
 import signal
 import subprocess
 import time
@@ -429,6 +430,7 @@ def _reset_agent_browser_daemon(session: str, *, reason: str = "recoverable_fail
     if pid > 1 and _agent_browser_daemon_matches(pid, session):
         daemon_pids.append(pid)
     stopped_pids = _terminate_agent_browser_daemons(daemon_pids)
+    _drop_cdp_eval_session(session)
 
     for suffix in ("sock", "pid", "stream", "version", "engine"):
         try:
@@ -480,6 +482,10 @@ def _recoverable_agent_browser_error(error: BaseException) -> bool:
 
 def _run(*args: str, timeout: int = 180, isolated: bool = True) -> dict[str, Any]:
     session = _session_name()
+    if args and args[0] in _CDP_EVAL_REBIND_COMMANDS:
+        # Tab switches and navigation may move agent-browser to another page
+        # target; rebind the persistent eval socket on the next evaluation.
+        _drop_cdp_eval_session(session)
     command = [AGENT_BROWSER]
     if isolated:
         command.extend(["--session", session])
@@ -550,20 +556,205 @@ def _run(*args: str, timeout: int = 180, isolated: bool = True) -> dict[str, Any
         _release_browser_lock(lock_file)
 
 
-def _eval(expression: str, *, isolated: bool = True) -> Any:
-    payload = _run("eval", expression, isolated=isolated)
-    value = (payload.get("data") or {}).get("result")
-    if isinstance(value, str):
+_CDP_EVAL_REBIND_COMMANDS = frozenset({"open", "tab", "close", "connect"})
+_CDP_EVAL_SESSIONS: dict[str, "_CdpEvalSession"] = {}
+
+
+class _CdpEvalTransportError(RuntimeError):
+    """The persistent socket failed before the page produced a result."""
+
+
+def _cdp_eval_enabled() -> bool:
+    value = str(os.getenv("HERMES_BROWSER_CDP_EVAL", "1")).strip().lower()
+    return value not in {"0", "false", "no", "off"}
+
+
+def _cdp_debugger_url(cdp_url: str, target: dict[str, Any]) -> str:
+    """Route a target's debugger URL through the configured CDP host.
+
+    Chrome advertises ``ws://127.0.0.1:<port>`` even when the endpoint is
+    reached through an SSH tunnel, so only the path is taken from the target.
+    """
+    route = urllib.parse.urlparse(str(cdp_url).rstrip("/"))
+    debugger = urllib.parse.urlparse(str(target.get("webSocketDebuggerUrl") or ""))
+    if not debugger.path:
+        return ""
+    return urllib.parse.urlunparse((
+        "wss" if route.scheme == "https" else "ws",
+        route.netloc,
+        debugger.path,
+        debugger.params,
+        debugger.query,
+        debugger.fragment,
+    ))
+
+
+class _CdpEvalSession:
+    """Long-lived DevTools page socket for ``Runtime.evaluate`` probes.
+
+    Every agent-browser command forks a CLI process, while page-state probes
+    and composer polling are plain evaluations.  This session keeps one
+    socket open to the page agent-browser is driving and pipelines
+    evaluations over it.  The page is identified by tagging agent-browser's
+    active tab with a random marker through one CLI eval and selecting the
+    target that reports the same marker, so both paths always see one tab.
+    """
+
+    rebind_cooldown_seconds = 30.0
+
+    def __init__(self, session: str, cdp_url: str) -> None:
+        self.session = session
+        self.cdp_url = str(cdp_url or "").rstrip("/")
+        self.target_id = ""
+        self._socket: Any = None
+        self._sequence = 0
+        self._retry_after = 0.0
+
+    @property
+    def connected(self) -> bool:
+        return self._socket is not None
+
+    def close(self) -> None:
+        socket, self._socket = self._socket, None
+        self.target_id = ""
+        if socket is None:
+            return
         try:
-            return json.loads(value)
-        except ValueError:
-            return value
-    return value
+            socket.close()
+        except Exception:
+            pass
 
+    def _bind(self) -> None:
+        if time.monotonic() < self._retry_after:
+            raise _CdpEvalTransportError("CDP eval socket is cooling down after a failed bind")
+        if not self.cdp_url.startswith(("http://", "https://")):
+            self._retry_after = time.monotonic() + self.rebind_cooldown_seconds
+            raise _CdpEvalTransportError(f"CDP eval requires an HTTP CDP endpoint: {self.cdp_url}")
+        from websockets.sync.client import connect
 
-def _eval_timeout(expression: str, *, timeout: int = 30, isolated: bool = True) -> Any:
-    payload = _run("eval", expression, timeout=timeout, isolated=isolated)
-    value = (payload.get("data") or {}).get("result")
+        marker = f"hermes-{secrets.token_hex(8)}"
+        try:
+            tagged = _run(
+                "eval",
+                f"(window.__hermesCdpEvalTag = {json.dumps(marker)})",
+                timeout=30,
+            )
+            if (tagged.get("data") or {}).get("result") != marker:
+                raise _CdpEvalTransportError("agent-browser did not echo the CDP eval marker")
+            with urllib.request.urlopen(f"{self.cdp_url}/json/list", timeout=5) as response:
+                targets = json.load(response)
+            for target in list(targets or []):
+                if str(target.get("type") or "") != "page":
+                    continue
+                debugger_url = _cdp_debugger_url(self.cdp_url, target)
+                if not debugger_url:
+                    continue
+                socket = connect(
+                    debugger_url,
+                    origin="http://localhost",
+                    proxy=None,
+                    open_timeout=5,
+                    close_timeout=2,
+                    max_size=None,
+                )
+                self._socket = socket
+                try:
+                    tag = self._evaluate_locked(["window.__hermesCdpEvalTag"], timeout=5)[0]
+                except Exception:
+                    tag = None
+                if tag == marker:
+                    self.target_id = str(target.get("id") or "")
+                    return
+                self.close()
+            raise _CdpEvalTransportError("No CDP page target carries the agent-browser marker")
+        except BaseException as exc:
+            self.close()
+            self._retry_after = time.monotonic() + self.rebind_cooldown_seconds
+            if isinstance(exc, (_CdpEvalTransportError, KeyboardInterrupt, SoftTimeLimitExceeded)):
+                raise
+            if isinstance(exc, Exception):
+                raise _CdpEvalTransportError(str(exc)[:500]) from exc
+            raise
+
+    def _evaluate_locked(self, expressions: list[str], *, timeout: float) -> list[Any]:
+        socket = self._socket
+        if socket is None:
+            raise _CdpEvalTransportError("CDP eval socket is not connected")
+        pending: dict[int, int] = {}
+        try:
+            for index, expression in enumerate(expressions):
+                self._sequence += 1
+                pending[self._sequence] = index
+                socket.send(json.dumps({
+                    "id": self._sequence,
+                    "method": "Runtime.evaluate",
+                    "params": {
+                        "expression": expression,
+                        "returnByValue": True,
+                        "awaitPromise": True,
+                    },
+                }))
+            replies: dict[int, dict[str, Any]] = {}
+            deadline = time.monotonic() + max(1.0, float(timeout))
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"CDP evaluation timed out after {timeout}s")
+                message = json.loads(socket.recv(timeout=remaining))
+                index = pending.pop(int(message.get("id") or 0), None)
+                if index is not None:
+                    replies[index] = message
+        except BaseException as exc:
+            # Unanswered ids would poison the next request on this socket.
+            self.close()
+            if isinstance(exc, Exception) and not isinstance(exc, TimeoutError):
+                raise _CdpEvalTransportError(str(exc)[:500]) from exc
+            raise
+
+        values: list[Any] = []
+        for index in range(len(expressions)):
+            message = replies[index]
+            if message.get("error"):
+                raise RuntimeError(str(message["error"])[:2000])
+            result = dict(message.get("result") or {})
+            details = result.get("exceptionDetails")
+            if details:
+                exception = dict(dict(details).get("exception") or {})
+                text = exception.get("description") or dict(details).get("text") or details
+                raise RuntimeError(f"Browser evaluation failed: {str(text)[:2000]}")
+            values.append(dict(result.get("result") or {}).get("value"))
+        return values
+
+    def evaluate_many(self, expressions: list[str], *, timeout: float = 30) -> list[Any]:
+        if not self.connected:
+            self._bind()
+        lock_file = _acquire_browser_lock(self.session)
+        _touch_agent_browser_activity(self.session)
+        try:
+            return self._evaluate_locked(list(expressions), timeout=timeout)
+        finally:
+            _touch_agent_browser_activity(self.session)
+            _release_browser_lock(lock_file)
+
+
+def _cdp_eval_session() -> _CdpEvalSession:
+    session = _session_name()
+    current = _CDP_EVAL_SESSIONS.get(session)
+    if current is None or current.cdp_url != str(CDP_URL or "").rstrip("/"):
+        if current is not None:
+            current.close()
+        current = _CdpEvalSession(session, CDP_URL)
+        _CDP_EVAL_SESSIONS[session] = current
+    return current
+
+
+def _drop_cdp_eval_session(session: str) -> None:
+    current = _CDP_EVAL_SESSIONS.get(session)
+    if current is not None:
+        current.close()
+
+
+def _decode_eval_value(value: Any) -> Any:
     if isinstance(value, str):
         try:
             return json.loads(value)
@@ -572,6 +763,42 @@ def _eval_timeout(expression: str, *, timeout: int = 30, isolated: bool = True)
     return value
 
 
+def _eval_many(expressions: list[str], *, timeout: int = 30, isolated: bool = True) -> list[Any]:
+    """Evaluate expressions in order on the agent-browser page.
+
+    Isolated evaluations are pipelined over the persistent CDP socket.  When
+    the socket cannot be bound or drops before answering, the agent-browser
+    CLI runs the expressions instead, exactly as it did before the socket
+    existed.  Page-side exceptions are raised without a CLI retry.
+    """
+    if isolated and _cdp_eval_enabled() and expressions:
+        try:
+            values = _cdp_eval_session().evaluate_many(list(expressions), timeout=timeout)
+            return [_decode_eval_value(value) for value in values]
+        except _CdpEvalTransportError as exc:
+            logger.debug("CDP eval socket unavailable for %s; using agent-browser CLI: %s", _session_name(), exc)
+    return [
+        _decode_eval_value((_run("eval", expression, timeout=timeout, isolated=isolated).get("data") or {}).get("result"))
+        for expression in expressions
+    ]
+
+
+def _eval(expression: str, *, isolated: bool = True) -> Any:
+    return _eval_many([expression], timeout=180, isolated=isolated)[0]
+
+
+def _eval_timeout(expression: str, *, timeout: int = 30, isolated: bool = True) -> Any:
+    return _eval_many([expression], timeout=timeout, isolated=isolated)[0]
+
+
+def _selector_count(selector: str, *, timeout: int = 30) -> int:
+    value = _eval_timeout(f"document.querySelectorAll({json.dumps(selector)}).length", timeout=timeout)
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
 def _list_tabs() -> list[dict[str, Any]]:
     try:
         payload = _run("tab", "list", timeout=30)
@@ -971,8 +1198,7 @@ def _wait_selector(selector: str, timeout_seconds: int = 90) -> None:
     deadline = time.monotonic() + timeout_seconds
     while time.monotonic() < deadline:
         try:
-            payload = _run("get", "count", selector, timeout=30)
-            if int((payload.get("data") or {}).get("count") or 0) > 0:
+            if _selector_count(selector, timeout=30) > 0:
                 return
         except Exception:
             pass
@@ -984,8 +1210,7 @@ def _composer_ready(timeout_seconds: int = 20) -> bool:
     deadline = time.monotonic() + timeout_seconds
     while time.monotonic() < deadline:
         try:
-            count = _run("get", "count", "#prompt-textarea", timeout=20)
-            if int((count.get("data") or {}).get("count") or 0) > 0:
+            if _selector_count("#prompt-textarea", timeout=20) > 0:
                 return True
         except Exception:
             pass
@@ -1017,7 +1242,7 @@ def _enter_chat_composer(stage_url: str) -> None:
 
 def _clear_composer() -> None:
     try:
-        _eval(r'''(() => {
+        _eval_many([r'''(() => {
           const composer = document.querySelector('form textarea')?.closest('form')
             || document.querySelector('#prompt-textarea')?.closest('form')
             || document.querySelector('[contenteditable="true"]')?.closest('form')
@@ -1027,8 +1252,7 @@ def _clear_composer() -> None:
             if (/移除文件|删除文件|取消上传|Remove file|Remove attachment|Delete file|Cancel upload|Close|×/i.test(label)) button.click();
           }
           return true;
-        })()''')
-        _eval(r'''(() => {
+        })()''', r'''(() => {
           for (const button of [...document.querySelectorAll('button')]) {
             const label=(button.getAttribute('aria-label')||'')+' '+(button.innerText||'');
             if (/移除文件|Remove file|删除文件|Remove attachment/i.test(label)) button.click();
@@ -1057,7 +1281,7 @@ def _clear_composer() -> None:
             textarea.dispatchEvent(new Event('input',{bubbles:true}));
           }
           return true;
-        })()''')
+        })()'''], timeout=180)
         time.sleep(1)
     except Exception:
         pass
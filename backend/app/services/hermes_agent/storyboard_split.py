@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import numpy as np
-from PIL import Image
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy and Pillow are imported inside the functions that decode and scan
+# boards: importers such as the content factory API only need the layout
+# helpers and should not pay for the imaging stack at startup.
+
+Cell = tuple[int, int, int, int]
+CellDetector = Callable[..., tuple[list[Cell], dict[str, Any]]]
 
 
 def _separator_scores(rgb: np.ndarray, *, axis: int) -> np.ndarray:
@@ -16,6 +29,8 @@ def _separator_scores(rgb: np.ndarray, *, axis: int) -> np.ndarray:
     constant end to end. The high uniformity gate avoids treating ordinary
     photographic rows/columns as dividers.
     """
+    import numpy as np
+
     values = np.asarray(rgb, dtype=np.int16)
     minimum = np.min(values, axis=2)
     maximum = np.max(values, axis=2)
@@ -59,6 +74,8 @@ def _separator_runs(
     threshold: float = 0.90,
     minimum_width: int = 2,
 ) -> list[tuple[int, int]]:
+    import numpy as np
+
     mask = np.asarray(scores >= threshold, dtype=bool)
     runs: list[tuple[int, int]] = []
     start: int | None = None
@@ -157,6 +174,8 @@ def _select_guided_runs(
     generation contract explicitly asks for white gutters, so use their known
     geometric positions first and retain the generic detector as fallback.
     """
+    import numpy as np
+
     if divisions <= 1:
         return []
     runs = _merge_nearby_runs(
@@ -201,6 +220,8 @@ def _trim_bright_outer_margins(
     cell: tuple[int, int, int, int],
 ) -> tuple[int, int, int, int]:
     """Remove white centering margins without cropping photographic content."""
+    import numpy as np
+
     x, y, width, height = cell
     crop = rgb[y:y + height, x:x + width, :]
     if crop.size == 0:
@@ -226,6 +247,8 @@ def _detect_guided_bright_gutters(
     *,
     count: int,
 ) -> tuple[list[tuple[int, int, int, int]], dict[str, Any]] | None:
+    import numpy as np
+
     height, width = rgb.shape[:2]
     bright = np.min(rgb, axis=2) >= 225
     for row_columns in _candidate_row_layouts(count):
@@ -320,9 +343,24 @@ def detect_preview_cells(
     projection cannot see them. Detect horizontal rows first, then find the
     vertical gutters independently inside every row.
     """
-    source_path = Path(source)
-    with Image.open(source_path) as image:
-        rgb = np.asarray(image.convert("RGB"))
+    return detect_preview_cells_in_rgb(load_storyboard_rgb(source), count=count)
+
+
+def load_storyboard_rgb(source: str | Path) -> np.ndarray:
+    """Decode a storyboard once into an ``H x W x 3`` uint8 array."""
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(Path(source)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def detect_preview_cells_in_rgb(
+    rgb: np.ndarray,
+    *,
+    count: int,
+) -> tuple[list[tuple[int, int, int, int]], dict[str, Any]]:
+    """Run :func:`detect_preview_cells` on an already decoded board."""
     height, width = rgb.shape[:2]
     if count <= 0:
         raise ValueError("Storyboard panel count must be positive")
@@ -414,4 +452,117 @@ def detect_preview_cells(
     )
 
 
-__all__ = ["detect_preview_cells", "expected_row_columns", "validate_expected_layout"]
+def extract_panels(rgb: np.ndarray, cells: Sequence[Cell]) -> list[np.ndarray]:
+    """Slice every cell out of the decoded board without copying pixels."""
+    return [rgb[y:y + height, x:x + width, :] for x, y, width, height in cells]
+
+
+def _encode_panel_png(panel: np.ndarray, target: str, optimize: bool) -> int:
+    import numpy as np
+    from PIL import Image
+
+    Image.fromarray(np.ascontiguousarray(panel), mode="RGB").save(
+        target,
+        format="PNG",
+        optimize=optimize,
+    )
+    return os.path.getsize(target)
+
+
+def _default_split_workers(job_count: int) -> int:
+    configured = str(os.getenv("HERMES_STORYBOARD_SPLIT_WORKERS") or "").strip()
+    if configured.isdigit():
+        return max(1, min(job_count, int(configured)))
+    return max(1, min(job_count, os.cpu_count() or 1, 4))
+
+
+def encode_panels(
+    jobs: Sequence[tuple[np.ndarray, str | Path]],
+    *,
+    optimize: bool = False,
+    max_workers: int | None = None,
+) -> list[int]:
+    """Write panel arrays as PNG files, in parallel when it pays off.
+
+    PNG deflate dominates split time, so panels are encoded on a small
+    spawn-based process pool.  Celery prefork children cannot always start
+    their own pools; encoding then continues inline in the same order.
+    """
+    if not jobs:
+        return []
+    workers = max_workers if max_workers is not None else _default_split_workers(len(jobs))
+    if workers > 1 and len(jobs) > 1:
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                futures = [
+                    pool.submit(_encode_panel_png, panel, str(target), optimize)
+                    for panel, target in jobs
+                ]
+                return [future.result() for future in futures]
+        except (BrokenProcessPool, OSError, AssertionError):
+            # ``AssertionError`` is raised by multiprocessing for daemonic
+            # parents; fall through to inline encoding.
+            pass
+    return [_encode_panel_png(panel, str(target), optimize) for panel, target in jobs]
+
+
+@dataclass
+class StoryboardSplitRequest:
+    """One board to split and the panel file each detected cell becomes."""
+
+    source: Path
+    count: int
+    targets: list[Path]
+    cells: list[Cell] = field(default_factory=list)
+    layout: dict[str, Any] = field(default_factory=dict)
+    sizes: list[int] = field(default_factory=list)
+
+
+def split_storyboard_boards(
+    requests: Sequence[StoryboardSplitRequest],
+    *,
+    detector: CellDetector = detect_preview_cells_in_rgb,
+    optimize: bool = False,
+    max_workers: int | None = None,
+) -> list[StoryboardSplitRequest]:
+    """Split many boards, e.g. every variant of a project, in one batch.
+
+    Every board is decoded once and its cells are detected on that array.
+    All panels of all boards are then encoded together, so one pool serves
+    the whole batch.  Detection errors propagate before any file is written;
+    ``cells``, ``layout`` and ``sizes`` are filled in on each request.
+    """
+    jobs: list[tuple[np.ndarray, Path]] = []
+    for request in requests:
+        rgb = load_storyboard_rgb(request.source)
+        cells, layout = detector(rgb, count=request.count)
+        if len(cells) != len(request.targets):
+            raise ValueError(
+                "Storyboard split target count mismatch: "
+                f"detected={len(cells)}, targets={len(request.targets)}, source={request.source}"
+            )
+        request.cells = [tuple(int(value) for value in cell) for cell in cells]
+        request.layout = layout
+        jobs.extend(zip(extract_panels(rgb, request.cells), request.targets))
+    sizes = encode_panels(jobs, optimize=optimize, max_workers=max_workers)
+    offset = 0
+    for request in requests:
+        request.sizes = sizes[offset:offset + len(request.targets)]
+        offset += len(request.targets)
+    return list(requests)
+
+
+__all__ = [
+    "StoryboardSplitRequest",
+    "detect_preview_cells",
+    "detect_preview_cells_in_rgb",
+    "encode_panels",
+    "expected_row_columns",
+    "extract_panels",
+    "load_storyboard_rgb",
+    "split_storyboard_boards",
+    "validate_expected_layout",
+]
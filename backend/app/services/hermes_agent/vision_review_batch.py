@@ -0,0 +1,181 @@
+"""Concurrent contact-sheet rendering and vision review of generated segments.
+
+Segment reviewers are prepared on the caller's session (cache checks, review
+contracts) and return a :class:`VisionReviewJob` when pixels still have to be
+judged.  :func:`run_vision_review_jobs` renders all pending contact sheets in
+parallel and submits their vision calls concurrently, each worker on its own
+session.  :func:`route_slot` caps in-flight calls per logical vision model so
+a batch cannot flood one provider; the routed completion acquires it, so the
+cap also holds for serial callers in other threads.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import logging
+import threading
+import time
+from typing import Any, Callable, Iterator, Sequence
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+
+logger = logging.getLogger("gmv.hermes.vision_review_batch")
+
+_route_slots: dict[str, threading.BoundedSemaphore] = {}
+_route_slots_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class VisionReviewJob:
+    """One contact sheet plus vision call whose verdict is not cached yet.
+
+    ``key`` is ``(review kind, task id, source sha256)``; ``record`` holds the
+    fields merged into the persisted review next to the verdict.
+    """
+
+    key: tuple[str, int, str]
+    render: Callable[[], None]
+    review: Callable[[Session], dict[str, Any]]
+    record: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class VisionReviewOutcome:
+    key: tuple[str, int, str]
+    verdict: dict[str, Any] | None
+    error: BaseException | None
+    contact_sheet_ms: int
+    vision_ms: int
+    prefetched: bool
+
+    def result(self) -> dict[str, Any]:
+        if self.error is not None:
+            raise self.error
+        return dict(self.verdict or {})
+
+    def latency(self) -> dict[str, Any]:
+        return {
+            "contact_sheet_ms": self.contact_sheet_ms,
+            "vision_ms": self.vision_ms,
+            "prefetched": self.prefetched,
+        }
+
+
+def _route_limit() -> int:
+    return max(1, int(settings.CONTENT_FACTORY_VISION_REVIEW_ROUTE_CONCURRENCY))
+
+
+@contextmanager
+def route_slot(route: str) -> Iterator[None]:
+    """Hold one of the in-flight slots of a logical vision model."""
+
+    name = str(route or "default")
+    with _route_slots_lock:
+        slot = _route_slots.get(name)
+        if slot is None:
+            slot = _route_slots[name] = threading.BoundedSemaphore(_route_limit())
+    with slot:
+        yield
+
+
+def execute_vision_review_job(
+    job: VisionReviewJob,
+    db: Session,
+    *,
+    prefetched: bool = False,
+) -> VisionReviewOutcome:
+    """Render the sheet and run the vision call; errors become the outcome."""
+
+    started = time.monotonic()
+    rendered = started
+    verdict: dict[str, Any] | None = None
+    error: BaseException | None = None
+    try:
+        job.render()
+        rendered = time.monotonic()
+        verdict = dict(job.review(db))
+    except Exception as exc:  # noqa: BLE001 - re-raised by the caller's gate.
+        error = exc
+    finished = time.monotonic()
+    if rendered == started:
+        rendered = finished
+    return VisionReviewOutcome(
+        key=job.key,
+        verdict=verdict,
+        error=error,
+        contact_sheet_ms=int((rendered - started) * 1000),
+        vision_ms=int((finished - rendered) * 1000),
+        prefetched=prefetched,
+    )
+
+
+def run_vision_review_jobs(
+    jobs: Sequence[VisionReviewJob],
+    *,
+    db: Session,
+    session_factory: Callable[[], Session] | None = None,
+    max_workers: int | None = None,
+) -> dict[tuple[str, int, str], VisionReviewOutcome]:
+    """Run ``jobs`` concurrently and return their outcomes by key.
+
+    Each worker uses its own session from ``session_factory`` (a session
+    maker on ``db``'s engine by default); ``db`` itself is never shared with
+    the pool.
+    """
+
+    unique = list({job.key: job for job in jobs}.values())
+    if not unique:
+        return {}
+    make_session = session_factory or sessionmaker(
+        bind=db.get_bind(), autoflush=False, expire_on_commit=False
+    )
+    workers = max(
+        1,
+        min(
+            len(unique),
+            int(max_workers or settings.CONTENT_FACTORY_VISION_REVIEW_CONCURRENCY),
+        ),
+    )
+
+    def _run(job: VisionReviewJob) -> VisionReviewOutcome:
+        worker_db = make_session()
+        try:
+            return execute_vision_review_job(job, worker_db, prefetched=True)
+        finally:
+            worker_db.close()
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vision-review") as pool:
+        outcomes = list(pool.map(_run, unique))
+    for outcome in outcomes:
+        logger.info(
+            "content factory vision review finished",
+            extra={
+                "review_kind": outcome.key[0],
+                "task_id": outcome.key[1],
+                "failed": outcome.error is not None,
+                **outcome.latency(),
+            },
+        )
+    logger.info(
+        "content factory vision review batch finished",
+        extra={
+            "jobs": len(unique),
+            "workers": workers,
+            "elapsed_ms": int((time.monotonic() - started) * 1000),
+        },
+    )
+    return {outcome.key: outcome for outcome in outcomes}
+
+
+__all__ = [
+    "VisionReviewJob",
+    "VisionReviewOutcome",
+    "execute_vision_review_job",
+    "route_slot",
+    "run_vision_review_jobs",
+]
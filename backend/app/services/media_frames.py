@@ -0,0 +1,385 @@
+"""Cached frame sampling and contact sheets for managed videos.
+
+Vision review, critics and analysts used to render their own contact sheets
+of the same source video, each with its own ffmpeg filter graph.  Here a video
+is decoded once per sample set: ffmpeg selects the frames at the requested
+times in a single pass and they are kept as JPEGs under
+``MEDIA_FRAME_CACHE_DIR/<content sha256>/<sample digest>/``.  Sheets of any
+grid, tile size or fit are composed from those frames with Pillow and cached
+next to them by layout.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Sequence
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FFMPEG_BIN = "/opt/apps/bin/ffmpeg"
+# Bump when cached frames or sheets change encoding; old entries are ignored.
+CACHE_FORMAT_VERSION = 1
+SHOWINFO_PTS_RE = re.compile(r"Parsed_showinfo.*?\bpts_time:\s*(-?[0-9.]+)")
+_HASH_CHUNK_BYTES = 1 << 20
+_HASH_MEMO_ENTRIES = 1024
+_hash_memo: OrderedDict[str, str] = OrderedDict()
+_hash_memo_lock = threading.Lock()
+
+
+class MediaFrameError(RuntimeError):
+    """Frames could not be decoded from the video."""
+
+
+@dataclass(frozen=True)
+class SampledFrame:
+    timestamp: float
+    path: Path
+
+
+@dataclass(frozen=True)
+class SheetLayout:
+    """Grid and tile geometry of a contact sheet.
+
+    ``fit`` is ``"width"`` (scale to ``tile_width`` and keep the aspect
+    ratio), ``"contain"`` (letterbox into the tile) or ``"cover"`` (fill the
+    tile and crop).  Missing ``columns``/``rows`` are chosen to keep the grid
+    close to square.
+    """
+
+    tile_width: int = 320
+    tile_height: int | None = None
+    columns: int | None = None
+    rows: int | None = None
+    fit: str = "width"
+    padding: int = 0
+    margin: int = 0
+    background: tuple[int, int, int] = (0, 0, 0)
+    quality: int = 90
+    image_format: str = "JPEG"
+
+    def digest(self) -> str:
+        material = json.dumps(asdict(self), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(material.encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class ContactSheet:
+    path: Path
+    timestamps: list[float]
+    size_bytes: int
+
+
+def _ffmpeg_binary() -> str:
+    return FFMPEG_BIN if Path(FFMPEG_BIN).exists() else "ffmpeg"
+
+
+def cache_root() -> Path:
+    return Path(str(settings.MEDIA_FRAME_CACHE_DIR)).expanduser()
+
+
+def content_sha256(path: Path) -> str:
+    """Hash file contents, memoized per path + size + mtime in this process."""
+
+    stat = path.stat()
+    memo_key = f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+    with _hash_memo_lock:
+        if memo_key in _hash_memo:
+            _hash_memo.move_to_end(memo_key)
+            return _hash_memo[memo_key]
+    digest = hashlib.sha256()
+    with path.open("rb") as stream:
+        while chunk := stream.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    with _hash_memo_lock:
+        _hash_memo[memo_key] = value
+        while len(_hash_memo) > _HASH_MEMO_ENTRIES:
+            _hash_memo.popitem(last=False)
+    return value
+
+
+def select_expression(times: Sequence[float]) -> str:
+    """ffmpeg ``select`` expression picking the first frame at or after each time."""
+
+    terms = []
+    for value in sorted({round(max(0.0, item), 3) for item in times}):
+        terms.append(f"gte(t,{value:.3f})*(isnan(prev_t)+lt(prev_t,{value:.3f}))")
+    return "+".join(terms) or "0"
+
+
+def uniform_times(duration: float, count: int) -> list[float]:
+    """``count`` evenly spaced sample times starting at zero."""
+
+    count = max(1, int(count))
+    step = max(0.0, float(duration)) / count
+    return [round(step * index, 3) for index in range(count)]
+
+
+def _normalized_times(times: Sequence[float]) -> list[float]:
+    return [round(max(0.0, float(value)), 3) for value in times]
+
+
+def _sample_dir(path: Path, times: Sequence[float]) -> Path:
+    max_side = int(settings.MEDIA_FRAME_MAX_SIDE)
+    material = json.dumps(
+        {"times": sorted(set(times)), "max_side": max_side, "version": CACHE_FORMAT_VERSION},
+        separators=(",", ":"),
+    )
+    sha = content_sha256(path)
+    digest = hashlib.sha256(material.encode()).hexdigest()[:16]
+    return cache_root() / sha[:2] / sha / f"frames-{digest}"
+
+
+def _load_manifest(directory: Path) -> dict[float, Path] | None:
+    try:
+        manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    frames = {float(t): directory / str(name) for t, name in manifest.get("frames") or []}
+    if not frames or not all(frame.is_file() for frame in frames.values()):
+        return None
+    return frames
+
+
+def _decode(path: Path, times: Sequence[float], directory: Path) -> dict[float, Path]:
+    max_side = int(settings.MEDIA_FRAME_MAX_SIDE)
+    scale = (
+        f"scale='min({max_side}\\,iw)':'min({max_side}\\,ih)'"
+        ":force_original_aspect_ratio=decrease"
+    )
+    try:
+        completed = subprocess.run(
+            [
+                _ffmpeg_binary(),
+                "-hide_banner",
+                "-nostats",
+                "-nostdin",
+                "-v",
+                "info",
+                "-i",
+                str(path),
+                "-map",
+                "0:v:0",
+                "-vf",
+                f"select='{select_expression(times)}',showinfo,{scale}",
+                "-fps_mode",
+                "passthrough",
+                "-q:v",
+                "2",
+                "-y",
+                str(directory / "decoded-%03d.jpg"),
+            ],
+            check=False,
+            capture_output=True,
+            timeout=max(1, int(settings.MEDIA_FRAME_DECODE_TIMEOUT_SECONDS)),
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        raise MediaFrameError(f"could not decode frames from {path}: {exc}") from exc
+    decoded = sorted(directory.glob("decoded-*.jpg"))
+    pts = [
+        float(match.group(1))
+        for match in SHOWINFO_PTS_RE.finditer(completed.stderr.decode("utf-8", "replace"))
+    ][: len(decoded)]
+    if completed.returncode != 0 or not pts:
+        raise MediaFrameError(
+            f"could not decode frames from {path}: "
+            + completed.stderr.decode("utf-8", "replace")[-400:]
+        )
+    frames: dict[float, Path] = {}
+    for timestamp in times:
+        # Selected frames are in presentation order; a sample past the last
+        # decoded frame (end-of-clip samples) falls back to that last frame.
+        index = next(
+            (i for i, value in enumerate(pts) if value >= timestamp - 1e-3),
+            len(pts) - 1,
+        )
+        frames[timestamp] = decoded[index]
+    return frames
+
+
+def sample_frames(path: str | Path, times: Sequence[float]) -> list[SampledFrame]:
+    """Return cached frames of ``path`` at ``times``, decoding the video once.
+
+    Frames are capped at ``MEDIA_FRAME_MAX_SIDE`` on the long side so any
+    smaller sheet can be composed from them.
+    """
+
+    source = Path(path)
+    requested = _normalized_times(times)
+    if not requested:
+        return []
+    directory = _sample_dir(source, requested)
+    frames = _load_manifest(directory)
+    if frames is None:
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".frames-", dir=directory.parent))
+        try:
+            decoded = _decode(source, sorted(set(requested)), staging)
+            names = {frame: frame.name for frame in decoded.values()}
+            (staging / "manifest.json").write_text(
+                json.dumps({"frames": [[t, names[f]] for t, f in decoded.items()]}),
+                encoding="utf-8",
+            )
+            try:
+                staging.rename(directory)
+            except OSError:
+                # Another worker published the same sample set first.
+                pass
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        frames = _load_manifest(directory)
+        if frames is None:
+            raise MediaFrameError(f"frame cache for {source} is unreadable")
+    os.utime(directory.parent)
+    return [SampledFrame(timestamp, frames[timestamp]) for timestamp in requested]
+
+
+def best_grid(count: int) -> tuple[int, int]:
+    """``(columns, rows)`` closest to square, preferring the smaller area."""
+
+    count = max(1, int(count))
+    best = (count, 1)
+    for rows in range(1, count + 1):
+        columns = math.ceil(count / rows)
+        score = (abs(columns - rows), columns * rows)
+        if score < (abs(best[0] - best[1]), best[0] * best[1]):
+            best = (columns, rows)
+    return best
+
+
+def _grid(count: int, layout: SheetLayout) -> tuple[int, int]:
+    if layout.columns and layout.rows:
+        return layout.columns, layout.rows
+    if layout.columns:
+        return layout.columns, math.ceil(count / layout.columns)
+    if layout.rows:
+        return math.ceil(count / layout.rows), layout.rows
+    return best_grid(count)
+
+
+def _tile(image: Image.Image, layout: SheetLayout) -> Image.Image:
+    width = max(1, int(layout.tile_width))
+    if layout.fit == "width" or layout.tile_height is None:
+        height = max(1, round(image.height * width / max(1, image.width)))
+        return image.resize((width, height), Image.LANCZOS)
+    size = (width, max(1, int(layout.tile_height)))
+    if layout.fit == "cover":
+        return ImageOps.fit(image, size, Image.LANCZOS)
+    return ImageOps.pad(image, size, Image.LANCZOS, color=layout.background)
+
+
+def _compose(frames: Sequence[SampledFrame], layout: SheetLayout, target: Path) -> None:
+    tiles = []
+    for frame in frames:
+        with Image.open(frame.path) as image:
+            tiles.append(_tile(image.convert("RGB"), layout))
+    columns, rows = _grid(len(tiles), layout)
+    cell_width = max(tile.width for tile in tiles)
+    cell_height = max(tile.height for tile in tiles)
+    pad, margin = max(0, layout.padding), max(0, layout.margin)
+    sheet = Image.new(
+        "RGB",
+        (
+            2 * margin + columns * cell_width + (columns - 1) * pad,
+            2 * margin + rows * cell_height + (rows - 1) * pad,
+        ),
+        layout.background,
+    )
+    for index, tile in enumerate(tiles[: columns * rows]):
+        column, row = index % columns, index // columns
+        sheet.paste(
+            tile,
+            (margin + column * (cell_width + pad), margin + row * (cell_height + pad)),
+        )
+    if layout.image_format.upper() == "PNG":
+        sheet.save(target, format="PNG", optimize=True)
+    else:
+        sheet.save(target, format="JPEG", quality=int(layout.quality), optimize=True)
+
+
+def render_contact_sheet(
+    path: str | Path,
+    times: Sequence[float],
+    layout: SheetLayout,
+    target: str | Path | None = None,
+) -> ContactSheet:
+    """Return a cached sheet of ``path`` at ``times``; copy it to ``target`` if given."""
+
+    frames = sample_frames(path, times)
+    if not frames:
+        raise MediaFrameError(f"no sample times requested for {path}")
+    frame_dir = frames[0].path.parent
+    extension = "png" if layout.image_format.upper() == "PNG" else "jpg"
+    cached = frame_dir / f"sheet-{layout.digest()}-{len(frames)}.{extension}"
+    if not cached.is_file():
+        staging = frame_dir / f".{cached.name}.{os.getpid()}.{threading.get_ident()}"
+        try:
+            _compose(frames, layout, staging)
+            os.replace(staging, cached)
+        finally:
+            staging.unlink(missing_ok=True)
+    output = cached
+    if target is not None:
+        output = Path(target)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cached, output)
+    return ContactSheet(
+        path=output,
+        timestamps=[frame.timestamp for frame in frames],
+        size_bytes=output.stat().st_size,
+    )
+
+
+def prune_frame_cache(*, retention_days: int | None = None) -> int:
+    """Remove cached videos not sampled within the retention window."""
+
+    root = cache_root()
+    if not root.is_dir():
+        return 0
+    days = retention_days or int(settings.MEDIA_FRAME_CACHE_RETENTION_DAYS)
+    cutoff = time.time() - max(1, days) * 86400
+    removed = 0
+    for bucket in root.iterdir():
+        if not bucket.is_dir():
+            continue
+        for entry in bucket.iterdir():
+            try:
+                if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                logger.warning("media frame cache prune failed", extra={"path": str(entry)})
+    return removed
+
+
+__all__ = [
+    "ContactSheet",
+    "MediaFrameError",
+    "SHOWINFO_PTS_RE",
+    "SampledFrame",
+    "SheetLayout",
+    "best_grid",
+    "content_sha256",
+    "prune_frame_cache",
+    "render_contact_sheet",
+    "sample_frames",
+    "select_expression",
+    "uniform_times",
+]
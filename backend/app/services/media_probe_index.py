@@ -0,0 +1,414 @@
+"""Persistent ffprobe metadata index for managed media files.
+
+Pipeline stages used to fork ffprobe for the same file again and again:
+duration for every contact sheet, an audio check before each transcription,
+geometry after a download.  :func:`probe_media` runs ffprobe once per file
+version and keeps the result in a small SQLite index on the media host, keyed
+by resolved path + size + mtime (or by content hash when the caller already
+knows it), so later stages and other worker processes read it back instead.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FFPROBE_BIN = "/opt/apps/bin/ffprobe"
+# Bump when the stored payload changes shape; older rows are then ignored.
+INDEX_FORMAT_VERSION = 1
+_MEMORY_ENTRIES = 2048
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS media_probe (
+        stat_key TEXT PRIMARY KEY,
+        content_hash TEXT,
+        payload TEXT NOT NULL,
+        probed_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_media_probe_content_hash ON media_probe (content_hash)",
+)
+
+
+class MediaProbeError(ValueError):
+    """ffprobe could not read the file as media."""
+
+
+@dataclass(frozen=True)
+class MediaProbe:
+    duration_seconds: float
+    width: int
+    height: int
+    fps: float
+    video_codec: str | None
+    audio_codec: str | None
+    has_video: bool
+    has_audio: bool
+    streams: tuple[dict[str, Any], ...] = ()
+    keyframes: tuple[float, ...] | None = None
+
+    def to_payload(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["streams"] = list(self.streams)
+        payload["keyframes"] = list(self.keyframes) if self.keyframes is not None else None
+        payload["version"] = INDEX_FORMAT_VERSION
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "MediaProbe | None":
+        if int(payload.get("version") or 0) != INDEX_FORMAT_VERSION:
+            return None
+        keyframes = payload.get("keyframes")
+        return cls(
+            duration_seconds=float(payload.get("duration_seconds") or 0.0),
+            width=int(payload.get("width") or 0),
+            height=int(payload.get("height") or 0),
+            fps=float(payload.get("fps") or 0.0),
+            video_codec=payload.get("video_codec"),
+            audio_codec=payload.get("audio_codec"),
+            has_video=bool(payload.get("has_video")),
+            has_audio=bool(payload.get("has_audio")),
+            streams=tuple(payload.get("streams") or ()),
+            keyframes=tuple(float(value) for value in keyframes) if keyframes is not None else None,
+        )
+
+
+def _ffprobe_binary() -> str:
+    return FFPROBE_BIN if Path(FFPROBE_BIN).exists() else "ffprobe"
+
+
+def _frame_rate(value: Any) -> float:
+    text = str(value or "").strip()
+    numerator, _, denominator = text.partition("/")
+    try:
+        rate = float(numerator) / float(denominator or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+    return round(rate, 3) if rate > 0 else 0.0
+
+
+def _run_ffprobe(arguments: Sequence[str], path: Path) -> dict[str, Any]:
+    try:
+        completed = subprocess.run(
+            [_ffprobe_binary(), "-v", "error", *arguments, "-of", "json", str(path)],
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=max(1, int(settings.MEDIA_PROBE_TIMEOUT_SECONDS)),
+        )
+        return json.loads(completed.stdout or "{}")
+    except (OSError, subprocess.SubprocessError, json.JSONDecodeError) as exc:
+        raise MediaProbeError(f"ffprobe failed for {path}: {exc}") from exc
+
+
+def _probe_streams(path: Path) -> MediaProbe:
+    payload = _run_ffprobe(
+        [
+            "-show_entries",
+            "format=duration:stream=index,codec_type,codec_name,width,height,"
+            "avg_frame_rate,r_frame_rate,duration",
+        ],
+        path,
+    )
+    streams = tuple(
+        {key: value for key, value in dict(stream).items() if value not in (None, "")}
+        for stream in payload.get("streams") or []
+    )
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+    try:
+        duration = float(dict(payload.get("format") or {}).get("duration") or 0.0)
+    except (TypeError, ValueError):
+        duration = 0.0
+    if duration <= 0 and video is not None:
+        try:
+            duration = float(video.get("duration") or 0.0)
+        except (TypeError, ValueError):
+            duration = 0.0
+    return MediaProbe(
+        duration_seconds=max(0.0, duration),
+        width=int((video or {}).get("width") or 0),
+        height=int((video or {}).get("height") or 0),
+        fps=_frame_rate((video or {}).get("avg_frame_rate"))
+        or _frame_rate((video or {}).get("r_frame_rate")),
+        video_codec=(video or {}).get("codec_name"),
+        audio_codec=(audio or {}).get("codec_name"),
+        has_video=video is not None,
+        has_audio=audio is not None,
+        streams=streams,
+    )
+
+
+def _probe_keyframes(path: Path) -> tuple[float, ...]:
+    payload = _run_ffprobe(
+        [
+            "-select_streams", "v:0",
+            "-skip_frame", "nokey",
+            "-show_entries", "frame=best_effort_timestamp_time",
+        ],
+        path,
+    )
+    times: list[float] = []
+    for frame in payload.get("frames") or []:
+        try:
+            times.append(round(float(frame.get("best_effort_timestamp_time")), 3))
+        except (TypeError, ValueError):
+            continue
+    return tuple(sorted(set(times)))
+
+
+def _stat_key(path: Path) -> str:
+    stat = path.stat()
+    return f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+class MediaProbeIndex:
+    """SQLite-backed probe index with a bounded in-process front cache."""
+
+    def __init__(self, db_path: str | Path | None) -> None:
+        self._db_path = Path(db_path) if db_path else None
+        self._memory: OrderedDict[str, MediaProbe] = OrderedDict()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self._disabled = self._db_path is None
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._disabled:
+            return None
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self._db_path), timeout=5.0)
+            if not self._schema_ready:
+                connection.execute("PRAGMA journal_mode=WAL")
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+                connection.commit()
+                self._schema_ready = True
+            return connection
+        except (OSError, sqlite3.Error):
+            logger.warning(
+                "media probe index unavailable; probing without persistence",
+                extra={"path": str(self._db_path)},
+                exc_info=True,
+            )
+            self._disabled = True
+            return None
+
+    def _remember(self, key: str, probe: MediaProbe) -> None:
+        with self._lock:
+            self._memory[key] = probe
+            self._memory.move_to_end(key)
+            while len(self._memory) > _MEMORY_ENTRIES:
+                self._memory.popitem(last=False)
+
+    def lookup(
+        self,
+        stat_keys: Sequence[str],
+        content_hashes: dict[str, str] | None = None,
+    ) -> dict[str, MediaProbe]:
+        found: dict[str, MediaProbe] = {}
+        with self._lock:
+            for key in stat_keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+        missing = [key for key in stat_keys if key not in found]
+        if not missing:
+            return found
+        connection = self._connect()
+        if connection is None:
+            return found
+        rows: list[tuple[str | None, str | None, str]] = []
+        try:
+            for start in range(0, len(missing), _LOOKUP_CHUNK):
+                chunk = missing[start : start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" for _ in chunk)
+                rows.extend(
+                    connection.execute(
+                        f"SELECT stat_key, content_hash, payload FROM media_probe "
+                        f"WHERE stat_key IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                )
+            by_hash = {
+                content_hash: key
+                for key, content_hash in (content_hashes or {}).items()
+                if key in missing
+            }
+            if by_hash:
+                hashes = list(by_hash)
+                placeholders = ",".join("?" for _ in hashes)
+                for content_hash, payload in connection.execute(
+                    f"SELECT content_hash, payload FROM media_probe "
+                    f"WHERE content_hash IN ({placeholders})",
+                    hashes,
+                ).fetchall():
+                    rows.append((by_hash[content_hash], content_hash, payload))
+        except sqlite3.Error:
+            logger.warning("media probe index lookup failed", exc_info=True)
+        finally:
+            connection.close()
+        for key, _content_hash, payload in rows:
+            if key in found:
+                continue
+            try:
+                probe = MediaProbe.from_payload(json.loads(payload))
+            except (TypeError, ValueError):
+                probe = None
+            if probe is not None:
+                found[key] = probe
+                self._remember(key, probe)
+        return found
+
+    def store(self, entries: Iterable[tuple[str, str | None, MediaProbe]]) -> None:
+        entries = list(entries)
+        for key, _content_hash, probe in entries:
+            self._remember(key, probe)
+        connection = self._connect()
+        if connection is None or not entries:
+            if connection is not None:
+                connection.close()
+            return
+        now = time.time()
+        try:
+            connection.executemany(
+                "INSERT OR REPLACE INTO media_probe (stat_key, content_hash, payload, probed_at) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        key,
+                        content_hash,
+                        json.dumps(probe.to_payload(), separators=(",", ":")),
+                        now,
+                    )
+                    for key, content_hash, probe in entries
+                ],
+            )
+            connection.commit()
+        except sqlite3.Error:
+            logger.warning("media probe index write failed", exc_info=True)
+        finally:
+            connection.close()
+
+
+_index: MediaProbeIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_media_probe_index() -> MediaProbeIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = MediaProbeIndex(getattr(settings, "MEDIA_PROBE_INDEX_PATH", None))
+        return _index
+
+
+def _probe_file(path: Path, *, keyframes: bool, cached: MediaProbe | None) -> MediaProbe:
+    probe = cached or _probe_streams(path)
+    if keyframes and probe.keyframes is None:
+        probe = replace(probe, keyframes=_probe_keyframes(path) if probe.has_video else ())
+    return probe
+
+
+def probe_media_batch(
+    paths: Iterable[str | Path],
+    *,
+    keyframes: bool = False,
+    content_hashes: dict[str | Path, str] | None = None,
+) -> dict[Path, MediaProbe | None]:
+    """Probe many files, forking ffprobe only for files the index lacks.
+
+    Unreadable or missing files map to ``None``.  ``content_hashes`` lets a
+    caller that already hashed a file reuse a probe of an identical copy.
+    """
+
+    index = get_media_probe_index()
+    resolved: dict[Path, str] = {}
+    results: dict[Path, MediaProbe | None] = {}
+    for raw in paths:
+        path = Path(raw).expanduser().resolve()
+        try:
+            resolved[path] = _stat_key(path)
+        except OSError:
+            results[path] = None
+    hashes = {
+        resolved[Path(raw).expanduser().resolve()]: value
+        for raw, value in (content_hashes or {}).items()
+        if value and Path(raw).expanduser().resolve() in resolved
+    }
+    cached = index.lookup(list(dict.fromkeys(resolved.values())), hashes)
+
+    pending = [
+        path
+        for path, key in resolved.items()
+        if key not in cached or (keyframes and cached[key].keyframes is None)
+    ]
+
+    def _work(path: Path) -> tuple[Path, MediaProbe | None]:
+        try:
+            return path, _probe_file(path, keyframes=keyframes, cached=cached.get(resolved[path]))
+        except MediaProbeError:
+            logger.warning("media probe failed", extra={"path": str(path)}, exc_info=True)
+            return path, None
+
+    workers = max(1, min(int(settings.MEDIA_PROBE_MAX_WORKERS), len(pending)))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="media-probe") as pool:
+            probed = list(pool.map(_work, pending))
+    else:
+        probed = [_work(path) for path in pending]
+    index.store(
+        (resolved[path], hashes.get(resolved[path]), probe)
+        for path, probe in probed
+        if probe is not None
+    )
+    fresh = dict(probed)
+    for path, key in resolved.items():
+        results[path] = fresh[path] if path in fresh else cached.get(key)
+    return results
+
+
+def probe_media(
+    path: str | Path,
+    *,
+    keyframes: bool = False,
+    content_hash: str | None = None,
+) -> MediaProbe:
+    """Return indexed metadata for ``path``, probing it at most once per version."""
+
+    resolved = Path(path).expanduser().resolve()
+    if not resolved.is_file():
+        raise MediaProbeError(f"media file not found: {resolved}")
+    result = probe_media_batch(
+        [resolved],
+        keyframes=keyframes,
+        content_hashes={resolved: content_hash} if content_hash else None,
+    ).get(resolved)
+    if result is None:
+        raise MediaProbeError(f"ffprobe could not read {resolved}")
+    return result
+
+
+__all__ = [
+    "MediaProbe",
+    "MediaProbeError",
+    "MediaProbeIndex",
+    "get_media_probe_index",
+    "probe_media",
+    "probe_media_batch",
+]
@@ -6,10 +6,12 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 import logging
 import re
+import threading
+import time
 from typing import Iterable, Mapping, Sequence
 
 from croniter import croniter
-from sqlalchemy import or_, select
+from sqlalchemy import case, event, func, or_, select
 from sqlalchemy.orm import Session
 
 from app.data.models.providers import (
@@ -90,115 +92,182 @@ def _compile_product_patterns(patterns: Iterable[str]) -> list[tuple[str, re.Pat
     return compiled
 
 
-def _matches_scope(policy: PlatformPolicy, candidate: CandidateMapping) -> bool:
-    scopes = policy.business_scopes_json or {}
-    include_scopes = scopes.get("include") or {}
-    exclude_scopes = scopes.get("exclude") or {}
+@dataclass(frozen=True, slots=True)
+class _ProductMatcher:
+    """All product ID patterns of one policy folded into one test."""
+
+    prefixes: tuple[str, ...]
+    regexes: tuple[re.Pattern[str], ...]
+
+    @classmethod
+    def build(cls, patterns: Iterable[str]) -> "_ProductMatcher":
+        prefixes: list[str] = []
+        regexes: list[re.Pattern[str]] = []
+        for raw, regex in _compile_product_patterns(patterns):
+            if regex is None:
+                prefixes.append(raw)
+            else:
+                regexes.append(regex)
+        if len(regexes) > 1:
+            try:
+                regexes = [re.compile("|".join(f"(?:{regex.pattern})" for regex in regexes))]
+            except re.error:
+                # Inline global flags cannot be combined; keep them separate.
+                pass
+        return cls(prefixes=tuple(prefixes), regexes=tuple(regexes))
 
-    if include_scopes or exclude_scopes:
-        include_sets = {
-            key: {str(item).strip() for item in values if str(item).strip()}
-            for key, values in include_scopes.items()
-        }
-        exclude_sets = {
-            key: {str(item).strip() for item in values if str(item).strip()}
-            for key, values in exclude_scopes.items()
-        }
-        for key, include_values in include_sets.items():
-            if key in exclude_sets:
-                exclude_sets[key] = exclude_sets[key] - include_values
+    def matches(self, product_id: str) -> bool:
+        if self.prefixes and product_id.startswith(self.prefixes):
+            return True
+        return any(regex.search(product_id) for regex in self.regexes)
 
-        for scope_key, candidate_field in _SCOPE_FIELD_MAP.items():
-            include_values = include_sets.get(scope_key) or set()
-            exclude_values = exclude_sets.get(scope_key) or set()
-            value = candidate.get(candidate_field)
-            normalized = str(value).strip() if value is not None else None
-            if include_values:
-                if not normalized or normalized not in include_values:
-                    return False
-            if normalized and normalized in exclude_values:
-                return False
-        return True
 
-    # Fallback to legacy scope columns when business_scopes_json is empty.
-    def _contains(values: list[str] | None, key: str, *, ignore_case: bool = False) -> bool:
-        if not values:
+def _id_set(values: Iterable[object] | None, *, upper: bool = False) -> frozenset[str] | None:
+    if not values:
+        return None
+    items = {str(value).strip() for value in values if value is not None}
+    return frozenset(item.upper() for item in items) if upper else frozenset(items)
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledPolicy:
+    """Immutable copy of one ``PlatformPolicy`` row with its matchers built.
+
+    The snapshot outlives the session that loaded it, so it never holds ORM
+    instances.  Limit attributes keep the model's names for ``_merge_limits``.
+    """
+
+    id: int
+    mode: str
+    enforcement_mode: PolicyEnforcementMode | None
+    window_cron: str | None
+    rate_limit_rps: int | None
+    rate_burst: int | None
+    cooldown_seconds: int | None
+    max_concurrency: int | None
+    max_entities_per_run: int | None
+    domain_any: bool
+    domain_exact: frozenset[str]
+    domain_suffixes: tuple[str, ...]
+    business_scoped: bool
+    business_fields: tuple[tuple[str, frozenset[str], frozenset[str]], ...]
+    legacy_fields: tuple[tuple[str, frozenset[str], bool], ...]
+    product_matcher: _ProductMatcher | None
+
+    @classmethod
+    def from_model(cls, policy: PlatformPolicy) -> "_CompiledPolicy":
+        try:
+            enforcement_mode: PolicyEnforcementMode | None = PolicyEnforcementMode(policy.enforcement_mode)
+        except ValueError:
+            logger.warning("Unknown enforcement mode %s on policy %s", policy.enforcement_mode, policy.id)
+            enforcement_mode = None
+
+        domains = policy.domains_json or []
+        exact: set[str] = set()
+        suffixes: list[str] = []
+        for raw in domains:
+            if raw is None:
+                continue
+            domain = str(raw).strip().lower()
+            if not domain:
+                continue
+            if domain.startswith("*."):
+                suffix = domain[2:]
+                if suffix:
+                    exact.add(suffix)
+                    suffixes.append(f".{suffix}")
+            else:
+                exact.add(domain)
+
+        scopes = policy.business_scopes_json or {}
+        include_scopes = scopes.get("include") or {}
+        exclude_scopes = scopes.get("exclude") or {}
+        business_fields: list[tuple[str, frozenset[str], frozenset[str]]] = []
+        if include_scopes or exclude_scopes:
+            for scope_key, candidate_field in _SCOPE_FIELD_MAP.items():
+                include_values = frozenset(
+                    str(item).strip() for item in include_scopes.get(scope_key) or () if str(item).strip()
+                )
+                exclude_values = frozenset(
+                    str(item).strip() for item in exclude_scopes.get(scope_key) or () if str(item).strip()
+                ) - include_values
+                if include_values or exclude_values:
+                    business_fields.append((candidate_field, include_values, exclude_values))
+
+        legacy_fields: list[tuple[str, frozenset[str], bool]] = []
+        for candidate_field, values, upper in (
+            ("bc_id", policy.scope_bc_ids_json, False),
+            ("advertiser_id", policy.scope_advertiser_ids_json, False),
+            ("store_id", policy.scope_store_ids_json, False),
+            ("region_code", policy.scope_region_codes_json, True),
+        ):
+            allowed = _id_set(values, upper=upper)
+            if allowed is not None:
+                legacy_fields.append((candidate_field, allowed, upper))
+
+        return cls(
+            id=int(policy.id),
+            mode=policy.mode,
+            enforcement_mode=enforcement_mode,
+            window_cron=policy.window_cron,
+            rate_limit_rps=policy.rate_limit_rps,
+            rate_burst=policy.rate_burst,
+            cooldown_seconds=policy.cooldown_seconds,
+            max_concurrency=policy.max_concurrency,
+            max_entities_per_run=policy.max_entities_per_run,
+            domain_any=not domains,
+            domain_exact=frozenset(exact),
+            domain_suffixes=tuple(suffixes),
+            business_scoped=bool(include_scopes or exclude_scopes),
+            business_fields=tuple(business_fields),
+            legacy_fields=tuple(legacy_fields),
+            product_matcher=(
+                _ProductMatcher.build(policy.scope_product_id_patterns_json)
+                if policy.scope_product_id_patterns_json
+                else None
+            ),
+        )
+
+    def matches_domain(self, candidate: CandidateMapping) -> bool:
+        if self.domain_any:
             return True
-        value = candidate.get(key)
+        value = candidate.get("domain") or candidate.get("host")
         if value is None:
             return False
-        target = value.strip()
-        if ignore_case:
-            target = target.upper()
-            normalized = {str(v).strip().upper() for v in values if v is not None}
-        else:
-            normalized = {str(v).strip() for v in values if v is not None}
-        return target in normalized
-
-    if not _contains(policy.scope_bc_ids_json, "bc_id"):
-        return False
-    if not _contains(policy.scope_advertiser_ids_json, "advertiser_id"):
-        return False
-    if not _contains(policy.scope_store_ids_json, "store_id"):
-        return False
-    if not _contains(policy.scope_region_codes_json, "region_code", ignore_case=True):
-        return False
-
-    if policy.scope_product_id_patterns_json:
-        product_id = candidate.get("product_id")
-        if product_id is None:
-            return False
-        product_id = str(product_id)
-        compiled = getattr(policy, "__compiled_product_patterns", None)
-        if compiled is None:
-            compiled = _compile_product_patterns(policy.scope_product_id_patterns_json)
-            setattr(policy, "__compiled_product_patterns", compiled)
-        matched = False
-        for raw, regex in compiled:
-            if regex is not None:
-                if regex.search(product_id):
-                    matched = True
-                    break
-            else:
-                if product_id.startswith(raw):
-                    matched = True
-                    break
-        if not matched:
+        normalized = str(value).strip().lower()
+        if not normalized:
             return False
+        return normalized in self.domain_exact or (
+            bool(self.domain_suffixes) and normalized.endswith(self.domain_suffixes)
+        )
 
-    return True
-
+    def matches_scope(self, candidate: CandidateMapping) -> bool:
+        if self.business_scoped:
+            for candidate_field, include_values, exclude_values in self.business_fields:
+                value = candidate.get(candidate_field)
+                normalized = str(value).strip() if value is not None else None
+                if include_values and (not normalized or normalized not in include_values):
+                    return False
+                if normalized and normalized in exclude_values:
+                    return False
+            return True
 
-def _matches_domain(policy: PlatformPolicy, candidate: CandidateMapping) -> bool:
-    domains = policy.domains_json or []
-    if not domains:
+        # Fallback to legacy scope columns when business_scopes_json is empty.
+        for candidate_field, allowed, upper in self.legacy_fields:
+            value = candidate.get(candidate_field)
+            if value is None:
+                return False
+            target = str(value).strip()
+            if (target.upper() if upper else target) not in allowed:
+                return False
+        if self.product_matcher is not None:
+            product_id = candidate.get("product_id")
+            if product_id is None or not self.product_matcher.matches(str(product_id)):
+                return False
         return True
 
-    value = candidate.get("domain") or candidate.get("host")
-    if value is None:
-        return False
-    normalized = str(value).strip().lower()
-    if not normalized:
-        return False
 
-    for raw in domains:
-        if raw is None:
-            continue
-        candidate_domain = str(raw).strip().lower()
-        if not candidate_domain:
-            continue
-        if candidate_domain.startswith("*."):
-            suffix = candidate_domain[2:]
-            if not suffix:
-                continue
-            if normalized == suffix or normalized.endswith(f".{suffix}"):
-                return True
-        elif normalized == candidate_domain:
-            return True
-    return False
-
-
-def _merge_limits(policies: Iterable[PlatformPolicy]) -> PolicyLimits:
+def _merge_limits(policies: Iterable[PlatformPolicy | _CompiledPolicy]) -> PolicyLimits:
     rps_values: list[int] = []
     burst_values: list[int] = []
     cooldown_values: list[int] = []
@@ -230,12 +299,183 @@ def _merge_limits(policies: Iterable[PlatformPolicy]) -> PolicyLimits:
     )
 
 
+@dataclass(frozen=True, slots=True)
+class PolicySnapshot:
+    """Compiled enabled policies of one provider/workspace at one version."""
+
+    provider_key: str
+    workspace_id: int | None
+    version: tuple[object, ...]
+    policies: tuple[_CompiledPolicy, ...]
+    active: tuple[_CompiledPolicy, ...]
+    enforce: tuple[_CompiledPolicy, ...]
+    dryrun: tuple[_CompiledPolicy, ...]
+    has_enforce_whitelist: bool
+    has_dryrun_whitelist: bool
+    deny_limits: PolicyLimits
+    allow_limits: PolicyLimits
+    allow_policy_ids: tuple[int, ...]
+
+    @classmethod
+    def build(
+        cls,
+        provider_key: str,
+        workspace_id: int | None,
+        version: tuple[object, ...],
+        rows: Sequence[PlatformPolicy],
+    ) -> "PolicySnapshot":
+        policies = tuple(_CompiledPolicy.from_model(row) for row in rows)
+        active = tuple(
+            policy
+            for policy in policies
+            if policy.enforcement_mode is not None and policy.enforcement_mode is not PolicyEnforcementMode.OFF
+        )
+        enforce = tuple(p for p in active if p.enforcement_mode is PolicyEnforcementMode.ENFORCE)
+        dryrun = tuple(p for p in active if p.enforcement_mode is not PolicyEnforcementMode.ENFORCE)
+        allow_source = enforce if enforce else dryrun or policies
+        return cls(
+            provider_key=provider_key,
+            workspace_id=workspace_id,
+            version=version,
+            policies=policies,
+            active=active,
+            enforce=enforce,
+            dryrun=dryrun,
+            has_enforce_whitelist=any(p.mode == PolicyMode.WHITELIST.value for p in enforce),
+            has_dryrun_whitelist=any(p.mode == PolicyMode.WHITELIST.value for p in dryrun),
+            deny_limits=_merge_limits(enforce or policies),
+            allow_limits=_merge_limits(allow_source),
+            allow_policy_ids=tuple(p.id for p in allow_source),
+        )
+
+
+# Snapshots are shared by every session of the process.  A snapshot is reused
+# while both the local generation (bumped whenever this process flushes a
+# policy change) and the table version stamp read from the database (which
+# catches changes committed by other processes) are unchanged.  The stamp is
+# re-read at most every VERSION_STAMP_TTL_SECONDS, so another process's edit
+# can take that long to show up here; this process's own edits bump the
+# generation and are seen at once.
+VERSION_STAMP_TTL_SECONDS = 5.0
+_SNAPSHOT_CACHE: dict[tuple[str, int | None], PolicySnapshot] = {}
+_SNAPSHOT_CHECKED_AT: dict[tuple[str, int | None], float] = {}
+_SNAPSHOT_LOCK = threading.Lock()
+_generation = 0
+_POLICY_CHANGES_KEY = "gmv_policy_engine_pending_changes"
+
+
+def invalidate_policy_cache() -> None:
+    """Drop every compiled snapshot held by this process."""
+
+    global _generation
+    with _SNAPSHOT_LOCK:
+        _generation += 1
+        _SNAPSHOT_CACHE.clear()
+        _SNAPSHOT_CHECKED_AT.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_policy_changes(session: Session, flush_context) -> None:  # noqa: ARG001
+    if any(
+        isinstance(instance, PlatformPolicy)
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info[_POLICY_CHANGES_KEY] = True
+        invalidate_policy_cache()
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _settle_policy_changes(session: Session, *args) -> None:  # noqa: ARG001
+    if session.info.pop(_POLICY_CHANGES_KEY, False):
+        invalidate_policy_cache()
+
+
+def _window_violations(policies: Iterable[_CompiledPolicy], now_utc: datetime, *, warn: bool) -> list[int]:
+    violations: list[int] = []
+    for policy in policies:
+        if not policy.window_cron:
+            continue
+        expr = policy.window_cron.strip()
+        try:
+            if not croniter.match(expr, now_utc):
+                violations.append(policy.id)
+        except (ValueError, KeyError):
+            if warn:
+                logger.warning("Invalid cron expression on policy %s", policy.id)
+            violations.append(policy.id)
+    return violations
+
+
 class PolicyEngine:
     """Evaluate platform policies deterministically."""
 
     def __init__(self, db: Session):
         self._db = db
 
+    def _scope_filter(self, provider_key: str, workspace_id: int | None) -> tuple:
+        return (
+            PlatformPolicy.provider_key == provider_key,
+            or_(
+                PlatformPolicy.workspace_id.is_(None),
+                PlatformPolicy.workspace_id == workspace_id,
+            ),
+        )
+
+    def _version_stamp(self, provider_key: str, workspace_id: int | None) -> tuple[object, ...]:
+        row = self._db.execute(
+            select(
+                func.count(PlatformPolicy.id),
+                func.max(PlatformPolicy.id),
+                func.max(PlatformPolicy.updated_at),
+                func.sum(case((PlatformPolicy.is_enabled.is_(True), PlatformPolicy.id), else_=0)),
+            ).where(*self._scope_filter(provider_key, workspace_id))
+        ).one()
+        return tuple(str(value) if value is not None else None for value in row)
+
+    def snapshot(self, workspace_id: int | None, provider_key: str) -> PolicySnapshot:
+        """Return the compiled policies for a provider/workspace, reusing the cache."""
+
+        provider = provider_key.strip().lower()
+        workspace = int(workspace_id) if workspace_id is not None else None
+        key = (provider, workspace)
+        with _SNAPSHOT_LOCK:
+            generation = _generation
+            cached = _SNAPSHOT_CACHE.get(key)
+            checked_at = _SNAPSHOT_CHECKED_AT.get(key)
+        # Uncommitted policy edits of this session must not leak to others.
+        shareable = not self._db.info.get(_POLICY_CHANGES_KEY)
+        now = time.monotonic()
+        if (
+            shareable
+            and cached is not None
+            and checked_at is not None
+            and cached.version[0] == generation
+            and now - checked_at < VERSION_STAMP_TTL_SECONDS
+        ):
+            return cached
+
+        version = (generation, *self._version_stamp(provider, workspace))
+        if cached is not None and cached.version == version:
+            if shareable:
+                with _SNAPSHOT_LOCK:
+                    if _generation == generation:
+                        _SNAPSHOT_CHECKED_AT[key] = now
+            return cached
+
+        stmt = (
+            select(PlatformPolicy)
+            .where(*self._scope_filter(provider, workspace), PlatformPolicy.is_enabled.is_(True))
+            .order_by(PlatformPolicy.workspace_id.isnot(None).desc(), PlatformPolicy.id)
+        )
+        snapshot = PolicySnapshot.build(provider, workspace, version, self._db.scalars(stmt).all())
+        if shareable:
+            with _SNAPSHOT_LOCK:
+                if _generation == generation:
+                    _SNAPSHOT_CACHE[key] = snapshot
+                    _SNAPSHOT_CHECKED_AT[key] = now
+        return snapshot
+
     def evaluate_policy(
         self,
         workspace_id: int | None,
@@ -248,216 +488,185 @@ class PolicyEngine:
         if not normalized_candidates:
             normalized_candidates = [{}]
 
-        stmt = (
-            select(PlatformPolicy)
-            .where(
-                PlatformPolicy.provider_key == provider_key.strip().lower(),
-                PlatformPolicy.is_enabled.is_(True),
-                or_(
-                    PlatformPolicy.workspace_id.is_(None),
-                    PlatformPolicy.workspace_id == (int(workspace_id) if workspace_id is not None else None),
-                ),
-            )
-            .order_by(PlatformPolicy.workspace_id.isnot(None).desc(), PlatformPolicy.id)
+        snapshot = self.snapshot(workspace_id, provider_key)
+        decision = _decide(
+            snapshot,
+            normalized_candidates,
+            enforce_windows=_window_violations(snapshot.enforce, now_utc, warn=True),
+            dryrun_windows=_window_violations(snapshot.dryrun, now_utc, warn=False),
         )
-        policies = self._db.scalars(stmt).all()
-
-        enforce_policies: list[PlatformPolicy] = []
-        dryrun_policies: list[PlatformPolicy] = []
-
-        trace: list[dict[str, object]] = []
-
-        enforce_blacklist_hits: list[int] = []
-        dryrun_blacklist_hits: list[int] = []
-        enforce_whitelist_hits = [False] * len(normalized_candidates)
-        dryrun_whitelist_hits = [False] * len(normalized_candidates)
-
-        deny_reason: str | None = None
-        dryrun_reason: str | None = None
-
-        def _matches_policy(policy: PlatformPolicy, candidate: CandidateMapping) -> tuple[bool, bool]:
-            domain_match = _matches_domain(policy, candidate)
-            scope_match = _matches_scope(policy, candidate)
-            return domain_match, scope_match
-
-        for policy in policies:
-            try:
-                target_mode = PolicyEnforcementMode(policy.enforcement_mode)
-            except ValueError:
-                logger.warning("Unknown enforcement mode %s on policy %s", policy.enforcement_mode, policy.id)
-                continue
-
-            if target_mode is PolicyEnforcementMode.OFF:
-                continue
-
-            collection = enforce_policies if target_mode is PolicyEnforcementMode.ENFORCE else dryrun_policies
-            collection.append(policy)
-
-            entry = {
-                "policy_id": int(policy.id),
-                "mode": policy.mode,
-                "enforcement_mode": target_mode.value,
-                "matched": False,
-                "domain_match": False,
-                "scope_match": False,
-            }
-
-            for idx, candidate in enumerate(normalized_candidates):
-                domain_match, scope_match = _matches_policy(policy, candidate)
-                if domain_match:
-                    entry["domain_match"] = True
-                if scope_match:
-                    entry["scope_match"] = True
-                if not (domain_match and scope_match):
-                    continue
-                if policy.mode == PolicyMode.BLACKLIST.value:
-                    if target_mode is PolicyEnforcementMode.ENFORCE:
-                        enforce_blacklist_hits.append(int(policy.id))
-                        deny_reason = "Matched blacklist policy"
-                    else:
-                        dryrun_blacklist_hits.append(int(policy.id))
-                        dryrun_reason = "Matched blacklist policy in dryrun mode"
-                    entry["matched"] = True
-                else:
-                    if target_mode is PolicyEnforcementMode.ENFORCE:
-                        enforce_whitelist_hits[idx] = True
-                    else:
-                        dryrun_whitelist_hits[idx] = True
-                    entry["matched"] = True
-            trace.append(entry)
-
-        if enforce_blacklist_hits:
-            decision_mode = PolicyEnforcementMode.ENFORCE
-            limits = _merge_limits(enforce_policies or policies)
-            logger.info(
-                "policy.decision",
-                extra={
-                    "workspace_id": workspace_id,
-                    "provider": provider_key,
-                    "resource_type": resource_type,
-                    "decision": "deny",
-                    "reason": deny_reason,
-                    "policy_ids": enforce_blacklist_hits,
-                },
-            )
-            return PolicyDecision(
-                allowed=False,
-                enforcement_mode=decision_mode,
-                reason=deny_reason,
-                matched_policy_ids=tuple(enforce_blacklist_hits),
-                observed_policy_ids=tuple(dryrun_blacklist_hits),
-                limits=limits,
-                trace=tuple(trace),
-            )
-
-        has_enforce_whitelist = any(
-            p.mode == PolicyMode.WHITELIST.value and p in enforce_policies for p in policies
-        )
-        if has_enforce_whitelist and not all(enforce_whitelist_hits):
-            decision_mode = PolicyEnforcementMode.ENFORCE
-            limits = _merge_limits(enforce_policies or policies)
-            deny_reason = "Outside enforce whitelist"
-            logger.info(
-                "policy.decision",
-                extra={
-                    "workspace_id": workspace_id,
-                    "provider": provider_key,
-                    "resource_type": resource_type,
-                    "decision": "deny",
-                    "reason": deny_reason,
-                },
-            )
-            return PolicyDecision(
-                allowed=False,
-                enforcement_mode=decision_mode,
-                reason=deny_reason,
-                matched_policy_ids=tuple(int(p.id) for p in policies if p in enforce_policies),
-                observed_policy_ids=tuple(dryrun_blacklist_hits),
-                limits=limits,
-                trace=tuple(trace),
-            )
-
-        window_violations: list[int] = []
-        for policy in enforce_policies:
-            if not policy.window_cron:
-                continue
-            expr = policy.window_cron.strip()
-            try:
-                if not croniter.match(expr, now_utc):
-                    window_violations.append(int(policy.id))
-            except (ValueError, KeyError):
-                logger.warning("Invalid cron expression on policy %s", policy.id)
-                window_violations.append(int(policy.id))
-
-        if window_violations:
-            limits = _merge_limits(enforce_policies or policies)
-            reason = "Outside enforce window"
-            logger.info(
-                "policy.decision",
-                extra={
-                    "workspace_id": workspace_id,
-                    "provider": provider_key,
-                    "resource_type": resource_type,
-                    "decision": "deny",
-                    "reason": reason,
-                    "policy_ids": window_violations,
-                },
-            )
-            return PolicyDecision(
-                allowed=False,
-                enforcement_mode=PolicyEnforcementMode.ENFORCE,
-                reason=reason,
-                matched_policy_ids=tuple(window_violations),
-                observed_policy_ids=tuple(dryrun_blacklist_hits),
-                limits=limits,
-                trace=tuple(trace),
+        extra: dict[str, object] = {
+            "workspace_id": workspace_id,
+            "provider": provider_key,
+            "resource_type": resource_type,
+            "decision": (
+                "deny"
+                if not decision.allowed
+                else "allow" if decision.enforcement_mode == PolicyEnforcementMode.ENFORCE else "dryrun"
+            ),
+            "reason": decision.reason,
+        }
+        if decision.allowed:
+            extra["policy_ids"] = list(decision.matched_policy_ids)
+        elif decision.reason != "Outside enforce whitelist":
+            extra["policy_ids"] = list(decision.matched_policy_ids)
+        logger.info("policy.decision", extra=extra)
+        return decision
+
+    def evaluate_batch(
+        self,
+        workspace_id: int | None,
+        provider_key: str,
+        resource_type: str,
+        candidates: Sequence[Mapping[str, str | None]],
+        now_utc: datetime,
+    ) -> list[PolicyDecision]:
+        """Decide every candidate on its own, in one pass over one snapshot.
+
+        ``result[i]`` equals ``evaluate_policy`` called with ``candidates[i]``
+        alone, but the policies are loaded, compiled and checked against the
+        cron windows once for the whole batch, and one summary line is logged.
+        """
+
+        snapshot = self.snapshot(workspace_id, provider_key)
+        enforce_windows = _window_violations(snapshot.enforce, now_utc, warn=True)
+        dryrun_windows = _window_violations(snapshot.dryrun, now_utc, warn=False)
+        decisions = [
+            _decide(
+                snapshot,
+                _normalize_candidates(candidate),
+                enforce_windows=enforce_windows,
+                dryrun_windows=dryrun_windows,
             )
-
-        decision_mode = PolicyEnforcementMode.ENFORCE
-        reason = None
-
-        dryrun_window_violations: list[int] = []
-        for policy in dryrun_policies:
-            if not policy.window_cron:
-                continue
-            expr = policy.window_cron.strip()
-            try:
-                if not croniter.match(expr, now_utc):
-                    dryrun_window_violations.append(int(policy.id))
-            except (ValueError, KeyError):
-                dryrun_window_violations.append(int(policy.id))
-
-        if dryrun_blacklist_hits or (
-            any(p.mode == PolicyMode.WHITELIST.value for p in dryrun_policies)
-            and not all(a or b for a, b in zip(enforce_whitelist_hits, dryrun_whitelist_hits))
-        ) or dryrun_window_violations:
-            decision_mode = PolicyEnforcementMode.DRYRUN
-            reason = dryrun_reason or "Dryrun policy restriction"
-
-        limits_source = enforce_policies if enforce_policies else dryrun_policies or policies
-        limits = _merge_limits(limits_source)
-
+            for candidate in candidates
+        ]
+        denied = sum(1 for decision in decisions if not decision.allowed)
         logger.info(
-            "policy.decision",
+            "policy.batch_decision",
             extra={
                 "workspace_id": workspace_id,
                 "provider": provider_key,
                 "resource_type": resource_type,
-                "decision": "allow" if decision_mode == PolicyEnforcementMode.ENFORCE else "dryrun",
-                "policy_ids": [int(p.id) for p in limits_source],
-                "reason": reason,
+                "candidates": len(decisions),
+                "denied": denied,
+                "dryrun": sum(
+                    1
+                    for decision in decisions
+                    if decision.allowed and decision.enforcement_mode != PolicyEnforcementMode.ENFORCE
+                ),
             },
         )
+        return decisions
+
+
+def _decide(
+    snapshot: PolicySnapshot,
+    candidates: Sequence[CandidateMapping],
+    *,
+    enforce_windows: list[int],
+    dryrun_windows: list[int],
+) -> PolicyDecision:
+    trace: list[dict[str, object]] = []
+
+    enforce_blacklist_hits: list[int] = []
+    dryrun_blacklist_hits: list[int] = []
+    enforce_whitelist_hits = [False] * len(candidates)
+    dryrun_whitelist_hits = [False] * len(candidates)
+
+    deny_reason: str | None = None
+    dryrun_reason: str | None = None
+
+    for policy in snapshot.active:
+        enforced = policy.enforcement_mode is PolicyEnforcementMode.ENFORCE
+        entry = {
+            "policy_id": policy.id,
+            "mode": policy.mode,
+            "enforcement_mode": policy.enforcement_mode.value,
+            "matched": False,
+            "domain_match": False,
+            "scope_match": False,
+        }
+
+        for idx, candidate in enumerate(candidates):
+            domain_match = policy.matches_domain(candidate)
+            scope_match = policy.matches_scope(candidate)
+            if domain_match:
+                entry["domain_match"] = True
+            if scope_match:
+                entry["scope_match"] = True
+            if not (domain_match and scope_match):
+                continue
+            if policy.mode == PolicyMode.BLACKLIST.value:
+                if enforced:
+                    enforce_blacklist_hits.append(policy.id)
+                    deny_reason = "Matched blacklist policy"
+                else:
+                    dryrun_blacklist_hits.append(policy.id)
+                    dryrun_reason = "Matched blacklist policy in dryrun mode"
+            elif enforced:
+                enforce_whitelist_hits[idx] = True
+            else:
+                dryrun_whitelist_hits[idx] = True
+            entry["matched"] = True
+        trace.append(entry)
 
+    if enforce_blacklist_hits:
         return PolicyDecision(
-            allowed=True,
-            enforcement_mode=decision_mode,
-            reason=reason,
-            matched_policy_ids=tuple(int(p.id) for p in limits_source),
-            observed_policy_ids=tuple(dryrun_blacklist_hits + dryrun_window_violations),
-            limits=limits,
+            allowed=False,
+            enforcement_mode=PolicyEnforcementMode.ENFORCE,
+            reason=deny_reason,
+            matched_policy_ids=tuple(enforce_blacklist_hits),
+            observed_policy_ids=tuple(dryrun_blacklist_hits),
+            limits=snapshot.deny_limits,
             trace=tuple(trace),
         )
 
+    if snapshot.has_enforce_whitelist and not all(enforce_whitelist_hits):
+        return PolicyDecision(
+            allowed=False,
+            enforcement_mode=PolicyEnforcementMode.ENFORCE,
+            reason="Outside enforce whitelist",
+            matched_policy_ids=tuple(p.id for p in snapshot.enforce),
+            observed_policy_ids=tuple(dryrun_blacklist_hits),
+            limits=snapshot.deny_limits,
+            trace=tuple(trace),
+        )
+
+    if enforce_windows:
+        return PolicyDecision(
+            allowed=False,
+            enforcement_mode=PolicyEnforcementMode.ENFORCE,
+            reason="Outside enforce window",
+            matched_policy_ids=tuple(enforce_windows),
+            observed_policy_ids=tuple(dryrun_blacklist_hits),
+            limits=snapshot.deny_limits,
+            trace=tuple(trace),
+        )
+
+    decision_mode = PolicyEnforcementMode.ENFORCE
+    reason = None
+    if dryrun_blacklist_hits or (
+        snapshot.has_dryrun_whitelist
+        and not all(a or b for a, b in zip(enforce_whitelist_hits, dryrun_whitelist_hits))
+    ) or dryrun_windows:
+        decision_mode = PolicyEnforcementMode.DRYRUN
+        reason = dryrun_reason or "Dryrun policy restriction"
+
+    return PolicyDecision(
+        allowed=True,
+        enforcement_mode=decision_mode,
+        reason=reason,
+        matched_policy_ids=snapshot.allow_policy_ids,
+        observed_policy_ids=tuple(dryrun_blacklist_hits + dryrun_windows),
+        limits=snapshot.allow_limits,
+        trace=tuple(trace),
+    )
+
 
-__all__ = ["PolicyEngine", "PolicyDecision", "PolicyLimits"]
+__all__ = [
+    "PolicyEngine",
+    "PolicyDecision",
+    "PolicyLimits",
+    "PolicySnapshot",
+    "invalidate_policy_cache",
+]
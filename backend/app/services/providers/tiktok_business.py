@@ -4,12 +4,13 @@ from __future__ import annotations
 import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Mapping, Optional, Literal
+from typing import Any, Dict, List, Mapping, Optional, Literal, Tuple
 
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.data.models.oauth_ttb import OAuthAccountTTB
+from app.data.models.providers import PolicyEnforcementMode
 from app.services.ttb_client_factory import build_ttb_client
 from app.services.policy_engine import PolicyEngine, PolicyLimits
 from app.services.ttb_api import TTBApiClient
@@ -123,7 +124,13 @@ class TiktokBusinessProvider:
 
         limits = self._policy_limits(db, workspace_id=workspace_id, auth_id=auth_id)
         client = self._build_client(db, auth_id=auth_id, limits=limits)
-        service = TTBSyncService(db, client, workspace_id=workspace_id, auth_id=auth_id)
+        service = TTBSyncService(
+            db,
+            client,
+            workspace_id=workspace_id,
+            auth_id=auth_id,
+            pair_filter=self._policy_pair_filter(db, workspace_id=workspace_id, auth_id=auth_id),
+        )
 
         phases: List[PhaseResult] = []
         meta_summary: Dict[str, Dict[str, int]] | None = None
@@ -193,6 +200,30 @@ class TiktokBusinessProvider:
             raise PermissionError(decision.reason or "policy denied")
         return decision.limits
 
+    def _policy_pair_filter(self, db: Session, *, workspace_id: int, auth_id: int):
+        """按 (advertiser_id, store_id) 组合批量判定策略，去掉被 enforce 拒绝的组合。"""
+        engine = PolicyEngine(db)
+
+        def _allowed(pairs: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+            decisions = engine.evaluate_batch(
+                workspace_id=workspace_id,
+                provider_key=self.provider_id,
+                resource_type="sync",
+                candidates=[
+                    {"auth_id": str(auth_id), "advertiser_id": adv_id, "store_id": store_id}
+                    for adv_id, store_id in pairs
+                ],
+                now_utc=datetime.now(timezone.utc),
+            )
+            enforce = PolicyEnforcementMode.ENFORCE
+            return [
+                pair
+                for pair, decision in zip(pairs, decisions)
+                if decision.allowed or decision.enforcement_mode is not enforce
+            ]
+
+        return _allowed
+
     def _build_client(self, db: Session, *, auth_id: int, limits: PolicyLimits) -> TTBApiClient:
         """
         为当前 auth_id 构造 TTBApiClient：
@@ -4,13 +4,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import threading
 import time
+import weakref
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Callable, Optional, Sequence
 
 from app.core.config import settings
-from app.services.redis_client import get_redis_sync  # 统一从这里拿同步客户端
+from app.services.redis_client import get_redis, get_redis_sync  # 统一从这里拿客户端
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +25,25 @@ else
 end
 """
 
-_REFRESH_SCRIPT = b"""
-if redis.call("GET", KEYS[1]) == ARGV[1] then
-    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
-else
-    return 0
+# 批量续期：KEYS[i] 对应 ARGV[2i-1]=owner, ARGV[2i]=ttl_ms，一次往返续期本进程持有的全部锁
+_REFRESH_MANY_SCRIPT = b"""
+local renewed = {}
+for index, key in ipairs(KEYS) do
+    if redis.call("GET", key) == ARGV[index * 2 - 1] then
+        renewed[index] = redis.call("PEXPIRE", key, ARGV[index * 2])
+    else
+        renewed[index] = 0
+    end
 end
+return renewed
+"""
+
+# 加锁同时递增 fencing 计数器（计数器不过期，保证单调）
+_ACQUIRE_FENCED_SCRIPT = b"""
+if redis.call("SET", KEYS[1], ARGV[1], "NX", "PX", ARGV[2]) then
+    return redis.call("INCR", KEYS[2])
+end
+return 0
 """
 
 def _b(s: str | bytes) -> bytes:
@@ -62,13 +77,252 @@ def _adapt_client(client):
 
     return _SyncAdapter(client)
 
+
+def _fence_key(key: str) -> str:
+    return f"{key}:fence"
+
+
+def _ttl_ms(ttl_seconds: int) -> int:
+    return max(int(ttl_seconds * 1000), 1)
+
+
+def _normalize_heartbeat(key: str, ttl_seconds: int, heartbeat_interval: int) -> tuple[int, int]:
+    ttl_seconds = max(int(ttl_seconds), 1)
+    hb = max(int(heartbeat_interval), 0)
+    if hb and hb >= ttl_seconds:
+        hb = max(ttl_seconds // 2, 1)
+        if hb >= ttl_seconds:
+            hb = max(ttl_seconds - 1, 1)
+        message = "redis lock heartbeat interval >= ttl; adjusted"
+        extra = {"key": key, "ttl_seconds": ttl_seconds, "effective_heartbeat": hb}
+        logger.warning(message, extra=extra)
+        logging.getLogger().warning(message, extra=extra)
+    return ttl_seconds, hb
+
+
+def _refresh_many_args(leases: Sequence[Any]) -> list[Any]:
+    keys = [_b(lease.key) for lease in leases]
+    argv: list[Any] = []
+    for lease in leases:
+        argv.extend((_b(lease.owner_token), _ttl_ms(lease.ttl_seconds)))
+    return [_REFRESH_MANY_SCRIPT, len(keys), *keys, *argv]
+
+
+def _renewed_flags(result: Any, count: int) -> list[bool]:
+    """Per-lease outcome of one batched refresh (scalar replies apply to all)."""
+
+    if isinstance(result, (list, tuple)):
+        flags = [bool(item) for item in result]
+        return (flags + [False] * count)[:count]
+    return [bool(result)] * count
+
+
+def _due_batch(leases: dict[int, Any], due: dict[int, float], now: float) -> list[Any]:
+    """Leases to renew in this tick, or ``[]`` when none is due yet.
+
+    Renewing early only extends a TTL, so once one lease is due every lease
+    that would come due before the next tick rides along in the same EVAL;
+    their schedules then share one tick instead of drifting apart.
+    """
+
+    ready = [lease_id for lease_id, at in due.items() if at <= now]
+    if not ready:
+        return []
+    horizon = now + min(leases[lease_id].heartbeat_interval for lease_id in ready)
+    return [leases[lease_id] for lease_id, at in due.items() if at <= horizon]
+
+
+def _group_by_client(leases: Sequence[Any]) -> list[list[Any]]:
+    groups: dict[int, list[Any]] = {}
+    for lease in leases:
+        groups.setdefault(id(lease._redis), []).append(lease)
+    return list(groups.values())
+
+
+class RedisLeaseManager:
+    """
+    进程级共享续期器：一个守护线程按各锁的 heartbeat_interval 调度；
+    有锁到期时，下一周期内将到期的锁一并续期（对齐到同一节拍），
+    按 Redis 客户端分组，每组一次 EVAL 批量续期。
+    线程在没有持有锁时退出，下次 register 时重新拉起。
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._leases: dict[int, Any] = {}
+        self._due: dict[int, float] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, lease: Any) -> None:
+        with self._condition:
+            self._leases[id(lease)] = lease
+            self._due[id(lease)] = time.monotonic() + lease.heartbeat_interval
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="redis-lease-manager", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def unregister(self, lease: Any) -> None:
+        with self._condition:
+            self._leases.pop(id(lease), None)
+            self._due.pop(id(lease), None)
+            self._condition.notify()
+
+    def held(self) -> int:
+        with self._condition:
+            return len(self._leases)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._leases:
+                    self._thread = None
+                    return
+                now = time.monotonic()
+                next_due = min(self._due.values())
+                if next_due > now:
+                    self._condition.wait(next_due - now)
+                    continue
+                batch = _due_batch(self._leases, self._due, now)
+                for lease in batch:
+                    self._due[id(lease)] = now + lease.heartbeat_interval
+            for group in _group_by_client(batch):
+                self._renew(group)
+
+    def _renew(self, leases: Sequence[Any]) -> None:
+        try:
+            result = leases[0]._redis.eval(*_refresh_many_args(leases))
+            flags = _renewed_flags(result, len(leases))
+        except Exception:  # noqa: BLE001
+            logger.exception(
+                "redis lock heartbeat failed",
+                extra={"keys": [lease.key for lease in leases]},
+            )
+            # A heartbeat transport error means ownership can no longer be
+            # proven. The Redis TTL may expire and another worker may acquire
+            # the same key while this process is still running, so
+            # continuing as owner is unsafe.
+            flags = [False] * len(leases)
+        for lease, renewed in zip(leases, flags):
+            if renewed:
+                continue
+            with self._condition:
+                # Released while the batch was in flight: not a loss.
+                if self._leases.pop(id(lease), None) is None:
+                    continue
+                self._due.pop(id(lease), None)
+            logger.warning("redis lock heartbeat lost ownership", extra={"key": lease.key})
+            lease._mark_lost()
+
+
+class AsyncRedisLeaseManager:
+    """asyncio 版共享续期器：每个事件循环一个后台 task，语义同 RedisLeaseManager。"""
+
+    def __init__(self) -> None:
+        self._leases: dict[int, Any] = {}
+        self._due: dict[int, float] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, lease: Any) -> None:
+        self._leases[id(lease)] = lease
+        self._due[id(lease)] = time.monotonic() + lease.heartbeat_interval
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._wakeup.set()
+
+    def unregister(self, lease: Any) -> None:
+        self._leases.pop(id(lease), None)
+        self._due.pop(id(lease), None)
+        self._wakeup.set()
+
+    def held(self) -> int:
+        return len(self._leases)
+
+    async def _run(self) -> None:
+        while self._leases:
+            now = time.monotonic()
+            next_due = min(self._due.values())
+            if next_due > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=next_due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            batch = _due_batch(self._leases, self._due, now)
+            for lease in batch:
+                self._due[id(lease)] = now + lease.heartbeat_interval
+            for group in _group_by_client(batch):
+                await self._renew(group)
+        self._task = None
+
+    async def _renew(self, leases: Sequence[Any]) -> None:
+        try:
+            result = await leases[0]._redis.eval(*_refresh_many_args(leases))
+            flags = _renewed_flags(result, len(leases))
+        except Exception:  # noqa: BLE001
+            logger.exception(
+                "redis lock heartbeat failed",
+                extra={"keys": [lease.key for lease in leases]},
+            )
+            flags = [False] * len(leases)
+        for lease, renewed in zip(leases, flags):
+            if renewed or self._leases.pop(id(lease), None) is None:
+                continue
+            self._due.pop(id(lease), None)
+            logger.warning("redis lock heartbeat lost ownership", extra={"key": lease.key})
+            lease._mark_lost()
+
+
+_lease_managers: dict[int, RedisLeaseManager] = {}
+_lease_managers_lock = threading.Lock()
+_async_lease_managers: "weakref.WeakKeyDictionary[Any, AsyncRedisLeaseManager]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_lease_manager() -> RedisLeaseManager:
+    """Return this process's lease manager (a fresh one after a prefork fork)."""
+
+    pid = os.getpid()
+    with _lease_managers_lock:
+        manager = _lease_managers.get(pid)
+        if manager is None:
+            _lease_managers.clear()
+            manager = _lease_managers[pid] = RedisLeaseManager()
+        return manager
+
+
+def get_async_lease_manager() -> AsyncRedisLeaseManager:
+    """Return the lease manager bound to the running event loop."""
+
+    loop = asyncio.get_running_loop()
+    manager = _async_lease_managers.get(loop)
+    if manager is None:
+        manager = _async_lease_managers[loop] = AsyncRedisLeaseManager()
+    return manager
+
+
+def _notify_lost(lock: Any) -> None:
+    callback = lock.on_lost
+    if callback is None:
+        return
+    try:
+        callback(lock)
+    except Exception:  # noqa: BLE001
+        logger.exception("redis lock loss callback failed", extra={"key": lock.key})
+
 @dataclass
 class RedisDistributedLock:
     """
     生产可用的同步分布式锁：
-    - acquire(): SET NX EX
-    - 心跳线程定期 Lua 校验 owner + PEXPIRE
+    - acquire(): SET NX EX（fencing=True 时 Lua 原子 SET NX + INCR fencing 计数器）
+    - 续期由进程级 RedisLeaseManager 统一批量执行，不再每把锁一个心跳线程
     - release(): Lua 校验 owner + DEL
+    - on_lost: 续期失败/校验失败时回调一次
     """
     key: str
     owner_token: str
@@ -78,34 +332,22 @@ class RedisDistributedLock:
     heartbeat_interval: int = field(
         default_factory=lambda: getattr(settings, "TTB_SYNC_LOCK_HEARTBEAT_SECONDS", 10)
     )
+    fencing: bool = False
+    on_lost: Optional[Callable[["RedisDistributedLock"], None]] = None
 
     # 运行态
     _acquired: bool = False
     _lost: bool = False
-    _stop_event: threading.Event = field(default_factory=threading.Event)
-    _heartbeat_thread: Optional[threading.Thread] = None
+    _fencing_token: Optional[int] = None
+    _manager: Optional[RedisLeaseManager] = None
     _lock: threading.Lock = field(default_factory=threading.Lock)
 
     def __post_init__(self) -> None:
         # 统一使用同步客户端工厂；禁止手写 ssl= 等不兼容参数
         self._redis = _adapt_client(get_redis_sync())
-
-        self.ttl_seconds = max(int(self.ttl_seconds), 1)
-        hb = max(int(self.heartbeat_interval), 0)
-        if hb and hb >= self.ttl_seconds:
-            hb = max(self.ttl_seconds // 2, 1)
-            if hb >= self.ttl_seconds:
-                hb = max(self.ttl_seconds - 1, 1)
-            message = "redis lock heartbeat interval >= ttl; adjusted"
-            logger.warning(
-                message,
-                extra={"key": self.key, "ttl_seconds": self.ttl_seconds, "effective_heartbeat": hb},
-            )
-            logging.getLogger().warning(
-                message,
-                extra={"key": self.key, "ttl_seconds": self.ttl_seconds, "effective_heartbeat": hb},
-            )
-        self.heartbeat_interval = hb
+        self.ttl_seconds, self.heartbeat_interval = _normalize_heartbeat(
+            self.key, self.ttl_seconds, self.heartbeat_interval
+        )
 
     @property
     def acquired(self) -> bool:
@@ -115,6 +357,19 @@ class RedisDistributedLock:
     def lost(self) -> bool:
         return self._lost
 
+    @property
+    def fencing_token(self) -> Optional[int]:
+        """Monotonic token of this acquisition (``fencing=True`` only)."""
+
+        return self._fencing_token
+
+    def _mark_lost(self) -> None:
+        with self._lock:
+            if self._lost:
+                return
+            self._lost = True
+        _notify_lost(self)
+
     def verify_ownership(self) -> bool:
         """Synchronously prove ownership before a protected mutation/commit."""
 
@@ -131,17 +386,33 @@ class RedisDistributedLock:
             )
             owned = False
         if not owned:
-            with self._lock:
-                self._lost = True
+            self._stop_heartbeat()
+            self._mark_lost()
         return owned
 
-    def acquire(self, *, timeout: float = 0.0, retry_interval: float = 0.1) -> bool:
-        """获取锁；成功则启动心跳线程。"""
+    def _try_acquire(self) -> bool:
         value = _b(self.owner_token)
+        if not self.fencing:
+            return bool(self._redis.set(self.key, value, nx=True, ex=self.ttl_seconds))
+        token = self._redis.eval(
+            _ACQUIRE_FENCED_SCRIPT,
+            2,
+            _b(self.key),
+            _b(_fence_key(self.key)),
+            value,
+            _ttl_ms(self.ttl_seconds),
+        )
+        if not token:
+            return False
+        self._fencing_token = int(token)
+        return True
+
+    def acquire(self, *, timeout: float = 0.0, retry_interval: float = 0.1) -> bool:
+        """获取锁；成功则登记到共享续期器。"""
         deadline = time.monotonic() + max(timeout, 0.0)
         while True:
             try:
-                ok = self._redis.set(self.key, value, nx=True, ex=self.ttl_seconds)
+                ok = self._try_acquire()
             except Exception:  # noqa: BLE001
                 logger.exception("redis lock acquire failed", extra={"key": self.key})
                 ok = False
@@ -153,7 +424,12 @@ class RedisDistributedLock:
                 self._start_heartbeat()
                 logger.debug(
                     "redis lock acquired",
-                    extra={"key": self.key, "ttl_seconds": self.ttl_seconds, "heartbeat_interval": self.heartbeat_interval},
+                    extra={
+                        "key": self.key,
+                        "ttl_seconds": self.ttl_seconds,
+                        "heartbeat_interval": self.heartbeat_interval,
+                        "fencing_token": self._fencing_token,
+                    },
                 )
                 return True
 
@@ -165,47 +441,22 @@ class RedisDistributedLock:
             time.sleep(min(retry_interval, max(remaining, 0)))
 
     def _start_heartbeat(self) -> None:
-        interval = max(int(self.heartbeat_interval), 0)
-        if interval <= 0:
+        if self.heartbeat_interval <= 0 or self._manager is not None:
             return
-        if self._heartbeat_thread and self._heartbeat_thread.is_alive():
-            return
-
-        def _loop() -> None:
-            key_b = _b(self.key)
-            owner_b = _b(self.owner_token)
-            ttl_ms = max(int(self.ttl_seconds * 1000), 1)
-            while not self._stop_event.wait(interval):
-                try:
-                    res = self._redis.eval(_REFRESH_SCRIPT, 1, key_b, owner_b, ttl_ms)
-                    if not res:
-                        logger.warning("redis lock heartbeat lost ownership", extra={"key": self.key})
-                        with self._lock:
-                            self._lost = True
-                        return
-                except Exception:  # noqa: BLE001
-                    logger.exception("redis lock heartbeat failed", extra={"key": self.key})
-                    # A heartbeat transport error means ownership can no
-                    # longer be proven. The Redis TTL may expire and another
-                    # worker may acquire the same key while this process is
-                    # still running, so continuing as owner is unsafe.
-                    with self._lock:
-                        self._lost = True
-                    return
+        self._manager = get_lease_manager()
+        self._manager.register(self)
 
-        self._stop_event = threading.Event()
-        self._heartbeat_thread = threading.Thread(target=_loop, daemon=True)
-        self._heartbeat_thread.start()
+    def _stop_heartbeat(self) -> None:
+        manager, self._manager = self._manager, None
+        if manager is not None:
+            manager.unregister(self)
 
     def release(self) -> bool:
         """释放锁（原子校验 owner）。"""
         with self._lock:
             if not self._acquired:
                 return False
-            self._stop_event.set()
-
-        if self._heartbeat_thread and self._heartbeat_thread.is_alive():
-            self._heartbeat_thread.join(timeout=2.0)
+        self._stop_heartbeat()
 
         try:
             res = self._redis.eval(_RELEASE_SCRIPT, 1, _b(self.key), _b(self.owner_token))
@@ -219,13 +470,137 @@ class RedisDistributedLock:
         finally:
             with self._lock:
                 self._acquired = False
-                self._heartbeat_thread = None
 
     def force_stop(self) -> None:
         """仅停止心跳，不释放锁（测试/故障注入）。"""
-        self._stop_event.set()
-        t = self._heartbeat_thread
-        if t and t.is_alive():
-            t.join(timeout=2.0)
-        with self._lock:
-            self._heartbeat_thread = None
+        self._stop_heartbeat()
+
+
+@dataclass
+class AsyncRedisDistributedLock:
+    """
+    协程版分布式锁：语义同 RedisDistributedLock，使用异步 Redis 客户端，
+    续期由当前事件循环的 AsyncRedisLeaseManager 批量执行。
+    """
+    key: str
+    owner_token: str
+    ttl_seconds: int = field(
+        default_factory=lambda: getattr(settings, "TTB_SYNC_LOCK_TTL_SECONDS", 30)
+    )
+    heartbeat_interval: int = field(
+        default_factory=lambda: getattr(settings, "TTB_SYNC_LOCK_HEARTBEAT_SECONDS", 10)
+    )
+    fencing: bool = False
+    on_lost: Optional[Callable[["AsyncRedisDistributedLock"], None]] = None
+    redis_client: Any = None
+
+    # 运行态
+    _acquired: bool = False
+    _lost: bool = False
+    _fencing_token: Optional[int] = None
+    _manager: Optional[AsyncRedisLeaseManager] = None
+
+    def __post_init__(self) -> None:
+        self._redis = self.redis_client
+        self.ttl_seconds, self.heartbeat_interval = _normalize_heartbeat(
+            self.key, self.ttl_seconds, self.heartbeat_interval
+        )
+
+    @property
+    def acquired(self) -> bool:
+        return self._acquired and not self._lost
+
+    @property
+    def lost(self) -> bool:
+        return self._lost
+
+    @property
+    def fencing_token(self) -> Optional[int]:
+        return self._fencing_token
+
+    def _mark_lost(self) -> None:
+        if self._lost:
+            return
+        self._lost = True
+        _notify_lost(self)
+
+    async def _client(self) -> Any:
+        if self._redis is None:
+            self._redis = await get_redis()
+        return self._redis
+
+    async def verify_ownership(self) -> bool:
+        if not self._acquired or self._lost:
+            return False
+        try:
+            owned = await (await self._client()).get(self.key) == _b(self.owner_token)
+        except Exception:  # noqa: BLE001
+            logger.exception(
+                "redis lock ownership verification failed",
+                extra={"key": self.key},
+            )
+            owned = False
+        if not owned:
+            self._stop_heartbeat()
+            self._mark_lost()
+        return owned
+
+    async def _try_acquire(self) -> bool:
+        client = await self._client()
+        value = _b(self.owner_token)
+        if not self.fencing:
+            return bool(await client.set(self.key, value, nx=True, ex=self.ttl_seconds))
+        token = await client.eval(
+            _ACQUIRE_FENCED_SCRIPT,
+            2,
+            _b(self.key),
+            _b(_fence_key(self.key)),
+            value,
+            _ttl_ms(self.ttl_seconds),
+        )
+        if not token:
+            return False
+        self._fencing_token = int(token)
+        return True
+
+    async def acquire(self, *, timeout: float = 0.0, retry_interval: float = 0.1) -> bool:
+        deadline = time.monotonic() + max(timeout, 0.0)
+        while True:
+            try:
+                ok = await self._try_acquire()
+            except Exception:  # noqa: BLE001
+                logger.exception("redis lock acquire failed", extra={"key": self.key})
+                ok = False
+
+            if ok:
+                self._acquired = True
+                self._lost = False
+                if self.heartbeat_interval > 0 and self._manager is None:
+                    self._manager = get_async_lease_manager()
+                    self._manager.register(self)
+                return True
+
+            remaining = deadline - time.monotonic()
+            if timeout <= 0 or remaining <= 0:
+                return False
+            await asyncio.sleep(min(retry_interval, max(remaining, 0)))
+
+    def _stop_heartbeat(self) -> None:
+        manager, self._manager = self._manager, None
+        if manager is not None:
+            manager.unregister(self)
+
+    async def release(self) -> bool:
+        if not self._acquired:
+            return False
+        self._stop_heartbeat()
+        try:
+            res = await (await self._client()).eval(
+                _RELEASE_SCRIPT, 1, _b(self.key), _b(self.owner_token)
+            )
+            return bool(res)
+        except Exception:  # noqa: BLE001
+            logger.exception("redis lock release failed", extra={"key": self.key})
+            return False
+        finally:
+            self._acquired = False
@@ -8,7 +8,7 @@ import logging
 from typing import Any, Iterable, Mapping, TypeVar
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from sqlalchemy import func, select
+from sqlalchemy import func, inspect as sa_inspect, select
 from sqlalchemy.orm import Session
 
 from app.core.errors import APIError
@@ -37,6 +37,7 @@ from app.data.models.tiktok_shop import (
     TikTokShopVideoOverviewDailyMetric,
     TikTokShopWithdrawal,
 )
+from app.services.commerce_order_facts import floor_hour, refresh_order_facts
 from app.services.tiktok_shop_api import TikTokShopAPIClient, TikTokShopRequestResult
 
 
@@ -412,12 +413,14 @@ async def sync_catalog(
             break
 
 
-def _upsert_order(db: Session, shop: OAuthTikTokShopShop, order: Mapping[str, Any]) -> None:
+def _upsert_order(db: Session, shop: OAuthTikTokShopShop, order: Mapping[str, Any]) -> set[datetime]:
+    """Upsert one order and its lines; return the paid hours it touched."""
+
     order_id = _text(order.get("id"), 128)
     if not order_id:
-        return
+        return set()
     payment = order.get("payment") if isinstance(order.get("payment"), dict) else {}
-    _upsert(
+    row = _upsert(
         db,
         TikTokShopOrder,
         {**_scope(shop), "order_id": order_id},
@@ -469,6 +472,12 @@ def _upsert_order(db: Session, shop: OAuthTikTokShopShop, order: Mapping[str, An
                 "raw_json": sanitize_order_payload(deepcopy(item)),
             },
         )
+    paid_history = sa_inspect(row).attrs.paid_at.history
+    return {
+        floor_hour(value)
+        for value in (row.paid_at, *(paid_history.deleted or ()))
+        if isinstance(value, datetime)
+    }
 
 
 async def sync_orders(
@@ -486,6 +495,7 @@ async def sync_orders(
         default_days=14,
     )
     token: str | None = None
+    touched_hours: set[datetime] = set()
     for _ in range(1000):
         result = await client.search_orders(
             create_time_ge=local_date_epoch(start, client.shop),
@@ -506,11 +516,17 @@ async def sync_orders(
         for item in orders:
             stats.seen += 1
             order = detailed.get(str(item.get("id"))) or item
-            _upsert_order(db, client.shop, order)
+            touched_hours |= _upsert_order(db, client.shop, order)
             stats.upserted += 1
         token = _next_token(result.data)
         if not token:
             break
+    refresh_order_facts(
+        db,
+        workspace_id=int(client.shop.workspace_id),
+        shop_row_id=int(client.shop.id),
+        hours=touched_hours,
+    )
     return start, end
 
 
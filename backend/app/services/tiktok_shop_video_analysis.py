@@ -22,6 +22,8 @@ from app.data.models.tiktok_shop import (
     TikTokShopVideoDailyMetric,
 )
 from app.services.gmvmax_creative_media_cache import resolve_creative_media
+from app.services.media_frames import SheetLayout, render_contact_sheet
+from app.services.media_probe_index import probe_media
 from app.services.hermes_agent.client import (
     HermesVideoAnalystClient,
     extract_output_text,
@@ -399,20 +401,7 @@ def serialize_analysis(row: TikTokShopVideoContentAnalysis) -> dict[str, Any]:
 
 
 def _probe_duration(path: Path) -> float:
-    result = subprocess.run(
-        [
-            "/opt/apps/bin/ffprobe",
-            "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            str(path),
-        ],
-        check=True,
-        capture_output=True,
-        text=True,
-        timeout=min(30, int(settings.HERMES_VIDEO_ANALYSIS_FFMPEG_TIMEOUT_SECONDS)),
-    )
-    duration = float(result.stdout.strip())
+    duration = probe_media(path).duration_seconds
     if duration <= 0 or duration > 60 * 60:
         raise ValueError("video duration is outside the supported range")
     return duration
@@ -424,24 +413,23 @@ def _render_contact_sheet(video_path: Path, output_path: Path) -> tuple[list[flo
     interval = max(0.25, duration / frame_count)
     columns = 4 if frame_count > 4 else frame_count
     rows = 2 if frame_count > 4 else 1
-    vf = (
-        f"fps=1/{interval:.6f},"
-        "scale=320:320:force_original_aspect_ratio=decrease,"
-        "pad=320:320:(ow-iw)/2:(oh-ih)/2:color=black,"
-        f"tile={columns}x{rows}:padding=4:margin=4"
-    )
-    subprocess.run(
-        [
-            "/opt/apps/bin/ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error",
-            "-threads", "1", "-i", str(video_path), "-vf", vf,
-            "-frames:v", "1", "-q:v", "5", "-y", str(output_path),
-        ],
-        check=True,
-        capture_output=True,
-        timeout=int(settings.HERMES_VIDEO_ANALYSIS_FFMPEG_TIMEOUT_SECONDS),
-    )
     timestamps = [round(min(duration, interval * index), 2) for index in range(frame_count)]
-    return timestamps, output_path.stat().st_size
+    sheet = render_contact_sheet(
+        video_path,
+        timestamps,
+        SheetLayout(
+            tile_width=320,
+            tile_height=320,
+            fit="contain",
+            columns=columns,
+            rows=rows,
+            padding=4,
+            margin=4,
+            quality=75,
+        ),
+        output_path,
+    )
+    return timestamps, sheet.size_bytes
 
 
 def _normalize_cover(cover_path: Path, output_path: Path) -> int:
@@ -42,6 +42,7 @@ from tenacity import (
 )
 
 from app.core.config import settings
+from app.services import ttb_quota_planner as quota_planner
 from app.services.redis_client import get_redis_sync
 from app.services.ttb_http import build_url
 
@@ -689,9 +690,9 @@ class SharedTikTokRateLimiter:
 
     def __init__(self, *, app_id: str | None, access_token: str) -> None:
         identity = str(app_id or access_token or "default")
-        digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:20]
-        environment = str(getattr(settings, "LOCK_ENV", "prod") or "prod")
-        self._prefix = f"gmv:ttb:quota:{environment}:{digest}"
+        self._prefix = quota_planner.quota_key_prefix(identity)
+        # Never label an app by its access token in the quota overview.
+        self._app_label = str(app_id) if app_id else f"token:{self._prefix[-8:]}"
         self._max_wait = max(
             0.25,
             float(getattr(settings, "TTB_API_RATE_LIMIT_MAX_WAIT_SECONDS", 8.0)),
@@ -807,12 +808,23 @@ class SharedTikTokRateLimiter:
                 continue
 
             now_ms = int(time.time() * 1000)
+            # Lower-priority subsystems may only fill their share of the
+            # minute/day windows; the demand counters feed the planner.
+            subsystem = quota_planner.current_subsystem()
+            demand = quota_planner.demand_counters(self._prefix, subsystem, now_ms, path=path)
             keys = [
                 f"{self._prefix}:{name}:{now_ms // period_ms}"
                 for name, _limit, period_ms in limits
             ]
-            argv = [str(limit) for _name, limit, _period_ms in limits]
+            keys.extend(key for key, _expiry_ms in demand)
+            argv = [
+                str(quota_planner.effective_limit(limit, period_ms, subsystem))
+                for _name, limit, period_ms in limits
+            ]
+            argv.extend(str(quota_planner.UNLIMITED) for _item in demand)
             argv.extend(str(period_ms + 2_000) for _name, _limit, period_ms in limits)
+            argv.extend(str(expiry_ms) for _key, expiry_ms in demand)
+            quota_planner.register_app(redis_client, self._prefix, self._app_label)
             try:
                 result = await asyncio.to_thread(
                     redis_client.eval,
@@ -837,7 +849,12 @@ class SharedTikTokRateLimiter:
                 raise TTBRateLimitBudgetError(
                     f"TikTok shared quota busy: {quota_name}",
                     code="LOCAL_RATE_LIMIT",
-                    payload={"path": path, "quota": quota_name, "retry_after_ms": retry_ms},
+                    payload={
+                        "path": path,
+                        "quota": quota_name,
+                        "subsystem": subsystem,
+                        "retry_after_ms": retry_ms,
+                    },
                     status=429,
                 )
             await asyncio.sleep(min(retry_ms / 1000, remaining))
@@ -2000,18 +2000,20 @@ def _upsert_campaign_catalog_from_api(
                     *_extract_item_group_ids_from_payload(campaign_details),
                 }
             )
-        for item_group_id in item_group_ids:
-            relation = (
-                db.query(GmvmaxProductCampaignItemGroup)
+        existing_item_group_ids: set[str] = set()
+        if item_group_ids:
+            existing_item_group_ids = {
+                str(value)
+                for (value,) in db.query(GmvmaxProductCampaignItemGroup.item_group_id)
                 .filter(GmvmaxProductCampaignItemGroup.workspace_id == int(workspace_id))
                 .filter(GmvmaxProductCampaignItemGroup.auth_id == int(auth_id))
                 .filter(GmvmaxProductCampaignItemGroup.advertiser_id == str(advertiser_id))
                 .filter(GmvmaxProductCampaignItemGroup.store_id == str(store_id))
                 .filter(GmvmaxProductCampaignItemGroup.campaign_id == str(campaign_identifier))
-                .filter(GmvmaxProductCampaignItemGroup.item_group_id == str(item_group_id))
-                .first()
-            )
-            if relation is None:
+            }
+        for item_group_id in item_group_ids:
+            if str(item_group_id) not in existing_item_group_ids:
+                existing_item_group_ids.add(str(item_group_id))
                 db.add(
                     GmvmaxProductCampaignItemGroup(
                         workspace_id=int(workspace_id),
@@ -0,0 +1,167 @@
+"""Shared Redis cache of the GMV Max options payload per binding.
+
+``build_gmvmax_options`` walks the business center, advertiser, store and
+link tables of a binding on every options request, while the result only
+changes when a meta sync lands.  The serialized payload is kept in Redis,
+zlib-compressed and tagged with the meta ETag (the revision set it was built
+from), under one key per binding:
+
+* a request whose current ETag matches the stored one is answered from the
+  cached bytes without touching the meta tables;
+* concurrent cold loads elect one builder with a short ``SET NX`` claim and
+  the others wait briefly for its result, so each revision set is built from
+  MySQL about once;
+* :func:`invalidate_gmvmax_options_cache` drops the entry when a meta sync
+  completes, covering writes that do not move a cursor revision.
+
+Request paths use the async Redis client and build the payload on a worker
+thread, so the event loop never blocks on Redis or MySQL.  Redis errors fall
+back to building from the database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Mapping, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.redis_client import get_redis, get_redis_sync
+from app.services.ttb_meta import build_gmvmax_options
+
+logger = logging.getLogger("gmv.ttb.meta.cache")
+
+_KEY_PREFIX = "ttb:meta:gmvmax_options"
+_SEPARATOR = b"\n"
+
+
+def _ttl_seconds() -> int:
+    return max(0, int(getattr(settings, "GMV_MAX_OPTIONS_CACHE_TTL_SECONDS", 3600) or 0))
+
+
+def _cache_key(workspace_id: int, auth_id: int) -> str:
+    return f"{_KEY_PREFIX}:{int(workspace_id)}:{int(auth_id)}"
+
+
+def encode_options_payload(payload: Mapping[str, Any]) -> bytes:
+    """Serialize exactly like ``JSONResponse`` so cached and fresh bodies match."""
+
+    return json.dumps(
+        payload,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+async def _cached_body(key: str, etag: str) -> Optional[bytes]:
+    try:
+        raw = await (await get_redis()).get(key)
+    except Exception as exc:  # noqa: BLE001 - the database stays the fallback
+        logger.debug("gmv max options cache unavailable: %s", exc)
+        return None
+    if not raw:
+        return None
+    cached_etag, _, compressed = bytes(raw).partition(_SEPARATOR)
+    if cached_etag.decode("ascii", "replace") != etag:
+        return None
+    try:
+        return zlib.decompress(compressed)
+    except zlib.error:
+        return None
+
+
+async def _claim_build(key: str) -> bool:
+    wait = float(getattr(settings, "GMV_MAX_OPTIONS_CACHE_BUILD_WAIT_SECONDS", 2.0) or 0)
+    if wait <= 0:
+        return True
+    try:
+        client = await get_redis()
+        return bool(await client.set(f"{key}:build", b"1", nx=True, ex=max(1, int(wait * 5))))
+    except Exception:  # noqa: BLE001
+        return True
+
+
+async def _store(key: str, etag: str, body: bytes, ttl: int) -> None:
+    try:
+        client = await get_redis()
+        await client.set(key, etag.encode("ascii") + _SEPARATOR + zlib.compress(body), ex=ttl)
+        await client.delete(f"{key}:build")
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("gmv max options cache write skipped: %s", exc)
+
+
+async def store_gmvmax_options(
+    *, workspace_id: int, auth_id: int, etag: str, payload: Mapping[str, Any]
+) -> None:
+    """Cache a payload that was built outside :func:`gmvmax_options_body`."""
+
+    ttl = _ttl_seconds()
+    if ttl:
+        await _store(_cache_key(workspace_id, auth_id), etag, encode_options_payload(payload), ttl)
+
+
+async def gmvmax_options_body(
+    db: Session,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    etag: str,
+    fallback_synced_at: Optional[datetime] = None,
+) -> bytes:
+    """Return the serialized options payload for ``etag``, building it at most once."""
+
+    key = _cache_key(workspace_id, auth_id)
+    ttl = _ttl_seconds()
+    if ttl:
+        body = await _cached_body(key, etag)
+        if body is not None:
+            return body
+        if not await _claim_build(key):
+            wait = float(getattr(settings, "GMV_MAX_OPTIONS_CACHE_BUILD_WAIT_SECONDS", 2.0))
+            deadline = time.monotonic() + wait
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+                body = await _cached_body(key, etag)
+                if body is not None:
+                    return body
+
+    db.expire_all()
+    payload = await asyncio.to_thread(
+        build_gmvmax_options,
+        db,
+        workspace_id=workspace_id,
+        auth_id=auth_id,
+        fallback_synced_at=fallback_synced_at,
+    )
+    body = encode_options_payload(payload)
+    if ttl:
+        await _store(key, etag, body, ttl)
+    return body
+
+
+def invalidate_gmvmax_options_cache(workspace_id: int, auth_id: int) -> None:
+    """Drop the cached payload of a binding after its meta tables changed."""
+
+    try:
+        get_redis_sync().delete(_cache_key(workspace_id, auth_id))
+    except Exception as exc:  # noqa: BLE001 - entries still expire by ETag and TTL
+        logger.warning(
+            "gmv max options cache invalidation failed",
+            extra={"workspace_id": int(workspace_id), "auth_id": int(auth_id), "error": str(exc)},
+        )
+
+
+__all__ = [
+    "encode_options_payload",
+    "gmvmax_options_body",
+    "invalidate_gmvmax_options_cache",
+    "store_gmvmax_options",
+]
@@ -0,0 +1,454 @@
+"""Priority planning for the shared TikTok Business API quota.
+
+:class:`~app.services.ttb_api.SharedTikTokRateLimiter` counts every call in
+per-app second/minute/day windows in Redis.  This module adds *who* is
+calling so that the report budget is spent by priority instead of first come,
+first served:
+
+* every call runs under a subsystem: Celery tasks get one from their task name
+  (``task_prerun``), API requests run as ``control``.  Admitted calls also
+  bump that subsystem's per-minute and per-day demand counters, and calls to
+  the GMV Max report endpoint bump separate report-demand counters;
+* in the minute and day windows a subsystem may only fill its priority's
+  share of the limit, so the rest stays reserved for higher priorities:
+  control plane first, guards next, syncs, then backfills;
+* :func:`plan` forecasts the higher-priority report demand for the rest of
+  each report window from the recent per-minute report counters, and dispatchers use it to defer
+  low-priority work before the quota runs out instead of discovering
+  starvation through ``TTBRateLimitBudgetError``;
+* :func:`quota_overview` reports the remaining budget per app for the
+  platform admin endpoint.
+
+Redis errors fail open: calls and dispatches proceed as they did before.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Iterator
+
+from app.core.config import settings
+
+logger = logging.getLogger("gmv.ttb.quota_planner")
+
+REPORT_PATH = "/gmv_max/report/get/"
+MINUTE_MS = 60_000
+DAY_MS = 86_400_000
+# Demand counters never block a call; they only feed the forecast.
+UNLIMITED = 2**62
+
+
+class QuotaPriority(IntEnum):
+    CONTROL = 0
+    GUARD = 1
+    SYNC = 2
+    BACKFILL = 3
+
+
+SUBSYSTEM_PRIORITIES: dict[str, QuotaPriority] = {
+    "control": QuotaPriority.CONTROL,
+    "smart_guard": QuotaPriority.GUARD,
+    "creative_guard": QuotaPriority.GUARD,
+    "account_sync": QuotaPriority.SYNC,
+    "creative_10min": QuotaPriority.SYNC,
+    "website_ads_monitor": QuotaPriority.SYNC,
+    "other": QuotaPriority.SYNC,
+    "daily_report": QuotaPriority.BACKFILL,
+    "backfill": QuotaPriority.BACKFILL,
+}
+
+# Task-name prefixes, first match wins.  Unlisted tasks run as ``other``.
+_TASK_SUBSYSTEMS: tuple[tuple[str, str], ...] = (
+    ("gmvmax.execute_campaign_pause_intent", "control"),
+    ("gmvmax.recover_campaign_pause_intents", "control"),
+    ("gmvmax.precheck", "control"),
+    ("gmvmax.strategy_preview", "control"),
+    ("gmvmax.smart_guard_cycle", "smart_guard"),
+    ("gmvmax.creative_guard_cycle", "creative_guard"),
+    ("gmvmax.creative_heating_cycle", "creative_guard"),
+    ("gmvmax.sync_creative_metrics_10min", "creative_10min"),
+    ("gmvmax.hermes_daily_report", "daily_report"),
+    ("gmvmax.hermes_advisor_cycle", "daily_report"),
+    ("website_ads.daily_report_cycle", "daily_report"),
+    ("website_ads.monitor_cycle", "website_ads_monitor"),
+    ("gmvmax.backfill_", "backfill"),
+    ("gmvmax.", "account_sync"),
+    ("ttb.sync.", "account_sync"),
+)
+
+_SHARE_SETTINGS: dict[QuotaPriority, tuple[str, float]] = {
+    QuotaPriority.GUARD: ("TTB_QUOTA_GUARD_SHARE", 0.9),
+    QuotaPriority.SYNC: ("TTB_QUOTA_SYNC_SHARE", 0.75),
+    QuotaPriority.BACKFILL: ("TTB_QUOTA_BACKFILL_SHARE", 0.5),
+}
+
+_subsystem: ContextVar[str] = ContextVar("ttb_quota_subsystem", default="control")
+_task_tokens: dict[str, Token[str]] = {}
+_registered_apps: set[str] = set()
+_installed = False
+
+
+def _enabled() -> bool:
+    return bool(getattr(settings, "TTB_QUOTA_PLANNER_ENABLED", True))
+
+
+def _environment() -> str:
+    return str(getattr(settings, "LOCK_ENV", "prod") or "prod")
+
+
+def quota_key_prefix(identity: str) -> str:
+    digest = hashlib.sha256(str(identity or "default").encode("utf-8")).hexdigest()[:20]
+    return f"gmv:ttb:quota:{_environment()}:{digest}"
+
+
+def _apps_key() -> str:
+    return f"gmv:ttb:quota:{_environment()}:apps"
+
+
+# =========================
+# Subsystems
+# =========================
+def subsystem_for_task(task_name: str | None) -> str:
+    name = str(task_name or "")
+    for prefix, subsystem in _TASK_SUBSYSTEMS:
+        if name.startswith(prefix):
+            return subsystem
+    return "other"
+
+
+def current_subsystem() -> str:
+    return _subsystem.get()
+
+
+@contextmanager
+def quota_subsystem(name: str) -> Iterator[None]:
+    """Attribute TikTok calls made inside the block to ``name``."""
+
+    token = _subsystem.set(str(name))
+    try:
+        yield
+    finally:
+        _subsystem.reset(token)
+
+
+def priority_of(subsystem: str) -> QuotaPriority:
+    return SUBSYSTEM_PRIORITIES.get(str(subsystem), QuotaPriority.SYNC)
+
+
+def priority_share(priority: QuotaPriority) -> float:
+    if priority is QuotaPriority.CONTROL or not _enabled():
+        return 1.0
+    name, default = _SHARE_SETTINGS[priority]
+    return min(1.0, max(0.05, float(getattr(settings, name, default))))
+
+
+def effective_limit(limit: int, period_ms: int, subsystem: str) -> int:
+    """Ceiling a subsystem may fill in one window; sub-minute windows are shared."""
+
+    if period_ms < MINUTE_MS:
+        return int(limit)
+    return max(1, int(int(limit) * priority_share(priority_of(subsystem))))
+
+
+def is_report_path(path: str | None) -> bool:
+    return "/" + str(path or "").strip("/") + "/" == REPORT_PATH
+
+
+def _demand_key(prefix: str, kind: str, subsystem: str, bucket: int) -> str:
+    return f"{prefix}:demand:{kind}:{subsystem}:{bucket}"
+
+
+def demand_counters(
+    prefix: str,
+    subsystem: str,
+    now_ms: int,
+    *,
+    path: str | None = None,
+) -> list[tuple[str, int]]:
+    """``(key, expiry_ms)`` of the demand counters one admitted call increments.
+
+    Every call counts towards the subsystem's overall demand; only report
+    calls count towards the report demand the planner forecasts from.
+    """
+
+    minute_expiry_ms = _forecast_minutes() * MINUTE_MS + 2 * MINUTE_MS
+    day_expiry_ms = DAY_MS + 2 * MINUTE_MS
+    minute, day = now_ms // MINUTE_MS, now_ms // DAY_MS
+    counters = [
+        (_demand_key(prefix, "m", subsystem, minute), minute_expiry_ms),
+        (_demand_key(prefix, "d", subsystem, day), day_expiry_ms),
+    ]
+    if is_report_path(path):
+        counters.extend(
+            [
+                (_demand_key(prefix, "report:m", subsystem, minute), minute_expiry_ms),
+                (_demand_key(prefix, "report:d", subsystem, day), day_expiry_ms),
+            ]
+        )
+    return counters
+
+
+def register_app(client: Any, prefix: str, label: str) -> None:
+    """Remember which app a quota prefix belongs to, once per process."""
+
+    if prefix in _registered_apps:
+        return
+    try:
+        client.hset(_apps_key(), prefix.rsplit(":", 1)[-1], label)
+    except Exception as exc:  # noqa: BLE001 - only the overview loses the label
+        logger.debug("ttb quota app registration skipped: %s", exc)
+        return
+    _registered_apps.add(prefix)
+
+
+def _on_task_prerun(sender=None, task_id=None, task=None, **_kwargs) -> None:
+    name = getattr(task, "name", None) or getattr(sender, "name", None)
+    if task_id:
+        _task_tokens[str(task_id)] = _subsystem.set(subsystem_for_task(name))
+
+
+def _on_task_postrun(sender=None, task_id=None, **_kwargs) -> None:
+    token = _task_tokens.pop(str(task_id), None) if task_id else None
+    if token is not None:
+        try:
+            _subsystem.reset(token)
+        except ValueError:  # pragma: no cover - token from another context
+            _subsystem.set("control")
+
+
+def install_quota_subsystems() -> None:
+    """Run every Celery task under the quota subsystem of its task name."""
+
+    global _installed
+    if _installed:
+        return
+    from celery.signals import task_postrun, task_prerun
+
+    task_prerun.connect(_on_task_prerun, weak=False)
+    task_postrun.connect(_on_task_postrun, weak=False)
+    _installed = True
+
+
+# =========================
+# Planning
+# =========================
+def _forecast_minutes() -> int:
+    return max(1, int(getattr(settings, "TTB_QUOTA_FORECAST_MINUTES", 15)))
+
+
+def _report_windows() -> list[tuple[str, int, int]]:
+    from app.services.ttb_api import SharedTikTokRateLimiter
+
+    return [
+        window
+        for window in SharedTikTokRateLimiter._limits(REPORT_PATH)
+        if window[2] >= MINUTE_MS
+    ]
+
+
+def _forecast_rates(client: Any, prefix: str, now_ms: int, *, kind: str = "m") -> dict[str, float]:
+    """Average calls per minute of each subsystem over the last full minutes."""
+
+    minutes = _forecast_minutes()
+    current = now_ms // MINUTE_MS
+    subsystems = list(SUBSYSTEM_PRIORITIES)
+    keys = [
+        _demand_key(prefix, kind, subsystem, minute)
+        for subsystem in subsystems
+        for minute in range(current - minutes, current)
+    ]
+    values = client.mget(keys)
+    rates: dict[str, float] = {}
+    for index, subsystem in enumerate(subsystems):
+        chunk = values[index * minutes : (index + 1) * minutes]
+        rates[subsystem] = sum(int(value or 0) for value in chunk) / minutes
+    return rates
+
+
+def _window_usage(client: Any, prefix: str, now_ms: int) -> list[dict[str, Any]]:
+    windows = _report_windows()
+    used = client.mget([f"{prefix}:{name}:{now_ms // period}" for name, _limit, period in windows])
+    return [
+        {
+            "quota": name,
+            "limit": int(limit),
+            "used": int(value or 0),
+            "remaining": max(0, int(limit) - int(value or 0)),
+            "period_ms": int(period),
+            "resets_in_ms": int(period - now_ms % period),
+        }
+        for (name, limit, period), value in zip(windows, used)
+    ]
+
+
+@dataclass(frozen=True)
+class QuotaPlan:
+    admit: bool
+    subsystem: str
+    priority: str
+    quota: str | None = None
+    available: float | None = None
+    demand: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "admit": self.admit,
+            "subsystem": self.subsystem,
+            "priority": self.priority,
+            "quota": self.quota,
+            "available": self.available,
+            "demand": self.demand,
+        }
+
+
+def plan(
+    subsystem: str,
+    *,
+    app_id: str | None,
+    calls: float | None = None,
+    client: Any = None,
+    now: float | None = None,
+) -> QuotaPlan:
+    """Decide whether ``subsystem`` may start about ``calls`` report calls now.
+
+    ``calls`` defaults to the subsystem's own recent per-minute report demand.
+    In each report minute and day window the subsystem may use its priority
+    share, minus the report calls higher-priority subsystems are forecast to
+    need until the window resets.  Calls to other endpoints do not count.
+    """
+
+    priority = priority_of(subsystem)
+    admitted = QuotaPlan(admit=True, subsystem=subsystem, priority=priority.name)
+    if priority is QuotaPriority.CONTROL or not app_id or not _enabled():
+        return admitted
+    now_ms = int((time.time() if now is None else now) * 1000)
+    prefix = quota_key_prefix(str(app_id))
+    try:
+        if client is None:
+            from app.services.redis_client import get_redis_sync
+
+            client = get_redis_sync()
+        rates = _forecast_rates(client, prefix, now_ms, kind="report:m")
+        windows = _window_usage(client, prefix, now_ms)
+    except Exception as exc:  # noqa: BLE001 - the limiter still guards every call
+        logger.debug("ttb quota planner unavailable: %s", exc)
+        return admitted
+
+    demand = float(rates.get(subsystem, 0.0) if calls is None else calls)
+    higher = sum(rate for name, rate in rates.items() if priority_of(name) < priority)
+    for window in windows:
+        horizon_minutes = window["resets_in_ms"] / MINUTE_MS
+        reserved = higher * horizon_minutes
+        ceiling = min(
+            effective_limit(window["limit"], window["period_ms"], subsystem),
+            window["limit"] - reserved,
+        )
+        available = ceiling - window["used"]
+        if available < max(1.0, demand):
+            return QuotaPlan(
+                admit=False,
+                subsystem=subsystem,
+                priority=priority.name,
+                quota=window["quota"],
+                available=round(available, 1),
+                demand=round(demand, 1),
+            )
+    return admitted
+
+
+def app_id_for_auth(db: Any, auth_id: int) -> str | None:
+    """The TikTok app (OAuth client id) whose quota an auth's calls count against."""
+
+    from app.data.models.oauth_ttb import OAuthAccountTTB, OAuthProviderApp
+
+    account = db.get(OAuthAccountTTB, int(auth_id))
+    if account is None:
+        return None
+    app = db.get(OAuthProviderApp, int(account.provider_app_id))
+    return str(app.client_id) if app is not None and app.client_id else None
+
+
+def plan_for_auth(
+    db: Any,
+    subsystem: str,
+    *,
+    auth_id: int,
+    calls: float | None = None,
+) -> QuotaPlan:
+    try:
+        app_id = app_id_for_auth(db, auth_id)
+    except Exception as exc:  # noqa: BLE001 - unknown app, let the limiter decide
+        logger.debug("ttb quota planner could not resolve app: %s", exc)
+        app_id = None
+    return plan(subsystem, app_id=app_id, calls=calls)
+
+
+# =========================
+# Reporting
+# =========================
+def quota_overview(client: Any = None, *, now: float | None = None) -> dict[str, Any]:
+    """Remaining minute/day report budget and subsystem demand for every known app."""
+
+    if client is None:
+        from app.services.redis_client import get_redis_sync
+
+        client = get_redis_sync()
+    now_ms = int((time.time() if now is None else now) * 1000)
+    apps = client.hgetall(_apps_key()) or {}
+    subsystems = list(SUBSYSTEM_PRIORITIES)
+    items: list[dict[str, Any]] = []
+    for raw_digest, raw_label in sorted(apps.items()):
+        digest = raw_digest.decode() if isinstance(raw_digest, bytes) else str(raw_digest)
+        label = raw_label.decode() if isinstance(raw_label, bytes) else str(raw_label)
+        prefix = f"gmv:ttb:quota:{_environment()}:{digest}"
+        rates = _forecast_rates(client, prefix, now_ms)
+        report_rates = _forecast_rates(client, prefix, now_ms, kind="report:m")
+        day = now_ms // DAY_MS
+        today = client.mget([_demand_key(prefix, "d", subsystem, day) for subsystem in subsystems])
+        report_today = client.mget(
+            [_demand_key(prefix, "report:d", subsystem, day) for subsystem in subsystems]
+        )
+        items.append(
+            {
+                "app": label,
+                "quotas": _window_usage(client, prefix, now_ms),
+                "subsystems": [
+                    {
+                        "subsystem": subsystem,
+                        "priority": priority_of(subsystem).name,
+                        "share": priority_share(priority_of(subsystem)),
+                        "calls_per_minute": round(rates[subsystem], 2),
+                        "calls_today": int(value or 0),
+                        "report_calls_per_minute": round(report_rates[subsystem], 2),
+                        "report_calls_today": int(report_value or 0),
+                    }
+                    for subsystem, value, report_value in zip(subsystems, today, report_today)
+                ],
+            }
+        )
+    return {"enabled": _enabled(), "forecast_minutes": _forecast_minutes(), "apps": items}
+
+
+__all__ = [
+    "QuotaPlan",
+    "QuotaPriority",
+    "SUBSYSTEM_PRIORITIES",
+    "current_subsystem",
+    "demand_counters",
+    "effective_limit",
+    "install_quota_subsystems",
+    "is_report_path",
+    "plan",
+    "plan_for_auth",
+    "quota_key_prefix",
+    "quota_overview",
+    "quota_subsystem",
+    "register_app",
+    "subsystem_for_task",
+]
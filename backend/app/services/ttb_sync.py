@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, List, Tuple, Literal, Set, Iterable
+from typing import Any, Callable, Dict, Optional, List, Tuple, Literal, Set, Iterable
 import logging
 import contextlib
 
@@ -906,11 +906,21 @@ class TTBSyncService:
      - 只使用官方字段，不做历史兼容。
     """
 
-    def __init__(self, db: Session, client: TTBApiClient, *, workspace_id: int, auth_id: int):
+    def __init__(
+        self,
+        db: Session,
+        client: TTBApiClient,
+        *,
+        workspace_id: int,
+        auth_id: int,
+        pair_filter: Callable[[List[Tuple[str, str]]], List[Tuple[str, str]]] | None = None,
+    ):
         self.db = db
         self.client = client
         self.workspace_id = int(workspace_id)
         self.auth_id = int(auth_id)
+        # 可选：按策略筛选 (advertiser_id, store_id) 组合，一次性批量判定
+        self.pair_filter = pair_filter
 
     def _cursor_checkpoint(self, cursor: TTBSyncCursor, *, last_rev: str | None) -> None:
         cursor.last_rev = last_rev or str(int(datetime.now(timezone.utc).timestamp()))
@@ -1342,6 +1352,20 @@ class TTBSyncService:
                     continue
                 pairs.append((str(adv_id), str(sid)))
 
+        pairs = list(dict.fromkeys(pairs))
+        if pairs and self.pair_filter is not None:
+            allowed_pairs = self.pair_filter(pairs)
+            if len(allowed_pairs) != len(pairs):
+                logger.info(
+                    "ttb_sync.product_pairs_denied_by_policy",
+                    extra={
+                        "workspace_id": self.workspace_id,
+                        "auth_id": self.auth_id,
+                        "denied": len(pairs) - len(allowed_pairs),
+                    },
+                )
+            pairs = list(allowed_pairs)
+
         if not pairs:
             # 没有任何绑定，直接返回
             self._cursor_checkpoint(cursor, last_rev=latest_rev)
@@ -1350,7 +1374,6 @@ class TTBSyncService:
         # A store can be linked to more than one advertiser.  Keep each
         # eligibility snapshot as an independent advertiser partition; the
         # official GMV_MAX filter is advertiser-dependent.
-        pairs = list(dict.fromkeys(pairs))
         advertisers_by_store: dict[str, list[str]] = {}
         for adv_id, sid in pairs:
             advertisers_by_store.setdefault(str(sid), []).append(str(adv_id))
@@ -34,6 +34,7 @@ from app.providers.tiktok_business.website_ads_pagination import (
 )
 from app.services.gmv_product_order_events import sync_product_order_events_from_hourly
 from app.services.website_ads_conversion_guard import resolve_website_ads_store_id
+from app.services.website_ads_report_cache import fetch_hourly_ad_report
 from app.services.website_ads_execution_lock import (
     WebsiteAdsExecutionLockLost,
     assert_website_ads_execution_lock,
@@ -193,12 +194,13 @@ async def _refresh_campaign_day_metrics(
             "request_id": None,
             "duplicate_local_report_ids": duplicate_remote_ids,
         }
-    payload = await api.report_ads(
+    payload = await fetch_hourly_ad_report(
+        api,
         str(campaign.advertiser_id),
         remote_ids,
         report_date.isoformat(),
-        report_date.isoformat(),
-        hourly=True,
+        workspace_id=int(campaign.workspace_id),
+        auth_id=int(campaign.auth_id),
     )
     assert_website_ads_execution_lock(
         db,
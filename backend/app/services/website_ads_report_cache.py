@@ -0,0 +1,191 @@
+"""Short-lived sharing of TikTok Website Ads hourly ad reports.
+
+The monitor pulls the hourly ``/report/integrated/get/`` day for every
+guarded ad of an advertiser, and the daily report pulls the same day for one
+campaign's ads a little later.  A report proven complete by its pagination
+metadata is kept for ``WEBSITE_ADS_REPORT_CACHE_TTL_SECONDS``: in a
+per-cycle memo opened with :func:`report_fetch_scope`, and in Redis so other
+workers can reuse it.  A cached report answers any request whose ad IDs are
+a subset of the IDs it was fetched for; the rows are filtered to the
+requested ads so callers validate it exactly like a fresh response.
+Entries are keyed by workspace and auth as well as advertiser, so a report
+is only reused under the binding whose credentials fetched it.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import copy
+import json
+import logging
+import time
+import zlib
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any
+
+from app.core.config import settings
+from app.providers.tiktok_business.website_ads_client import TikTokWebsiteAdsClient
+from app.providers.tiktok_business.website_ads_pagination import (
+    report_payload_has_complete_pagination,
+)
+from app.services.redis_client import get_redis_sync
+
+logger = logging.getLogger("gmv.services.website_ads.report_cache")
+
+_KEY_PREFIX = "website_ads:report:hourly"
+_memo: contextvars.ContextVar[dict[str, dict[str, Any]] | None] = contextvars.ContextVar(
+    "website_ads_report_memo",
+    default=None,
+)
+
+
+def _ttl_seconds() -> int:
+    return max(0, int(getattr(settings, "WEBSITE_ADS_REPORT_CACHE_TTL_SECONDS", 45) or 0))
+
+
+def _cache_key(workspace_id: int, auth_id: int, advertiser_id: str, report_day: str) -> str:
+    return f"{_KEY_PREFIX}:{int(workspace_id)}:{int(auth_id)}:{advertiser_id}:{report_day}"
+
+
+def _normalized_ids(ad_ids: Iterable[Any]) -> list[str]:
+    return sorted({str(ad_id).strip() for ad_id in ad_ids if str(ad_id or "").strip()})
+
+
+@contextmanager
+def report_fetch_scope() -> Iterator[None]:
+    """Share report fetches in memory for the duration of one cycle."""
+
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def _subset_payload(
+    entry: Mapping[str, Any],
+    requested: list[str],
+    *,
+    source: str,
+) -> dict[str, Any] | None:
+    cached_ids = set(entry.get("ad_ids") or [])
+    if not set(requested) <= cached_ids:
+        return None
+    payload = copy.deepcopy(dict(entry.get("payload") or {}))
+    if set(requested) != cached_ids:
+        wanted = set(requested)
+        data = dict(payload.get("data") or {})
+        rows = [
+            row
+            for row in data.get("list") or []
+            if not isinstance(row, Mapping)
+            or not isinstance(row.get("dimensions"), Mapping)
+            or str(row["dimensions"].get("ad_id_v2") or "").strip() in wanted
+        ]
+        data["list"] = rows
+        data["page_info"] = {
+            "page": 1,
+            "page_size": len(rows),
+            "total_number": len(rows),
+            "total_page": 1,
+        }
+        payload["data"] = data
+        pagination = dict(payload.get("_report_pagination") or {})
+        pagination["rows_returned"] = len(rows)
+        payload["_report_pagination"] = pagination
+    payload["_report_cache"] = {
+        "hit": True,
+        "source": source,
+        "age_seconds": round(max(0.0, time.time() - float(entry.get("fetched_at") or 0)), 3),
+    }
+    return payload
+
+
+def _fresh(entry: Mapping[str, Any] | None, ttl: int) -> bool:
+    return bool(entry) and time.time() - float(entry.get("fetched_at") or 0) <= ttl
+
+
+def _redis_entry(key: str) -> dict[str, Any] | None:
+    try:
+        raw = get_redis_sync().get(key)
+    except Exception as exc:  # noqa: BLE001 - the report API stays the fallback
+        logger.debug("website ads report cache unavailable: %s", exc)
+        return None
+    if not raw:
+        return None
+    try:
+        entry = json.loads(zlib.decompress(raw))
+    except (ValueError, TypeError, zlib.error):
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def _remember(key: str, entry: dict[str, Any], ttl: int) -> None:
+    memo = _memo.get()
+    if memo is not None:
+        memo[key] = entry
+    try:
+        get_redis_sync().set(
+            key,
+            zlib.compress(json.dumps(entry, separators=(",", ":"), default=str).encode("utf-8")),
+            ex=ttl,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("website ads report cache write skipped: %s", exc)
+
+
+async def fetch_hourly_ad_report(
+    api: TikTokWebsiteAdsClient,
+    advertiser_id: str,
+    ad_ids: Iterable[Any],
+    report_day: str,
+    *,
+    workspace_id: int,
+    auth_id: int,
+) -> dict[str, Any]:
+    """Return the hourly ad report of one day, reusing a recent complete one."""
+
+    requested = _normalized_ids(ad_ids)
+    ttl = _ttl_seconds()
+    key = _cache_key(workspace_id, auth_id, str(advertiser_id), str(report_day))
+    if ttl and requested:
+        memo = _memo.get()
+        entry = memo.get(key) if memo is not None else None
+        if _fresh(entry, ttl):
+            payload = _subset_payload(entry, requested, source="memo")
+            if payload is not None:
+                return payload
+        entry = _redis_entry(key)
+        if _fresh(entry, ttl):
+            payload = _subset_payload(entry, requested, source="redis")
+            if payload is not None:
+                if memo is not None:
+                    memo[key] = entry
+                return payload
+
+    payload = await api.report_ads(
+        str(advertiser_id),
+        requested,
+        str(report_day),
+        str(report_day),
+        hourly=True,
+    )
+    if ttl and requested and report_payload_has_complete_pagination(payload):
+        _remember(
+            key,
+            {"ad_ids": requested, "payload": payload, "fetched_at": time.time()},
+            ttl,
+        )
+    return payload
+
+
+def report_fetched_remotely(payload: Mapping[str, Any] | None) -> bool:
+    return not (isinstance(payload, Mapping) and isinstance(payload.get("_report_cache"), Mapping))
+
+
+__all__ = [
+    "fetch_hourly_ad_report",
+    "report_fetch_scope",
+    "report_fetched_remotely",
+]
@@ -1,8 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
-import subprocess
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
@@ -23,6 +21,7 @@ from app.services.ai_video.local_storage import (
     save_remote_file_locally,
     set_task_local_meta,
 )
+from app.services.media_probe_index import MediaProbeError, probe_media
 from app.services.ai_video.retry_policy import (
     MAX_AUTO_RETRIES,
     delete_archived_task_result_files,
@@ -35,7 +34,6 @@ from app.services.ai_video.queues import (
 
 logger = get_task_logger(__name__)
 
-FFPROBE_BIN = "/opt/apps/bin/ffprobe"
 OUTPUT_ASPECT_TOLERANCE = 0.08
 
 
@@ -99,35 +97,10 @@ def _serialize_task(task: KieTask) -> dict[str, Any]:
 
 def _probe_video_geometry(path: Path) -> tuple[int, int] | None:
     try:
-        completed = subprocess.run(
-            [
-                FFPROBE_BIN if Path(FFPROBE_BIN).exists() else "ffprobe",
-                "-v",
-                "error",
-                "-select_streams",
-                "v:0",
-                "-show_entries",
-                "stream=width,height",
-                "-of",
-                "json",
-                str(path),
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            timeout=15,
-            check=False,
-        )
-    except (OSError, subprocess.TimeoutExpired):
-        return None
-    if completed.returncode != 0:
-        return None
-    try:
-        streams = list(json.loads(completed.stdout.decode("utf-8")).get("streams") or [])
-        width = int(streams[0].get("width") or 0)
-        height = int(streams[0].get("height") or 0)
-    except (IndexError, KeyError, TypeError, ValueError, json.JSONDecodeError):
+        probe = probe_media(path)
+    except MediaProbeError:
         return None
-    return (width, height) if width > 0 and height > 0 else None
+    return (probe.width, probe.height) if probe.width > 0 and probe.height > 0 else None
 
 
 def _result_contract_error(
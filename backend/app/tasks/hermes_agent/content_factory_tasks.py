@@ -17,6 +17,7 @@ import time
 import urllib.request
 import uuid
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from itertools import combinations
 from pathlib import Path
 from types import SimpleNamespace
@@ -84,6 +85,13 @@ from app.services.ai_routing.router import (
     _mark_failure as mark_ai_route_failure,
     _mark_success as mark_ai_route_success,
 )
+from app.services.media_frames import (
+    MediaFrameError,
+    SheetLayout,
+    render_contact_sheet,
+    uniform_times,
+)
+from app.services.media_probe_index import MediaProbeError, probe_media
 from app.services.redis_locks import RedisDistributedLock
 from app.services.toapis.client import ToApisApiError, ToApisVideoClient
 from app.services.sub2api.client import Sub2ApiApiError, Sub2ApiImageClient
@@ -96,6 +104,12 @@ from app.services.hermes_agent.content_factory import (
     _visual_variant_api_route,
 )
 from app.services.hermes_agent.direct_browser import ChatGPTStageError, execute_chatgpt_stage
+from app.services.hermes_agent.vision_review_batch import (
+    VisionReviewJob,
+    VisionReviewOutcome,
+    execute_vision_review_job,
+    run_vision_review_jobs,
+)
 from app.services.hermes_agent.content_factory_api import (
     BENCHMARK_VISUAL_ANALYSIS_POLICY_VERSION,
     CONTENT_FACTORY_CONTEXT_COMPILER_VERSION,
@@ -129,7 +143,12 @@ from app.services.hermes_agent.content_factory_api import (
     visual_reference_mentions_product,
     visual_reference_requires_product,
 )
-from app.services.hermes_agent.storyboard_split import detect_preview_cells
+from app.services.hermes_agent.storyboard_split import (
+    StoryboardSplitRequest,
+    detect_preview_cells,
+    detect_preview_cells_in_rgb,
+    split_storyboard_boards,
+)
 from app.services.hermes_agent.stage_routing import (
     clear_external_retry_barriers_for_local_stage,
     is_local_worker_stage,
@@ -393,7 +412,6 @@ REQUIRED_FIELDS = {
 }
 BROWSER_OUTBOX_ROOT = CONTENT_FACTORY_STORAGE_ROOT / "browser_outbox"
 FFMPEG_BIN = "/opt/apps/bin/ffmpeg"
-FFPROBE_BIN = "/opt/apps/bin/ffprobe"
 SELF_HEAL_FAST_RETRY_LIMIT = max(1, int(os.getenv("HERMES_SELF_HEAL_FAST_RETRY_LIMIT", "5")))
 AUTOMATIC_QUALITY_RECOVERY_COOLDOWN_SECONDS = max(
     15,
@@ -7330,40 +7348,82 @@ def _split_visual_board_native_files(
     reference_indices: list[int] | None = None,
 ) -> list[dict[str, Any]]:
     """Split one paid board locally into durable native reference frames."""
-    if panel_count <= 1:
-        return []
-    cells, layout = _detect_preview_cells(source, count=panel_count)
-    if len(cells) != panel_count:
-        raise ValueError(
-            "VISUAL_PREVIEW_NATIVE_SPLIT_UNSAFE: "
-            f"detected={len(cells)}, expected={panel_count}, source={source}"
-        )
-    stat = source.stat()
-    source_token = hashlib.sha256(
-        f"{source.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8")
-    ).hexdigest()[:12]
-    output_dir.mkdir(parents=True, exist_ok=True)
-    output_dir.chmod(0o775)
-    rows: list[dict[str, Any]] = []
-    mapped_indices = [int(value) for value in list(reference_indices or [])]
-    if mapped_indices and len(mapped_indices) != panel_count:
-        raise ValueError(
-            "VISUAL_PREVIEW_NATIVE_SPLIT_INDEX_MAP_INVALID: "
-            f"indices={mapped_indices}, expected={panel_count}, source={source}"
-        )
-    with Image.open(source) as opened:
-        board = opened.convert("RGB")
-        for offset, (x, y, width, height) in enumerate(cells):
-            reference_index = (
-                mapped_indices[offset]
-                if mapped_indices
-                else int(start_index) + offset
-            )
-            target = output_dir / (
-                f"visual-preview-reference-{reference_index:02d}-{source_token}.png"
-            )
-            panel = board.crop((x, y, x + width, y + height))
-            panel.save(target, format="PNG", optimize=True)
+    return _split_visual_boards_native_files(
+        [{
+            "source": source,
+            "start_index": start_index,
+            "panel_count": panel_count,
+            "reference_indices": reference_indices,
+        }],
+        output_dir=output_dir,
+        aspect_ratio=aspect_ratio,
+    )[0]
+
+
+def _split_visual_boards_native_files(
+    boards: list[dict[str, Any]],
+    *,
+    output_dir: Path,
+    aspect_ratio: str,
+) -> list[list[dict[str, Any]]]:
+    """Split several paid boards in one decode-once, pooled-encode batch.
+
+    Each board dict carries ``source``, ``start_index``, ``panel_count`` and
+    optional ``reference_indices``.  Returns one row list per board, in order.
+    """
+    requests: list[StoryboardSplitRequest] = []
+    index_maps: list[list[int]] = []
+    for board in boards:
+        source = Path(board["source"])
+        panel_count = int(board["panel_count"])
+        if panel_count <= 1:
+            requests.append(StoryboardSplitRequest(source=source, count=panel_count, targets=[]))
+            index_maps.append([])
+            continue
+        mapped_indices = [int(value) for value in list(board.get("reference_indices") or [])]
+        if mapped_indices and len(mapped_indices) != panel_count:
+            raise ValueError(
+                "VISUAL_PREVIEW_NATIVE_SPLIT_INDEX_MAP_INVALID: "
+                f"indices={mapped_indices}, expected={panel_count}, source={source}"
+            )
+        stat = source.stat()
+        source_token = hashlib.sha256(
+            f"{source.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8")
+        ).hexdigest()[:12]
+        reference_map = mapped_indices or [
+            int(board["start_index"]) + offset for offset in range(panel_count)
+        ]
+        requests.append(StoryboardSplitRequest(
+            source=source,
+            count=panel_count,
+            targets=[
+                output_dir / f"visual-preview-reference-{reference_index:02d}-{source_token}.png"
+                for reference_index in reference_map
+            ],
+        ))
+        index_maps.append(reference_map)
+
+    def detect_native_board(rgb, *, count: int):
+        cells, layout = _detect_preview_cells_in_rgb(rgb, count=count)
+        if len(cells) != count:
+            raise ValueError(
+                "VISUAL_PREVIEW_NATIVE_SPLIT_UNSAFE: "
+                f"detected={len(cells)}, expected={count}"
+            )
+        return cells, layout
+
+    split_requests = [request for request in requests if request.targets]
+    if split_requests:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir.chmod(0o775)
+        split_storyboard_boards(split_requests, detector=detect_native_board, optimize=True)
+
+    results: list[list[dict[str, Any]]] = []
+    for request, reference_map in zip(requests, index_maps):
+        rows: list[dict[str, Any]] = []
+        for reference_index, target, (x, y, width, height) in zip(
+            reference_map, request.targets, request.cells,
+        ):
             normalized_meta = _normalize_reference_panel_to_aspect(
                 target,
                 aspect_ratio=aspect_ratio,
@@ -7385,9 +7445,10 @@ def _split_visual_board_native_files(
                 "path": str(target),
                 "crop": {"x": x, "y": y, "width": width, "height": height},
                 "aspect_normalization": normalized_meta,
-                "detected_layout": layout,
+                "detected_layout": request.layout,
             })
-    return rows
+        results.append(rows)
+    return results
 
 
 def _materialize_visual_preview_native_assets(
@@ -7415,6 +7476,7 @@ def _materialize_visual_preview_native_assets(
         / project.project_key
     )
     bridge_dir.mkdir(parents=True, exist_ok=True)
+    planned: list[tuple[HermesContentFactoryAsset, dict[str, Any], dict[str, Any]]] = []
     for board_asset in list(board_assets or []):
         if not _asset_file_available(board_asset):
             continue
@@ -7439,14 +7501,20 @@ def _materialize_visual_preview_native_assets(
             continue
         if start <= 0 or panel_count <= 1:
             continue
-        rows = _split_visual_board_native_files(
-            Path(str(board_asset.file_path)),
-            start_index=start,
-            panel_count=panel_count,
-            output_dir=native_dir,
-            aspect_ratio=target_aspect_ratio,
-            reference_indices=reference_indices or None,
-        )
+        planned.append((board_asset, meta, {
+            "source": Path(str(board_asset.file_path)),
+            "start_index": start,
+            "panel_count": panel_count,
+            "reference_indices": reference_indices or None,
+        }))
+    # Every board of the variant is decoded once and its panels are encoded
+    # together, instead of one board at a time.
+    rows_by_board = _split_visual_boards_native_files(
+        [board for _asset, _meta, board in planned],
+        output_dir=native_dir,
+        aspect_ratio=target_aspect_ratio,
+    ) if planned else []
+    for (board_asset, meta, _board), rows in zip(planned, rows_by_board):
         board_outbox_path = str(meta.get("outbox_path") or board_asset.file_path)
         board_derived_assets: list[HermesContentFactoryAsset] = []
         for row in rows:
@@ -7854,14 +7922,28 @@ def _detect_preview_cells(source: Path, *, count: int) -> tuple[list[tuple[int,
             width, height = image.size
         if width <= 0 or height <= 0:
             raise ValueError(f"Invalid single reference image size: {source}")
-        return [(0, 0, width, height)], {
-            "columns": 1,
-            "rows": 1,
-            "mode": "native_single_reference",
-        }
+        return _native_single_reference_cells(width, height)
     return detect_preview_cells(source, count=count)
 
 
+def _detect_preview_cells_in_rgb(rgb, *, count: int) -> tuple[list[tuple[int, int, int, int]], dict[str, Any]]:
+    """Same contract as ``_detect_preview_cells`` for an already decoded board."""
+    if int(count or 0) == 1:
+        height, width = rgb.shape[:2]
+        if width <= 0 or height <= 0:
+            raise ValueError("Invalid single reference image size")
+        return _native_single_reference_cells(width, height)
+    return detect_preview_cells_in_rgb(rgb, count=count)
+
+
+def _native_single_reference_cells(width: int, height: int) -> tuple[list[tuple[int, int, int, int]], dict[str, Any]]:
+    return [(0, 0, width, height)], {
+        "columns": 1,
+        "rows": 1,
+        "mode": "native_single_reference",
+    }
+
+
 def _reference_frame_geometry(aspect_ratio: str) -> tuple[tuple[int, int], float]:
     normalized = str(aspect_ratio or "9:16").strip().replace("x", ":").replace("/", ":")
     try:
@@ -8394,6 +8476,7 @@ def _split_approved_preview(
         for asset in selected
         if str(asset.file_path or "").strip()
     }
+    split_requests: list[StoryboardSplitRequest] = []
     global_index = 0
     for board_index, (source, board_panel_count) in enumerate(zip(sources, board_counts), 1):
         try:
@@ -8403,44 +8486,62 @@ def _split_approved_preview(
                 source = source_copy
         except Exception:
             pass
-        cells, layout = _detect_preview_cells(source, count=board_panel_count)
-        board_layouts.append({
-            "board_index": board_index,
-            "source": str(source),
-            "panel_count": board_panel_count,
-            "layout": layout,
-        })
-        for local_index, (x, y, cell_width, cell_height) in enumerate(cells, 1):
-            global_index += 1
-            target = output_dir / f"final_assets-{global_index}.png"
-            try:
-                subprocess.run(
-                    [
-                        FFMPEG_BIN, "-y", "-i", str(source),
-                        "-vf", f"crop={cell_width}:{cell_height}:{x}:{y}",
-                        "-frames:v", "1", str(target),
-                    ],
-                    check=True, capture_output=True, text=True, timeout=120,
-                )
-            except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as exc:
-                stderr = str(exc.stderr or "") if isinstance(exc, subprocess.CalledProcessError) else ""
-                stdout = str(exc.stdout or "") if isinstance(exc, subprocess.CalledProcessError) else ""
+        split_requests.append(StoryboardSplitRequest(
+            source=source,
+            count=board_panel_count,
+            targets=[
+                output_dir / f"final_assets-{global_index + offset}.png"
+                for offset in range(1, board_panel_count + 1)
+            ],
+        ))
+        global_index += board_panel_count
+
+    def record_board_layouts() -> None:
+        # Layouts come from the requests themselves, so they stay paired with
+        # their source whatever order the batch detects boards in.
+        board_layouts[:] = [
+            {
+                "board_index": board_index,
+                "source": str(request.source),
+                "panel_count": request.count,
+                "layout": request.layout,
+            }
+            for board_index, request in enumerate(split_requests, 1)
+            if request.cells
+        ]
+
+    # All boards are decoded once and every panel is encoded on one pool,
+    # rather than forking ffmpeg for each crop.
+    try:
+        split_storyboard_boards(split_requests, detector=_detect_preview_cells_in_rgb)
+    except OSError as exc:
+        record_board_layouts()
+        for request in split_requests:
+            for target in request.targets:
                 target.unlink(missing_ok=True)
-                state = dict(project.state_json or {})
-                state["last_split_layout"] = {"boards": board_layouts, "panel_count": count}
-                state["last_split_manifest"] = split_manifest
-                state["last_split_rejected"] = {
-                    "reasons": [f"ffmpeg crop failed for panel {global_index}: {(stderr or stdout or str(exc))[:400]}"],
-                    "action": "rebuild_with_chatgpt_final_assets",
-                    "rejected_at": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
-                }
-                project.state_json = state
-                db.flush()
-                raise ValueError(
-                    "FINAL_ASSETS_SPLIT_UNSAFE: local storyboard split failed; "
-                    f"board={board_index}; panel={global_index}; crop={cell_width}:{cell_height}:{x}:{y}; "
-                    f"{(stderr or stdout or str(exc))[:600]}"
-                ) from exc
+        state = dict(project.state_json or {})
+        state["last_split_layout"] = {"boards": board_layouts, "panel_count": count}
+        state["last_split_manifest"] = split_manifest
+        state["last_split_rejected"] = {
+            "reasons": [f"panel encode failed: {str(exc)[:400]}"],
+            "action": "rebuild_with_chatgpt_final_assets",
+            "rejected_at": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+        }
+        project.state_json = state
+        db.flush()
+        raise ValueError(
+            "FINAL_ASSETS_SPLIT_UNSAFE: local storyboard split failed; "
+            f"boards={len(split_requests)}; {str(exc)[:600]}"
+        ) from exc
+    record_board_layouts()
+
+    global_index = 0
+    for board_index, request in enumerate(split_requests, 1):
+        source = request.source
+        for local_index, (target, (x, y, cell_width, cell_height)) in enumerate(
+            zip(request.targets, request.cells), 1,
+        ):
+            global_index += 1
             target.chmod(0o644)
             if not target.is_file() or target.stat().st_size < 1024:
                 raise RuntimeError(f"Could not split preview panel {global_index}")
@@ -17051,11 +17152,41 @@ def _uses_only_local_voiceover(params: dict[str, Any]) -> bool:
     )
 
 
+def _segment_execution_qa_policy_is_stale(task: KieTask) -> bool:
+    local_meta = dict(get_task_local_meta(task) or {})
+    # A final-composition intent failure is not a stale per-segment gate.
+    # Re-running only the segment execution reviewer can legitimately pass the
+    # same pixels while the composition-level reviewer still rejects spoken
+    # copy or cross-segment continuity.  Treating that pass as a policy
+    # reconciliation reactivates the same paid result and creates an endless
+    # wait/review loop instead of a new bounded repair attempt.
+    if (
+        isinstance(local_meta.get("final_intent_qa_failure"), dict)
+        or "CONTENT_FINAL_INTENT_QA_FAILED" in str(task.fail_msg or "")
+    ):
+        return False
+    prior_review = dict(local_meta.get("segment_execution_review") or {})
+    return (
+        str(prior_review.get("policy_version") or "").strip()
+        != SEGMENT_EXECUTION_VIDEO_REVIEW_POLICY_VERSION
+    )
+
+
+def _product_visual_qa_policy_is_stale(task: KieTask) -> bool:
+    local_meta = dict(get_task_local_meta(task) or {})
+    prior_review = dict(local_meta.get("provider_product_video_review") or {})
+    return (
+        str(prior_review.get("policy_version") or "").strip()
+        != PRODUCT_REFERENCE_VIDEO_REVIEW_POLICY_VERSION
+    )
+
+
 def _reconcile_segment_execution_qa_after_policy_change(
     db,
     *,
     project: HermesContentFactoryProject,
     task: KieTask,
+    prefetched: dict[tuple[str, int, str], VisionReviewOutcome] | None = None,
 ) -> bool:
     """Re-review a downloaded clip when only the semantic gate changed.
 
@@ -17066,24 +17197,10 @@ def _reconcile_segment_execution_qa_after_policy_change(
     and only after the new multimodal gate returns a non-blocking verdict.
     """
 
-    local_meta = dict(get_task_local_meta(task) or {})
-    # A final-composition intent failure is not a stale per-segment gate.
-    # Re-running only the segment execution reviewer can legitimately pass the
-    # same pixels while the composition-level reviewer still rejects spoken
-    # copy or cross-segment continuity.  Treating that pass as a policy
-    # reconciliation reactivates the same paid result and creates an endless
-    # wait/review loop instead of a new bounded repair attempt.
-    if (
-        isinstance(local_meta.get("final_intent_qa_failure"), dict)
-        or "CONTENT_FINAL_INTENT_QA_FAILED" in str(task.fail_msg or "")
-    ):
+    if not _segment_execution_qa_policy_is_stale(task):
         return False
+    local_meta = dict(get_task_local_meta(task) or {})
     prior_review = dict(local_meta.get("segment_execution_review") or {})
-    if (
-        str(prior_review.get("policy_version") or "").strip()
-        == SEGMENT_EXECUTION_VIDEO_REVIEW_POLICY_VERSION
-    ):
-        return False
     try:
         source, _result_file = _result_video_for_task(db, task)
         review = _review_provider_segment_execution(
@@ -17091,6 +17208,7 @@ def _reconcile_segment_execution_qa_after_policy_change(
             project=project,
             source=source,
             task=task,
+            prefetched=prefetched,
         )
     except (ContentFactoryApiError, RuntimeError, ValueError):
         return False
@@ -17118,6 +17236,7 @@ def _reconcile_product_visual_qa_after_policy_change(
     *,
     project: HermesContentFactoryProject,
     task: KieTask,
+    prefetched: dict[tuple[str, int, str], VisionReviewOutcome] | None = None,
 ) -> bool:
     """Re-review an already downloaded product clip under a newer policy.
 
@@ -17126,13 +17245,10 @@ def _reconcile_product_visual_qa_after_policy_change(
     instead of submitting another provider task.
     """
 
+    if not _product_visual_qa_policy_is_stale(task):
+        return False
     local_meta = dict(get_task_local_meta(task) or {})
     prior_review = dict(local_meta.get("provider_product_video_review") or {})
-    if (
-        str(prior_review.get("policy_version") or "").strip()
-        == PRODUCT_REFERENCE_VIDEO_REVIEW_POLICY_VERSION
-    ):
-        return False
     try:
         source, _result_file = _result_video_for_task(db, task)
         review = _review_provider_product_segment(
@@ -17140,6 +17256,7 @@ def _reconcile_product_visual_qa_after_policy_change(
             project=project,
             source=source,
             task=task,
+            prefetched=prefetched,
         )
     except (ContentFactoryApiError, RuntimeError, ValueError):
         return False
@@ -17162,6 +17279,32 @@ def _reconcile_product_visual_qa_after_policy_change(
     return True
 
 
+def _policy_reconciliation_review_candidates(
+    db,
+    tasks: Iterable[KieTask],
+) -> list[tuple[KieTask, Path, tuple[str, ...]]]:
+    """Failed clips that only a newer review policy may reactivate."""
+    candidates: list[tuple[KieTask, Path, tuple[str, ...]]] = []
+    for task in tasks:
+        failure_code = _normalize_segment_release_failure_code(task)
+        if failure_code == SEGMENT_EXECUTION_QA_FAIL_CODE:
+            stale = _segment_execution_qa_policy_is_stale(task)
+            kinds: tuple[str, ...] = ("segment_execution_review",)
+        elif failure_code == PRODUCT_VISUAL_QA_FAIL_CODE:
+            stale = _product_visual_qa_policy_is_stale(task)
+            kinds = ("provider_product_video_review",)
+        else:
+            continue
+        if not stale:
+            continue
+        try:
+            source, _result_file = _result_video_for_task(db, task)
+        except ValueError:
+            continue
+        candidates.append((task, source, kinds))
+    return candidates
+
+
 def _restore_inherited_final_intent_repair(
     db,
     *,
@@ -17813,6 +17956,18 @@ def _retry_failed_video_segments(
             )
 
     affected_video_indices: set[int] = set()
+    prefetched_reviews = _prefetch_segment_vision_reviews(
+        db,
+        project=project,
+        candidates=_policy_reconciliation_review_candidates(
+            db,
+            [
+                failed
+                for failed in failed_tasks
+                if int(failed.id) not in restored_dependency_ids
+            ],
+        ),
+    )
     for failed in failed_tasks:
         # Retrying an earlier segment restores its downstream chain in-place.
         # ``failed_tasks`` still contains those same ORM objects from the
@@ -17834,6 +17989,7 @@ def _retry_failed_video_segments(
                 db,
                 project=project,
                 task=failed,
+                prefetched=prefetched_reviews,
             )
         ):
             policy_reconciled_task_ids.append(int(failed.id))
@@ -17844,6 +18000,7 @@ def _retry_failed_video_segments(
                 db,
                 project=project,
                 task=failed,
+                prefetched=prefetched_reviews,
             )
         ):
             policy_reconciled_task_ids.append(int(failed.id))
@@ -20976,20 +21133,12 @@ def _queue_ai_video_tasks(
 
 
 def _contact_sheet(video_path: Path, target: Path) -> None:
-    probe = subprocess.run(
-        [FFPROBE_BIN, "-v", "error", "-show_entries", "format=duration", "-of", "default=nw=1:nk=1", str(video_path)],
-        check=True, capture_output=True, text=True, timeout=30,
-    )
-    duration = max(1.0, float(probe.stdout.strip() or 10.0))
-    target.parent.mkdir(parents=True, exist_ok=True)
-    fps = 6.0 / duration
-    subprocess.run(
-        [
-            FFMPEG_BIN, "-y", "-i", str(video_path), "-an",
-            "-vf", f"fps={fps:.8f},scale=480:-2,tile=3x2:padding=4:margin=8",
-            "-frames:v", "1", "-q:v", "2", str(target),
-        ],
-        check=True, capture_output=True, text=True, timeout=180,
+    duration = max(1.0, probe_media(video_path).duration_seconds or 10.0)
+    render_contact_sheet(
+        video_path,
+        uniform_times(duration, 6),
+        SheetLayout(tile_width=480, columns=3, rows=2, padding=4, margin=8, quality=95),
+        target,
     )
     if not target.is_file() or target.stat().st_size < 1024:
         raise RuntimeError(f"FFmpeg did not create a usable contact sheet for {video_path}")
@@ -21019,53 +21168,18 @@ def _segment_execution_contact_sheet(
         timestamp = min(max(0.0, float(value)), max(0.0, duration - 0.05))
         if not samples or abs(timestamp - samples[-1]) >= 0.04:
             samples.append(timestamp)
-    target.parent.mkdir(parents=True, exist_ok=True)
-    frames: list[Image.Image] = []
-    with tempfile.TemporaryDirectory(prefix="cf-execution-sheet-") as temp_dir:
-        for index, timestamp in enumerate(samples, 1):
-            frame_path = Path(temp_dir) / f"frame-{index:02d}.jpg"
-            result = subprocess.run(
-                [
-                    FFMPEG_BIN, "-hide_banner", "-loglevel", "error", "-y",
-                    "-ss", f"{timestamp:.3f}", "-i", str(video_path),
-                    "-frames:v", "1", "-vf", "scale=360:-2",
-                    "-q:v", "2", str(frame_path),
-                ],
-                check=False,
-                capture_output=True,
-                text=True,
-                timeout=90,
-            )
-            if (
-                result.returncode != 0
-                or not frame_path.is_file()
-                or frame_path.stat().st_size < 1024
-            ):
-                raise RuntimeError(
-                    "Could not sample segment execution frame: "
-                    + str(result.stderr or result.stdout or "")[:400]
-                )
-            # Execution review must inspect provider pixels only. Inspector
-            # decorations previously burned into the frame were misclassified
-            # as real caption/watermark-cover bands.
-            frames.append(Image.open(frame_path).convert("RGB").copy())
-    if not frames:
-        raise RuntimeError("No segment execution frames were sampled")
-    columns = 4
-    rows = math.ceil(len(frames) / columns)
-    width = max(frame.width for frame in frames)
-    height = max(frame.height for frame in frames)
-    sheet = Image.new(
-        "RGB",
-        (columns * width, rows * height),
-        (22, 22, 22),
-    )
-    for index, frame in enumerate(frames):
-        sheet.paste(
-            frame,
-            ((index % columns) * width, (index // columns) * height),
-        )
-    sheet.save(target, format="JPEG", quality=90, optimize=True)
+    # Execution review must inspect provider pixels only. Inspector
+    # decorations previously burned into the frame were misclassified as real
+    # caption/watermark-cover bands, so tiles are pasted without overlays.
+    try:
+        render_contact_sheet(
+            video_path,
+            samples,
+            SheetLayout(tile_width=360, columns=4, background=(22, 22, 22), quality=90),
+            target,
+        )
+    except MediaFrameError as exc:
+        raise RuntimeError(f"Could not sample segment execution frame: {str(exc)[:400]}") from exc
     if not target.is_file() or target.stat().st_size < 1024:
         raise RuntimeError(
             f"Could not create segment execution contact sheet for {video_path}"
@@ -21164,13 +21278,17 @@ def _segment_requirement_contract_for_review(
     return scoped, start_seconds, end_seconds
 
 
-def _review_provider_segment_execution(
+def _segment_execution_review_job(
     db: Session,
     *,
     project: HermesContentFactoryProject,
     source: Path,
     task: KieTask,
-) -> dict[str, Any] | None:
+) -> tuple[dict[str, Any] | None, VisionReviewJob | None]:
+    """Return ``(cached pass, None)`` or ``(None, pending job)``.
+
+    ``(None, None)`` means the task carries no signed execution contract.
+    """
     params = dict(task.input_json or {})
     contract = dict(
         params.get("content_factory_segment_execution_contract") or {}
@@ -21180,7 +21298,7 @@ def _review_provider_segment_execution(
         != "signed_production_plan"
         or not contract
     ):
-        return None
+        return None, None
     source_sha256 = _file_sha256(source)
     local_meta = dict(get_task_local_meta(task) or {})
     cached = dict(local_meta.get("segment_execution_review") or {})
@@ -21190,7 +21308,7 @@ def _review_provider_segment_execution(
         and str(cached.get("source_sha256") or "") == source_sha256
         and str(cached.get("status") or "").lower() == "pass"
     ):
-        return cached
+        return cached, None
     review_dir = (
         CONTENT_FACTORY_STORAGE_ROOT
         / f"workspace_{int(project.workspace_id)}"
@@ -21201,7 +21319,6 @@ def _review_provider_segment_execution(
     sheet_path = (
         review_dir / f"task-{int(task.id)}-{source_sha256[:16]}.jpg"
     )
-    _segment_execution_contact_sheet(source, sheet_path)
     scoped_requirements, global_start, global_end = (
         _segment_requirement_contract_for_review(
             project,
@@ -21268,24 +21385,49 @@ def _review_provider_segment_execution(
             for item in list(params.get("reference_file_paths") or [])
         ),
     }
-    verdict = review_provider_rendered_segment_execution_api(
-        db,
-        contact_sheet_path=str(sheet_path),
-        segment_contract=review_contract,
-        execution_id=(
-            f"{params.get('content_factory_media_manifest_sha256') or ''}:"
-            f"task-{int(task.id)}:{source_sha256}"
-        ),
-        requirement_contract=scoped_requirements,
-        forbid_overlay_bands=bool(
-            params.get("content_factory_forbid_overlay_bands")
-        ),
+
+    # The review runs on a worker thread: it must only see plain values, never
+    # attributes of ``task``, which belongs to the caller's session.
+    task_id = int(task.id)
+    execution_id = (
+        f"{params.get('content_factory_media_manifest_sha256') or ''}:"
+        f"task-{task_id}:{source_sha256}"
+    )
+
+    def _review(review_db: Session) -> dict[str, Any]:
+        return review_provider_rendered_segment_execution_api(
+            review_db,
+            contact_sheet_path=str(sheet_path),
+            segment_contract=review_contract,
+            execution_id=execution_id,
+            requirement_contract=scoped_requirements,
+            forbid_overlay_bands=bool(
+                params.get("content_factory_forbid_overlay_bands")
+            ),
+        )
+
+    return None, VisionReviewJob(
+        key=("segment_execution_review", task_id, source_sha256),
+        render=partial(_segment_execution_contact_sheet, source, sheet_path),
+        review=_review,
+        record={
+            "source_sha256": source_sha256,
+            "contact_sheet_path": str(sheet_path),
+        },
     )
+
+
+def _record_segment_execution_review(
+    db: Session,
+    task: KieTask,
+    job: VisionReviewJob,
+    outcome: VisionReviewOutcome,
+) -> dict[str, Any]:
     review = {
-        **dict(verdict),
-        "source_sha256": source_sha256,
-        "contact_sheet_path": str(sheet_path),
+        **outcome.result(),
+        **job.record,
         "reviewed_at": _stage_now().isoformat(),
+        "review_latency": outcome.latency(),
     }
     set_task_local_meta(task, segment_execution_review=review)
     db.add(task)
@@ -21327,14 +21469,34 @@ def _review_provider_segment_execution(
     return review
 
 
-def _review_provider_product_segment(
+def _review_provider_segment_execution(
     db: Session,
     *,
     project: HermesContentFactoryProject,
     source: Path,
     task: KieTask,
-) -> dict[str, Any]:
-    """Review a generated product segment once and cache its bounded verdict."""
+    prefetched: dict[tuple[str, int, str], VisionReviewOutcome] | None = None,
+) -> dict[str, Any] | None:
+    cached, job = _segment_execution_review_job(
+        db,
+        project=project,
+        source=source,
+        task=task,
+    )
+    if job is None:
+        return cached
+    outcome = dict(prefetched or {}).get(job.key) or execute_vision_review_job(job, db)
+    return _record_segment_execution_review(db, task, job, outcome)
+
+
+def _product_segment_review_job(
+    db: Session,
+    *,
+    project: HermesContentFactoryProject,
+    source: Path,
+    task: KieTask,
+) -> tuple[dict[str, Any] | None, VisionReviewJob | None]:
+    """Return ``(cached pass, None)`` or ``(None, pending job)``."""
     params = dict(task.input_json or {})
     product_ref = next(
         (
@@ -21361,7 +21523,7 @@ def _review_provider_product_segment(
         and str(cached.get("product_sha256") or "") == product_sha256
         and str(cached.get("status") or "").lower() == "pass"
     ):
-        return cached
+        return cached, None
     review_dir = (
         CONTENT_FACTORY_STORAGE_ROOT
         / f"workspace_{int(project.workspace_id)}"
@@ -21370,7 +21532,6 @@ def _review_provider_product_segment(
         / "product_video_reviews"
     )
     contact_sheet = review_dir / f"task-{int(task.id)}-{source_sha256[:16]}.jpg"
-    _contact_sheet(source, contact_sheet)
     execution_contract = dict(
         params.get("content_factory_segment_execution_contract") or {}
     )
@@ -21388,22 +21549,45 @@ def _review_provider_product_segment(
         )
         if execution_contract.get(key) not in (None, "", [], {})
     }
-    verdict = review_provider_rendered_product_video_api(
-        db,
-        contact_sheet_path=str(contact_sheet),
-        product_reference_path=str(product_path),
-        execution_id=(
-            f"{params.get('content_factory_media_manifest_sha256') or ''}:"
-            f"task-{int(task.id)}:{source_sha256}"
-        ),
-        segment_context=segment_context,
+
+    task_id = int(task.id)
+    execution_id = (
+        f"{params.get('content_factory_media_manifest_sha256') or ''}:"
+        f"task-{task_id}:{source_sha256}"
     )
+
+    def _review(review_db: Session) -> dict[str, Any]:
+        return review_provider_rendered_product_video_api(
+            review_db,
+            contact_sheet_path=str(contact_sheet),
+            product_reference_path=str(product_path),
+            execution_id=execution_id,
+            segment_context=segment_context,
+        )
+
+    return None, VisionReviewJob(
+        key=("provider_product_video_review", task_id, source_sha256),
+        render=partial(_contact_sheet, source, contact_sheet),
+        review=_review,
+        record={
+            "source_sha256": source_sha256,
+            "product_sha256": product_sha256,
+            "contact_sheet_path": str(contact_sheet),
+        },
+    )
+
+
+def _record_product_segment_review(
+    db: Session,
+    task: KieTask,
+    job: VisionReviewJob,
+    outcome: VisionReviewOutcome,
+) -> dict[str, Any]:
     review = {
-        **dict(verdict),
-        "source_sha256": source_sha256,
-        "product_sha256": product_sha256,
-        "contact_sheet_path": str(contact_sheet),
+        **outcome.result(),
+        **job.record,
         "reviewed_at": _stage_now().isoformat(),
+        "review_latency": outcome.latency(),
     }
     set_task_local_meta(task, provider_product_video_review=review)
     db.add(task)
@@ -21421,6 +21605,84 @@ def _review_provider_product_segment(
     return review
 
 
+def _review_provider_product_segment(
+    db: Session,
+    *,
+    project: HermesContentFactoryProject,
+    source: Path,
+    task: KieTask,
+    prefetched: dict[tuple[str, int, str], VisionReviewOutcome] | None = None,
+) -> dict[str, Any]:
+    """Review a generated product segment once and cache its bounded verdict."""
+    cached, job = _product_segment_review_job(
+        db,
+        project=project,
+        source=source,
+        task=task,
+    )
+    if job is None:
+        return dict(cached or {})
+    outcome = dict(prefetched or {}).get(job.key) or execute_vision_review_job(job, db)
+    return _record_product_segment_review(db, task, job, outcome)
+
+
+_VISION_REVIEW_STEPS: dict[str, tuple[Callable[..., Any], Callable[..., dict[str, Any]]]] = {
+    "segment_execution_review": (
+        _segment_execution_review_job,
+        _record_segment_execution_review,
+    ),
+    "provider_product_video_review": (
+        _product_segment_review_job,
+        _record_product_segment_review,
+    ),
+}
+
+
+def _segment_review_kinds(product_review: bool) -> tuple[str, ...]:
+    if product_review:
+        return ("segment_execution_review", "provider_product_video_review")
+    return ("segment_execution_review",)
+
+
+def _prefetch_segment_vision_reviews(
+    db: Session,
+    *,
+    project: HermesContentFactoryProject,
+    candidates: Iterable[tuple[KieTask, Path, tuple[str, ...]]],
+) -> dict[tuple[str, int, str], VisionReviewOutcome]:
+    """Review ``(task, source, review kinds)`` candidates concurrently.
+
+    Serial gates then walk the same segments with the returned outcomes and
+    never wait on a vision call themselves.  Verdicts are recorded here so a
+    gate that stops at its first failure keeps the passes already paid for;
+    preparation errors are left for the serial reviewer to raise in place.
+    """
+    jobs: list[tuple[KieTask, VisionReviewJob]] = []
+    for task, source, kinds in candidates:
+        for kind in kinds:
+            prepare, _record = _VISION_REVIEW_STEPS[kind]
+            try:
+                _cached, job = prepare(db, project=project, source=source, task=task)
+            except (ContentFactoryApiError, OSError, RuntimeError, ValueError):
+                continue
+            if job is not None:
+                jobs.append((task, job))
+    if len(jobs) < 2:
+        return {}
+    outcomes = run_vision_review_jobs([job for _task, job in jobs], db=db)
+    for task, job in jobs:
+        outcome = outcomes[job.key]
+        if outcome.error is not None:
+            continue
+        _prepare, record = _VISION_REVIEW_STEPS[job.key[0]]
+        try:
+            record(db, task, job, outcome)
+        except ValueError:
+            # Blocking verdicts are raised again by the serial gate.
+            continue
+    return outcomes
+
+
 def _result_video_for_task(db, task: KieTask) -> tuple[Path, KieFile]:
     result_files = db.query(KieFile).filter(
         KieFile.task_id == task.id,
@@ -21442,6 +21704,7 @@ def _segment_release_quality_gate(
     project: HermesContentFactoryProject,
     task: KieTask,
     source: Path,
+    prefetched_reviews: dict[tuple[str, int, str], VisionReviewOutcome] | None = None,
 ) -> dict[str, Any]:
     """Evaluate a segment without rewriting its provider transport result.
 
@@ -21512,6 +21775,7 @@ def _segment_release_quality_gate(
             project=project,
             source=source,
             task=task,
+            prefetched=prefetched_reviews,
         )
     except (RuntimeError, ValueError) as exc:
         diagnostic = str(exc)[:700]
@@ -21534,6 +21798,7 @@ def _segment_release_quality_gate(
                 project=project,
                 source=source,
                 task=task,
+                prefetched=prefetched_reviews,
             )
         except (RuntimeError, ValueError) as exc:
             diagnostic = str(exc)[:700]
@@ -21689,6 +21954,49 @@ def _compatible_chained_reference_route(
     return references, None
 
 
+def _dependency_release_review_candidates(
+    db,
+    project: HermesContentFactoryProject,
+    groups: list[dict[str, Any]],
+    task_by_id: dict[int, KieTask],
+) -> list[tuple[KieTask, Path, tuple[str, ...]]]:
+    """Downloaded predecessors whose successors wait on the release gate."""
+    candidates: list[tuple[KieTask, Path, tuple[str, ...]]] = []
+    for group in groups:
+        if _media_group_source_is_superseded(db, project, dict(group)):
+            continue
+        segments = sorted(
+            list(group.get("segments") or []),
+            key=lambda item: int(item.get("segment_index") or 0),
+        )
+        for previous_segment, current_segment in zip(segments, segments[1:]):
+            previous_task = task_by_id.get(int(previous_segment.get("task_id") or 0))
+            current_task = task_by_id.get(int(current_segment.get("task_id") or 0))
+            if (
+                previous_task is None
+                or current_task is None
+                or str(current_task.state or "").lower() != "waiting_dependency"
+                or str(previous_task.state or "").lower() != "success"
+            ):
+                continue
+            try:
+                source, _result_file = _result_video_for_task(db, previous_task)
+            except ValueError:
+                continue
+            candidates.append((
+                previous_task,
+                source,
+                _segment_review_kinds(
+                    bool(
+                        dict(previous_task.input_json or {}).get(
+                            "content_factory_product_anchor_required"
+                        )
+                    )
+                ),
+            ))
+    return candidates
+
+
 def _release_ready_segment_dependencies(
     db,
     project: HermesContentFactoryProject,
@@ -21788,6 +22096,16 @@ def _release_ready_segment_dependencies(
                 )
         return [int(task.id) for task in released]
 
+    prefetched_reviews = _prefetch_segment_vision_reviews(
+        db,
+        project=project,
+        candidates=_dependency_release_review_candidates(
+            db,
+            project,
+            groups,
+            task_by_id,
+        ),
+    )
     for group in groups:
         segments = sorted(list(group.get("segments") or []), key=lambda item: int(item.get("segment_index") or 0))
         if _media_group_source_is_superseded(db, project, dict(group)):
@@ -21829,6 +22147,7 @@ def _release_ready_segment_dependencies(
                 project=project,
                 task=previous_task,
                 source=previous_video,
+                prefetched_reviews=prefetched_reviews,
             )
             if str(release_quality.get("status") or "") != "PASS":
                 previous_segment["dependency_status"] = (
@@ -22552,22 +22871,10 @@ def _write_local_overlay_ass(
 
 
 def _video_dimensions(source: Path) -> tuple[int, int]:
-    result = subprocess.run(
-        [
-            FFPROBE_BIN, "-v", "error", "-select_streams", "v:0",
-            "-show_entries", "stream=width,height", "-of", "csv=s=x:p=0",
-            str(source),
-        ],
-        check=True,
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
-    raw = result.stdout.strip().lower()
-    match = re.fullmatch(r"(\d+)x(\d+)", raw)
-    if not match:
-        raise RuntimeError(f"Could not probe video dimensions for {source}: {raw}")
-    return int(match.group(1)), int(match.group(2))
+    probe = probe_media(source)
+    if probe.width <= 0 or probe.height <= 0:
+        raise RuntimeError(f"Could not probe video dimensions for {source}")
+    return probe.width, probe.height
 
 
 
@@ -23421,18 +23728,10 @@ def _invalidate_successful_segments_missing_continuity(
 
 
 def _video_has_audio_stream(source: Path) -> bool:
-    result = subprocess.run(
-        [
-            FFPROBE_BIN, "-v", "error", "-select_streams", "a:0",
-            "-show_entries", "stream=index", "-of", "csv=p=0",
-            str(source),
-        ],
-        check=False,
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
-    return result.returncode == 0 and bool(result.stdout.strip())
+    try:
+        return probe_media(source).has_audio
+    except MediaProbeError:
+        return False
 
 
 def _parse_aspect_ratio(value: Any) -> tuple[float, str]:
@@ -24729,6 +25028,24 @@ def _compose_segmented_videos(db, project: HermesContentFactoryProject, tasks: l
             continue
         postprocessed_paths: list[Path] = []
         local_postproduction: list[dict[str, Any]] = []
+        prefetched_reviews = _prefetch_segment_vision_reviews(
+            db,
+            project=project,
+            candidates=[
+                (
+                    task_by_id[int(task_id)],
+                    source_path,
+                    _segment_review_kinds(
+                        bool(segment.get("product_anchor_required"))
+                    ),
+                )
+                for segment, source_path, task_id in zip(
+                    segments,
+                    segment_paths,
+                    source_task_ids,
+                )
+            ],
+        )
         for segment, source_path, task_id in zip(
             segments,
             segment_paths,
@@ -24747,6 +25064,7 @@ def _compose_segmented_videos(db, project: HermesContentFactoryProject, tasks: l
                     project=project,
                     source=source_path,
                     task=task,
+                    prefetched=prefetched_reviews,
                 )
                 if bool(segment.get("product_anchor_required"))
                 else None
@@ -24757,6 +25075,7 @@ def _compose_segmented_videos(db, project: HermesContentFactoryProject, tasks: l
                     project=project,
                     source=source_path,
                     task=task,
+                    prefetched=prefetched_reviews,
                 )
                 if str(
                     dict(task.input_json or {}).get(
@@ -30542,23 +30861,9 @@ def _ffmpeg_binary() -> str:
     return FFMPEG_BIN if Path(FFMPEG_BIN).exists() else "ffmpeg"
 
 
-def _ffprobe_binary() -> str:
-    return FFPROBE_BIN if Path(FFPROBE_BIN).exists() else "ffprobe"
-
-
 def _probe_video_duration_seconds(video_path: Path) -> float:
     try:
-        output = subprocess.check_output(
-            [
-                _ffprobe_binary(),
-                "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                str(video_path),
-            ],
-            stderr=subprocess.STDOUT,
-        ).decode("utf-8", errors="ignore").strip()
-        return max(0.0, float(output)) if output else 0.0
+        return probe_media(video_path).duration_seconds
     except Exception:
         return 0.0
 
@@ -1,9 +1,7 @@
 from __future__ import annotations
 
-import json
 import logging
 import re
-import subprocess
 from pathlib import Path
 from typing import Any
 
@@ -15,6 +13,7 @@ from app.data.db import SessionLocal
 from app.data.models.oauth_tiktok_shop import OAuthTikTokShopShop
 from app.data.models.tiktok_shop import TikTokShopVideoContentAnalysis
 from app.services.gmvmax_creative_media_cache import resolve_creative_media
+from app.services.media_probe_index import probe_media
 from app.services.tiktok_shop_video_analysis import FINAL_STATUSES, _media_row, utcnow
 
 
@@ -34,17 +33,7 @@ def _minimal_result(row: TikTokShopVideoContentAnalysis) -> dict[str, object]:
 
 
 def _has_audio_stream(path: Path) -> bool:
-    result = subprocess.run(
-        [
-            "/opt/apps/bin/ffprobe", "-v", "error", "-select_streams", "a",
-            "-show_entries", "stream=index", "-of", "json", str(path),
-        ],
-        check=True,
-        capture_output=True,
-        text=True,
-        timeout=min(30, int(settings.HERMES_VIDEO_ANALYSIS_FFMPEG_TIMEOUT_SECONDS)),
-    )
-    return bool((json.loads(result.stdout or "{}") or {}).get("streams"))
+    return probe_media(path).has_audio
 
 
 def classify_whisper_result(result: dict[str, Any]) -> tuple[str, str | None, list[dict[str, Any]], str]:
@@ -28,17 +28,26 @@ from app.data.models.scheduling import ScheduleRun
 from app.data.models.ttb_entities import TTBAdvertiserStoreLink, TTBBindingConfig
 from app.data.models.ttb_gmvmax import TTBGmvMaxCampaign
 from app.gmvmax.services.campaign_cleanup import cleanup_campaign_tables
+from app.gmvmax.services.campaign_item_groups import (
+    backfill_catalog_item_group_range,
+    catalog_id_bounds,
+)
+from app.gmvmax.services.retention import RetentionEngine, RetentionTarget
+from app.gmvmax.services.report_pagination import REPORT_FILTER_ID_LIMIT
 from app.gmvmax.services.create_intent_recovery import (
     recover_incomplete_gmvmax_create_intents,
 )
 from app.services.ttb_client_factory import build_ttb_gmvmax_client
+from app.services.ttb_quota_planner import plan_for_auth
 from app.services.ttb_balances import select_latest_balance, sync_advertiser_balance
 from app.services.gmvmax_heating import run_creative_heating_cycle
 from app.services.gmvmax_creative_guard import run_creative_guard_cycle
+from app.services.gmvmax_creative_leaderboard import build_creative_leaderboard
 from app.services.gmvmax_hermes_daily_report import run_hermes_daily_report_cycle
 from app.services.gmvmax_hermes_advisor import run_hermes_advisor_cycle
 from app.services.gmvmax_smart_guard import run_smart_guard_cycle
 from app.services.gmvmax_creative_metrics import (
+    fetch_creative_rows_for_campaigns,
     sync_creative_metrics_10min_for_campaign,
 )
 from app.services.gmvmax_lifecycle import _derive_campaign_lifecycle
@@ -105,6 +114,17 @@ GMVMAX_CAMPAIGN_SNAPSHOT_TTL_DAYS = int(
 GMVMAX_CREATIVE_10MIN_TTL_DAYS = int(
     getattr(settings, "GMVMAX_CREATIVE_10MIN_TTL_DAYS", 90)
 )
+GMVMAX_GUARD_HEARTBEAT_TTL_DAYS = int(
+    getattr(settings, "GMVMAX_GUARD_HEARTBEAT_TTL_DAYS", 30)
+)
+GMVMAX_RETENTION_BATCH_SIZE = int(getattr(settings, "GMVMAX_RETENTION_BATCH_SIZE", 5000))
+GMVMAX_RETENTION_PAUSE_SECONDS = float(
+    getattr(settings, "GMVMAX_RETENTION_PAUSE_SECONDS", 0.05)
+)
+GMVMAX_RETENTION_MAX_SECONDS = float(getattr(settings, "GMVMAX_RETENTION_MAX_SECONDS", 0.0))
+GMVMAX_RETENTION_FUTURE_PARTITIONS = int(
+    getattr(settings, "GMVMAX_RETENTION_FUTURE_PARTITIONS", 7)
+)
 
 BALANCE_FETCH_MIN_INTERVAL_SECONDS = int(
     getattr(settings, "TTB_BALANCE_MIN_FETCH_INTERVAL_SECONDS", 300)
@@ -774,6 +794,16 @@ def _record_creative_10min_result(
     return True
 
 
+def _retention_engine(db: Session) -> RetentionEngine:
+    return RetentionEngine(
+        db,
+        batch_size=GMVMAX_RETENTION_BATCH_SIZE,
+        pause_seconds=GMVMAX_RETENTION_PAUSE_SECONDS,
+        max_seconds=GMVMAX_RETENTION_MAX_SECONDS or None,
+        future_partitions=GMVMAX_RETENTION_FUTURE_PARTITIONS,
+    )
+
+
 @celery_app.task(
     name="gmvmax.cleanup_overview_snapshots",
     queue="gmvmax",
@@ -784,17 +814,20 @@ def cleanup_overview_snapshots() -> int:
     cutoff = date.today() - timedelta(days=GMVMAX_OVERVIEW_SNAPSHOT_TTL_DAYS)
     db = _db_session()
     try:
-        deleted = (
-            db.query(GmvOverviewSnapshot)
-            .filter(GmvOverviewSnapshot.end_date < cutoff)
-            .delete(synchronize_session=False)
+        target = RetentionTarget(
+            "overview_snapshots", GmvOverviewSnapshot.__table__, "end_date", cutoff
         )
-        db.commit()
+        (result,) = _retention_engine(db).run([target])
         logger.info(
             "gmvmax overview snapshots cleanup done",
-            extra={"cutoff": cutoff.isoformat(), "deleted": int(deleted)},
+            extra={
+                "cutoff": cutoff.isoformat(),
+                "deleted": result.rows,
+                "bytes": result.bytes,
+                "strategy": result.strategy,
+            },
         )
-        return int(deleted)
+        return result.rows
     finally:
         _close_session(db)
 
@@ -814,6 +847,8 @@ def cleanup_campaign_tables_task() -> dict:
             daily_retention_days=GMVMAX_CAMPAIGN_METRICS_DAILY_TTL_DAYS,
             snapshot_retention_days=GMVMAX_CAMPAIGN_SNAPSHOT_TTL_DAYS,
             creative_10min_retention_days=GMVMAX_CREATIVE_10MIN_TTL_DAYS,
+            guard_heartbeat_retention_days=GMVMAX_GUARD_HEARTBEAT_TTL_DAYS,
+            engine=_retention_engine(db),
         )
         return result
     finally:
@@ -1277,6 +1312,46 @@ def hermes_daily_report_task(report_date: str | None = None, force: bool = False
         _close_session(db)
 
 
+@celery_app.task(
+    name="gmvmax.refresh_creative_leaderboard",
+    queue="gmvmax",
+)
+def refresh_creative_leaderboard_task(
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    item_group_key: str,
+    lookback_days: int,
+    metric_start_date: str,
+) -> dict[str, Any]:
+    """Build a Hermes creative leaderboard a candidate page found missing or stale."""
+
+    db = _db_session()
+    try:
+        built = build_creative_leaderboard(
+            db,
+            workspace_id=int(workspace_id),
+            auth_id=int(auth_id),
+            advertiser_id=str(advertiser_id),
+            store_id=str(store_id),
+            item_group_key=str(item_group_key or ""),
+            lookback_days=int(lookback_days),
+            metric_start_date=date.fromisoformat(str(metric_start_date)),
+        )
+        db.commit()
+        return {"built": built}
+    except Exception:  # noqa: BLE001
+        db.rollback()
+        logger.exception(
+            "gmvmax creative leaderboard build failed",
+            extra={"store_id": str(store_id), "item_group_key": str(item_group_key or "")},
+        )
+        raise
+    finally:
+        _close_session(db)
+
+
 @celery_app.task(
     bind=True,
     name="gmvmax.reconcile_campaign_status",
@@ -1345,6 +1420,72 @@ def reconcile_campaign_status(self, batch_size: int = 500) -> dict:
     return {"status": "ok", "scanned": scanned, "updated": updated}
 
 
+@celery_app.task(
+    name="gmvmax.backfill_catalog_item_groups",
+    queue="gmvmax",
+)
+def backfill_catalog_item_groups_task(chunk_size: int = 5000) -> dict[str, Any]:
+    """Fan the catalog out in primary-key ranges for item-group backfill chunks."""
+
+    db = _db_session()
+    try:
+        bounds = catalog_id_bounds(db)
+    finally:
+        _close_session(db)
+    if bounds is None:
+        return {"chunks": 0, "queued": 0}
+
+    low, high = bounds
+    step = max(1, int(chunk_size))
+    chunks = 0
+    queued = 0
+    for start_id in range(low, high + 1, step):
+        chunks += 1
+        end_id = min(start_id + step, high + 1)
+        try:
+            celery_app.send_task(
+                "gmvmax.backfill_catalog_item_group_chunk",
+                kwargs={"start_id": start_id, "end_id": end_id},
+                queue="gmvmax",
+            )
+            queued += 1
+        except Exception:  # noqa: BLE001
+            logger.exception(
+                "gmvmax catalog item group chunk enqueue failed",
+                extra={"start_id": start_id, "end_id": end_id},
+            )
+    return {"chunks": chunks, "queued": queued}
+
+
+@celery_app.task(
+    name="gmvmax.backfill_catalog_item_group_chunk",
+    queue="gmvmax",
+)
+def backfill_catalog_item_group_chunk_task(start_id: int, end_id: int) -> dict[str, Any]:
+    """Persist item-group relations parsed from one catalog id range."""
+
+    db = _db_session()
+    try:
+        result = backfill_catalog_item_group_range(
+            db, start_id=int(start_id), end_id=int(end_id)
+        )
+        db.commit()
+    except Exception:  # noqa: BLE001
+        db.rollback()
+        logger.exception(
+            "gmvmax catalog item group chunk failed",
+            extra={"start_id": start_id, "end_id": end_id},
+        )
+        raise
+    finally:
+        _close_session(db)
+    logger.info(
+        "gmvmax catalog item group chunk backfilled",
+        extra={"start_id": start_id, "end_id": end_id, **result},
+    )
+    return result
+
+
 @celery_app.task(
     bind=True,
     name="gmvmax.dispatch_account_syncs",
@@ -1358,6 +1499,7 @@ def dispatch_account_syncs_task(self, **_: Any) -> dict[str, Any]:
     dispatches: list[dict[str, Any]] = []
     failures: list[dict[str, Any]] = []
     disabled: list[dict[str, Any]] = []
+    deferred: list[dict[str, Any]] = []
     expired_ownerships = 0
     try:
         cleanup_result = db.execute(
@@ -1421,6 +1563,20 @@ def dispatch_account_syncs_task(self, **_: Any) -> dict[str, Any]:
                 )
                 continue
 
+            quota = plan_for_auth(db, "account_sync", auth_id=int(row.auth_id))
+            if not quota.admit:
+                # The schedule stays due; the next dispatcher tick plans again
+                # once guards and the control plane have their headroom.
+                deferred.append(
+                    {
+                        "schedule_id": int(row.id),
+                        "workspace_id": int(row.workspace_id),
+                        "auth_id": int(row.auth_id),
+                        "quota": quota.quota,
+                    }
+                )
+                continue
+
             # The schedule stores cadence only. Account scope is rebound from
             # the authoritative tenant binding on every due dispatch.
             row.advertiser_id = current_advertiser_id
@@ -1525,11 +1681,13 @@ def dispatch_account_syncs_task(self, **_: Any) -> dict[str, Any]:
 
     return {
         "status": "ok" if not failures else "partial",
-        "due": len(dispatches) + len(disabled),
+        "due": len(dispatches) + len(disabled) + len(deferred),
         "enqueued": len(dispatches) - len(failures),
         "failed": len(failures),
         "disabled": len(disabled),
         "disabled_schedules": disabled,
+        "deferred": len(deferred),
+        "deferred_schedules": deferred,
         "expired_ownerships_deleted": expired_ownerships,
         "failures": failures,
     }
@@ -2296,6 +2454,345 @@ def task_gmvmax_sync_creative_metrics_10min_for_campaign(
                 lock.release()
 
 
+def _acquire_creative_10min_writer(
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    campaign_id: str,
+    owner_token: str,
+) -> tuple[RedisDistributedLock, Any] | None:
+    """Take the Redis lock and durable fence of one creative fact writer."""
+
+    lock = build_creative_10min_sync_lock(
+        workspace_id=int(workspace_id),
+        auth_id=int(auth_id),
+        advertiser_id=str(advertiser_id),
+        campaign_id=str(campaign_id),
+        owner_token=owner_token,
+    )
+    if not lock.acquire(timeout=0.2, retry_interval=0.05):
+        return None
+    fence = None
+    fence_db = _db_session()
+    try:
+        fence = acquire_creative_10min_sync_fence(
+            fence_db,
+            redis_lock=lock,
+            workspace_id=int(workspace_id),
+            auth_id=int(auth_id),
+            advertiser_id=str(advertiser_id),
+            campaign_id=str(campaign_id),
+            owner_token=owner_token,
+        )
+        if fence is None:
+            fence_db.rollback()
+        else:
+            fence_db.commit()
+    except Exception:
+        fence_db.rollback()
+        lock.release()
+        raise
+    finally:
+        _close_session(fence_db)
+    if fence is None:
+        lock.release()
+        return None
+    return lock, fence
+
+
+def _release_creative_10min_writer(lock: RedisDistributedLock, fence: Any) -> None:
+    release_db = _db_session()
+    try:
+        release_sync_fence(release_db, fence=fence)
+        release_db.commit()
+    except Exception:  # noqa: BLE001
+        release_db.rollback()
+        logger.exception(
+            "gmvmax creative metrics durable fence release failed",
+            extra={"lease_name": getattr(fence, "lease_name", None)},
+        )
+    finally:
+        _close_session(release_db)
+        with contextlib.suppress(Exception):
+            lock.release()
+
+
+@celery_app.task(
+    bind=True,
+    name="gmvmax.sync_creative_metrics_10min_for_store",
+    queue="gmvmax",
+)
+def task_gmvmax_sync_creative_metrics_10min_for_store(
+    self,
+    *,
+    workspace_id: int,
+    provider: str,
+    auth_id: int,
+    advertiser_id: str,
+    store_id: str,
+    campaigns: list[dict[str, Any]],
+    start_date: str,
+    end_date: str,
+    **extra: Any,
+) -> dict:
+    """Refresh the creative 10-minute batches of many campaigns of one store.
+
+    Creative rows for every campaign are pulled in shared multi-campaign
+    report requests and split locally; each campaign is then written,
+    checked for completeness and committed on its own, under its own writer
+    lock and fence, exactly like the per-campaign task.  Failures are
+    recorded per campaign and picked up by the next sweep's backoff instead
+    of Celery retries, so one bad campaign cannot re-fetch the whole store.
+    """
+    owner_token = f"{self.request.id or 'creative-10min-store'}:{uuid4()}"
+    start = date.fromisoformat(str(start_date))
+    end = date.fromisoformat(str(end_date))
+    tokens = {
+        str(item["campaign_id"]): item.get("sync_attempt_token")
+        for item in campaigns
+        if item.get("campaign_id")
+    }
+    writers: dict[str, tuple[RedisDistributedLock, Any]] = {}
+    results: dict[str, dict[str, Any]] = {}
+    db = _db_session()
+
+    def _record_failure(campaign_id: str, error: BaseException | str) -> None:
+        writer = writers.get(campaign_id)
+        try:
+            _record_creative_10min_result(
+                db,
+                workspace_id=workspace_id,
+                auth_id=auth_id,
+                advertiser_id=str(advertiser_id),
+                campaign_id=campaign_id,
+                store_id=store_id,
+                attempt_token=tokens.get(campaign_id),
+                success=False,
+                error=error,
+            )
+            if writer is not None:
+                writer[1].assert_current(db)
+            db.commit()
+        except Exception:  # noqa: BLE001
+            db.rollback()
+            logger.exception(
+                "gmvmax creative 10min attempt state update failed",
+                extra={
+                    "workspace_id": workspace_id,
+                    "auth_id": auth_id,
+                    "advertiser_id": advertiser_id,
+                    "campaign_id": campaign_id,
+                },
+            )
+        results[campaign_id] = {"error": f"{type(error).__name__}: {error}"[:500]}
+
+    try:
+        scopes: dict[str, Any] = {}
+        for campaign_id in tokens:
+            writer = _acquire_creative_10min_writer(
+                workspace_id=int(workspace_id),
+                auth_id=int(auth_id),
+                advertiser_id=str(advertiser_id),
+                campaign_id=campaign_id,
+                owner_token=owner_token,
+            )
+            if writer is None:
+                _record_failure(
+                    campaign_id,
+                    RuntimeError("GMV Max creative metrics sync already running"),
+                )
+                continue
+            writers[campaign_id] = writer
+            campaign = _find_catalog_campaign_scope(
+                db,
+                workspace_id=workspace_id,
+                auth_id=auth_id,
+                advertiser_id=str(advertiser_id),
+                campaign_id=campaign_id,
+                store_id=store_id,
+            )
+            if campaign is None:
+                _record_failure(campaign_id, RuntimeError(f"campaign not found: {campaign_id}"))
+                continue
+            scopes[campaign_id] = campaign
+
+        async def _sync(client: Any) -> None:
+            try:
+                prefetched = await fetch_creative_rows_for_campaigns(
+                    db,
+                    client,
+                    advertiser_id=str(advertiser_id),
+                    store_id=str(store_id),
+                    campaigns=list(scopes.values()),
+                    start_date=start,
+                    end_date=end,
+                )
+            except Exception as exc:  # noqa: BLE001 - recorded per campaign
+                db.rollback()
+                logger.warning(
+                    "gmvmax creative 10min store fetch failed",
+                    exc_info=True,
+                    extra={
+                        "workspace_id": workspace_id,
+                        "auth_id": auth_id,
+                        "advertiser_id": advertiser_id,
+                        "store_id": store_id,
+                        "campaigns": len(scopes),
+                    },
+                )
+                for campaign_id in scopes:
+                    _record_failure(campaign_id, exc)
+                return
+            for campaign_id, campaign in scopes.items():
+                try:
+                    result = await sync_creative_metrics_10min_for_campaign(
+                        db,
+                        client,
+                        workspace_id=workspace_id,
+                        provider=provider,
+                        auth_id=auth_id,
+                        advertiser_id=str(advertiser_id),
+                        campaign=campaign,
+                        start_date=start,
+                        end_date=end,
+                        prefetched=prefetched.get(campaign_id, ([], [])),
+                    )
+                    _record_creative_10min_result(
+                        db,
+                        workspace_id=workspace_id,
+                        auth_id=auth_id,
+                        advertiser_id=str(advertiser_id),
+                        campaign_id=campaign_id,
+                        store_id=store_id,
+                        attempt_token=tokens.get(campaign_id),
+                        success=True,
+                        rows=int((result or {}).get("rows", 0) or 0),
+                    )
+                    writers[campaign_id][1].assert_current(db)
+                    db.commit()
+                    results[campaign_id] = result or {}
+                except Exception as exc:  # noqa: BLE001 - isolated per campaign
+                    db.rollback()
+                    logger.warning(
+                        "gmvmax creative 10min store campaign failed",
+                        exc_info=True,
+                        extra={
+                            "workspace_id": workspace_id,
+                            "advertiser_id": advertiser_id,
+                            "campaign_id": campaign_id,
+                        },
+                    )
+                    _record_failure(campaign_id, exc)
+
+        if scopes:
+            _run_with_client(db, auth_id, _sync)
+    finally:
+        _close_session(db)
+        for lock, fence in writers.values():
+            _release_creative_10min_writer(lock, fence)
+
+    failed = sum(1 for item in results.values() if "error" in item)
+    logger.info(
+        "gmvmax.sync_creative_metrics_10min_for_store done",
+        extra={
+            "workspace_id": workspace_id,
+            "auth_id": auth_id,
+            "advertiser_id": advertiser_id,
+            "store_id": store_id,
+            "campaigns": len(tokens),
+            "failed": failed,
+        },
+    )
+    return {
+        "campaigns": len(tokens),
+        "failed": failed,
+        "rows": sum(int(item.get("rows", 0) or 0) for item in results.values()),
+        "results": results,
+    }
+
+
+def _dispatch_creative_10min_store_batches(
+    db: Session,
+    *,
+    workspace_id: int,
+    auth_id: int,
+    advertiser_id: str,
+    store_batches: dict[tuple[str, date, date], list[Any]],
+    dispatch_errors: list[dict[str, str]],
+) -> tuple[int, int]:
+    """Publish one store task per shared report window and campaign chunk."""
+
+    batch_size = min(
+        REPORT_FILTER_ID_LIMIT,
+        max(1, int(getattr(settings, "GMVMAX_CREATIVE_10MIN_STORE_BATCH_CAMPAIGNS", 100))),
+    )
+    enqueued = 0
+    failed = 0
+    for (store_id, start_day, end_day), campaigns in store_batches.items():
+        for offset in range(0, len(campaigns), batch_size):
+            chunk = campaigns[offset : offset + batch_size]
+            try:
+                celery_app.send_task(
+                    "gmvmax.sync_creative_metrics_10min_for_store",
+                    kwargs={
+                        "workspace_id": workspace_id,
+                        "provider": getattr(chunk[0], "provider", "tiktok-business"),
+                        "auth_id": auth_id,
+                        "advertiser_id": str(advertiser_id),
+                        "store_id": store_id,
+                        "campaigns": [
+                            {
+                                "campaign_id": str(campaign.campaign_id),
+                                "sync_attempt_token": getattr(
+                                    campaign,
+                                    "sync_attempt_token",
+                                    None,
+                                ),
+                            }
+                            for campaign in chunk
+                        ],
+                        "start_date": start_day.isoformat(),
+                        "end_date": end_day.isoformat(),
+                    },
+                    queue="gmvmax",
+                )
+                enqueued += 1
+            except Exception as exc:  # noqa: BLE001
+                db.rollback()
+                for campaign in chunk:
+                    _record_creative_10min_result(
+                        db,
+                        workspace_id=workspace_id,
+                        auth_id=auth_id,
+                        advertiser_id=str(advertiser_id),
+                        campaign_id=str(campaign.campaign_id),
+                        store_id=store_id,
+                        attempt_token=getattr(campaign, "sync_attempt_token", None),
+                        success=False,
+                        error=f"DispatchPreparationError: {type(exc).__name__}: {exc}",
+                    )
+                    dispatch_errors.append(
+                        {
+                            "campaign_id": str(campaign.campaign_id),
+                            "error": f"{type(exc).__name__}: {exc}"[:500],
+                        }
+                    )
+                db.commit()
+                failed += len(chunk)
+                logger.exception(
+                    "gmvmax creative 10min store dispatch failed",
+                    extra={
+                        "workspace_id": workspace_id,
+                        "auth_id": auth_id,
+                        "advertiser_id": advertiser_id,
+                        "store_id": store_id,
+                        "campaigns": len(chunk),
+                    },
+                )
+    return enqueued, failed
+
+
 @celery_app.task(
     bind=True,
     name="gmvmax.sync_creative_metrics_10min",
@@ -2306,12 +2803,35 @@ def task_gmvmax_sync_creative_metrics_10min(self, **extra: Any) -> dict:
     enqueued = 0
     dispatch_failed = 0
     ranges: list[dict[str, Any]] = []
+    deferred: list[dict[str, Any]] = []
+    quota_plans: dict[int, Any] = {}
+    store_mode = (
+        str(getattr(settings, "GMVMAX_CREATIVE_10MIN_SWEEP_MODE", "campaign")).strip().lower()
+        == "store"
+    )
     try:
         scopes = _iter_sync_scopes(db)
         for workspace_id, auth_id, advertiser_id in scopes:
+            if auth_id not in quota_plans:
+                quota_plans[auth_id] = plan_for_auth(db, "creative_10min", auth_id=auth_id)
+            if not quota_plans[auth_id].admit:
+                # Nothing is claimed, so the campaigns stay due for the next sweep.
+                deferred.append(
+                    {
+                        "workspace_id": workspace_id,
+                        "auth_id": auth_id,
+                        "advertiser_id": str(advertiser_id),
+                        "quota": quota_plans[auth_id].quota,
+                    }
+                )
+                continue
             max_campaigns = max(
                 1,
-                int(getattr(settings, "GMVMAX_CREATIVE_10MIN_MAX_CAMPAIGNS_PER_SWEEP", 6)),
+                int(
+                    getattr(settings, "GMVMAX_CREATIVE_10MIN_STORE_SWEEP_MAX_CAMPAIGNS", 500)
+                    if store_mode
+                    else getattr(settings, "GMVMAX_CREATIVE_10MIN_MAX_CAMPAIGNS_PER_SWEEP", 6)
+                ),
             )
             campaigns = _iter_active_catalog_campaign_scopes(
                 db,
@@ -2322,6 +2842,7 @@ def task_gmvmax_sync_creative_metrics_10min(self, **extra: Any) -> dict:
             )
             campaign_windows: list[dict[str, Any]] = []
             dispatch_errors: list[dict[str, str]] = []
+            store_batches: dict[tuple[str, date, date], list[Any]] = {}
             ranges.append(
                 {
                     "workspace_id": workspace_id,
@@ -2355,6 +2876,12 @@ def task_gmvmax_sync_creative_metrics_10min(self, **extra: Any) -> dict:
                             "end_date": end_day.isoformat(),
                         }
                     )
+                    if store_mode:
+                        store_batches.setdefault(
+                            (str(getattr(campaign, "store_id", "") or ""), start_day, end_day),
+                            [],
+                        ).append(campaign)
+                        continue
                     celery_app.send_task(
                         "gmvmax.sync_creative_metrics_10min_for_campaign",
                         kwargs={
@@ -2405,17 +2932,34 @@ def task_gmvmax_sync_creative_metrics_10min(self, **extra: Any) -> dict:
                             "campaign_id": str(campaign.campaign_id),
                         },
                     )
+            if store_batches:
+                batch_enqueued, batch_failed = _dispatch_creative_10min_store_batches(
+                    db,
+                    workspace_id=workspace_id,
+                    auth_id=auth_id,
+                    advertiser_id=str(advertiser_id),
+                    store_batches=store_batches,
+                    dispatch_errors=dispatch_errors,
+                )
+                enqueued += batch_enqueued
+                dispatch_failed += batch_failed
     finally:
         _close_session(db)
 
     logger.info(
         "gmvmax.sync_creative_metrics_10min sweep enqueued",
-        extra={"tasks": enqueued, "dispatch_failed": dispatch_failed, "ranges": ranges},
+        extra={
+            "tasks": enqueued,
+            "dispatch_failed": dispatch_failed,
+            "ranges": ranges,
+            "deferred": deferred,
+        },
     )
     return {
         "tasks": enqueued,
         "dispatch_failed": dispatch_failed,
         "ranges": ranges,
+        "deferred": deferred,
     }
 
 
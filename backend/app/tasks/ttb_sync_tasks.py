@@ -25,6 +25,7 @@ from app.services.redis_locks import RedisDistributedLock
 from app.services.provider_registry import load_builtin_providers, provider_registry
 from app.services.providers.tiktok_business import ProviderExecutionError
 from app.services.ttb_binding_config import record_products_sync_result
+from app.services.ttb_meta_cache import invalidate_gmvmax_options_cache
 
 # 确保 provider 在 worker 启动时完成注册
 load_builtin_providers()
@@ -463,6 +464,10 @@ class TTBSyncTask(Task):
 # -----------------------------
 # 执行器
 # -----------------------------
+# Scopes that write the BC / advertiser / store tables behind GMV Max options.
+_META_SCOPES = frozenset({"meta", "bc", "advertisers", "stores", "all"})
+
+
 def _execute_task(
     self: TTBSyncTask,
     *,
@@ -713,6 +718,9 @@ def _execute_task(
         )
         raise
     finally:
+        if expected_scope in _META_SCOPES:
+            # Meta tables may have changed even when the run failed midway.
+            invalidate_gmvmax_options_cache(envelope.workspace_id, envelope.auth_id)
         _db_close(db)
 
 
@@ -0,0 +1,162 @@
+"""Add hourly commerce order facts for the commerce overview.
+
+Revision ID: 0131_commerce_order_facts
+Revises: 0130_flow2api_nano_image
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+revision = "0131_commerce_order_facts"
+down_revision = "0130_flow2api_nano_image"
+branch_labels = None
+depends_on = None
+
+
+def _inspector() -> sa.Inspector:
+    return sa.inspect(op.get_bind())
+
+
+def _scope_columns(ubigint: sa.types.TypeEngine) -> list[sa.Column]:
+    return [
+        sa.Column("id", ubigint, primary_key=True, autoincrement=True),
+        sa.Column("workspace_id", ubigint, nullable=False),
+        sa.Column("shop_row_id", ubigint, nullable=False),
+    ]
+
+
+def _scope_foreign_keys(prefix: str) -> list[sa.ForeignKeyConstraint]:
+    return [
+        sa.ForeignKeyConstraint(
+            ["workspace_id"],
+            ["workspaces.id"],
+            ondelete="CASCADE",
+            name=f"fk_{prefix}_workspace",
+        ),
+        sa.ForeignKeyConstraint(
+            ["shop_row_id"],
+            ["oauth_tiktok_shop_shops.id"],
+            ondelete="CASCADE",
+            name=f"fk_{prefix}_shop",
+        ),
+    ]
+
+
+def upgrade() -> None:
+    existing = set(_inspector().get_table_names())
+    ubigint = sa.BigInteger().with_variant(mysql.BIGINT(unsigned=True), "mysql")
+    timestamp = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+    if "commerce_order_product_hourly_facts" not in existing:
+        op.create_table(
+            "commerce_order_product_hourly_facts",
+            *_scope_columns(ubigint),
+            sa.Column("paid_hour", timestamp, nullable=False),
+            sa.Column("product_id", sa.String(128), nullable=False),
+            sa.Column(
+                "sku_id",
+                sa.String(128),
+                nullable=False,
+                server_default=sa.text("''"),
+            ),
+            sa.Column("product_name", sa.String(1024), nullable=True),
+            sa.Column(
+                "product_orders",
+                ubigint,
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "quantity",
+                ubigint,
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "merchandise_revenue",
+                sa.Numeric(30, 10),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "allocated_revenue",
+                sa.Numeric(30, 10),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column("first_paid_at", timestamp, nullable=False),
+            sa.Column("last_paid_at", timestamp, nullable=False),
+            sa.Column(
+                "refreshed_at",
+                timestamp,
+                nullable=False,
+                server_default=sa.text("CURRENT_TIMESTAMP(6)"),
+            ),
+            *_scope_foreign_keys("commerce_order_fact"),
+            sa.UniqueConstraint(
+                "workspace_id",
+                "shop_row_id",
+                "paid_hour",
+                "product_id",
+                "sku_id",
+                name="uq_commerce_order_product_hour",
+            ),
+        )
+    if "commerce_shop_order_hourly_facts" not in existing:
+        op.create_table(
+            "commerce_shop_order_hourly_facts",
+            *_scope_columns(ubigint),
+            sa.Column("paid_hour", timestamp, nullable=False),
+            sa.Column(
+                "orders",
+                ubigint,
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "revenue",
+                sa.Numeric(20, 6),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "refreshed_at",
+                timestamp,
+                nullable=False,
+                server_default=sa.text("CURRENT_TIMESTAMP(6)"),
+            ),
+            *_scope_foreign_keys("commerce_shop_order_fact"),
+            sa.UniqueConstraint(
+                "workspace_id",
+                "shop_row_id",
+                "paid_hour",
+                name="uq_commerce_shop_order_hour",
+            ),
+        )
+    if "commerce_order_fact_states" not in existing:
+        op.create_table(
+            "commerce_order_fact_states",
+            *_scope_columns(ubigint),
+            sa.Column("rebuilt_at", timestamp, nullable=False),
+            sa.Column("refreshed_at", timestamp, nullable=False),
+            *_scope_foreign_keys("commerce_order_fact_state"),
+            sa.UniqueConstraint(
+                "workspace_id",
+                "shop_row_id",
+                name="uq_commerce_order_fact_state",
+            ),
+        )
+
+
+def downgrade() -> None:
+    tables = set(_inspector().get_table_names())
+    for name in (
+        "commerce_order_fact_states",
+        "commerce_shop_order_hourly_facts",
+        "commerce_order_product_hourly_facts",
+    ):
+        if name in tables:
+            op.drop_table(name)
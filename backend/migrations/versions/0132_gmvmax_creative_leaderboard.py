@@ -0,0 +1,176 @@
+"""Add the precomputed GMV Max creative leaderboard.
+
+Revision ID: 0132_creative_leaderboard
+Revises: 0131_commerce_order_facts
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+revision = "0132_creative_leaderboard"
+down_revision = "0131_commerce_order_facts"
+branch_labels = None
+depends_on = None
+
+
+def _inspector() -> sa.Inspector:
+    return sa.inspect(op.get_bind())
+
+
+def _scope_columns(ubigint: sa.types.TypeEngine) -> list[sa.Column]:
+    return [
+        sa.Column("id", ubigint, primary_key=True, autoincrement=True),
+        sa.Column("workspace_id", ubigint, nullable=False),
+        sa.Column("auth_id", ubigint, nullable=False),
+        sa.Column("advertiser_id", sa.String(64), nullable=False),
+        sa.Column("store_id", sa.String(64), nullable=False),
+        sa.Column(
+            "item_group_key",
+            sa.String(64),
+            nullable=False,
+            server_default=sa.text("''"),
+        ),
+        sa.Column("lookback_days", sa.Integer(), nullable=False),
+    ]
+
+
+def _scope_names() -> list[str]:
+    return [
+        "workspace_id",
+        "auth_id",
+        "advertiser_id",
+        "store_id",
+        "item_group_key",
+        "lookback_days",
+    ]
+
+
+def upgrade() -> None:
+    existing = set(_inspector().get_table_names())
+    ubigint = sa.BigInteger().with_variant(mysql.BIGINT(unsigned=True), "mysql")
+    timestamp = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+    if "gmvmax_creative_leaderboard" not in existing:
+        # Same collation as gmvmax_creative_asset_cache so page lookups join
+        # on item_id through the asset unique key without a collate cast.
+        op.create_table(
+            "gmvmax_creative_leaderboard",
+            *_scope_columns(ubigint),
+            sa.Column("position", sa.Integer(), nullable=False),
+            sa.Column("item_id", sa.String(64), nullable=False),
+            sa.Column("item_group_id", sa.String(64), nullable=True),
+            sa.Column("hermes_tier", sa.String(16), nullable=False),
+            sa.Column(
+                "hermes_score",
+                sa.Numeric(12, 2),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column("hermes_rank", sa.Integer(), nullable=True),
+            sa.Column(
+                "hermes_recommended",
+                sa.Boolean(),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "selectable",
+                sa.Boolean(),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "historically_excluded",
+                sa.Boolean(),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "cost_cents",
+                sa.BigInteger(),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "gross_revenue_cents",
+                sa.BigInteger(),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "orders",
+                sa.BigInteger(),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column("ranking_json", sa.JSON(), nullable=True),
+            sa.Column(
+                "refreshed_at",
+                timestamp,
+                nullable=False,
+                server_default=sa.text("CURRENT_TIMESTAMP(6)"),
+            ),
+            sa.UniqueConstraint(
+                *_scope_names(),
+                "item_id",
+                name="uq_gmvmax_creative_leaderboard_item",
+            ),
+            mysql_charset="utf8mb4",
+            mysql_collate="utf8mb4_0900_ai_ci",
+        )
+        op.create_index(
+            "idx_gmvmax_creative_leaderboard_position",
+            "gmvmax_creative_leaderboard",
+            [*_scope_names(), "position"],
+        )
+    if "gmvmax_creative_leaderboard_states" not in existing:
+        op.create_table(
+            "gmvmax_creative_leaderboard_states",
+            *_scope_columns(ubigint),
+            sa.Column("metric_start_date", sa.Date(), nullable=False),
+            sa.Column(
+                "total",
+                sa.Integer(),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "selectable_count",
+                sa.Integer(),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "historically_excluded_count",
+                sa.Integer(),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column("product_price_source", sa.String(128), nullable=True),
+            sa.Column("summary_json", sa.JSON(), nullable=True),
+            sa.Column(
+                "refreshed_at",
+                timestamp,
+                nullable=False,
+                server_default=sa.text("CURRENT_TIMESTAMP(6)"),
+            ),
+            sa.UniqueConstraint(
+                *_scope_names(),
+                name="uq_gmvmax_creative_leaderboard_state",
+            ),
+            mysql_charset="utf8mb4",
+            mysql_collate="utf8mb4_0900_ai_ci",
+        )
+
+
+def downgrade() -> None:
+    tables = set(_inspector().get_table_names())
+    for name in (
+        "gmvmax_creative_leaderboard_states",
+        "gmvmax_creative_leaderboard",
+    ):
+        if name in tables:
+            op.drop_table(name)
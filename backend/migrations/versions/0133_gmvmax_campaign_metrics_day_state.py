@@ -0,0 +1,135 @@
+"""Track per-day fingerprints and settlement of GMV Max campaign report syncs.
+
+Revision ID: 0133_campaign_day_state
+Revises: 0132_creative_leaderboard
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+revision = "0133_campaign_day_state"
+down_revision = "0132_creative_leaderboard"
+branch_labels = None
+depends_on = None
+
+_SNAPSHOT_BATCH_TABLES = (
+    "gmvmax_product_campaign_snapshot_batches",
+    "gmvmax_live_campaign_snapshot_batches",
+)
+
+
+def _inspector() -> sa.Inspector:
+    return sa.inspect(op.get_bind())
+
+
+def upgrade() -> None:
+    inspector = _inspector()
+    existing = set(inspector.get_table_names())
+    ubigint = sa.BigInteger().with_variant(mysql.BIGINT(unsigned=True), "mysql")
+    timestamp = sa.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+    if "gmv_campaign_metrics_day_state" not in existing:
+        op.create_table(
+            "gmv_campaign_metrics_day_state",
+            sa.Column("id", ubigint, primary_key=True, autoincrement=True),
+            sa.Column("workspace_id", ubigint, nullable=False),
+            sa.Column("auth_id", ubigint, nullable=False),
+            sa.Column("advertiser_id", sa.String(64), nullable=False),
+            sa.Column("store_id", sa.String(64), nullable=False),
+            sa.Column("promotion_type", sa.String(16), nullable=False),
+            sa.Column("granularity", sa.String(16), nullable=False),
+            sa.Column(
+                "campaign_id",
+                sa.String(64),
+                nullable=False,
+                server_default=sa.text("''"),
+            ),
+            sa.Column("stat_time_day", sa.Date(), nullable=False),
+            sa.Column("fingerprint", sa.String(64), nullable=False),
+            sa.Column(
+                "row_count",
+                sa.Integer(),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column(
+                "is_final",
+                sa.Boolean(),
+                nullable=False,
+                server_default=sa.text("0"),
+            ),
+            sa.Column("fetched_at", timestamp, nullable=False),
+            sa.Column(
+                "created_at",
+                timestamp,
+                nullable=False,
+                server_default=sa.text("CURRENT_TIMESTAMP(6)"),
+            ),
+            sa.Column(
+                "updated_at",
+                timestamp,
+                nullable=False,
+                server_default=sa.text("CURRENT_TIMESTAMP(6)"),
+                server_onupdate=sa.text("CURRENT_TIMESTAMP(6)"),
+            ),
+            sa.UniqueConstraint(
+                "workspace_id",
+                "auth_id",
+                "advertiser_id",
+                "store_id",
+                "promotion_type",
+                "granularity",
+                "campaign_id",
+                "stat_time_day",
+                name="uk_gmv_campaign_metrics_day_state",
+            ),
+            mysql_charset="utf8mb4",
+            mysql_collate="utf8mb4_0900_ai_ci",
+        )
+        op.create_index(
+            "idx_gmv_campaign_metrics_day_state_day",
+            "gmv_campaign_metrics_day_state",
+            [
+                "workspace_id",
+                "auth_id",
+                "advertiser_id",
+                "store_id",
+                "promotion_type",
+                "granularity",
+                "stat_time_day",
+            ],
+        )
+
+    for table in _SNAPSHOT_BATCH_TABLES:
+        if table not in existing:
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "rows_fingerprint" not in columns:
+            op.add_column(table, sa.Column("rows_fingerprint", sa.String(64), nullable=True))
+        if "is_final" not in columns:
+            op.add_column(
+                table,
+                sa.Column(
+                    "is_final",
+                    sa.Boolean(),
+                    nullable=False,
+                    server_default=sa.text("0"),
+                ),
+            )
+
+
+def downgrade() -> None:
+    inspector = _inspector()
+    tables = set(inspector.get_table_names())
+    for table in _SNAPSHOT_BATCH_TABLES:
+        if table not in tables:
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        for name in ("is_final", "rows_fingerprint"):
+            if name in columns:
+                op.drop_column(table, name)
+    if "gmv_campaign_metrics_day_state" in tables:
+        op.drop_table("gmv_campaign_metrics_day_state")
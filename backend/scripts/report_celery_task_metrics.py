@@ -0,0 +1,68 @@
+#!/opt/gmv/python3.13/bin/python
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+os.chdir(BACKEND_ROOT)
+
+from app.core.task_metrics import collect_task_metrics
+
+
+def _fmt(value: object) -> str:
+    return "-" if value is None else str(value)
+
+
+def _print_table(report: dict, top: int) -> None:
+    print(f"last {report['hours']}h, generated {report['generated_at']}")
+    header = (
+        f"{'queue':<34} {'count':>7} {'fail':>5} {'retry':>5} "
+        f"{'wait p50':>8} {'wait p95':>8} {'wait max ms':>11} {'run avg ms':>10} {'rss+ MB':>7}"
+    )
+    print(header)
+    for row in report["queues"]:
+        print(
+            f"{row['queue']:<34} {row['count']:>7} {row['failures']:>5} {row['retries']:>5} "
+            f"{_fmt(row['wait_p50_s']):>8} {_fmt(row['wait_p95_s']):>8} "
+            f"{_fmt(row['wait_max_ms']):>11} {_fmt(row['run_avg_ms']):>10} "
+            f"{_fmt(row['rss_growth_mb']):>7}"
+        )
+    print()
+    print(f"{'task':<58} {'count':>7} {'wait p95':>8} {'run p95':>8} {'retry':>5} {'rss+ MB':>7}")
+    for row in report["tasks"][:top]:
+        print(
+            f"{row['task'][:58]:<58} {row['count']:>7} {_fmt(row['wait_p95_s']):>8} "
+            f"{_fmt(row['run_p95_s']):>8} {row['retries']:>5} {_fmt(row['rss_growth_mb']):>7}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Celery queue wait and task runtime report.")
+    parser.add_argument("--hours", type=int, default=24, help="Hourly buckets to include.")
+    parser.add_argument("--queue", help="Only report this queue.")
+    parser.add_argument("--top", type=int, default=30, help="Tasks to list in table mode.")
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of a table.")
+    args = parser.parse_args()
+
+    try:
+        report = collect_task_metrics(hours=args.hours, queue=args.queue)
+    except Exception as exc:  # noqa: BLE001
+        print(json.dumps({"ok": False, "error": type(exc).__name__}))
+        return 2
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=True))
+    else:
+        _print_table(report, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,13 +2,12 @@ from __future__ import annotations
 
 import argparse
 import json
-import subprocess
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from app.services.hermes_agent.storyboard_split import detect_preview_cells
+from app.services.hermes_agent.storyboard_split import StoryboardSplitRequest, split_storyboard_boards
 
 
 def main() -> int:
@@ -16,41 +15,29 @@ def main() -> int:
     parser.add_argument("--input", required=True)
     parser.add_argument("--count", required=True, type=int)
     parser.add_argument("--output-dir", required=True)
-    parser.add_argument("--ffmpeg", default="/opt/apps/bin/ffmpeg")
+    parser.add_argument("--ffmpeg", default="/opt/apps/bin/ffmpeg", help="Unused; panels are encoded in-process.")
+    parser.add_argument("--workers", type=int, help="Parallel PNG encoders (default: up to 4)")
     parser.add_argument("--manifest")
     args = parser.parse_args()
 
     source = Path(args.input).expanduser().resolve()
     output_dir = Path(args.output_dir).expanduser().resolve()
     output_dir.mkdir(parents=True, exist_ok=True)
-    cells, layout = detect_preview_cells(source, count=args.count)
-    outputs: list[dict[str, object]] = []
-    for index, (x, y, width, height) in enumerate(cells, 1):
-        target = output_dir / f"panel-{index}.png"
-        subprocess.run(
-            [
-                args.ffmpeg,
-                "-y",
-                "-i",
-                str(source),
-                "-vf",
-                f"crop={width}:{height}:{x}:{y}",
-                "-frames:v",
-                "1",
-                str(target),
-            ],
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-        outputs.append(
-            {
-                "index": index,
-                "path": str(target),
-                "crop": {"x": x, "y": y, "width": width, "height": height},
-            }
-        )
+    request = StoryboardSplitRequest(
+        source=source,
+        count=args.count,
+        targets=[output_dir / f"panel-{index}.png" for index in range(1, args.count + 1)],
+    )
+    split_storyboard_boards([request], max_workers=args.workers)
+    layout = request.layout
+    outputs: list[dict[str, object]] = [
+        {
+            "index": index,
+            "path": str(target),
+            "crop": {"x": x, "y": y, "width": width, "height": height},
+        }
+        for index, (target, (x, y, width, height)) in enumerate(zip(request.targets, request.cells), 1)
+    ]
     manifest = {"source": str(source), "count": args.count, "layout": layout, "outputs": outputs}
     encoded = json.dumps(manifest, ensure_ascii=False, indent=2)
     if args.manifest:
@@ -7,9 +7,9 @@ import pytest
 
 from app.core.errors import APIError
 from app.data.models.scheduling import Schedule, ScheduleRun
-from app.features.tenants.ttb.gmv_max import router_provider
 from app.features.tenants.ttb.router import common
 from app.services import (
+    gmvmax_creative_candidates,
     gmvmax_hermes_advisor,
     gmvmax_hermes_daily_report,
     gmvmax_smart_guard,
@@ -159,7 +159,7 @@ def test_hermes_product_price_searches_beyond_80_strategy_configs() -> None:
     )
     db = _StrategyConfigDb(rows)
 
-    price, source = router_provider._configured_product_price_for_hermes(
+    price, source = gmvmax_creative_candidates.configured_product_price_for_hermes(
         db,
         workspace_id=1,
         auth_id=2,
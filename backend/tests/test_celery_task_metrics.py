@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.core import task_metrics
+from app.core.task_metrics import TaskSample, collect_task_metrics, percentile, record_sample
+
+NOW = datetime(2026, 10, 18, 12, 30, tzinfo=timezone.utc)
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, float]] = defaultdict(dict)
+        self.zsets: dict[str, dict[str, float]] = defaultdict(dict)
+        self.ttls: dict[str, int] = {}
+
+    def pipeline(self, transaction: bool = True):
+        return self
+
+    def execute(self) -> list:
+        return []
+
+    def hincrby(self, key: str, field: str, amount: int) -> None:
+        self.hashes[key][field] = self.hashes[key].get(field, 0) + amount
+
+    hincrbyfloat = hincrby
+
+    def zadd(self, key: str, mapping: dict[str, float], gt: bool = False) -> None:
+        for member, score in mapping.items():
+            current = self.zsets[key].get(member)
+            if current is None or not gt or score > current:
+                self.zsets[key][member] = score
+
+    def expire(self, key: str, seconds: int) -> None:
+        self.ttls[key] = seconds
+
+    def hgetall(self, key: str) -> dict[bytes, bytes]:
+        fields = self.hashes.get(key, {})
+        return {field.encode(): str(value).encode() for field, value in fields.items()}
+
+    def zrange(self, key: str, start: int, end: int, withscores: bool = False) -> list:
+        return [(member.encode(), score) for member, score in self.zsets.get(key, {}).items()]
+
+
+def test_rollup_ranks_the_starving_queue_first() -> None:
+    redis = _FakeRedis()
+    pause = "gmvmax.execute_campaign_pause_intent"
+    samples = [
+        TaskSample("gmvmax", "gmvmax.sync_campaigns", "SUCCESS", 2.0, 0.05, 200_000),
+        TaskSample("gmvmax", "gmvmax.sync_campaigns", "RETRY", 0.3, 0.2, 260_000, retried=True),
+        TaskSample("gmvmax_control", pause, "SUCCESS", 0.2, 420.0, 90_000),
+        TaskSample("gmvmax_control", pause, "FAILURE", 0.1, 2400.0, 95_000),
+    ]
+    for sample in samples:
+        record_sample(redis, sample, now=NOW)
+    record_sample(redis, samples[0], now=NOW - timedelta(hours=30))  # outside the window
+
+    report = collect_task_metrics(redis, hours=24, now=NOW)
+
+    assert [row["queue"] for row in report["queues"]] == ["gmvmax_control", "gmvmax"]
+    control, gmvmax = report["queues"]
+    assert (control["count"], control["failures"], control["wait_p95_s"]) == (2, 1, "+Inf")
+    assert control["wait_max_ms"] == 2_400_000.0
+    assert (gmvmax["count"], gmvmax["retries"], gmvmax["wait_p95_s"]) == (2, 1, 0.5)
+    assert gmvmax["rss_growth_mb"] == round(260_000 / 1024, 1)
+    assert gmvmax["run_avg_ms"] == 1150.0
+    assert all(ttl == 48 * 3600 for ttl in redis.ttls.values())
+
+    only_gmvmax = collect_task_metrics(redis, hours=24, queue="gmvmax", now=NOW)
+    assert [row["task"] for row in only_gmvmax["tasks"]] == ["gmvmax.sync_campaigns"]
+
+
+def test_signal_handlers_measure_wait_from_the_publish_stamp(monkeypatch) -> None:
+    redis = _FakeRedis()
+    monkeypatch.setattr(task_metrics, "_redis", lambda: redis)
+    headers: dict = {}
+    task_metrics._on_before_task_publish(sender="tiktok_shop.sync", headers=headers)
+    headers[task_metrics.ENQUEUED_AT_HEADER] -= 30  # the message sat in the queue for 30s
+    task = SimpleNamespace(
+        name="tiktok_shop.sync",
+        request=SimpleNamespace(
+            headers=headers,
+            eta=None,
+            delivery_info={"routing_key": "tiktok_shop"},
+        ),
+    )
+
+    task_metrics._on_task_prerun(task_id="t-1", task=task)
+    task_metrics._on_task_postrun(task_id="t-1", task=task, state="SUCCESS")
+
+    stats = redis.hashes[f"gmv:task_metrics:{datetime.now(timezone.utc):%Y%m%d%H}:stats"]
+    assert stats["tiktok_shop|tiktok_shop.sync|count"] == 1
+    assert 29_000 < stats["tiktok_shop|tiktok_shop.sync|wait_ms"] < 60_000
+    assert stats["tiktok_shop|tiktok_shop.sync|wait_b5"] == 1  # (15s, 60s]
+
+
+def test_tasks_are_charged_with_their_own_rss_growth(monkeypatch) -> None:
+    redis = _FakeRedis()
+    monkeypatch.setattr(task_metrics, "_redis", lambda: redis)
+    # One prefork child: a heavy task raises ru_maxrss, the light one after it does not.
+    high_water = iter([100_000, 400_000, 400_000, 400_000])
+    monkeypatch.setattr(task_metrics, "_peak_rss_kb", lambda: next(high_water))
+    request = SimpleNamespace(headers={}, eta=None, delivery_info={"routing_key": "gmvmax"})
+    heavy = SimpleNamespace(name="gmvmax.sync_creatives", request=request)
+    light = SimpleNamespace(name="gmvmax.sync_campaigns", request=request)
+
+    for task_id, task in (("t-heavy", heavy), ("t-light", light)):
+        task_metrics._on_task_prerun(task_id=task_id, task=task)
+        task_metrics._on_task_postrun(task_id=task_id, task=task, state="SUCCESS")
+
+    growth = redis.zsets[f"gmv:task_metrics:{datetime.now(timezone.utc):%Y%m%d%H}:rss_growth"]
+    assert growth == {"gmvmax|gmvmax.sync_creatives": 300_000}
+
+
+def test_delayed_tasks_wait_from_their_eta() -> None:
+    started = time.time()
+    eta = datetime.fromtimestamp(started - 2, tz=timezone.utc).isoformat()
+    request = SimpleNamespace(headers={task_metrics.ENQUEUED_AT_HEADER: started - 600}, eta=eta)
+
+    assert 1.9 < task_metrics._wait_seconds(request, started) < 2.1
+
+
+def test_percentile_reads_bucket_upper_bounds() -> None:
+    buckets = [0] * (len(task_metrics.BUCKETS_SECONDS) + 1)
+    buckets[0], buckets[3] = 90, 10
+
+    assert percentile(buckets, 0.5) == 0.1
+    assert percentile(buckets, 0.95) == 5
+    assert percentile([0] * len(buckets), 0.95) is None
@@ -1,3 +1,6 @@
+import importlib
+
+from app import celery_app as celery_module
 from app.celery_app import (
     AI_VIDEO_API_TASK_QUEUE,
     AI_VIDEO_BROWSER_TASK_QUEUE,
@@ -6,7 +9,12 @@ from app.celery_app import (
     AI_VIDEO_MAINTENANCE_TASK_QUEUE,
     HERMES_AGENT_TASK_QUEUE,
     HERMES_MAINTENANCE_TASK_QUEUE,
+    WEBSITE_ADS_MEDIA_TASK_QUEUE,
+    WEBSITE_ADS_TASK_QUEUE,
     WHISPER_TASK_QUEUE,
+    celery_app,
+    default_queue_name,
+    queue_task_registry,
     task_modules_for_runtime,
     task_modules_for_worker_queue,
 )
@@ -54,11 +62,54 @@ def test_hermes_browser_maintenance_does_not_load_content_factory():
     )
 
 
-def test_whisper_worker_only_loads_whisper_tasks():
-    assert task_modules_for_worker_queue(WHISPER_TASK_QUEUE) == (
+def test_whisper_worker_only_loads_whisper_tasks(monkeypatch):
+    monkeypatch.setattr(celery_module, "WHISPER_TASK_QUEUE", "openai_whisper")
+
+    assert task_modules_for_worker_queue("openai_whisper") == (
         "app.features.tenants.openai_whisper.tasks",
         "app.tasks.tiktok_shop_video_transcript_tasks",
+        "app.tasks.website_ads_tasks",
+    )
+
+
+def test_default_queue_keeps_complete_registry_even_when_shared_with_whisper():
+    assert task_modules_for_worker_queue(default_queue_name) == task_modules_for_worker_queue(None)
+
+
+def test_gmvmax_control_worker_loads_only_gmvmax_tasks():
+    assert task_modules_for_worker_queue("gmvmax_control") == ("app.tasks.ttb_gmvmax_tasks",)
+    assert task_modules_for_worker_queue("gmvmax_sync") == ("app.gmvmax.tasks_sync",)
+    assert task_modules_for_worker_queue(WEBSITE_ADS_TASK_QUEUE) == ("app.tasks.website_ads_tasks",)
+    assert task_modules_for_worker_queue(WEBSITE_ADS_MEDIA_TASK_QUEUE) == (
+        "app.tasks.website_ads_tasks",
+    )
+
+
+def test_multi_queue_workers_load_the_union_in_order():
+    assert task_modules_for_worker_queue(" gmvmax_control, gmvmax ,gmvmax_control") == (
+        "app.tasks.ttb_gmvmax_tasks",
+        "app.tasks.website_ads_tasks",
     )
+    assert task_modules_for_worker_queue("gmvmax,unknown.queue") == task_modules_for_worker_queue(None)
+
+
+def test_every_routed_task_is_registered_by_its_queue_worker():
+    for module_name in task_modules_for_worker_queue(None):
+        importlib.import_module(module_name)
+    registry = queue_task_registry()
+    router = celery_app.amqp.router
+    missing = []
+    for name, task in celery_app.tasks.items():
+        module_name = getattr(task, "__module__", "")
+        if name.startswith("celery.") or not module_name.startswith("app."):
+            continue
+        route = router.route({}, name, (), {}).get("queue")
+        queues = {getattr(route, "name", route), getattr(task, "queue", None)}
+        for queue in queues:
+            if queue in registry and module_name not in registry[queue]:
+                missing.append((name, queue, module_name))
+
+    assert missing == []
 
 
 def test_unspecialized_process_keeps_complete_registry():
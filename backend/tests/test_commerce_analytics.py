@@ -29,6 +29,7 @@ from app.services.commerce_analytics import (
     date_range,
 )
 from app.features.tenants.commerce.router import ProductCostRequest
+from app.services.commerce_order_facts import refresh_order_facts
 from app.services.commerce_orders import (
     CommerceOrderError,
     order_summary,
@@ -333,3 +334,109 @@ def test_overview_allocates_paid_total_and_uses_effective_cost_version(
     assert payload["products"][0]["current_cost"]["unit_cost"] == 9.0
     assert payload["data_health"]["finance"]["coverage_ratio"] == 0.0
     assert payload["data_health"]["sales_basis"] == "shop_order_paid_total"
+
+
+def test_overview_from_hourly_facts_matches_raw_orders(db_session) -> None:
+    shop = _seed_scope(db_session)
+    orders = [
+        ("order-1", datetime(2026, 7, 1, 16, 5), Decimal("30.00"), [("sku-1", "10.00", 1), ("sku-2", "20.00", 1)]),
+        ("order-2", datetime(2026, 7, 1, 16, 40), Decimal("18.00"), [("sku-1", "10.00", 2)]),
+        ("order-3", datetime(2026, 7, 2, 3, 15), Decimal("9.00"), [("sku-2", "9.00", 1)]),
+    ]
+    for order_id, paid_at, total, lines in orders:
+        db_session.add(
+            TikTokShopOrder(
+                workspace_id=1,
+                account_id=12,
+                shop_row_id=shop.id,
+                order_id=order_id,
+                status="IN_TRANSIT",
+                currency="USD",
+                total_amount=total,
+                paid_at=paid_at,
+            )
+        )
+        for index, (sku_id, price, quantity) in enumerate(lines):
+            db_session.add(
+                TikTokShopOrderLine(
+                    workspace_id=1,
+                    account_id=12,
+                    shop_row_id=shop.id,
+                    order_id=order_id,
+                    line_item_id=f"{order_id}-{index}",
+                    product_id="product-1",
+                    product_name="Body balm",
+                    sku_id=sku_id,
+                    currency="USD",
+                    sale_price=Decimal(price),
+                    quantity=quantity,
+                )
+            )
+    db_session.add_all(
+        [
+            TikTokShopProduct(
+                workspace_id=1,
+                account_id=12,
+                shop_row_id=shop.id,
+                product_id="product-1",
+                title="Body balm",
+                status="ACTIVATE",
+                currency="USD",
+            ),
+            CommerceProductCostVersion(
+                workspace_id=1,
+                shop_row_id=shop.id,
+                product_id="product-1",
+                sku_id="",
+                effective_from=datetime(2026, 6, 1),
+                currency="USD",
+                unit_cost=Decimal("3"),
+                platform_fee_rate=Decimal("0.10"),
+            ),
+            # Takes effect between order-1 and order-2 inside the same hour.
+            CommerceProductCostVersion(
+                workspace_id=1,
+                shop_row_id=shop.id,
+                product_id="product-1",
+                sku_id="",
+                effective_from=datetime(2026, 7, 1, 16, 30),
+                currency="USD",
+                unit_cost=Decimal("5"),
+            ),
+        ]
+    )
+    db_session.commit()
+
+    def _overview():
+        return commerce_overview(
+            db_session,
+            workspace_id=1,
+            shop_id=shop.id,
+            advertiser_id="adv-main",
+            start_date=date(2026, 7, 1),
+            end_date=date(2026, 7, 3),
+        )
+
+    raw = _overview()
+    refresh_order_facts(db_session, workspace_id=1, shop_row_id=shop.id, hours=[])
+    db_session.commit()
+    from_facts = _overview()
+
+    assert from_facts["summary"] == raw["summary"]
+    assert from_facts["products"] == raw["products"]
+    assert from_facts["trends"] == raw["trends"]
+    assert raw["products"][0]["orders"] == 3
+
+    cancelled = db_session.query(TikTokShopOrder).filter_by(order_id="order-3").one()
+    cancelled.status = "CANCELLED"
+    refresh_order_facts(
+        db_session,
+        workspace_id=1,
+        shop_row_id=shop.id,
+        hours=[datetime(2026, 7, 2, 3)],
+    )
+    db_session.commit()
+
+    refreshed = _overview()
+    assert refreshed["products"][0]["orders"] == 2
+    assert refreshed["summary"]["order_paid_sales"] == 48.0
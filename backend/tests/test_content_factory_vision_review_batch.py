@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services.ai_video.local_storage import get_task_local_meta
+from app.services.hermes_agent import vision_review_batch
+from app.services.hermes_agent.vision_review_batch import (
+    VisionReviewJob,
+    route_slot,
+    run_vision_review_jobs,
+)
+from app.tasks.hermes_agent import content_factory_tasks as content_factory_tasks_module
+
+
+def _session_factory():
+    return SimpleNamespace(close=lambda: None)
+
+
+def test_batch_renders_and_reviews_segments_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+    rendered: list[int] = []
+
+    def _job(task_id: int, *, fail: bool = False) -> VisionReviewJob:
+        def _review(_db):
+            # Serial execution would never release the barrier.
+            barrier.wait()
+            if fail:
+                raise RuntimeError("inspector outage")
+            return {"status": "pass", "task_id": task_id}
+
+        return VisionReviewJob(
+            key=("segment_execution_review", task_id, f"sha-{task_id}"),
+            render=lambda: rendered.append(task_id),
+            review=_review,
+        )
+
+    jobs = [_job(1), _job(2), _job(3, fail=True)]
+    outcomes = run_vision_review_jobs(
+        jobs + [jobs[0]],
+        db=SimpleNamespace(),
+        session_factory=_session_factory,
+        max_workers=3,
+    )
+
+    assert sorted(rendered) == [1, 2, 3]
+    assert outcomes[jobs[1].key].result() == {"status": "pass", "task_id": 2}
+    assert outcomes[jobs[0].key].latency()["prefetched"] is True
+    with pytest.raises(RuntimeError, match="inspector outage"):
+        outcomes[jobs[2].key].result()
+
+
+def test_route_slot_caps_in_flight_calls_per_model(monkeypatch):
+    monkeypatch.setattr(settings, "CONTENT_FACTORY_VISION_REVIEW_ROUTE_CONCURRENCY", 2)
+    monkeypatch.setattr(vision_review_batch, "_route_slots", {})
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def _review(_db):
+        with route_slot("vision-model-a"):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+        return {"status": "pass"}
+
+    jobs = [
+        VisionReviewJob(
+            key=("segment_execution_review", task_id, "sha"),
+            render=lambda: None,
+            review=_review,
+        )
+        for task_id in range(6)
+    ]
+    run_vision_review_jobs(
+        jobs,
+        db=SimpleNamespace(),
+        session_factory=_session_factory,
+        max_workers=6,
+    )
+
+    assert active["peak"] == 2
+
+
+def test_serial_gate_reuses_prefetched_blocking_verdict(monkeypatch, tmp_path):
+    task = SimpleNamespace(id=71, result_json={}, input_json={})
+    calls: list[str] = []
+    job = VisionReviewJob(
+        key=("segment_execution_review", 71, "sha-71"),
+        render=lambda: calls.append("render"),
+        review=lambda _db: calls.append("review") or {},
+        record={"source_sha256": "sha-71", "contact_sheet_path": "sheet.jpg"},
+    )
+    monkeypatch.setattr(
+        content_factory_tasks_module,
+        "_segment_execution_review_job",
+        lambda *_args, **_kwargs: (None, job),
+    )
+    outcome = vision_review_batch.VisionReviewOutcome(
+        key=job.key,
+        verdict={
+            "status": "fail",
+            "blocking": True,
+            "blocking_reasons": ["opening hook is static"],
+        },
+        error=None,
+        contact_sheet_ms=12,
+        vision_ms=3400,
+        prefetched=True,
+    )
+    db = SimpleNamespace(add=lambda _value: None, flush=lambda: None)
+
+    with pytest.raises(ValueError, match="CONTENT_SEGMENT_EXECUTION_QA_FAILED_TASK_71"):
+        content_factory_tasks_module._review_provider_segment_execution(
+            db,
+            project=SimpleNamespace(id=1),
+            source=tmp_path / "segment.mp4",
+            task=task,
+            prefetched={job.key: outcome},
+        )
+
+    assert calls == []
+    review = get_task_local_meta(task)["segment_execution_review"]
+    assert review["contact_sheet_path"] == "sheet.jpg"
+    assert review["review_latency"] == {
+        "contact_sheet_ms": 12,
+        "vision_ms": 3400,
+        "prefetched": True,
+    }
@@ -5,6 +5,7 @@ import subprocess
 from types import SimpleNamespace
 
 from app.tasks.hermes_agent import content_factory_tasks
+from app.services.hermes_agent import content_source_diff
 from app.services.hermes_agent.content_source_diff import (
     audit_bounded_source_edit,
     audit_regenerated_source_originality,
@@ -165,6 +166,31 @@ def test_regenerated_source_originality_rejects_copied_media(tmp_path):
     assert regenerated_report["near_duplicate_sample_count"] == 0
 
 
+def test_single_decode_maps_every_sample_to_its_selected_frame(monkeypatch):
+    calls = []
+
+    def fake_run(args, **_kwargs):
+        calls.append(args)
+        frames = bytes([10]) * 4096 + bytes([40]) * 4096
+        stderr = (
+            "[Parsed_showinfo_1 @ 0x1] n:   0 pts:  6144 pts_time:0.5     duration:1024\n"
+            "[Parsed_showinfo_1 @ 0x1] n:   1 pts: 12288 pts_time:1       duration:1024\n"
+        )
+        return SimpleNamespace(returncode=0, stdout=frames, stderr=stderr.encode())
+
+    monkeypatch.setattr(content_source_diff.subprocess, "run", fake_run)
+
+    # 0.45 and 0.5 resolve to the same frame; 2.0 is past the last selected one.
+    left = content_source_diff._sample_gray_frames(Path("a.mp4"), [0.45, 0.5, 1.0, 2.0])
+    right = (left[0].copy(), left[1].copy())
+    right[0][2] += 3
+
+    assert len(calls) == 1
+    assert left[1].tolist() == [True, True, True, False]
+    assert left[0][:, 0].tolist() == [10, 10, 40, 0]
+    assert content_source_diff._frame_maes(left, right) == [0.0, 0.0, 3.0, 255.0]
+
+
 class _EmptyAssetQuery:
     def filter(self, *_args, **_kwargs):
         return self
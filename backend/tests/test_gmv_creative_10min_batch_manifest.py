@@ -482,3 +482,103 @@ def test_guard_holds_on_latest_complete_zero_row_batch(monkeypatch):
     assert quality["creative_valid"] is False
     assert quality["creative_rows"] == 0
     assert "gmv_creative_10min_batch_manifests" in db.statement
+
+
+def _creative_row(campaign_id: str, product_id: str, creative_id: str) -> dict:
+    return {
+        "metrics": {"cost": "1.00"},
+        "dimensions": {
+            "campaign_id": campaign_id,
+            "product_id": product_id,
+            "shop_content_id": creative_id,
+            "stat_time_day": STAT_DAY,
+        },
+    }
+
+
+def test_store_fetch_pulls_all_campaigns_in_one_request_and_splits_rows(monkeypatch):
+    item_groups = {"campaign-1": ["product-1"], "campaign-2": ["product-2"], "campaign-3": []}
+    report_calls: list[dict] = []
+    status_calls: list[dict] = []
+
+    async def _report(_client, **kwargs):
+        report_calls.append(kwargs)
+        return [
+            _creative_row("campaign-1", "product-1", "creative-1"),
+            _creative_row("campaign-2", "product-2", "creative-2"),
+            _creative_row("campaign-2", "product-2", "creative-3"),
+        ]
+
+    async def _statuses(_client, **kwargs):
+        status_calls.append(kwargs)
+        return [_creative_row("campaign-1", "product-1", "creative-1")]
+
+    monkeypatch.setattr(
+        creative_metrics,
+        "_item_group_ids_for_campaigns",
+        lambda _session, campaigns: {
+            campaign["campaign_id"]: item_groups[campaign["campaign_id"]]
+            for campaign in campaigns
+        },
+    )
+    monkeypatch.setattr(creative_metrics, "fetch_gmvmax_report_by_level", _report)
+    monkeypatch.setattr(creative_metrics, "fetch_gmvmax_current_creative_statuses", _statuses)
+
+    split = asyncio.run(
+        creative_metrics.fetch_creative_rows_for_campaigns(
+            object(),
+            object(),
+            advertiser_id="advertiser-1",
+            store_id="store-1",
+            campaigns=[{"campaign_id": campaign_id} for campaign_id in item_groups],
+            start_date=STAT_DAY,
+            end_date=STAT_DAY,
+        )
+    )
+
+    assert len(report_calls) == 1 and len(status_calls) == 1
+    assert report_calls[0]["campaign_ids"] == ["campaign-1", "campaign-2"]
+    assert report_calls[0]["item_group_ids"] == ["product-1", "product-2"]
+    assert sorted(split) == ["campaign-1", "campaign-2"]
+    assert len(split["campaign-1"][0]) == 1 and len(split["campaign-1"][1]) == 1
+    assert len(split["campaign-2"][0]) == 2 and split["campaign-2"][1] == []
+    # Each campaign's share still passes its own completeness check.
+    for campaign_id, (rows, _statuses) in split.items():
+        _assert_complete_creative_rows(
+            rows,
+            campaign_id=campaign_id,
+            item_group_ids=item_groups[campaign_id],
+            start_date=STAT_DAY,
+            end_date=STAT_DAY,
+        )
+
+
+def test_store_fetch_rejects_rows_it_cannot_attribute(monkeypatch):
+    async def _report(_client, **_kwargs):
+        return [_creative_row("", "product-1", "creative-1")]
+
+    async def _statuses(_client, **_kwargs):
+        return []
+
+    monkeypatch.setattr(
+        creative_metrics,
+        "_item_group_ids_for_campaigns",
+        lambda _session, campaigns: {
+            campaign["campaign_id"]: ["product-1"] for campaign in campaigns
+        },
+    )
+    monkeypatch.setattr(creative_metrics, "fetch_gmvmax_report_by_level", _report)
+    monkeypatch.setattr(creative_metrics, "fetch_gmvmax_current_creative_statuses", _statuses)
+
+    with pytest.raises(ValueError, match="without a requested campaign_id"):
+        asyncio.run(
+            creative_metrics.fetch_creative_rows_for_campaigns(
+                object(),
+                object(),
+                advertiser_id="advertiser-1",
+                store_id="store-1",
+                campaigns=[{"campaign_id": "campaign-1"}, {"campaign_id": "campaign-2"}],
+                start_date=STAT_DAY,
+                end_date=STAT_DAY,
+            )
+        )
@@ -428,6 +428,61 @@ def test_creative_10min_sweep_continues_after_one_dispatch_failure(
     assert states["product-2"].last_status == "QUEUED"
 
 
+def test_creative_10min_store_sweep_batches_campaigns_per_store_window(
+    db_session,
+    monkeypatch,
+):
+    workspace_id, auth_id = _account_scope(db_session)
+    db_session.add_all(
+        [
+            _product_catalog(
+                workspace_id=workspace_id,
+                auth_id=auth_id,
+                index=index,
+            )
+            for index in range(1, 4)
+        ]
+    )
+    db_session.commit()
+
+    monkeypatch.setattr(ttb_gmvmax_tasks.settings, "GMVMAX_CREATIVE_10MIN_SWEEP_MODE", "store")
+    monkeypatch.setattr(
+        ttb_gmvmax_tasks.settings, "GMVMAX_CREATIVE_10MIN_STORE_BATCH_CAMPAIGNS", 2
+    )
+    monkeypatch.setattr(ttb_gmvmax_tasks, "_db_session", lambda: db_session)
+    monkeypatch.setattr(ttb_gmvmax_tasks, "_close_session", lambda session: None)
+    monkeypatch.setattr(
+        ttb_gmvmax_tasks,
+        "_iter_sync_scopes",
+        lambda session: [(workspace_id, auth_id, "adv-fair")],
+    )
+    monkeypatch.setattr(
+        ttb_gmvmax_tasks,
+        "_campaign_sync_window",
+        lambda *args, **kwargs: (date(2024, 1, 1), date(2024, 1, 2)),
+    )
+    published: list[tuple[str, dict]] = []
+    monkeypatch.setattr(
+        ttb_gmvmax_tasks.celery_app,
+        "send_task",
+        lambda name, *, kwargs, queue: published.append((name, kwargs)),
+    )
+
+    result = ttb_gmvmax_tasks.task_gmvmax_sync_creative_metrics_10min.run()
+
+    assert result["tasks"] == 2
+    assert {name for name, _kwargs in published} == {
+        "gmvmax.sync_creative_metrics_10min_for_store"
+    }
+    assert [
+        [item["campaign_id"] for item in kwargs["campaigns"]] for _name, kwargs in published
+    ] == [["product-1", "product-2"], ["product-3"]]
+    assert all(
+        item["sync_attempt_token"] for _name, kwargs in published for item in kwargs["campaigns"]
+    )
+    assert published[0][1]["start_date"] == "2024-01-01"
+
+
 class _ScalarResult:
     def scalars(self):
         return self
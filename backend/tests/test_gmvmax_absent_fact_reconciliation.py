@@ -14,6 +14,10 @@ from app.data.models.gmv_restructured import (
     GmvProductMetricsDaily,
     GmvProductMetricsHourly,
 )
+from app.data.models.gmvmax_campaign_catalog import (
+    GmvmaxProductCampaignCatalog,
+    GmvmaxProductCampaignItemGroup,
+)
 from app.data.models.gmvmax_campaign_metrics import (
     GmvmaxProductCampaignMetricsDaily,
     GmvmaxProductCampaignMetricsHourly,
@@ -22,6 +26,10 @@ from app.data.models.gmvmax_creative_metrics import (
     GmvmaxProductCreativeMetricsDaily,
 )
 from app.gmvmax.services import creative_report_sync
+from app.gmvmax.services.campaign_item_groups import (
+    backfill_catalog_item_group_range,
+    catalog_id_bounds,
+)
 from app.gmvmax.services.campaign_report_sync import (
     SyncIdentifiers,
     _ensure_catalog_stub,
@@ -42,7 +50,10 @@ from app.providers.tiktok_business.gmvmax_client import (
     GMVMaxResponse,
     TikTokBusinessGMVMaxClient,
 )
-from app.services.gmvmax_creative_metrics import _item_group_ids_for_campaign
+from app.services.gmvmax_creative_metrics import (
+    _item_group_ids_for_campaign,
+    _item_group_ids_for_campaigns,
+)
 from app.services.ttb_gmvmax import (
     fetch_gmvmax_current_creative_statuses,
     fetch_gmvmax_report_by_level,
@@ -307,72 +318,122 @@ def test_ten_minute_creative_fetch_chunks_item_filters_at_100():
     )
 
 
-def test_ten_minute_product_resolver_merges_all_sources_without_limit_50():
-    class _Result:
-        def __init__(self, *, row=None, values=None):
-            self.row = row
-            self.values = list(values or [])
-
-        def mappings(self):
-            return self
-
-        def scalars(self):
-            return self
-
-        def first(self):
-            return self.row
-
-        def all(self):
-            return self.values
-
-    class _Session:
-        def __init__(self):
-            self.statements: list[str] = []
-
-        def execute(self, statement, _params):
-            self.statements.append(str(statement))
-            if len(self.statements) == 1:
-                return _Result(
-                    row={
-                        "detail_raw_json": {
-                            "item_group_ids": ["catalog-detail"]
-                        },
-                        "list_raw_json": {
-                            "item_group_ids": ["catalog-list"]
-                        },
-                    }
+def _seed_campaign_relations(db_session, count: int) -> SimpleNamespace:
+    db_session.add_all(
+        [
+            *(
+                GmvmaxProductCampaignItemGroup(
+                    workspace_id=1,
+                    auth_id=2,
+                    advertiser_id="adv-1",
+                    store_id="store-1",
+                    campaign_id="campaign-1",
+                    item_group_id=f"database-{index}",
                 )
-            return _Result(
-                values=[
-                    *(f"database-{index}" for index in range(120)),
-                    "campaign-raw",
-                ]
-            )
-
-    session = _Session()
-    campaign = SimpleNamespace(
+                for index in range(count)
+            ),
+            _creative_row(creative_id="creative-1", item_group_id="observed-1"),
+        ]
+    )
+    db_session.flush()
+    return SimpleNamespace(
         campaign_id="campaign-1",
         workspace_id=1,
         auth_id=2,
         advertiser_id="adv-1",
         store_id="store-1",
         raw_json={"item_group_ids": ["campaign-raw"]},
-        detail_raw_json={"item_group_ids": ["campaign-detail"]},
-        list_raw_json={"item_group_ids": ["campaign-list"]},
     )
 
-    resolved = _item_group_ids_for_campaign(session, campaign)
 
-    assert resolved[:5] == [
-        "campaign-raw",
-        "campaign-detail",
-        "campaign-list",
-        "catalog-detail",
-        "catalog-list",
+def test_ten_minute_product_resolver_reads_relations_without_limit_50(db_session):
+    campaign = _seed_campaign_relations(db_session, 120)
+
+    resolved = _item_group_ids_for_campaign(db_session, campaign)
+
+    assert resolved[:2] == ["database-0", "database-1"]
+    assert resolved[-1] == "observed-1"
+    assert len(resolved) == 121
+
+
+def test_ten_minute_product_resolver_skips_campaign_raw_once_relations_exist(db_session):
+    campaign = _seed_campaign_relations(db_session, 3)
+
+    resolved = _item_group_ids_for_campaign(db_session, campaign)
+
+    assert resolved == ["database-0", "database-1", "database-2", "observed-1"]
+    assert "campaign-raw" not in resolved
+
+
+def test_ten_minute_product_resolver_persists_parsed_payloads_once(db_session):
+    db_session.add(
+        GmvmaxProductCampaignCatalog(
+            workspace_id=1,
+            auth_id=2,
+            advertiser_id="adv-1",
+            store_id="store-1",
+            campaign_id="campaign-2",
+            detail_raw_json={"_campaign_info": {"item_group_ids": ["catalog-detail"]}},
+            list_raw_json={"item_group_ids": ["catalog-list"]},
+        )
+    )
+    db_session.flush()
+    campaigns = [
+        SimpleNamespace(
+            campaign_id=campaign_id,
+            workspace_id=1,
+            auth_id=2,
+            advertiser_id="adv-1",
+            store_id="store-1",
+            raw_json={"item_group_ids": [f"{campaign_id}-raw"]},
+        )
+        for campaign_id in ("campaign-2", "campaign-3")
     ]
-    assert len(resolved) == 125
-    assert "database-119" in resolved
-    assert "limit 50" not in " ".join(session.statements).lower()
+
+    resolved = _item_group_ids_for_campaigns(db_session, campaigns)
+
+    assert resolved == {
+        "campaign-2": ["campaign-2-raw", "catalog-detail", "catalog-list"],
+        "campaign-3": ["campaign-3-raw"],
+    }
+    stored = (
+        db_session.query(GmvmaxProductCampaignItemGroup.campaign_id)
+        .order_by(GmvmaxProductCampaignItemGroup.id)
+        .all()
+    )
+    assert [row.campaign_id for row in stored] == ["campaign-2"] * 3 + ["campaign-3"]
+
+    campaigns[0].raw_json = {"item_group_ids": ["changed-raw"]}
+    assert _item_group_ids_for_campaigns(db_session, campaigns) == resolved
+
+
+def test_catalog_item_group_ranges_convert_each_row_once(db_session):
+    db_session.add_all(
+        GmvmaxProductCampaignCatalog(
+            workspace_id=1,
+            auth_id=2,
+            advertiser_id="adv-1",
+            store_id="store-1",
+            campaign_id=f"campaign-{index}",
+            detail_raw_json={"item_group_ids": [f"item-{index}"]} if index % 2 else None,
+        )
+        for index in range(6)
+    )
+    db_session.flush()
+    low, high = catalog_id_bounds(db_session)
+    middle = low + 3
+
+    first = backfill_catalog_item_group_range(
+        db_session, start_id=low, end_id=middle, batch_size=2
+    )
+    second = backfill_catalog_item_group_range(db_session, start_id=middle, end_id=high + 1)
+    again = backfill_catalog_item_group_range(db_session, start_id=low, end_id=high + 1)
+
+    assert first["scanned"] + second["scanned"] == 6
+    assert first["inserted"] + second["inserted"] == 3
+    assert again == {"scanned": 6, "campaigns": 3, "inserted": 0}
+    stored = db_session.query(GmvmaxProductCampaignItemGroup.item_group_id).all()
+    assert sorted(row.item_group_id for row in stored) == ["item-1", "item-3", "item-5"]
 
 
 def test_catalog_lock_error_propagates_without_global_rollback_or_seen_pollution():
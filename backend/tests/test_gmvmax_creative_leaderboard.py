@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import select, text
+
+from app.data.models.gmvmax_creative_leaderboard import GmvmaxCreativeLeaderboardEntry
+from app.data.models.gmvmax_creative_metrics import GmvmaxProductCreativeMetricsDaily
+from app.features.tenants.ttb.gmv_max import router_provider
+from app.services import gmvmax_creative_leaderboard as leaderboard
+from app.services.gmvmax_creative_candidates import creative_asset_candidate_from_row
+from app.services.gmvmax_hermes_creative_ranker import rank_creative_candidates
+
+SCOPE = {
+    "workspace_id": 1,
+    "auth_id": 2,
+    "advertiser_id": "adv-1",
+    "store_id": "store-1",
+}
+START = date(2026, 9, 1)
+
+
+def _create_asset_cache(db_session) -> None:
+    db_session.execute(
+        text(
+            """
+            create table if not exists gmvmax_creative_asset_cache (
+                id integer primary key autoincrement,
+                workspace_id integer, auth_id integer,
+                advertiser_id varchar(64), store_id varchar(64),
+                item_id varchar(64), item_group_id varchar(64), video_id varchar(64),
+                title varchar(255), preview_url text, video_cover_url text,
+                local_preview_path text, local_cover_path text,
+                preview_content_type varchar(64), cover_content_type varchar(64),
+                media_cache_status varchar(32), duration float,
+                identity_id varchar(64), identity_type varchar(32), identity_name varchar(255),
+                raw_json text, fetched_at datetime, updated_at datetime
+            )
+            """
+        )
+    )
+    # Not an ORM table, so the per-test metadata reset leaves it in place.
+    db_session.execute(text("delete from gmvmax_creative_asset_cache"))
+    for index in range(1, 6):
+        db_session.execute(
+            text(
+                """
+                insert into gmvmax_creative_asset_cache (
+                    workspace_id, auth_id, advertiser_id, store_id,
+                    item_id, item_group_id, video_id, title, media_cache_status, raw_json
+                ) values (
+                    :workspace_id, :auth_id, :advertiser_id, :store_id,
+                    :item_id, 'group-1', :video_id, :title, 'cached', '{}'
+                )
+                """
+            ),
+            {
+                **SCOPE,
+                "item_id": f"item-{index}",
+                "video_id": f"video-{index}",
+                "title": f"Creative {index}",
+            },
+        )
+    db_session.commit()
+
+
+def _default_metrics() -> dict[str, tuple[int, int, int]]:
+    return {
+        f"item-{index}": (index * 1_000, index * index * 2_000, index * index)
+        for index in range(1, 6)
+    }
+
+
+def _source_rows(metrics, *, identity=False, item_ids=None) -> list[dict]:
+    rows = []
+    for item_id, (cost_cents, gross_revenue_cents, orders) in metrics.items():
+        if item_ids is not None and item_id not in item_ids:
+            continue
+        index = item_id.rsplit("-", 1)[-1]
+        rows.append(
+            {
+                **SCOPE,
+                "item_id": item_id,
+                "item_group_id": "group-1",
+                "video_id": f"video-{index}",
+                "title": f"Creative {index}",
+                "media_cache_status": "cached",
+                "cache_active": "true",
+                "partition_active": 1,
+                "identity_id": "identity-1" if identity else None,
+                "identity_type": "TT_USER" if identity else None,
+                "cost_cents": cost_cents,
+                "gross_revenue_cents": gross_revenue_cents,
+                "orders": orders,
+                "impressions": 10_000,
+                "clicks": 200,
+                "product_impressions": 10_000,
+                "product_clicks": 200,
+            }
+        )
+    return rows
+
+
+def _patch_sources(monkeypatch, *, identity=False) -> tuple[dict, list]:
+    metrics = _default_metrics()
+    requested: list = []
+
+    def _candidate_rows(db, scope, *, metric_start_date, item_ids=None):  # noqa: ARG001
+        requested.append(item_ids)
+        return _source_rows(metrics, identity=identity, item_ids=item_ids)
+
+    monkeypatch.setattr(leaderboard, "_candidate_rows", _candidate_rows)
+    _patch_ranking_inputs(monkeypatch)
+    return metrics, requested
+
+
+def _patch_ranking_inputs(monkeypatch) -> None:
+    monkeypatch.setattr(
+        leaderboard,
+        "load_historical_removed_creatives",
+        lambda db, **kwargs: [("item-2", None)],
+    )
+    monkeypatch.setattr(
+        leaderboard,
+        "product_price_for_hermes",
+        lambda db, **kwargs: (20.0, "test"),
+    )
+
+
+def _read(db_session, **options):
+    return leaderboard.read_creative_leaderboard_page(
+        db_session,
+        **SCOPE,
+        item_group_key="group-1",
+        lookback_days=45,
+        metric_start_date=options.pop("metric_start_date", START),
+        **options,
+    )
+
+
+def test_leaderboard_pages_follow_hermes_order_with_keyset_cursor(db_session, monkeypatch):
+    _create_asset_cache(db_session)
+    _patch_sources(monkeypatch)
+
+    assert _read(db_session, limit=2) is None
+
+    state = leaderboard.refresh_creative_leaderboard(
+        db_session,
+        **SCOPE,
+        item_group_key="group-1",
+        lookback_days=45,
+        metric_start_date=START,
+    )
+    db_session.commit()
+    assert state.total == 5
+    assert state.historically_excluded_count == 1
+    assert state.product_price_source == "test"
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = _read(
+            db_session,
+            limit=2,
+            after_position=int(cursor) if cursor else None,
+        )
+        assert page is not None
+        assert page["total"] == 5
+        seen.extend(item["item_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            break
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+    offset_page = _read(db_session, limit=5)
+    assert [item["item_id"] for item in offset_page["items"]] == seen
+    assert [item["leaderboard_position"] for item in offset_page["items"]] == [1, 2, 3, 4, 5]
+    excluded = [item for item in offset_page["items"] if item["historically_excluded"]]
+    assert [item["item_id"] for item in excluded] == ["item-2"]
+    assert all(item["hermes_tier"] for item in offset_page["items"])
+    assert offset_page["items"][0]["video_id"]
+
+
+def test_leaderboard_filters_and_stale_window(db_session, monkeypatch):
+    _create_asset_cache(db_session)
+    _patch_sources(monkeypatch)
+    leaderboard.refresh_creative_leaderboard(
+        db_session,
+        **SCOPE,
+        item_group_key="group-1",
+        lookback_days=45,
+        metric_start_date=START,
+    )
+    db_session.commit()
+
+    full = _read(db_session, limit=10)
+    tier = full["items"][0]["hermes_tier"]
+    filtered = _read(db_session, limit=10, tiers=[tier.lower()])
+    assert filtered["total"] == sum(1 for item in full["items"] if item["hermes_tier"] == tier)
+    assert {item["hermes_tier"] for item in filtered["items"]} == {tier}
+
+    selectable = _read(db_session, limit=10, selectable_only=True)
+    assert selectable["total"] == sum(1 for item in full["items"] if item["selectable"])
+
+    assert _read(db_session, limit=10, metric_start_date=date(2026, 9, 2)) is None
+
+    refreshed = leaderboard.refresh_scope_leaderboards(
+        db_session,
+        **SCOPE,
+        item_group_ids=["group-1"],
+        advertiser_today=date(2026, 10, 17),
+    )
+    assert refreshed == 1
+    assert _read(db_session, limit=10, metric_start_date=date(2026, 9, 2)) is not None
+
+
+def _refresh(db_session, **options):
+    return leaderboard.refresh_creative_leaderboard(
+        db_session,
+        **SCOPE,
+        item_group_key="group-1",
+        lookback_days=45,
+        metric_start_date=options.pop("metric_start_date", START),
+        **options,
+    )
+
+
+def _expected_order(metrics, *, identity=False) -> list[tuple[str, object]]:
+    candidates = []
+    for row in _source_rows(metrics, identity=identity):
+        candidate = creative_asset_candidate_from_row(row)
+        candidate["historically_excluded"] = candidate["item_id"] == "item-2"
+        candidates.append(candidate)
+    ranked, _summary = rank_creative_candidates(candidates, product_price=20.0)
+    return [(item["item_id"], item["hermes_rank"]) for item in ranked]
+
+
+def test_incremental_refresh_rescores_only_changed_creatives(db_session, monkeypatch):
+    _create_asset_cache(db_session)
+    metrics, requested = _patch_sources(monkeypatch, identity=True)
+    _refresh(db_session)
+    db_session.commit()
+    untouched = db_session.scalar(
+        select(GmvmaxCreativeLeaderboardEntry.refreshed_at).where(
+            GmvmaxCreativeLeaderboardEntry.item_id == "item-3"
+        )
+    )
+
+    # item-1 becomes the best seller; only it is scored again.
+    metrics["item-1"] = (1_000, 90_000, 40)
+    state = _refresh(db_session, item_ids=["item-1"])
+    db_session.commit()
+
+    assert requested == [None, ["item-1"]]
+    page = _read(db_session, limit=10)
+    assert [(item["item_id"], item["hermes_rank"]) for item in page["items"]] == _expected_order(
+        metrics, identity=True
+    )
+    assert page["items"][0]["item_id"] == "item-1"
+    assert [item["leaderboard_position"] for item in page["items"]] == [1, 2, 3, 4, 5]
+    assert state.total == 5
+    assert db_session.scalar(
+        select(GmvmaxCreativeLeaderboardEntry.refreshed_at).where(
+            GmvmaxCreativeLeaderboardEntry.item_id == "item-3"
+        )
+    ) == untouched
+
+    # A creative that left the board is removed; nothing else is rescored.
+    del metrics["item-4"]
+    state = _refresh(db_session, item_ids=["item-4"])
+    db_session.commit()
+    assert state.total == 4
+    assert [item["item_id"] for item in _read(db_session, limit=10)["items"]] == [
+        item_id for item_id, _rank in _expected_order(metrics, identity=True)
+    ]
+
+    # A moved metric window rescores the whole board.
+    _refresh(db_session, item_ids=["item-1"], metric_start_date=date(2026, 9, 2))
+    assert requested[-1] is None
+
+
+def _seed_store(db_session) -> None:
+    _create_asset_cache(db_session)
+    db_session.execute(
+        text("update gmvmax_creative_asset_cache set identity_id='identity-1', identity_type='TT_USER'")
+    )
+    db_session.execute(text("delete from gmvmax_creative_asset_products"))
+    for index in range(1, 5):
+        db_session.execute(
+            text(
+                """
+                insert into gmvmax_creative_asset_products (
+                    workspace_id, auth_id, advertiser_id, store_id, item_id, item_group_id,
+                    created_at, updated_at
+                ) values (
+                    :workspace_id, :auth_id, :advertiser_id, :store_id, :item_id, 'group-1',
+                    current_timestamp, current_timestamp
+                )
+                """
+            ),
+            {**SCOPE, "item_id": f"item-{index}"},
+        )
+    now = datetime(2026, 9, 10)
+    for index in range(1, 6):
+        db_session.add(
+            GmvmaxProductCreativeMetricsDaily(
+                **SCOPE,
+                campaign_id="campaign-1",
+                item_group_id="group-1",
+                creative_id=f"item-{index}",
+                stat_time_day=date(2026, 9, 5),
+                cost_cents=index * 1_000,
+                gross_revenue_cents=index * index * 2_000,
+                orders=index * index,
+                impressions=10_000,
+                clicks=200,
+                created_at=now,
+                updated_at=now,
+            )
+        )
+    db_session.commit()
+
+
+def _board_flags(db_session) -> dict[str, tuple[bool, str]]:
+    return {
+        item_id: (bool(selectable), tier)
+        for item_id, selectable, tier in db_session.execute(
+            select(
+                GmvmaxCreativeLeaderboardEntry.item_id,
+                GmvmaxCreativeLeaderboardEntry.selectable,
+                GmvmaxCreativeLeaderboardEntry.hermes_tier,
+            )
+        ).all()
+    }
+
+
+def test_asset_sync_refreshes_stale_selectable_flags(db_session, monkeypatch):
+    _seed_store(db_session)
+    _patch_ranking_inputs(monkeypatch)
+    _refresh(db_session)
+    db_session.commit()
+
+    flags = _board_flags(db_session)
+    # item-5 has product metrics but TikTok no longer links it to the product.
+    assert {item_id for item_id, (selectable, _tier) in flags.items() if selectable} == {
+        "item-1",
+        "item-2",
+        "item-3",
+        "item-4",
+    }
+    assert flags["item-5"] == (False, "UNRATED")
+
+    db_session.execute(
+        text(
+            """
+            update gmvmax_creative_asset_cache
+            set raw_json='{"_gmv_ops_sync": {"active": false}}'
+            where item_id='item-4'
+            """
+        )
+    )
+    db_session.execute(
+        text(
+            """
+            insert into gmvmax_creative_asset_products (
+                workspace_id, auth_id, advertiser_id, store_id, item_id, item_group_id,
+                created_at, updated_at
+            ) values (
+                :workspace_id, :auth_id, :advertiser_id, :store_id, 'item-5', 'group-1',
+                current_timestamp, current_timestamp
+            )
+            """
+        ),
+        SCOPE,
+    )
+    assert leaderboard.refresh_asset_leaderboards(db_session, **SCOPE) == 1
+    db_session.commit()
+
+    refreshed = _board_flags(db_session)
+    assert refreshed["item-4"] == (False, "UNRATED")
+    assert refreshed["item-5"][0] is True
+    assert refreshed["item-5"][1] != "UNRATED"
+    assert {item_id: flag for item_id, flag in refreshed.items() if item_id not in {"item-4", "item-5"}} == {
+        item_id: flag for item_id, flag in flags.items() if item_id not in {"item-4", "item-5"}
+    }
+    page = _read(db_session, limit=10)
+    assert page["items"][0]["item_id"] == "item-5"
+    assert [item["leaderboard_position"] for item in page["items"]] == [1, 2, 3, 4, 5]
+
+
+def test_candidate_page_queues_missing_board_instead_of_building(db_session, monkeypatch):
+    requested = []
+    monkeypatch.setattr(
+        router_provider,
+        "request_creative_leaderboard_build",
+        lambda **kwargs: requested.append(kwargs) or True,
+    )
+    monkeypatch.setattr(
+        db_session,
+        "commit",
+        lambda: (_ for _ in ()).throw(AssertionError("GET must not commit")),
+    )
+    board = {**SCOPE, "item_group_key": "group-1", "lookback_days": 45}
+
+    page = router_provider._creative_leaderboard_page(
+        db_session,
+        board=board,
+        metric_start_date=START,
+        limit=10,
+    )
+
+    assert page is None
+    assert requested == [{**board, "metric_start_date": START}]
+    assert _read(db_session, limit=10) is None
@@ -172,3 +172,65 @@ def test_hermes_ranking_uses_item_id_as_the_final_tie_break():
     )
 
     assert [item["item_id"] for item in ranked] == ["creative-a", "creative-b"]
+
+
+def test_live_cursor_pages_report_the_filtered_total(monkeypatch):
+    class _FiveAssetsDb(_RecordingDb):
+        def execute(self, statement, params):
+            result = super().execute(statement, params)
+            if "from gmvmax_creative_asset_cache a" in self.statements[-1][0]:
+                (row,) = result.all()
+                return _Rows({**row, "item_id": f"creative-{index}"} for index in range(1, 6))
+            return result
+
+    db = _FiveAssetsDb()
+    monkeypatch.setattr(
+        router_provider,
+        "_validate_bound_scope",
+        lambda *_args, **_kwargs: ("advertiser-1", "store-1"),
+    )
+    monkeypatch.setattr(router_provider, "_load_historical_removed_creatives", lambda *_a, **_k: [])
+    monkeypatch.setattr(
+        router_provider,
+        "_resolve_advertiser_today",
+        lambda *_args, **_kwargs: datetime(2026, 7, 17).date(),
+    )
+    monkeypatch.setattr(router_provider, "_product_price_for_hermes", lambda *_a, **_k: (None, None))
+    monkeypatch.setattr(
+        router_provider,
+        "rank_creative_candidates",
+        lambda candidates, **_kwargs: (
+            [
+                {**candidate, "hermes_tier": "WINNER" if index % 2 else "WEAK"}
+                for index, candidate in enumerate(candidates, start=1)
+            ],
+            {"model": "TEST", "status": "ok"},
+        ),
+    )
+
+    response = asyncio.run(
+        router_provider.list_gmvmax_creative_assets_route(
+            workspace_id=3,
+            provider="tiktok-business",
+            auth_id=9,
+            store_id="store-1",
+            advertiser_id="advertiser-1",
+            campaign_id=None,
+            item_group_id=None,
+            item_group_ids=["product-c", "product-b"],
+            refresh=False,
+            lookback_days=30,
+            page=1,
+            page_size=1,
+            offset=None,
+            cursor="3",
+            hermes_tier=["winner"],
+            selectable_only=False,
+            context=SimpleNamespace(db=db),
+        )
+    )
+
+    # WINNERs sit at positions 1, 3 and 5; the page after position 3 is the last.
+    assert [item["item_id"] for item in response["items"]] == ["creative-5"]
+    assert response["total_number"] == 3
+    assert response["page_info"]["has_more"] is False
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.services import gmvmax_hermes_daily_report as daily_report
+
+
+class _Db:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_cycle_runs_scopes_in_bounded_lanes_with_own_sessions(monkeypatch):
+    scopes = [{"store_id": str(index)} for index in range(6)]
+    sessions: list[_Db] = []
+    active = 0
+    peak = 0
+
+    async def process(db, scope, *, report_date, force, limits, summary):  # noqa: ARG001
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if scope["store_id"] == "3":
+            raise RuntimeError("scope failed")
+        summary["generated"] += 1
+
+    def make_session():
+        session = _Db()
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr(daily_report, "ensure_hermes_daily_report_table", lambda db: None)
+    monkeypatch.setattr(daily_report, "_load_report_scopes", lambda db: scopes)
+    monkeypatch.setattr(daily_report, "_process_report_scope", process)
+    monkeypatch.setattr(daily_report.settings, "GMVMAX_HERMES_DAILY_REPORT_SCOPE_CONCURRENCY", 2)
+
+    summary = asyncio.run(
+        daily_report.run_hermes_daily_report_cycle(_Db(), session_factory=make_session)
+    )
+
+    assert peak == 2
+    assert summary["scopes"] == 6
+    assert summary["generated"] == 5
+    assert summary["errors"] == 1
+    assert len(sessions) == 6
+    assert all(session.closed for session in sessions)
+    assert sum(session.rollbacks for session in sessions) == 1
+
+
+def test_checkpoint_reuse_requires_same_stage_and_recent_success():
+    now = datetime(2026, 7, 13, 1, 30, tzinfo=timezone.utc)
+    checkpoint = {
+        "stage": "OVERVIEW_REFRESHED",
+        "final_cutoff": 1,
+        "overview_json": {"status": "success", "synced_rows": 3},
+        "updated_at": (now - timedelta(minutes=5)).replace(tzinfo=None),
+    }
+
+    assert daily_report._checkpoint_reusable(checkpoint, final_cutoff=True, now=now)
+    assert not daily_report._checkpoint_reusable(checkpoint, final_cutoff=False, now=now)
+    assert not daily_report._checkpoint_reusable(
+        checkpoint, final_cutoff=True, stage="COMPLETED", now=now
+    )
+    assert not daily_report._checkpoint_reusable(
+        {**checkpoint, "overview_json": {"status": "failed"}}, final_cutoff=True, now=now
+    )
+    assert not daily_report._checkpoint_reusable(
+        checkpoint, final_cutoff=True, now=now + timedelta(hours=1)
+    )
+    assert daily_report._checkpoint_reusable(
+        {**checkpoint, "stage": "COMPLETED"}, final_cutoff=True, stage="COMPLETED", now=now
+    )
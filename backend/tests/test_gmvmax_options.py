@@ -23,6 +23,7 @@ from app.data.models.ttb_entities import (
 )
 from app.features.tenants.ttb.router import router as ttb_router
 from app.features.tenants.ttb.gmv_max import router_provider
+from app.services import ttb_meta_cache
 from app.services.crypto import encrypt_text_to_blob
 from app.services.ttb_meta import (
     MetaCursorState,
@@ -31,8 +32,53 @@ from app.services.ttb_meta import (
 )
 
 
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+
+    def get(self, key):  # noqa: ANN001
+        return self.values.get(key)
+
+    def set(self, key, value, nx=False, ex=None):  # noqa: ANN001
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    def delete(self, key):  # noqa: ANN001
+        self.values.pop(key, None)
+
+
+class _AsyncRedis:
+    """Async view of the same store, as served to the request path."""
+
+    def __init__(self, redis: _FakeRedis) -> None:
+        self._redis = redis
+
+    async def get(self, key):  # noqa: ANN001
+        return self._redis.get(key)
+
+    async def set(self, key, value, nx=False, ex=None):  # noqa: ANN001
+        return self._redis.set(key, value, nx=nx, ex=ex)
+
+    async def delete(self, key):  # noqa: ANN001
+        self._redis.delete(key)
+
+
 @pytest.fixture()
-def gmv_app(db_session):
+def options_cache(monkeypatch):
+    redis = _FakeRedis()
+
+    async def _get_redis():
+        return _AsyncRedis(redis)
+
+    monkeypatch.setattr(ttb_meta_cache, "get_redis_sync", lambda: redis)
+    monkeypatch.setattr(ttb_meta_cache, "get_redis", _get_redis)
+    return redis
+
+
+@pytest.fixture()
+def gmv_app(db_session, options_cache):
     app = FastAPI()
     install_exception_handlers(app)
     app.include_router(ttb_router)
@@ -578,3 +624,64 @@ def test_gmvmax_alias_scope_enforced(monkeypatch, gmv_app):
         "/api/v1/tenants/2/providers/tiktok-business/accounts/1/gmvmax/"
     )
     assert not_found.status_code == 404
+
+
+def _count_builds(monkeypatch) -> list[int]:
+    calls: list[int] = []
+    original = ttb_meta_cache.build_gmvmax_options
+
+    def _counting(*args, **kwargs):  # noqa: ANN002, ANN003
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(ttb_meta_cache, "build_gmvmax_options", _counting)
+    return calls
+
+
+def test_options_are_built_once_per_revision_set(monkeypatch, gmv_app, options_cache):
+    client, db_session = gmv_app
+    builds = _count_builds(monkeypatch)
+    url = "/api/v1/tenants/1/providers/tiktok-business/accounts/1/gmvmax/options"
+
+    first = client.get(url)
+    second = client.get(url)
+
+    assert builds == [1]
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    stored = options_cache.values["ttb:meta:gmvmax_options:1:1"]
+    assert stored.startswith(first.headers["ETag"].strip('"').encode() + b"\n")
+    assert len(stored) < len(first.content)
+
+    cursor = db_session.query(TTBSyncCursor).filter(TTBSyncCursor.resource_type == "store").one()
+    cursor.last_rev = "store-rev-2"
+    db_session.commit()
+    third = client.get(url)
+
+    assert builds == [1, 1]
+    assert third.headers["ETag"] != first.headers["ETag"]
+    assert third.json() == first.json()
+
+
+def test_options_cache_is_dropped_when_meta_sync_completes(monkeypatch, gmv_app, options_cache):
+    client, _ = gmv_app
+    builds = _count_builds(monkeypatch)
+    url = "/api/v1/tenants/1/providers/tiktok-business/accounts/1/gmvmax/options"
+
+    client.get(url)
+    ttb_meta_cache.invalidate_gmvmax_options_cache(1, 1)
+    client.get(url)
+
+    assert builds == [1, 1]
+
+
+def test_options_build_without_waiting_forever_on_a_stale_claim(monkeypatch, gmv_app, options_cache):
+    client, _ = gmv_app
+    builds = _count_builds(monkeypatch)
+    monkeypatch.setattr(settings, "GMV_MAX_OPTIONS_CACHE_BUILD_WAIT_SECONDS", 0.2, raising=False)
+    options_cache.values["ttb:meta:gmvmax_options:1:1:build"] = b"1"
+
+    resp = client.get("/api/v1/tenants/1/providers/tiktok-business/accounts/1/gmvmax/options")
+
+    assert resp.status_code == 200
+    assert builds == [1]
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.services import gmvmax_realtime_counters, gmvmax_smart_guard, gmvmax_smart_guard_windows
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.values: dict[str, str] = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zremrangebyscore(self, key, low, high):
+        low = float("-inf") if low == "-inf" else float(low)
+        exclusive = isinstance(high, str) and high.startswith("(")
+        high = float(str(high).lstrip("("))
+        members = self.zsets.get(key, {})
+        for member, score in list(members.items()):
+            if low <= score and (score < high if exclusive else score <= high):
+                del members[member]
+
+    def zrangebyscore(self, key, low, high, withscores=False):
+        return sorted(
+            ((member, score) for member, score in self.zsets.get(key, {}).items() if low <= score <= high),
+            key=lambda item: item[1],
+        )
+
+    def expire(self, key, seconds):
+        return True
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.ops]
+
+
+class _Rows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+def _campaign():
+    return SimpleNamespace(
+        workspace_id=7,
+        auth_id=11,
+        advertiser_id="adv-1",
+        store_id="store-1",
+        campaign_id="campaign-1",
+    )
+
+
+def _publish_snapshots(redis, monkeypatch, snapshots):
+    monkeypatch.setattr(gmvmax_realtime_counters, "get_redis_sync", lambda: redis)
+    session = Session(create_engine("sqlite://"))
+    for snapshot_at, counters in snapshots:
+        gmvmax_realtime_counters.record_creative_snapshot(
+            session,
+            workspace_id=7,
+            auth_id=11,
+            advertiser_id="adv-1",
+            store_id="store-1",
+            campaign_id="campaign-1",
+            snapshot_at=snapshot_at,
+            rows_by_day={date(2026, 7, 17): {("product-1", "creative-1"): counters}},
+        )
+        session.commit()
+
+
+def test_momentum_reads_committed_snapshots_from_redis(monkeypatch):
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    early = now.replace(tzinfo=None) - timedelta(minutes=230)
+    late = now.replace(tzinfo=None) - timedelta(minutes=10)
+    redis = _FakeRedis()
+    _publish_snapshots(
+        redis,
+        monkeypatch,
+        [
+            (early, {"cost_cents": 100, "gross_revenue_cents": 0, "orders": 0, "impressions": 10, "clicks": 1}),
+            (late, {"cost_cents": 150, "gross_revenue_cents": 100, "orders": 1, "impressions": 20, "clicks": 2}),
+        ],
+    )
+    # Coverage starts at the first publish; claim the whole window.
+    for key in redis.values:
+        redis.values[key] = str((now - timedelta(hours=6)).timestamp())
+
+    class _Db:
+        def __init__(self):
+            self.calls = []
+
+        def execute(self, statement, params):
+            self.calls.append((" ".join(str(statement).split()), params))
+            if len(self.calls) == 1:
+                return _Rows(["campaign-1"])
+            return _Rows([{"campaign_id": "campaign-1", "latest_snapshot_at": late, "snapshot_count": 2}])
+
+    db = _Db()
+    monkeypatch.setattr(gmvmax_smart_guard, "_source_age_seconds", lambda *_: 0)
+
+    result = gmvmax_smart_guard._product_recent_momentum_stats(
+        db,
+        campaign=_campaign(),
+        guard={"recent_momentum_window_minutes": 60},
+        item_group_ids=["product-1"],
+        now=now,
+    )
+
+    assert result["cost_cents"] == 50
+    assert result["orders"] == 1
+    assert result["source_updated_at"] == late.isoformat()
+    assert len(db.calls) == 2
+    assert "join gmv_creative_10min_batch_manifests b" not in db.calls[1][0]
+
+
+def test_momentum_falls_back_to_sql_when_manifest_watermark_differs(monkeypatch):
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    early = now.replace(tzinfo=None) - timedelta(minutes=230)
+    late = now.replace(tzinfo=None) - timedelta(minutes=10)
+    redis = _FakeRedis()
+    _publish_snapshots(
+        redis,
+        monkeypatch,
+        [(early, {"cost_cents": 100, "gross_revenue_cents": 0, "orders": 0, "impressions": 10, "clicks": 1})],
+    )
+    for key in redis.values:
+        redis.values[key] = str((now - timedelta(hours=6)).timestamp())
+
+    class _Db:
+        def __init__(self):
+            self.calls = []
+
+        def execute(self, statement, params):
+            self.calls.append((" ".join(str(statement).split()), params))
+            if len(self.calls) == 1:
+                return _Rows(["campaign-1"])
+            if len(self.calls) == 2:
+                # A newer complete batch exists that never reached Redis.
+                return _Rows([{"campaign_id": "campaign-1", "latest_snapshot_at": late, "snapshot_count": 2}])
+            return _Rows([])
+
+    db = _Db()
+    monkeypatch.setattr(gmvmax_smart_guard, "_source_age_seconds", lambda *_: 0)
+
+    gmvmax_smart_guard._product_recent_momentum_stats(
+        db,
+        campaign=_campaign(),
+        guard={"recent_momentum_window_minutes": 60},
+        item_group_ids=["product-1"],
+        now=now,
+    )
+
+    assert len(db.calls) == 3
+    assert "join gmv_creative_10min_batch_manifests b" in db.calls[2][0]
+
+
+def test_rolled_back_snapshot_is_never_published(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(gmvmax_realtime_counters, "get_redis_sync", lambda: redis)
+    session = Session(create_engine("sqlite://"))
+    session.execute(text("select 1"))
+    gmvmax_realtime_counters.record_creative_snapshot(
+        session,
+        workspace_id=7,
+        auth_id=11,
+        advertiser_id="adv-1",
+        store_id="store-1",
+        campaign_id="campaign-1",
+        snapshot_at=datetime.utcnow().replace(second=0, microsecond=0),
+        rows_by_day={date(2026, 7, 17): {}},
+    )
+    session.rollback()
+    session.commit()
+
+    assert redis.zsets == {}
+    assert redis.values == {}
+
+
+def test_unavailable_redis_reports_unknown_coverage(monkeypatch):
+    def _down():
+        raise ConnectionError("redis unavailable")
+
+    monkeypatch.setattr(gmvmax_realtime_counters, "get_redis_sync", _down)
+
+    assert gmvmax_realtime_counters.heartbeat_matches(("scope",), "sig") is None
+    assert (
+        gmvmax_realtime_counters.creative_snapshot_rows(
+            workspace_id=7,
+            auth_id=11,
+            advertiser_id="adv-1",
+            store_id="store-1",
+            campaign_ids=["campaign-1"],
+            item_group_ids=["product-1"],
+            since=datetime(2026, 7, 17, 9, 0),
+            now=datetime(2026, 7, 17, 12, 0),
+        )
+        is None
+    )
+
+
+def test_cycle_windows_load_momentum_from_the_redis_mirror(monkeypatch):
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    early = now.replace(tzinfo=None) - timedelta(minutes=230)
+    late = now.replace(tzinfo=None) - timedelta(minutes=10)
+    redis = _FakeRedis()
+    _publish_snapshots(
+        redis,
+        monkeypatch,
+        [
+            (early, {"cost_cents": 100, "gross_revenue_cents": 0, "orders": 0, "impressions": 10, "clicks": 1}),
+            (late, {"cost_cents": 150, "gross_revenue_cents": 100, "orders": 1, "impressions": 20, "clicks": 2}),
+        ],
+    )
+    for key in redis.values:
+        redis.values[key] = str((now - timedelta(hours=6)).timestamp())
+
+    class _Db:
+        def __init__(self):
+            self.calls = []
+            self.info = {}
+
+        def execute(self, statement, params):
+            self.calls.append((" ".join(str(statement).split()), params))
+            if len(self.calls) == 1:
+                return _Rows(
+                    [
+                        {"campaign_id": "campaign-1", "item_group_id": "product-1"},
+                        {"campaign_id": "campaign-idle", "item_group_id": "product-1"},
+                    ]
+                )
+            return _Rows([{"campaign_id": "campaign-1", "latest_snapshot_at": late, "snapshot_count": 2}])
+
+    db = _Db()
+    monkeypatch.setattr(gmvmax_smart_guard, "_source_age_seconds", lambda *_: 0)
+    gmvmax_smart_guard_windows.begin_cycle(db)
+
+    result = gmvmax_smart_guard._product_recent_momentum_stats(
+        db,
+        campaign=_campaign(),
+        guard={"recent_momentum_window_minutes": 60},
+        item_group_ids=["product-1"],
+        now=now,
+    )
+
+    assert result["cost_cents"] == 50
+    assert result["orders"] == 1
+    assert result["campaign_count"] == 2
+    assert len(db.calls) == 2
+    # Idle campaigns without batches in the window need no mirrored series.
+    assert db.calls[1][1]["campaign_ids"] == ["campaign-1", "campaign-idle"]
+    assert all("join gmv_creative_10min_batch_manifests b" not in query for query, _params in db.calls)
@@ -15,6 +15,7 @@ from app.data.models.gmvmax_campaign_snapshots import (
 )
 from app.data.models.gmvmax_sync_state import GmvCreative10MinBatchManifest
 from app.gmvmax.services.campaign_report_sync import (
+    CampaignSyncStats,
     SyncIdentifiers,
     sync_campaign_metrics,
     sync_campaign_snapshot,
@@ -46,6 +47,92 @@ class DummyReportClient:
         )
 
 
+class RecordingReportClient(DummyReportClient):
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.windows = []
+
+    async def gmv_max_report_get(self, request):
+        self.windows.append((request.start_date, request.end_date))
+        return await super().gmv_max_report_get(request)
+
+
+def _sync_daily(db_session, client, identifiers, start, end, **kwargs):
+    stats = CampaignSyncStats()
+    asyncio.run(
+        sync_campaign_metrics(
+            db_session,
+            client,
+            identifiers=identifiers,
+            promotion_type="PRODUCT",
+            granularity="DAILY",
+            start_date=start,
+            end_date=end,
+            stats=stats,
+            **kwargs,
+        )
+    )
+    return stats
+
+
+def test_settled_days_are_not_requested_again(db_session):
+    identifiers = SyncIdentifiers(1, 2, "adv", "store", advertiser_timezone="UTC")
+    client = RecordingReportClient(
+        [
+            {
+                "metrics": {"cost": "5.00"},
+                "dimensions": {"campaign_id": "c1", "stat_time_day": "2024-01-01"},
+            }
+        ]
+    )
+
+    first = _sync_daily(db_session, client, identifiers, date(2024, 1, 1), date(2024, 1, 3))
+    assert client.windows == [("2024-01-01", "2024-01-03")]
+    assert (first.rows_written, first.settled_days_skipped) == (1, 0)
+    assert first.bytes_fetched > 0
+
+    second = _sync_daily(db_session, client, identifiers, date(2023, 12, 31), date(2024, 1, 3))
+    assert client.windows[1:] == [("2023-12-31", "2023-12-31")]
+    assert (second.requested_days, second.settled_days_skipped) == (1, 3)
+
+    # A fact removed behind the planner's back makes its day unsettled again.
+    db_session.query(GmvmaxProductCampaignMetricsDaily).delete()
+    third = _sync_daily(db_session, client, identifiers, date(2024, 1, 1), date(2024, 1, 3))
+    assert client.windows[2:] == [("2024-01-01", "2024-01-01")]
+    assert third.rows_written == 1
+    assert db_session.query(GmvmaxProductCampaignMetricsDaily).one().is_final is True
+
+    _sync_daily(
+        db_session, client, identifiers, date(2024, 1, 1), date(2024, 1, 3), force_refresh=True
+    )
+    assert client.windows[3:] == [("2024-01-01", "2024-01-03")]
+
+
+def test_unchanged_unsettled_day_skips_the_upsert(db_session):
+    identifiers = SyncIdentifiers(1, 2, "adv", "store")
+    client = RecordingReportClient(
+        [
+            {
+                "metrics": {"cost": "5.00"},
+                "dimensions": {"campaign_id": "c1", "stat_time_day": "2024-01-01"},
+            }
+        ]
+    )
+
+    _sync_daily(db_session, client, identifiers, date(2024, 1, 1), date(2024, 1, 1))
+    ingested_at = db_session.query(GmvmaxProductCampaignMetricsDaily).one().ingested_at
+
+    unchanged = _sync_daily(db_session, client, identifiers, date(2024, 1, 1), date(2024, 1, 1))
+    assert len(client.windows) == 2
+    assert (unchanged.rows_fetched, unchanged.rows_written, unchanged.rows_unchanged) == (1, 0, 1)
+    assert db_session.query(GmvmaxProductCampaignMetricsDaily).one().ingested_at == ingested_at
+
+    client.rows[0]["metrics"]["cost"] = "6.00"
+    changed = _sync_daily(db_session, client, identifiers, date(2024, 1, 1), date(2024, 1, 1))
+    assert changed.rows_written == 1
+    assert db_session.query(GmvmaxProductCampaignMetricsDaily).one().cost_cents == 600
+
+
 def test_fact_upsert_idempotent(db_session):
     identifiers = SyncIdentifiers(1, 2, "adv", "store")
     client = DummyReportClient(
@@ -166,6 +253,40 @@ def test_snapshot_replace_idempotent(db_session):
     assert row.cost_cents == 1200
 
 
+def test_settled_snapshot_is_reused_without_a_request(db_session):
+    identifiers = SyncIdentifiers(1, 2, "adv", "store", advertiser_timezone="UTC")
+    client = RecordingReportClient(
+        [
+            {
+                "metrics": {"cost": "10.00"},
+                "dimensions": {"campaign_id": "c1"},
+            }
+        ]
+    )
+
+    def _snapshot():
+        stats = CampaignSyncStats()
+        rows = asyncio.run(
+            sync_campaign_snapshot(
+                db_session,
+                client,
+                identifiers=identifiers,
+                promotion_type="PRODUCT",
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 1, 2),
+                stats=stats,
+            )
+        )
+        return rows, stats
+
+    rows, stats = _snapshot()
+    assert (rows, stats.rows_written, len(client.windows)) == (1, 1, 1)
+    rows, stats = _snapshot()
+    assert (rows, stats.rows_unchanged, stats.settled_days_skipped) == (1, 1, 2)
+    assert len(client.windows) == 1
+    assert db_session.query(GmvmaxProductCampaignSnapshotRow).one().cost_cents == 1000
+
+
 def test_snapshot_concurrent_workers():
     identifiers = SyncIdentifiers(1, 2, "adv", "store")
     rows = [
@@ -0,0 +1,136 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select, text
+
+from app.data.models.gmvmax_campaign_metrics import GmvmaxProductCampaignMetricsHourly
+from app.gmvmax.services import retention
+from app.gmvmax.services.campaign_cleanup import cleanup_campaign_tables
+from app.gmvmax.services.retention import RetentionEngine, RetentionTarget
+
+NOW = datetime(2026, 10, 18, 12, 0)
+HOURLY = GmvmaxProductCampaignMetricsHourly
+
+
+def _hourly(row_id: int, stat_time_hour: datetime) -> HOURLY:
+    return HOURLY(
+        id=row_id,
+        workspace_id=1,
+        auth_id=2,
+        advertiser_id="adv",
+        store_id="store",
+        campaign_id=f"c{row_id}",
+        stat_time_hour=stat_time_hour,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def test_chunked_delete_walks_keyset_batches_and_pauses_between_them(db_session) -> None:
+    old = [_hourly(row_id, NOW - timedelta(days=200, hours=row_id % 3)) for row_id in range(1, 8)]
+    db_session.add_all(old + [_hourly(20, NOW - timedelta(days=1)), _hourly(21, NOW)])
+    db_session.commit()
+    pauses: list[float] = []
+
+    engine = RetentionEngine(db_session, batch_size=3, pause_seconds=0.25, sleep=pauses.append)
+    (result,) = engine.run(
+        [RetentionTarget("hourly_prod", HOURLY.__table__, "stat_time_hour", NOW - timedelta(days=90))]
+    )
+
+    assert (result.strategy, result.rows, result.batches, result.complete) == ("delete", 7, 3, True)
+    assert result.bytes is None  # SQLite exposes no average row length
+    assert pauses == [0.25, 0.25]
+    assert db_session.execute(select(HOURLY.id).order_by(HOURLY.id)).scalars().all() == [20, 21]
+
+
+def test_chunked_delete_stops_at_the_run_budget(db_session) -> None:
+    db_session.add_all([_hourly(row_id, NOW - timedelta(days=200)) for row_id in range(1, 6)])
+    db_session.commit()
+    ticks = iter(range(100))
+
+    engine = RetentionEngine(
+        db_session,
+        batch_size=2,
+        pause_seconds=0,
+        max_seconds=3,
+        clock=lambda: next(ticks),
+    )
+    (result,) = engine.run(
+        [RetentionTarget("hourly_prod", HOURLY.__table__, "stat_time_hour", NOW - timedelta(days=90))]
+    )
+
+    assert result.complete is False
+    assert result.rows == 2
+    assert db_session.execute(select(HOURLY.id)).scalars().all() != []
+
+
+def test_cleanup_expires_only_smart_guard_heartbeats(db_session) -> None:
+    db_session.execute(
+        text(
+            """
+            create table if not exists gmv_campaign_guard_events (
+                id integer primary key autoincrement,
+                workspace_id integer not null,
+                auth_id integer not null,
+                advertiser_id varchar(64) not null,
+                store_id varchar(64) not null,
+                campaign_id varchar(64) not null,
+                strategy_id integer null,
+                event_type varchar(64) not null,
+                action varchar(32) not null,
+                reason varchar(512) null,
+                result varchar(32) not null,
+                cost_cents integer null,
+                gross_revenue_cents integer null,
+                orders integer null,
+                roi numeric null,
+                request_json text null,
+                response_json text null,
+                error_message text null,
+                created_at datetime not null
+            )
+            """
+        )
+    )
+    db_session.execute(text("delete from gmv_campaign_guard_events"))
+    old = NOW - timedelta(days=45)
+    for event_type, action, result, created_at in [
+        ("SMART_GUARD", "HOLD", "SKIPPED", old),
+        ("SMART_GUARD", "HOLD", "SKIPPED", NOW - timedelta(days=2)),
+        ("SMART_GUARD", "PAUSE", "SUCCESS", old),
+        ("SMART_GUARD", "HOLD", "FAILED", old),
+        ("CREATIVE_GUARD", "HOLD", "SKIPPED", old),
+    ]:
+        db_session.execute(
+            text(
+                "insert into gmv_campaign_guard_events (workspace_id, auth_id, advertiser_id, "
+                "store_id, campaign_id, event_type, action, result, created_at) values "
+                "(1, 2, 'adv', 'store', 'c1', :event_type, :action, :result, :created_at)"
+            ),
+            {"event_type": event_type, "action": action, "result": result, "created_at": created_at},
+        )
+    db_session.commit()
+
+    summary = cleanup_campaign_tables(db_session, now=NOW, guard_heartbeat_retention_days=30)
+
+    assert summary["guard_heartbeats"] == 1
+    assert summary["retention"]["guard_heartbeats"]["table"] == "gmv_campaign_guard_events"
+    remaining = db_session.execute(
+        text("select event_type, action, result from gmv_campaign_guard_events order by id")
+    ).all()
+    assert [tuple(row) for row in remaining] == [
+        ("SMART_GUARD", "HOLD", "SKIPPED"),
+        ("SMART_GUARD", "PAUSE", "SUCCESS"),
+        ("SMART_GUARD", "HOLD", "FAILED"),
+        ("CREATIVE_GUARD", "HOLD", "SKIPPED"),
+    ]
+
+
+def test_partition_upper_bounds_parse_range_columns_and_to_days() -> None:
+    to_days = date(2026, 10, 1).toordinal() + 365
+
+    assert retention._partition_upper_bound(str(to_days), to_days=True) == datetime(2026, 10, 1)
+    assert retention._partition_upper_bound("'2026-10-01'", to_days=False) == datetime(2026, 10, 1)
+    assert retention._partition_upper_bound(
+        "'2026-10-01 06:00:00'", to_days=False
+    ) == datetime(2026, 10, 1, 6)
+    assert retention._partition_upper_bound("MAXVALUE", to_days=False) is None
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.services import gmvmax_smart_guard_windows
+from app.services.gmvmax_smart_guard_windows import SmartGuardCycleWindows, momentum_totals
+
+SCOPE = (7, 11, "adv-1", "store-1")
+
+
+class _Rows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class _Db:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+        self.info = {}
+
+    def execute(self, statement, params):
+        self.calls.append((" ".join(str(statement).split()), params))
+        return _Rows(self.responses.pop(0))
+
+
+def _reference_momentum(rows, *, item_group_ids, cutoff, active_campaign_id):
+    """The per-row loop Smart Guard used before the columnar pass."""
+
+    allowed = {str(item) for item in item_group_ids}
+    grouped = {}
+    for row in rows:
+        item_group_id = str(row.get("item_group_id") or "")
+        if item_group_id not in allowed:
+            continue
+        key = (str(row.get("campaign_id")), item_group_id, str(row.get("creative_id")))
+        grouped.setdefault(key, []).append(row)
+    totals = {"cost_cents": 0, "gross_revenue_cents": 0, "orders": 0, "impressions": 0, "clicks": 0}
+    active = {"cost_cents": 0, "gross_revenue_cents": 0, "orders": 0}
+    latest_snapshot_at = None
+    reliable = 0
+    for (campaign_id, _item_group_id, _creative_id), snapshots in grouped.items():
+        latest = snapshots[-1]
+        latest_at = latest.get("snapshot_at")
+        if latest_at != latest.get("latest_complete_snapshot_at"):
+            continue
+        if latest_snapshot_at is None or latest_at > latest_snapshot_at:
+            latest_snapshot_at = latest_at
+        baseline = None
+        for snapshot in snapshots:
+            if snapshot.get("snapshot_at") <= cutoff:
+                baseline = snapshot
+            else:
+                break
+        if baseline is None:
+            baseline = snapshots[0]
+        if latest is not baseline:
+            reliable += 1
+        for key in totals:
+            delta = int(latest.get(key) or 0) - int(baseline.get(key) or 0)
+            if delta < 0:
+                delta = int(latest.get(key) or 0)
+            totals[key] += delta
+            if campaign_id == active_campaign_id and key in active:
+                active[key] += delta
+    return {
+        "totals": totals,
+        "active_campaign_totals": active,
+        "latest_snapshot_at": latest_snapshot_at,
+        "reliable_group_count": reliable,
+    }
+
+
+def test_momentum_totals_match_reference_loop():
+    rng = random.Random(20260717)
+    now = datetime(2026, 7, 17, 12, 0)
+    cutoff = now - timedelta(minutes=60)
+    for _ in range(50):
+        rows = []
+        latest_by_campaign = {
+            f"c{campaign}": now - timedelta(minutes=10 * rng.randint(0, 3)) for campaign in range(3)
+        }
+        for campaign in range(3):
+            for product in range(3):
+                for creative in range(rng.randint(0, 3)):
+                    cost = 0
+                    for step in sorted(rng.sample(range(24), rng.randint(1, 8))):
+                        cost = max(0, cost + rng.randint(-50, 200))
+                        rows.append(
+                            {
+                                "campaign_id": f"c{campaign}",
+                                "item_group_id": f"p{product}",
+                                "creative_id": f"cr{creative}",
+                                "snapshot_at": now - timedelta(minutes=10 * (23 - step)),
+                                "latest_complete_snapshot_at": latest_by_campaign[f"c{campaign}"],
+                                "cost_cents": cost,
+                                "gross_revenue_cents": rng.randint(0, 900),
+                                "orders": rng.randint(0, 5),
+                                "impressions": rng.randint(0, 1000),
+                                "clicks": rng.randint(0, 50),
+                            }
+                        )
+        rows.sort(key=lambda row: (row["campaign_id"], row["item_group_id"], row["creative_id"], row["snapshot_at"]))
+        item_group_ids = rng.sample(["p0", "p1", "p2"], rng.randint(1, 3))
+
+        expected = _reference_momentum(rows, item_group_ids=item_group_ids, cutoff=cutoff, active_campaign_id="c1")
+        actual = momentum_totals(rows, item_group_ids=item_group_ids, cutoff=cutoff, active_campaign_id="c1")
+
+        assert actual == expected
+
+
+def test_product_day_rows_are_loaded_once_per_scope_and_day():
+    updated = datetime(2026, 7, 17, 11, 55)
+    db = _Db(
+        [
+            [
+                {"campaign_id": "c1", "item_group_id": "p1", "cost_cents": 100, "gross_revenue_cents": 300,
+                 "orders": 2, "updated_at": updated - timedelta(minutes=5)},
+                {"campaign_id": "c2", "item_group_id": "p1", "cost_cents": 50, "gross_revenue_cents": 0,
+                 "orders": 0, "updated_at": updated},
+                {"campaign_id": "c2", "item_group_id": "p2", "cost_cents": 999, "gross_revenue_cents": 999,
+                 "orders": 9, "updated_at": updated + timedelta(minutes=1)},
+            ]
+        ]
+    )
+    windows = SmartGuardCycleWindows()
+
+    first = windows.product_day_row(db, scope=SCOPE, stat_day=date(2026, 7, 17), item_group_ids=["p1"], campaign_id="c1")
+    second = windows.product_day_row(db, scope=SCOPE, stat_day=date(2026, 7, 17), item_group_ids=["p1"], campaign_id="c2")
+
+    assert len(db.calls) == 1
+    assert first == {
+        "total_cost_cents": 150,
+        "total_gmv_cents": 300,
+        "total_orders": 2,
+        "campaign_count": 2,
+        "current_cost_cents": 100,
+        "current_gmv_cents": 300,
+        "current_orders": 2,
+        "source_updated_at": updated,
+    }
+    assert second["current_cost_cents"] == 50
+    assert second["total_cost_cents"] == 150
+
+
+def test_failure_windows_match_sql_filters_and_refresh_after_mutation():
+    created = datetime(2026, 7, 17, 11, 0)
+    events = [
+        {"campaign_id": "c1", "action": "PAUSE", "reason": "Hard Stop: spend", "cost_cents": 100,
+         "gross_revenue_cents": 0, "orders": 0, "created_at": created},
+        {"campaign_id": "c2", "action": "RESET_CAMPAIGN", "reason": "no_order window", "cost_cents": 40,
+         "gross_revenue_cents": 10, "orders": 1, "created_at": created + timedelta(minutes=5)},
+        {"campaign_id": "c3", "action": "PAUSE", "reason": "manual", "cost_cents": 7,
+         "gross_revenue_cents": 0, "orders": 0, "created_at": created},
+        {"campaign_id": "c9", "action": "PAUSE", "reason": "hard stop", "cost_cents": 7,
+         "gross_revenue_cents": 0, "orders": 0, "created_at": created},
+    ]
+    mappings = [
+        {"campaign_id": "c1", "item_group_id": "p1"},
+        {"campaign_id": "c2", "item_group_id": "p1"},
+        {"campaign_id": "c3", "item_group_id": "p1"},
+        {"campaign_id": "c9", "item_group_id": "p9"},
+    ]
+    db = _Db([events, mappings, events[:1], mappings])
+    windows = SmartGuardCycleWindows()
+    cutoff = datetime(2026, 7, 16, 12, 0)
+
+    row = windows.failure_row(db, scope=SCOPE, cutoff=cutoff, item_group_ids=["p1"])
+    assert windows.failure_row(db, scope=SCOPE, cutoff=cutoff, item_group_ids=["p1"]) == row
+    assert len(db.calls) == 2
+    assert row == {
+        "failure_count": 2,
+        "campaign_count": 2,
+        "reset_count": 1,
+        "hard_stop_count": 1,
+        "no_order_count": 1,
+        "observed_cost_cents": 140,
+        "observed_gmv_cents": 10,
+        "observed_orders": 1,
+        "last_failure_at": created + timedelta(minutes=5),
+    }
+
+    windows.invalidate_failures(SCOPE)
+    assert windows.failure_row(db, scope=SCOPE, cutoff=cutoff, item_group_ids=["p1"])["failure_count"] == 1
+    assert len(db.calls) == 4
+
+
+def test_cycle_windows_live_in_session_info_only_during_a_cycle():
+    db = _Db([])
+
+    windows = gmvmax_smart_guard_windows.begin_cycle(db)
+    assert gmvmax_smart_guard_windows.cycle_windows(db) is windows
+    gmvmax_smart_guard_windows.end_cycle(db)
+    assert gmvmax_smart_guard_windows.cycle_windows(db) is None
+    assert gmvmax_smart_guard_windows.cycle_windows(object()) is None
+
+
+def test_failed_cycle_still_releases_its_windows(monkeypatch):
+    from app.services import gmvmax_smart_guard
+
+    def _broken(*_args, **_kwargs):
+        raise RuntimeError("catalog unavailable")
+
+    monkeypatch.setattr(gmvmax_smart_guard, "_load_enabled_strategies", lambda _db: [object()])
+    monkeypatch.setattr(gmvmax_smart_guard, "_load_catalog_campaign", _broken)
+    db = _Db([])
+
+    with pytest.raises(RuntimeError, match="catalog unavailable"):
+        asyncio.run(gmvmax_smart_guard.run_smart_guard_cycle(db))
+
+    assert gmvmax_smart_guard_windows.cycle_windows(db) is None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from types import SimpleNamespace
 
 from celery.exceptions import Retry
@@ -322,3 +323,87 @@ def test_creative_10min_lost_fence_rolls_back_without_fact_commit(monkeypatch):
     assert "facts_db:rollback" in events
     assert "facts_db:commit" not in events
     assert events[-2:] == ["release_db:commit", "lock:release"]
+
+
+def test_creative_10min_store_task_fetches_once_and_commits_per_campaign(monkeypatch):
+    events: list[str] = []
+    recorded: dict[str, bool] = {}
+
+    class _Db:
+        def commit(self):
+            events.append("commit")
+
+        def rollback(self):
+            events.append("rollback")
+
+    class _Lock:
+        def acquire(self, **_kwargs):
+            return True
+
+        def release(self):
+            events.append("lock:release")
+            return True
+
+    class _Fence:
+        def assert_current(self, _db):
+            return None
+
+    async def _fetch(_db, _client, **kwargs):
+        events.append("fetch:" + ",".join(c.campaign_id for c in kwargs["campaigns"]))
+        return {"good": (["row"], []), "bad": (["row"], [])}
+
+    async def _write(_db, _client, *, campaign, prefetched, **_kwargs):
+        if campaign.campaign_id == "bad":
+            raise ValueError("incomplete GMV Max creative row in official snapshot")
+        return {"rows": len(prefetched[0])}
+
+    def _record(_db, *, campaign_id, attempt_token, success, **_kwargs):
+        assert attempt_token == f"claim-{campaign_id}"
+        recorded[campaign_id] = success
+        return True
+
+    monkeypatch.setattr(
+        ttb_gmvmax_tasks, "build_creative_10min_sync_lock", lambda **_kwargs: _Lock()
+    )
+    monkeypatch.setattr(
+        ttb_gmvmax_tasks,
+        "acquire_creative_10min_sync_fence",
+        lambda *_args, **_kwargs: _Fence(),
+    )
+    monkeypatch.setattr(ttb_gmvmax_tasks, "_db_session", _Db)
+    monkeypatch.setattr(ttb_gmvmax_tasks, "_close_session", lambda *_args: None)
+    monkeypatch.setattr(
+        ttb_gmvmax_tasks,
+        "_find_catalog_campaign_scope",
+        lambda *_args, campaign_id, **_kwargs: SimpleNamespace(campaign_id=campaign_id),
+    )
+    monkeypatch.setattr(
+        ttb_gmvmax_tasks,
+        "_run_with_client",
+        lambda _db, _auth_id, fn: asyncio.run(fn(object())),
+    )
+    monkeypatch.setattr(ttb_gmvmax_tasks, "fetch_creative_rows_for_campaigns", _fetch)
+    monkeypatch.setattr(ttb_gmvmax_tasks, "sync_creative_metrics_10min_for_campaign", _write)
+    monkeypatch.setattr(ttb_gmvmax_tasks, "_record_creative_10min_result", _record)
+    monkeypatch.setattr(ttb_gmvmax_tasks, "release_sync_fence", lambda *_a, **_k: True)
+
+    result = ttb_gmvmax_tasks.task_gmvmax_sync_creative_metrics_10min_for_store.run(
+        workspace_id=3,
+        provider="tiktok-business",
+        auth_id=7,
+        advertiser_id="adv",
+        store_id="store",
+        campaigns=[
+            {"campaign_id": "good", "sync_attempt_token": "claim-good"},
+            {"campaign_id": "bad", "sync_attempt_token": "claim-bad"},
+        ],
+        start_date="2026-07-16",
+        end_date="2026-07-17",
+    )
+
+    assert [event for event in events if event.startswith("fetch:")] == ["fetch:good,bad"]
+    assert recorded == {"good": True, "bad": False}
+    assert result["failed"] == 1
+    assert result["results"]["good"] == {"rows": 1}
+    assert "incomplete" in result["results"]["bad"]["error"]
+    assert events.count("lock:release") == 2
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from app.services.hermes_agent import direct_browser
+
+
+class _FakeSocket:
+    def __init__(self, values):
+        self.values = list(values)
+        self.sent = []
+        self.closed = False
+
+    def send(self, raw):
+        self.sent.append(json.loads(raw))
+
+    def recv(self, timeout=None):
+        # Answer in reverse order to prove replies are matched by id.
+        request = self.sent.pop()
+        value = self.values.pop()
+        return json.dumps({"id": request["id"], "result": {"result": {"value": value}}})
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def _isolated_sessions(monkeypatch, tmp_path):
+    monkeypatch.setenv("HERMES_BROWSER_LOCK_DIR", str(tmp_path / "locks"))
+    monkeypatch.setenv("HERMES_AGENT_BROWSER_RUNTIME_DIR", str(tmp_path / "runtime"))
+    monkeypatch.setattr(direct_browser, "CDP_URL", "http://127.0.0.1:9222")
+    monkeypatch.setattr(direct_browser, "_CDP_EVAL_SESSIONS", {})
+
+
+def test_evaluations_are_pipelined_over_one_socket(monkeypatch):
+    session = direct_browser._cdp_eval_session()
+    socket = _FakeSocket(['{"busy": false}', 3])
+    session._socket = socket
+    monkeypatch.setattr(direct_browser, "_run", lambda *args, **kwargs: pytest.fail("CLI must not run"))
+
+    values = direct_browser._eval_many(["state()", "count()"])
+
+    assert values == [{"busy": False}, 3]
+    assert direct_browser._cdp_eval_session() is session
+    assert session.connected
+
+
+def test_transport_failure_falls_back_to_agent_browser_cli(monkeypatch):
+    calls = []
+
+    def fake_run(*args, **kwargs):
+        calls.append(args)
+        if "__hermesCdpEvalTag" in args[-1]:
+            raise RuntimeError("failed to connect to cdp")
+        return {"success": True, "data": {"result": "7"}}
+
+    monkeypatch.setattr(direct_browser, "_run", fake_run)
+
+    assert direct_browser._eval_timeout("document.title", timeout=5) == 7
+    assert calls[-1] == ("eval", "document.title")
+    # A failed bind cools down instead of retrying on every probe.
+    calls.clear()
+    assert direct_browser._eval_timeout("document.title", timeout=5) == 7
+    assert calls == [("eval", "document.title")]
+
+
+def test_tab_commands_drop_the_bound_socket(monkeypatch):
+    session = direct_browser._cdp_eval_session()
+    socket = _FakeSocket([])
+    session._socket = socket
+    monkeypatch.setattr(direct_browser, "AGENT_BROWSER", "/nonexistent/agent-browser")
+
+    with pytest.raises(OSError):
+        direct_browser._run("tab", "t2", timeout=1)
+
+    assert socket.closed
+    assert not session.connected
+
+
+def test_page_exceptions_are_not_retried_through_the_cli(monkeypatch):
+    session = direct_browser._cdp_eval_session()
+
+    class _ThrowingSocket(_FakeSocket):
+        def recv(self, timeout=None):
+            request = self.sent.pop()
+            return json.dumps({
+                "id": request["id"],
+                "result": {"exceptionDetails": {"exception": {"description": "TypeError: boom"}}},
+            })
+
+    session._socket = _ThrowingSocket([])
+    monkeypatch.setattr(direct_browser, "_run", lambda *args, **kwargs: pytest.fail("CLI must not run"))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        direct_browser._eval("broken()")
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.services import media_frames
+from app.services.media_frames import SheetLayout, best_grid
+
+
+@pytest.fixture
+def decode_calls(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_FRAME_CACHE_DIR", str(tmp_path / "cache"))
+    calls: list[list[float]] = []
+
+    def _fake_decode(path, times, directory):
+        calls.append(sorted(times))
+        frames = {}
+        for index, timestamp in enumerate(sorted(times), start=1):
+            frame = directory / f"decoded-{index:03d}.jpg"
+            Image.new("RGB", (90, 160), (index * 20, 40, 80)).save(frame, "JPEG")
+            frames[timestamp] = frame
+        return frames
+
+    monkeypatch.setattr(media_frames, "_decode", _fake_decode)
+    return calls
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"video-bytes" * 64)
+    return path
+
+
+def test_frames_decode_once_and_sheets_cache_per_layout(tmp_path, video, decode_calls):
+    times = [0.0, 1.5, 3.0, 4.5]
+    wide = SheetLayout(tile_width=120, columns=4, rows=1)
+    square = SheetLayout(tile_width=80, tile_height=80, fit="contain", padding=2)
+
+    first = media_frames.render_contact_sheet(video, times, wide, tmp_path / "a.jpg")
+    second = media_frames.render_contact_sheet(video, times, square, tmp_path / "b.jpg")
+    again = media_frames.render_contact_sheet(video, times, wide, tmp_path / "c.jpg")
+
+    assert decode_calls == [times]
+    assert list(first.timestamps) == list(second.timestamps) == times
+    assert second.size_bytes == (tmp_path / "b.jpg").stat().st_size
+    assert again.size_bytes == first.size_bytes
+    assert (tmp_path / "c.jpg").read_bytes() == (tmp_path / "a.jpg").read_bytes()
+    with Image.open(tmp_path / "a.jpg") as sheet:
+        assert sheet.size == (480, int(round(120 * 160 / 90)))
+    with Image.open(tmp_path / "b.jpg") as sheet:
+        assert sheet.size == (2 * 80 + 2, 2 * 80 + 2)
+
+    # A rewritten file is new content and is sampled again.
+    video.write_bytes(b"other-bytes" * 64)
+    media_frames.render_contact_sheet(video, times, wide, tmp_path / "d.jpg")
+    assert len(decode_calls) == 2
+
+
+def test_png_layout_and_grid_selection(tmp_path, video, decode_calls):
+    layout = SheetLayout(tile_width=60, tile_height=100, fit="cover", margin=5, image_format="PNG")
+
+    sheet = media_frames.render_contact_sheet(video, [0.0, 1.0, 2.0, 3.0, 4.0], layout)
+
+    assert sheet.path.suffix == ".png"
+    with Image.open(sheet.path) as image:
+        assert image.format == "PNG"
+        assert image.size == (3 * 60 + 10, 2 * 100 + 10)
+    assert best_grid(1) == (1, 1)
+    assert best_grid(6) == (3, 2)
+    assert best_grid(10) == (4, 3)
+
+
+def test_prune_removes_only_stale_videos(tmp_path, video, decode_calls):
+    media_frames.render_contact_sheet(video, [0.0], SheetLayout(tile_width=40))
+    other = tmp_path / "other.mp4"
+    other.write_bytes(b"fresh" * 64)
+    media_frames.render_contact_sheet(other, [0.0], SheetLayout(tile_width=40))
+    stale = media_frames.cache_root() / media_frames.content_sha256(video)[:2]
+    stale = stale / media_frames.content_sha256(video)
+    old = time.time() - 30 * 86400
+    os.utime(stale, (old, old))
+
+    assert media_frames.prune_frame_cache(retention_days=14) == 1
+    assert not stale.exists()
+    media_frames.render_contact_sheet(other, [0.0], SheetLayout(tile_width=40))
+    assert len(decode_calls) == 2
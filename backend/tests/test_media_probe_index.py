@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services import media_probe_index
+from app.services.media_probe_index import MediaProbeError, MediaProbeIndex
+
+
+def _fake_ffprobe(calls: list[tuple[str, str]]):
+    def _run(arguments, path):
+        if "-skip_frame" in arguments:
+            calls.append(("keyframes", path.name))
+            times = ("2.0", "0.0")
+            return {"frames": [{"best_effort_timestamp_time": value} for value in times]}
+        calls.append(("streams", path.name))
+        return {
+            "format": {"duration": "3.5"},
+            "streams": [
+                {
+                    "index": 0,
+                    "codec_type": "video",
+                    "codec_name": "h264",
+                    "width": 720,
+                    "height": 1280,
+                    "avg_frame_rate": "30000/1001",
+                },
+                {"index": 1, "codec_type": "audio", "codec_name": "aac"},
+            ],
+        }
+
+    return _run
+
+
+@pytest.fixture
+def index_path(tmp_path, monkeypatch):
+    path = tmp_path / "index" / "media_probe.sqlite3"
+    monkeypatch.setattr(media_probe_index, "_index", MediaProbeIndex(path))
+    return path
+
+
+def test_batch_probe_persists_and_later_processes_skip_ffprobe(tmp_path, index_path, monkeypatch):
+    calls: list[tuple[str, str]] = []
+    monkeypatch.setattr(media_probe_index, "_run_ffprobe", _fake_ffprobe(calls))
+    first, second = tmp_path / "a.mp4", tmp_path / "b.mp4"
+    first.write_bytes(b"a" * 10)
+    second.write_bytes(b"b" * 10)
+
+    results = media_probe_index.probe_media_batch([first, second, tmp_path / "missing.mp4"])
+
+    assert sorted(calls) == [("streams", "a.mp4"), ("streams", "b.mp4")]
+    assert results[tmp_path / "missing.mp4"] is None
+    probe = results[first.resolve()]
+    assert (probe.duration_seconds, probe.width, probe.height) == (3.5, 720, 1280)
+    assert (probe.fps, probe.video_codec, probe.audio_codec) == (29.97, "h264", "aac")
+    assert probe.has_audio is True and probe.keyframes is None
+
+    # A new process starts with an empty front cache but the same index file.
+    monkeypatch.setattr(media_probe_index, "_index", MediaProbeIndex(index_path))
+    calls.clear()
+    assert media_probe_index.probe_media(first) == probe
+    assert calls == []
+
+    # Keyframes are added to the indexed entry without re-probing streams.
+    assert media_probe_index.probe_media(first, keyframes=True).keyframes == (0.0, 2.0)
+    assert calls == [("keyframes", "a.mp4")]
+
+    # A rewritten file is a new version and is probed again.
+    first.write_bytes(b"a" * 20)
+    calls.clear()
+    media_probe_index.probe_media(first)
+    assert calls == [("streams", "a.mp4")]
+
+
+def test_unreadable_media_raises_and_is_not_indexed(tmp_path, index_path, monkeypatch):
+    calls: list[str] = []
+
+    def _broken(_arguments, path):
+        calls.append(path.name)
+        raise MediaProbeError("not media")
+
+    monkeypatch.setattr(media_probe_index, "_run_ffprobe", _broken)
+    path = tmp_path / "broken.mp4"
+    path.write_bytes(b"x")
+
+    with pytest.raises(MediaProbeError):
+        media_probe_index.probe_media(path)
+    with pytest.raises(MediaProbeError):
+        media_probe_index.probe_media(path)
+    assert calls == ["broken.mp4", "broken.mp4"]
@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+
+from app.data.models.providers import PlatformPolicy, PolicyEnforcementMode, PolicyMode
+from app.services import policy_engine
+from app.services.policy_engine import PolicyEngine
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def _policy(name: str, mode: PolicyMode, **fields) -> PlatformPolicy:
+    return PlatformPolicy(
+        provider_key="tiktok-business",
+        name=name,
+        name_normalized=name.lower(),
+        mode=mode.value,
+        enforcement_mode=PolicyEnforcementMode.ENFORCE.value,
+        is_enabled=True,
+        **{"domains_json": [], "business_scopes_json": {}, **fields},
+    )
+
+
+def test_snapshot_is_reused_until_a_policy_changes(db_session) -> None:
+    blocked = _policy("Block stores", PolicyMode.BLACKLIST, scope_store_ids_json=["s-9"])
+    db_session.add(blocked)
+    db_session.commit()
+
+    engine = PolicyEngine(db_session)
+    first = engine.snapshot(None, "TikTok-Business")
+    assert engine.snapshot(None, "tiktok-business") is first
+    assert not engine.evaluate_policy(None, "tiktok-business", "sync", {"store_id": "s-9"}, NOW).allowed
+
+    blocked.scope_store_ids_json = ["s-1"]
+    db_session.commit()
+
+    second = engine.snapshot(None, "tiktok-business")
+    assert second is not first
+    assert engine.evaluate_policy(None, "tiktok-business", "sync", {"store_id": "s-9"}, NOW).allowed
+    assert not engine.evaluate_policy(None, "tiktok-business", "sync", {"store_id": "s-1"}, NOW).allowed
+
+
+def test_version_stamp_is_rechecked_only_after_its_ttl(db_session, monkeypatch) -> None:
+    db_session.add(_policy("Block stores", PolicyMode.BLACKLIST, scope_store_ids_json=["s-9"]))
+    db_session.commit()
+    stamps: list[str] = []
+    read_stamp = PolicyEngine._version_stamp
+
+    def _counting_stamp(self, provider_key, workspace_id):
+        stamps.append(provider_key)
+        return read_stamp(self, provider_key, workspace_id)
+
+    monkeypatch.setattr(PolicyEngine, "_version_stamp", _counting_stamp)
+    engine = PolicyEngine(db_session)
+    first = engine.snapshot(None, "tiktok-business")
+    for _ in range(3):
+        assert engine.evaluate_policy(None, "tiktok-business", "sync", {"store_id": "s-1"}, NOW).allowed
+    assert len(stamps) == 1
+
+    key = ("tiktok-business", None)
+    policy_engine._SNAPSHOT_CHECKED_AT[key] -= policy_engine.VERSION_STAMP_TTL_SECONDS
+    assert engine.snapshot(None, "tiktok-business") is first
+    assert len(stamps) == 2
+
+
+def test_uncommitted_policy_edits_are_not_cached(db_session) -> None:
+    db_session.add(_policy("Block all", PolicyMode.BLACKLIST))
+    db_session.flush()
+
+    engine = PolicyEngine(db_session)
+    pending = engine.snapshot(None, "tiktok-business")
+    assert [policy.mode for policy in pending.policies] == [PolicyMode.BLACKLIST.value]
+    db_session.rollback()
+
+    assert engine.snapshot(None, "tiktok-business").policies == ()
+
+
+def test_batch_matches_single_candidate_evaluation(db_session) -> None:
+    db_session.add_all(
+        [
+            _policy(
+                "Allow products",
+                PolicyMode.WHITELIST,
+                scope_product_id_patterns_json=["17", "^29\\d+$", "(?:a|b)x+", "[bad"],
+            ),
+            _policy(
+                "Block advertiser",
+                PolicyMode.BLACKLIST,
+                business_scopes_json={"include": {"advertiser_ids": ["adv-2"]}, "exclude": {}},
+            ),
+        ]
+    )
+    db_session.commit()
+    candidates = [
+        {"product_id": "1701", "advertiser_id": "adv-1"},
+        {"product_id": "2900", "advertiser_id": "adv-1"},
+        {"product_id": "bxx", "advertiser_id": "adv-1"},
+        {"product_id": "[bad-1", "advertiser_id": "adv-1"},
+        {"product_id": "3100", "advertiser_id": "adv-1"},
+        {"product_id": "1701", "advertiser_id": "adv-2"},
+        {"advertiser_id": "adv-1"},
+    ]
+
+    engine = PolicyEngine(db_session)
+    batch = engine.evaluate_batch(None, "tiktok-business", "sync", candidates, NOW)
+    single = [
+        engine.evaluate_policy(None, "tiktok-business", "sync", candidate, NOW) for candidate in candidates
+    ]
+
+    assert batch == single
+    assert [decision.allowed for decision in batch] == [True, True, True, True, False, False, False]
+    assert batch[5].reason == "Matched blacklist policy"
+    assert batch[4].reason == "Outside enforce whitelist"
+
+
+def test_product_patterns_fold_into_one_regex() -> None:
+    matcher = policy_engine._ProductMatcher.build(["17", "^29", "(?:a|b)x+", "[bad", " "])
+
+    assert matcher.prefixes == ("17", "[bad")
+    assert len(matcher.regexes) == 1
+    assert matcher.matches("29") and matcher.matches("zbx") and not matcher.matches("30")
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.ai_video import prompt_budget
+from app.services.ai_video.prompt_budget import (
+    compact_structured_video_prompt,
+    compact_structured_video_prompt_tiers,
+    localize_structured_video_prompt_for_doubao,
+)
+
+# Provider prompt budgets in use: Doubao's signed 495-character lane, the
+# lean tier ceiling, Seedance/Omni packets and the long-context dialect.
+PROVIDER_BUDGETS = (495, 800, 1400, 2000, 4000, 12000)
+
+# Structured packets as compiled by the content factory for real segments.
+PROMPT_CORPUS = (
+    "\n".join([
+        "Segment 2: truthful reasons to consider",
+        "Visual style (signed whole-video contract): " + "warm lifestyle " * 40,
+        "Timeline (this segment only): " + "0-3s precise action and camera; " * 40,
+        "Dialogue: woman_1: 'I chose this simple routine step: blueberry flavor, "
+        "two gummies per serving, with L-Theanine, GABA, magnesium glycinate.'",
+        "Voice lock for this segment: adult US woman, female, clear alto. "
+        "This speaker is explicitly female; do not change the speaker's gender "
+        "in this or any adjacent segment. This is the visible protagonist's own "
+        "voiceover, not an independent narrator, even when her lips are hidden. "
+        "Keep the same speaker identity, gender, timbre, pitch, accent, and delivery.",
+        "Continuity: " + "same woman, wardrobe, room, bottle, and gummies; " * 20,
+        "Product presentation policy: use the uploaded product as sole package authority.",
+        "Do not model-render captions, overlays, ingredient cards, sales UI, QR codes, "
+        "collage, picture-in-picture, or watermark. Preserve the exact approved dialogue.",
+        "Output: 9:16 720p; spoken language English (US) only.",
+        "Segment scope: 2/3; show only this segment's actions and dialogue.",
+        "One continuous full-frame scene. No collage, inset, playback UI, watermark, "
+        "or language mixing.",
+    ]),
+    "\n".join([
+        "Segment 1: fast visual hook",
+        "Reference bindings: @image1=character+scene; "
+        "@image2,@image3=character+scene+action; @image4=scene+action; "
+        "images lock appearance/state, Motion controls animation.",
+        "Timeline (this segment only): 0-3s cold bedroom opening; "
+        "camera pushes toward phone | 3-6s portal escalation around her | "
+        "6-9s phone goes face-down on warm tray",
+        "Motion and effects: 0-3s luminous portal pulls and shards multiply | "
+        "3-6s shard storm slows around tired eyes | "
+        "6-9s portal glow contracts into warm bedside light",
+        "Dialogue: female_narrator: 'One more video was 43 videos ago.' | "
+        "female_narrator: 'There goes my morning walk.' | "
+        "female_narrator: 'Phone down. I am starting my bedtime routine.'",
+        "Voice: same female US narrator.",
+        "Output: 9:16 720p, English US, segment 1/2 only.",
+    ]),
+    "\n".join([
+        "Reference bindings: @image1,@image2,@image3,@image4="
+        "appearance+scene+action; @image5=package authority.",
+        "Timeline (this segment only): "
+        "0-1.72s: The female-presenting protagonist keeps scrolling "
+        "despite a nearly empty red battery; FX: sharp battery pulse | "
+        "1.72-2.5s: She freezes mid-scroll, lowers the phone, and looks "
+        "toward the clock; FX: quick whip-pan | "
+        "2.5-4.21s: She repeats rapid upward swipes and suddenly stops; "
+        "FX: three jump cuts | "
+        "4.21-5s: Her stopped hand hovers as the light trail collapses; "
+        "FX: motion blur contracts | "
+        "5-6.7s: She turns the phone face-down and sits up; FX: cable "
+        "enters frame | "
+        "6.7-9s: She unplugs the cable and reveals the product bottle; "
+        "FX: match cut to nightstand",
+        "Product presentation policy: uploaded package is the sole "
+        "authority; integrate it naturally in the scene.",
+        "Audio: visible characters remain silent with no lip-sync; exact "
+        "signed voiceover is added locally.",
+        "Output: 9:16; no generated text, UI, or watermark.",
+    ]),
+    "\n".join([
+        "Visual style (signed whole-video contract): adult stylized animation.",
+        "Reference bindings: @image1=character+scene+action; "
+        "@image2,@image3=character+action+scene; @image4=package",
+        "Timeline (this segment only): "
+        "0-3s: cool-blue bedroom, woman holds a glowing phone and looks "
+        "tired; physical clock reads 1:43 and mechanical tally counter "
+        "reads 43 | 3-6s: she makes one deliberate choice, places the "
+        "phone face-down on the bedside; room changes from cool-blue "
+        "phone light to warm light | 6-9s: she holds the uploaded bottle "
+        "in a warm setting and presents exactly two gummies; end with "
+        "the phone remaining face-down",
+        "Product presentation policy: uploaded package is the sole "
+        "authority; integrate it naturally in the scene.",
+        "Audio: visible characters remain silent with no lip-sync.",
+        "Output: 9:16; no generated text, UI, or watermark.",
+    ]),
+    "\n".join([
+        "Visual style (signed whole-video contract): Original adult "
+        "stylized 2D/2.5D animation with blue-purple accents.",
+        "Reference bindings: @image1=action+scene+character; "
+        "@image2,@image3,@image4=scene+action+character",
+        "Timeline (this segment only): "
+        "0-2.87s: Her thumb keeps scrolling while an oversized phone "
+        "portal pulls luminous shards into the room; FX: rapid scale "
+        "distortion and multiplying text-free shards; Cam: fast push-in | "
+        "2.87-4.98s: Her alarmed tired eyes look toward the promised dawn "
+        "walk; FX: the shard storm abruptly slows at realization; "
+        "Cam: frontal close-up | "
+        "4.98-9s: She places the phone face-down outside reach and opens "
+        "the ceramic tray; FX: portal light contracts and the hand "
+        "completes the action; Cam: stable bedside framing",
+        "Audio: visible characters remain silent with no lip-sync; exact "
+        "signed voiceover is added locally.",
+        "Output: 9:16 720p.",
+        "Segment scope: 1/2 only.",
+    ]),
+    "\n".join([
+        "Refs: @image1=character+scene; @image2=package",
+        "Repair: " + ("preserve the approved visual repair evidence; " * 170),
+        "Beats: 0-4s: woman sets the balm jar on the nightstand and turns "
+        "toward camera | 4-8s: she opens the jar, takes a small amount, "
+        "and applies it to intact shoulder skin",
+        "Direction: " + ("fast rhythmic cuts | tactile close-up | warm 2D animation | " * 130),
+        "Dialogue: 'My nighttime reset stays simple.'",
+        "Voice: same adult US female narrator; expressive and continuous.",
+        "Product: uploaded package is sole authority.",
+        "Audio: native expressive speech; no added words.",
+        "9:16; this segment only; no text/UI/watermark.",
+    ]),
+)
+
+
+def _uncached(prompt: str, budget: int) -> str:
+    return prompt_budget._compact_structured_video_prompt.__wrapped__(
+        prompt.strip(),
+        budget,
+    )
+
+
+def _outcome(compact, prompt: str, budget: int) -> str:
+    try:
+        return compact(prompt, budget)
+    except ValueError as exc:
+        return f"ValueError: {exc}"
+
+
+def test_memoized_compaction_matches_uncached_pipeline_for_every_tier():
+    for prompt in PROMPT_CORPUS:
+        tiers = compact_structured_video_prompt_tiers(prompt, budgets=PROVIDER_BUDGETS)
+        for budget in PROVIDER_BUDGETS:
+            expected = _outcome(_uncached, prompt, budget)
+            actual = _outcome(
+                lambda value, limit: compact_structured_video_prompt(
+                    value,
+                    max_characters=limit,
+                ),
+                prompt,
+                budget,
+            )
+            assert actual == expected
+            if budget in tiers:
+                assert tiers[budget] == expected
+                assert len(tiers[budget]) <= budget
+            else:
+                assert expected.startswith("ValueError")
+
+
+def test_repeated_submission_reuses_compacted_prompt():
+    prompt_budget._compact_structured_video_prompt.cache_clear()
+    prompt = PROMPT_CORPUS[2]
+
+    first = compact_structured_video_prompt(prompt, max_characters=495)
+    second = compact_structured_video_prompt("\n" + prompt + "\n", max_characters=495)
+
+    info = prompt_budget._compact_structured_video_prompt.cache_info()
+    assert first == second
+    assert (info.hits, info.misses) == (1, 1)
+    assert localize_structured_video_prompt_for_doubao(first) == (
+        localize_structured_video_prompt_for_doubao(second)
+    )
+
+
+def test_tiers_reject_invalid_budgets_like_single_compaction():
+    with pytest.raises(ValueError, match="at least 256"):
+        compact_structured_video_prompt_tiers(PROMPT_CORPUS[0], budgets=(495, 128))
+
+
+def _benchmark(request):
+    pytest.importorskip("pytest_benchmark")
+    return request.getfixturevalue("benchmark")
+
+
+def _compact_corpus_cold() -> None:
+    prompt_budget.clear_prompt_budget_caches()
+    for prompt in PROMPT_CORPUS:
+        compact_structured_video_prompt_tiers(prompt, budgets=PROVIDER_BUDGETS)
+
+
+def test_benchmark_corpus_all_tiers_cold(request):
+    _benchmark(request)(_compact_corpus_cold)
+
+
+def test_benchmark_corpus_doubao_tier_warm(request):
+    def _submit() -> None:
+        for prompt in PROMPT_CORPUS:
+            localize_structured_video_prompt_for_doubao(
+                compact_structured_video_prompt(prompt, max_characters=495)
+            )
+
+    _submit()
+    _benchmark(request)(_submit)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import threading
 import time
 
 from app.services import redis_locks
@@ -29,3 +31,158 @@ def test_heartbeat_transport_error_marks_lock_lost(monkeypatch):
     assert lock.lost is True
     assert lock.acquired is False
     lock.release()
+
+
+class _ScriptedRedis:
+    """Executes the lock scripts against a dict; counts round trips."""
+
+    def __init__(self) -> None:
+        self.values: dict[bytes, bytes] = {}
+        self.counters: dict[bytes, int] = {}
+        self.refresh_calls: list[int] = []
+
+    def set(self, key, value, nx=False, ex=None):
+        key = redis_locks._b(key)
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def get(self, key):
+        return self.values.get(redis_locks._b(key))
+
+    def eval(self, script, numkeys, *args):
+        keys, argv = list(args[:numkeys]), list(args[numkeys:])
+        if script == redis_locks._REFRESH_MANY_SCRIPT:
+            self.refresh_calls.append(len(keys))
+            return [
+                int(self.values.get(key) == argv[index * 2])
+                for index, key in enumerate(keys)
+            ]
+        if script == redis_locks._ACQUIRE_FENCED_SCRIPT:
+            if keys[0] in self.values:
+                return 0
+            self.values[keys[0]] = argv[0]
+            self.counters[keys[1]] = self.counters.get(keys[1], 0) + 1
+            return self.counters[keys[1]]
+        if script == redis_locks._RELEASE_SCRIPT:
+            if self.values.get(keys[0]) == argv[0]:
+                del self.values[keys[0]]
+                return 1
+            return 0
+        raise AssertionError("unexpected script")
+
+
+class _AsyncScriptedRedis:
+    def __init__(self, inner: _ScriptedRedis) -> None:
+        self.inner = inner
+
+    async def set(self, *args, **kwargs):
+        return self.inner.set(*args, **kwargs)
+
+    async def get(self, *args):
+        return self.inner.get(*args)
+
+    async def eval(self, *args):
+        return self.inner.eval(*args)
+
+
+def _wait_until(predicate, timeout: float = 3.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def test_held_locks_share_one_batched_renewal(monkeypatch):
+    fake = _ScriptedRedis()
+    monkeypatch.setattr(redis_locks, "get_redis_sync", lambda: fake)
+    lost: list[str] = []
+    locks = [
+        redis_locks.RedisDistributedLock(
+            key=f"test:batched:{index}",
+            owner_token="owner",
+            ttl_seconds=2,
+            heartbeat_interval=1,
+            on_lost=lambda lock: lost.append(lock.key),
+        )
+        for index in range(3)
+    ]
+    threads_before = threading.active_count()
+
+    assert all(lock.acquire() for lock in locks)
+    assert threading.active_count() <= threads_before + 1
+    _wait_until(lambda: bool(fake.refresh_calls))
+    assert fake.refresh_calls[0] == 3
+
+    fake.values[b"test:batched:1"] = b"someone-else"
+    _wait_until(lambda: bool(lost))
+    assert lost == ["test:batched:1"]
+    assert locks[1].lost is True
+    assert locks[0].acquired is True and locks[2].acquired is True
+    assert all(lock.release() for lock in (locks[0], locks[2]))
+    assert redis_locks.get_lease_manager().held() == 0
+
+
+def test_locks_acquired_apart_are_renewed_on_one_tick(monkeypatch):
+    fake = _ScriptedRedis()
+    monkeypatch.setattr(redis_locks, "get_redis_sync", lambda: fake)
+    first, second = (
+        redis_locks.RedisDistributedLock(
+            key=f"test:staggered:{index}",
+            owner_token="owner",
+            ttl_seconds=2,
+            heartbeat_interval=1,
+        )
+        for index in range(2)
+    )
+
+    assert first.acquire() is True
+    time.sleep(0.5)
+    assert second.acquire() is True
+    _wait_until(lambda: len(fake.refresh_calls) >= 2, timeout=4.0)
+
+    assert fake.refresh_calls[:2] == [2, 2]
+    assert first.release() and second.release()
+
+
+def test_fenced_acquisitions_get_increasing_tokens(monkeypatch):
+    fake = _ScriptedRedis()
+    monkeypatch.setattr(redis_locks, "get_redis_sync", lambda: fake)
+
+    def _lock(owner: str):
+        return redis_locks.RedisDistributedLock(
+            key="test:fenced", owner_token=owner, heartbeat_interval=0, fencing=True
+        )
+
+    first = _lock("a")
+    assert first.acquire() is True
+    assert _lock("b").acquire() is False
+    first.release()
+    second = _lock("b")
+    assert second.acquire() is True
+    assert (first.fencing_token, second.fencing_token) == (1, 2)
+
+
+def test_async_lock_renews_on_the_event_loop_and_reports_loss():
+    fake = _ScriptedRedis()
+    lost: list[str] = []
+
+    async def _run() -> None:
+        lock = redis_locks.AsyncRedisDistributedLock(
+            key="test:async",
+            owner_token="owner",
+            ttl_seconds=2,
+            heartbeat_interval=1,
+            redis_client=_AsyncScriptedRedis(fake),
+            on_lost=lambda held: lost.append(held.key),
+        )
+        assert await lock.acquire() is True
+        await asyncio.sleep(1.2)
+        assert fake.refresh_calls == [1]
+        fake.values[b"test:async"] = b"someone-else"
+        await asyncio.sleep(1.0)
+        assert lock.lost is True
+        assert await lock.release() is False
+
+    asyncio.run(_run())
+    assert lost == ["test:async"]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core import request_profiling
+from app.core.deps import require_platform_admin
+from app.core.request_profiling import RequestProfilingMiddleware, SlowRequestStore
+from app.data.db import get_db
+from app.features.platform import router_request_profiles
+
+
+def _profiled_app(store: SlowRequestStore, *, slow_ms: float = 0) -> FastAPI:
+    request_profiling.instrument()
+    app = FastAPI()
+    app.add_middleware(RequestProfilingMiddleware, slow_ms=slow_ms, store=store)
+
+    @app.get("/items")
+    def items(db=Depends(get_db)) -> dict:
+        # One query per item: the N+1 shape the traces are meant to surface.
+        ids = [1, 2, 3]
+        return {"items": [db.execute(text("select :id"), {"id": item}).scalar() for item in ids]}
+
+    @app.get("/upstream")
+    async def upstream() -> dict:
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get(
+                "https://business-api.tiktok.com/open_api/v1.3/x", params={"access_token": "secret"}
+            )
+        return response.json()
+
+    return app
+
+
+def test_profiles_sql_and_upstream_calls_into_server_timing_and_traces(db_session) -> None:
+    store = SlowRequestStore(10, use_redis=False)
+    app = _profiled_app(store)
+    app.dependency_overrides[get_db] = lambda: db_session
+
+    with TestClient(app) as client:
+        items = client.get("/items")
+        upstream = client.get("/upstream")
+
+    assert items.status_code == 200
+    assert 'desc="3 queries"' in items.headers["server-timing"]
+    assert 'upstream;dur=' in upstream.headers["server-timing"]
+    assert 'desc="1 calls"' in upstream.headers["server-timing"]
+
+    upstream_trace, items_trace = asyncio.run(store.recent(10))
+    assert items_trace["path"] == "/items"
+    assert items_trace["sql"]["count"] == 3
+    assert items_trace["repeated_statements"][0]["count"] == 3
+    assert upstream_trace["upstream"]["count"] == 1
+    assert upstream_trace["slowest_upstream_calls"][0]["url"] == (
+        "business-api.tiktok.com/open_api/v1.3/x"
+    )
+
+
+def test_fast_requests_are_not_traced(db_session) -> None:
+    store = SlowRequestStore(10, use_redis=False)
+    app = _profiled_app(store, slow_ms=60_000)
+    app.dependency_overrides[get_db] = lambda: db_session
+
+    with TestClient(app) as client:
+        response = client.get("/items")
+
+    assert "server-timing" in response.headers
+    assert asyncio.run(store.recent(10)) == []
+
+
+def test_admin_endpoint_lists_and_clears_traces(monkeypatch) -> None:
+    store = SlowRequestStore(10, use_redis=False)
+    for path, total_ms in [("/api/v1/gmvmax/b", 1500.0), ("/api/v1/tenants/a", 3200.0)]:
+        asyncio.run(store.add({"path": path, "total_ms": total_ms}))
+    monkeypatch.setattr(router_request_profiles, "slow_request_store", store)
+    app = FastAPI()
+    app.include_router(router_request_profiles.router)
+    app.dependency_overrides[require_platform_admin] = lambda: object()
+
+    with TestClient(app) as client:
+        listed = client.get("/api/v1/admin/platform/request-profiles", params={"min_ms": 2000})
+        by_path = client.get("/api/v1/admin/platform/request-profiles", params={"path": "gmvmax"})
+        cleared = client.delete("/api/v1/admin/platform/request-profiles")
+        after = client.get("/api/v1/admin/platform/request-profiles")
+
+    assert [item["path"] for item in listed.json()["items"]] == ["/api/v1/tenants/a"]
+    assert [item["path"] for item in by_path.json()["items"]] == ["/api/v1/gmvmax/b"]
+    assert cleared.status_code == 204
+    assert after.json()["items"] == []
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import os
+
+from app.core.startup_profile import measure_startup, parse_importtime
+
+# Generous enough for a cold CI runner; the ML stack alone used to add ~5s.
+IMPORT_BUDGET_SECONDS = float(os.environ.get("GMV_IMPORT_BUDGET_SECONDS", "15"))
+
+
+def test_parse_importtime_reads_self_cumulative_and_depth() -> None:
+    modules = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   app.core.config\n"
+        "import time:      3000 |       3120 | app.app\n"
+    )
+
+    assert [(item.module, item.self_us, item.cumulative_us, item.depth) for item in modules] == [
+        ("app.core.config", 120, 120, 1),
+        ("app.app", 3000, 3120, 0),
+    ]
+
+
+def test_api_import_skips_ml_stack_and_stays_within_budget() -> None:
+    report = measure_startup("app.app")
+
+    assert report.heavy_modules == [], report.as_dict(limit=15)
+    assert report.wall_seconds < IMPORT_BUDGET_SECONDS, report.as_dict(limit=15)
@@ -4,8 +4,10 @@ from PIL import Image, ImageDraw
 import pytest
 
 from app.services.hermes_agent.storyboard_split import (
+    StoryboardSplitRequest,
     detect_preview_cells,
     expected_row_columns,
+    split_storyboard_boards,
     validate_expected_layout,
 )
 
@@ -231,3 +233,40 @@ def test_merges_fragmented_separator_and_splits_actual_two_by_three_board(tmp_pa
     assert cells[0] == (0, 0, 461, 552)
     assert cells[-1][0] == 467
     assert cells[-1][1] == 1152
+
+
+def test_batch_split_decodes_each_board_once_and_writes_every_panel(tmp_path, monkeypatch):
+    from app.services.hermes_agent import storyboard_split
+
+    requests = []
+    for board_index in range(2):
+        path = tmp_path / f"board-{board_index}.png"
+        image = Image.new("RGB", (1500, 900), "white")
+        draw = ImageDraw.Draw(image)
+        for offset, box in enumerate(((0, 0, 492, 899), (504, 0, 996, 899), (1008, 0, 1499, 899))):
+            draw.rectangle(box, fill=(40 * offset + board_index * 20, 30, 80))
+        image.save(path)
+        requests.append(StoryboardSplitRequest(
+            source=path,
+            count=3,
+            targets=[tmp_path / f"board-{board_index}-panel-{index}.png" for index in range(1, 4)],
+        ))
+    decoded = []
+    original_load = storyboard_split.load_storyboard_rgb
+
+    def counting_load(source):
+        decoded.append(source)
+        return original_load(source)
+
+    monkeypatch.setattr(storyboard_split, "load_storyboard_rgb", counting_load)
+
+    split_storyboard_boards(requests, max_workers=1)
+
+    assert decoded == [request.source for request in requests]
+    for request in requests:
+        assert request.layout["row_columns"] == [3]
+        assert len(request.sizes) == 3
+        for target, (x, y, width, height) in zip(request.targets, request.cells):
+            with Image.open(target) as panel:
+                assert panel.size == (width, height)
+                assert panel.getpixel((width // 2, height // 2)) != (255, 255, 255)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.deps import require_platform_admin
+from app.features.platform import router_ttb_quota
+from app.services import ttb_api, ttb_quota_planner
+from app.services.ttb_api import SharedTikTokRateLimiter, TTBRateLimitBudgetError
+from app.services.ttb_quota_planner import (
+    MINUTE_MS,
+    plan,
+    quota_key_prefix,
+    quota_subsystem,
+    subsystem_for_task,
+)
+
+NOW = 1_800_000_000.0  # start of a minute, 960 minutes before UTC midnight
+
+
+class _FakeRedis:
+    """Counters plus a Python rendition of the limiter's check-then-incr script."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, int] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    def pttl(self, _key):
+        return -2
+
+    def eval(self, _script, numkeys, *args):
+        keys, argv = list(args[:numkeys]), list(args[numkeys:])
+        for index, key in enumerate(keys):
+            if self.values.get(key, 0) >= int(argv[index]):
+                return [0, index + 1, 30_000]
+        for key in keys:
+            self.values[key] = self.values.get(key, 0) + 1
+        return [1, 0, 0]
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def hset(self, name, key, value):
+        self.hashes.setdefault(name, {})[key] = value
+
+    def hgetall(self, name):
+        return dict(self.hashes.get(name, {}))
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = _FakeRedis()
+    monkeypatch.setattr(ttb_api, "get_redis_sync", lambda: client)
+    monkeypatch.setattr(ttb_quota_planner, "_registered_apps", set())
+    monkeypatch.setattr(ttb_api.settings, "TTB_API_GMVMAX_REPORT_QPM", 20)
+    monkeypatch.setattr(ttb_api.settings, "TTB_API_GMVMAX_REPORT_QPS", 1000)
+    monkeypatch.setattr(ttb_api.settings, "TTB_API_GLOBAL_QPS", 1000)
+    monkeypatch.setattr(ttb_api.settings, "TTB_API_RATE_LIMIT_MAX_WAIT_SECONDS", 0.25)
+    return client
+
+
+def _calls(
+    limiter: SharedTikTokRateLimiter,
+    subsystem: str,
+    count: int,
+    path: str = "/gmv_max/report/get/",
+) -> int:
+    async def _run() -> int:
+        admitted = 0
+        with quota_subsystem(subsystem):
+            for _ in range(count):
+                try:
+                    await limiter.acquire(path)
+                except TTBRateLimitBudgetError:
+                    break
+                admitted += 1
+        return admitted
+
+    return asyncio.run(_run())
+
+
+def test_tasks_map_to_prioritized_subsystems():
+    assert subsystem_for_task("gmvmax.execute_campaign_pause_intent") == "control"
+    assert subsystem_for_task("gmvmax.smart_guard_cycle") == "smart_guard"
+    assert subsystem_for_task("gmvmax.sync_creative_metrics_10min_for_store") == "creative_10min"
+    assert subsystem_for_task("gmvmax.manual_sync_levels") == "account_sync"
+    assert subsystem_for_task("gmvmax.sync.run_scheduler") == "account_sync"
+    assert subsystem_for_task("gmvmax.sync.run_for_strategy") == "account_sync"
+    assert subsystem_for_task("gmvmax.backfill_catalog_item_groups") == "backfill"
+    assert subsystem_for_task("gmvmax.backfill_catalog_item_group_chunk") == "backfill"
+    assert subsystem_for_task("tiktok_shop.sync_domain") == "other"
+
+
+def test_lower_priorities_leave_the_window_to_higher_ones(redis, monkeypatch):
+    monkeypatch.setattr(ttb_api.time, "time", lambda: NOW)
+    limiter = SharedTikTokRateLimiter(app_id="app-1", access_token="token")
+
+    # 20 report calls per minute: backfills stop at half, syncs at 75%,
+    # and the control plane still gets the remainder.
+    assert _calls(limiter, "backfill", 20) == 10
+    assert _calls(limiter, "account_sync", 20) == 5
+    assert _calls(limiter, "control", 20) == 5
+
+    prefix = quota_key_prefix("app-1")
+    minute = int(NOW * 1000) // MINUTE_MS
+    assert redis.values[f"{prefix}:demand:m:backfill:{minute}"] == 10
+    assert redis.values[f"{prefix}:demand:m:control:{minute}"] == 5
+    assert redis.values[f"{prefix}:demand:report:m:backfill:{minute}"] == 10
+    assert redis.hashes[ttb_quota_planner._apps_key()] == {prefix.rsplit(":", 1)[-1]: "app-1"}
+
+
+def test_planner_defers_backfill_before_forecast_guard_demand(redis, monkeypatch):
+    monkeypatch.setattr(ttb_api.settings, "TTB_API_GMVMAX_REPORT_QPM", 240)
+    monkeypatch.setattr(ttb_api.settings, "TTB_API_GMVMAX_REPORT_QPD", 28_000)
+    prefix = quota_key_prefix("app-1")
+    minute = int(NOW * 1000) // MINUTE_MS
+    day = int(NOW * 1000) // ttb_quota_planner.DAY_MS
+    for back in range(1, 16):
+        redis.values[f"{prefix}:demand:report:m:smart_guard:{minute - back}"] = 25
+        redis.values[f"{prefix}:demand:report:m:backfill:{minute - back}"] = 20
+    redis.values[f"{prefix}:gmv-report:d:{day}"] = 3000
+
+    # Guards are forecast to need 25 * 960 = 24000 of the 28000 daily report
+    # calls, so backfills may only use the first 4000 of the day.
+    assert plan("backfill", app_id="app-1", client=redis, now=NOW).admit is True
+
+    redis.values[f"{prefix}:gmv-report:d:{day}"] = 3990
+    deferred = plan("backfill", app_id="app-1", client=redis, now=NOW)
+    assert deferred.admit is False
+    assert deferred.quota == "gmv-report:d"
+    assert plan("smart_guard", app_id="app-1", client=redis, now=NOW).admit is True
+    assert plan("control", app_id="app-1", client=redis, now=NOW).admit is True
+
+
+def test_non_report_calls_do_not_count_as_report_demand(redis, monkeypatch):
+    monkeypatch.setattr(ttb_api.time, "time", lambda: NOW)
+    monkeypatch.setattr(ttb_api.settings, "TTB_API_GMVMAX_REPORT_QPM", 240)
+    monkeypatch.setattr(ttb_api.settings, "TTB_API_GMVMAX_REPORT_QPD", 28_000)
+    limiter = SharedTikTokRateLimiter(app_id="app-1", access_token="token")
+    prefix = quota_key_prefix("app-1")
+    minute = int(NOW * 1000) // MINUTE_MS
+    day = int(NOW * 1000) // ttb_quota_planner.DAY_MS
+
+    assert _calls(limiter, "smart_guard", 30, path="/campaign/gmv_max/info/") == 30
+    assert redis.values[f"{prefix}:demand:m:smart_guard:{minute}"] == 30
+    assert f"{prefix}:demand:report:m:smart_guard:{minute}" not in redis.values
+
+    # Heavy guard traffic on other endpoints leaves the report windows to syncs.
+    for back in range(1, 16):
+        redis.values[f"{prefix}:demand:m:smart_guard:{minute - back}"] = 200
+    redis.values[f"{prefix}:gmv-report:d:{day}"] = 3990
+    assert plan("account_sync", app_id="app-1", client=redis, now=NOW).admit is True
+
+
+def test_admin_endpoint_reports_remaining_budget_per_app(redis, monkeypatch):
+    monkeypatch.setattr(ttb_api.time, "time", lambda: NOW)
+    monkeypatch.setattr(ttb_quota_planner.time, "time", lambda: NOW)
+    limiter = SharedTikTokRateLimiter(app_id="app-1", access_token="token")
+    _calls(limiter, "smart_guard", 3)
+    monkeypatch.setattr(
+        router_ttb_quota, "quota_overview", lambda: ttb_quota_planner.quota_overview(redis)
+    )
+    app = FastAPI()
+    app.include_router(router_ttb_quota.router)
+    app.dependency_overrides[require_platform_admin] = lambda: object()
+
+    with TestClient(app) as client:
+        body = client.get("/api/v1/admin/platform/ttb-quota").json()
+
+    (item,) = body["apps"]
+    quotas = {quota["quota"]: quota for quota in item["quotas"]}
+    subsystems = {entry["subsystem"]: entry for entry in item["subsystems"]}
+    assert item["app"] == "app-1"
+    assert quotas["gmv-report:d"]["used"] == 3
+    assert quotas["gmv-report:d"]["remaining"] == quotas["gmv-report:d"]["limit"] - 3
+    assert subsystems["smart_guard"]["calls_today"] == 3
+    assert subsystems["smart_guard"]["report_calls_today"] == 3
+    assert subsystems["smart_guard"]["priority"] == "GUARD"
@@ -19,6 +19,7 @@ from app.data.models import (
     TaskCatalog,
     OAuthProviderApp,
     OAuthAccountTTB,
+    PlatformPolicy,
 )
 from app.data.models.gmvmax_campaign_catalog import (
     GmvmaxProductCampaignCatalog,
@@ -867,6 +868,57 @@ def test_product_sync_limits_pairs_to_selected_advertiser(db_session):
     assert client.calls[0]["store_id"] == "STORE1"
 
 
+def test_provider_skips_product_pairs_denied_by_store_policy(db_session):
+    _seed_data(db_session)
+    db_session.add_all(
+        [
+            TTBAdvertiser(workspace_id=1, auth_id=1, advertiser_id="ADV2", bc_id="BC2"),
+            TTBStore(workspace_id=1, auth_id=1, store_id="STORE2", bc_id="BC2"),
+            TTBAdvertiserStoreLink(
+                workspace_id=1,
+                auth_id=1,
+                advertiser_id="ADV2",
+                store_id="STORE2",
+                bc_id_hint="BC2",
+            ),
+            PlatformPolicy(
+                provider_key="tiktok-business",
+                name="Block STORE2",
+                name_normalized="block store2",
+                mode="BLACKLIST",
+                enforcement_mode="ENFORCE",
+                is_enabled=True,
+                domains_json=[],
+                business_scopes_json={"include": {"store_ids": ["STORE2"]}, "exclude": {}},
+            ),
+        ]
+    )
+    db_session.commit()
+
+    class DummyClient:
+        def __init__(self):
+            self.stores: list[str] = []
+
+        async def iter_products(self, *, store_id, **_kwargs):  # noqa: ANN003
+            self.stores.append(store_id)
+            if False:
+                yield None
+
+    client = DummyClient()
+    provider = TiktokBusinessProvider()
+    service = TTBSyncService(
+        db_session,
+        client,
+        workspace_id=1,
+        auth_id=1,
+        pair_filter=provider._policy_pair_filter(db_session, workspace_id=1, auth_id=1),
+    )
+
+    asyncio.run(service.sync_products())
+
+    assert client.stores == ["STORE1"]
+
+
 def test_gmv_product_sync_tombstones_only_previously_tracked_absences(db_session):
     _seed_data(db_session)
 
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.providers.tiktok_business.website_ads_pagination import (
+    report_payload_has_complete_pagination,
+)
+from app.services import website_ads_report_cache as report_cache
+
+
+
+class _UnavailableRedis:
+    def get(self, key):
+        raise ConnectionError("redis down")
+
+    def set(self, *args, **kwargs):
+        raise ConnectionError("redis down")
+
+
+class _Api:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    async def report_ads(self, advertiser_id, ad_ids, start_date, end_date, *, hourly):
+        assert hourly is True
+        self.calls.append(list(ad_ids))
+        rows = [
+            {
+                "dimensions": {"ad_id_v2": ad_id, "stat_time_hour": f"{start_date} 01:00:00"},
+                "metrics": {"spend": "1.00"},
+            }
+            for ad_id in ad_ids
+        ]
+        return {
+            "data": {"list": rows},
+            "_metric_fidelity": "conversion_video",
+            "_report_pagination": {
+                "chunks_fetched": 1,
+                "pages_fetched": 1,
+                "rows_returned": len(rows),
+                "source_pages": [{"page": 1}],
+            },
+        }
+
+
+def _fetch(api, ad_ids, *, workspace_id=1, auth_id=7):
+    return report_cache.fetch_hourly_ad_report(
+        api,
+        "adv-1",
+        ad_ids,
+        "2026-10-18",
+        workspace_id=workspace_id,
+        auth_id=auth_id,
+    )
+
+
+def test_cycle_scope_serves_subset_requests_from_one_complete_fetch(monkeypatch):
+    monkeypatch.setattr(report_cache, "get_redis_sync", lambda: _UnavailableRedis())
+    api = _Api()
+
+    async def run():
+        with report_cache.report_fetch_scope():
+            full = await _fetch(api, ["a", "b", "c"])
+            subset = await _fetch(api, ["b"])
+            wider = await _fetch(api, ["b", "d"])
+        outside = await _fetch(api, ["b"])
+        return full, subset, wider, outside
+
+    full, subset, wider, outside = asyncio.run(run())
+
+    assert api.calls == [["a", "b", "c"], ["b", "d"], ["b"]]
+    assert report_cache.report_fetched_remotely(full)
+    assert not report_cache.report_fetched_remotely(subset)
+    assert [row["dimensions"]["ad_id_v2"] for row in subset["data"]["list"]] == ["b"]
+    assert report_payload_has_complete_pagination(subset)
+    assert len(full["data"]["list"]) == 3
+    assert report_cache.report_fetched_remotely(wider)
+    assert report_cache.report_fetched_remotely(outside)
+
+
+def test_incomplete_reports_are_never_shared(monkeypatch):
+    monkeypatch.setattr(report_cache, "get_redis_sync", lambda: _UnavailableRedis())
+
+    class _PartialApi(_Api):
+        async def report_ads(self, *args, **kwargs):
+            payload = await super().report_ads(*args, **kwargs)
+            payload.pop("_report_pagination")
+            return payload
+
+    api = _PartialApi()
+
+    async def run():
+        with report_cache.report_fetch_scope():
+            await _fetch(api, ["a"])
+            await _fetch(api, ["a"])
+
+    asyncio.run(run())
+
+    assert len(api.calls) == 2
+
+
+def test_reports_are_not_shared_across_bindings_of_one_advertiser(monkeypatch):
+    monkeypatch.setattr(report_cache, "get_redis_sync", lambda: _UnavailableRedis())
+    api = _Api()
+
+    async def run():
+        with report_cache.report_fetch_scope():
+            first = await _fetch(api, ["a"])
+            other_auth = await _fetch(api, ["a"], workspace_id=1, auth_id=8)
+            other_workspace = await _fetch(api, ["a"], workspace_id=2, auth_id=7)
+            again = await _fetch(api, ["a"])
+        return first, other_auth, other_workspace, again
+
+    first, other_auth, other_workspace, again = asyncio.run(run())
+
+    assert len(api.calls) == 3
+    assert report_cache.report_fetched_remotely(first)
+    assert report_cache.report_fetched_remotely(other_auth)
+    assert report_cache.report_fetched_remotely(other_workspace)
+    assert not report_cache.report_fetched_remotely(again)
@@ -1,13 +1,13 @@
 #!/usr/bin/env bash
 set -Eeuo pipefail
 
-QUEUE="${1:?Usage: celery-worker.sh <queue-name>}"
+QUEUE="${1:?Usage: celery-worker.sh <queue-name>[,<queue-name>...]}"
 CELERY_BIN="/opt/gmv/python3.13/bin/celery"
 HOSTNAME="$(hostname)-${QUEUE}"
 
 # The Python task registry uses this role only to avoid importing unrelated
-# worker task graphs. The queue and all resource limits remain deployment
-# configuration.
+# worker task graphs (see queue_task_registry in app/celery_app.py). The queue
+# and all resource limits remain deployment configuration.
 export GMV_CELERY_WORKER_QUEUE="$QUEUE"
 
 QUEUE_KEY="$(echo "$QUEUE" | tr '.-' '__' | tr '[:lower:]' '[:upper:]')"